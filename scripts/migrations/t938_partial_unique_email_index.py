@@ -30,7 +30,7 @@ the actual fix for that: replace `email_1` with
 so uniqueness is enforced only among live users, and a deleted email
 becomes reusable by a genuinely new account.
 
-`src/services/database.py`'s `MongoDBManager._create_indexes` (runs on
+`src/services/database.py`'s `MongoDBManager._declare_indexes` (reconciled on
 every API boot) has been updated in the same change to create this same
 partial index under the name `email_live_unique` — deliberately NOT named
 `email_1`, so it can coexist with the not-yet-dropped old index without a
@@ -0,0 +1,56 @@
+"""Add keyset indexes for the streamed account statement
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-19 00:00:00.000000
+
+Background
+----------
+GET /reports/account-statement streams every line posted to one GL account
+in (jeDate, jeNumber, lineNumber) order, one keyset page at a time. Each
+page is "the next N lines after the last one sent", so neither index below
+is ever asked for an OFFSET or a COUNT(*).
+
+  - ix_je_org_company_date_number on journal_entries
+      (organizationId, companyCode, jeDate, jeNumber)
+    Walks a company's headers in statement order and serves the keyset
+    range predicate on (jeDate, jeNumber).
+
+  - ix_jel_account_je_line on journal_entry_lines
+      (accountId, jeId, lineNumber, debit, credit)
+    Covering index for the line side: finding a header's lines on the
+    account and the opening-balance SUM before the statement's start date
+    are index-only. Only the lines actually streamed go back to the table
+    row, for their free-text description.
+
+Downgrade
+---------
+Drops both indexes. The statement still works, with a sort per page.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_je_org_company_date_number",
+        "journal_entries",
+        ["organizationId", "companyCode", "jeDate", "jeNumber"],
+    )
+    op.create_index(
+        "ix_jel_account_je_line",
+        "journal_entry_lines",
+        ["accountId", "jeId", "lineNumber", "debit", "credit"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jel_account_je_line", "journal_entry_lines")
+    op.drop_index("ix_je_org_company_date_number", "journal_entries")
@@ -0,0 +1,288 @@
+"""
+Benchmark: ap_invoice_posted ingestion with the posting configuration cache.
+
+Purpose
+-------
+Posts a stream of large AP invoices through the real ingest endpoint and
+reports throughput and the number of configuration SELECTs per event, once
+with the cache cleared before every event (each event still resolves all of
+its lines from one snapshot) and once warm (events share the org snapshot
+until a config write bumps it).
+
+Default run: 1,000 invoices × 100 lines, 10 distinct tax codes, against a
+fresh in-memory SQLite database, so it needs no MySQL. Point DATABASE_URL at
+a scratch MySQL database to measure real round-trips — the script creates its
+own org and company but does not clean up after itself, so never run it
+against a live database.
+
+Usage
+-----
+Run from the finance service root:
+
+    PYTHONPATH=src:../.. python -m scripts.bench_ap_invoice_posting
+    PYTHONPATH=src:../.. python -m scripts.bench_ap_invoice_posting --invoices 200 --lines 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List
+
+# Override DB and secret BEFORE importing any finance module (session.py reads
+# DATABASE_URL at import time).
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "bench_secret_key")
+os.environ["FINANCE_INGESTION_SECRET"] = "bench-ingest-secret"
+os.environ["DEBUG"] = "false"
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from finance.db.session import AsyncSessionLocal, engine  # noqa: E402
+from finance.main import app  # noqa: E402
+from finance.models.orm.base import Base  # noqa: E402
+from finance.models.orm.models import (  # noqa: E402
+    AccountLevelEnum,
+    AccountTypeEnum,
+    CompanyCode,
+    CompanyPostingSetup,
+    DrawerEnum,
+    FiscalPeriod,
+    GLAccount,
+    PeriodStatusEnum,
+    TaxCode,
+)
+from finance.services import posting_config_cache  # noqa: E402
+
+_INGEST_URL = "/api/v1/finance/events/ingest"
+_HEADERS = {"X-Service-Secret": "bench-ingest-secret"}
+_CONFIG_TABLES = (
+    "company_posting_setup",
+    "gl_accounts",
+    "tax_codes",
+    "fiscal_periods",
+    "purchase_item_finance_ext",
+    "sale_item_finance_ext",
+    "customer_finance_ext",
+)
+
+
+async def _seed(tax_code_count: int) -> Dict[str, Any]:
+    """Create the org's company, accounts, posting setup, tax codes and period."""
+    org = str(uuid.uuid4())
+    company_code = f"BN{uuid.uuid4().hex[:6].upper()}"
+    async with AsyncSessionLocal() as db:
+        db.add(
+            CompanyCode(companyCode=company_code, organizationId=org, legalName="Bench")
+        )
+        account_ids = {}
+        for role, drawer, account_type in (
+            ("apControl", DrawerEnum.LIABILITIES, AccountTypeEnum.LIABILITY),
+            ("grIr", DrawerEnum.LIABILITIES, AccountTypeEnum.LIABILITY),
+            ("inputVat", DrawerEnum.ASSETS, AccountTypeEnum.ASSET),
+            ("outputVat", DrawerEnum.LIABILITIES, AccountTypeEnum.LIABILITY),
+            ("ppv", DrawerEnum.COST_OF_SALES, AccountTypeEnum.EXPENSE),
+        ):
+            account_id = str(uuid.uuid4())
+            db.add(
+                GLAccount(
+                    accountId=account_id,
+                    organizationId=org,
+                    accountNumber=f"9{len(account_ids):05d}-001",
+                    accountName=f"Bench {role}",
+                    drawer=drawer,
+                    accountType=account_type,
+                    accountLevel=AccountLevelEnum.ACTIVE,
+                )
+            )
+            account_ids[role] = account_id
+        db.add(
+            CompanyPostingSetup(
+                setupId=str(uuid.uuid4()),
+                organizationId=org,
+                companyCode=company_code,
+                apControlAccountId=account_ids["apControl"],
+                grIrClearingAccountId=account_ids["grIr"],
+                inputVatAccountId=account_ids["inputVat"],
+                outputVatAccountId=account_ids["outputVat"],
+                purchasePriceVarianceAccountId=account_ids["ppv"],
+                isComplete=True,
+            )
+        )
+        tax_codes = [f"T{n}" for n in range(tax_code_count)]
+        for n, code in enumerate(tax_codes):
+            db.add(
+                TaxCode(
+                    organizationId=org,
+                    taxCode=code,
+                    description=f"Bench {code}",
+                    rate=Decimal("5.00"),
+                    isReverseCharge=n % 5 == 0,
+                    isActive=True,
+                )
+            )
+        db.add(
+            FiscalPeriod(
+                periodId=str(uuid.uuid4()),
+                companyCode=company_code,
+                fiscalYear=2026,
+                periodNumber=6,
+                startDate=date(2026, 6, 1),
+                endDate=date(2026, 6, 30),
+                status=PeriodStatusEnum.OPEN,
+            )
+        )
+        await db.commit()
+    return {"org": org, "company": company_code, "tax_codes": tax_codes}
+
+
+def _ap_event(seed: Dict[str, Any], line_count: int) -> Dict[str, Any]:
+    lines: List[Dict[str, Any]] = []
+    for n in range(line_count):
+        line_net = Decimal("100.00")
+        line_tax = Decimal("5.00")
+        lines.append(
+            {
+                "lineNumber": n + 1,
+                "itemId": str(uuid.uuid4()),
+                "itemCode": f"ITEM-{n:03d}",
+                "itemName": f"Item {n}",
+                "itemType": "raw_material",
+                "quantity": "10.000",
+                "uom": "KG",
+                "poUnitPrice": "10.00",
+                "invoiceUnitPrice": "10.00",
+                "priceVarianceAmount": "0.00",
+                "lineNet": str(line_net),
+                "lineTax": str(line_tax),
+                "lineGross": str(line_net + line_tax),
+                "taxCode": seed["tax_codes"][n % len(seed["tax_codes"])],
+                "grLineId": str(uuid.uuid4()),
+                "baseLineId": str(uuid.uuid4()),
+            }
+        )
+    total_net = sum(Decimal(line["lineNet"]) for line in lines)
+    total_tax = sum(Decimal(line["lineTax"]) for line in lines)
+    return {
+        "eventId": str(uuid.uuid4()),
+        "eventType": "ap_invoice_posted",
+        "organizationId": seed["org"],
+        "companyCode": seed["company"],
+        "occurredAt": datetime.utcnow().isoformat(),
+        "sourceUserId": str(uuid.uuid4()),
+        "payload": {
+            "apDocId": str(uuid.uuid4()),
+            "apDocNumber": f"AP-2026-{uuid.uuid4().hex[:6].upper()}",
+            "apDate": "2026-06-15",
+            "invoiceNumber": f"INV-{uuid.uuid4().hex[:8]}",
+            "invoiceDate": "2026-06-14",
+            "dueDate": "2026-07-14",
+            "dateOfSupply": "2026-06-10",
+            "grDocId": str(uuid.uuid4()),
+            "grDocNumber": "GR-2026-0001",
+            "poDocId": str(uuid.uuid4()),
+            "poDocNumber": "PO-2026-0001",
+            "vendorId": str(uuid.uuid4()),
+            "vendorCode": "VND-BENCH",
+            "companyCode": seed["company"],
+            "paymentTermsCode": "NET30",
+            "lines": lines,
+            "currencyCode": "AED",
+            "totalNetAmount": str(total_net),
+            "totalTaxAmount": str(total_tax),
+            "totalGrossAmount": str(total_net + total_tax),
+            "totalPriceVariance": "0.00",
+        },
+    }
+
+
+async def _run_pass(
+    client: AsyncClient,
+    seed: Dict[str, Any],
+    invoices: int,
+    lines: int,
+    cold: bool,
+) -> Dict[str, float]:
+    counts = {"config": 0, "total": 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counts["total"] += 1
+        lowered = statement.lower()
+        if lowered.lstrip().startswith("select") and any(
+            f"from {table}" in lowered for table in _CONFIG_TABLES
+        ):
+            counts["config"] += 1
+
+    # Reason: build the payloads up front so the timing covers ingestion only.
+    events = [_ap_event(seed, lines) for _ in range(invoices)]
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    started = time.perf_counter()
+    try:
+        for body in events:
+            if cold:
+                posting_config_cache.clear()
+            resp = await client.post(_INGEST_URL, json=body, headers=_HEADERS)
+            if resp.status_code != 200:
+                raise RuntimeError(f"ingest failed ({resp.status_code}): {resp.text}")
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(engine.sync_engine, "before_cursor_execute", _count)
+    return {
+        "seconds": elapsed,
+        "events_per_second": invoices / elapsed,
+        "config_selects_per_event": counts["config"] / invoices,
+        "statements_per_event": counts["total"] / invoices,
+    }
+
+
+async def run_benchmark(invoices: int, lines: int, tax_codes: int) -> None:
+    """Seed one org, then post ``invoices`` AP invoices cold and warm."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    seed = await _seed(tax_codes)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        results = {
+            "cold (cache cleared per event)": await _run_pass(
+                client, seed, invoices, lines, cold=True
+            ),
+            "warm (shared org snapshot)": await _run_pass(
+                client, seed, invoices, lines, cold=False
+            ),
+        }
+
+    print(
+        f"\n{invoices} ap_invoice_posted events × {lines} lines, {tax_codes} tax codes"
+    )
+    print(
+        f"{'pass':<32}{'seconds':>10}{'events/s':>10}{'cfg SELECT/ev':>15}{'stmts/ev':>10}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<32}{r['seconds']:>10.2f}{r['events_per_second']:>10.1f}"
+            f"{r['config_selects_per_event']:>15.2f}{r['statements_per_event']:>10.1f}"
+        )
+    await engine.dispose()
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--invoices", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--tax-codes", type=int, default=10)
+    args = parser.parse_args(argv)
+    # Reason: per-event INFO logging would dominate the timings.
+    logging.disable(logging.INFO)
+    asyncio.run(run_benchmark(args.invoices, args.lines, args.tax_codes))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
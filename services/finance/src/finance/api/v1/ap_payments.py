@@ -49,6 +49,7 @@ from ...models.schemas.ap_payments import (
     JESummary,
 )
 from ...models.schemas.common import PaginatedResponse, SuccessResponse
+from ...services.posting_config_cache import org_snapshot
 from ...utils.responses import paginated, success
 from .events import (
     _next_je_number,
@@ -374,7 +375,9 @@ async def create_ap_payment(
     # ------------------------------------------------------------------
     # 1. Validate posting setup — apControlAccountId is mandatory
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    setup = await _resolve_posting_setup_or_raise(
+        db, org_snapshot(db, org_id), company_code
+    )
 
     if not setup.apControlAccountId:
         raise HTTPException(
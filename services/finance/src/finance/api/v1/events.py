@@ -44,24 +44,25 @@ from ...config import settings
 from ...db.session import get_db
 from ...models.orm.models import (
     AccountTypeEnum,
-    CompanyPostingSetup,
-    CustomerFinanceExt,
     DrawerEnum,
-    FiscalPeriod,
     GLAccount,
     JEStatusEnum,
     JournalEntry,
     JournalEntryLine,
     OutboxEventResultEnum,
     OutboxEventsProcessed,
-    PeriodStatusEnum,
     PurchaseItemFinanceExt,
     PurchaseItemTypeEnum,
-    SaleItemFinanceExt,
-    TaxCode,
     VendorFinanceExt,
 )
 
+from ...services.posting_config_cache import (
+    PostingConfigSnapshot,
+    open_fiscal_periods,
+    open_period_covering,
+    org_snapshot,
+)
+
 # Import shared contracts — both the envelope and the registry
 from contracts.finance_events import BaseFinanceEvent, EVENT_TYPE_REGISTRY
 
@@ -314,30 +315,24 @@ async def _handle_purchase_item_changed(
 
 async def _resolve_posting_setup_or_raise(
     db: AsyncSession,
-    organization_id: str,
+    config: PostingConfigSnapshot,
     company_code: str,
-) -> CompanyPostingSetup:
+) -> Any:
     """
     Load the company_posting_setup row for (organizationId, companyCode).
 
     Args:
         db: Active SQLAlchemy async session.
-        organization_id: Owning organisation.
+        config: Posting configuration snapshot of the owning organisation.
         company_code: Company code from the event.
 
     Returns:
-        CompanyPostingSetup ORM row.
+        Read-only copy of the CompanyPostingSetup row.
 
     Raises:
         HTTPException 400: If no posting setup row exists. Permanent failure — no retry.
     """
-    result = await db.execute(
-        select(CompanyPostingSetup).where(
-            CompanyPostingSetup.organizationId == organization_id,
-            CompanyPostingSetup.companyCode == company_code,
-        )
-    )
-    setup = result.scalar_one_or_none()
+    setup = await config.posting_setup(db, company_code)
     if setup is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -351,7 +346,7 @@ async def _resolve_posting_setup_or_raise(
 
 async def _resolve_item_inventory_account_or_raise(
     db: AsyncSession,
-    organization_id: str,
+    config: PostingConfigSnapshot,
     item_id: str,
     item_code: str,
 ) -> str:
@@ -360,7 +355,7 @@ async def _resolve_item_inventory_account_or_raise(
 
     Args:
         db: Active SQLAlchemy async session.
-        organization_id: Owning organisation.
+        config: Posting configuration snapshot of the owning organisation.
         item_id: UUID of the item from the GR line.
         item_code: Item code (for error messages only).
 
@@ -371,13 +366,7 @@ async def _resolve_item_inventory_account_or_raise(
         HTTPException 400: If no ext row exists, or if inventoryAccountId is null.
                            Permanent failure — no retry.
     """
-    result = await db.execute(
-        select(PurchaseItemFinanceExt).where(
-            PurchaseItemFinanceExt.organizationId == organization_id,
-            PurchaseItemFinanceExt.itemId == item_id,
-        )
-    )
-    ext_row = result.scalar_one_or_none()
+    ext_row = await config.purchase_item_ext(db, item_id)
     if ext_row is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -416,16 +405,8 @@ async def _resolve_fiscal_period_or_raise(
     Raises:
         HTTPException 400: If no open fiscal period covers je_date. Permanent failure.
     """
-    result = await db.execute(
-        select(FiscalPeriod.periodId).where(
-            FiscalPeriod.companyCode == company_code,
-            FiscalPeriod.status == PeriodStatusEnum.OPEN,
-            FiscalPeriod.startDate <= je_date,
-            FiscalPeriod.endDate >= je_date,
-        )
-    )
-    period_id = result.scalar_one_or_none()
-    if period_id is None:
+    period = open_period_covering(await open_fiscal_periods(db, company_code), je_date)
+    if period is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=(
@@ -433,7 +414,7 @@ async def _resolve_fiscal_period_or_raise(
                 f"in company {company_code}. Open or create the relevant period first."
             ),
         )
-    return period_id
+    return period.periodId
 
 
 async def _next_je_number(
@@ -570,7 +551,8 @@ async def _handle_purchase_received(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 2. Validate GR/IR Clearing account is configured
@@ -589,10 +571,13 @@ async def _handle_purchase_received(
     # ------------------------------------------------------------------
     # Reason: resolve all accounts before opening the transaction so a
     # missing item causes a clean 400 without any partial writes.
+    await config.preload_purchase_item_exts(
+        db, [str(line.itemId) for line in payload.lines]
+    )
     line_inventory_accounts: list[tuple[Any, str]] = []
     for line in payload.lines:
         inv_acct_id = await _resolve_item_inventory_account_or_raise(
-            db, org_id, str(line.itemId), line.itemCode
+            db, config, str(line.itemId), line.itemCode
         )
         line_inventory_accounts.append((line, inv_acct_id))
 
@@ -699,7 +684,7 @@ async def _handle_purchase_received(
 
 async def _resolve_item_cogs_account_or_raise(
     db: AsyncSession,
-    organization_id: str,
+    config: PostingConfigSnapshot,
     item_id: str,
     item_code: str,
 ) -> str:
@@ -711,7 +696,7 @@ async def _resolve_item_cogs_account_or_raise(
 
     Args:
         db: Active SQLAlchemy async session.
-        organization_id: Owning organisation.
+        config: Posting configuration snapshot of the owning organisation.
         item_id: UUID of the item from the delivery line.
         item_code: Item code (for error messages only).
 
@@ -722,13 +707,7 @@ async def _resolve_item_cogs_account_or_raise(
         HTTPException 400: If no ext row exists, cogsAccountId is null,
                            or the account is inactive / wrong type.
     """
-    result = await db.execute(
-        select(SaleItemFinanceExt).where(
-            SaleItemFinanceExt.organizationId == organization_id,
-            SaleItemFinanceExt.itemId == item_id,
-        )
-    )
-    ext_row = result.scalar_one_or_none()
+    ext_row = await config.sale_item_ext(db, item_id)
     if ext_row is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -749,10 +728,7 @@ async def _resolve_item_cogs_account_or_raise(
     # active, still in the COST_OF_SALES drawer, and accountType=expense.
     # Finance may have archived or re-typed the account since the mapping
     # was saved, so a runtime check prevents silent mis-postings.
-    acct_result = await db.execute(
-        select(GLAccount).where(GLAccount.accountId == ext_row.cogsAccountId)
-    )
-    acct = acct_result.scalar_one_or_none()
+    acct = await config.gl_account(db, ext_row.cogsAccountId)
     if acct is None or not acct.isActive:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -782,7 +758,7 @@ async def _resolve_item_cogs_account_or_raise(
 
 async def _resolve_item_inventory_account_validated_or_raise(
     db: AsyncSession,
-    organization_id: str,
+    config: PostingConfigSnapshot,
     item_id: str,
     item_code: str,
 ) -> str:
@@ -796,7 +772,7 @@ async def _resolve_item_inventory_account_validated_or_raise(
 
     Args:
         db: Active SQLAlchemy async session.
-        organization_id: Owning organisation.
+        config: Posting configuration snapshot of the owning organisation.
         item_id: UUID of the item from the delivery line.
         item_code: Item code (for error messages only).
 
@@ -807,13 +783,7 @@ async def _resolve_item_inventory_account_validated_or_raise(
         HTTPException 400: If no ext row exists, inventoryAccountId is null,
                            or the account is inactive / wrong type.
     """
-    result = await db.execute(
-        select(PurchaseItemFinanceExt).where(
-            PurchaseItemFinanceExt.organizationId == organization_id,
-            PurchaseItemFinanceExt.itemId == item_id,
-        )
-    )
-    ext_row = result.scalar_one_or_none()
+    ext_row = await config.purchase_item_ext(db, item_id)
     if ext_row is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -833,10 +803,7 @@ async def _resolve_item_inventory_account_validated_or_raise(
         )
     # Reason: validate at posting time that the inventory account is still
     # active and is in the ASSETS drawer with accountType=asset.
-    acct_result = await db.execute(
-        select(GLAccount).where(GLAccount.accountId == ext_row.inventoryAccountId)
-    )
-    acct = acct_result.scalar_one_or_none()
+    acct = await config.gl_account(db, ext_row.inventoryAccountId)
     if acct is None or not acct.isActive:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -864,6 +831,32 @@ async def _resolve_item_inventory_account_validated_or_raise(
     return ext_row.inventoryAccountId
 
 
+async def _preload_item_accounts(
+    db: AsyncSession,
+    config: PostingConfigSnapshot,
+    item_ids: list[str],
+) -> None:
+    """
+    Batch-load a delivery or return's item extensions and the GL accounts
+    they map to, so the per-line COGS / inventory resolvers run from the
+    snapshot instead of issuing two SELECTs each.
+
+    Args:
+        db: Active SQLAlchemy async session.
+        config: Posting configuration snapshot of the owning organisation.
+        item_ids: Item UUIDs of every line in the event.
+    """
+    await config.preload_sale_item_exts(db, item_ids)
+    await config.preload_purchase_item_exts(db, item_ids)
+    account_ids: list[Optional[str]] = []
+    for item_id in item_ids:
+        sale_ext = await config.sale_item_ext(db, item_id)
+        purchase_ext = await config.purchase_item_ext(db, item_id)
+        account_ids.append(sale_ext.cogsAccountId if sale_ext else None)
+        account_ids.append(purchase_ext.inventoryAccountId if purchase_ext else None)
+    await config.preload_accounts(db, account_ids)
+
+
 # ---------------------------------------------------------------------------
 # T-100.8.1 — delivery_posted posting handler (Wave 3 Phase 2)
 # ---------------------------------------------------------------------------
@@ -910,7 +903,8 @@ async def _handle_delivery_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup (confirms company is configured)
     # ------------------------------------------------------------------
-    await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 2. Resolve COGS + Inventory accounts for each line — fail fast if
@@ -918,13 +912,14 @@ async def _handle_delivery_posted(
     # ------------------------------------------------------------------
     # Reason: resolve all accounts before opening the transaction so a
     # missing item config causes a clean 400 without any partial writes.
+    await _preload_item_accounts(db, config, [str(line.itemId) for line in payload.lines])
     line_accounts: list[tuple[Any, str, str]] = []
     for line in payload.lines:
         cogs_acct_id = await _resolve_item_cogs_account_or_raise(
-            db, org_id, str(line.itemId), line.itemCode
+            db, config, str(line.itemId), line.itemCode
         )
         inv_acct_id = await _resolve_item_inventory_account_validated_or_raise(
-            db, org_id, str(line.itemId), line.itemCode
+            db, config, str(line.itemId), line.itemCode
         )
         line_accounts.append((line, cogs_acct_id, inv_acct_id))
 
@@ -1203,7 +1198,7 @@ async def _handle_delivery_cancelled(
 
 async def _lookup_tax_code_reverse_charge(
     db: AsyncSession,
-    organization_id: str,
+    config: PostingConfigSnapshot,
     tax_code_str: Optional[str],
 ) -> bool:
     """
@@ -1211,7 +1206,7 @@ async def _lookup_tax_code_reverse_charge(
 
     Args:
         db: Active SQLAlchemy async session.
-        organization_id: Organisation scope for the tax code lookup.
+        config: Posting configuration snapshot scoping the tax code lookup.
         tax_code_str: The tax code string from the invoice line (e.g. 'S', 'SR').
 
     Returns:
@@ -1220,15 +1215,9 @@ async def _lookup_tax_code_reverse_charge(
     """
     if not tax_code_str:
         return False
-    result = await db.execute(
-        select(TaxCode.isReverseCharge).where(
-            TaxCode.organizationId == organization_id,
-            TaxCode.taxCode == tax_code_str,
-        )
-    )
-    is_rc = result.scalar_one_or_none()
+    tax_code = await config.tax_code(db, tax_code_str)
     # Reason: None means the tax code row doesn't exist — treat as non-reverse-charge.
-    return bool(is_rc) if is_rc is not None else False
+    return bool(tax_code.isReverseCharge) if tax_code is not None else False
 
 
 def _compute_tax_point_date(date_of_supply: str, invoice_date: str) -> str:
@@ -1357,27 +1346,20 @@ async def _handle_ap_invoice_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 2. Resolve per-line reverse-charge flags
     # ------------------------------------------------------------------
-    # Reason: we look up each distinct tax code once to avoid N+1 queries.
-    # Cache the results in a small dict keyed by taxCode string.
-    _rc_cache: Dict[str, bool] = {}
-
-    async def _is_reverse_charge(tc_str: Optional[str]) -> bool:
-        """Cached reverse-charge lookup for a tax code string."""
-        if tc_str not in _rc_cache:
-            _rc_cache[tc_str] = await _lookup_tax_code_reverse_charge(
-                db, org_id, tc_str
-            )
-        return _rc_cache[tc_str]
+    # Reason: every distinct tax code is loaded in one query up front; the
+    # per-line lookups below are then served from the snapshot.
+    await config.preload_tax_codes(db, [line.taxCode for line in payload.lines])
 
     # Build per-line reverse-charge flags and per-line tax amounts
     line_rc_flags: list[bool] = []
     for line in payload.lines:
-        is_rc = await _is_reverse_charge(line.taxCode)
+        is_rc = await _lookup_tax_code_reverse_charge(db, config, line.taxCode)
         line_rc_flags.append(is_rc)
 
     # ------------------------------------------------------------------
@@ -1788,7 +1770,8 @@ async def _handle_ap_down_payment_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     has_vat = total_tax > Decimal("0")
 
@@ -2017,7 +2000,8 @@ async def _handle_ap_credit_note_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     has_vat = total_tax > Decimal("0")
 
@@ -2191,10 +2175,10 @@ async def _handle_ap_credit_note_posted(
 
 async def _resolve_ar_control_account_or_raise(
     db: AsyncSession,
-    org_id: str,
+    config: PostingConfigSnapshot,
     company_code: str,
     customer_id: str,
-    setup: CompanyPostingSetup,
+    setup: Any,
 ) -> str:
     """
     Resolve the AR control account for a sales invoice via the 3-tier chain.
@@ -2211,7 +2195,7 @@ async def _resolve_ar_control_account_or_raise(
 
     Args:
         db: Active SQLAlchemy async session.
-        org_id: Organisation scope.
+        config: Posting configuration snapshot of the organisation.
         company_code: Company code (for error messages).
         customer_id: MongoDB customer document ID string.
         setup: Loaded CompanyPostingSetup for this company.
@@ -2228,13 +2212,7 @@ async def _resolve_ar_control_account_or_raise(
     # ------------------------------------------------------------------
     # Tier 1: per-customer override in customer_finance_ext
     # ------------------------------------------------------------------
-    cust_ext_result = await db.execute(
-        select(CustomerFinanceExt.arControlAccountId).where(
-            CustomerFinanceExt.organizationId == org_id,
-            CustomerFinanceExt.customerId == customer_id,
-        )
-    )
-    cust_ext_ar = cust_ext_result.scalar_one_or_none()
+    cust_ext_ar = await config.customer_ar_override(db, customer_id)
     if cust_ext_ar:
         ar_account_id = cust_ext_ar
 
@@ -2248,14 +2226,9 @@ async def _resolve_ar_control_account_or_raise(
     # Tier 3: system fallback — lookup by account number '124000-001'
     # ------------------------------------------------------------------
     if not ar_account_id:
-        fallback_result = await db.execute(
-            select(GLAccount.accountId).where(
-                GLAccount.organizationId == org_id,
-                GLAccount.accountNumber == "124000-001",
-                GLAccount.isActive == True,  # noqa: E712
-            )
-        )
-        ar_account_id = fallback_result.scalar_one_or_none()
+        fallback = await config.gl_account_by_number(db, "124000-001")
+        if fallback is not None and fallback.isActive:
+            ar_account_id = fallback.accountId
 
     if not ar_account_id:
         raise HTTPException(
@@ -2271,10 +2244,7 @@ async def _resolve_ar_control_account_or_raise(
     # ------------------------------------------------------------------
     # Validate the resolved account
     # ------------------------------------------------------------------
-    acct_result = await db.execute(
-        select(GLAccount).where(GLAccount.accountId == ar_account_id)
-    )
-    acct = acct_result.scalar_one_or_none()
+    acct = await config.gl_account(db, ar_account_id)
     if acct is None or not acct.isActive:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2313,6 +2283,7 @@ async def _resolve_ar_control_account_or_raise(
 
 async def _validate_revenue_account_or_raise(
     db: AsyncSession,
+    config: PostingConfigSnapshot,
     account_id: str,
     item_code: str,
     line_number: int,
@@ -2323,6 +2294,7 @@ async def _validate_revenue_account_or_raise(
 
     Args:
         db: Active SQLAlchemy async session.
+        config: Posting configuration snapshot of the organisation.
         account_id: The revenueAccountId from the invoice line.
         item_code: Item code (for error messages).
         line_number: Line number (for error messages).
@@ -2330,10 +2302,7 @@ async def _validate_revenue_account_or_raise(
     Raises:
         HTTPException 400: If the account fails any validation check.
     """
-    acct_result = await db.execute(
-        select(GLAccount).where(GLAccount.accountId == account_id)
-    )
-    acct = acct_result.scalar_one_or_none()
+    acct = await config.gl_account(db, account_id)
     if acct is None or not acct.isActive:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2373,9 +2342,9 @@ async def _validate_revenue_account_or_raise(
 
 async def _validate_bank_account_or_raise(
     db: AsyncSession,
-    org_id: str,
+    config: PostingConfigSnapshot,
     account_id: str,
-) -> "GLAccount":
+) -> Any:
     """
     Validate that account_id is an active, non-header, ASSETS/asset GL account.
 
@@ -2383,23 +2352,20 @@ async def _validate_bank_account_or_raise(
 
     Args:
         db: Active SQLAlchemy async session.
-        org_id: Organisation scope (cross-org protection).
+        config: Posting configuration snapshot of the organisation (cross-org
+            protection).
         account_id: The bankAccountId from the CustomerPaymentReceivedPayload.
 
     Returns:
-        The validated GLAccount ORM object.
+        Read-only copy of the validated GLAccount row.
 
     Raises:
         HTTPException 400: If the account is not found, inactive, a header account,
                            wrong drawer (not ASSETS), or wrong accountType (not asset).
     """
-    acct_result = await db.execute(
-        select(GLAccount).where(
-            GLAccount.accountId == account_id,
-            GLAccount.organizationId == org_id,
-        )
-    )
-    acct = acct_result.scalar_one_or_none()
+    acct = await config.gl_account(db, account_id)
+    if acct is not None and acct.organizationId != config.organization_id:
+        acct = None
     if acct is None or not acct.isActive:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2491,7 +2457,8 @@ async def _handle_sales_invoice_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 2. Validate outputVatAccountId is configured when VAT is non-zero
@@ -2511,7 +2478,7 @@ async def _handle_sales_invoice_posted(
     # 3. Resolve AR control account via 3-tier chain
     # ------------------------------------------------------------------
     ar_account_id = await _resolve_ar_control_account_or_raise(
-        db, org_id, company_code, payload.customerId, setup
+        db, config, company_code, payload.customerId, setup
     )
 
     # ------------------------------------------------------------------
@@ -2519,9 +2486,10 @@ async def _handle_sales_invoice_posted(
     # ------------------------------------------------------------------
     # Reason: fail fast — resolve and validate all accounts before any writes
     # so a misconfigured line causes a clean 400 with no partial JE in DB.
+    await config.preload_accounts(db, [line.revenueAccountId for line in payload.lines])
     for line in payload.lines:
         await _validate_revenue_account_or_raise(
-            db, line.revenueAccountId, line.itemCode, line.lineNumber
+            db, config, line.revenueAccountId, line.itemCode, line.lineNumber
         )
 
     # ------------------------------------------------------------------
@@ -2874,18 +2842,19 @@ async def _handle_customer_payment_received(
     # ------------------------------------------------------------------
     # 1. Validate bank account (DR side)
     # ------------------------------------------------------------------
-    await _validate_bank_account_or_raise(db, org_id, payload.bankAccountId)
+    config = org_snapshot(db, org_id)
+    await _validate_bank_account_or_raise(db, config, payload.bankAccountId)
 
     # ------------------------------------------------------------------
     # 2. Resolve company posting setup (needed for AR 3-tier chain tier 2)
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 3. Resolve AR control account via 3-tier chain (CR side)
     # ------------------------------------------------------------------
     ar_account_id = await _resolve_ar_control_account_or_raise(
-        db, org_id, company_code, payload.customerId, setup
+        db, config, company_code, payload.customerId, setup
     )
 
     # ------------------------------------------------------------------
@@ -3196,20 +3165,22 @@ async def _handle_return_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 2. Resolve Inventory + COGS accounts for each line — fail fast
     # ------------------------------------------------------------------
     # Reason: resolve all accounts before any writes so a missing item config
     # causes a clean 400 without partial writes.
+    await _preload_item_accounts(db, config, [str(line.itemId) for line in payload.lines])
     line_accounts: list[tuple[Any, str, str]] = []
     for line in payload.lines:
         inv_acct_id = await _resolve_item_inventory_account_validated_or_raise(
-            db, org_id, str(line.itemId), line.itemCode
+            db, config, str(line.itemId), line.itemCode
         )
         cogs_acct_id = await _resolve_item_cogs_account_or_raise(
-            db, org_id, str(line.itemId), line.itemCode
+            db, config, str(line.itemId), line.itemCode
         )
         line_accounts.append((line, inv_acct_id, cogs_acct_id))
 
@@ -3523,7 +3494,8 @@ async def _handle_credit_note_posted(
     # ------------------------------------------------------------------
     # 1. Resolve company posting setup
     # ------------------------------------------------------------------
-    setup = await _resolve_posting_setup_or_raise(db, org_id, company_code)
+    config = org_snapshot(db, org_id)
+    setup = await _resolve_posting_setup_or_raise(db, config, company_code)
 
     # ------------------------------------------------------------------
     # 2. Validate outputVatAccountId is configured when VAT is non-zero
@@ -3543,15 +3515,16 @@ async def _handle_credit_note_posted(
     # 3. Resolve AR control account via 3-tier chain
     # ------------------------------------------------------------------
     ar_account_id = await _resolve_ar_control_account_or_raise(
-        db, org_id, company_code, payload.customerId, setup
+        db, config, company_code, payload.customerId, setup
     )
 
     # ------------------------------------------------------------------
     # 4. Validate all revenue accounts before any writes (fail fast)
     # ------------------------------------------------------------------
+    await config.preload_accounts(db, [line.revenueAccountId for line in payload.lines])
     for line in payload.lines:
         await _validate_revenue_account_or_raise(
-            db, line.revenueAccountId, line.itemCode, line.lineNumber
+            db, config, line.revenueAccountId, line.itemCode, line.lineNumber
         )
 
     # ------------------------------------------------------------------
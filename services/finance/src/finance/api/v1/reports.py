@@ -7,22 +7,29 @@ Endpoints:
   GET  /reports/trial-balance         — Standard trial balance as of a given date.
   POST /reports/ap-aging              — AP aging bucket report (frontend-orchestrated).
   GET  /reports/vendor-sub-ledger     — Per-vendor AP sub-ledger from JE lines.
+  GET  /reports/account-statement     — One GL account's lines with running balance
+                                        (streamed NDJSON / CSV).
 
 Permissions:
   All endpoints: accountant, finance_admin, auditor, admin, super_admin
 """
 
+import csv
+import io
+import json
 import logging
+import re
 from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import case, func, or_, select
+from sqlalchemy import and_, case, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db.session import get_db
+from ...db.session import get_db, get_db_context
 from ...middleware.auth import TokenPayload, require_roles
 from ...models.orm.models import (
     AccountLevelEnum,
@@ -2095,3 +2102,379 @@ async def get_cash_flow(
         reconciliationDelta=str(reconciliation_delta),
         warnings=warnings,
     ))
+
+
+# ===========================================================================
+# Account statement — line-level ledger of one GL account, streamed
+# ===========================================================================
+
+# Reason: one keyset page is the unit of memory — the stream holds at most
+# this many rows at a time however long the account's history is.
+_STATEMENT_PAGE_SIZE = 1000
+_STATEMENT_FORMATS = frozenset({"ndjson", "csv"})
+_STATEMENT_CSV_COLUMNS = (
+    "jeDate",
+    "jeNumber",
+    "lineNumber",
+    "status",
+    "sourceEventType",
+    "sourceDocNumber",
+    "description",
+    "costCenterId",
+    "debit",
+    "credit",
+    "balance",
+)
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _statement_filters(
+    organization_id: str,
+    company_code: str,
+    account_id: str,
+    include_voided: bool,
+) -> list:
+    """Predicates shared by the opening-balance SUM and every statement page."""
+    filters = [
+        JournalEntryLine.accountId == account_id,
+        JournalEntry.organizationId == organization_id,
+        JournalEntry.companyCode == company_code,
+    ]
+    if not include_voided:
+        filters.append(JournalEntry.status == JEStatusEnum.POSTED)
+    return filters
+
+
+def _after_statement_cursor(cursor: Tuple[date, str, int]) -> list:
+    """
+    Keyset predicate: strictly after (jeDate, jeNumber, lineNumber).
+
+    Reason: spelled out as OR-of-ANDs rather than a row-value comparison —
+    MySQL only turns the expanded form (plus the redundant jeDate >= bound)
+    into an index range scan on ix_je_org_company_date_number.
+    """
+    je_date, je_number, line_number = cursor
+    return [
+        JournalEntry.jeDate >= je_date,
+        or_(
+            JournalEntry.jeDate > je_date,
+            and_(JournalEntry.jeDate == je_date, JournalEntry.jeNumber > je_number),
+            and_(
+                JournalEntry.jeDate == je_date,
+                JournalEntry.jeNumber == je_number,
+                JournalEntryLine.lineNumber > line_number,
+            ),
+        ),
+    ]
+
+
+def _statement_csv_row(values: Dict[str, object]) -> List[object]:
+    """One CSV row in _STATEMENT_CSV_COLUMNS order; missing / None → empty cell."""
+    return [
+        "" if values.get(column) is None else values[column]
+        for column in _STATEMENT_CSV_COLUMNS
+    ]
+
+
+async def _iter_statement_pages(
+    db: AsyncSession,
+    filters: list,
+    from_date: Optional[date],
+    to_date: date,
+) -> AsyncIterator[list]:
+    """
+    Yield the account's lines in (jeDate, jeNumber, lineNumber) order, one
+    keyset page at a time — no OFFSET, no COUNT(*), so page 500 costs the
+    same as page 1.
+    """
+    page_size = _STATEMENT_PAGE_SIZE
+    cursor: Optional[Tuple[date, str, int]] = None
+    while True:
+        stmt = (
+            select(
+                JournalEntry.jeDate,
+                JournalEntry.jeNumber,
+                JournalEntryLine.lineNumber,
+                JournalEntry.status,
+                JournalEntry.sourceEventType,
+                JournalEntry.sourceDocNumber,
+                func.coalesce(
+                    JournalEntryLine.description, JournalEntry.description
+                ).label("description"),
+                JournalEntryLine.costCenterId,
+                JournalEntryLine.debit,
+                JournalEntryLine.credit,
+            )
+            .join(JournalEntry, JournalEntryLine.jeId == JournalEntry.jeId)
+            .where(*filters, JournalEntry.jeDate <= to_date)
+            .order_by(
+                JournalEntry.jeDate,
+                JournalEntry.jeNumber,
+                JournalEntryLine.lineNumber,
+            )
+            .limit(page_size)
+        )
+        if cursor is not None:
+            stmt = stmt.where(*_after_statement_cursor(cursor))
+        elif from_date is not None:
+            stmt = stmt.where(JournalEntry.jeDate >= from_date)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+        cursor = (last.jeDate, last.jeNumber, last.lineNumber)
+
+
+async def _stream_account_statement(
+    header: Dict[str, str],
+    filters: list,
+    from_date: Optional[date],
+    to_date: date,
+    debit_natural: bool,
+    output_format: str,
+) -> AsyncIterator[str]:
+    """
+    Render the statement as NDJSON or CSV, one chunk per keyset page.
+
+    Reason: the request session from get_db is closed by the dependency's
+    teardown before a StreamingResponse body is iterated, so the stream reads
+    through its own session. On MySQL its REPEATABLE READ transaction also
+    makes the opening balance and every page one consistent snapshot — a JE
+    posted mid-download can't shift the running balance.
+    """
+    async with get_db_context() as stream_db:
+        opening = _ZERO
+        if from_date is not None:
+            sums = (
+                await stream_db.execute(
+                    select(
+                        func.coalesce(func.sum(JournalEntryLine.debit), _ZERO),
+                        func.coalesce(func.sum(JournalEntryLine.credit), _ZERO),
+                    )
+                    .join(JournalEntry, JournalEntryLine.jeId == JournalEntry.jeId)
+                    .where(*filters, JournalEntry.jeDate < from_date)
+                )
+            ).one()
+            dr, cr = Decimal(str(sums[0])), Decimal(str(sums[1]))
+            opening = dr - cr if debit_natural else cr - dr
+
+        balance = opening
+        total_debit = _ZERO
+        total_credit = _ZERO
+        line_count = 0
+
+        if output_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(_STATEMENT_CSV_COLUMNS)
+            writer.writerow(
+                _statement_csv_row(
+                    {
+                        "jeDate": from_date.isoformat() if from_date else None,
+                        "description": "Opening balance",
+                        "balance": str(opening),
+                    }
+                )
+            )
+        else:
+            yield json.dumps(
+                {"record": "opening", **header, "openingBalance": str(opening)}
+            ) + "\n"
+
+        async for rows in _iter_statement_pages(stream_db, filters, from_date, to_date):
+            chunk: List[str] = []
+            for row in rows:
+                debit = Decimal(str(row.debit)) if row.debit is not None else None
+                credit = Decimal(str(row.credit)) if row.credit is not None else None
+                movement = (debit or _ZERO) - (credit or _ZERO)
+                balance += movement if debit_natural else -movement
+                total_debit += debit or _ZERO
+                total_credit += credit or _ZERO
+                line_count += 1
+                status_value = (
+                    row.status.value
+                    if isinstance(row.status, JEStatusEnum)
+                    else str(row.status)
+                )
+                values = {
+                    "jeDate": row.jeDate.isoformat(),
+                    "jeNumber": row.jeNumber,
+                    "lineNumber": row.lineNumber,
+                    "status": status_value,
+                    "sourceEventType": row.sourceEventType,
+                    "sourceDocNumber": row.sourceDocNumber,
+                    "description": row.description,
+                    "costCenterId": row.costCenterId,
+                    "debit": str(debit) if debit is not None else None,
+                    "credit": str(credit) if credit is not None else None,
+                    "balance": str(balance),
+                }
+                if output_format == "csv":
+                    writer.writerow(_statement_csv_row(values))
+                else:
+                    chunk.append(json.dumps({"record": "line", **values}) + "\n")
+            if output_format == "csv":
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            else:
+                yield "".join(chunk)
+
+        if output_format == "csv":
+            writer.writerow(
+                _statement_csv_row(
+                    {
+                        "jeDate": to_date.isoformat(),
+                        "description": "Closing balance",
+                        "debit": str(total_debit),
+                        "credit": str(total_credit),
+                        "balance": str(balance),
+                    }
+                )
+            )
+            yield buffer.getvalue()
+        else:
+            yield json.dumps(
+                {
+                    "record": "closing",
+                    "lineCount": line_count,
+                    "totalDebit": str(total_debit),
+                    "totalCredit": str(total_credit),
+                    "closingBalance": str(balance),
+                }
+            ) + "\n"
+
+    logger.info(
+        "[Finance/Reports] account_statement account=%s lines=%d format=%s",
+        header["accountId"],
+        line_count,
+        output_format,
+    )
+
+
+@router.get(
+    "/reports/account-statement",
+    summary="GL account statement (streamed)",
+    description=(
+        "Streams every JE line posted to one GL account between from_date and "
+        "to_date in (jeDate, jeNumber, lineNumber) order, with the opening balance "
+        "before from_date and a running balance on each line.\n\n"
+        "**format**: `ndjson` (default) — an `opening` record, one `line` record per "
+        "JE line, then a `closing` record with totals; or `csv` — a header row, an "
+        "Opening balance row, the lines, and a Closing balance row.\n\n"
+        "Balances follow the trial balance sign convention: positive = the "
+        "account's natural side (DR for asset/expense, CR otherwise). Lines are "
+        "read in keyset pages, so memory stays flat for accounts with hundreds of "
+        "thousands of lines."
+    ),
+    response_class=StreamingResponse,
+)
+async def get_account_statement(
+    organization_id: str = Query(..., description="Required — org scope"),
+    company_code: str = Query(..., description="Required — company code"),
+    account_id: str = Query(..., description="Required — GL account to report on"),
+    from_date: Optional[date] = Query(
+        None,
+        description=(
+            "First jeDate included (inclusive). Lines before it are summed into "
+            "the opening balance. Default: from the first posting (opening = 0)."
+        ),
+    ),
+    to_date: Optional[date] = Query(
+        None,
+        description="Last jeDate included (inclusive). Default: today.",
+    ),
+    include_voided: bool = Query(
+        False,
+        description="Include voided JEs (default: false).",
+    ),
+    format: str = Query("ndjson", description="Output format: ndjson | csv"),
+    db: AsyncSession = Depends(get_db),
+    _current_user: TokenPayload = Depends(require_roles(*_READ_ROLES)),
+) -> StreamingResponse:
+    """
+    Stream the line-level statement of one GL account.
+
+    Args:
+        organization_id: Owning organisation UUID.
+        company_code: Company code to scope JE headers.
+        account_id: GL account UUID (must belong to organization_id).
+        from_date: Statement start (inclusive); None = from the first posting.
+        to_date: Statement end (inclusive). Defaults to today.
+        include_voided: Whether to include voided JEs (default False).
+        format: ndjson or csv.
+        db: Async DB session (validation only — the body streams through
+            its own session).
+        _current_user: Authenticated user (any finance read role).
+
+    Returns:
+        StreamingResponse of application/x-ndjson or text/csv.
+
+    Raises:
+        HTTPException 400: Unknown format, or to_date before from_date.
+        HTTPException 403: Insufficient role (handled by require_roles).
+        HTTPException 404: Account not found in the organisation.
+    """
+    output_format = format.lower()
+    if output_format not in _STATEMENT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format '{format}'. Must be one of: csv, ndjson.",
+        )
+    effective_to: date = to_date or date.today()
+    if from_date is not None and from_date > effective_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date must be on or before to_date.",
+        )
+
+    account = await db.get(GLAccount, account_id)
+    if account is None or account.organizationId != organization_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Account '{account_id}' not found.",
+        )
+
+    account_type = account.accountType
+    if not isinstance(account_type, AccountTypeEnum):
+        account_type = AccountTypeEnum(account_type)
+
+    generated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    header = {
+        "organizationId": organization_id,
+        "companyCode": company_code,
+        "accountId": account.accountId,
+        "accountNumber": account.accountNumber,
+        "accountName": account.accountName,
+        "accountType": account_type.value,
+        "fromDate": from_date.isoformat() if from_date else None,
+        "toDate": effective_to.isoformat(),
+        "includesVoided": include_voided,
+        "generatedAt": generated_at.isoformat(),
+    }
+    body = _stream_account_statement(
+        header=header,
+        filters=_statement_filters(
+            organization_id, company_code, account.accountId, include_voided
+        ),
+        from_date=from_date,
+        to_date=effective_to,
+        debit_natural=account_type in _DEBIT_NATURAL_TYPES,
+        output_format=output_format,
+    )
+
+    if output_format == "csv":
+        filename = _UNSAFE_FILENAME_RE.sub(
+            "_",
+            f"account-statement_{account.accountNumber}_{company_code}_"
+            f"{header['fromDate'] or 'start'}_{header['toDate']}.csv",
+        )
+        return StreamingResponse(
+            body,
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+    return StreamingResponse(body, media_type="application/x-ndjson")
@@ -53,6 +53,16 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    # Statement export rendering (PDF / XLSX) — see services/render_executor.py
+    # EXPORT_RENDER_WORKERS: process pool size (0 = os.cpu_count()).
+    # EXPORT_RENDER_QUEUE_PER_WORKER: renders allowed to wait per worker
+    #   before new ones are refused with HTTP 429.
+    # EXPORT_CACHE_MAX_BYTES: rendered-file cache budget
+    #   (see services/statement_export_cache.py); 0 disables the cache.
+    EXPORT_RENDER_WORKERS: int = 0
+    EXPORT_RENDER_QUEUE_PER_WORKER: int = 4
+    EXPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
     @property
     def database_url(self) -> str:
         """Async MySQL URL for SQLAlchemy (asyncmy driver)."""
@@ -123,10 +123,12 @@ async def startup_event() -> None:
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
-    """Dispose SQLAlchemy connection pool on shutdown."""
+    """Dispose SQLAlchemy connection pool and the export render pool on shutdown."""
     from .db.session import engine
+    from .services.render_executor import render_executor
 
     await engine.dispose()
+    render_executor.shutdown()
     logger.info("Finance service stopped — DB pool disposed.")
 
 
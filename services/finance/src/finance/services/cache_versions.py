@@ -0,0 +1,134 @@
+"""
+Cache Versions
+
+Version clock and ORM-session invalidation shared by the in-process caches
+(``posting_config_cache``, ``statement_export_cache``).
+
+A cache names the rows it depends on with a ``scope_of`` callable that maps
+an ORM instance to a scope string (``"org:<organizationId>"``, ...) or None.
+Every scope has a version: the value of a per-cache clock at its last bump.
+A ``before_flush`` listener records the scopes touched by any new, dirty or
+deleted row; ``after_commit`` bumps them, so every ORM write path
+invalidates without having to remember to. A rollback discards the recorded
+scopes. ``after_begin`` records the clock a session's transaction began at,
+because a REPEATABLE READ transaction that began before a bump still sees
+the old rows.
+
+Reason: the finance service runs a single uvicorn worker (see Dockerfile),
+so one process sees every write. Running more workers would need the version
+bump moved to a shared store. Writes that bypass the ORM session (raw SQL,
+the one-off scripts/ migrations) are not seen either — restart the service
+after running one.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class ScopeVersions:
+    """
+    One cache's version clock, kept current by Session event listeners.
+
+    Args:
+        name: Cache name; prefixes the ``session.info`` keys and log lines.
+        scope_of: Maps an ORM instance to its scope, or None when the cache
+            doesn't depend on that model.
+        on_invalidate: Called with the bumped scopes after every bump, for
+            caches that evict eagerly.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        scope_of: Callable[[Any], Optional[str]],
+        on_invalidate: Optional[Callable[[Set[str]], None]] = None,
+    ) -> None:
+        self.name = name
+        self._scope_of = scope_of
+        self._on_invalidate = on_invalidate
+        self._pending_key = f"{name}_pending_scopes"
+        self._begin_key = f"{name}_begin_clock"
+        self._clock = 0
+        self._versions: Dict[str, int] = {}
+
+        event.listen(Session, "after_begin", self._record_begin)
+        event.listen(Session, "before_flush", self._collect_touched_scopes)
+        event.listen(Session, "after_commit", self._bump_committed_scopes)
+        event.listen(Session, "after_soft_rollback", self._discard_rolled_back_scopes)
+
+    # -----------------------------------------------------------------------
+    # Session listeners
+    # -----------------------------------------------------------------------
+
+    def _record_begin(
+        self, session: Session, transaction: Any, connection: Any
+    ) -> None:
+        # Reason: setdefault — a SAVEPOINT begin must not move the clock the
+        # outer transaction's snapshot was taken at.
+        session.info.setdefault(self._begin_key, self._clock)
+
+    def _collect_touched_scopes(
+        self, session: Session, flush_context: Any, instances: Any
+    ) -> None:
+        touched: Set[str] = set()
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            scope = self._scope_of(instance)
+            if scope is not None:
+                touched.add(scope)
+        if touched:
+            session.info.setdefault(self._pending_key, set()).update(touched)
+
+    def _bump_committed_scopes(self, session: Session) -> None:
+        session.info.pop(self._begin_key, None)
+        touched = session.info.pop(self._pending_key, None)
+        if touched:
+            self.invalidate(touched)
+
+    def _discard_rolled_back_scopes(
+        self, session: Session, previous_transaction: Any
+    ) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(self._begin_key, None)
+            session.info.pop(self._pending_key, None)
+
+    # -----------------------------------------------------------------------
+    # Versions
+    # -----------------------------------------------------------------------
+
+    def invalidate(self, scopes: Iterable[str]) -> None:
+        """Bump the given scopes."""
+        self._clock += 1
+        scopes = set(scopes)
+        for scope in scopes:
+            self._versions[scope] = self._clock
+        if self._on_invalidate is not None:
+            self._on_invalidate(scopes)
+        logger.debug("[Finance/%s] invalidated %s", self.name, sorted(scopes))
+
+    def version(self, scope: str) -> int:
+        """The clock value at the scope's last bump (0 if never bumped)."""
+        return self._versions.get(scope, 0)
+
+    def has_uncommitted_writes(self, db: AsyncSession) -> bool:
+        """True when ``db`` holds flushed or pending writes to any scope."""
+        if db.info.get(self._pending_key):
+            return True
+        return any(
+            self._scope_of(instance) is not None
+            for instance in (*db.new, *db.dirty, *db.deleted)
+        )
+
+    def sees(self, db: AsyncSession, version: int) -> bool:
+        """
+        True when ``db``'s transaction began at or after ``version``, or
+        hasn't begun yet (the first query starts one now, after every bump
+        so far).
+        """
+        begin_clock = db.info.get(self._begin_key)
+        return begin_clock is None or begin_clock >= version
@@ -0,0 +1,372 @@
+"""
+Posting Configuration Cache
+
+In-process cache of the configuration the posting handlers in
+``api/v1/events.py`` resolve on every event: company posting setup, GL
+accounts, purchase / sale item finance extensions, customer AR overrides,
+tax codes and open fiscal periods. A 100-line AP invoice used to cost a
+tax-code SELECT per distinct code, a GR posting one ext SELECT per line and a
+delivery two SELECTs per line; the same rows were read again for the next
+event. A handler now takes one snapshot per event, preloads every line's
+rows with one ``IN`` query per table and resolves the lines from memory.
+
+Scopes and versions:
+  - ``org:<organizationId>``  → one ``PostingConfigSnapshot`` (setup, accounts,
+    item exts, customer AR overrides, tax codes)
+  - ``company:<companyCode>`` → the company's open fiscal periods
+
+Versions are kept by ``cache_versions.ScopeVersions``: a commit touching a
+config row bumps its scope and drops the scope's cached entries, so every
+ORM write path (master_data, accounts, item_ext, customer_ext, tax_codes,
+periods, company posting setup and the ``purchase_item_changed`` event
+itself) invalidates without having to remember to. See that module for the
+session listeners and the single-worker assumption.
+
+A snapshot is only shared when it can't be stale:
+  - the session has no uncommitted config writes of its own, and
+  - the session's transaction began after the scope's last bump (a
+    REPEATABLE READ transaction that began earlier still sees the old rows).
+Otherwise the caller gets a private snapshot — memoised for the event,
+never published. A shared snapshot evicted while a handler still holds it is
+simply orphaned; nothing hands it out again.
+
+Cached rows are detached read-only copies (``SimpleNamespace``), never ORM
+instances, so they can outlive the session that loaded them.
+"""
+
+import logging
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import inspect as sa_inspect, select
+from sqlalchemy.exc import MultipleResultsFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.orm.models import (
+    CompanyPostingSetup,
+    CustomerFinanceExt,
+    FiscalPeriod,
+    GLAccount,
+    PeriodStatusEnum,
+    PurchaseItemFinanceExt,
+    SaleItemFinanceExt,
+    TaxCode,
+)
+from .cache_versions import ScopeVersions
+
+logger = logging.getLogger(__name__)
+
+# Reason: comfortably below SQLite's 999 bound-parameter limit and MySQL's
+# packet size, so a 1,000-line event preloads in a handful of queries.
+_IN_CHUNK = 500
+
+_ORG_SCOPED = (
+    CompanyPostingSetup,
+    CustomerFinanceExt,
+    GLAccount,
+    PurchaseItemFinanceExt,
+    SaleItemFinanceExt,
+    TaxCode,
+)
+
+_org_snapshots: Dict[str, "PostingConfigSnapshot"] = {}
+_open_periods: Dict[str, Tuple[SimpleNamespace, ...]] = {}
+
+
+def _org_scope(organization_id: str) -> str:
+    return f"org:{organization_id}"
+
+
+def _company_scope(company_code: str) -> str:
+    return f"company:{company_code}"
+
+
+def _scope_of(instance: Any) -> Optional[str]:
+    """The cache scope a config row belongs to, or None for other models."""
+    if isinstance(instance, _ORG_SCOPED):
+        return _org_scope(instance.organizationId) if instance.organizationId else None
+    if isinstance(instance, FiscalPeriod):
+        return _company_scope(instance.companyCode) if instance.companyCode else None
+    return None
+
+
+def _frozen(row: Any) -> SimpleNamespace:
+    """Detached read-only copy of an ORM row's column attributes."""
+    mapper = sa_inspect(row).mapper
+    return SimpleNamespace(
+        **{attr.key: getattr(row, attr.key) for attr in mapper.column_attrs}
+    )
+
+
+def _chunks(values: List[str]) -> Iterable[List[str]]:
+    for i in range(0, len(values), _IN_CHUNK):
+        yield values[i : i + _IN_CHUNK]
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+
+def _evict(scopes: Set[str]) -> None:
+    for scope in scopes:
+        kind, _, key = scope.partition(":")
+        if kind == "org":
+            _org_snapshots.pop(key, None)
+        elif kind == "company":
+            _open_periods.pop(key, None)
+
+
+_scopes = ScopeVersions("posting_config", _scope_of, on_invalidate=_evict)
+
+
+def invalidate(scopes: Iterable[str]) -> None:
+    """Bump the given scopes and drop their cached entries."""
+    _scopes.invalidate(scopes)
+
+
+def clear() -> None:
+    """Drop every cached entry (test isolation, benchmark cold start)."""
+    _org_snapshots.clear()
+    _open_periods.clear()
+
+
+def _shareable(db: AsyncSession, scope: str) -> bool:
+    """True when entries loaded through ``db`` are safe to publish for ``scope``."""
+    if _scopes.has_uncommitted_writes(db):
+        return False
+    return _scopes.sees(db, _scopes.version(scope))
+
+
+# ---------------------------------------------------------------------------
+# Per-organisation snapshot
+# ---------------------------------------------------------------------------
+
+
+class PostingConfigSnapshot:
+    """
+    One organisation's posting configuration, filled lazily.
+
+    Lookups that miss load from ``db`` and memoise the result, negative
+    results included for org-scoped lookups. ``preload_*`` batch the misses
+    for a whole event's lines into one ``IN`` query per table.
+    """
+
+    def __init__(self, organization_id: str, shared: bool) -> None:
+        self.organization_id = organization_id
+        self.shared = shared
+        self._setups: Dict[str, Optional[SimpleNamespace]] = {}
+        self._accounts: Dict[str, SimpleNamespace] = {}
+        self._accounts_by_number: Dict[str, Optional[SimpleNamespace]] = {}
+        self._purchase_item_exts: Dict[str, Optional[SimpleNamespace]] = {}
+        self._sale_item_exts: Dict[str, Optional[SimpleNamespace]] = {}
+        self._customer_ar: Dict[str, Optional[str]] = {}
+        self._tax_codes: Dict[str, Optional[SimpleNamespace]] = {}
+
+    async def posting_setup(
+        self, db: AsyncSession, company_code: str
+    ) -> Optional[SimpleNamespace]:
+        if company_code not in self._setups:
+            result = await db.execute(
+                select(CompanyPostingSetup).where(
+                    CompanyPostingSetup.organizationId == self.organization_id,
+                    CompanyPostingSetup.companyCode == company_code,
+                )
+            )
+            row = result.scalar_one_or_none()
+            self._setups[company_code] = _frozen(row) if row is not None else None
+        return self._setups[company_code]
+
+    async def preload_accounts(
+        self, db: AsyncSession, account_ids: Iterable[Optional[str]]
+    ) -> Dict[str, SimpleNamespace]:
+        """
+        Load the accounts not yet memoised and return every row found, in
+        any organisation.
+
+        Only this org's rows are memoised — a write to another org's account
+        bumps that org, not this snapshot. Misses are not memoised either:
+        an account id can't be known to be missing without knowing which
+        org will create it.
+        """
+        missing = sorted({a for a in account_ids if a and a not in self._accounts})
+        found: Dict[str, SimpleNamespace] = {}
+        for chunk in _chunks(missing):
+            result = await db.execute(
+                select(GLAccount).where(GLAccount.accountId.in_(chunk))
+            )
+            for row in result.scalars():
+                found[row.accountId] = _frozen(row)
+                if row.organizationId == self.organization_id:
+                    self._accounts[row.accountId] = found[row.accountId]
+        return found
+
+    async def gl_account(
+        self, db: AsyncSession, account_id: str
+    ) -> Optional[SimpleNamespace]:
+        """
+        GL account by id, in any organisation (matching the unscoped lookups
+        the handlers have always done; callers that need the org checked do
+        so on ``organizationId``). Another org's account is read on every
+        call rather than memoised.
+        """
+        if account_id in self._accounts:
+            return self._accounts[account_id]
+        return (await self.preload_accounts(db, [account_id])).get(account_id)
+
+    async def gl_account_by_number(
+        self, db: AsyncSession, account_number: str
+    ) -> Optional[SimpleNamespace]:
+        if account_number not in self._accounts_by_number:
+            result = await db.execute(
+                select(GLAccount).where(
+                    GLAccount.organizationId == self.organization_id,
+                    GLAccount.accountNumber == account_number,
+                )
+            )
+            row = result.scalar_one_or_none()
+            self._accounts_by_number[account_number] = (
+                _frozen(row) if row is not None else None
+            )
+        return self._accounts_by_number[account_number]
+
+    async def preload_purchase_item_exts(
+        self, db: AsyncSession, item_ids: Iterable[str]
+    ) -> None:
+        await self._preload_item_exts(
+            db, PurchaseItemFinanceExt, self._purchase_item_exts, item_ids
+        )
+
+    async def purchase_item_ext(
+        self, db: AsyncSession, item_id: str
+    ) -> Optional[SimpleNamespace]:
+        await self.preload_purchase_item_exts(db, [item_id])
+        return self._purchase_item_exts[item_id]
+
+    async def preload_sale_item_exts(
+        self, db: AsyncSession, item_ids: Iterable[str]
+    ) -> None:
+        await self._preload_item_exts(
+            db, SaleItemFinanceExt, self._sale_item_exts, item_ids
+        )
+
+    async def sale_item_ext(
+        self, db: AsyncSession, item_id: str
+    ) -> Optional[SimpleNamespace]:
+        await self.preload_sale_item_exts(db, [item_id])
+        return self._sale_item_exts[item_id]
+
+    async def _preload_item_exts(
+        self,
+        db: AsyncSession,
+        model: Any,
+        memo: Dict[str, Optional[SimpleNamespace]],
+        item_ids: Iterable[str],
+    ) -> None:
+        missing = sorted({i for i in item_ids if i not in memo})
+        for chunk in _chunks(missing):
+            result = await db.execute(
+                select(model).where(
+                    model.organizationId == self.organization_id,
+                    model.itemId.in_(chunk),
+                )
+            )
+            found = {row.itemId: _frozen(row) for row in result.scalars()}
+            for item_id in chunk:
+                memo[item_id] = found.get(item_id)
+
+    async def customer_ar_override(
+        self, db: AsyncSession, customer_id: str
+    ) -> Optional[str]:
+        if customer_id not in self._customer_ar:
+            result = await db.execute(
+                select(CustomerFinanceExt.arControlAccountId).where(
+                    CustomerFinanceExt.organizationId == self.organization_id,
+                    CustomerFinanceExt.customerId == customer_id,
+                )
+            )
+            self._customer_ar[customer_id] = result.scalar_one_or_none()
+        return self._customer_ar[customer_id]
+
+    async def preload_tax_codes(
+        self, db: AsyncSession, tax_codes: Iterable[Optional[str]]
+    ) -> None:
+        missing = sorted({c for c in tax_codes if c and c not in self._tax_codes})
+        for chunk in _chunks(missing):
+            result = await db.execute(
+                select(TaxCode).where(
+                    TaxCode.organizationId == self.organization_id,
+                    TaxCode.taxCode.in_(chunk),
+                )
+            )
+            found = {row.taxCode: _frozen(row) for row in result.scalars()}
+            for code in chunk:
+                self._tax_codes[code] = found.get(code)
+
+    async def tax_code(
+        self, db: AsyncSession, tax_code: str
+    ) -> Optional[SimpleNamespace]:
+        await self.preload_tax_codes(db, [tax_code])
+        return self._tax_codes[tax_code]
+
+
+def org_snapshot(db: AsyncSession, organization_id: str) -> PostingConfigSnapshot:
+    """
+    The posting configuration snapshot to resolve one event against.
+
+    Shared across events while nothing in the org changes; private to the
+    caller when ``db`` can't safely publish what it reads (see module doc).
+    """
+    scope = _org_scope(organization_id)
+    if not _shareable(db, scope):
+        return PostingConfigSnapshot(organization_id, shared=False)
+    snapshot = _org_snapshots.get(organization_id)
+    if snapshot is None:
+        snapshot = PostingConfigSnapshot(organization_id, shared=True)
+        _org_snapshots[organization_id] = snapshot
+    return snapshot
+
+
+async def open_fiscal_periods(
+    db: AsyncSession, company_code: str
+) -> Tuple[SimpleNamespace, ...]:
+    """Every open fiscal period of a company (periodId, startDate, endDate)."""
+    scope = _company_scope(company_code)
+    shareable = _shareable(db, scope)
+    if shareable and company_code in _open_periods:
+        return _open_periods[company_code]
+    result = await db.execute(
+        select(FiscalPeriod.periodId, FiscalPeriod.startDate, FiscalPeriod.endDate)
+        .where(
+            FiscalPeriod.companyCode == company_code,
+            FiscalPeriod.status == PeriodStatusEnum.OPEN,
+        )
+        .order_by(FiscalPeriod.startDate)
+    )
+    periods = tuple(
+        SimpleNamespace(periodId=p.periodId, startDate=p.startDate, endDate=p.endDate)
+        for p in result.all()
+    )
+    # Reason: re-checked after the await — a commit that landed while the
+    # query ran may have bumped the scope this read predates.
+    if shareable and _shareable(db, scope):
+        _open_periods[company_code] = periods
+    return periods
+
+
+def open_period_covering(
+    periods: Tuple[SimpleNamespace, ...], on: date
+) -> Optional[SimpleNamespace]:
+    """
+    The period among ``periods`` whose range includes ``on``, or None.
+
+    Raises:
+        MultipleResultsFound: If periods overlap — as the SELECT it replaces did.
+    """
+    covering = [p for p in periods if p.startDate <= on <= p.endDate]
+    if len(covering) > 1:
+        raise MultipleResultsFound(
+            f"{len(covering)} open fiscal periods cover {on.isoformat()}"
+        )
+    return covering[0] if covering else None
@@ -0,0 +1,124 @@
+"""
+Statement Render Executor
+
+Building a statement workbook (openpyxl) or PDF (Jinja2 + WeasyPrint) is
+pure CPU — hundreds of milliseconds to seconds for a large chart of
+accounts. Run on the event loop, a month-end board pack stalls every other
+request the finance service is serving, so ``api/v1/export.py`` hands the
+rendering to this process pool (``EXPORT_RENDER_WORKERS``, 0 =
+``os.cpu_count()``) and keeps only the database work on the loop.
+
+Admission control
+-----------------
+At most ``EXPORT_RENDER_QUEUE_PER_WORKER`` renders may wait per worker
+behind the ones running. Past that the pool is saturated and new work is
+refused with ``RenderPoolSaturated`` — an HTTP 429 with ``Retry-After`` —
+rather than queueing downloads whose clients would time out first.
+
+The pool is created lazily on first use with the ``spawn`` start method (the
+parent runs the SQLAlchemy engine's threads, which ``fork`` must not copy)
+and is closed by the application's shutdown hook. Work submitted here must
+be a module-level function so it pickles by reference.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RenderPoolSaturated(HTTPException):
+    """The render pool's queue is full; the download should be retried."""
+
+    def __init__(self, retry_after: int = 2) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many statement exports in progress. Please retry shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class RenderExecutor:
+    """Bounded, lazily created process pool for statement rendering."""
+
+    def __init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._in_flight = 0
+        self._rejected = 0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._workers = max(
+                1, settings.EXPORT_RENDER_WORKERS or os.cpu_count() or 1
+            )
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(
+                "[Finance/Export] render pool started with %d worker(s)",
+                self._workers,
+            )
+        return self._pool
+
+    @property
+    def workers(self) -> int:
+        """Pool size (starts the pool if it isn't running yet)."""
+        self._ensure_pool()
+        return self._workers
+
+    @property
+    def capacity(self) -> int:
+        """Renders admitted at once: one running per worker plus its queue."""
+        return self._workers * (1 + max(0, settings.EXPORT_RENDER_QUEUE_PER_WORKER))
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``func(*args)`` in the pool.
+
+        Raises:
+            RenderPoolSaturated: If ``capacity`` renders are already admitted.
+        """
+        pool = self._ensure_pool()
+        if self._in_flight >= self.capacity:
+            self._rejected += 1
+            raise RenderPoolSaturated()
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM-killed, ...): replace the pool and retry once
+                logger.error("[Finance/Export] render pool broken; restarting it")
+                self.shutdown(wait=False)
+                return await loop.run_in_executor(self._ensure_pool(), func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self._workers,
+            "capacity": self.capacity,
+            "inFlight": self._in_flight,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._pool = None
+
+
+render_executor = RenderExecutor()
@@ -0,0 +1,163 @@
+"""
+Statement Export Cache
+
+In-process cache of rendered statement files (PDF / XLSX) served by
+``api/v1/export.py``. A board pack re-downloaded during month-end close
+used to recompute and re-render every statement on every click; the file
+is now rendered once per ledger version and repeat downloads are a
+dictionary lookup until new postings land.
+
+Ledger versions
+---------------
+A statement depends on two version scopes:
+  - ``ledger:<companyCode>`` — the company's journal entries (postings,
+    reversals, voids) and its CompanyCode row (fiscal-year start);
+  - ``org:<organizationId>`` — the org's chart of accounts (names,
+    drawers, cash-flow categories, hierarchy).
+A statement's ledger version is the newer of its company's and org's.
+Versions are kept by ``cache_versions.ScopeVersions``: a commit touching a
+JournalEntry / CompanyCode / GLAccount row bumps its scope (see that module
+for the session listeners and the single-worker assumption). Journal entry
+lines are only ever written together with their header, so the header is
+what is tracked.
+
+Entries are keyed by the export's parameters and hold the ledger version
+they were rendered at; a lookup with a newer version is a miss and drops
+the entry. A render is only stored when it can't be stale: the session had
+no uncommitted ledger writes of its own, its transaction began after the
+version was taken, and no bump landed while it was rendering.
+
+The cache is bounded by ``EXPORT_CACHE_MAX_BYTES`` and evicts least
+recently used files first.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.orm.models import CompanyCode, GLAccount, JournalEntry
+from .cache_versions import ScopeVersions
+
+logger = logging.getLogger(__name__)
+
+class CachedExport(NamedTuple):
+    """A rendered statement file and the ledger version it reflects."""
+
+    version: int
+    content: bytes
+    filename: str
+
+
+_entries: "OrderedDict[Hashable, CachedExport]" = OrderedDict()
+_size = 0
+
+
+def _ledger_scope(company_code: str) -> str:
+    return f"ledger:{company_code}"
+
+
+def _org_scope(organization_id: str) -> str:
+    return f"org:{organization_id}"
+
+
+def _scope_of(instance: Any) -> Optional[str]:
+    """The version scope a row belongs to, or None for other models."""
+    if isinstance(instance, (JournalEntry, CompanyCode)):
+        return _ledger_scope(instance.companyCode) if instance.companyCode else None
+    if isinstance(instance, GLAccount):
+        return _org_scope(instance.organizationId) if instance.organizationId else None
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+_scopes = ScopeVersions("statement_export", _scope_of)
+
+
+def invalidate(scopes: Iterable[str]) -> None:
+    """
+    Bump the given scopes. Entries rendered at an older version are dropped
+    lazily, on their next lookup or by LRU eviction.
+    """
+    _scopes.invalidate(scopes)
+
+
+def clear() -> None:
+    """Drop every cached file (test isolation)."""
+    global _size
+    _entries.clear()
+    _size = 0
+
+
+# ---------------------------------------------------------------------------
+# Lookup / store
+# ---------------------------------------------------------------------------
+
+
+def ledger_version(
+    db: AsyncSession, organization_id: str, company_code: str
+) -> Optional[int]:
+    """
+    The ledger version a statement computed through ``db`` would reflect, or
+    None when ``db`` can't produce a cacheable render (it holds uncommitted
+    ledger writes, or its transaction began before the latest bump).
+    """
+    if _scopes.has_uncommitted_writes(db):
+        return None
+    version = max(
+        _scopes.version(_ledger_scope(company_code)),
+        _scopes.version(_org_scope(organization_id)),
+    )
+    if not _scopes.sees(db, version):
+        return None
+    return version
+
+
+def get(key: Hashable, version: Optional[int]) -> Optional[CachedExport]:
+    """The file cached under ``key`` if it was rendered at ``version``."""
+    global _size
+    if version is None:
+        return None
+    cached = _entries.get(key)
+    if cached is None:
+        return None
+    if cached.version != version:
+        del _entries[key]
+        _size -= len(cached.content)
+        return None
+    _entries.move_to_end(key)
+    return cached
+
+
+def put(
+    db: AsyncSession,
+    key: Hashable,
+    version: Optional[int],
+    organization_id: str,
+    company_code: str,
+    content: bytes,
+    filename: str,
+) -> None:
+    """
+    Cache a rendered file under ``key`` at ``version`` — unless a posting
+    landed while it was computed, or the file alone exceeds the budget.
+    """
+    global _size
+    budget = settings.EXPORT_CACHE_MAX_BYTES
+    if version is None or len(content) > budget:
+        return
+    if ledger_version(db, organization_id, company_code) != version:
+        return
+    previous = _entries.pop(key, None)
+    if previous is not None:
+        _size -= len(previous.content)
+    _entries[key] = CachedExport(version, content, filename)
+    _size += len(content)
+    while _size > budget:
+        _, evicted = _entries.popitem(last=False)
+        _size -= len(evicted.content)
@@ -0,0 +1,326 @@
+"""
+Tests for the streamed GL account statement.
+
+GET /api/v1/finance/reports/account-statement
+
+Coverage:
+  - NDJSON: opening balance sums the lines before from_date, lines come in
+    (jeDate, jeNumber, lineNumber) order with a running balance, the closing
+    record carries the totals; voided JEs are excluded by default.
+  - Credit-natural account (liability) → balances positive on the CR side.
+  - Keyset paging: a page size smaller than the history streams every line
+    exactly once, in order.
+  - CSV: header row, Opening / Closing balance rows, attachment filename.
+  - Account from another org → 404; unknown format → 400.
+
+The stream reads through its own session, so every test commits its seed data
+under a fresh org and company.
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from finance.api.v1 import reports
+from finance.models.orm.models import (
+    AccountLevelEnum,
+    AccountTypeEnum,
+    CompanyCode,
+    DrawerEnum,
+    FiscalPeriod,
+    GLAccount,
+    JEStatusEnum,
+    JournalEntry,
+    JournalEntryLine,
+    PeriodStatusEnum,
+)
+from tests.conftest import auth_headers
+
+_URL = "/api/v1/finance/reports/account-statement"
+
+
+async def _seed_ledger(
+    db_session: AsyncSession,
+    entries: List[
+        Tuple[str, str, List[Tuple[str, Optional[str], Optional[str]]], JEStatusEnum]
+    ],
+) -> Dict[str, Any]:
+    """
+    Seed a company with a bank (asset) and AP (liability) account and commit
+    the given JEs.
+
+    Args:
+        entries: (jeDate, jeNumber, [(account role, debit, credit), ...], status).
+            Line numbers follow list order starting at 1.
+    """
+    org = str(uuid.uuid4())
+    company_code = f"AS{uuid.uuid4().hex[:6].upper()}"
+    db_session.add(
+        CompanyCode(companyCode=company_code, organizationId=org, legalName="Stmt Co")
+    )
+    accounts = {}
+    for role, number, drawer, account_type in (
+        ("bank", "111000-001", DrawerEnum.ASSETS, AccountTypeEnum.ASSET),
+        ("ap", "221000-001", DrawerEnum.LIABILITIES, AccountTypeEnum.LIABILITY),
+    ):
+        account = GLAccount(
+            accountId=str(uuid.uuid4()),
+            organizationId=org,
+            accountNumber=number,
+            accountName=f"Stmt {role}",
+            drawer=drawer,
+            accountType=account_type,
+            accountLevel=AccountLevelEnum.ACTIVE,
+        )
+        db_session.add(account)
+        accounts[role] = account.accountId
+    period = FiscalPeriod(
+        periodId=str(uuid.uuid4()),
+        companyCode=company_code,
+        fiscalYear=2026,
+        periodNumber=1,
+        startDate=date(2026, 1, 1),
+        endDate=date(2026, 12, 31),
+        status=PeriodStatusEnum.OPEN,
+    )
+    db_session.add(period)
+    await db_session.flush()
+
+    for je_date, je_number, lines, je_status in entries:
+        total = sum(Decimal(debit) for _, debit, _ in lines if debit)
+        je = JournalEntry(
+            jeId=str(uuid.uuid4()),
+            organizationId=org,
+            companyCode=company_code,
+            jeNumber=f"JE-{company_code}-{je_number}",
+            jeDate=date.fromisoformat(je_date),
+            periodId=period.periodId,
+            sourceEventType="manual_je",
+            sourceEventId=str(uuid.uuid4()),
+            sourceDocNumber=je_number,
+            description=f"Entry {je_number}",
+            totalDebit=total,
+            totalCredit=total,
+            status=je_status,
+            postedAt=datetime(2026, 1, 1),
+            postedBy="test",
+        )
+        db_session.add(je)
+        for n, (role, debit, credit) in enumerate(lines, start=1):
+            db_session.add(
+                JournalEntryLine(
+                    jeLineId=str(uuid.uuid4()),
+                    jeId=je.jeId,
+                    lineNumber=n,
+                    accountId=accounts[role],
+                    debit=Decimal(debit) if debit else None,
+                    credit=Decimal(credit) if credit else None,
+                )
+            )
+    await db_session.commit()
+    return {"org": org, "company": company_code, **accounts}
+
+
+def _ndjson(text: str) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in text.splitlines() if line]
+
+
+_LEDGER = [
+    # Before the statement window — only feeds the opening balance.
+    (
+        "2026-01-10",
+        "0001",
+        [("bank", "1000.00", None), ("ap", None, "1000.00")],
+        JEStatusEnum.POSTED,
+    ),
+    # Inside the window, deliberately seeded out of order.
+    (
+        "2026-02-05",
+        "0004",
+        [("bank", None, "300.00"), ("ap", "300.00", None)],
+        JEStatusEnum.POSTED,
+    ),
+    (
+        "2026-02-01",
+        "0003",
+        [("bank", "50.00", None), ("bank", "25.00", None), ("ap", None, "75.00")],
+        JEStatusEnum.POSTED,
+    ),
+    (
+        "2026-02-01",
+        "0002",
+        [("bank", "200.00", None), ("ap", None, "200.00")],
+        JEStatusEnum.POSTED,
+    ),
+    # Voided — excluded unless include_voided.
+    (
+        "2026-02-03",
+        "0005",
+        [("bank", "999.00", None), ("ap", None, "999.00")],
+        JEStatusEnum.VOID,
+    ),
+]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_statement_opening_running_and_closing(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed_ledger(db_session, _LEDGER)
+
+    resp = await client.get(
+        _URL,
+        params={
+            "organization_id": seed["org"],
+            "company_code": seed["company"],
+            "account_id": seed["bank"],
+            "from_date": "2026-02-01",
+            "to_date": "2026-02-28",
+        },
+        headers=auth_headers("auditor"),
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = _ndjson(resp.text)
+
+    opening, *lines, closing = records
+    assert opening["record"] == "opening"
+    assert opening["openingBalance"] == "1000.00"
+    assert [(l["jeDate"], l["jeNumber"][-4:], l["lineNumber"]) for l in lines] == [
+        ("2026-02-01", "0002", 1),
+        ("2026-02-01", "0003", 1),
+        ("2026-02-01", "0003", 2),
+        ("2026-02-05", "0004", 1),
+    ]
+    assert [l["balance"] for l in lines] == ["1200.00", "1250.00", "1275.00", "975.00"]
+    assert lines[0]["description"] == "Entry 0002"
+    assert closing == {
+        "record": "closing",
+        "lineCount": 4,
+        "totalDebit": "275.00",
+        "totalCredit": "300.00",
+        "closingBalance": "975.00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_credit_natural_account_and_include_voided(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed_ledger(db_session, _LEDGER)
+
+    resp = await client.get(
+        _URL,
+        params={
+            "organization_id": seed["org"],
+            "company_code": seed["company"],
+            "account_id": seed["ap"],
+            "to_date": "2026-02-28",
+            "include_voided": "true",
+        },
+        headers=auth_headers(),
+    )
+    assert resp.status_code == 200, resp.text
+    opening, *lines, closing = _ndjson(resp.text)
+    assert opening["openingBalance"] == "0"
+    assert opening["fromDate"] is None
+    assert len(lines) == 5
+    assert "void" in {l["status"] for l in lines}
+    # 1000 + 200 + 75 + 999 (void) - 300 on the CR-natural side
+    assert closing["closingBalance"] == "1974.00"
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_stream_every_line_once(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ledger = [
+        (
+            f"2026-03-{day:02d}",
+            f"{day:04d}",
+            [("bank", "10.00", None), ("bank", "1.00", None), ("ap", None, "11.00")],
+            JEStatusEnum.POSTED,
+        )
+        for day in range(1, 8)
+    ]
+    seed = await _seed_ledger(db_session, ledger)
+    monkeypatch.setattr(reports, "_STATEMENT_PAGE_SIZE", 3)
+
+    resp = await client.get(
+        _URL,
+        params={
+            "organization_id": seed["org"],
+            "company_code": seed["company"],
+            "account_id": seed["bank"],
+            "to_date": "2026-03-31",
+        },
+        headers=auth_headers(),
+    )
+    assert resp.status_code == 200, resp.text
+    _, *lines, closing = _ndjson(resp.text)
+    keys = [(l["jeNumber"][-4:], l["lineNumber"]) for l in lines]
+    assert keys == [(f"{day:04d}", n) for day in range(1, 8) for n in (1, 2)]
+    assert closing["closingBalance"] == "77.00"
+
+
+@pytest.mark.asyncio
+async def test_csv_statement(client: AsyncClient, db_session: AsyncSession) -> None:
+    seed = await _seed_ledger(db_session, _LEDGER)
+
+    resp = await client.get(
+        _URL,
+        params={
+            "organization_id": seed["org"],
+            "company_code": seed["company"],
+            "account_id": seed["bank"],
+            "from_date": "2026-02-01",
+            "to_date": "2026-02-28",
+            "format": "csv",
+        },
+        headers=auth_headers(),
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert (
+        f"account-statement_111000-001_{seed['company']}_2026-02-01_2026-02-28.csv"
+        in resp.headers["content-disposition"]
+    )
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert rows[0]["description"] == "Opening balance"
+    assert rows[0]["balance"] == "1000.00"
+    assert [r["balance"] for r in rows[1:-1]] == [
+        "1200.00",
+        "1250.00",
+        "1275.00",
+        "975.00",
+    ]
+    assert rows[-1]["description"] == "Closing balance"
+    assert (rows[-1]["debit"], rows[-1]["credit"]) == ("275.00", "300.00")
+
+
+@pytest.mark.asyncio
+async def test_foreign_account_404_and_bad_format_400(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed_ledger(db_session, _LEDGER[:1])
+    params = {
+        "organization_id": str(uuid.uuid4()),
+        "company_code": seed["company"],
+        "account_id": seed["bank"],
+    }
+    resp = await client.get(_URL, params=params, headers=auth_headers())
+    assert resp.status_code == 404
+
+    params["organization_id"] = seed["org"]
+    resp = await client.get(
+        _URL, params={**params, "format": "xml"}, headers=auth_headers()
+    )
+    assert resp.status_code == 400
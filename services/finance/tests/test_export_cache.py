@@ -0,0 +1,220 @@
+"""
+Tests for off-loop, cached statement export rendering and the batch export.
+
+Coverage:
+  - A repeat download is served from the export cache: same bytes, no
+    journal entry SELECTs.
+  - A committed posting for the company bumps its ledger version — the next
+    download is recomputed and reflects it.
+  - POST /reports/export/batch returns one zip with a file per item
+    (duplicate filenames suffixed), and reuses cached files.
+  - An invalid batch item → 400 before anything is computed.
+  - Saturated render pool → 429 with Retry-After.
+
+Seed data and the ``seeded`` fixture come from test_export.py; every test
+gets its own org and company, so cached files can't leak between tests.
+"""
+
+import io
+import zipfile
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterator, List
+
+import openpyxl
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from finance.db.session import engine
+from finance.services.render_executor import render_executor
+
+from .conftest import auth_headers
+from .test_export import _post_je, seeded  # noqa: F401  (fixture)
+
+_EXPORT_URL = "/api/v1/finance/reports/export"
+
+
+@contextmanager
+def _ledger_selects() -> Iterator[List[str]]:
+    """Collect the SELECTs against journal entries run inside the block."""
+    statements: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        lowered = statement.lower()
+        if lowered.lstrip().startswith("select") and "journal_entr" in lowered:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+def _bs_params(seeded) -> dict:
+    return {
+        "format": "xlsx",
+        "organization_id": seeded["org_id"],
+        "company_code": seeded["company_code"],
+        "as_of_date": "2026-12-31",
+    }
+
+
+def _cash_balance(content: bytes) -> str:
+    ws = openpyxl.load_workbook(io.BytesIO(content)).active
+    for label, balance, *_ in ws.iter_rows(values_only=True):
+        if isinstance(label, str) and label.strip() == "Cash":
+            return str(balance)
+    raise AssertionError("Cash row not found")
+
+
+@pytest.mark.asyncio
+async def test_repeat_download_served_from_cache(client: AsyncClient, seeded) -> None:
+    resp = await client.get(
+        f"{_EXPORT_URL}/balance-sheet",
+        params=_bs_params(seeded),
+        headers=auth_headers(),
+    )
+    assert resp.status_code == 200, resp.text
+
+    with _ledger_selects() as statements:
+        repeat = await client.get(
+            f"{_EXPORT_URL}/balance-sheet",
+            params=_bs_params(seeded),
+            headers=auth_headers(),
+        )
+    assert repeat.status_code == 200, repeat.text
+    assert statements == []
+    assert repeat.content == resp.content
+    assert repeat.headers["content-disposition"] == resp.headers["content-disposition"]
+
+
+@pytest.mark.asyncio
+async def test_new_posting_invalidates_cached_file(
+    client: AsyncClient, db_session, seeded
+) -> None:
+    first = await client.get(
+        f"{_EXPORT_URL}/balance-sheet",
+        params=_bs_params(seeded),
+        headers=auth_headers(),
+    )
+    assert first.status_code == 200, first.text
+
+    ids = seeded["ids"]
+    await _post_je(
+        db_session,
+        seeded["org_id"],
+        seeded["company_code"],
+        lines=[(ids["cash"], "500", "0"), (ids["sc"], "0", "500")],
+        je_date=date(2026, 6, 1),
+        period_id=ids["period_id"],
+    )
+
+    with _ledger_selects() as statements:
+        second = await client.get(
+            f"{_EXPORT_URL}/balance-sheet",
+            params=_bs_params(seeded),
+            headers=auth_headers(),
+        )
+    assert second.status_code == 200, second.text
+    assert statements, "the statement must be recomputed after a posting"
+    assert _cash_balance(first.content) != _cash_balance(second.content)
+
+
+@pytest.mark.asyncio
+async def test_batch_export_zips_every_statement(client: AsyncClient, seeded) -> None:
+    company = seeded["company_code"]
+    body = {
+        "organizationId": seeded["org_id"],
+        "format": "xlsx",
+        "items": [
+            {
+                "statement": "balance-sheet",
+                "companyCode": company,
+                "asOfDate": "2026-12-31",
+            },
+            {
+                "statement": "income-statement",
+                "companyCode": company,
+                "periodStart": "2026-01-01",
+                "periodEnd": "2026-12-31",
+            },
+            {
+                "statement": "cash-flow",
+                "companyCode": company,
+                "periodStart": "2026-01-01",
+                "periodEnd": "2026-12-31",
+            },
+            # Same file name as the first item — only the voided flag differs.
+            {
+                "statement": "balance-sheet",
+                "companyCode": company,
+                "asOfDate": "2026-12-31",
+                "includeVoided": True,
+            },
+        ],
+    }
+    # Warm the cache for the first item; the batch must reuse it.
+    single = await client.get(
+        f"{_EXPORT_URL}/balance-sheet",
+        params=_bs_params(seeded),
+        headers=auth_headers(),
+    )
+    assert single.status_code == 200, single.text
+
+    resp = await client.post(f"{_EXPORT_URL}/batch", json=body, headers=auth_headers())
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"] == "application/zip"
+    assert ".zip" in resp.headers["content-disposition"]
+
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as archive:
+        names = archive.namelist()
+        assert names == [
+            f"balance-sheet_2026-12-31_{company}.xlsx",
+            f"income-statement_2026-01-01_2026-12-31_{company}.xlsx",
+            f"cash-flow_2026-01-01_2026-12-31_{company}.xlsx",
+            f"balance-sheet_2026-12-31_{company}_2.xlsx",
+        ]
+        assert archive.read(names[0]) == single.content
+        titles = [
+            openpyxl.load_workbook(io.BytesIO(archive.read(n)))
+            .active.cell(row=3, column=1)
+            .value
+            for n in names
+        ]
+    assert titles[0] == "Balance Sheet"
+    assert titles[1] == "Income Statement"
+
+
+@pytest.mark.asyncio
+async def test_batch_invalid_item_returns_400(client: AsyncClient, seeded) -> None:
+    body = {
+        "organizationId": seeded["org_id"],
+        "format": "xlsx",
+        "items": [
+            {"statement": "balance-sheet", "companyCode": seeded["company_code"]},
+            {"statement": "cash-flow", "companyCode": seeded["company_code"]},
+        ],
+    }
+    with _ledger_selects() as statements:
+        resp = await client.post(
+            f"{_EXPORT_URL}/batch", json=body, headers=auth_headers()
+        )
+    assert resp.status_code == 400
+    assert "period_start and period_end" in resp.json()["detail"]
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_saturated_render_pool_returns_429(
+    client: AsyncClient, seeded, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(render_executor, "_in_flight", 10_000)
+    resp = await client.get(
+        f"{_EXPORT_URL}/balance-sheet",
+        params=_bs_params(seeded),
+        headers=auth_headers(),
+    )
+    assert resp.status_code == 429
+    assert resp.headers["retry-after"]
@@ -0,0 +1,330 @@
+"""
+Tests for the posting configuration cache (services/posting_config_cache.py).
+
+Covers:
+  - A repeat GR posting for the same org resolves setup, item exts and the
+    open period from the cached snapshot — no config SELECTs.
+  - A committed config write (item ext re-mapped) bumps the org and the next
+    posting uses the new account.
+  - Closing a period evicts the company's open periods — the next posting is
+    rejected instead of landing in the closed period.
+  - Uncommitted config writes are never published to the shared cache, and
+    rolling them back leaves the org version alone.
+  - A 100-line GR preloads its item exts in one query.
+
+Every test uses its own org and company and commits its seed data, so the
+rows (and cache entries) can't leak into the other posting test modules.
+"""
+
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from finance.db.session import engine
+from finance.models.orm.models import (
+    AccountLevelEnum,
+    AccountTypeEnum,
+    CompanyCode,
+    CompanyPostingSetup,
+    DrawerEnum,
+    FiscalPeriod,
+    GLAccount,
+    JournalEntry,
+    JournalEntryLine,
+    PeriodStatusEnum,
+    PurchaseItemFinanceExt,
+    ValuationMethodEnum,
+)
+from finance.services import posting_config_cache
+
+_INGEST_URL = "/api/v1/finance/events/ingest"
+_SECRET_HEADERS = {"X-Service-Secret": "test-ingest-secret"}
+_CONFIG_TABLES = (
+    "company_posting_setup",
+    "purchase_item_finance_ext",
+    "fiscal_periods",
+)
+
+
+@contextmanager
+def _config_selects() -> Iterator[List[str]]:
+    """Collect the SELECTs against config tables run inside the block."""
+    statements: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        lowered = statement.lower()
+        if lowered.lstrip().startswith("select") and any(
+            f"from {table}" in lowered for table in _CONFIG_TABLES
+        ):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+async def _seed(db_session: AsyncSession, item_count: int = 1) -> Dict[str, Any]:
+    """Seed and commit a company, two accounts, setup, item exts and a period."""
+    org = str(uuid.uuid4())
+    company_code = f"PC{uuid.uuid4().hex[:6].upper()}"
+    db_session.add(
+        CompanyCode(companyCode=company_code, organizationId=org, legalName="Cache Co")
+    )
+    accounts = []
+    for number in ("131000-001", "131000-002", "211900-001"):
+        account = GLAccount(
+            accountId=str(uuid.uuid4()),
+            organizationId=org,
+            accountNumber=number,
+            accountName=f"Account {number}",
+            drawer=DrawerEnum.ASSETS,
+            accountType=AccountTypeEnum.ASSET,
+            accountLevel=AccountLevelEnum.ACTIVE,
+        )
+        db_session.add(account)
+        accounts.append(account.accountId)
+    db_session.add(
+        CompanyPostingSetup(
+            setupId=str(uuid.uuid4()),
+            organizationId=org,
+            companyCode=company_code,
+            grIrClearingAccountId=accounts[2],
+            isComplete=True,
+        )
+    )
+    item_ids = [str(uuid.uuid4()) for _ in range(item_count)]
+    for n, item_id in enumerate(item_ids):
+        db_session.add(
+            PurchaseItemFinanceExt(
+                extId=str(uuid.uuid4()),
+                organizationId=org,
+                itemId=item_id,
+                itemCode=f"ITEM-{n:03d}",
+                itemName=f"Item {n}",
+                inventoryAccountId=accounts[0],
+                valuationMethod=ValuationMethodEnum.MOVING_AVERAGE,
+                isActive=True,
+            )
+        )
+    period = FiscalPeriod(
+        periodId=str(uuid.uuid4()),
+        companyCode=company_code,
+        fiscalYear=2026,
+        periodNumber=6,
+        startDate=date(2026, 6, 1),
+        endDate=date(2026, 6, 30),
+        status=PeriodStatusEnum.OPEN,
+    )
+    db_session.add(period)
+    await db_session.commit()
+    return {
+        "org": org,
+        "company": company_code,
+        "inventory": accounts[0],
+        "inventory_alt": accounts[1],
+        "items": item_ids,
+        "period": period.periodId,
+    }
+
+
+def _gr_event(seed: Dict[str, Any]) -> Dict[str, Any]:
+    lines = [
+        {
+            "lineNumber": n + 1,
+            "itemId": item_id,
+            "itemCode": f"ITEM-{n:03d}",
+            "itemName": f"Item {n}",
+            "itemType": "raw_material",
+            "quantity": "1.000",
+            "uom": "EA",
+            "unitPrice": "10.00",
+            "lineNet": "10.00",
+            "lineTax": "0.50",
+            "lineGross": "10.50",
+            "taxCode": "VAT5",
+            "baseLineId": str(uuid.uuid4()),
+        }
+        for n, item_id in enumerate(seed["items"])
+    ]
+    return {
+        "eventId": str(uuid.uuid4()),
+        "eventType": "purchase_received",
+        "organizationId": seed["org"],
+        "companyCode": seed["company"],
+        "occurredAt": datetime.utcnow().isoformat(),
+        "sourceUserId": str(uuid.uuid4()),
+        "payload": {
+            "grDocId": str(uuid.uuid4()),
+            "grDocNumber": f"GR-2026-{uuid.uuid4().hex[:4].upper()}",
+            "grDate": "2026-06-15",
+            "poDocId": str(uuid.uuid4()),
+            "poDocNumber": "PO-2026-0001",
+            "vendorId": str(uuid.uuid4()),
+            "vendorCode": "VND-001",
+            "companyCode": seed["company"],
+            "lines": lines,
+            "currencyCode": "AED",
+            "totalNetAmount": str(10 * len(lines)),
+            "totalTaxAmount": str(0.5 * len(lines)),
+            "totalGrossAmount": str(10.5 * len(lines)),
+        },
+    }
+
+
+async def _debit_accounts(db_session: AsyncSession, event_id: str) -> List[str]:
+    result = await db_session.execute(
+        select(JournalEntryLine.accountId)
+        .join(JournalEntry, JournalEntry.jeId == JournalEntryLine.jeId)
+        .where(
+            JournalEntry.sourceEventId == event_id,
+            JournalEntryLine.debit.is_not(None),
+        )
+    )
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_repeat_posting_reads_config_from_snapshot(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed(db_session)
+
+    with _config_selects() as first:
+        resp = await client.post(
+            _INGEST_URL, json=_gr_event(seed), headers=_SECRET_HEADERS
+        )
+    assert resp.status_code == 200, resp.text
+    assert first, "the first posting must load the configuration"
+
+    with _config_selects() as second:
+        resp = await client.post(
+            _INGEST_URL, json=_gr_event(seed), headers=_SECRET_HEADERS
+        )
+    assert resp.status_code == 200, resp.text
+    assert second == []
+
+
+@pytest.mark.asyncio
+async def test_committed_item_ext_write_evicts_the_org(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed(db_session)
+    resp = await client.post(_INGEST_URL, json=_gr_event(seed), headers=_SECRET_HEADERS)
+    assert resp.status_code == 200, resp.text
+
+    ext = (
+        await db_session.execute(
+            select(PurchaseItemFinanceExt).where(
+                PurchaseItemFinanceExt.organizationId == seed["org"],
+                PurchaseItemFinanceExt.itemId == seed["items"][0],
+            )
+        )
+    ).scalar_one()
+    ext.inventoryAccountId = seed["inventory_alt"]
+    await db_session.commit()
+
+    event_body = _gr_event(seed)
+    resp = await client.post(_INGEST_URL, json=event_body, headers=_SECRET_HEADERS)
+    assert resp.status_code == 200, resp.text
+    assert await _debit_accounts(db_session, event_body["eventId"]) == [
+        seed["inventory_alt"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_closing_a_period_evicts_open_periods(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed(db_session)
+    resp = await client.post(_INGEST_URL, json=_gr_event(seed), headers=_SECRET_HEADERS)
+    assert resp.status_code == 200, resp.text
+
+    period = await db_session.get(FiscalPeriod, seed["period"])
+    period.status = PeriodStatusEnum.CLOSED
+    await db_session.commit()
+
+    resp = await client.post(_INGEST_URL, json=_gr_event(seed), headers=_SECRET_HEADERS)
+    assert resp.status_code == 400
+    assert "No open fiscal period" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_writes_stay_private_and_rollback_keeps_version(
+    db_session: AsyncSession,
+) -> None:
+    seed = await _seed(db_session)
+    scope = f"org:{seed['org']}"
+    version = posting_config_cache._scopes.version(scope)
+
+    ext = (
+        await db_session.execute(
+            select(PurchaseItemFinanceExt).where(
+                PurchaseItemFinanceExt.itemId == seed["items"][0]
+            )
+        )
+    ).scalar_one()
+    ext.inventoryAccountId = seed["inventory_alt"]
+    await db_session.flush()
+
+    snapshot = posting_config_cache.org_snapshot(db_session, seed["org"])
+    assert snapshot.shared is False
+    assert (
+        await snapshot.purchase_item_ext(db_session, seed["items"][0])
+    ).inventoryAccountId == (seed["inventory_alt"])
+
+    await db_session.rollback()
+    assert posting_config_cache._scopes.version(scope) == version
+
+    snapshot = posting_config_cache.org_snapshot(db_session, seed["org"])
+    assert snapshot.shared is True
+    assert (
+        await snapshot.purchase_item_ext(db_session, seed["items"][0])
+    ).inventoryAccountId == (seed["inventory"])
+
+
+@pytest.mark.asyncio
+async def test_hundred_line_gr_preloads_item_exts_in_one_query(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await _seed(db_session, item_count=100)
+
+    with _config_selects() as statements:
+        resp = await client.post(
+            _INGEST_URL, json=_gr_event(seed), headers=_SECRET_HEADERS
+        )
+    assert resp.status_code == 200, resp.text
+    ext_selects = [
+        s for s in statements if "from purchase_item_finance_ext" in s.lower()
+    ]
+    assert len(ext_selects) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_org_account_resolves_without_being_memoised(
+    db_session: AsyncSession,
+) -> None:
+    seed = await _seed(db_session)
+    other = await _seed(db_session)
+    foreign_id = other["inventory"]
+
+    snapshot = posting_config_cache.org_snapshot(db_session, seed["org"])
+    foreign = await snapshot.gl_account(db_session, foreign_id)
+    assert foreign is not None
+    assert foreign.organizationId == other["org"]
+
+    # Reason: the write bumps the other org only, so this snapshot must not
+    # have kept a copy of the row.
+    account = await db_session.get(GLAccount, foreign_id)
+    account.accountName = "Renamed"
+    await db_session.commit()
+
+    assert posting_config_cache.org_snapshot(db_session, seed["org"]) is snapshot
+    assert (await snapshot.gl_account(db_session, foreign_id)).accountName == "Renamed"
@@ -28,6 +28,9 @@ from ...models.user import (
     UserRole,
     UserOrganizationAssignment,
 )
+from ...core.jobs import get_job_runner
+from ...core.propagation import propagation_status
+from ...core.tokens import revoke_user_tokens
 from ...services import deployment_settings_service
 from ...services.audit_log_service import write_user_audit_log
 from ...services.database import mongodb
@@ -728,6 +731,9 @@ async def reset_user_mfa(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to reset MFA"
         )
 
+    # Sessions established with the old second factor end here
+    await revoke_user_tokens(db, user_id, "mfa_reset")
+
     # Log admin action in audit trail
     audit_entry = {
         "action": "mfa_reset",
@@ -765,3 +771,95 @@ async def reset_user_mfa(
         "resetAt": reset_time.isoformat(),
         "resetBy": current_user.email,
     }
+
+
+@router.get("/jobs")
+async def get_background_jobs(
+    history: int = Query(5, ge=0, le=50, description="Recent runs per job"),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Background job status (admin action)
+
+    One row per registered job: schedule, next run, how overdue it is, last
+    status / duration / lag and the most recent runs.  Also reports which
+    worker currently holds the job-runner lease.
+
+    **Authentication:** Required (admin or super_admin)
+
+    **Returns:**
+    - 200: Job runner status
+    - 403: Forbidden (insufficient permissions)
+    - 503: Job runner not started on this worker
+    """
+    require_role([UserRole.SUPER_ADMIN, UserRole.ADMIN], current_user)
+
+    runner = get_job_runner()
+    if not runner.is_running:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job runner is not running",
+        )
+    return await runner.get_status(history=history)
+
+
+@router.post("/jobs/{job_name}/run", status_code=status.HTTP_202_ACCEPTED)
+async def trigger_background_job(
+    job_name: str, current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Queue an immediate run of a background job (admin action)
+
+    The run is queued, not executed inline: the current job-runner leader
+    picks it up on its next tick (within ~15s), subject to the job's
+    concurrency limit.  Disabled jobs can still be triggered this way.
+
+    **Authentication:** Required (admin or super_admin)
+
+    **Returns:**
+    - 202: Run queued (``runId`` to follow it in GET /admin/jobs)
+    - 403: Forbidden (insufficient permissions)
+    - 404: Unknown job
+    - 503: Job runner not started on this worker
+    """
+    require_role([UserRole.SUPER_ADMIN, UserRole.ADMIN], current_user)
+
+    runner = get_job_runner()
+    if not runner.is_running:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job runner is not running",
+        )
+    try:
+        run_id = await runner.enqueue(job_name, trigger=f"manual:{current_user.userId}")
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown job: {job_name}"
+        )
+
+    logger.info(f"Admin {current_user.email} queued job {job_name} (run {run_id})")
+    return {"job": job_name, "runId": run_id, "status": "queued"}
+
+
+@router.get("/propagation")
+async def get_propagation_status(
+    recent: int = Query(20, ge=0, le=200, description="Unfinished jobs to list"),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Denormalized-field propagation backlog (admin action)
+
+    One row per registered denormalized field (e.g. ``customer.name``):
+    pending / running / failed job counts and lag (age of the oldest
+    unfinished request), plus the oldest unfinished jobs with their
+    per-collection progress and last error.  Propagation itself runs in the
+    ``propagation.drain`` background job.
+
+    **Authentication:** Required (admin or super_admin)
+
+    **Returns:**
+    - 200: Propagation status
+    - 403: Forbidden (insufficient permissions)
+    """
+    require_role([UserRole.SUPER_ADMIN, UserRole.ADMIN], current_user)
+    return await propagation_status(mongodb.get_database(), recent=recent)
@@ -10,7 +10,8 @@ Security:
 - Rate limiting applied (10 requests/minute for installation)
 
 Endpoints:
-- POST   /api/v1/modules/install              - Install new module
+- POST   /api/v1/modules/install              - Install new module (background job)
+- GET    /api/v1/modules/jobs/{job_id}        - Poll a background job
 - GET    /api/v1/modules/installed            - List installed modules
 - DELETE /api/v1/modules/{module_name}        - Uninstall module
 - GET    /api/v1/modules/{module_name}/status - Get module status
@@ -28,10 +29,13 @@ from ...models.module import (
     ModuleListResponse,
     ModuleStatusResponse,
     ModuleInstallResponse,
+    ModuleJob,
+    ModuleStatus,
     ModuleUninstallResponse,
     ModuleAuditLog,
 )
 from ...services.module_manager import module_manager
+from ...services.module_ops import container_states, module_ops
 from ...middleware.permissions import require_role, require_super_admin
 from ...middleware.auth import get_current_user
 
@@ -60,12 +64,12 @@ router = APIRouter(prefix="/modules", tags=["Module Management"])
     - Module limits not exceeded (50 total, 10 per user)
 
     **Process:**
-    1. Validate license key
-    2. Check module limits
-    3. Validate and pull Docker image
-    4. Create container with security configuration
-    5. Update database and routing
-    6. Return installation status
+    1. Check the module is not installed and the image is acceptable
+    2. Start a background install job and return its `job_id`
+    3. The job validates the license key, checks module limits, pulls the
+       image, creates the container and configures routing
+
+    Poll `GET /api/v1/modules/jobs/{job_id}` for the job's step and progress.
 
     **Security:**
     - Docker images validated against trusted registries
@@ -87,13 +91,13 @@ async def install_module(
         current_user: Current authenticated user (from JWT, must be super_admin)
 
     Returns:
-        ModuleInstallResponse with installation status
+        ModuleInstallResponse with the install job to poll
 
     Raises:
         HTTPException 403: If user is not super_admin
-        HTTPException 400: If validation fails (license, limits, etc.)
-        HTTPException 409: If module already exists
-        HTTPException 500: If installation fails
+        HTTPException 400: If validation fails (image)
+        HTTPException 409: If module already exists or is being installed
+        HTTPException 500: If the job cannot be started
     """
 
     try:
@@ -102,8 +106,8 @@ async def install_module(
             f"by {current_user.email} ({current_user.role})"
         )
 
-        # Install module
-        result = await module_manager.install_module(
+        # Start the install in the background
+        job = await module_manager.start_install(
             config=config,
             user_id=current_user.userId,
             user_email=current_user.email,
@@ -111,9 +115,10 @@ async def install_module(
         )
 
         return ModuleInstallResponse(
-            message=result["message"],
-            module_name=result["module_name"],
-            status=result["status"],
+            message=f"Module '{config.module_name}' installation started",
+            module_name=config.module_name,
+            status=ModuleStatus.INSTALLING,
+            job_id=job.job_id,
         )
 
     except ValueError as e:
@@ -121,7 +126,7 @@ async def install_module(
         logger.warning(f"Module installation validation failed: {str(e)}")
 
         # Determine appropriate status code
-        if "already installed" in str(e).lower():
+        if "already" in str(e).lower():
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
         else:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -143,6 +148,51 @@ async def install_module(
         )
 
 
+# =============================================================================
+# Background Jobs
+# =============================================================================
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ModuleJob,
+    summary="Get module job progress",
+    description="""
+    Get the status of a background module job (e.g. an install started by
+    `POST /api/v1/modules/install`).
+
+    **Requirements:**
+    - super_admin role required
+
+    **Response includes:**
+    - Job status (pending, running, succeeded, failed)
+    - Current step and progress percentage
+    - Error message (if failed) or result (container) when succeeded
+    """,
+)
+async def get_module_job(
+    job_id: str, current_user: UserInDB = Depends(require_super_admin)
+) -> ModuleJob:
+    """
+    Get a background module job.
+
+    Args:
+        job_id: Job ID returned by the install endpoint
+        current_user: Current authenticated user (must be super_admin)
+
+    Returns:
+        ModuleJob with status and progress
+
+    Raises:
+        HTTPException 403: If user is not super_admin
+        HTTPException 404: If job not found
+    """
+    try:
+        return await module_manager.get_job(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
 # =============================================================================
 # List Installed Modules
 # =============================================================================
@@ -526,8 +576,8 @@ async def module_system_health() -> dict:
     """
     try:
         # Check Docker connectivity (initialize if not already done)
-        module_manager._ensure_docker_client()
-        module_manager.docker_client.ping()
+        await module_ops.run(module_manager._ensure_docker_client)
+        await module_ops.run(module_manager.docker_client.ping, timeout=5)
         docker_status = "healthy"
     except Exception as e:
         logger.error(f"Docker health check failed: {e}")
@@ -556,6 +606,7 @@ async def module_system_health() -> dict:
             "docker": docker_status,
             "database": db_status,
             "license_validator": "healthy",
+            "container_events": "synced" if container_states.synced else "stale",
         },
         "timestamp": str(datetime.utcnow()),
     }
@@ -21,6 +21,9 @@ from ...models.organization import (
 )
 from ...models.user import UserResponse, UserRole
 from ...modules.finance_bridge.tenant_flag import invalidate_tenant_flag_cache
+from ...modules.genetics.services.public_info.snapshot_service import (
+    PublicInfoSnapshotService,
+)
 from ...services.database import mongodb
 from ...services.division_service import division_service
 from ...services.organization_service import organization_service
@@ -268,6 +271,9 @@ async def update_organization_modules(
     redis_cache = await get_redis_cache()
     redis_client = redis_cache._redis if redis_cache.is_available else None
     await invalidate_tenant_flag_cache(redis_client, organization_id)
+    # Reason: stored public label pages carry the publicInfoPage flags.
+    if data.publicInfoPage is not None:
+        await PublicInfoSnapshotService.invalidate(organization_ids=[organization_id])
 
     return updated
 
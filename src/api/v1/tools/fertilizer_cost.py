@@ -11,6 +11,8 @@ Endpoints:
   POST   /calculate                — run calculation
   POST   /export                   — run calculation and return .xlsx
   POST   /import                   — parse .xlsx and return crop list
+  GET    /forecast                 — daily demand forecast for planted blocks
+  GET    /forecast/export          — demand forecast as .xlsx
   GET    /lists                    — list saved calculation lists
   POST   /lists                    — save a new list
   PATCH  /lists/{listId}           — update a saved list
@@ -59,11 +61,19 @@ from src.modules.farm_manager.services.tools.chemicals_repository import (
 from src.modules.farm_manager.services.tools.fertilizer_calculator import (
     calculate_for_crops,
 )
+from src.modules.farm_manager.models.tools.demand_forecast import (
+    DemandForecastResponse,
+)
 from src.modules.farm_manager.services.tools.excel_handler import (
     build_import_template,
     export_calculation,
+    export_demand_forecast,
     import_crops,
 )
+from src.modules.farm_manager.services.tools.fertilizer_forecast import (
+    MAX_FORECAST_DAYS,
+    forecast_fertilizer_demand,
+)
 from src.modules.farm_manager.services.tools.calculation_lists_repository import (
     CalculationListsRepository,
 )
@@ -341,6 +351,82 @@ async def export_to_excel(
     )
 
 
+@router.get(
+    "/forecast",
+    response_model=SuccessResponse[DemandForecastResponse],
+    summary="Forecast daily fertilizer demand",
+)
+async def get_demand_forecast(
+    startDate: Optional[date] = Query(None, description="First day (default today)"),
+    days: int = Query(90, ge=1, le=MAX_FORECAST_DAYS, description="Horizon in days"),
+    farmId: Optional[List[UUID]] = Query(None, description="Restrict to farms"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+) -> SuccessResponse:
+    """
+    Forecast day-by-day chemical demand for every planted (or planned) block.
+
+    Each block's fertigation schedule is offset by its planting date and
+    scaled by its irrigation points; results are summed per farm and for the
+    whole organisation.
+
+    Args:
+        startDate: First forecast day.
+        days: Forecast horizon.
+        farmId: Optional farm filter (repeatable).
+        current_user: Authenticated user.
+
+    Returns:
+        SuccessResponse with DemandForecastResponse.
+    """
+    org_id = _require_org(current_user)
+    forecast = await forecast_fertilizer_demand(org_id, startDate, days, farmId)
+    return SuccessResponse(data=forecast, message="Forecast complete")
+
+
+@router.get(
+    "/forecast/export",
+    summary="Export demand forecast to Excel",
+    responses={
+        200: {
+            "content": {
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {}
+            },
+            "description": "Returns a .xlsx file",
+        }
+    },
+)
+async def export_demand_forecast_to_excel(
+    startDate: Optional[date] = Query(None, description="First day (default today)"),
+    days: int = Query(90, ge=1, le=MAX_FORECAST_DAYS, description="Horizon in days"),
+    farmId: Optional[List[UUID]] = Query(None, description="Restrict to farms"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+) -> Response:
+    """
+    Forecast daily chemical demand and export it as an Excel file.
+
+    Args:
+        startDate: First forecast day.
+        days: Forecast horizon.
+        farmId: Optional farm filter (repeatable).
+        current_user: Authenticated user.
+
+    Returns:
+        FastAPI Response with application/vnd.openxmlformats... content-type.
+    """
+    org_id = _require_org(current_user)
+    forecast = await forecast_fertilizer_demand(org_id, startDate, days, farmId)
+    xlsx_bytes = export_demand_forecast(forecast)
+    filename = f"fertilizer-demand-{forecast.startDate.isoformat()}-{days}d.xlsx"
+
+    return Response(
+        content=xlsx_bytes,
+        media_type=(
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        ),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get(
     "/import-template",
     summary="Download sample import template",
@@ -43,6 +43,12 @@ class Settings(BaseSettings):
     # Database Settings - MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "a64core_db"
+    # Max concurrent listIndexes/createIndexes commands during the boot-time
+    # index reconciliation (src/core/indexes).
+    INDEX_RECONCILE_CONCURRENCY: int = 8
+    # Leader-elected background job runner (src/core/jobs). Disable on
+    # replicas that must never run scheduled work.
+    JOB_RUNNER_ENABLED: bool = True
 
     # Security Settings
     SECRET_KEY: str = "dev_secret_key_change_in_production"
@@ -142,6 +148,68 @@ class Settings(BaseSettings):
     AI_ASSISTANT_MAX_TURNS: int = 50
     AI_ASSISTANT_HISTORY_LIMIT: int = 3
 
+    # AI analytics query governor (ai_analytics/services/query_governor.py)
+    AI_QUERY_MAX_TIME_MS: int = 5000
+    AI_QUERY_MAX_RESULTS: int = 1000
+    AI_QUERY_MAX_RESULT_BYTES: int = 4 * 1024 * 1024
+    # Collection scans above this size are rewritten to a recent-documents
+    # window of AI_QUERY_SCAN_WINDOW (or rejected); unindexed $lookup joins
+    # into collections above it are rejected.
+    AI_QUERY_LARGE_COLLECTION_DOCS: int = 50000
+    AI_QUERY_SCAN_WINDOW: int = 50000
+    AI_QUERY_READ_PREFERENCE: str = "secondaryPreferred"
+    AI_QUERY_PER_USER_CONCURRENCY: int = 2
+
+    # Shared AI tool runtime (src/core/ai_tools): concurrent read-only tool
+    # calls per model turn, and the per-organisation tool result cache size.
+    AI_TOOL_MAX_CONCURRENCY: int = 4
+    AI_TOOL_CACHE_MAX_ENTRIES: int = 2048
+
+    # Shared search index (src/core/search).  Token documents are always
+    # maintained on write; list/search endpoints of the entities named here
+    # (comma-separated, e.g. "customers,vendors") read from the index once
+    # its backfill has completed, and fall back to their $regex query before.
+    SEARCH_INDEX_ENTITIES: str = ""
+
+    # Denormalized-field propagation (src/core/propagation).  Renames are
+    # copied onto their denormalized targets by the propagation.drain job in
+    # batches of PROPAGATION_BATCH_SIZE documents, pausing
+    # PROPAGATION_BATCH_PAUSE_MS between batches; one pass stops claiming
+    # new work after PROPAGATION_PASS_SECONDS.
+    PROPAGATION_BATCH_SIZE: int = 500
+    PROPAGATION_BATCH_PAUSE_MS: int = 50
+    PROPAGATION_PASS_SECONDS: int = 20
+
+    # Sequence allocator (src/core/sequences).  Prefetched code counters
+    # (customer/employee codes, block sequence numbers) reserve this many
+    # numbers per worker at a time; fiscal document numbers never prefetch.
+    SEQUENCE_BLOCK_SIZE: int = 20
+
+    # Password hashing (src/utils/crypto_executor).  bcrypt runs off the event
+    # loop in a process pool of CRYPTO_POOL_WORKERS (0 = one per core); up to
+    # CRYPTO_QUEUE_PER_WORKER more hashes may wait per worker, beyond that new
+    # ones are refused with 429.  Changing BCRYPT_ROUNDS rehashes each
+    # password at its owner's next successful login.
+    BCRYPT_ROUNDS: int = 12
+    CRYPTO_POOL_WORKERS: int = 0
+    CRYPTO_QUEUE_PER_WORKER: int = 16
+
+    # Module management (src/services/module_ops).  Docker and nginx calls
+    # run off the event loop on MODULE_OPS_WORKERS threads and fail after
+    # MODULE_OPS_TIMEOUT_SECONDS (image pulls use MODULE_INSTALL_TIMEOUT);
+    # container resource usage shown by the status endpoint is resampled in
+    # the background once older than MODULE_STATS_TTL_SECONDS.
+    MODULE_OPS_WORKERS: int = 4
+    MODULE_OPS_TIMEOUT_SECONDS: int = 30
+    MODULE_STATS_TTL_SECONDS: int = 15
+
+    # Token verification (src/core/tokens).  Verified JWTs are cached by
+    # digest (at most TOKEN_CACHE_MAX_ENTRIES, each until its expiry);
+    # revocations made on other workers take effect here within
+    # TOKEN_REVOCATION_SYNC_SECONDS.
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5
+
     # Document Attachment Storage (T-053)
     ATTACHMENT_STORAGE_ROOT: str = "/app/data/attachments"
     """
@@ -0,0 +1,37 @@
+"""
+A64 Core Platform — AI Tool Runtime
+
+Shared execution layer for the tool calls of every AI chat loop: concurrent
+read-only tools under a concurrency cap, a per-organisation, per-caller result
+cache that writes invalidate, and per-call latency records.
+
+Modules
+-------
+runtime — SideEffect, ToolSpec, ToolCall, ToolOutcome, ToolRuntime,
+          ToolResultCache, get_tool_result_cache, invalidate_tool_results,
+          tool_stats
+"""
+
+from .runtime import (
+    SideEffect,
+    ToolCall,
+    ToolOutcome,
+    ToolResultCache,
+    ToolRuntime,
+    ToolSpec,
+    get_tool_result_cache,
+    invalidate_tool_results,
+    tool_stats,
+)
+
+__all__ = [
+    "SideEffect",
+    "ToolCall",
+    "ToolOutcome",
+    "ToolResultCache",
+    "ToolRuntime",
+    "ToolSpec",
+    "get_tool_result_cache",
+    "invalidate_tool_results",
+    "tool_stats",
+]
@@ -0,0 +1,392 @@
+"""
+A64 Core Platform — AI Tool Runtime
+
+Every AI chat loop (the Claude assistant and the Gemini farm / farm-level /
+global / hub chats) receives a batch of tool calls per model turn.  The
+runtime executes one batch:
+
+* Independent READ calls run concurrently, at most
+  ``AI_TOOL_MAX_CONCURRENCY`` at a time, so a turn takes about as long as
+  its slowest tool instead of the sum of all of them.
+* WRITE calls (and any tool without a declared spec) are barriers: they run
+  alone, in the order the model asked for them, and invalidate the scope's
+  cached results once they finish.
+* READ results with a ``cache_ttl_seconds`` are cached per organisation and
+  per caller (user ID and role — tools filter by permissions), across turns
+  in this process.  Identical calls within a batch, or already in flight
+  from another request of the same caller, share a single execution.
+  Callers without an organisation are never cached.
+* Every call records its latency; ``tool_stats()`` returns per-tool totals.
+
+Results are returned in call order regardless of completion order.
+
+Usage::
+
+    runtime = ToolRuntime("global_ai", TOOL_SPECS)
+    outcomes = await runtime.run(
+        [ToolCall(name, args) for name, args in requested],
+        lambda call: execute_tool(call.name, call.input),
+        scope=org_id,
+        user_id=user_id,
+        role=role,
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SideEffect(str, Enum):
+    """What running a tool does to the outside world."""
+
+    READ = "read"  # no state change — may run concurrently and be cached
+    WRITE = "write"  # changes state — runs alone, invalidates the scope cache
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Side-effect class and cache TTL for one tool name."""
+
+    name: str
+    side_effect: SideEffect = SideEffect.READ
+    cache_ttl_seconds: float = 0.0
+
+
+@dataclass
+class ToolCall:
+    """One tool call requested by the model."""
+
+    name: str
+    input: Dict[str, Any] = field(default_factory=dict)
+    id: Optional[str] = None
+
+
+@dataclass
+class ToolOutcome:
+    """Result of one ToolCall, with how it was produced."""
+
+    call: ToolCall
+    result: Any
+    latency_ms: float
+    cached: bool = False
+    error: Optional[str] = None
+
+    def to_log(self) -> Dict[str, Any]:
+        """Compact record for chat-log documents."""
+        return {
+            "name": self.call.name,
+            "latencyMs": round(self.latency_ms, 1),
+            "cached": self.cached,
+        }
+
+
+ToolExecutor = Callable[[ToolCall], Awaitable[Any]]
+_CacheKey = Tuple[str, str, str, str, str]
+
+
+def _canonical_input(tool_input: Dict[str, Any]) -> str:
+    return json.dumps(tool_input, sort_keys=True, default=str)
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+class ToolResultCache:
+    """
+    In-process LRU of tool results keyed by
+    (scope, caller, namespace, tool, input).
+
+    Holds at most ``max_entries`` results; expired entries are dropped on
+    read.  ``invalidate(scope)`` forgets everything cached for a scope and
+    is what write events call.
+    """
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[_CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[_CacheKey, "asyncio.Future[Any]"] = {}
+
+    def get(self, key: _CacheKey) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: _CacheKey, value: Any, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_run(
+        self,
+        key: _CacheKey,
+        ttl_seconds: float,
+        run: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Return ``(result, cached)``; concurrent callers for the same key
+        share one execution.  Error results are never stored.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value, True
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await run()
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Reason: mark the exception retrieved when nobody else waited.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if not _is_error(value):
+                self.put(key, value, ttl_seconds)
+            return value, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, scope: Optional[str] = None) -> int:
+        """Drop cached results for ``scope`` (every scope when None)."""
+        if scope is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+        stale = [k for k in self._entries if k[0] == scope]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+
+@dataclass
+class ToolStats:
+    """Running latency totals for one (namespace, tool)."""
+
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, outcome: ToolOutcome) -> None:
+        self.calls += 1
+        self.cache_hits += int(outcome.cached)
+        self.errors += int(outcome.error is not None or _is_error(outcome.result))
+        self.total_ms += outcome.latency_ms
+        self.max_ms = max(self.max_ms, outcome.latency_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "cacheHits": self.cache_hits,
+            "errors": self.errors,
+            "avgMs": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "maxMs": round(self.max_ms, 1),
+        }
+
+
+_cache: Optional[ToolResultCache] = None
+_stats: Dict[Tuple[str, str], ToolStats] = {}
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Return the process-wide tool result cache."""
+    global _cache
+    if _cache is None:
+        _cache = ToolResultCache(max_entries=settings.AI_TOOL_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def invalidate_tool_results(scope: Optional[str] = None) -> int:
+    """
+    Forget cached tool results after a write outside the tool loop (e.g. a
+    confirmed pending action).  ``scope=None`` clears every organisation.
+    """
+    return get_tool_result_cache().invalidate(scope)
+
+
+def tool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-tool call counts, cache hits and latency since process start."""
+    return {f"{ns}.{name}": s.to_dict() for (ns, name), s in sorted(_stats.items())}
+
+
+class ToolRuntime:
+    """
+    Executes batches of tool calls for one executor namespace.
+
+    Args:
+        namespace:       Executor name; part of the cache key, since the same
+                         tool name can mean different things in different
+                         chats.
+        specs:           ToolSpec per tool.  Undeclared tools are treated as
+                         uncached writes.
+        max_concurrency: Concurrent READ calls per batch
+                         (default ``AI_TOOL_MAX_CONCURRENCY``).
+        cache:           Result cache (default: the process-wide one).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        specs: Iterable[ToolSpec],
+        max_concurrency: Optional[int] = None,
+        cache: Optional[ToolResultCache] = None,
+    ) -> None:
+        self.namespace = namespace
+        self._specs = {spec.name: spec for spec in specs}
+        self._max_concurrency = max(
+            1, max_concurrency or settings.AI_TOOL_MAX_CONCURRENCY
+        )
+        self._cache = cache
+
+    @property
+    def cache(self) -> ToolResultCache:
+        return self._cache or get_tool_result_cache()
+
+    def spec(self, name: str) -> ToolSpec:
+        return self._specs.get(name) or ToolSpec(name, SideEffect.WRITE)
+
+    async def run(
+        self,
+        calls: Iterable[ToolCall],
+        execute: ToolExecutor,
+        scope: Optional[str] = None,
+        context_key: str = "",
+        user_id: Optional[str] = None,
+        role: Optional[str] = None,
+    ) -> List[ToolOutcome]:
+        """
+        Execute one model turn's tool calls and return outcomes in call order.
+
+        Consecutive READ calls form a concurrent group; each WRITE call runs
+        by itself between groups.  An exception from ``execute`` becomes an
+        ``{"error": ...}`` result rather than failing the batch.
+
+        Args:
+            calls:       Tool calls in the order the model requested them.
+            execute:     Runs one call and returns its result.
+            scope:       Cache scope — the caller's organisation ID.  Without
+                         one nothing is cached, and a write invalidates
+                         every scope.
+            context_key: Anything besides the tool input that determines the
+                         result (e.g. the block a farm chat is bound to).
+            user_id:     Calling user; part of the cache key.
+            role:        Calling user's role; part of the cache key.
+        """
+        calls = list(calls)
+        caller = f"{user_id or ''}|{role or ''}"
+        outcomes: List[Optional[ToolOutcome]] = [None] * len(calls)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def run_one(index: int) -> None:
+            async with semaphore:
+                outcomes[index] = await self._execute(
+                    calls[index], execute, scope, caller, context_key
+                )
+
+        group: List[int] = []
+        for index, call in enumerate(calls):
+            if self.spec(call.name).side_effect is SideEffect.READ:
+                group.append(index)
+                continue
+            if group:
+                await asyncio.gather(*(run_one(i) for i in group))
+                group = []
+            outcomes[index] = await self._execute(
+                call, execute, scope, caller, context_key
+            )
+            # Reason: a write with no organisation may touch any of them.
+            dropped = self.cache.invalidate(scope)
+            logger.debug(
+                "[AI Tools] %s.%s invalidated %d cached result(s) for scope %s",
+                self.namespace,
+                call.name,
+                dropped,
+                scope,
+            )
+        if group:
+            await asyncio.gather(*(run_one(i) for i in group))
+
+        return [o for o in outcomes if o is not None]
+
+    async def _execute(
+        self,
+        call: ToolCall,
+        execute: ToolExecutor,
+        scope: Optional[str],
+        caller: str,
+        context_key: str,
+    ) -> ToolOutcome:
+        spec = self.spec(call.name)
+        started = time.perf_counter()
+        cached = False
+        error = None
+        try:
+            if (
+                scope
+                and spec.side_effect is SideEffect.READ
+                and spec.cache_ttl_seconds > 0
+            ):
+                key = (
+                    scope,
+                    caller,
+                    self.namespace,
+                    call.name,
+                    context_key + _canonical_input(call.input),
+                )
+                result, cached = await self.cache.get_or_run(
+                    key, spec.cache_ttl_seconds, lambda: execute(call)
+                )
+            else:
+                result = await execute(call)
+        except Exception as exc:
+            logger.error(
+                "[AI Tools] %s.%s failed: %s",
+                self.namespace,
+                call.name,
+                exc,
+                exc_info=True,
+            )
+            error = str(exc)
+            result = {"error": f"Tool execution failed: {error}"}
+
+        outcome = ToolOutcome(
+            call=call,
+            result=result,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            cached=cached,
+            error=error,
+        )
+        _stats.setdefault((self.namespace, call.name), ToolStats()).record(outcome)
+        logger.debug(
+            "[AI Tools] %s.%s %.1fms%s",
+            self.namespace,
+            call.name,
+            outcome.latency_ms,
+            " (cached)" if cached else "",
+        )
+        return outcome
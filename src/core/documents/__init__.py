@@ -9,7 +9,7 @@ Modules
 -------
 document_links     — Base/target document linking (DocumentLinkRef, DocumentLineLinkMixin, write_back_target_ref)
 open_quantity      — Open-quantity tracking and atomic increment (LineQuantityState, increment_consumed_qty)
-doc_number         — Sequential document-number generator (next_doc_number)
+doc_number         — Sequential document-number generator (next_doc_number, next_doc_numbers)
 bp_ref             — Business-partner reference-number mixin (BPReferenceMixin)
 journal_memo       — Journal-memo mixin + formatter (JournalMemoMixin, format_journal_memo)
 document_status    — Shared DocumentStatus enum + legal-transition guard (assert_legal_transition)
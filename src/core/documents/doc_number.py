@@ -25,7 +25,9 @@ Uses MongoDB ``findAndModify`` (Motor's ``find_one_and_update``) on a
 
 The counter increment and the downstream document insert should share the
 same Motor session/transaction so the counter rollback is automatic if the
-document creation fails.  (This mirrors the pattern in the existing
+document creation fails.  Counters are gapless ``src.core.sequences``
+counters (never prefetched); ``next_doc_numbers`` reserves several numbers
+in one round trip for multi-document operations.  (This mirrors the pattern in the existing
 ``_next_doc_number`` in ``src/modules/purchasing/services/document_service.py``
 — this module generalises it for all document types.)
 
@@ -37,8 +39,9 @@ entry here and document it in ``Docs/4-Finance-Mod-docs/Document-Conventions.md`
 Audit helper
 ------------
 ``assert_no_gaps`` is a diagnostic helper for auditors: given a doc type and
-year it returns a list of missing sequence numbers.  This is intentionally
-read-only and carries no production side-effects.
+year it returns a list of missing sequence numbers (optionally including
+numbers the counter issued after the last stored document).  This is
+intentionally read-only and carries no production side-effects.
 """
 
 from __future__ import annotations
@@ -48,6 +51,8 @@ from typing import List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
 
+from src.core.sequences import Counter, allocate, counter_value, find_gaps
+
 # ---------------------------------------------------------------------------
 # Doc-type → prefix mapping (single source of truth)
 # ---------------------------------------------------------------------------
@@ -106,6 +111,15 @@ def _prefix_for(doc_type: str) -> str:
     return prefix
 
 
+def _counter_for(
+    doc_type: str, org_id: str, company_code: Optional[str], year: int
+) -> Counter:
+    scope = company_code or org_id
+    return Counter(
+        _COUNTERS_COLLECTION, f"{scope}:{doc_type}:{year}", "counter", gapless=True
+    )
+
+
 async def next_doc_number(
     db: AsyncIOMotorDatabase,
     *,
@@ -148,20 +162,46 @@ async def next_doc_number(
         )
         # Returns "SO-2026-0001"
     """
-    prefix = _prefix_for(doc_type)
-    year = fiscal_year or datetime.now(tz=timezone.utc).year
-    scope = company_code or org_id
-    counter_key = f"{scope}:{doc_type}:{year}"
-
-    result = await db[_COUNTERS_COLLECTION].find_one_and_update(
-        {"_id": counter_key},
-        {"$inc": {"counter": 1}},
-        upsert=True,
-        return_document=True,
+    numbers = await next_doc_numbers(
+        db,
+        doc_type=doc_type,
+        org_id=org_id,
+        count=1,
+        company_code=company_code,
+        fiscal_year=fiscal_year,
         session=session,
     )
-    seq: int = result["counter"]
-    return f"{prefix}-{year}-{seq:04d}"
+    return numbers[0]
+
+
+async def next_doc_numbers(
+    db: AsyncIOMotorDatabase,
+    *,
+    doc_type: str,
+    org_id: str,
+    count: int,
+    company_code: Optional[str] = None,
+    fiscal_year: Optional[int] = None,
+    session: Optional[AsyncIOMotorClientSession] = None,
+) -> List[str]:
+    """
+    Reserve ``count`` consecutive document numbers in one counter round trip.
+
+    Same counter, scoping and session semantics as ``next_doc_number``; use
+    it when one operation creates several documents of the same type, and
+    create all of them in the same transaction so the range stays gapless.
+
+    Returns:
+        Formatted document numbers in sequence order.
+
+    Raises:
+        ValueError: If ``doc_type`` is not registered or ``count`` < 1.
+    """
+    prefix = _prefix_for(doc_type)
+    year = fiscal_year or datetime.now(tz=timezone.utc).year
+    counter = _counter_for(doc_type, org_id, company_code, year)
+    seqs = await allocate(db, counter, count, session=session)
+    return [f"{prefix}-{year}-{seq:04d}" for seq in seqs]
 
 
 # ---------------------------------------------------------------------------
@@ -177,6 +217,7 @@ async def assert_no_gaps(
     org_id: str,
     company_code: Optional[str] = None,
     headers_collection: str = "document_headers",
+    include_unstored: bool = False,
 ) -> List[int]:
     """
     Return a list of missing sequence numbers for a doc type and year.
@@ -193,6 +234,9 @@ async def assert_no_gaps(
         org_id:              Organisation UUID for scoping the query.
         company_code:        Finance company code scope (optional).
         headers_collection:  Collection name for document headers.
+        include_unstored:    Also report numbers the counter issued after the
+                             last stored document (e.g. an insert that failed
+                             outside a transaction).
 
     Returns:
         List of missing sequence integers (empty if no gaps detected).
@@ -227,8 +271,8 @@ async def assert_no_gaps(
             # Reason: skip non-numeric suffixes (should never occur with our format)
             pass
 
-    if not seen:
-        return []
-
-    max_seq = max(seen)
-    return [n for n in range(1, max_seq + 1) if n not in seen]
+    end = None
+    if include_unstored:
+        counter = _counter_for(doc_type, org_id, company_code, fiscal_year)
+        end = max(await counter_value(db, counter), max(seen, default=0))
+    return find_gaps(seen, end=end)
@@ -11,6 +11,8 @@ company_resolver    — resolve the effective companyCode for an operation from
                       the user's org context via the finance microservice HTTP API.
 finance_ext_client  — HTTP helpers for item finance ext, customer finance ext,
                       and tax-code rate lookups (extracted from sales in T-200.22b).
+pnl_dirty           — mark months of the operational P&L fact table for rebuild
+                      from ops-side write paths.
 """
 
 from .finance_ext_client import (
@@ -18,9 +20,11 @@ from .finance_ext_client import (
     get_item_finance_ext,
     get_tax_percent,
 )
+from .pnl_dirty import mark_pnl_months_dirty
 
 __all__ = [
     "get_customer_finance_ext",
     "get_item_finance_ext",
     "get_tax_percent",
+    "mark_pnl_months_dirty",
 ]
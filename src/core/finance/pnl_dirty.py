@@ -0,0 +1,47 @@
+"""
+Core Finance — P&L Fact Dirty Marks
+
+Ops-side write paths (sales orders, block harvests) call
+``mark_pnl_months_dirty`` after they change a document that feeds the
+operational P&L.  The finance module's ``finance.pnl_facts_refresh`` job
+rebuilds the marked months of ``pnl_monthly_facts``; the nightly
+``finance.pnl_facts_repair`` job rebuilds every month regardless, so a lost
+mark only delays a correction by a day.
+
+Marking is one upsert per month and never raises: a P&L refresh must not fail
+the sale or harvest that triggered it.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DIRTY_COLLECTION = "pnl_fact_dirty_months"
+
+
+def month_key(value: Optional[datetime]) -> Optional[str]:
+    """``YYYY-MM`` bucket for a source document date (UTC), or None."""
+    if not isinstance(value, datetime):
+        return None
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+async def mark_pnl_months_dirty(db, dates: Iterable[Optional[datetime]]) -> None:
+    """
+    Flag the months containing ``dates`` for a P&L fact rebuild.
+
+    Args:
+        db: Motor database handle
+        dates: Source document dates (None and non-datetime values are ignored)
+    """
+    months = {m for m in (month_key(d) for d in dates) if m}
+    now = datetime.utcnow()
+    for month in sorted(months):
+        try:
+            await db[DIRTY_COLLECTION].update_one(
+                {"_id": month}, {"$set": {"markedAt": now}}, upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"[PnL Facts] Could not mark {month} dirty: {e}")
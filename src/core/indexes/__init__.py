@@ -0,0 +1,37 @@
+"""
+A64 Core Platform — Declarative Index Manifest
+
+Modules declare the MongoDB indexes they need; the API reconciles the
+declarations against the live database once per boot, on one elected worker.
+
+Modules
+-------
+registry    — IndexSpec, IndexRegistry, the shared ``index_registry`` and ``declare_index``
+reconciler  — reconcile_indexes, reconcile_indexes_on_startup, ensure_collection_indexes, index_usage_report
+
+CLI
+---
+``python -m src.core.indexes [--create]`` reports missing / undeclared /
+never-used indexes (and optionally creates the missing ones).
+"""
+
+from .registry import IndexRegistry, IndexSpec, declare_index, index_registry
+from .reconciler import (
+    IndexReconcileReport,
+    ensure_collection_indexes,
+    index_usage_report,
+    reconcile_indexes,
+    reconcile_indexes_on_startup,
+)
+
+__all__ = [
+    "IndexRegistry",
+    "IndexSpec",
+    "declare_index",
+    "index_registry",
+    "IndexReconcileReport",
+    "ensure_collection_indexes",
+    "index_usage_report",
+    "reconcile_indexes",
+    "reconcile_indexes_on_startup",
+]
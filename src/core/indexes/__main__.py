@@ -0,0 +1,131 @@
+"""
+Index manifest CLI.
+
+Loads every module's declarations, then reports indexes that are declared
+but missing, present but undeclared, or never used since the server started
+(``$indexStats``).  Read-only unless ``--create`` is passed.
+
+Usage::
+
+    docker compose exec api python -m src.core.indexes
+    docker compose exec api python -m src.core.indexes --json
+    docker compose exec api python -m src.core.indexes --create
+
+Environment variables: ``MONGODB_URL`` and ``MONGODB_DB_NAME`` (same as the
+API, via src.config.settings).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from .reconciler import index_usage_report, reconcile_indexes
+from .registry import index_registry
+
+logger = logging.getLogger(__name__)
+
+# "module:callable" of every declaration entry point.  An empty callable means
+# the module declares at import time.
+_DECLARATION_SOURCES = [
+    "src.services.database:MongoDBManager._declare_indexes",
+    "src.modules.crm.services.database:CRMDatabaseManager._declare_indexes",
+    "src.modules.farm_manager.services.database:FarmDatabaseManager._declare_indexes",
+    "src.modules.finance.services.database:FinanceDatabaseManager._declare_indexes",
+    "src.modules.genetics.services.database:GeneticsDatabaseManager._declare_indexes",
+    "src.modules.hr.services.database:HRDatabaseManager._declare_indexes",
+    "src.modules.logistics.services.database:LogisticsDatabaseManager._declare_indexes",
+    "src.modules.marketing.services.database:MarketingDatabaseManager._declare_indexes",
+    "src.modules.mushroom_manager.services.database:MushroomDatabaseManager._declare_indexes",
+    "src.modules.protocols.services.database:ProtocolsDatabaseManager._declare_indexes",
+    "src.modules.sales.services.database:SalesDatabaseManager._declare_indexes",
+    "src.modules.farm_manager.services.watchdog.service:WatchdogService.declare_indexes",
+    "src.modules.farm_manager.services.ai_dashboard.service:AIDashboardService._declare_indexes",
+    "src.modules.farm_manager.services.sensehub.sync_service:SenseHubSyncService._declare_indexes",
+    "src.modules.farm_manager.services.weather.weather_cache_service:WeatherCacheService._declare_indexes",
+    "src.services.port_manager:PortManager._declare_indexes",
+    "src.modules.attachments.services.attachment_service:",
+    "src.modules.finance_bridge.outbox_repository:",
+    "src.core.jobs.runner:",
+    "src.core.search.index:",
+    "src.core.propagation.engine:",
+    "src.core.tokens.verifier:",
+    "src.core.inventory.valuation:",
+    "src.modules.farm_manager.services.ai_context.snapshot_service:",
+    "src.modules.ai_assistant.services.conversation_repository:",
+]
+
+
+def load_declarations() -> None:
+    """Import every declaring module and call its declaration hook."""
+    for source in _DECLARATION_SOURCES:
+        module_name, _, attr_path = source.partition(":")
+        try:
+            target = importlib.import_module(module_name)
+            for attr in filter(None, attr_path.split(".")):
+                target = getattr(target, attr)
+            if attr_path:
+                target()
+        except Exception as e:
+            logger.warning(f"Could not load index declarations from {source}: {e}")
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from src.config.settings import settings
+
+    load_declarations()
+    client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=5000)
+    try:
+        db = client[settings.MONGODB_DB_NAME]
+        report = await index_usage_report(db)
+        if args.create and report["missing"]:
+            created = await reconcile_indexes(db)
+            report["created"] = created.created
+            report["failed"] = created.failed
+    finally:
+        client.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Declared indexes: {len(index_registry)}")
+        for section in (
+            "missing",
+            "undeclared",
+            "zeroOps",
+            "nameDrift",
+            "optionDrift",
+            "created",
+        ):
+            entries = report.get(section)
+            if entries is None:
+                continue
+            print(f"\n{section} ({len(entries)}):")
+            for entry in entries:
+                print(f"  - {entry}")
+        for name, error in (report.get("failed") or {}).items():
+            print(f"  ! {name}: {error}")
+    return 1 if report["missing"] and not args.create else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Report missing / unused MongoDB indexes against the manifest."
+    )
+    parser.add_argument(
+        "--create", action="store_true", help="Create the missing indexes."
+    )
+    parser.add_argument("--json", action="store_true", help="Emit JSON.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+A64 Core Platform — Index Reconciler
+
+Diffs the declared ``index_registry`` against the live database and creates
+only what is missing.
+
+Why this exists
+---------------
+Every module used to ``await create_index(...)`` one index at a time from its
+``connect()`` hook — several hundred sequential round trips on every boot of
+every uvicorn worker, all of them no-ops after the first deploy.  The
+reconciler instead:
+
+  1. lists the existing indexes of every declared collection (one
+     ``listIndexes`` per collection, run concurrently under a bounded pool),
+  2. computes the missing specs in memory, and
+  3. creates them with one ``createIndexes`` command per collection, again
+     under the bounded pool.
+
+``reconcile_indexes_on_startup`` wraps that in a Redis leader election so a
+single worker does the work and the others skip it, and remembers the
+manifest fingerprint per database so restarts with an unchanged manifest skip
+the lock and the createIndexes round.  The marker is only a hint: before
+trusting it every boot re-lists the indexes (step 1 alone) and falls back to a
+full reconciliation if anything declared is missing — a shared Redis, or a
+database dropped and restored behind an unchanged marker, must not leave
+unique indexes unbuilt.
+
+Matching rules
+--------------
+A declared spec counts as present when the collection already has an index
+with the same name, or with the same key pattern and the same
+``partialFilterExpression`` (the server refuses to build a second index with
+an identical key pattern under another name, so that case is reported as
+"name drift" instead of failing at create time).  A present index whose
+``unique``, ``sparse``, ``expireAfterSeconds`` or ``partialFilterExpression``
+differs from the declaration is reported as "option drift": it is not
+recreated (the server would refuse), but a non-unique index never silently
+stands in for a unique declaration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .registry import IndexRegistry, IndexSpec, index_registry
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent listIndexes/createIndexes commands.  Index builds
+# are server-side work; an unbounded fan-out on a fresh database would queue
+# dozens of builds on the primary at once.
+DEFAULT_CONCURRENCY = 8
+
+LOCK_KEY = "indexes:reconcile_lock"
+LOCK_TTL_SECONDS = 300
+DONE_KEY_PREFIX = "indexes:reconciled"
+DONE_TTL_SECONDS = 24 * 3600
+
+
+@dataclass
+class IndexReconcileReport:
+    """Outcome of one reconciliation pass."""
+
+    collections_checked: int = 0
+    declared: int = 0
+    missing: List[str] = field(default_factory=list)
+    created: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    name_drift: List[str] = field(default_factory=list)
+    option_drift: List[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+    skipped_reason: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "collectionsChecked": self.collections_checked,
+            "declared": self.declared,
+            "missing": self.missing,
+            "created": self.created,
+            "failed": self.failed,
+            "nameDrift": self.name_drift,
+            "optionDrift": self.option_drift,
+            "durationMs": round(self.duration_ms, 1),
+            "skippedReason": self.skipped_reason,
+        }
+
+
+def _existing_matches(
+    spec: IndexSpec, existing: Dict[str, Dict[str, Any]]
+) -> Optional[str]:
+    """
+    Return the name of the existing index satisfying ``spec``, or None.
+    """
+    if spec.name in existing:
+        return spec.name
+    wanted_keys = [list(pair) for pair in spec.keys]
+    wanted_partial = spec.option_dict.get("partialFilterExpression")
+    for name, info in existing.items():
+        keys = [list(pair) for pair in info.get("key", [])]
+        if (
+            keys == wanted_keys
+            and info.get("partialFilterExpression") == wanted_partial
+        ):
+            return name
+    return None
+
+
+# Options whose difference changes what the index enforces or keeps.
+_COMPARED_OPTIONS = (
+    "unique",
+    "sparse",
+    "expireAfterSeconds",
+    "partialFilterExpression",
+)
+_BOOLEAN_OPTIONS = {"unique", "sparse"}
+
+
+def _option_mismatches(spec: IndexSpec, info: Dict[str, Any]) -> List[str]:
+    """
+    ``option: declared != existing`` for every compared option that differs
+    between ``spec`` and the existing index ``info``.
+    """
+    declared = spec.option_dict
+    mismatches: List[str] = []
+    for option in _COMPARED_OPTIONS:
+        wanted, actual = declared.get(option), info.get(option)
+        if option in _BOOLEAN_OPTIONS:
+            wanted, actual = bool(wanted), bool(actual)
+        if wanted != actual:
+            mismatches.append(f"{option}: {wanted!r} != {actual!r}")
+    return mismatches
+
+
+def diff_collection(
+    specs: List[IndexSpec], existing: Dict[str, Dict[str, Any]]
+) -> tuple[List[IndexSpec], List[str], List[str]]:
+    """
+    Split ``specs`` into (missing, name_drift, option_drift) against
+    ``existing`` (the ``index_information()`` mapping of one collection).
+    """
+    missing: List[IndexSpec] = []
+    drift: List[str] = []
+    option_drift: List[str] = []
+    for spec in specs:
+        match = _existing_matches(spec, existing)
+        if match is None:
+            missing.append(spec)
+            continue
+        if match != spec.name:
+            drift.append(f"{spec.collection}.{spec.name} (exists as {match})")
+        mismatches = _option_mismatches(spec, existing[match])
+        if mismatches:
+            option_drift.append(
+                f"{spec.collection}.{spec.name} ({'; '.join(mismatches)})"
+            )
+    return missing, drift, option_drift
+
+
+async def _create_missing(
+    db, collection: str, missing: List[IndexSpec], report: IndexReconcileReport
+) -> None:
+    """
+    Create ``missing`` on one collection with a single createIndexes command,
+    falling back to one-by-one creation so a single bad spec cannot block
+    the rest of the collection.
+    """
+    coll = db[collection]
+    try:
+        await coll.create_indexes([spec.to_index_model() for spec in missing])
+        report.created.extend(f"{collection}.{spec.name}" for spec in missing)
+        return
+    except OperationFailure as e:
+        if len(missing) == 1:
+            report.failed[f"{collection}.{missing[0].name}"] = str(e)
+            return
+        logger.warning(
+            f"[Indexes] Batch create on {collection} failed ({e}); retrying one by one"
+        )
+
+    for spec in missing:
+        try:
+            await coll.create_indexes([spec.to_index_model()])
+            report.created.append(f"{collection}.{spec.name}")
+        except PyMongoError as e:
+            report.failed[f"{collection}.{spec.name}"] = str(e)
+
+
+async def reconcile_indexes(
+    db,
+    registry: Optional[IndexRegistry] = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    dry_run: bool = False,
+    collections: Optional[List[str]] = None,
+) -> IndexReconcileReport:
+    """
+    Create every declared index that does not exist yet.
+
+    Args:
+        db: Motor database.
+        registry: Registry to reconcile (defaults to the shared one).
+        concurrency: Max concurrent listIndexes/createIndexes commands.
+        dry_run: Only compute ``missing`` — create nothing.
+        collections: Restrict to these collections.
+
+    Returns:
+        IndexReconcileReport.
+    """
+    registry = registry if registry is not None else index_registry
+    started = time.perf_counter()
+    report = IndexReconcileReport()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    targets = collections if collections is not None else registry.collections()
+
+    async def _one(collection: str) -> None:
+        specs = registry.specs(collection)
+        if not specs:
+            return
+        async with semaphore:
+            try:
+                existing = await db[collection].index_information()
+            except PyMongoError as e:
+                for spec in specs:
+                    report.failed[f"{collection}.{spec.name}"] = f"listIndexes: {e}"
+                return
+            missing, drift, option_drift = diff_collection(specs, existing)
+            report.collections_checked += 1
+            report.declared += len(specs)
+            report.name_drift.extend(drift)
+            report.option_drift.extend(option_drift)
+            report.missing.extend(f"{collection}.{spec.name}" for spec in missing)
+            if missing and not dry_run:
+                await _create_missing(db, collection, missing, report)
+
+    await asyncio.gather(*(_one(c) for c in targets))
+
+    report.duration_ms = (time.perf_counter() - started) * 1000
+    return report
+
+
+async def ensure_collection_indexes(db, collection: str) -> IndexReconcileReport:
+    """
+    Reconcile a single collection's declarations immediately.
+
+    For standalone processes (workers, scripts) that do not go through the
+    API startup path but still need their collection's indexes in place.
+    """
+    return await reconcile_indexes(db, collections=[collection])
+
+
+async def _get_redis():
+    from src.core.cache.redis_cache import get_redis_cache
+
+    cache = await get_redis_cache()
+    if not cache.is_available or not cache._redis:
+        return None
+    return cache._redis
+
+
+async def reconcile_indexes_on_startup(
+    db,
+    registry: Optional[IndexRegistry] = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> IndexReconcileReport:
+    """
+    Leader-elected reconciliation for API boot.
+
+    Exactly one worker wins ``SET NX`` on ``indexes:reconcile_lock:<db>`` and
+    runs the reconciliation; the others return immediately.  After a clean
+    pass the winner records the manifest fingerprint for this database, so
+    later boots with the same manifest (a routine restart, a scaled-out
+    worker) only verify it with a dry run — one listIndexes per collection —
+    and skip when nothing is missing.  A marker that no longer matches the
+    live database is dropped and the boot reconciles as usual.
+
+    When Redis is unavailable every worker reconciles — the operation is
+    idempotent, just slower, matching the watchdog scheduler's "better noisy
+    than silent" fallback.
+    """
+    registry = registry if registry is not None else index_registry
+    fingerprint = registry.fingerprint()
+    lock_key = f"{LOCK_KEY}:{db.name}"
+    done_key = f"{DONE_KEY_PREFIX}:{db.name}:{fingerprint}"
+
+    redis = None
+    try:
+        redis = await _get_redis()
+    except Exception as e:
+        logger.warning(f"[Indexes] Redis unavailable for leader election: {e}")
+
+    if redis is not None:
+        try:
+            if await redis.exists(done_key):
+                check = await reconcile_indexes(
+                    db, registry, concurrency=concurrency, dry_run=True
+                )
+                if not check.missing and not check.failed:
+                    check.skipped_reason = "manifest already applied"
+                    return check
+                logger.warning(
+                    f"[Indexes] Manifest marker for {db.name} is stale "
+                    f"({len(check.missing)} missing); reconciling"
+                )
+                await redis.delete(done_key)
+            acquired = await redis.set(
+                lock_key, fingerprint, nx=True, ex=LOCK_TTL_SECONDS
+            )
+            if not acquired:
+                return IndexReconcileReport(
+                    declared=len(registry),
+                    skipped_reason="another worker is reconciling",
+                )
+        except Exception as e:
+            logger.warning(f"[Indexes] Leader election failed, reconciling anyway: {e}")
+            redis = None
+
+    try:
+        report = await reconcile_indexes(db, registry, concurrency=concurrency)
+    finally:
+        if redis is not None:
+            try:
+                await redis.delete(lock_key)
+            except Exception:
+                pass
+
+    if redis is not None and not report.failed:
+        try:
+            await redis.set(done_key, "1", ex=DONE_TTL_SECONDS)
+        except Exception:
+            pass
+
+    log = logger.warning if report.failed else logger.info
+    log(
+        f"[Indexes] Reconciled {report.declared} declared indexes across "
+        f"{report.collections_checked} collections in {report.duration_ms:.0f}ms: "
+        f"{len(report.created)} created, {len(report.failed)} failed"
+    )
+    for name, error in report.failed.items():
+        logger.error(f"[Indexes] Failed to create {name}: {error}")
+    for entry in report.option_drift:
+        logger.warning(f"[Indexes] Existing index differs from declaration: {entry}")
+    return report
+
+
+async def index_usage_report(
+    db,
+    registry: Optional[IndexRegistry] = None,
+) -> Dict[str, Any]:
+    """
+    Report declared-but-missing and existing-but-unused indexes.
+
+    "Unused" covers two cases per collection:
+      - undeclared: the index exists but no module declares it;
+      - zero_ops: ``$indexStats`` shows no accesses since the server started
+        (or since the index was built).
+
+    ``_id_`` is never reported.
+
+    Returns:
+        ``{"missing": [...], "undeclared": [...], "zeroOps": [...],
+        "nameDrift": [...], "optionDrift": [...]}`` with
+        ``collection.indexName`` strings.
+    """
+    registry = registry if registry is not None else index_registry
+    dry = await reconcile_indexes(db, registry, dry_run=True)
+
+    undeclared: List[str] = []
+    zero_ops: List[str] = []
+    for collection in registry.collections():
+        declared_names = {spec.name for spec in registry.specs(collection)}
+        try:
+            stats = (
+                await db[collection]
+                .aggregate([{"$indexStats": {}}])
+                .to_list(length=None)
+            )
+        except PyMongoError as e:
+            logger.warning(f"[Indexes] $indexStats failed on {collection}: {e}")
+            continue
+        for stat in stats:
+            name = stat.get("name")
+            if name == "_id_":
+                continue
+            if name not in declared_names:
+                undeclared.append(f"{collection}.{name}")
+            ops = (stat.get("accesses") or {}).get("ops", 0)
+            if not ops:
+                zero_ops.append(f"{collection}.{name}")
+
+    return {
+        "missing": sorted(dry.missing),
+        "undeclared": sorted(undeclared),
+        "zeroOps": sorted(zero_ops),
+        "nameDrift": sorted(dry.name_drift),
+        "optionDrift": sorted(dry.option_drift),
+    }
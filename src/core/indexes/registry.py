@@ -0,0 +1,212 @@
+"""
+A64 Core Platform — Declarative Index Registry
+
+Every module declares the MongoDB indexes it needs into one process-wide
+registry instead of calling ``create_index`` itself.  Declaring is a pure,
+synchronous, in-memory operation — no round trip — so it is safe to do from
+``connect()`` hooks, service ``initialize()`` methods or at import time.
+
+The registry is reconciled against the live database once per deployment
+boot by ``reconciler.reconcile_indexes_on_startup`` (see that module for the
+leader election and diffing).
+
+Usage::
+
+    from src.core.indexes import declare_index
+
+    declare_index("farms", "farmId", unique=True)
+    declare_index("blocks", [("farmId", 1), ("farmingYearPlanted", 1)])
+
+The ``keys`` / ``**options`` arguments are exactly what you would pass to
+Motor's ``create_index`` — converting an existing call is a one-line change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pymongo import IndexModel
+
+logger = logging.getLogger(__name__)
+
+IndexKeys = Union[str, Sequence[Tuple[str, Any]]]
+
+# Options that do not change what the server builds — ignored when comparing a
+# declared index with an existing one.  ``background`` is a no-op since
+# MongoDB 4.2 but several modules still pass it.
+_NON_IDENTITY_OPTIONS = frozenset({"background", "name"})
+
+
+def normalize_keys(keys: IndexKeys) -> List[Tuple[str, Any]]:
+    """
+    Normalise ``create_index``-style keys into an ordered list of pairs.
+
+    ``"email"`` becomes ``[("email", 1)]``; a list of ``(field, direction)``
+    tuples is returned as a list of tuples.
+    """
+    if isinstance(keys, str):
+        return [(keys, 1)]
+    return [(str(k), v) for k, v in keys]
+
+
+def default_index_name(keys: List[Tuple[str, Any]]) -> str:
+    """Mirror the server/pymongo default name: ``field_1_other_-1``."""
+    return "_".join(f"{k}_{v}" for k, v in keys)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """
+    One declared index.
+
+    Attributes:
+        collection: Target collection name.
+        keys: Ordered ``(field, direction)`` pairs.
+        options: ``create_index`` keyword options (unique, sparse,
+            expireAfterSeconds, partialFilterExpression, collation, ...).
+        owner: Free-text label of the declaring module, shown in reports.
+    """
+
+    collection: str
+    keys: Tuple[Tuple[str, Any], ...]
+    options: Tuple[Tuple[str, Any], ...] = field(default_factory=tuple)
+    owner: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return dict(self.options).get("name") or default_index_name(list(self.keys))
+
+    @property
+    def option_dict(self) -> Dict[str, Any]:
+        return dict(self.options)
+
+    def identity(self) -> str:
+        """
+        Canonical JSON of everything that makes two index specs the "same
+        index" on the server (keys in order + behaviour-changing options).
+        """
+        opts = {k: v for k, v in sorted(self.options) if k not in _NON_IDENTITY_OPTIONS}
+        return json.dumps(
+            {"key": [[k, v] for k, v in self.keys], "options": opts},
+            sort_keys=True,
+            default=str,
+        )
+
+    def to_index_model(self) -> IndexModel:
+        opts = self.option_dict
+        opts["name"] = self.name
+        return IndexModel(list(self.keys), **opts)
+
+
+class IndexRegistry:
+    """
+    Thread-safe, de-duplicating collection of ``IndexSpec`` declarations.
+
+    Re-declaring an identical spec (same collection + name + identity) is a
+    no-op, so ``initialize()`` methods that run more than once are harmless.
+    Declaring a *different* spec under an existing name raises ``ValueError``
+    — the server would reject it with IndexOptionsConflict anyway, and
+    failing at declaration time points at the module that caused it.
+    """
+
+    def __init__(self) -> None:
+        self._specs: Dict[Tuple[str, str], IndexSpec] = {}
+        self._lock = threading.Lock()
+
+    def declare(
+        self,
+        collection: str,
+        keys: IndexKeys,
+        *,
+        owner: Optional[str] = None,
+        **options: Any,
+    ) -> IndexSpec:
+        """
+        Declare an index.  Arguments mirror Motor's ``create_index``.
+
+        Args:
+            collection: Target collection name.
+            keys: Field name or list of ``(field, direction)`` pairs.
+            owner: Optional module label for reporting.
+            **options: ``create_index`` options.
+
+        Returns:
+            The registered ``IndexSpec``.
+
+        Raises:
+            ValueError: If a different spec is already declared under the
+                same collection/name.
+        """
+        spec = IndexSpec(
+            collection=collection,
+            keys=tuple(normalize_keys(keys)),
+            options=tuple(sorted(options.items())),
+            owner=owner,
+        )
+        key = (collection, spec.name)
+        with self._lock:
+            existing = self._specs.get(key)
+            if existing is not None:
+                if existing.identity() != spec.identity():
+                    raise ValueError(
+                        f"Conflicting index declaration for {collection}.{spec.name}: "
+                        f"{existing.identity()} vs {spec.identity()}"
+                    )
+                return existing
+            self._specs[key] = spec
+        return spec
+
+    def specs(self, collection: Optional[str] = None) -> List[IndexSpec]:
+        """All declared specs, optionally filtered to one collection."""
+        with self._lock:
+            specs = list(self._specs.values())
+        if collection is not None:
+            specs = [s for s in specs if s.collection == collection]
+        return specs
+
+    def collections(self) -> List[str]:
+        """Sorted names of every collection with at least one declaration."""
+        with self._lock:
+            return sorted({c for c, _ in self._specs})
+
+    def fingerprint(self) -> str:
+        """
+        Stable hash of the full manifest.  Changes whenever any declaration is
+        added, removed or altered — used to skip reconciliation when a
+        previous boot already applied this exact manifest.
+        """
+        with self._lock:
+            items = sorted(
+                f"{spec.collection}|{spec.name}|{spec.identity()}"
+                for spec in self._specs.values()
+            )
+        return hashlib.sha256("\n".join(items).encode()).hexdigest()[:16]
+
+    def clear(self) -> None:
+        """Drop every declaration (tests only)."""
+        with self._lock:
+            self._specs.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._specs)
+
+
+# Process-wide registry every module declares into.
+index_registry = IndexRegistry()
+
+
+def declare_index(
+    collection: str,
+    keys: IndexKeys,
+    *,
+    owner: Optional[str] = None,
+    **options: Any,
+) -> IndexSpec:
+    """Declare an index on the shared ``index_registry``."""
+    return index_registry.declare(collection, keys, owner=owner, **options)
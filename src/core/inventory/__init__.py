@@ -0,0 +1,38 @@
+"""
+A64 Core Platform — Inventory
+
+Moving-average inventory valuation: an append-only stock-movement ledger per
+(organization, item, warehouse) and the running balances projected from it.
+
+Modules
+-------
+valuation — StockMovement, Balance, PostedMovement, InventoryConflictError,
+            apply_movement, post_movements, post_movement, get_balances,
+            valuation_as_of, rebuild_balances
+"""
+
+from .valuation import (
+    Balance,
+    InventoryConflictError,
+    PostedMovement,
+    StockMovement,
+    apply_movement,
+    get_balances,
+    post_movement,
+    post_movements,
+    rebuild_balances,
+    valuation_as_of,
+)
+
+__all__ = [
+    "Balance",
+    "InventoryConflictError",
+    "PostedMovement",
+    "StockMovement",
+    "apply_movement",
+    "get_balances",
+    "post_movement",
+    "post_movements",
+    "rebuild_balances",
+    "valuation_as_of",
+]
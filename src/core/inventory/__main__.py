@@ -0,0 +1,102 @@
+"""
+Inventory valuation CLI.
+
+``rebuild`` replays the ledger, reports entries that disagree with the
+moving-average rule, seq gaps and balances that drifted from the ledger, and
+repairs those balances (read-only with ``--dry-run``).  ``valuation`` prints
+the quantity, value and average cost per item/warehouse as of a date.
+
+Usage::
+
+    docker compose exec api python -m src.core.inventory rebuild --dry-run
+    docker compose exec api python -m src.core.inventory rebuild --org <orgId>
+    docker compose exec api python -m src.core.inventory valuation \\
+        --org <orgId> --as-of 2026-06-30T23:59:59
+
+Environment variables: ``MONGODB_URL`` and ``MONGODB_DB_NAME`` (same as the
+API, via src.config.settings).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from .valuation import rebuild_balances, valuation_as_of
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from src.config.settings import settings
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=5000)
+    try:
+        db = client[settings.MONGODB_DB_NAME]
+        if args.command == "rebuild":
+            report = await rebuild_balances(db, args.org, dry_run=args.dry_run)
+        else:
+            as_of = datetime.fromisoformat(args.as_of)
+            if as_of.tzinfo is None:
+                as_of = as_of.replace(tzinfo=timezone.utc)
+            balances = await valuation_as_of(db, args.org, as_of)
+            report = {
+                "asOf": as_of.isoformat(),
+                "totalValue": str(sum(b.value for b in balances)),
+                "balances": [
+                    {
+                        "itemId": b.item_id,
+                        "warehouseId": b.warehouse_id,
+                        "quantity": str(b.quantity),
+                        "value": str(b.value),
+                        "avgCost": str(b.avg_cost),
+                    }
+                    for b in balances
+                ],
+            }
+    finally:
+        client.close()
+
+    if args.command == "valuation" or args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Keys replayed: {report['keys']}  entries: {report['entries']}")
+        for section in ("mismatches", "gaps", "drifted"):
+            print(f"\n{section} ({len(report[section])}):")
+            for entry in report[section]:
+                print(f"  - {entry}")
+        print(f"\nrepaired: {report['repaired']}")
+    if args.command == "rebuild":
+        return 1 if report["mismatches"] or report["gaps"] else 0
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inventory valuation ledger tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser(
+        "rebuild", help="Replay the ledger and repair drifted balances."
+    )
+    rebuild.add_argument("--org", help="Only this organization.")
+    rebuild.add_argument(
+        "--dry-run", action="store_true", help="Report only; write nothing."
+    )
+    rebuild.add_argument("--json", action="store_true", help="Emit JSON.")
+    valuation = commands.add_parser(
+        "valuation", help="Stock valuation per item/warehouse as of a date."
+    )
+    valuation.add_argument("--org", required=True, help="Organization ID.")
+    valuation.add_argument(
+        "--as-of", required=True, help="ISO date/time (UTC when no offset)."
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
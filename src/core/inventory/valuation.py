@@ -0,0 +1,682 @@
+"""
+A64 Core Platform — Inventory Valuation Ledger
+
+Every stock movement valued at moving-average cost is appended to
+``inventory_ledger``; ``inventory_balances`` holds the running state per
+(organization, item, warehouse) that document builders read.
+
+Ledger
+------
+One entry per movement, numbered ``seq`` 1, 2, 3… per balance key (unique
+index), carrying the movement (signed quantity, unit cost, value) and the
+balance after it (``quantityAfter``, ``valueAfter``, ``avgCostAfter``).
+Entries are never updated; the ledger is the source of truth and a balance
+is a projection of its latest entry.
+
+Moving average
+--------------
+``apply_movement`` is the one costing rule, used both when posting and when
+replaying:
+
+* issues (negative quantity) and receipts without a cost (returns) move
+  stock at the current average, which stays unchanged;
+* receipts with a cost (goods receipts, adjustments, reversals) add their
+  value and re-average — unless the position was empty or oversold, in
+  which case the receipt's cost becomes the average;
+* an empty position has no value left (rounding residue is dropped).
+
+Balances seeded before the ledger existed (``avgCost`` only) are taken as
+an ``opening`` entry the first time a movement is posted against them.
+
+Concurrency
+-----------
+``post_movements`` reads every balance it touches in one query, appends all
+entries with one ``insert_many`` and advances the balances with one
+``bulk_write`` of conditional updates (``seq`` must still be the one the
+entries were planned from).  A writer that loses the race for a ``seq``
+(duplicate key) re-plans its remaining movements from the ledger; a balance
+left behind by a lost update is brought up to the latest entry
+(``_catch_up``).  Inside a caller's transaction conflicts are raised
+instead, so the transaction aborts and can be retried as a whole.
+
+Reads
+-----
+``get_balances`` — current balances for many (item, warehouse) pairs in one
+query; ``valuation_as_of`` — the state per key as of a point in time, from
+the ledger; ``rebuild_balances`` — replay the ledger, verify every entry and
+repair drifted balances (also ``python -m src.core.inventory rebuild``).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from ..indexes import declare_index
+
+logger = logging.getLogger(__name__)
+
+LEDGER_COLLECTION = "inventory_ledger"
+BALANCES_COLLECTION = "inventory_balances"
+
+_KEY_FIELDS = ("organizationId", "itemId", "warehouseId")
+_QTY = Decimal("0.0001")
+_VALUE = Decimal("0.0001")
+_COST = Decimal("0.000001")
+_ZERO = Decimal("0")
+_MAX_ATTEMPTS = 10
+
+declare_index(
+    LEDGER_COLLECTION,
+    [
+        ("organizationId", ASCENDING),
+        ("itemId", ASCENDING),
+        ("warehouseId", ASCENDING),
+        ("seq", ASCENDING),
+    ],
+    name="key_seq_unique",
+    unique=True,
+)
+declare_index(
+    LEDGER_COLLECTION,
+    [("organizationId", ASCENDING), ("postedAt", ASCENDING)],
+    name="org_posted_at",
+)
+declare_index(
+    LEDGER_COLLECTION,
+    [("sourceDocType", ASCENDING), ("sourceDocEntry", ASCENDING)],
+    name="source_doc",
+)
+declare_index(
+    BALANCES_COLLECTION,
+    [("organizationId", ASCENDING), ("itemId", ASCENDING), ("warehouseId", ASCENDING)],
+    name="balance_key_unique",
+    unique=True,
+)
+
+# (organizationId, itemId, warehouseId)
+BalanceKey = Tuple[str, str, str]
+
+
+class InventoryConflictError(RuntimeError):
+    """A balance kept changing underneath a posting; retry the operation."""
+
+
+def _dec(value: Any) -> Decimal:
+    return Decimal(str(value)) if value is not None else _ZERO
+
+
+def _q(value: Decimal, places: Decimal) -> Decimal:
+    return value.quantize(places, rounding=ROUND_HALF_UP)
+
+
+def _key_filter(key: BalanceKey) -> Dict[str, Any]:
+    return dict(zip(_KEY_FIELDS, key))
+
+
+@dataclass(frozen=True)
+class StockMovement:
+    """
+    A quantity of one item moving into (positive) or out of (negative) a
+    warehouse.
+
+    Attributes:
+        unit_cost: Cost per unit of a receipt; None receives at the current
+            average.  Ignored for issues, which always leave at the average.
+        movement_type: e.g. ``goods_receipt``, ``delivery``,
+            ``delivery_reversal``, ``return``, ``return_reversal``,
+            ``adjustment``.
+    """
+
+    organization_id: str
+    item_id: str
+    warehouse_id: str
+    quantity: Decimal
+    movement_type: str
+    unit_cost: Optional[Decimal] = None
+    source_doc_type: Optional[str] = None
+    source_doc_entry: Optional[str] = None
+    source_doc_number: Optional[str] = None
+    source_line_id: Optional[str] = None
+    posted_by: Optional[str] = None
+
+    @property
+    def key(self) -> BalanceKey:
+        return (self.organization_id, self.item_id, self.warehouse_id)
+
+
+@dataclass(frozen=True)
+class Balance:
+    """Running state of one (organization, item, warehouse)."""
+
+    organization_id: str
+    item_id: str
+    warehouse_id: str
+    quantity: Decimal = _ZERO
+    value: Decimal = _ZERO
+    avg_cost: Decimal = _ZERO
+    seq: int = 0
+    stored: bool = False
+
+    @property
+    def key(self) -> BalanceKey:
+        return (self.organization_id, self.item_id, self.warehouse_id)
+
+    @property
+    def unledgered(self) -> bool:
+        """Seeded before the ledger existed, with stock or a cost to carry."""
+        return self.stored and self.seq == 0 and bool(self.quantity or self.avg_cost)
+
+    @classmethod
+    def from_doc(cls, key: BalanceKey, doc: Optional[Dict[str, Any]]) -> "Balance":
+        if doc is None:
+            return cls(*key)
+        avg_cost = _dec(
+            doc.get("avgCost") or doc.get("avg_cost") or doc.get("movingAvgCost")
+        )
+        quantity = _dec(doc.get("quantityOnHand", doc.get("quantity")))
+        value = (
+            _dec(doc["totalValue"])
+            if doc.get("totalValue") is not None
+            else _q(quantity * avg_cost, _VALUE)
+        )
+        return cls(*key, quantity, value, avg_cost, int(doc.get("seq") or 0), True)
+
+    @classmethod
+    def from_entry(cls, entry: Dict[str, Any]) -> "Balance":
+        return cls(
+            entry["organizationId"],
+            entry["itemId"],
+            entry["warehouseId"],
+            _dec(entry["quantityAfter"]),
+            _dec(entry["valueAfter"]),
+            _dec(entry["avgCostAfter"]),
+            int(entry["seq"]),
+            True,
+        )
+
+    def to_doc(self, now: datetime) -> Dict[str, Any]:
+        return {
+            **_key_filter(self.key),
+            "quantityOnHand": float(self.quantity),
+            "totalValue": float(self.value),
+            "avgCost": float(self.avg_cost),
+            "seq": self.seq,
+            "updatedAt": now,
+        }
+
+
+@dataclass(frozen=True)
+class PostedMovement:
+    """How a movement was valued: ``value`` is signed like its quantity."""
+
+    seq: int
+    unit_cost: Decimal
+    value: Decimal
+    balance: Balance
+
+
+def apply_movement(
+    balance: Balance, quantity: Decimal, unit_cost: Optional[Decimal]
+) -> Tuple[Balance, Decimal, Decimal]:
+    """
+    Apply one movement to a balance under moving-average costing.
+
+    Returns:
+        (balance after, unit cost applied, signed value moved)
+    """
+    new_qty = _q(balance.quantity + quantity, _QTY)
+    if quantity < 0 or unit_cost is None:
+        cost = balance.avg_cost
+        avg_cost = balance.avg_cost
+        new_value = _q(balance.value + quantity * cost, _VALUE)
+    elif balance.quantity <= 0:
+        cost = avg_cost = _q(unit_cost, _COST)
+        new_value = _q(new_qty * cost, _VALUE)
+    else:
+        cost = _q(unit_cost, _COST)
+        new_value = _q(balance.value + quantity * cost, _VALUE)
+        avg_cost = _q(new_value / new_qty, _COST) if new_qty > 0 else cost
+    if new_qty == 0:
+        new_value = _ZERO
+    after = Balance(
+        *balance.key,
+        quantity=new_qty,
+        value=new_value,
+        avg_cost=avg_cost,
+        seq=balance.seq + 1,
+        stored=True,
+    )
+    return after, cost, new_value - balance.value
+
+
+def _entry(
+    balance: Balance,
+    movement_type: str,
+    quantity: Decimal,
+    unit_cost: Decimal,
+    value: Decimal,
+    now: datetime,
+    movement: Optional[StockMovement] = None,
+) -> Dict[str, Any]:
+    return {
+        **_key_filter(balance.key),
+        "seq": balance.seq,
+        "movementType": movement_type,
+        "quantity": float(quantity),
+        "unitCost": float(unit_cost),
+        # Moved at the average rather than at a cost of its own (replay)
+        "atAverage": movement is not None
+        and (quantity < 0 or movement.unit_cost is None),
+        "value": float(value),
+        "quantityAfter": float(balance.quantity),
+        "valueAfter": float(balance.value),
+        "avgCostAfter": float(balance.avg_cost),
+        "sourceDocType": movement.source_doc_type if movement else None,
+        "sourceDocEntry": movement.source_doc_entry if movement else None,
+        "sourceDocNumber": movement.source_doc_number if movement else None,
+        "sourceLineId": movement.source_line_id if movement else None,
+        "postedAt": now,
+        "postedBy": movement.posted_by if movement else None,
+    }
+
+
+def _plan(
+    balance: Balance, movements: Sequence[StockMovement], now: datetime
+) -> Tuple[List[Dict[str, Any]], List[Optional[PostedMovement]], Balance]:
+    """Ledger entries for ``movements`` on top of ``balance``."""
+    entries: List[Dict[str, Any]] = []
+    posted: List[Optional[PostedMovement]] = []
+    if balance.unledgered:
+        # Adopt the pre-ledger balance as the key's first entry
+        balance = Balance(
+            *balance.key,
+            quantity=balance.quantity,
+            value=balance.value,
+            avg_cost=balance.avg_cost,
+            seq=balance.seq + 1,
+            stored=True,
+        )
+        entries.append(
+            _entry(
+                balance,
+                "opening",
+                balance.quantity,
+                balance.avg_cost,
+                balance.value,
+                now,
+            )
+        )
+        posted.append(None)
+    for movement in movements:
+        balance, cost, value = apply_movement(
+            balance, _dec(movement.quantity), movement.unit_cost
+        )
+        entries.append(
+            _entry(
+                balance,
+                movement.movement_type,
+                _dec(movement.quantity),
+                cost,
+                value,
+                now,
+                movement,
+            )
+        )
+        posted.append(PostedMovement(balance.seq, cost, value, balance))
+    return entries, posted, balance
+
+
+def _seq_filter(balance: Balance) -> Dict[str, Any]:
+    # Pre-ledger balances have no seq at all
+    return {"seq": balance.seq} if balance.seq else {"seq": {"$in": [0, None]}}
+
+
+def _is_duplicate(error: Exception) -> bool:
+    if isinstance(error, DuplicateKeyError):
+        return True
+    errors = getattr(error, "details", {}).get("writeErrors", [])
+    return bool(errors) and all(e.get("code") == 11000 for e in errors)
+
+
+async def _load_balances(
+    db, keys: Iterable[BalanceKey], session=None
+) -> Dict[BalanceKey, Balance]:
+    """Current balances of ``keys`` (absent ones empty), one query per org."""
+    by_org: Dict[str, List[BalanceKey]] = {}
+    for key in keys:
+        by_org.setdefault(key[0], []).append(key)
+    balances: Dict[BalanceKey, Balance] = {}
+    for org_id, org_keys in by_org.items():
+        wanted = set(org_keys)
+        cursor = db[BALANCES_COLLECTION].find(
+            {
+                "organizationId": org_id,
+                "itemId": {"$in": sorted({k[1] for k in org_keys})},
+                "warehouseId": {"$in": sorted({k[2] for k in org_keys})},
+            },
+            session=session,
+        )
+        for doc in await cursor.to_list(length=None):
+            key = (org_id, doc["itemId"], doc["warehouseId"])
+            if key in wanted:
+                balances[key] = Balance.from_doc(key, doc)
+        for key in org_keys:
+            balances.setdefault(key, Balance(*key))
+    return balances
+
+
+async def get_balances(
+    db,
+    org_id: str,
+    pairs: Iterable[Tuple[str, str]],
+    *,
+    session=None,
+) -> Dict[Tuple[str, str], Balance]:
+    """
+    Current balances for many (item, warehouse) pairs in one query.
+
+    Returns:
+        ``{(item_id, warehouse_id): Balance}`` for the pairs that have a
+        balance record; pairs never stocked are absent.
+    """
+    keys = [(org_id, item_id, warehouse_id) for item_id, warehouse_id in pairs]
+    if not keys:
+        return {}
+    balances = await _load_balances(db, keys, session=session)
+    return {
+        (key[1], key[2]): balance for key, balance in balances.items() if balance.stored
+    }
+
+
+async def _set_balance(db, current: Balance, target: Balance, session=None) -> bool:
+    """Move ``current`` to ``target`` unless someone else moved it first."""
+    try:
+        result = await db[BALANCES_COLLECTION].find_one_and_update(
+            {**_key_filter(current.key), **_seq_filter(current)},
+            {"$set": target.to_doc(datetime.now(tz=timezone.utc))},
+            upsert=not current.stored,
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+    except DuplicateKeyError:
+        return False
+    return result is not None
+
+
+async def _catch_up(db, key: BalanceKey, session=None) -> Balance:
+    """Bring a balance up to the key's latest ledger entry and return it."""
+    for _ in range(_MAX_ATTEMPTS):
+        balance = Balance.from_doc(
+            key,
+            await db[BALANCES_COLLECTION].find_one(_key_filter(key), session=session),
+        )
+        last = await db[LEDGER_COLLECTION].find_one(
+            _key_filter(key), sort=[("seq", DESCENDING)], session=session
+        )
+        if last is None or int(last["seq"]) <= balance.seq:
+            return balance
+        target = Balance.from_entry(last)
+        if await _set_balance(db, balance, target, session=session):
+            return target
+    raise InventoryConflictError(f"Balance {key} kept changing during catch-up")
+
+
+async def _advance_balances(
+    db, moves: Dict[BalanceKey, Tuple[Balance, Balance]], session=None
+) -> None:
+    """Apply planned balance moves in one round trip, catching up losers."""
+    if not moves:
+        return
+    now = datetime.now(tz=timezone.utc)
+    keys = list(moves)
+    operations = [
+        UpdateOne(
+            {**_key_filter(key), **_seq_filter(moves[key][0])},
+            {"$set": moves[key][1].to_doc(now)},
+            upsert=not moves[key][0].stored,
+        )
+        for key in keys
+    ]
+    try:
+        result = await db[BALANCES_COLLECTION].bulk_write(
+            operations, ordered=False, session=session
+        )
+        applied = result.matched_count + result.upserted_count
+    except BulkWriteError as e:
+        if not _is_duplicate(e):
+            raise
+        applied = -1
+    if applied != len(operations):
+        # Some balance moved under us (or lagged the ledger): converge every
+        # touched key on its latest entry, which includes ours
+        for key in keys:
+            await _catch_up(db, key, session=session)
+
+
+async def post_movements(
+    db,
+    movements: Sequence[StockMovement],
+    *,
+    session=None,
+) -> List[PostedMovement]:
+    """
+    Append ``movements`` to the ledger and advance their balances.
+
+    Movements of the same key are applied in the given order.
+
+    Args:
+        db: Motor database.
+        movements: The movements to post (quantity must not be zero).
+        session: Optional Motor session; inside a transaction a conflicting
+            concurrent posting raises instead of being retried.
+
+    Returns:
+        One ``PostedMovement`` per movement, in input order.
+
+    Raises:
+        ValueError: If a movement has zero quantity.
+        InventoryConflictError: If the balances kept changing concurrently.
+    """
+    for movement in movements:
+        if _dec(movement.quantity) == 0:
+            raise ValueError(f"Stock movement with zero quantity: {movement}")
+    results: List[Optional[PostedMovement]] = [None] * len(movements)
+    pending = list(range(len(movements)))
+    balances = await _load_balances(
+        db, {movement.key for movement in movements}, session=session
+    )
+    started: Dict[BalanceKey, Balance] = {}
+    ledger = db[LEDGER_COLLECTION]
+
+    for _ in range(_MAX_ATTEMPTS):
+        if not pending:
+            break
+        now = datetime.now(tz=timezone.utc)
+        by_key: Dict[BalanceKey, List[int]] = {}
+        for index in pending:
+            by_key.setdefault(movements[index].key, []).append(index)
+        entries: List[Dict[str, Any]] = []
+        owners: List[Tuple[BalanceKey, Optional[int], Optional[PostedMovement]]] = []
+        for key, indexes in by_key.items():
+            key_entries, posted, after = _plan(
+                balances[key], [movements[i] for i in indexes], now
+            )
+            started.setdefault(key, balances[key])
+            balances[key] = after
+            entries.extend(key_entries)
+            movement_indexes = iter(indexes)
+            owners.extend(
+                (key, next(movement_indexes) if p is not None else None, p)
+                for p in posted
+            )
+        try:
+            await ledger.insert_many(entries, ordered=True, session=session)
+            inserted = len(entries)
+        except (BulkWriteError, DuplicateKeyError) as e:
+            if session is not None or not _is_duplicate(e):
+                raise
+            inserted = getattr(e, "details", {}).get("nInserted", 0)
+        for key, index, posted in owners[:inserted]:
+            if index is not None:
+                results[index] = posted
+        pending = [index for _, index, _ in owners[inserted:] if index is not None]
+        if inserted < len(entries):
+            # Lost the race for a seq: re-plan that key from the ledger;
+            # keys not reached yet keep their (still valid) balances
+            lost_key = owners[inserted][0]
+            balances[lost_key] = await _catch_up(db, lost_key, session=session)
+            started[lost_key] = balances[lost_key]
+            for key, index, _ in owners[inserted:]:
+                if key != lost_key:
+                    balances[key] = started[key]
+    if pending:
+        raise InventoryConflictError("Stock movements kept conflicting; retry")
+
+    await _advance_balances(
+        db,
+        {
+            key: (started[key], balances[key])
+            for key in started
+            if balances[key].seq > started[key].seq
+        },
+        session=session,
+    )
+    return results  # type: ignore[return-value]
+
+
+async def post_movement(db, movement: StockMovement, *, session=None) -> PostedMovement:
+    """Post a single movement (see ``post_movements``)."""
+    return (await post_movements(db, [movement], session=session))[0]
+
+
+async def valuation_as_of(
+    db,
+    org_id: str,
+    as_of: datetime,
+    *,
+    item_id: Optional[str] = None,
+    warehouse_id: Optional[str] = None,
+) -> List[Balance]:
+    """
+    Quantity, value and average cost per (item, warehouse) as of ``as_of``.
+
+    Taken from each key's last ledger entry posted at or before ``as_of``;
+    keys with no stock and no value at that time are omitted.
+    """
+    match: Dict[str, Any] = {"organizationId": org_id, "postedAt": {"$lte": as_of}}
+    if item_id is not None:
+        match["itemId"] = item_id
+    if warehouse_id is not None:
+        match["warehouseId"] = warehouse_id
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"itemId": 1, "warehouseId": 1, "seq": -1}},
+        {
+            "$group": {
+                "_id": {"itemId": "$itemId", "warehouseId": "$warehouseId"},
+                "entry": {"$first": "$$ROOT"},
+            }
+        },
+        {"$sort": {"_id.itemId": 1, "_id.warehouseId": 1}},
+    ]
+    rows = await db[LEDGER_COLLECTION].aggregate(pipeline).to_list(length=None)
+    balances = [Balance.from_entry(row["entry"]) for row in rows]
+    return [b for b in balances if b.quantity or b.value]
+
+
+async def rebuild_balances(
+    db,
+    org_id: Optional[str] = None,
+    *,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Replay the ledger, verify it and repair balances that drifted from it.
+
+    Every entry is re-derived from its predecessor with ``apply_movement``;
+    entries whose stored after-state disagrees, and gaps in ``seq``, are
+    reported.  A balance whose stored state differs from its replayed one
+    is reset to it (unless ``dry_run``), conditional on no newer posting
+    having landed meanwhile.
+
+    Returns:
+        Report with ``keys``, ``entries``, ``mismatches``, ``gaps``,
+        ``drifted`` and ``repaired``.
+    """
+    query: Dict[str, Any] = {} if org_id is None else {"organizationId": org_id}
+    cursor = (
+        db[LEDGER_COLLECTION]
+        .find(query)
+        .sort([(field, ASCENDING) for field in _KEY_FIELDS] + [("seq", ASCENDING)])
+    )
+    report: Dict[str, Any] = {
+        "keys": 0,
+        "entries": 0,
+        "mismatches": [],
+        "gaps": [],
+        "drifted": [],
+        "repaired": 0,
+    }
+    replayed: Dict[BalanceKey, Balance] = {}
+    state: Optional[Balance] = None
+    async for entry in cursor:
+        key = (entry["organizationId"], entry["itemId"], entry["warehouseId"])
+        if state is None or state.key != key:
+            report["keys"] += 1
+            state = Balance(*key)
+        report["entries"] += 1
+        seq = int(entry["seq"])
+        if seq != state.seq + 1:
+            report["gaps"].append({"key": list(key), "after": state.seq, "seq": seq})
+        if entry["movementType"] == "opening":
+            state = Balance.from_entry(entry)
+        else:
+            unit_cost = None if entry.get("atAverage") else _dec(entry["unitCost"])
+            after, _, _ = apply_movement(state, _dec(entry["quantity"]), unit_cost)
+            stored = Balance.from_entry(entry)
+            if (after.quantity, after.value, after.avg_cost) != (
+                stored.quantity,
+                stored.value,
+                stored.avg_cost,
+            ):
+                report["mismatches"].append({"key": list(key), "seq": seq})
+            # Continue from what was recorded, so one bad entry is one mismatch
+            state = stored
+        state = Balance(
+            *key,
+            quantity=state.quantity,
+            value=state.value,
+            avg_cost=state.avg_cost,
+            seq=seq,
+            stored=True,
+        )
+        replayed[key] = state
+
+    current = await _load_balances(db, replayed)
+    for key, target in replayed.items():
+        balance = current[key]
+        if (balance.quantity, balance.value, balance.avg_cost, balance.seq) == (
+            target.quantity,
+            target.value,
+            target.avg_cost,
+            target.seq,
+        ):
+            continue
+        report["drifted"].append(
+            {
+                "key": list(key),
+                "stored": [str(balance.quantity), str(balance.value), balance.seq],
+                "ledger": [str(target.quantity), str(target.value), target.seq],
+            }
+        )
+        if not dry_run and balance.seq <= target.seq:
+            if await _set_balance(db, balance, target):
+                report["repaired"] += 1
+    return report
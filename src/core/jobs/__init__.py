@@ -0,0 +1,23 @@
+"""
+A64 Core Platform — Background Job Runner
+
+A single leader-elected runner for every periodic job (weather refresh,
+AI dashboard inspections, watchdog, SenseHub sync, harvest aggregation,
+inventory expiry).  Replaces the per-service asyncio loops that each ran in
+every uvicorn worker behind their own ad-hoc Redis locks.
+
+Modules
+-------
+cron    — CronSchedule (five-field UTC cron expressions)
+runner  — JobDefinition, JobRunner, get_job_runner
+"""
+
+from .cron import CronSchedule
+from .runner import JobDefinition, JobRunner, get_job_runner
+
+__all__ = [
+    "CronSchedule",
+    "JobDefinition",
+    "JobRunner",
+    "get_job_runner",
+]
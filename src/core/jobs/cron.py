@@ -0,0 +1,126 @@
+"""
+Minimal five-field cron expressions for the job runner.
+
+Supports the subset the platform actually uses::
+
+    minute hour day-of-month month day-of-week
+    *   */15   0,30   1-5   9-17/2
+
+Day-of-week is 0-6 with 0 = Sunday (7 is accepted as Sunday too).  When both
+day-of-month and day-of-week are restricted, a time matches if EITHER does —
+the classic Vixie-cron rule.  All evaluation is in UTC.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+_FIELD_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0, 59),  # minute
+    (0, 23),  # hour
+    (1, 31),  # day of month
+    (1, 12),  # month
+    (0, 7),  # day of week (0 and 7 are both Sunday)
+)
+
+# Upper bound on the minute-by-minute search (a little over four years, so
+# "0 0 29 2 *" always resolves).
+_MAX_SEARCH_MINUTES = 60 * 24 * 366 * 5
+
+
+def _parse_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"Invalid cron step: {step_text}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step != 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field value out of range: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A parsed cron expression."""
+
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    day_restricted: bool
+    weekday_restricted: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        """
+        Parse a five-field cron expression.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        parsed = [
+            _parse_field(text, low, high)
+            for text, (low, high) in zip(fields, _FIELD_RANGES)
+        ]
+        return cls(
+            expression=expression,
+            minutes=parsed[0],
+            hours=parsed[1],
+            days=parsed[2],
+            months=parsed[3],
+            weekdays=frozenset(v % 7 for v in parsed[4]),
+            day_restricted=fields[2] != "*",
+            weekday_restricted=fields[4] != "*",
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        # Reason: Python's weekday() is Monday=0; cron is Sunday=0.
+        cron_dow = (moment.weekday() + 1) % 7
+        day_ok = moment.day in self.days
+        dow_ok = cron_dow in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or dow_ok
+        return day_ok and dow_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        First matching minute strictly after ``after`` (naive UTC).
+        """
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(_MAX_SEARCH_MINUTES):
+            if moment.month not in self.months:
+                # Jump to the first minute of next month.
+                year = moment.year + (moment.month // 12)
+                month = moment.month % 12 + 1
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
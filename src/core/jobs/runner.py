@@ -0,0 +1,653 @@
+"""
+A64 Core Platform — Leader-Elected Background Job Runner
+
+One runner per API worker process; exactly one of them — the lease holder —
+schedules and executes jobs at any time.  The others only keep trying to take
+the lease, so a crashed leader is replaced within ``LEASE_TTL_SECONDS``.
+
+Collections
+-----------
+``job_runner_lease``  single ``{_id: "leader"}`` document; acquired/renewed
+                      with a conditional upsert (holder == me OR expired).
+``job_schedules``     one document per job: ``nextRunAt`` plus the last
+                      run's status, duration and lag.  Persisting
+                      ``nextRunAt`` is what makes missed runs catch up after
+                      a restart — a run that fell due while no worker was up
+                      is still due when the next leader looks.
+``job_runs``          the queue and the run history.  A due job becomes a
+                      ``queued`` run; the leader claims queued runs
+                      (``queued -> running``) up to each job's concurrency
+                      limit.  Manual triggers from any worker just insert a
+                      queued run.  Finished runs expire after 30 days.
+
+Scheduled runs coalesce: while a job already has a queued run, a due slot
+only bumps that run's ``coalesced`` counter instead of queueing another, so
+a job slower than its interval (or a backlog while dispatch is saturated)
+holds at most one queued run and never replays every missed slot.
+
+Fencing
+-------
+A running run carries ``leaseExpiresAt``, renewed by its leader on every
+tick.  A leader only recovers (marks abandoned and re-queues) runs of other
+workers whose lease has lapsed, and a leader that loses the election — or
+cannot renew its lease for ``LEASE_TTL_SECONDS`` — cancels its own in-flight
+runs.  ``RUN_LEASE_SECONDS`` is twice the leader lease, so a deposed leader
+has stopped its runs before anyone recovers them.  The final status write of
+a run is conditional on this worker still owning it (``workerId`` and
+``running``), so a run that was recovered elsewhere is never overwritten.
+
+Usage::
+
+    runner = get_job_runner()
+    runner.register(JobDefinition(
+        name="weather.refresh",
+        func=weather_cache.refresh_all_farms,
+        interval_seconds=3600,
+        startup_delay_seconds=10,
+    ))
+    # main.py starts the runner after every module has registered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..indexes import declare_index
+from .cron import CronSchedule
+
+logger = logging.getLogger(__name__)
+
+LEASE_COLLECTION = "job_runner_lease"
+SCHEDULES_COLLECTION = "job_schedules"
+RUNS_COLLECTION = "job_runs"
+
+LEASE_ID = "leader"
+LEASE_TTL_SECONDS = 60
+TICK_SECONDS = 15
+RUN_HISTORY_TTL_SECONDS = 30 * 24 * 3600
+RUN_LEASE_SECONDS = LEASE_TTL_SECONDS * 2
+
+RUN_QUEUED = "queued"
+RUN_RUNNING = "running"
+RUN_SUCCEEDED = "succeeded"
+RUN_FAILED = "failed"
+RUN_ABANDONED = "abandoned"
+
+declare_index(RUNS_COLLECTION, [("status", ASCENDING), ("scheduledFor", ASCENDING)])
+declare_index(RUNS_COLLECTION, [("job", ASCENDING), ("scheduledFor", DESCENDING)])
+declare_index(RUNS_COLLECTION, "runId", unique=True)
+declare_index(
+    RUNS_COLLECTION,
+    "finishedAt",
+    expireAfterSeconds=RUN_HISTORY_TTL_SECONDS,
+    name="ttl_finishedAt",
+)
+
+
+@dataclass
+class JobDefinition:
+    """
+    A schedulable job.
+
+    Exactly one of ``interval_seconds``, ``cron`` or ``interval_resolver``
+    must be set.
+
+    Attributes:
+        name: Unique job name, e.g. ``"farm.watchdog"``.
+        func: Zero-argument coroutine function doing the work.  A returned
+            dict is stored (truncated) as the run's result summary.
+        interval_seconds: Fixed interval between scheduled runs.
+        cron: Five-field UTC cron expression (see ``cron.py``).
+        interval_resolver: Coroutine returning the interval in seconds,
+            re-evaluated after every run (for admin-configurable intervals).
+        max_concurrency: Max simultaneous runs of this job cluster-wide.
+        jitter_seconds: Random delay added to every computed next run.
+        startup_delay_seconds: Delay before the first ever run.
+        timeout_seconds: Cancel a run that takes longer than this.
+        catch_up: Run once immediately when a scheduled run was missed
+            (e.g. no worker was up).  When False, missed runs are skipped and
+            the job waits for its next slot.
+        enabled: Disabled jobs are registered (visible in status) but never
+            scheduled; manual triggers still work.
+    """
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval_seconds: Optional[int] = None
+    cron: Optional[str] = None
+    interval_resolver: Optional[Callable[[], Awaitable[int]]] = None
+    max_concurrency: int = 1
+    jitter_seconds: int = 0
+    startup_delay_seconds: int = 0
+    timeout_seconds: Optional[int] = None
+    catch_up: bool = True
+    enabled: bool = True
+    description: str = ""
+
+    def __post_init__(self) -> None:
+        kinds = [
+            self.interval_seconds is not None,
+            self.cron is not None,
+            self.interval_resolver is not None,
+        ]
+        if sum(kinds) != 1:
+            raise ValueError(
+                f"Job {self.name!r} needs exactly one of interval_seconds, cron "
+                "or interval_resolver"
+            )
+        self._cron = CronSchedule.parse(self.cron) if self.cron else None
+
+    async def next_run_after(self, moment: datetime) -> datetime:
+        """Next scheduled time after ``moment``, jitter included."""
+        if self._cron is not None:
+            base = self._cron.next_after(moment)
+        else:
+            interval = self.interval_seconds
+            if self.interval_resolver is not None:
+                interval = await self.interval_resolver()
+            base = moment + timedelta(seconds=max(1, int(interval)))
+        if self.jitter_seconds:
+            base += timedelta(seconds=random.uniform(0, self.jitter_seconds))
+        return base
+
+    def schedule_label(self) -> str:
+        if self.cron:
+            return f"cron:{self.cron}"
+        if self.interval_resolver is not None:
+            return "interval:dynamic"
+        return f"interval:{self.interval_seconds}s"
+
+
+def _summarize_result(result: Any) -> Optional[Dict[str, Any]]:
+    """Keep only scalar top-level fields of a dict result for the run log."""
+    if not isinstance(result, dict):
+        return None
+    return {
+        k: v
+        for k, v in result.items()
+        if isinstance(v, (str, int, float, bool)) or v is None
+    }
+
+
+class JobRunner:
+    """
+    Process-wide job runner.  See the module docstring.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+        self._jobs: Dict[str, JobDefinition] = {}
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._is_running = False
+        self._is_leader = False
+        self._in_flight: Dict[str, Dict[str, asyncio.Task]] = {}
+        self._lease_renewed_at = 0.0
+        self._cancel_reason = "cancelled (runner stopped)"
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, job: JobDefinition) -> None:
+        """Register (or replace) a job.  Safe to call before ``start``."""
+        self._jobs[job.name] = job
+        self._in_flight.setdefault(job.name, {})
+        logger.info(f"[JobRunner] Registered {job.name} ({job.schedule_label()})")
+
+    def get_job(self, name: str) -> Optional[JobDefinition]:
+        return self._jobs.get(name)
+
+    @property
+    def jobs(self) -> List[JobDefinition]:
+        return list(self._jobs.values())
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self, db) -> None:
+        """Start the tick loop.  Idempotent."""
+        if self._is_running:
+            return
+        self._db = db
+        self._is_running = True
+
+        async def loop() -> None:
+            logger.info(f"[JobRunner] Started as {self.worker_id}")
+            while self._is_running:
+                try:
+                    await self.tick()
+                except asyncio.CancelledError:
+                    break
+                except Exception as exc:
+                    logger.error(f"[JobRunner] Tick error: {exc}")
+                await asyncio.sleep(TICK_SECONDS)
+
+        self._task = asyncio.create_task(loop())
+
+    async def stop(self) -> None:
+        """Stop ticking, cancel in-flight runs and release the lease."""
+        self._is_running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self._cancel_in_flight("cancelled (runner stopped)")
+
+        if self._is_leader and self._db is not None:
+            try:
+                await self._db[LEASE_COLLECTION].delete_one(
+                    {"_id": LEASE_ID, "holder": self.worker_id}
+                )
+            except Exception:
+                pass
+        self._is_leader = False
+        logger.info("[JobRunner] Stopped")
+
+    async def _cancel_in_flight(self, reason: str) -> None:
+        """Cancel this worker's running runs and wait for them to record."""
+        running = [t for runs in self._in_flight.values() for t in runs.values()]
+        if not running:
+            return
+        self._cancel_reason = reason
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        logger.warning(f"[JobRunner] Cancelled {len(running)} run(s): {reason}")
+
+    # ------------------------------------------------------------------
+    # Leader election
+    # ------------------------------------------------------------------
+
+    async def _acquire_lease(self) -> bool:
+        now = datetime.utcnow()
+        try:
+            await self._db[LEASE_COLLECTION].find_one_and_update(
+                {
+                    "_id": LEASE_ID,
+                    "$or": [
+                        {"holder": self.worker_id},
+                        {"expiresAt": {"$lt": now}},
+                    ],
+                },
+                {
+                    "$set": {
+                        "holder": self.worker_id,
+                        "expiresAt": now + timedelta(seconds=LEASE_TTL_SECONDS),
+                        "renewedAt": now,
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            return True
+        except DuplicateKeyError:
+            # Reason: the filter did not match (someone else holds a live
+            # lease) so the upsert tried to insert a second "leader" doc.
+            return False
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    async def tick(self) -> None:
+        """
+        One scheduling pass: renew lease, renew run leases, recover lapsed
+        runs, enqueue due jobs, dispatch.
+        """
+        was_leader = self._is_leader
+        try:
+            is_leader = await self._acquire_lease()
+        except Exception:
+            # Reason: while Mongo is unreachable we can't know whether the
+            # lease was taken over; once it may have expired, stop leading.
+            if (
+                not was_leader
+                or time.monotonic() - self._lease_renewed_at < LEASE_TTL_SECONDS
+            ):
+                raise
+            is_leader = False
+        self._is_leader = is_leader
+        if not is_leader:
+            if was_leader:
+                logger.warning("[JobRunner] Lost leadership")
+                await self._cancel_in_flight("cancelled (leadership lost)")
+            return
+        self._lease_renewed_at = time.monotonic()
+        if not was_leader:
+            logger.info(f"[JobRunner] {self.worker_id} is now leader")
+
+        now = datetime.utcnow()
+        await self._renew_run_leases(now)
+        await self._recover_abandoned_runs(now)
+        for job in self._jobs.values():
+            if job.enabled:
+                await self._enqueue_if_due(job, now)
+        await self._dispatch_queued()
+
+    async def _renew_run_leases(self, now: datetime) -> None:
+        """Extend the lease of every run this worker is executing."""
+        run_ids = [run_id for runs in self._in_flight.values() for run_id in runs]
+        if not run_ids:
+            return
+        await self._db[RUNS_COLLECTION].update_many(
+            {
+                "runId": {"$in": run_ids},
+                "status": RUN_RUNNING,
+                "workerId": self.worker_id,
+            },
+            {"$set": {"leaseExpiresAt": now + timedelta(seconds=RUN_LEASE_SECONDS)}},
+        )
+
+    async def _recover_abandoned_runs(self, now: datetime) -> None:
+        """
+        Runs of other workers whose lease lapsed died with their worker (or
+        were cancelled when it lost the lease).  Mark them abandoned and, for
+        catch-up jobs, queue a replacement.
+
+        Runs without ``leaseExpiresAt`` predate run leases and count as lapsed.
+        """
+        lapsed = {
+            "status": RUN_RUNNING,
+            "workerId": {"$ne": self.worker_id},
+            "$or": [
+                {"leaseExpiresAt": {"$lt": now}},
+                {"leaseExpiresAt": {"$exists": False}},
+            ],
+        }
+        runs = self._db[RUNS_COLLECTION]
+        stale = await runs.find(lapsed).to_list(length=None)
+        recovered = 0
+        for run in stale:
+            # Reason: re-check the lapse in the update so a lease renewed
+            # since the find is left alone.
+            result = await runs.update_one(
+                {**lapsed, "runId": run["runId"]},
+                {"$set": {"status": RUN_ABANDONED, "finishedAt": now}},
+            )
+            if not result.modified_count:
+                continue
+            recovered += 1
+            job = self._jobs.get(run.get("job"))
+            if job is not None and job.catch_up:
+                await self._insert_run(job.name, run["scheduledFor"], "recovery")
+        if recovered:
+            logger.warning(f"[JobRunner] Recovered {recovered} abandoned run(s)")
+
+    async def _insert_run(
+        self, job_name: str, scheduled_for: datetime, trigger: str
+    ) -> str:
+        run_id = str(uuid4())
+        await self._db[RUNS_COLLECTION].insert_one(
+            {
+                "runId": run_id,
+                "job": job_name,
+                "status": RUN_QUEUED,
+                "trigger": trigger,
+                "scheduledFor": scheduled_for,
+                "enqueuedAt": datetime.utcnow(),
+            }
+        )
+        return run_id
+
+    async def _enqueue_if_due(self, job: JobDefinition, now: datetime) -> None:
+        schedules = self._db[SCHEDULES_COLLECTION]
+        state = await schedules.find_one({"_id": job.name})
+        if state is None or state.get("nextRunAt") is None:
+            first = now + timedelta(seconds=job.startup_delay_seconds)
+            if job.jitter_seconds:
+                first += timedelta(seconds=random.uniform(0, job.jitter_seconds))
+            await schedules.update_one(
+                {"_id": job.name},
+                {"$set": {"nextRunAt": first, "schedule": job.schedule_label()}},
+                upsert=True,
+            )
+            return
+
+        due_at: datetime = state["nextRunAt"]
+        if due_at > now:
+            return
+
+        # Reason: a run is "missed" when it fell due more than one tick
+        # before we noticed — i.e. nobody was leading at the time.
+        missed = (now - due_at).total_seconds() > TICK_SECONDS * 2
+        if missed and not job.catch_up:
+            logger.info(
+                f"[JobRunner] Skipping missed run of {job.name} (catch_up=False)"
+            )
+        else:
+            # Reason: coalesce with a run that is still waiting — one queued
+            # run covers every slot that fell due before it starts.
+            pending = await self._db[RUNS_COLLECTION].find_one_and_update(
+                {"job": job.name, "status": RUN_QUEUED},
+                {"$inc": {"coalesced": 1}},
+            )
+            if pending is None:
+                await self._insert_run(
+                    job.name, due_at, "catch-up" if missed else "schedule"
+                )
+            else:
+                logger.info(
+                    f"[JobRunner] {job.name} already has a queued run; "
+                    "coalesced this slot into it"
+                )
+
+        await schedules.update_one(
+            {"_id": job.name},
+            {
+                "$set": {
+                    "nextRunAt": await job.next_run_after(now),
+                    "schedule": job.schedule_label(),
+                }
+            },
+        )
+
+    async def _dispatch_queued(self) -> None:
+        runs = self._db[RUNS_COLLECTION]
+        queued = (
+            await runs.find({"status": RUN_QUEUED, "job": {"$in": list(self._jobs)}})
+            .sort("scheduledFor", ASCENDING)
+            .to_list(length=None)
+        )
+        for run in queued:
+            job = self._jobs[run["job"]]
+            if len(self._in_flight[job.name]) >= job.max_concurrency:
+                continue
+            now = datetime.utcnow()
+            claimed = await runs.find_one_and_update(
+                {"runId": run["runId"], "status": RUN_QUEUED},
+                {
+                    "$set": {
+                        "status": RUN_RUNNING,
+                        "workerId": self.worker_id,
+                        "startedAt": now,
+                        "leaseExpiresAt": now + timedelta(seconds=RUN_LEASE_SECONDS),
+                    }
+                },
+                return_document=ReturnDocument.AFTER,
+            )
+            if claimed is None:
+                continue
+            task = asyncio.create_task(self._execute(job, claimed))
+            self._in_flight[job.name][claimed["runId"]] = task
+
+    async def _execute(self, job: JobDefinition, run: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        started_at: datetime = run["startedAt"]
+        lag_ms = max(0.0, (started_at - run["scheduledFor"]).total_seconds() * 1000)
+        status, error, result = RUN_SUCCEEDED, None, None
+        try:
+            if job.timeout_seconds:
+                result = await asyncio.wait_for(job.func(), job.timeout_seconds)
+            else:
+                result = await job.func()
+        except asyncio.CancelledError:
+            status, error = RUN_ABANDONED, self._cancel_reason
+        except asyncio.TimeoutError:
+            status, error = RUN_FAILED, f"timed out after {job.timeout_seconds}s"
+        except Exception as exc:
+            status, error = RUN_FAILED, str(exc)[:500]
+            logger.error(f"[JobRunner] {job.name} failed: {exc}")
+        finally:
+            self._in_flight[job.name].pop(run["runId"], None)
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        finished_at = datetime.utcnow()
+        try:
+            # Reason: fenced on ownership — if another leader recovered this
+            # run after our lease lapsed, its record is no longer ours to write.
+            recorded = await self._db[RUNS_COLLECTION].update_one(
+                {
+                    "runId": run["runId"],
+                    "workerId": self.worker_id,
+                    "status": RUN_RUNNING,
+                },
+                {
+                    "$set": {
+                        "status": status,
+                        "finishedAt": finished_at,
+                        "durationMs": round(duration_ms, 1),
+                        "lagMs": round(lag_ms, 1),
+                        "error": error,
+                        "result": _summarize_result(result),
+                    }
+                },
+            )
+            if not recorded.modified_count:
+                logger.warning(
+                    f"[JobRunner] {job.name} run {run['runId']} was taken over "
+                    f"by another worker; discarding its {status} result"
+                )
+                return
+            await self._db[SCHEDULES_COLLECTION].update_one(
+                {"_id": job.name},
+                {
+                    "$set": {
+                        "lastRunAt": started_at,
+                        "lastFinishedAt": finished_at,
+                        "lastStatus": status,
+                        "lastDurationMs": round(duration_ms, 1),
+                        "lastLagMs": round(lag_ms, 1),
+                        "lastError": error,
+                    }
+                },
+                upsert=True,
+            )
+        except Exception as exc:
+            logger.error(f"[JobRunner] Could not record run of {job.name}: {exc}")
+        logger.info(
+            f"[JobRunner] {job.name} {status} in {duration_ms:.0f}ms "
+            f"(lag {lag_ms:.0f}ms)"
+        )
+
+    # ------------------------------------------------------------------
+    # Manual triggers & status
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, name: str, trigger: str = "manual") -> str:
+        """
+        Queue an immediate run of ``name``.  Works from any worker — the
+        leader picks it up on its next tick.
+
+        Raises:
+            KeyError: If no job of that name is registered.
+        """
+        if name not in self._jobs:
+            raise KeyError(name)
+        return await self._insert_run(name, datetime.utcnow(), trigger)
+
+    async def get_status(self, history: int = 5) -> Dict[str, Any]:
+        """
+        Per-job schedule, lag, last/average duration and recent runs.
+        """
+        now = datetime.utcnow()
+        lease = await self._db[LEASE_COLLECTION].find_one({"_id": LEASE_ID})
+        states = {
+            s["_id"]: s
+            for s in await self._db[SCHEDULES_COLLECTION]
+            .find({"_id": {"$in": list(self._jobs)}})
+            .to_list(length=None)
+        }
+
+        jobs: List[Dict[str, Any]] = []
+        for job in self._jobs.values():
+            state = states.get(job.name, {})
+            recent = (
+                await self._db[RUNS_COLLECTION]
+                .find({"job": job.name}, {"_id": 0})
+                .sort("scheduledFor", DESCENDING)
+                .limit(history)
+                .to_list(length=history)
+            )
+            durations = [
+                r["durationMs"] for r in recent if r.get("durationMs") is not None
+            ]
+            next_run = state.get("nextRunAt")
+            jobs.append(
+                {
+                    "name": job.name,
+                    "description": job.description,
+                    "schedule": job.schedule_label(),
+                    "enabled": job.enabled,
+                    "maxConcurrency": job.max_concurrency,
+                    "nextRunAt": next_run,
+                    "overdueMs": (
+                        round((now - next_run).total_seconds() * 1000, 1)
+                        if next_run and next_run < now
+                        else 0
+                    ),
+                    "lastRunAt": state.get("lastRunAt"),
+                    "lastStatus": state.get("lastStatus"),
+                    "lastDurationMs": state.get("lastDurationMs"),
+                    "lastLagMs": state.get("lastLagMs"),
+                    "lastError": state.get("lastError"),
+                    "avgDurationMs": (
+                        round(sum(durations) / len(durations), 1) if durations else None
+                    ),
+                    "recentRuns": recent,
+                }
+            )
+
+        return {
+            "workerId": self.worker_id,
+            "isLeader": self._is_leader,
+            "leader": lease.get("holder") if lease else None,
+            "leaseExpiresAt": lease.get("expiresAt") if lease else None,
+            "jobs": jobs,
+        }
+
+
+_job_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """Return the process-wide JobRunner singleton."""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner()
+    return _job_runner
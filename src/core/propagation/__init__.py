@@ -0,0 +1,38 @@
+"""
+A64 Core Platform — Denormalized-Field Propagation
+
+Durable, batched, rate-limited copying of renamed source fields onto their
+denormalized copies, off the request path.
+
+Modules
+-------
+engine — PropagationTarget, DenormalizedField, register_denormalized_field,
+         enqueue_propagation, run_propagation_pass, propagation_drain_job,
+         propagation_status
+"""
+
+from .engine import (
+    DenormalizedField,
+    PropagationTarget,
+    apply_propagation,
+    denormalized_fields,
+    enqueue_propagation,
+    get_denormalized_field,
+    propagation_drain_job,
+    propagation_status,
+    register_denormalized_field,
+    run_propagation_pass,
+)
+
+__all__ = [
+    "DenormalizedField",
+    "PropagationTarget",
+    "apply_propagation",
+    "denormalized_fields",
+    "enqueue_propagation",
+    "get_denormalized_field",
+    "propagation_drain_job",
+    "propagation_status",
+    "register_denormalized_field",
+    "run_propagation_pass",
+]
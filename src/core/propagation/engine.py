@@ -0,0 +1,464 @@
+"""
+A64 Core Platform — Denormalized-Field Propagation
+
+Records copy a few fields of the records they point at (a sales order's
+``customerName``, a block's ``productName``…) so list views never need a
+join.  When the source field changes, the copies must follow.  Instead of
+``update_many`` calls inside the request, each denormalized field is
+registered once as a ``DenormalizedField`` — source collection and id field,
+plus every target collection, the field that references the source and the
+target paths to copy — and the write path only calls
+``enqueue_propagation``, which is a single upsert.
+
+Jobs
+----
+``propagation_jobs`` holds one document per ``(field, sourceId)``::
+
+    {_id: "<field>:<sourceId>", field, sourceId, status, generation,
+     requestedAt, retryAt, claimedBy, leaseUntil, attempts, progress: {...},
+     lastError, finishedAt}
+
+Enqueueing again before the copy has run coalesces into the same document
+and bumps ``generation``, so a burst of renames costs one propagation.
+
+The ``propagation.drain`` job claims due pending jobs (or running ones
+whose lease expired) and applies them target by target; a failed job is
+retried after a growing delay and parked as ``failed`` after
+``MAX_ATTEMPTS``:
+
+* values are read from the source record at apply time, never from the
+  request, so the newest value always wins;
+* each batch selects up to ``PROPAGATION_BATCH_SIZE`` target ``_id``s that
+  still differ from the source and ``$set``s them, pausing
+  ``PROPAGATION_BATCH_PAUSE_MS`` in between — a pass is naturally resumable
+  because already-updated documents no longer match;
+* progress is saved after every batch, conditional on ``generation``: a
+  newer request for the same source stops the stale pass, which is then
+  picked up again from scratch.
+
+``propagation_status`` reports pending/running/failed counts and lag per
+field (GET /api/v1/admin/propagation).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, ReturnDocument
+
+from src.config.settings import settings
+from src.core.indexes import declare_index
+from src.core.jobs import JobDefinition
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "propagation_jobs"
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# A claimed job is reclaimable once its worker stops renewing the lease.
+LEASE_SECONDS = 120
+# Attempts before a job is parked as failed (a new enqueue revives it).
+MAX_ATTEMPTS = 5
+# Delay before retrying a failed job, multiplied by its attempt count.
+RETRY_DELAY_SECONDS = 60
+# Finished jobs are kept this long for the status report.
+DONE_TTL_SECONDS = 7 * 24 * 3600
+
+declare_index(
+    COLLECTION,
+    [("status", ASCENDING), ("retryAt", ASCENDING)],
+    name="status_retry",
+)
+declare_index(
+    COLLECTION, "finishedAt", expireAfterSeconds=DONE_TTL_SECONDS, name="ttl_finishedAt"
+)
+
+
+@dataclass(frozen=True)
+class PropagationTarget:
+    """
+    One collection holding copies of the source field.
+
+    Attributes:
+        collection: Target collection name.
+        match_field: Target field referencing the source record's id.
+        paths: Target path -> source path, e.g. ``{"customerName": "name"}``.
+        stamp_updated_at: Also set the target's ``updatedAt``.
+    """
+
+    collection: str
+    match_field: str
+    paths: Dict[str, str]
+    stamp_updated_at: bool = False
+
+
+@dataclass(frozen=True)
+class DenormalizedField:
+    """
+    A source field and every place it is copied to.
+
+    Attributes:
+        name: Unique name, e.g. ``"customer.name"``.
+        source_collection: Collection of the source records.
+        source_id_field: Id field of the source records (string ids).
+        targets: The collections holding copies.
+    """
+
+    name: str
+    source_collection: str
+    source_id_field: str
+    targets: Tuple[PropagationTarget, ...] = field(default_factory=tuple)
+
+    @property
+    def source_paths(self) -> List[str]:
+        return sorted({p for t in self.targets for p in t.paths.values()})
+
+
+_fields: Dict[str, DenormalizedField] = {}
+
+
+def register_denormalized_field(definition: DenormalizedField) -> DenormalizedField:
+    """Register (or replace) a denormalized field definition and return it."""
+    _fields[definition.name] = definition
+    return definition
+
+
+def get_denormalized_field(name: str) -> DenormalizedField:
+    """
+    Raises:
+        ValueError: If no field of that name is registered.
+    """
+    try:
+        return _fields[name]
+    except KeyError:
+        raise ValueError(f"Unknown denormalized field: {name}")
+
+
+def denormalized_fields() -> List[DenormalizedField]:
+    return list(_fields.values())
+
+
+def _job_id(name: str, source_id: str) -> str:
+    return f"{name}:{source_id}"
+
+
+def _get(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ----------------------------------------------------------------------
+# Write side
+# ----------------------------------------------------------------------
+
+
+async def enqueue_propagation(db, name: str, source_id: Any) -> None:
+    """
+    Queue propagation of ``name`` for one source record.
+
+    Call after the source write has succeeded; the copies catch up within one
+    ``propagation.drain`` interval.  Database errors are logged, not raised —
+    the source write already succeeded, and a lost enqueue only leaves the
+    copies stale until the next change of that record.
+
+    Raises:
+        ValueError: If ``name`` is not a registered field.
+    """
+    get_denormalized_field(name)
+    source_id = str(source_id)
+    now = datetime.utcnow()
+    try:
+        await db[COLLECTION].update_one(
+            {"_id": _job_id(name, source_id)},
+            {
+                "$set": {
+                    "field": name,
+                    "sourceId": source_id,
+                    "status": STATUS_PENDING,
+                    "requestedAt": now,
+                    "retryAt": now,
+                    "attempts": 0,
+                    "progress": {},
+                    "lastError": None,
+                    "finishedAt": None,
+                },
+                "$inc": {"generation": 1},
+            },
+            upsert=True,
+        )
+    except Exception as e:
+        logger.warning(f"Could not enqueue propagation {name} for {source_id}: {e}")
+
+
+# ----------------------------------------------------------------------
+# Apply side
+# ----------------------------------------------------------------------
+
+
+class _Superseded(Exception):
+    """A newer request for the same source replaced the running job."""
+
+
+async def _claim(db, worker: str) -> Optional[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return await db[COLLECTION].find_one_and_update(
+        {
+            "$or": [
+                {"status": STATUS_PENDING, "retryAt": {"$lte": now}},
+                {"status": STATUS_RUNNING, "leaseUntil": {"$lt": now}},
+            ]
+        },
+        {
+            "$set": {
+                "status": STATUS_RUNNING,
+                "claimedBy": worker,
+                "claimedAt": now,
+                "leaseUntil": now + timedelta(seconds=LEASE_SECONDS),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("retryAt", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _save(db, job: Dict[str, Any], update: Dict[str, Any]) -> None:
+    result = await db[COLLECTION].update_one(
+        {"_id": job["_id"], "generation": job["generation"]}, update
+    )
+    if result.matched_count == 0:
+        raise _Superseded()
+
+
+async def _apply_target(
+    db,
+    job: Dict[str, Any],
+    target: PropagationTarget,
+    source: Dict[str, Any],
+    progress: Dict[str, int],
+) -> None:
+    values = {path: _get(source, src) for path, src in target.paths.items()}
+    stale = {
+        target.match_field: job["sourceId"],
+        "$or": [{path: {"$ne": value}} for path, value in values.items()],
+    }
+    batch_size = max(1, settings.PROPAGATION_BATCH_SIZE)
+    pause = max(0, settings.PROPAGATION_BATCH_PAUSE_MS) / 1000
+
+    while True:
+        ids = [
+            d["_id"]
+            for d in await db[target.collection]
+            .find(stale, {"_id": 1})
+            .limit(batch_size)
+            .to_list(length=batch_size)
+        ]
+        if not ids:
+            return
+        update = dict(values)
+        if target.stamp_updated_at:
+            update["updatedAt"] = datetime.utcnow()
+        result = await db[target.collection].update_many(
+            {"_id": {"$in": ids}}, {"$set": update}
+        )
+        progress[target.collection] = (
+            progress.get(target.collection, 0) + result.modified_count
+        )
+        await _save(
+            db,
+            job,
+            {
+                "$set": {
+                    f"progress.{target.collection}": progress[target.collection],
+                    "leaseUntil": datetime.utcnow() + timedelta(seconds=LEASE_SECONDS),
+                }
+            },
+        )
+        if len(ids) < batch_size:
+            return
+        if pause:
+            await asyncio.sleep(pause)
+
+
+async def apply_propagation(db, job: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Bring every target of a claimed job up to date with its source record.
+
+    Returns:
+        Modified document counts per target collection.
+
+    Raises:
+        _Superseded: A newer request for the source arrived meanwhile.
+    """
+    definition = get_denormalized_field(job["field"])
+    progress: Dict[str, int] = dict(job.get("progress") or {})
+    source = await db[definition.source_collection].find_one(
+        {definition.source_id_field: job["sourceId"]},
+        {"_id": 0, **{p: 1 for p in definition.source_paths}},
+    )
+    if source is not None:
+        for target in definition.targets:
+            await _apply_target(db, job, target, source, progress)
+    await _save(
+        db,
+        job,
+        {
+            "$set": {
+                "status": STATUS_DONE,
+                "finishedAt": datetime.utcnow(),
+                "lastError": None,
+            }
+        },
+    )
+    return progress
+
+
+async def run_propagation_pass(
+    db, max_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Claim and apply pending propagation jobs until none are left or the pass
+    budget (``PROPAGATION_PASS_SECONDS``) is spent.
+
+    Returns:
+        ``{"applied", "superseded", "failed", "modified": {collection: n}}``
+        where ``modified`` counts documents updated by completed jobs in
+        this pass.
+    """
+    budget = settings.PROPAGATION_PASS_SECONDS if max_seconds is None else max_seconds
+    deadline = time.monotonic() + budget
+    worker = _worker_id()
+    summary: Dict[str, Any] = {
+        "applied": 0,
+        "superseded": 0,
+        "failed": 0,
+        "modified": {},
+    }
+
+    while time.monotonic() < deadline:
+        job = await _claim(db, worker)
+        if job is None:
+            break
+        try:
+            progress = await apply_propagation(db, job)
+        except _Superseded:
+            summary["superseded"] += 1
+            continue
+        except Exception as e:
+            summary["failed"] += 1
+            attempts = job.get("attempts", 1)
+            parked = attempts >= MAX_ATTEMPTS
+            logger.error(
+                f"Propagation {job['_id']} failed (attempt {job.get('attempts')}): {e}"
+            )
+            await db[COLLECTION].update_one(
+                {"_id": job["_id"], "generation": job["generation"]},
+                {
+                    "$set": {
+                        "status": STATUS_FAILED if parked else STATUS_PENDING,
+                        "lastError": str(e)[:500],
+                        "leaseUntil": None,
+                        "retryAt": datetime.utcnow()
+                        + timedelta(seconds=RETRY_DELAY_SECONDS * attempts),
+                    }
+                },
+            )
+            continue
+        summary["applied"] += 1
+        earlier = job.get("progress") or {}
+        for collection, count in progress.items():
+            summary["modified"][collection] = (
+                summary["modified"].get(collection, 0)
+                + count
+                - earlier.get(collection, 0)
+            )
+
+    return summary
+
+
+def propagation_drain_job(db) -> JobDefinition:
+    """The ``propagation.drain`` job definition."""
+    return JobDefinition(
+        name="propagation.drain",
+        func=partial(run_propagation_pass, db),
+        interval_seconds=30,
+        timeout_seconds=LEASE_SECONDS,
+        description="Copy renamed fields onto their denormalized copies",
+    )
+
+
+# ----------------------------------------------------------------------
+# Status
+# ----------------------------------------------------------------------
+
+
+async def propagation_status(db, recent: int = 20) -> Dict[str, Any]:
+    """
+    Per-field backlog and lag, plus the unfinished jobs themselves.
+
+    ``lagSeconds`` is the age of the oldest unfinished request of the field.
+    """
+    now = datetime.utcnow()
+    open_jobs = (
+        await db[COLLECTION]
+        .find({"status": {"$in": [STATUS_PENDING, STATUS_RUNNING, STATUS_FAILED]}})
+        .sort("requestedAt", ASCENDING)
+        .to_list(length=None)
+    )
+
+    fields: Dict[str, Dict[str, Any]] = {
+        f.name: {
+            "field": f.name,
+            "sourceCollection": f.source_collection,
+            "targets": [t.collection for t in f.targets],
+            STATUS_PENDING: 0,
+            STATUS_RUNNING: 0,
+            STATUS_FAILED: 0,
+            "lagSeconds": 0.0,
+        }
+        for f in _fields.values()
+    }
+    for job in open_jobs:
+        row = fields.get(job.get("field"))
+        if row is None:
+            continue
+        row[job["status"]] += 1
+        if job["status"] != STATUS_FAILED and job.get("requestedAt"):
+            age = (now - job["requestedAt"]).total_seconds()
+            row["lagSeconds"] = round(max(row["lagSeconds"], age), 1)
+
+    return {
+        "fields": list(fields.values()),
+        "jobs": [
+            {
+                "field": j.get("field"),
+                "sourceId": j.get("sourceId"),
+                "status": j.get("status"),
+                "requestedAt": j.get("requestedAt"),
+                "attempts": j.get("attempts", 0),
+                "progress": j.get("progress") or {},
+                "lastError": j.get("lastError"),
+            }
+            for j in open_jobs[:recent]
+        ],
+    }
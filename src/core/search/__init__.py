@@ -0,0 +1,52 @@
+"""
+A64 Core Platform — Search Index
+
+Per-organisation prefix and trigram token documents for the platform's
+searchable records, maintained on write, serving indexed autocomplete and
+typo-tolerant ranked search with keyset paging and estimated totals.
+
+Modules
+-------
+tokens  — normalize, split_words, word_prefixes, trigrams
+index   — SearchEntity, SearchHit, SearchPage, register_search_entity,
+          reindex, autocomplete, search, fetch_hits, use_search_index,
+          rebuild_entity, backfill_search_index, search_backfill_job
+schemas — AutocompleteItem, AutocompleteResponse (API response model)
+"""
+
+from .index import (
+    SearchEntity,
+    SearchHit,
+    SearchPage,
+    autocomplete,
+    backfill_search_index,
+    fetch_hits,
+    get_search_entity,
+    rebuild_entity,
+    register_search_entity,
+    reindex,
+    search,
+    search_backfill_job,
+    use_search_index,
+)
+from .tokens import normalize, split_words, trigrams, word_prefixes
+
+__all__ = [
+    "SearchEntity",
+    "SearchHit",
+    "SearchPage",
+    "autocomplete",
+    "backfill_search_index",
+    "fetch_hits",
+    "get_search_entity",
+    "rebuild_entity",
+    "register_search_entity",
+    "reindex",
+    "search",
+    "search_backfill_job",
+    "use_search_index",
+    "normalize",
+    "split_words",
+    "trigrams",
+    "word_prefixes",
+]
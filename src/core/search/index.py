@@ -0,0 +1,750 @@
+"""
+A64 Core Platform — Search Index
+
+One shared collection, ``search_tokens``, holds a small token document per
+searchable record (customer, employee, vendor, purchase item, inventory
+item, plant…)::
+
+    {_id: "<entity>:<id>", entity, scope, entityId, label, sortKey,
+     prefixes: [...], grams: [...], gramCount, filters: {...}, updatedAt}
+
+``scope`` is the owning organisation (or ``"*"`` for entities that are not
+organisation-scoped), so every lookup is confined to one tenant's keys.
+
+Reads
+-----
+* ``autocomplete`` — every query word must be a prefix of some indexed word.
+  One equality match on the ``(entity, scope, prefixes, sortKey, entityId)``
+  index, already in sort order, keyset-paged: it touches ``limit`` index
+  keys regardless of collection size.
+* ``search`` — typo-tolerant ranked search.  A record matches when it shares
+  at least ``threshold`` of the query's trigrams.  By pigeonhole every such
+  record contains one of the ``n - min_match + 1`` query grams that are
+  rarest in this scope (per-gram counts in ``search_token_stats``), so only
+  those grams are probed; overlap and score are computed server-side, the
+  survivors are ranked by query coverage, with a bonus for a leading-word
+  prefix hit, and only the best ``CANDIDATE_CAP`` of them come back — the
+  cap applies after ranking, so it never drops a better match.
+
+Both return a ``SearchPage`` with an opaque keyset cursor and a total:
+autocomplete counts up to ``ESTIMATE_CAP``, search counts the matches its
+ranking already had to score.
+
+Writes
+------
+Owners call ``reindex(db, entity, ids)`` after a write; it re-reads the
+source records, replaces their token documents and adjusts the gram counts,
+and never raises.  ``backfill_search_index`` (job ``search.index_backfill``)
+builds the index of any entity whose definition ``version`` has not been
+built yet; endpoints only read from the index once that has completed
+(``use_search_index``) and when the entity is listed in
+``SEARCH_INDEX_ENTITIES``.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+from src.config.settings import settings
+from src.core.indexes import declare_index
+from src.core.jobs import JobDefinition
+
+from .tokens import (
+    MAX_QUERY_WORDS,
+    PREFIX_MAX,
+    split_words,
+    normalize,
+    trigrams,
+    word_prefixes,
+)
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "search_tokens"
+STATS_COLLECTION = "search_token_stats"
+STATE_COLLECTION = "search_index_state"
+
+# Scope of entities that are not organisation-scoped.
+GLOBAL_SCOPE = "*"
+
+# Max ranked matches returned to the application by one search.
+CANDIDATE_CAP = 5000
+# Autocomplete totals are counted up to this many matches.
+ESTIMATE_CAP = 1000
+# Fraction of the query's trigrams a record must share to match.
+DEFAULT_THRESHOLD = 0.35
+
+_BATCH_SIZE = 1000
+
+declare_index(
+    COLLECTION,
+    [("entity", 1), ("scope", 1), ("prefixes", 1), ("sortKey", 1), ("entityId", 1)],
+    name="entity_scope_prefix_sort",
+)
+declare_index(
+    COLLECTION, [("entity", 1), ("scope", 1), ("grams", 1)], name="entity_scope_grams"
+)
+declare_index(COLLECTION, [("entity", 1), ("updatedAt", 1)], name="entity_updated")
+
+
+@dataclass(frozen=True)
+class SearchEntity:
+    """
+    How one collection is indexed.
+
+    Attributes:
+        name: Entity name used by callers and in ``SEARCH_INDEX_ENTITIES``.
+        collection: Source collection.
+        id_field: Source field holding the record's ID.
+        fields: Searchable fields (dotted paths; list values are flattened).
+        label_fields: Fields joined into the record's display label and sort
+            key; defaults to the first searchable field.
+        scope_field: Organisation field, or None for an unscoped entity.
+        filter_fields: Fields copied into the token document so searches can
+            be narrowed with ``filters={field: value}``.
+        include: Predicate on the source document; records failing it (e.g.
+            soft-deleted) are kept out of the index.
+        version: Bump when the definition changes; the backfill job then
+            rebuilds this entity.
+    """
+
+    name: str
+    collection: str
+    id_field: str
+    fields: Tuple[str, ...]
+    label_fields: Tuple[str, ...] = ()
+    scope_field: Optional[str] = None
+    filter_fields: Tuple[str, ...] = ()
+    include: Optional[Callable[[dict], bool]] = None
+    version: int = 1
+
+    @property
+    def projection(self) -> Dict[str, int]:
+        paths = [self.id_field, *self.fields, *self.label_fields, *self.filter_fields]
+        if self.scope_field:
+            paths.append(self.scope_field)
+        projection = {path: 1 for path in paths}
+        projection["_id"] = 0
+        return projection
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One matching record."""
+
+    entity_id: str
+    label: str
+    score: float
+
+
+@dataclass
+class SearchPage:
+    """
+    One page of search results.
+
+    Attributes:
+        hits: Matches in rank order.
+        next_cursor: Opaque cursor for the next page, None on the last page.
+        estimated_total: Estimated number of matches.
+        total_is_exact: True when ``estimated_total`` is an exact count.
+    """
+
+    hits: List[SearchHit] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    estimated_total: int = 0
+    total_is_exact: bool = True
+
+    @property
+    def entity_ids(self) -> List[str]:
+        return [hit.entity_id for hit in self.hits]
+
+
+_entities: Dict[str, SearchEntity] = {}
+# (entity, version) pairs whose backfill is known to be complete.
+_ready: set = set()
+
+
+def register_search_entity(entity: SearchEntity) -> SearchEntity:
+    """Register (or replace) an entity definition; returns it unchanged."""
+    _entities[entity.name] = entity
+    return entity
+
+
+def get_search_entity(name: str) -> SearchEntity:
+    """Return a registered entity, raising ValueError if unknown."""
+    try:
+        return _entities[name]
+    except KeyError:
+        raise ValueError(f"Unknown search entity: {name}")
+
+
+def search_entities() -> List[SearchEntity]:
+    """All registered entities."""
+    return list(_entities.values())
+
+
+# ---------------------------------------------------------------------------
+# Token documents
+# ---------------------------------------------------------------------------
+
+
+def _values(doc: dict, path: str) -> List[Any]:
+    """Values at a dotted path, flattening lists along the way."""
+    current: List[Any] = [doc]
+    for part in path.split("."):
+        found: List[Any] = []
+        for value in current:
+            if isinstance(value, dict) and value.get(part) is not None:
+                found.append(value[part])
+        current = []
+        for value in found:
+            current.extend(value if isinstance(value, list) else [value])
+    return current
+
+
+def scope_key(entity: SearchEntity, scope: Any) -> str:
+    """The stored scope for an organisation value (``"*"`` if unscoped)."""
+    if entity.scope_field is None:
+        return GLOBAL_SCOPE
+    return str(scope) if scope else ""
+
+
+def _token_id(entity: SearchEntity, entity_id: Any) -> str:
+    return f"{entity.name}:{entity_id}"
+
+
+def _stat_id(entity: SearchEntity, scope: str, gram: str) -> str:
+    return f"{entity.name}|{scope}|{gram}"
+
+
+def build_token_doc(
+    entity: SearchEntity, doc: dict, now: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Token document for a source record, or None if it is not indexable.
+
+    Args:
+        entity: Entity definition.
+        doc: Source document (at least ``entity.projection``).
+        now: ``updatedAt`` stamp (defaults to utcnow).
+    """
+    entity_id = doc.get(entity.id_field)
+    if entity_id is None or (entity.include and not entity.include(doc)):
+        return None
+
+    words: List[str] = []
+    for path in entity.fields:
+        words.extend(split_words(" ".join(str(v) for v in _values(doc, path))))
+    label = " ".join(
+        str(v).strip()
+        for path in entity.label_fields or entity.fields[:1]
+        for v in _values(doc, path)
+        if str(v).strip()
+    )
+    words = list(dict.fromkeys(words))
+    grams = trigrams(words)
+
+    return {
+        "_id": _token_id(entity, entity_id),
+        "entity": entity.name,
+        "scope": scope_key(
+            entity, doc.get(entity.scope_field) if entity.scope_field else None
+        ),
+        "entityId": str(entity_id),
+        "label": label,
+        "sortKey": normalize(label),
+        "prefixes": word_prefixes(words),
+        "grams": grams,
+        "gramCount": len(grams),
+        "filters": {f: doc.get(f) for f in entity.filter_fields},
+        "updatedAt": now or datetime.utcnow(),
+    }
+
+
+async def _apply_stats(db, deltas: Counter) -> None:
+    ops = [
+        UpdateOne({"_id": key}, {"$inc": {"n": delta}}, upsert=True)
+        for key, delta in deltas.items()
+        if delta
+    ]
+    if ops:
+        await db[STATS_COLLECTION].bulk_write(ops, ordered=False)
+
+
+async def index_documents(db, entity_name: str, docs: Iterable[dict]) -> int:
+    """
+    Replace the token documents of ``docs`` and adjust the gram counts.
+
+    Records that are not indexable (``include`` false) are removed.
+
+    Returns:
+        Number of token documents written.
+    """
+    entity = get_search_entity(entity_name)
+    latest: Dict[str, dict] = {}
+    for doc in docs:
+        if doc.get(entity.id_field) is not None:
+            latest[_token_id(entity, doc[entity.id_field])] = doc
+    if not latest:
+        return 0
+
+    previous = {
+        old["_id"]: old
+        async for old in db[COLLECTION].find(
+            {"_id": {"$in": list(latest)}}, {"scope": 1, "grams": 1}
+        )
+    }
+
+    now = datetime.utcnow()
+    deltas: Counter = Counter()
+    ops: List[Any] = []
+    for key, doc in latest.items():
+        old = previous.get(key)
+        if old:
+            for gram in old.get("grams", []):
+                deltas[_stat_id(entity, old.get("scope", ""), gram)] -= 1
+        new = build_token_doc(entity, doc, now)
+        if new:
+            for gram in new["grams"]:
+                deltas[_stat_id(entity, new["scope"], gram)] += 1
+            ops.append(ReplaceOne({"_id": key}, new, upsert=True))
+        elif old:
+            ops.append(DeleteOne({"_id": key}))
+
+    if ops:
+        await db[COLLECTION].bulk_write(ops, ordered=False)
+    await _apply_stats(db, deltas)
+    return sum(1 for op in ops if isinstance(op, ReplaceOne))
+
+
+async def remove_documents(db, entity_name: str, entity_ids: Iterable[Any]) -> None:
+    """Delete the token documents of ``entity_ids``."""
+    entity = get_search_entity(entity_name)
+    keys = [_token_id(entity, i) for i in entity_ids if i is not None]
+    if not keys:
+        return
+    deltas: Counter = Counter()
+    async for old in db[COLLECTION].find(
+        {"_id": {"$in": keys}}, {"scope": 1, "grams": 1}
+    ):
+        for gram in old.get("grams", []):
+            deltas[_stat_id(entity, old.get("scope", ""), gram)] -= 1
+    await db[COLLECTION].delete_many({"_id": {"$in": keys}})
+    await _apply_stats(db, deltas)
+
+
+async def reindex(db, entity_name: str, entity_ids: Iterable[Any]) -> None:
+    """
+    Refresh the token documents of ``entity_ids`` from their source records.
+
+    Called after every write that changes a searchable field; records that
+    no longer exist are removed.  Never raises: a stale search token must
+    not fail the write that caused it.
+    """
+    try:
+        entity = get_search_entity(entity_name)
+        ids = list(dict.fromkeys(str(i) for i in entity_ids if i))
+        if not ids:
+            return
+        docs = (
+            await db[entity.collection]
+            .find({entity.id_field: {"$in": ids}}, entity.projection)
+            .to_list(length=None)
+        )
+        await index_documents(db, entity_name, docs)
+        found = {str(d.get(entity.id_field)) for d in docs}
+        missing = [i for i in ids if i not in found]
+        if missing:
+            await remove_documents(db, entity_name, missing)
+    except Exception as e:
+        logger.warning(f"[Search] Could not reindex {entity_name} {entity_ids}: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Backfill / rebuild
+# ---------------------------------------------------------------------------
+
+
+async def rebuild_entity(db, entity_name: str) -> Dict[str, Any]:
+    """
+    Rebuild an entity's token documents and gram counts from its collection.
+
+    Readers keep working throughout: tokens are overwritten in place and
+    tokens of records that disappeared are dropped at the end.  Gram counts
+    written concurrently by ``reindex`` may be off until the next rebuild;
+    they only steer probe selection, never correctness.
+    """
+    entity = get_search_entity(entity_name)
+    started = datetime.utcnow()
+    stats: Counter = Counter()
+    written = 0
+
+    ops: List[Any] = []
+    async for doc in db[entity.collection].find({}, entity.projection):
+        token = build_token_doc(entity, doc, started)
+        if token is None:
+            continue
+        for gram in token["grams"]:
+            stats[(token["scope"], gram)] += 1
+        ops.append(ReplaceOne({"_id": token["_id"]}, token, upsert=True))
+        if len(ops) >= _BATCH_SIZE:
+            await db[COLLECTION].bulk_write(ops, ordered=False)
+            written += len(ops)
+            ops = []
+    if ops:
+        await db[COLLECTION].bulk_write(ops, ordered=False)
+        written += len(ops)
+
+    await db[COLLECTION].delete_many(
+        {"entity": entity.name, "updatedAt": {"$lt": started}}
+    )
+
+    # Reason: upsert rather than delete-then-insert — a concurrent reindex
+    # upserting a gram between the two would make the insert a duplicate
+    # key and abort the rebuild.  Grams no longer present are dropped after.
+    stat_ops = [
+        UpdateOne(
+            {"_id": _stat_id(entity, scope, gram)},
+            {"$set": {"n": n, "rebuiltAt": started}},
+            upsert=True,
+        )
+        for (scope, gram), n in stats.items()
+    ]
+    for start in range(0, len(stat_ops), _BATCH_SIZE):
+        await db[STATS_COLLECTION].bulk_write(
+            stat_ops[start : start + _BATCH_SIZE], ordered=False
+        )
+    await db[STATS_COLLECTION].delete_many(
+        {"_id": {"$regex": f"^{entity.name}\\|"}, "rebuiltAt": {"$ne": started}}
+    )
+
+    await db[STATE_COLLECTION].update_one(
+        {"_id": entity.name},
+        {
+            "$set": {
+                "version": entity.version,
+                "builtAt": datetime.utcnow(),
+                "count": written,
+            }
+        },
+        upsert=True,
+    )
+    _ready.add((entity.name, entity.version))
+    logger.info(f"[Search] Rebuilt {entity.name}: {written} record(s)")
+    return {"entity": entity.name, "count": written}
+
+
+async def backfill_search_index(db) -> Dict[str, Any]:
+    """Rebuild every registered entity whose current version was never built."""
+    built: Dict[str, int] = {}
+    states = {
+        s["_id"]: s.get("version")
+        async for s in db[STATE_COLLECTION].find({}, {"version": 1})
+    }
+    for entity in search_entities():
+        if states.get(entity.name) == entity.version:
+            _ready.add((entity.name, entity.version))
+            continue
+        result = await rebuild_entity(db, entity.name)
+        built[entity.name] = result["count"]
+    return {"rebuilt": built}
+
+
+def search_backfill_job(db) -> JobDefinition:
+    """The ``search.index_backfill`` job definition."""
+    return JobDefinition(
+        name="search.index_backfill",
+        func=partial(backfill_search_index, db),
+        interval_seconds=600,
+        description="Build the search index of entities added or redefined since the last run",
+    )
+
+
+def _enabled_entities() -> set:
+    return {
+        name.strip()
+        for name in (settings.SEARCH_INDEX_ENTITIES or "").split(",")
+        if name.strip()
+    }
+
+
+async def use_search_index(db, entity_name: str) -> bool:
+    """
+    True when ``entity_name`` is opted in and its backfill has completed.
+
+    Opted-in means listed in ``SEARCH_INDEX_ENTITIES``.  Readiness is looked
+    up once per entity version and process.
+    """
+    if entity_name not in _enabled_entities() or entity_name not in _entities:
+        return False
+    entity = _entities[entity_name]
+    if (entity.name, entity.version) in _ready:
+        return True
+    state = await db[STATE_COLLECTION].find_one({"_id": entity.name}, {"version": 1})
+    if state and state.get("version") == entity.version:
+        _ready.add((entity.name, entity.version))
+        return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+def _encode_cursor(values: List[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid search cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid search cursor")
+    return values
+
+
+def _filter_query(entity: SearchEntity, filters: Optional[Dict[str, Any]]) -> dict:
+    query: Dict[str, Any] = {}
+    for name, value in (filters or {}).items():
+        if name not in entity.filter_fields:
+            raise ValueError(f"{entity.name} cannot be filtered by {name}")
+        if value is not None:
+            query[f"filters.{name}"] = value
+    return query
+
+
+async def autocomplete(
+    db,
+    entity_name: str,
+    text: str,
+    *,
+    scope: Any = None,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> SearchPage:
+    """
+    Records with a word starting with every query word, in label order.
+
+    Args:
+        db: Motor database handle.
+        entity_name: Registered entity.
+        text: What the user typed so far.
+        scope: Organisation ID (ignored for unscoped entities).
+        filters: Equality filters on the entity's ``filter_fields``.
+        limit: Page size.
+        cursor: ``next_cursor`` of the previous page.
+        skip: Records to skip (offset paging for legacy endpoints).
+
+    Raises:
+        ValueError: Unknown entity or filter, or a malformed cursor.
+    """
+    entity = get_search_entity(entity_name)
+    words = split_words(text, MAX_QUERY_WORDS)
+    if not words:
+        return SearchPage()
+
+    # Reason: the index is bounded by the first $all value, so lead with the
+    # longest (most selective) prefix.
+    keys = sorted({w[:PREFIX_MAX] for w in words}, key=len, reverse=True)
+    query: Dict[str, Any] = {
+        "entity": entity.name,
+        "scope": scope_key(entity, scope),
+        "prefixes": keys[0] if len(keys) == 1 else {"$all": keys},
+        **_filter_query(entity, filters),
+    }
+    collection = db[COLLECTION]
+    total = await collection.count_documents(query, limit=ESTIMATE_CAP)
+
+    if cursor:
+        sort_key, entity_id = _decode_cursor(cursor, 2)
+        query["$or"] = [
+            {"sortKey": {"$gt": sort_key}},
+            {"sortKey": sort_key, "entityId": {"$gt": entity_id}},
+        ]
+    docs = (
+        await collection.find(query, {"entityId": 1, "label": 1, "sortKey": 1})
+        .sort([("sortKey", 1), ("entityId", 1)])
+        .skip(skip)
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+
+    page = docs[:limit]
+    next_cursor = None
+    if len(docs) > limit:
+        next_cursor = _encode_cursor([page[-1]["sortKey"], page[-1]["entityId"]])
+    return SearchPage(
+        hits=[SearchHit(d["entityId"], d.get("label", ""), 1.0) for d in page],
+        next_cursor=next_cursor,
+        estimated_total=total,
+        total_is_exact=total < ESTIMATE_CAP,
+    )
+
+
+def _score_expr(query_grams: int) -> Dict[str, Any]:
+    """
+    Aggregation expression for a candidate's rank: query coverage, plus 0.5
+    for a leading-word prefix hit, plus a small Jaccard tie-breaker.
+    """
+    jaccard = {
+        "$divide": [
+            "$overlap",
+            {
+                "$max": [
+                    {"$subtract": [{"$add": [query_grams, "$gramCount"]}, "$overlap"]},
+                    1,
+                ]
+            },
+        ]
+    }
+    return {
+        "$round": [
+            {
+                "$add": [
+                    {"$divide": ["$overlap", query_grams]},
+                    {"$cond": ["$prefixHit", 0.5, 0.0]},
+                    {"$multiply": [0.1, jaccard]},
+                ]
+            },
+            6,
+        ]
+    }
+
+
+async def search(
+    db,
+    entity_name: str,
+    text: str,
+    *,
+    scope: Any = None,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> SearchPage:
+    """
+    Typo-tolerant ranked search.
+
+    Args:
+        db: Motor database handle.
+        entity_name: Registered entity.
+        text: Search text.
+        scope: Organisation ID (ignored for unscoped entities).
+        filters: Equality filters on the entity's ``filter_fields``.
+        limit: Page size.
+        cursor: ``next_cursor`` of the previous page.
+        skip: Records to skip (offset paging for legacy endpoints).
+        threshold: Fraction of the query's trigrams a record must share.
+
+    Raises:
+        ValueError: Unknown entity or filter, or a malformed cursor.
+    """
+    entity = get_search_entity(entity_name)
+    words = split_words(text, MAX_QUERY_WORDS)
+    if not words:
+        return SearchPage()
+
+    scope_value = scope_key(entity, scope)
+    query_grams = trigrams(words)
+    min_match = max(1, math.ceil(threshold * len(query_grams)))
+
+    stat_ids = {_stat_id(entity, scope_value, g): g for g in query_grams}
+    frequency = {
+        stat_ids[s["_id"]]: s.get("n", 0)
+        async for s in db[STATS_COLLECTION].find({"_id": {"$in": list(stat_ids)}})
+    }
+    probe = sorted(query_grams, key=lambda g: (frequency.get(g, 0), g))[
+        : len(query_grams) - min_match + 1
+    ]
+
+    pipeline = [
+        {
+            "$match": {
+                "entity": entity.name,
+                "scope": scope_value,
+                "grams": {"$in": probe},
+                **_filter_query(entity, filters),
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "entityId": 1,
+                "label": 1,
+                "sortKey": 1,
+                "gramCount": 1,
+                "overlap": {"$size": {"$setIntersection": ["$grams", query_grams]}},
+                "prefixHit": {"$in": [words[0][:PREFIX_MAX], "$prefixes"]},
+            }
+        },
+        {"$match": {"overlap": {"$gte": min_match}}},
+        {"$addFields": {"score": _score_expr(len(query_grams))}},
+        # Reason: rank before capping — a cap on the raw gram match would
+        # keep an arbitrary 5000 candidates and could drop the best ones.
+        {
+            "$facet": {
+                "rows": [
+                    {"$sort": {"score": -1, "sortKey": 1, "entityId": 1}},
+                    {"$limit": CANDIDATE_CAP},
+                ],
+                "total": [{"$count": "n"}],
+            }
+        },
+    ]
+    (result,) = await db[COLLECTION].aggregate(pipeline).to_list(length=1)
+    rows = result["rows"]
+    total = result["total"][0]["n"] if result["total"] else 0
+
+    ranked = [(-row["score"], row["sortKey"], row["entityId"], row) for row in rows]
+    if cursor:
+        after = tuple(_decode_cursor(cursor, 3))
+        ranked = [item for item in ranked if item[:3] > after]
+    window = ranked[skip : skip + limit + 1]
+    page = window[:limit]
+
+    next_cursor = None
+    if len(window) > limit:
+        next_cursor = _encode_cursor(list(page[-1][:3]))
+
+    return SearchPage(
+        hits=[
+            SearchHit(row["entityId"], row.get("label", ""), -neg_score)
+            for neg_score, _, _, row in page
+        ],
+        next_cursor=next_cursor,
+        estimated_total=total,
+        total_is_exact=True,
+    )
+
+
+async def fetch_hits(
+    db, entity_name: str, page: SearchPage, projection: Optional[dict] = None
+) -> List[dict]:
+    """Source documents of ``page``'s hits, in rank order."""
+    entity = get_search_entity(entity_name)
+    ids = page.entity_ids
+    if not ids:
+        return []
+    docs = (
+        await db[entity.collection]
+        .find({entity.id_field: {"$in": ids}}, projection)
+        .to_list(length=len(ids))
+    )
+    by_id = {str(d.get(entity.id_field)): d for d in docs}
+    return [by_id[i] for i in ids if i in by_id]
@@ -0,0 +1,38 @@
+"""
+A64 Core Platform — Search API Schemas
+
+Response model shared by the modules' ``/autocomplete`` endpoints.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .index import SearchPage
+
+
+class AutocompleteItem(BaseModel):
+    """One suggestion."""
+
+    id: str = Field(..., description="Record ID")
+    label: str = Field(..., description="Display label")
+
+
+class AutocompleteResponse(BaseModel):
+    """A page of suggestions with a keyset cursor and an estimated total."""
+
+    items: List[AutocompleteItem] = Field(default_factory=list)
+    nextCursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page"
+    )
+    estimatedTotal: int = Field(0, ge=0, description="Estimated number of matches")
+    totalIsExact: bool = Field(True, description="Whether estimatedTotal is exact")
+
+    @classmethod
+    def from_page(cls, page: SearchPage) -> "AutocompleteResponse":
+        return cls(
+            items=[AutocompleteItem(id=h.entity_id, label=h.label) for h in page.hits],
+            nextCursor=page.next_cursor,
+            estimatedTotal=page.estimated_total,
+            totalIsExact=page.total_is_exact,
+        )
@@ -0,0 +1,63 @@
+"""
+A64 Core Platform — Search Tokenisation
+
+Text is normalised (NFKD, accents stripped, case-folded, anything that is
+not a letter or digit turned into a space) and split into words.  Two token
+families are derived from the words:
+
+* prefixes — every leading slice of each word, up to ``PREFIX_MAX``
+  characters.  Autocomplete is an exact (indexed) match on these.
+* trigrams — the 3-character windows of each word padded as ``"  word "``
+  (the pg_trgm convention), so word starts and 1–2 letter words still yield
+  grams.  A misspelt query keeps most of its trigrams, which is what makes
+  ranked search typo-tolerant.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Any, Iterable, List
+
+# Longest indexed prefix; longer query words are matched on this many chars.
+PREFIX_MAX = 16
+
+# Words indexed per document / considered per query.
+MAX_WORDS = 64
+MAX_QUERY_WORDS = 8
+
+
+def normalize(text: Any) -> str:
+    """Lower-case, accent-free text with single spaces between words."""
+    if text is None:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    chars = [
+        ch if ch.isalnum() else " "
+        for ch in decomposed
+        if not unicodedata.combining(ch)
+    ]
+    return " ".join("".join(chars).casefold().split())
+
+
+def split_words(text: Any, limit: int = MAX_WORDS) -> List[str]:
+    """Normalised words of ``text``, first ``limit`` only."""
+    return normalize(text).split()[:limit]
+
+
+def word_prefixes(words: Iterable[str]) -> List[str]:
+    """Distinct leading slices (1..PREFIX_MAX chars) of every word, sorted."""
+    prefixes = set()
+    for word in words:
+        for end in range(1, min(len(word), PREFIX_MAX) + 1):
+            prefixes.add(word[:end])
+    return sorted(prefixes)
+
+
+def trigrams(words: Iterable[str]) -> List[str]:
+    """Distinct padded trigrams of every word, sorted."""
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        for start in range(len(padded) - 2):
+            grams.add(padded[start : start + 3])
+    return sorted(grams)
@@ -0,0 +1,32 @@
+"""
+A64 Core Platform — Sequences
+
+One allocator for every generated code and document number: range
+allocation in a single round trip, per-worker prefetched blocks for codes,
+strict gapless numbering for fiscal documents, and gap auditing.
+
+Modules
+-------
+allocator — Counter, CounterNotFoundError, allocate, next_value,
+            counter_value, find_gaps, discard_prefetched_blocks
+"""
+
+from .allocator import (
+    Counter,
+    CounterNotFoundError,
+    allocate,
+    counter_value,
+    discard_prefetched_blocks,
+    find_gaps,
+    next_value,
+)
+
+__all__ = [
+    "Counter",
+    "CounterNotFoundError",
+    "allocate",
+    "counter_value",
+    "discard_prefetched_blocks",
+    "find_gaps",
+    "next_value",
+]
@@ -0,0 +1,205 @@
+"""
+A64 Core Platform — Sequence Allocator
+
+Every generated code and document number (customer ``C001``, employee
+``E001``, block sequence numbers, ``PO-2026-0042``…) comes from an integer
+counter held in some MongoDB document and advanced with one atomic
+``$inc``.  ``Counter`` describes where that integer lives; the functions
+here are the one API for taking numbers from it.
+
+Ranges
+------
+``allocate(db, counter, n)`` reserves ``n`` consecutive numbers with a
+single ``find_one_and_update`` (``$inc: n``) and returns them as a
+``range``, so a bulk import or a multi-document conversion touches the hot
+counter document once, not once per record.
+
+Modes
+-----
+* gapless (fiscal document numbers) — every number is taken from the
+  counter directly, inside the caller's session/transaction when one is
+  passed, so an aborted insert rolls its number back with it.
+* prefetched (``prefetch=True``; master-data codes) — each worker process
+  reserves a block of ``SEQUENCE_BLOCK_SIZE`` numbers at a time and hands
+  them out locally; concurrent requests in the worker share one refill.
+  Numbers still unused in a block when the process exits are never issued,
+  and codes from different workers interleave rather than follow creation
+  order — acceptable for codes, never for fiscal numbers.
+* plain — neither: one ``$inc`` per number, no session.
+
+The stored value is always the last number issued (``$inc`` then read the
+post-increment value), which is what every pre-existing counter document
+already holds.
+
+Auditing
+--------
+``find_gaps`` lists the numbers missing from an issued set;
+``counter_value`` reads a counter's high-water mark so audits can also see
+numbers issued past the last stored record.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from src.config.settings import settings
+
+
+class CounterNotFoundError(LookupError):
+    """A non-upserting counter's document does not exist."""
+
+
+@dataclass(frozen=True)
+class Counter:
+    """
+    Where a sequence's integer lives.
+
+    Attributes:
+        collection: Collection holding the counter document.
+        key: The counter document's ``_id``, or a filter dict for a counter
+            field embedded in another record (e.g. ``{"farmId": ...}``).
+        field: Integer field holding the last issued number.
+        prefetch: Hand out numbers from per-worker blocks (not gapless).
+        gapless: Fiscal numbering: never prefetched, session-aware.
+        upsert: Create the counter document on first use.  When False a
+            missing document raises ``CounterNotFoundError``.
+    """
+
+    collection: str
+    key: Any
+    field: str = "value"
+    prefetch: bool = False
+    gapless: bool = False
+    upsert: bool = True
+
+    def __post_init__(self) -> None:
+        if self.prefetch and self.gapless:
+            raise ValueError("A gapless counter cannot prefetch blocks")
+
+    @property
+    def filter(self) -> Dict[str, Any]:
+        return dict(self.key) if isinstance(self.key, dict) else {"_id": self.key}
+
+    @property
+    def cache_key(self) -> Tuple[str, str, str]:
+        return (
+            self.collection,
+            json.dumps(self.filter, sort_keys=True, default=str),
+            self.field,
+        )
+
+
+async def allocate(db, counter: Counter, count: int = 1, *, session=None) -> range:
+    """
+    Reserve ``count`` consecutive numbers in one round trip.
+
+    Args:
+        db: Motor database.
+        counter: The counter to advance.
+        count: How many numbers to reserve.
+        session: Optional Motor session; pass the caller's transaction
+            session for gapless numbering.
+
+    Returns:
+        The reserved numbers, e.g. ``range(41, 51)`` for ``count=10``.
+
+    Raises:
+        ValueError: If ``count`` < 1.
+        CounterNotFoundError: If the counter is not upserting and its
+            document does not exist.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    result = await db[counter.collection].find_one_and_update(
+        counter.filter,
+        {"$inc": {counter.field: count}},
+        upsert=counter.upsert,
+        return_document=ReturnDocument.AFTER,
+        session=session,
+    )
+    if result is None or result.get(counter.field) is None:
+        raise CounterNotFoundError(
+            f"No counter document in {counter.collection} matching {counter.filter}"
+        )
+    last = int(result[counter.field])
+    return range(last - count + 1, last + 1)
+
+
+class _Block:
+    """A worker's unissued numbers of one prefetched counter."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.lock = asyncio.Lock()
+        self.next = 0
+        self.end = 0
+
+
+_blocks: Dict[Tuple[str, str, str], _Block] = {}
+
+
+def _block_for(counter: Counter) -> _Block:
+    loop = asyncio.get_running_loop()
+    block = _blocks.get(counter.cache_key)
+    if block is None or block.loop is not loop:
+        block = _blocks[counter.cache_key] = _Block(loop)
+    return block
+
+
+async def next_value(db, counter: Counter, *, session=None) -> int:
+    """
+    Take the next number of ``counter``.
+
+    Prefetched counters are served from this worker's block, refilled with
+    one ``allocate`` of ``SEQUENCE_BLOCK_SIZE`` when it runs out; others take
+    the number from the counter document directly.
+    """
+    if not counter.prefetch:
+        return (await allocate(db, counter, session=session))[0]
+
+    block = _block_for(counter)
+    if block.next >= block.end:
+        async with block.lock:
+            if block.next >= block.end:
+                size = max(1, settings.SEQUENCE_BLOCK_SIZE)
+                fresh = await allocate(db, counter, size)
+                block.next, block.end = fresh.start, fresh.stop
+    value = block.next
+    block.next += 1
+    return value
+
+
+def discard_prefetched_blocks() -> None:
+    """Forget every worker-local block (their unused numbers become gaps)."""
+    _blocks.clear()
+
+
+async def counter_value(db, counter: Counter) -> int:
+    """The last number issued by ``counter`` (0 if it was never used)."""
+    doc = await db[counter.collection].find_one(
+        counter.filter, {counter.field: 1, "_id": 0}
+    )
+    return int((doc or {}).get(counter.field) or 0)
+
+
+def find_gaps(
+    issued: Iterable[int], *, start: int = 1, end: Optional[int] = None
+) -> List[int]:
+    """
+    Numbers in ``start..end`` (inclusive) that are missing from ``issued``.
+
+    ``end`` defaults to the largest issued number, i.e. only internal gaps
+    are reported; pass a counter's ``counter_value`` to also report numbers
+    issued after the last stored record.
+    """
+    seen = set(issued)
+    if end is None:
+        if not seen:
+            return []
+        end = max(seen)
+    return [n for n in range(start, end + 1) if n not in seen]
@@ -0,0 +1,39 @@
+"""
+A64 Core Platform — Tokens
+
+Shared JWT verification: a verified-token LRU keyed by token digest, valid
+until each token's expiry, and an O(1) revocation map (user, session and
+refresh-token entries) kept in sync across workers.
+
+Modules
+-------
+verifier — TokenVerifier, TokenRevokedError, verify_token,
+           claims_for_request, revoke_user_tokens, revoke_session,
+           revoke_refresh_token, sync_revocations, run_revocation_sync
+"""
+
+from .verifier import (
+    TokenRevokedError,
+    TokenVerifier,
+    claims_for_request,
+    revoke_refresh_token,
+    revoke_session,
+    revoke_user_tokens,
+    run_revocation_sync,
+    sync_revocations,
+    token_verifier,
+    verify_token,
+)
+
+__all__ = [
+    "TokenRevokedError",
+    "TokenVerifier",
+    "claims_for_request",
+    "revoke_refresh_token",
+    "revoke_session",
+    "revoke_user_tokens",
+    "run_revocation_sync",
+    "sync_revocations",
+    "token_verifier",
+    "verify_token",
+]
@@ -0,0 +1,302 @@
+"""
+A64 Core Platform — Token Verifier
+
+Every authenticated request used to re-verify its HS256 JWT with
+python-jose, often more than once (the rate limiter, ``get_current_user``,
+and each module's own auth dependency).  ``verify_token`` is the one shared
+verification path:
+
+Cache
+-----
+A bounded LRU (``TOKEN_CACHE_MAX_ENTRIES``) maps the SHA-256 digest of each
+token that verified successfully to its claims.  An entry lives until the
+token's ``exp``; after that a lookup raises ``ExpiredSignatureError`` just as
+jose would.  A hit costs one digest and one dict lookup.  Failed
+verifications are never cached, and a change of ``SECRET_KEY`` empties the
+cache.
+
+Revocation
+----------
+Tokens are stateless, so logging out, resetting a password or an admin MFA
+reset previously left issued access tokens valid until they expired.  The
+revocation map is checked on every verification of an access or refresh
+token (cache hit or not), all in O(1):
+
+* ``user:<userId>``    — every token of that user issued (``iat``) at or
+                         before the revocation; tokens minted before ``iat``
+                         was added count as issued at 0.
+* ``session:<id>``     — the refresh token with that ``tokenId`` and every
+                         access token minted with it (``sid`` claim).
+* ``refresh:<id>``     — only the refresh token with that ``tokenId``
+                         (rotation: the session's access tokens stay valid).
+
+Revocations are applied to this worker's map immediately and written to the
+``token_revocations`` collection; every worker pulls other workers' entries
+every ``TOKEN_REVOCATION_SYNC_SECONDS`` (``run_revocation_sync``).  Entries
+expire (TTL) once no token they could match is still valid.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError
+
+from src.config.settings import settings
+
+from ..indexes import declare_index
+
+logger = logging.getLogger(__name__)
+
+REVOCATIONS_COLLECTION = "token_revocations"
+
+# Longest token lifetime (refresh tokens: 7 days); a user-wide revocation
+# must outlive every token issued before it.
+USER_REVOCATION_TTL = timedelta(days=7)
+
+SYNC_OVERLAP = timedelta(seconds=30)
+
+# Single-use verification/MFA tokens are tracked by their own services.
+REVOCABLE_TYPES = frozenset({"access", "refresh"})
+
+declare_index(
+    REVOCATIONS_COLLECTION,
+    "expiresAt",
+    name="expires_ttl",
+    expireAfterSeconds=0,
+)
+declare_index(REVOCATIONS_COLLECTION, "revokedAt", name="revoked_at")
+
+
+class TokenRevokedError(JWTError):
+    """The token verified, but has been revoked."""
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class TokenVerifier:
+    """Verified-token LRU plus the worker's copy of the revocation map."""
+
+    def __init__(self) -> None:
+        self._cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._secret: Optional[str] = None
+        self._lock = threading.Lock()
+        # key -> (cutoff epoch seconds, expiry epoch seconds)
+        self._revoked: Dict[str, Tuple[float, float]] = {}
+        self._synced_until: Optional[datetime] = None
+        self.hits = 0
+        self.misses = 0
+
+    # -- verification -------------------------------------------------------
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verified claims of ``token``.
+
+        Raises:
+            ExpiredSignatureError: The token has expired.
+            TokenRevokedError: The token has been revoked.
+            JWTError: The token is malformed or its signature is invalid.
+        """
+        if not token:
+            raise JWTError("No token")
+        key = _digest(token)
+        now = time.time()
+        with self._lock:
+            if self._secret != settings.SECRET_KEY:
+                self._cache.clear()
+                self._secret = settings.SECRET_KEY
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[1] <= now:
+                    del self._cache[key]
+                    raise ExpiredSignatureError("Signature has expired.")
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+            self.misses += 1
+            exp = claims.get("exp")
+            if isinstance(exp, (int, float)):
+                with self._lock:
+                    self._cache[key] = (claims, float(exp))
+                    while len(self._cache) > max(1, settings.TOKEN_CACHE_MAX_ENTRIES):
+                        self._cache.popitem(last=False)
+        else:
+            claims = entry[0]
+        if self.is_revoked(claims, now):
+            raise TokenRevokedError("Token has been revoked")
+        return dict(claims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revocations": len(self._revoked),
+        }
+
+    # -- revocation ---------------------------------------------------------
+
+    def is_revoked(self, claims: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Whether any revocation entry matches ``claims`` (O(1))."""
+        revoked = self._revoked
+        if not revoked or claims.get("type") not in REVOCABLE_TYPES:
+            return False
+        now = time.time() if now is None else now
+
+        def hit(key: str, issued_at: Optional[float] = None) -> bool:
+            entry = revoked.get(key)
+            if entry is None or entry[1] <= now:
+                return False
+            return issued_at is None or issued_at <= entry[0]
+
+        user_id = claims.get("userId")
+        if user_id and hit(f"user:{user_id}", float(claims.get("iat") or 0)):
+            return True
+        token_id = claims.get("tokenId")
+        session_id = claims.get("sid") or token_id
+        if session_id and hit(f"session:{session_id}"):
+            return True
+        return bool(token_id) and hit(f"refresh:{token_id}")
+
+    def apply_revocation(self, key: str, cutoff: float, expires_at: float) -> None:
+        """Add (or extend) a revocation entry in this worker's map."""
+        current = self._revoked.get(key)
+        if current is None or current[0] < cutoff:
+            self._revoked[key] = (cutoff, max(expires_at, current[1] if current else 0))
+
+    def prune_revocations(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        for key in [k for k, (_, exp) in self._revoked.items() if exp <= now]:
+            del self._revoked[key]
+
+    def reset_revocations(self) -> None:
+        self._revoked.clear()
+        self._synced_until = None
+
+
+token_verifier = TokenVerifier()
+
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """Verify ``token`` through the shared verifier (see ``TokenVerifier.verify``)."""
+    return token_verifier.verify(token)
+
+
+def claims_for_request(token: str, state: Any = None) -> Dict[str, Any]:
+    """
+    Verified claims of a request's bearer ``token``.
+
+    ``state`` is the request's ``request.state``; when the request pipeline
+    has put a context there for this same token, its memoized claims are
+    returned, otherwise the token goes through ``verify_token``.  Raises as
+    ``TokenVerifier.verify`` does.
+    """
+    context = getattr(state, "context", None) if state is not None else None
+    if context is not None and getattr(context, "token", None) == token:
+        return context.verified_claims()
+    return verify_token(token)
+
+
+# =============================================================================
+# Revocation persistence
+# =============================================================================
+
+
+def _epoch(naive_utc: datetime) -> float:
+    return (naive_utc - datetime(1970, 1, 1)).total_seconds()
+
+
+async def _revoke(db, key: str, expires_at: datetime, reason: str) -> None:
+    now = datetime.utcnow()
+    cutoff = time.time()
+    token_verifier.apply_revocation(key, cutoff, _epoch(expires_at))
+    try:
+        await db[REVOCATIONS_COLLECTION].update_one(
+            {"_id": key},
+            {
+                "$set": {
+                    "cutoff": cutoff,
+                    "revokedAt": now,
+                    "expiresAt": expires_at,
+                    "reason": reason,
+                }
+            },
+            upsert=True,
+        )
+    except Exception as e:
+        # This worker already rejects the token; the others will not until
+        # the entry is written, so make the failure visible.
+        logger.error(f"Failed to persist token revocation {key}: {e}")
+
+
+async def revoke_user_tokens(db, user_id: str, reason: str) -> None:
+    """Revoke every token of ``user_id`` issued up to now."""
+    await _revoke(
+        db, f"user:{user_id}", datetime.utcnow() + USER_REVOCATION_TTL, reason
+    )
+
+
+async def revoke_session(db, token_id: str, expires_at: datetime) -> None:
+    """Revoke a refresh token and the access tokens minted with it."""
+    await _revoke(db, f"session:{token_id}", expires_at, "logout")
+
+
+async def revoke_refresh_token(db, token_id: str, expires_at: datetime) -> None:
+    """Revoke a single refresh token (rotation)."""
+    await _revoke(db, f"refresh:{token_id}", expires_at, "rotated")
+
+
+async def sync_revocations(db) -> int:
+    """
+    Pull revocations written since the last sync into this worker's map.
+
+    Returns:
+        Number of entries applied.
+    """
+    query: Dict[str, Any] = {"expiresAt": {"$gt": datetime.utcnow()}}
+    if token_verifier._synced_until is not None:
+        # Overlap so entries committed slightly out of revokedAt order are
+        # not missed; applying an entry twice is harmless.
+        query["revokedAt"] = {"$gte": token_verifier._synced_until - SYNC_OVERLAP}
+    docs = await db[REVOCATIONS_COLLECTION].find(query).to_list(length=None)
+    for doc in docs:
+        token_verifier.apply_revocation(
+            doc["_id"], float(doc["cutoff"]), _epoch(doc["expiresAt"])
+        )
+        if (
+            token_verifier._synced_until is None
+            or doc["revokedAt"] > token_verifier._synced_until
+        ):
+            token_verifier._synced_until = doc["revokedAt"]
+    if token_verifier._synced_until is None:
+        token_verifier._synced_until = datetime.utcnow()
+    token_verifier.prune_revocations()
+    return len(docs)
+
+
+async def run_revocation_sync(db) -> None:
+    """Per-worker loop keeping the revocation map current (started by main)."""
+    while True:
+        try:
+            await sync_revocations(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Token revocation sync failed: {e}")
+        await asyncio.sleep(max(1, settings.TOKEN_REVOCATION_SYNC_SECONDS))
@@ -5,6 +5,8 @@ This module initializes and configures the FastAPI application,
 sets up middleware, routes, and error handlers.
 """
 
+import asyncio
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -20,13 +22,18 @@ from .config.settings import settings
 from .services.database import mongodb
 from .services.port_manager import init_port_manager, get_port_manager
 from .services.module_manager import module_manager
+from .services.module_ops import module_ops
 from .core.plugin_system import get_plugin_manager
 from .core.cache import get_redis_cache, close_redis_cache
+from .core.indexes import reconcile_indexes_on_startup
+from .core.jobs import get_job_runner
+from .core.propagation import propagation_drain_job
+from .core.search import search_backfill_job
+from .core.tokens import run_revocation_sync
 from .core.logging_config import setup_logging
-from .middleware.rate_limit import RateLimitMiddleware
-from .middleware.timing import TimingMiddlewareWithCollector
-from .middleware.division_context import DivisionContextMiddleware
+from .middleware.pipeline import RequestPipelineMiddleware
 from .utils.security import hash_password
+from .utils.crypto_executor import crypto_executor
 from .models.user import UserRole
 from .services.audit_log_service import write_user_audit_log
 
@@ -63,20 +70,14 @@ app.add_middleware(
     expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
 )
 
-# Response Time Monitoring Middleware - Applied first (outermost)
-# Tracks request timing, adds X-Response-Time header, alerts for slow requests (>1s)
+# Request pipeline - division context, rate limiting and response timing
+# (X-Response-Time, X-RateLimit-*, slow requests >1s) in one pure-ASGI layer.
+# Added after CORS, so it is outermost.
+# Limits vary by role: Guest=10, User=100, Moderator=200, Admin=500, Super Admin=1000 req/min
 app.add_middleware(
-    TimingMiddlewareWithCollector, slow_threshold_ms=1000, skip_health_logging=True
+    RequestPipelineMiddleware, slow_threshold_ms=1000, skip_health_logging=True
 )
 
-# Rate Limiting Middleware - Applied after CORS
-# Limits vary by role: Guest=10, User=100, Moderator=200, Admin=500, Super Admin=1000 req/min
-app.add_middleware(RateLimitMiddleware)
-
-# Division Context Middleware - Reads X-Division-Id header and sets ContextVar
-# Applied after rate limiting so division scoping is available to all request handlers
-app.add_middleware(DivisionContextMiddleware)
-
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -394,6 +395,14 @@ async def startup_event() -> None:
     except Exception as e:
         logger.warning(f"Redis cache connection failed: {e}. Caching disabled.")
 
+    # Keep this worker's token revocation map in sync with the other workers'
+    try:
+        app.state.token_revocation_task = asyncio.create_task(
+            run_revocation_sync(mongodb.get_database())
+        )
+    except Exception as e:
+        logger.error(f"Failed to start token revocation sync: {e}")
+
     # Initialize Port Manager
     try:
         await init_port_manager(mongodb.get_database())
@@ -405,6 +414,9 @@ async def startup_event() -> None:
     except Exception as e:
         logger.error(f"Failed to initialize Port Manager: {e}")
 
+    # Keep the module container state cache fed from Docker events
+    module_manager.start_container_watch()
+
     # Seed super_admin account if none exists
     try:
         await seed_admin()
@@ -422,6 +434,52 @@ async def startup_event() -> None:
     except Exception as e:
         logger.error(f"Failed to load plugin modules: {e}")
 
+    # Reason: plugin startup hooks (which declare the module indexes and
+    # register their background jobs) were appended to the startup handler
+    # list while loading the modules above, so these handlers — appended
+    # last — run after every declaration and job registration exists.
+    app.add_event_handler("startup", start_index_reconciliation)
+    app.add_event_handler("startup", start_job_runner)
+
+
+async def start_index_reconciliation() -> None:
+    """
+    Reconcile declared MongoDB indexes in the background.
+
+    Runs off the startup path so /api/health answers immediately; only the
+    worker that wins the Redis election does any work (see src.core.indexes).
+    """
+
+    async def _run() -> None:
+        try:
+            await reconcile_indexes_on_startup(
+                mongodb.get_database(),
+                concurrency=settings.INDEX_RECONCILE_CONCURRENCY,
+            )
+        except Exception as e:
+            logger.error(f"Index reconciliation failed: {e}")
+
+    app.state.index_reconcile_task = asyncio.create_task(_run())
+
+
+async def start_job_runner() -> None:
+    """
+    Start the leader-elected background job runner (see src.core.jobs).
+
+    Every worker runs one; only the lease holder schedules and executes jobs.
+    """
+    if not settings.JOB_RUNNER_ENABLED:
+        logger.info("Job runner disabled (JOB_RUNNER_ENABLED=false)")
+        return
+    try:
+        runner = get_job_runner()
+        # Core jobs; module jobs were registered by their startup hooks
+        runner.register(search_backfill_job(mongodb.get_database()))
+        runner.register(propagation_drain_job(mongodb.get_database()))
+        await runner.start(mongodb.get_database())
+    except Exception as e:
+        logger.error(f"Failed to start job runner: {e}")
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -429,6 +487,21 @@ async def shutdown_event() -> None:
     """Cleanup on application shutdown"""
     logger.info("Shutting down A64 Core Platform API Hub...")
 
+    # Stop background jobs before their database connections go away
+    await get_job_runner().stop()
+
+    # Stop the token revocation sync
+    revocation_task = getattr(app.state, "token_revocation_task", None)
+    if revocation_task is not None:
+        revocation_task.cancel()
+
+    # Stop the password-hashing worker processes
+    crypto_executor.shutdown(wait=False)
+
+    # Stop the Docker event subscription and the module ops threads
+    module_manager.stop_container_watch()
+    module_ops.shutdown(wait=False)
+
     # Disconnect from MongoDB
     await mongodb.disconnect()
     logger.info("Database connection closed")
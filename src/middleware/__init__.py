@@ -20,14 +20,13 @@ from .rate_limit import (
     rate_limit_dependency,
     login_rate_limiter,
     mfa_rate_limiter,
-    RateLimitMiddleware,
 )
 from .timing import (
-    TimingMiddleware,
-    TimingMiddlewareWithCollector,
     ResponseTimeCollector,
     response_time_collector,
 )
+from .request_context import RequestContext, get_request_context
+from .pipeline import RequestPipelineMiddleware
 
 __all__ = [
     "get_current_user",
@@ -45,9 +44,9 @@ __all__ = [
     "rate_limit_dependency",
     "login_rate_limiter",
     "mfa_rate_limiter",
-    "RateLimitMiddleware",
-    "TimingMiddleware",
-    "TimingMiddlewareWithCollector",
     "ResponseTimeCollector",
     "response_time_collector",
+    "RequestContext",
+    "get_request_context",
+    "RequestPipelineMiddleware",
 ]
@@ -10,7 +10,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
 from ..models.user import TokenPayload, UserRole, UserResponse
-from ..utils.security import verify_access_token
+from ..utils.security import token_payload_from_claims, verify_access_token
+from .request_context import get_request_context
 from ..services.database import mongodb
 
 # HTTP Bearer token scheme
@@ -45,8 +46,12 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Validate token
-    token_data = verify_access_token(credentials.credentials)
+    # Validate token (reusing the claims the request pipeline already decoded)
+    context = get_request_context()
+    if context is not None and context.token == credentials.credentials:
+        token_data = token_payload_from_claims(context.claims)
+    else:
+        token_data = verify_access_token(credentials.credentials)
 
     if token_data is None:
         raise credentials_exception
@@ -1,19 +1,20 @@
 """
-Division Context Middleware
+Division Context
 
-Reads X-Division-Id header from requests and sets a ContextVar
+The request pipeline (pipeline.py) reads the X-Division-Id and
+X-Organization-Id headers from requests and sets them as ContextVars
 accessible throughout the request lifecycle. Repositories use this
 to auto-scope queries to the active division.
+
+If no header is present, the ContextVar defaults to None,
+meaning queries run without division scoping (global scope).
+This ensures backward compatibility.
 """
 
 import logging
 from contextvars import ContextVar
 from typing import Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
-
 logger = logging.getLogger(__name__)
 
 # ContextVar holds the current division ID for the request scope
@@ -40,33 +41,3 @@ def set_division_context(
     _division_id_var.set(division_id)
     if organization_id:
         _organization_id_var.set(organization_id)
-
-
-class DivisionContextMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware that reads X-Division-Id and X-Organization-Id headers
-    and sets them as ContextVars for the duration of the request.
-
-    If no header is present, the ContextVar defaults to None,
-    meaning queries run without division scoping (global scope).
-    This ensures backward compatibility.
-    """
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Read division ID from header
-        division_id = request.headers.get("X-Division-Id")
-        organization_id = request.headers.get("X-Organization-Id")
-
-        # Set context vars for this request
-        division_token = _division_id_var.set(division_id)
-        org_token = _organization_id_var.set(organization_id)
-
-        try:
-            response = await call_next(request)
-            return response
-        finally:
-            # Reset context vars after request completes
-            _division_id_var.reset(division_token)
-            _organization_id_var.reset(org_token)
@@ -0,0 +1,161 @@
+"""
+Request Pipeline Middleware
+
+A single pure-ASGI middleware doing, in order, what three stacked
+``BaseHTTPMiddleware`` layers used to:
+
+1. Division context — X-Division-Id / X-Organization-Id into ContextVars
+   (division_context.py) for the duration of the request.
+2. Rate limiting — per role/user via ``rate_limiter`` (rate_limit.py);
+   429 with Retry-After and X-RateLimit-* when exceeded, X-RateLimit-*
+   headers on every other response.
+3. Response timing — X-Response-Time header, slow-request logging and the
+   response time collector (timing.py).
+
+``BaseHTTPMiddleware`` runs the rest of the app in a separate task behind a
+memory stream per layer, which costs time on every request and interferes
+with streaming responses and background tasks.  Here headers are added by
+wrapping ``send`` as the response starts; the body passes through untouched.
+
+All three stages share one ``RequestContext`` (request_context.py), so the
+bearer token is decoded once per request — by the rate limiter or by
+``get_current_user``, whichever needs it first.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .division_context import _division_id_var, _organization_id_var
+from .rate_limit import (
+    RATE_LIMIT_SKIP_PATHS,
+    rate_limit_headers,
+    rate_limit_user_from_claims,
+    rate_limiter,
+)
+from .request_context import RequestContext, _request_context_var
+from .timing import record_response_time
+
+logger = logging.getLogger(__name__)
+
+
+def _bearer_token(headers: Headers) -> Optional[str]:
+    auth_header = headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    return auth_header[7:]  # Remove "Bearer " prefix
+
+
+class RequestPipelineMiddleware:
+    """
+    Division context, rate limiting and response timing in one ASGI layer.
+
+    Args:
+        app: The wrapped ASGI application
+        slow_threshold_ms: Threshold in milliseconds for slow request warnings
+        skip_health_logging: Skip logging for health check endpoints
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_threshold_ms: int = 1000,
+        skip_health_logging: bool = True,
+    ):
+        self.app = app
+        self.slow_threshold_ms = slow_threshold_ms
+        self.skip_health_logging = skip_health_logging
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        context = RequestContext(
+            scope=scope,
+            method=scope["method"],
+            path=scope["path"],
+            token=_bearer_token(headers),
+            division_id=headers.get("X-Division-Id"),
+            organization_id=headers.get("X-Organization-Id"),
+        )
+        scope.setdefault("state", {})["context"] = context
+
+        context_token = _request_context_var.set(context)
+        division_token = _division_id_var.set(context.division_id)
+        org_token = _organization_id_var.set(context.organization_id)
+        try:
+            await self._rate_limit(context, receive, send)
+        finally:
+            _organization_id_var.reset(org_token)
+            _division_id_var.reset(division_token)
+            _request_context_var.reset(context_token)
+
+    async def _rate_limit(
+        self, context: RequestContext, receive: Receive, send: Send
+    ) -> None:
+        # Skip rate limiting for CORS preflight, health checks and docs
+        if context.method == "OPTIONS" or context.path in RATE_LIMIT_SKIP_PATHS:
+            await self._timed(context, receive, send, None)
+            return
+
+        request = Request(context.scope)
+        try:
+            user = rate_limit_user_from_claims(context.claims)
+            if user:
+                request.state.user = user
+            limit, remaining, _ = await rate_limiter.check_rate_limit(request)
+        except HTTPException as exc:
+            # Rate limit exceeded - return 429 response with headers
+            response = JSONResponse(
+                status_code=exc.status_code,
+                content={"detail": exc.detail},
+                headers=exc.headers or {},
+            )
+            await response(context.scope, receive, send)
+            return
+
+        await self._timed(context, receive, send, (limit, remaining))
+
+    async def _timed(
+        self,
+        context: RequestContext,
+        receive: Receive,
+        send: Send,
+        rate_limit: Optional[Tuple[int, int]],
+    ) -> None:
+        started = False
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                duration_ms = context.elapsed_ms
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+                if rate_limit is not None:
+                    response_headers.update(rate_limit_headers(*rate_limit))
+                record_response_time(
+                    context.method,
+                    context.path,
+                    message["status"],
+                    duration_ms,
+                    self.slow_threshold_ms,
+                    self.skip_health_logging,
+                )
+            await send(message)
+
+        try:
+            await self.app(context.scope, receive, send_with_headers)
+        except Exception as e:
+            if not started:
+                logger.error(
+                    f"ERROR {context.method} {context.path} - "
+                    f"{context.elapsed_ms:.2f}ms - Exception: {str(e)}"
+                )
+            raise
@@ -6,8 +6,7 @@ Uses Redis for distributed rate limiting with in-memory fallback
 """
 
 from fastapi import Request, HTTPException, status, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 import os
@@ -285,11 +284,53 @@ async def rate_limit_dependency(request: Request) -> Tuple[int, int, int]:
     return await rate_limiter.check_rate_limit(request)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Paths the request pipeline never rate limits (health checks, API docs)
+RATE_LIMIT_SKIP_PATHS = frozenset(
+    {
+        "/api/health",
+        "/api/ready",
+        "/",
+        "/api/docs",
+        "/api/redoc",
+        "/api/openapi.json",
+    }
+)
+
+
+class RateLimitedUser:
+    """The identity rate limiting keys on, taken from a bearer token's claims."""
+
+    def __init__(self, user_id: str, role_str: str):
+        self.userId = user_id
+        try:
+            self.role = UserRole(role_str)
+        except ValueError:
+            self.role = UserRole.GUEST
+
+
+def rate_limit_user_from_claims(
+    claims: Optional[Dict[str, Any]],
+) -> Optional[RateLimitedUser]:
+    """
+    Build the rate-limit identity from decoded JWT claims.
+
+    Returns None (rate limited by IP as a guest) unless the claims carry both
+    a userId and a role.
+    """
+    if not claims:
+        return None
+    user_id = claims.get("userId")
+    role = claims.get("role")
+    if not user_id or not role:
+        return None
+    return RateLimitedUser(user_id, role)
+
+
+def rate_limit_headers(limit: int, remaining: int) -> Dict[str, str]:
     """
-    Middleware to add rate limit headers to all responses.
+    Rate limit headers added to every rate-limited response.
 
-    Headers added:
+    Headers:
     - X-RateLimit-Limit: Maximum requests per minute for user's role
     - X-RateLimit-Remaining: Remaining requests in current window
     - X-RateLimit-Reset: Seconds until the rate limit resets
@@ -301,93 +342,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     - Admin: 500
     - Super Admin: 1000
     """
-
-    def _extract_user_from_token(self, request: Request) -> Optional[object]:
-        """
-        Extract user info from JWT token in Authorization header.
-
-        Returns a simple object with userId and role attributes, or None if no valid token.
-        """
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return None
-
-        try:
-            from jose import jwt, JWTError
-
-            token = auth_header[7:]  # Remove "Bearer " prefix
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-
-            user_id = payload.get("userId")
-            role = payload.get("role")
-
-            if not user_id or not role:
-                return None
-
-            # Create a simple user object
-            class SimpleUser:
-                def __init__(self, user_id: str, role_str: str):
-                    self.userId = user_id
-                    try:
-                        self.role = UserRole(role_str)
-                    except ValueError:
-                        self.role = UserRole.GUEST
-
-            return SimpleUser(user_id, role)
-
-        except (JWTError, Exception) as e:
-            logger.debug(f"Failed to extract user from token: {e}")
-            return None
-
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for CORS preflight requests
-        if request.method == "OPTIONS":
-            return await call_next(request)
-
-        # Skip rate limiting for health check and documentation endpoints
-        skip_paths = [
-            "/api/health",
-            "/api/ready",
-            "/",
-            "/api/docs",
-            "/api/redoc",
-            "/api/openapi.json",
-        ]
-        if request.url.path in skip_paths:
-            return await call_next(request)
-
-        try:
-            # Extract user from JWT token and set in request state
-            user = self._extract_user_from_token(request)
-            if user:
-                request.state.user = user
-
-            # Check rate limit and get info for headers
-            limit, remaining, current_count = await rate_limiter.check_rate_limit(
-                request
-            )
-
-            # Process the request
-            response = await call_next(request)
-
-            # Add rate limit headers to response
-            seconds_into_window = int(time.time()) % 60
-            reset_seconds = max(1, 60 - seconds_into_window)
-            response.headers["X-RateLimit-Limit"] = str(limit)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(reset_seconds)
-
-            return response
-
-        except HTTPException as exc:
-            # Rate limit exceeded - return 429 response with headers
-            from fastapi.responses import JSONResponse
-
-            return JSONResponse(
-                status_code=exc.status_code,
-                content={"detail": exc.detail},
-                headers=exc.headers or {},
-            )
+    seconds_into_window = int(time.time()) % 60
+    reset_seconds = max(1, 60 - seconds_into_window)
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset_seconds),
+    }
 
 
 class LoginRateLimiter:
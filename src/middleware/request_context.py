@@ -0,0 +1,83 @@
+"""
+Request Context
+
+One object per HTTP request, created by ``RequestPipelineMiddleware`` and
+shared by everything downstream of it: the bearer token and its decoded
+claims (decoded at most once per request, whoever asks first), the division
+and organization headers, the matched route template and the start time.
+
+Available through ``get_request_context()`` (a ContextVar, so also from
+dependencies and services) and as ``request.state.context``.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from jose import JWTError
+
+from ..core.tokens import verify_token
+
+_UNSET: Any = object()
+
+_request_context_var: ContextVar[Optional["RequestContext"]] = ContextVar(
+    "request_context", default=None
+)
+
+
+@dataclass
+class RequestContext:
+    """Per-request state shared across the middleware pipeline and handlers."""
+
+    scope: Dict[str, Any] = field(repr=False)
+    method: str
+    path: str
+    token: Optional[str] = None
+    division_id: Optional[str] = None
+    organization_id: Optional[str] = None
+    start_time: float = field(default_factory=time.perf_counter)
+    _claims: Any = field(default=_UNSET, repr=False)
+    _claims_error: Optional[JWTError] = field(default=None, repr=False)
+
+    def verified_claims(self) -> Dict[str, Any]:
+        """
+        The bearer token's verified JWT claims, verified once per request.
+
+        Raises:
+            JWTError: As ``verify_token`` (expired, revoked or invalid token),
+                every time it is called for this request.
+        """
+        if self._claims is _UNSET:
+            try:
+                self._claims = verify_token(self.token)
+            except JWTError as e:
+                self._claims, self._claims_error = None, e
+        if self._claims_error is not None:
+            raise self._claims_error
+        return self._claims
+
+    @property
+    def claims(self) -> Optional[Dict[str, Any]]:
+        """The bearer token's verified JWT claims (None if absent/invalid)."""
+        if not self.token:
+            return None
+        try:
+            return self.verified_claims()
+        except JWTError:
+            return None
+
+    @property
+    def route(self) -> Optional[str]:
+        """Matched route template (e.g. ``/api/v1/farms/{farm_id}``) once routed."""
+        route = self.scope.get("route")
+        return getattr(route, "path", None)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """The current request's context, or None outside a request."""
+    return _request_context_var.get()
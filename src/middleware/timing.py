@@ -1,5 +1,5 @@
 """
-API Response Time Monitoring Middleware
+API Response Time Monitoring
 
 Implements request timing and logging for performance monitoring:
 - Logs request method, path, and duration for all requests
@@ -7,116 +7,19 @@ Implements request timing and logging for performance monitoring:
 - Alerts for slow requests (> 1s threshold)
 - Prometheus-compatible metrics ready (optional integration)
 
+The timing itself is done by the request pipeline (pipeline.py); this module
+holds the response time collector and the logging rules.
+
 Feature #372: Implement API response time monitoring
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-import time
 import logging
-from typing import Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-
-class TimingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to track and log API response times.
-
-    Features:
-    - Measures request processing time in milliseconds
-    - Adds X-Response-Time header to all responses
-    - Logs slow requests (configurable threshold, default 1000ms)
-    - Logs all requests with method, path, status, and duration
-    - Skip logging for health check endpoints (optional)
-
-    Response Headers:
-    - X-Response-Time: Response time in milliseconds (e.g., "45.23ms")
-
-    Log Format:
-    - INFO: "{method} {path} {status} {duration}ms"
-    - WARNING: "SLOW REQUEST: {method} {path} took {duration}ms (threshold: {threshold}ms)"
-    """
-
-    # Default slow request threshold (milliseconds)
-    SLOW_REQUEST_THRESHOLD_MS = 1000
-
-    # Paths to skip logging (high-frequency health checks)
-    SKIP_LOGGING_PATHS = ["/api/health", "/api/ready", "/health"]
-
-    def __init__(
-        self, app, slow_threshold_ms: int = 1000, skip_health_logging: bool = True
-    ):
-        """
-        Initialize timing middleware.
-
-        Args:
-            app: The FastAPI/Starlette application
-            slow_threshold_ms: Threshold in milliseconds for slow request warnings (default: 1000ms)
-            skip_health_logging: Skip logging for health check endpoints (default: True)
-        """
-        super().__init__(app)
-        self.slow_threshold_ms = slow_threshold_ms
-        self.skip_health_logging = skip_health_logging
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Process request and measure response time.
-
-        Args:
-            request: The incoming HTTP request
-            call_next: The next middleware/handler in the chain
-
-        Returns:
-            Response with X-Response-Time header added
-        """
-        # Start timing
-        start_time = time.perf_counter()
-
-        # Get request info
-        method = request.method
-        path = request.url.path
-
-        # Process the request
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
-        except Exception as e:
-            # Calculate duration even on error
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            logger.error(
-                f"ERROR {method} {path} - {duration_ms:.2f}ms - Exception: {str(e)}"
-            )
-            raise
-
-        # Calculate duration
-        duration_ms = (time.perf_counter() - start_time) * 1000
-
-        # Add X-Response-Time header
-        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-        # Also add timing metadata that could be used by monitoring tools
-        response.headers["X-Request-Start"] = str(int(start_time * 1000))
-
-        # Log request (skip health checks if configured)
-        should_log = True
-        if self.skip_health_logging and path in self.SKIP_LOGGING_PATHS:
-            should_log = False
-
-        if should_log:
-            # Check for slow requests
-            if duration_ms > self.slow_threshold_ms:
-                logger.warning(
-                    f"SLOW REQUEST: {method} {path} {status_code} - "
-                    f"{duration_ms:.2f}ms (threshold: {self.slow_threshold_ms}ms)"
-                )
-            else:
-                # Log all requests at INFO level for debugging/monitoring
-                logger.info(f"{method} {path} {status_code} - {duration_ms:.2f}ms")
-
-        return response
+# Paths to skip logging (high-frequency health checks)
+SKIP_LOGGING_PATHS = ["/api/health", "/api/ready", "/health"]
 
 
 class ResponseTimeCollector:
@@ -293,54 +196,35 @@ class ResponseTimeCollector:
 response_time_collector = ResponseTimeCollector()
 
 
-class TimingMiddlewareWithCollector(BaseHTTPMiddleware):
+def record_response_time(
+    method: str,
+    path: str,
+    status_code: int,
+    duration_ms: float,
+    slow_threshold_ms: int = 1000,
+    skip_health_logging: bool = True,
+) -> None:
     """
-    Enhanced timing middleware that also records metrics to collector.
+    Record a finished request to the collector and log it.
 
-    Use this version if you want both logging and metrics collection.
-    """
+    Health checks are never recorded and, with ``skip_health_logging``, not
+    logged either.  Requests slower than ``slow_threshold_ms`` are logged as
+    warnings.
 
-    SKIP_LOGGING_PATHS = ["/api/health", "/api/ready", "/health"]
-
-    def __init__(
-        self, app, slow_threshold_ms: int = 1000, skip_health_logging: bool = True
-    ):
-        super().__init__(app)
-        self.slow_threshold_ms = slow_threshold_ms
-        self.skip_health_logging = skip_health_logging
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        start_time = time.perf_counter()
-        method = request.method
-        path = request.url.path
-
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
-        except Exception as e:
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            logger.error(
-                f"ERROR {method} {path} - {duration_ms:.2f}ms - Exception: {str(e)}"
+    Log Format:
+    - INFO: "{method} {path} {status} - {duration}ms"
+    - WARNING: "SLOW REQUEST: {method} {path} {status} - {duration}ms (threshold: {threshold}ms)"
+    """
+    # Record to collector (skip health checks)
+    if path not in SKIP_LOGGING_PATHS:
+        response_time_collector.record(method, path, status_code, duration_ms)
+
+    # Log slow requests
+    if path not in SKIP_LOGGING_PATHS or not skip_health_logging:
+        if duration_ms > slow_threshold_ms:
+            logger.warning(
+                f"SLOW REQUEST: {method} {path} {status_code} - "
+                f"{duration_ms:.2f}ms (threshold: {slow_threshold_ms}ms)"
             )
-            raise
-
-        duration_ms = (time.perf_counter() - start_time) * 1000
-
-        # Add response time header
-        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-        # Record to collector (skip health checks)
-        if path not in self.SKIP_LOGGING_PATHS:
-            response_time_collector.record(method, path, status_code, duration_ms)
-
-        # Log slow requests
-        if path not in self.SKIP_LOGGING_PATHS or not self.skip_health_logging:
-            if duration_ms > self.slow_threshold_ms:
-                logger.warning(
-                    f"SLOW REQUEST: {method} {path} {status_code} - "
-                    f"{duration_ms:.2f}ms (threshold: {self.slow_threshold_ms}ms)"
-                )
-            else:
-                logger.info(f"{method} {path} {status_code} - {duration_ms:.2f}ms")
-
-        return response
+        else:
+            logger.info(f"{method} {path} {status_code} - {duration_ms:.2f}ms")
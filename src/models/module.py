@@ -14,6 +14,7 @@ Security Notes:
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional
+from uuid import uuid4
 from pydantic import BaseModel, Field, validator, root_validator
 import re
 
@@ -41,6 +42,15 @@ class ModuleHealth(str, Enum):
     UNKNOWN = "unknown"  # Health check not configured or status unknown
 
 
+class ModuleJobStatus(str, Enum):
+    """Background module operation status"""
+
+    PENDING = "pending"  # Accepted, not started yet
+    RUNNING = "running"  # In progress (see step/progress)
+    SUCCEEDED = "succeeded"  # Finished successfully
+    FAILED = "failed"  # Finished with an error (see error)
+
+
 # =============================================================================
 # Request/Response Models
 # =============================================================================
@@ -348,6 +358,7 @@ class ModuleResponse(BaseModel):
     health: ModuleHealth
     container_id: Optional[str] = None
     container_name: Optional[str] = None
+    container_state: Optional[str] = None  # Last state seen by the event cache
     ports: List[str] = Field(default_factory=list)
     route_prefix: Optional[str] = None
     cpu_limit: str
@@ -543,6 +554,9 @@ class ModuleInstallResponse(BaseModel):
     message: str
     module_name: str
     status: ModuleStatus
+    job_id: Optional[str] = Field(
+        None, description="Install job to poll (GET /api/v1/modules/jobs/{job_id})"
+    )
 
     class Config:
         use_enum_values = True
@@ -551,6 +565,50 @@ class ModuleInstallResponse(BaseModel):
                 "message": "Module installation started successfully",
                 "module_name": "analytics-dashboard",
                 "status": "installing",
+                "job_id": "5f0c7a52-8c1e-4a8e-9d3b-2f6f0b1c9e21",
+            }
+        }
+
+
+class ModuleJob(BaseModel):
+    """
+    Background module operation (MongoDB: module_jobs collection)
+
+    Long operations (installs) run in the background; clients poll the job
+    (GET /api/v1/modules/jobs/{job_id}) for its step and progress.
+    """
+
+    job_id: str = Field(default_factory=lambda: str(uuid4()))
+    operation: str = Field(..., description="Operation type", example="install")
+    module_name: str
+    status: ModuleJobStatus = ModuleJobStatus.PENDING
+    step: Optional[str] = Field(
+        None, description="Current step", example="pulling_image"
+    )
+    progress: int = Field(0, ge=0, le=100, description="Completion percentage")
+    error: Optional[str] = None
+    result: Dict[str, Optional[str]] = Field(default_factory=dict)
+
+    # User context
+    requested_by_user_id: str
+    requested_by_email: str
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
+        json_schema_extra = {
+            "example": {
+                "job_id": "5f0c7a52-8c1e-4a8e-9d3b-2f6f0b1c9e21",
+                "operation": "install",
+                "module_name": "analytics-dashboard",
+                "status": "running",
+                "step": "pulling_image",
+                "progress": 20,
+                "requested_by_email": "admin@a64platform.com",
             }
         }
 
@@ -18,6 +18,7 @@ from ...models.chat import (
     ErrorDetail,
 )
 from ...services.query_engine import get_query_engine, QueryExecutionError
+from ...services.query_governor import QueryConcurrencyError, QueryRejectedError
 from ...services.schema_service import get_schema_service
 from ...services.cost_tracking_service import get_cost_tracking_service
 from ...utils.validators import QueryValidationError
@@ -62,13 +63,16 @@ async def chat_query(
     This endpoint:
     1. Converts natural language to MongoDB query using Gemini AI
     2. Validates the query for security
-    3. Executes the query on MongoDB
+    3. Executes the query on MongoDB under the query governor (explain-based
+       cost checks, time and size budgets, secondary reads)
     4. Generates a human-readable report with insights
     5. Returns results, query, and report
 
     **Rate Limits:**
     - Free users: 10 queries per day
     - Admin users: Unlimited
+    - At most AI_QUERY_PER_USER_CONCURRENCY queries in flight per user (429)
+    - Pipelines too expensive to run are refused with 422 QUERY_TOO_EXPENSIVE
 
     **Example Request:**
     ```json
@@ -81,7 +85,7 @@ async def chat_query(
 
     **Cost:**
     - Typical query: $0.0002 - $0.0005 USD
-    - Cached results: $0 (free)
+    - Cached results: query generation only (same pipeline over unchanged data)
     """
     # Rate limiting: 10 queries/day for regular users, unlimited for admin/super_admin
     AI_DAILY_QUERY_LIMIT = 10
@@ -182,6 +186,33 @@ async def chat_query(
             },
         )
 
+    except QueryRejectedError as e:
+        logger.warning(f"Query rejected by governor: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "error": {
+                    "code": "QUERY_TOO_EXPENSIVE",
+                    "message": str(e),
+                    "details": {},
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            },
+        )
+
+    except QueryConcurrencyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "error": {
+                    "code": "AI_QUERY_CONCURRENCY_EXCEEDED",
+                    "message": str(e),
+                    "details": {},
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            },
+        )
+
     except QueryExecutionError as e:
         logger.error(f"Query execution error: {e}")
         raise HTTPException(
@@ -111,9 +111,22 @@ class MetadataInfo(BaseModel):
 
     execution_time_seconds: float = Field(..., description="Total execution time")
     result_count: int = Field(..., description="Number of results returned")
+    truncated: bool = Field(
+        False, description="Whether the results cover only part of the data"
+    )
+    data_limitations: List[str] = Field(
+        default=[], description="Why the results are partial (scan window, caps)"
+    )
     cache_hit: bool = Field(..., description="Whether result was from cache")
+    results_cache_hit: bool = Field(
+        False, description="Whether the query results were reused from cache"
+    )
     cache_key: str = Field(..., description="Cache key for this query")
     cost: CostInfo = Field(..., description="Cost breakdown")
+    governor: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Query governor report: plan, rewrites, truncation, result bytes",
+    )
     timestamp: str = Field(..., description="Query timestamp (ISO format)")
 
 
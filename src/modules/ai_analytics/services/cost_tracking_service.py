@@ -9,6 +9,7 @@ import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from src.core.indexes import ensure_collection_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -42,12 +43,10 @@ class CostTrackingService:
         logger.info("CostTrackingService initialized")
 
     async def ensure_indexes(self):
-        """Create indexes for efficient cost queries."""
+        """Create any missing ai_query_log index (declared by the core DB manager)."""
         try:
-            await self.collection.create_index("user_id")
-            await self.collection.create_index([("timestamp", -1)])
-            await self.collection.create_index([("user_id", 1), ("timestamp", -1)])
-            logger.info("ai_query_log indexes created")
+            await ensure_collection_indexes(self.db, "ai_query_log")
+            logger.info("ai_query_log indexes ensured")
         except Exception as e:
             logger.error(f"Failed to create ai_query_log indexes: {e}")
 
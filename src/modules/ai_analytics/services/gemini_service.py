@@ -169,6 +169,7 @@ class GeminiService:
         query_results: List[Dict[str, Any]],
         user_prompt: str,
         query_explanation: str,
+        data_limitations: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Generate human-readable report from query results.
@@ -177,6 +178,8 @@ class GeminiService:
             query_results: Results from MongoDB query
             user_prompt: Original user prompt
             query_explanation: Explanation of the query
+            data_limitations: Why the results are partial (query governor),
+                if they are; the report must say so
 
         Returns:
             Dict containing:
@@ -187,7 +190,7 @@ class GeminiService:
         """
         # Build report prompt
         prompt = self._build_report_prompt(
-            query_results, user_prompt, query_explanation
+            query_results, user_prompt, query_explanation, data_limitations
         )
 
         max_retries = 3
@@ -304,6 +307,7 @@ RULES:
         query_results: List[Dict[str, Any]],
         user_prompt: str,
         query_explanation: str,
+        data_limitations: Optional[List[str]] = None,
     ) -> str:
         """
         Build prompt for report generation.
@@ -312,6 +316,7 @@ RULES:
             query_results: Query results
             user_prompt: Original user prompt
             query_explanation: Query explanation
+            data_limitations: Reasons the results are partial, if any
 
         Returns:
             Report prompt string
@@ -320,6 +325,15 @@ RULES:
         results_summary = (
             query_results[:10] if len(query_results) > 10 else query_results
         )
+        limitations = ""
+        if data_limitations:
+            notes = "\n".join(f"- {note}" for note in data_limitations)
+            limitations = f"""
+DATA LIMITATIONS (the results are INCOMPLETE):
+{notes}
+State this in the summary and the markdown. Do not present totals, counts or
+averages as covering all data.
+"""
 
         return f"""Generate a comprehensive report based on the following data analysis.
 
@@ -329,7 +343,7 @@ QUERY PERFORMED: {query_explanation}
 
 DATA RESULTS ({len(query_results)} records):
 {results_summary}
-
+{limitations}
 RESPONSE FORMAT (JSON):
 {{
     "summary": "2-3 sentence high-level summary of findings",
@@ -2,18 +2,18 @@
 Query Engine
 
 Complete pipeline from natural language prompt to MongoDB results.
-Integrates: GeminiService + SchemaService + QueryValidator + MongoDB execution.
+Integrates: GeminiService + SchemaService + QueryValidator + QueryGovernor.
 """
 
+import hashlib
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import hashlib
-import json
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from ..utils.validators import QueryValidator, QueryValidationError
 from .gemini_service import get_gemini_service
+from .query_governor import GovernedResult, QueryGovernor, QueryGovernorError
 from .schema_service import get_schema_service
 
 logger = logging.getLogger(__name__)
@@ -33,13 +33,18 @@ class QueryEngine:
     1. Get database schema (SchemaService)
     2. Generate MongoDB query from natural language (GeminiService)
     3. Validate query for security (QueryValidator)
-    4. Execute query on MongoDB
-    5. Generate human-readable report (GeminiService)
+    4. Execute query on MongoDB under the QueryGovernor
+    5. Generate human-readable report (GeminiService), told when the
+       governor returned partial data
     6. Cache results for performance
 
     Features:
     - End-to-end query pipeline
-    - Result caching (30-minute TTL)
+    - Explain-based cost checks, time/size budgets, secondary reads
+    - Result caching keyed on normalized pipeline + data version, shared
+      across users; the generated report is cached per user and prompt
+      (30-minute TTL)
+    - Per-user concurrency limit
     - Error handling and retry logic
     - Performance tracking
     - Cost tracking
@@ -68,9 +73,12 @@ class QueryEngine:
         self.gemini_service = get_gemini_service()
         self.schema_service = get_schema_service(mongodb_client, db_name)
         self.query_validator = QueryValidator()
+        self.governor = QueryGovernor(self.db)
 
-        # Result cache: {cache_key: {result, timestamp, cost}}
+        # Raw governed results: {governor cache_key: {result, timestamp}}
         self._result_cache: Dict[str, Dict[str, Any]] = {}
+        # Full responses: {response key: {result, timestamp}}
+        self._response_cache: Dict[str, Dict[str, Any]] = {}
 
         logger.info(f"QueryEngine initialized for database: {db_name}")
 
@@ -87,7 +95,8 @@ class QueryEngine:
 
         Args:
             user_prompt: User's natural language query
-            user_id: User ID (for caching and tracking)
+            user_id: User ID (for the per-user concurrency limit and the
+                report cache)
             user_role: User's role (for permissions)
             conversation_history: Previous conversation messages
             force_refresh: Skip cache and force fresh query
@@ -98,154 +107,222 @@ class QueryEngine:
                 - results: Query execution results
                 - explanation: Human-readable explanation
                 - report: AI-generated report with insights
-                - metadata: Execution time, cost, cache status
+                - metadata: Execution time, cost, cache status, governor,
+                  and ``truncated`` / ``data_limitations`` when the governor
+                  returned partial data
+
+        Raises:
+            QueryConcurrencyError: If the user already has the maximum number
+                of queries running
+            QueryRejectedError: If the governor refuses the pipeline
+            QueryExecutionError: For every other failure
         """
         start_time = datetime.utcnow()
 
         try:
-            # Check cache first (unless force refresh)
-            if not force_refresh:
-                cached_result = self._get_cached_result(user_prompt, user_id)
-                if cached_result:
-                    logger.info(f"Cache hit for user {user_id}")
-                    cached_result["metadata"]["cache_hit"] = True
-                    return cached_result
-
-            # Step 1: Get database schema
-            logger.info(f"Getting schema for query: {user_prompt[:50]}...")
-            schema = await self.schema_service.get_schema_as_json()
-
-            # Update validator with valid collections
-            schema_dict = await self.schema_service.get_schema()
-            valid_collections = set(schema_dict.get("collections", {}).keys())
-            self.query_validator.set_valid_collections(valid_collections)
-
-            # Step 2: Generate MongoDB query from natural language
-            logger.info("Generating MongoDB query with Gemini...")
-            query_generation = await self.gemini_service.generate_mongodb_query(
-                user_prompt=user_prompt,
-                schema=schema,
-                conversation_history=conversation_history,
-            )
-
-            collection = query_generation.get("collection")
-            query = query_generation.get("query")
-            explanation = query_generation.get("explanation")
-            query_cost = query_generation.get("estimated_cost", {})
-
-            # Step 3: Validate query for security
-            logger.info(f"Validating query for collection: {collection}...")
-            try:
-                self.query_validator.validate_query(
-                    collection=collection, query=query, user_role=user_role
+            async with self.governor.user_slot(user_id):
+                return await self._run_ai_query(
+                    user_prompt,
+                    user_id,
+                    user_role,
+                    conversation_history,
+                    force_refresh,
+                    start_time,
                 )
-            except QueryValidationError as e:
-                logger.error(f"Query validation failed: {e}")
-                raise QueryExecutionError(f"Query validation failed: {str(e)}")
 
-            # Step 4: Execute query on MongoDB
-            logger.info(f"Executing query on collection: {collection}...")
-            results = await self._execute_mongodb_query(collection, query)
-
-            # Step 5: Generate report with insights
-            logger.info("Generating report with Gemini...")
-            report = await self.gemini_service.generate_report(
-                query_results=results,
-                user_prompt=user_prompt,
-                query_explanation=explanation,
-            )
-            report_cost = report.get("estimated_cost", {})
+        except QueryGovernorError:
+            raise
 
-            # Calculate total execution time
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
+        except QueryValidationError as e:
+            logger.error(f"Validation error: {e}")
+            raise QueryExecutionError(f"Query validation failed: {str(e)}")
 
-            # Build response
-            response = {
-                "query": {
-                    "collection": collection,
-                    "pipeline": query,
-                    "explanation": explanation,
-                },
-                "results": results,
-                "report": {
-                    "summary": report.get("summary"),
-                    "insights": report.get("insights", []),
-                    "statistics": report.get("statistics", {}),
-                    "visualization_suggestions": report.get(
-                        "visualization_suggestions", []
-                    ),
-                    "markdown": report.get("markdown"),
-                },
-                "metadata": {
-                    "execution_time_seconds": round(execution_time, 2),
-                    "result_count": len(results),
-                    "cache_hit": False,
-                    "cache_key": self._generate_cache_key(user_prompt, user_id),
-                    "cost": {
-                        "query_generation": query_cost,
-                        "report_generation": report_cost,
-                        "total_cost_usd": round(
-                            query_cost.get("total_cost_usd", 0)
-                            + report_cost.get("total_cost_usd", 0),
-                            6,
-                        ),
-                    },
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-            }
+        except QueryExecutionError:
+            raise
 
-            # Cache the result
-            self._cache_result(user_prompt, user_id, response)
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}", exc_info=True)
+            raise QueryExecutionError(f"Failed to execute query: {str(e)}")
 
-            logger.info(
-                f"Query executed successfully: {len(results)} results in {execution_time:.2f}s, "
-                f"cost: ${response['metadata']['cost']['total_cost_usd']:.6f}"
-            )
+    async def _run_ai_query(
+        self,
+        user_prompt: str,
+        user_id: str,
+        user_role: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        force_refresh: bool,
+        start_time: datetime,
+    ) -> Dict[str, Any]:
+        """Steps 1-6 of execute_ai_query, run inside the user's query slot."""
+        # Step 1: Get database schema
+        logger.info(f"Getting schema for query: {user_prompt[:50]}...")
+        schema = await self.schema_service.get_schema_as_json()
+
+        # Update validator with valid collections
+        schema_dict = await self.schema_service.get_schema()
+        valid_collections = set(schema_dict.get("collections", {}).keys())
+        self.query_validator.set_valid_collections(valid_collections)
+
+        # Step 2: Generate MongoDB query from natural language
+        logger.info("Generating MongoDB query with Gemini...")
+        query_generation = await self.gemini_service.generate_mongodb_query(
+            user_prompt=user_prompt,
+            schema=schema,
+            conversation_history=conversation_history,
+        )
 
-            return response
+        collection = query_generation.get("collection")
+        query = query_generation.get("query")
+        explanation = query_generation.get("explanation")
+        query_cost = query_generation.get("estimated_cost", {})
 
+        # Step 3: Validate query for security
+        logger.info(f"Validating query for collection: {collection}...")
+        try:
+            self.query_validator.validate_query(
+                collection=collection, query=query, user_role=user_role
+            )
         except QueryValidationError as e:
-            logger.error(f"Validation error: {e}")
+            logger.error(f"Query validation failed: {e}")
             raise QueryExecutionError(f"Query validation failed: {str(e)}")
 
-        except Exception as e:
-            logger.error(f"Query execution failed: {e}", exc_info=True)
-            raise QueryExecutionError(f"Failed to execute query: {str(e)}")
+        # Same pipeline over unchanged data -> same results, whoever asked
+        # and however the question was phrased. The report is written for
+        # one user's question, so a whole response is only reused when the
+        # same user asks the same thing again.
+        cache_key = await self.governor.cache_key(collection, query)
+        response_key = self._response_key(cache_key, user_id, user_prompt)
+        if not force_refresh:
+            cached_result = self._get_cached_result(self._response_cache, response_key)
+            if cached_result:
+                cached_result = dict(cached_result)
+                cached_result["metadata"] = dict(cached_result["metadata"])
+                metadata = cached_result["metadata"]
+                metadata["cache_hit"] = True
+                metadata["execution_time_seconds"] = round(
+                    (datetime.utcnow() - start_time).total_seconds(), 2
+                )
+                metadata["cost"] = {
+                    "query_generation": query_cost,
+                    "report_generation": {},
+                    "total_cost_usd": round(query_cost.get("total_cost_usd", 0), 6),
+                }
+                return cached_result
+
+        # Step 4: Execute query on MongoDB (or reuse another caller's results)
+        governed = None
+        if not force_refresh:
+            governed = self._get_cached_result(self._result_cache, cache_key)
+        results_cache_hit = governed is not None
+        if not results_cache_hit:
+            logger.info(f"Executing query on collection: {collection}...")
+            governed = await self._execute_mongodb_query(collection, query, user_role)
+            self._cache_result(self._result_cache, cache_key, governed)
+        results = governed.results
+
+        # Step 5: Generate report with insights
+        logger.info("Generating report with Gemini...")
+        report = await self.gemini_service.generate_report(
+            query_results=results,
+            user_prompt=user_prompt,
+            query_explanation=explanation,
+            data_limitations=governed.limitations,
+        )
+        report_cost = report.get("estimated_cost", {})
+
+        # Calculate total execution time
+        execution_time = (datetime.utcnow() - start_time).total_seconds()
+
+        # Build response
+        response = {
+            "query": {
+                "collection": collection,
+                "pipeline": governed.pipeline,
+                "explanation": explanation,
+            },
+            "results": results,
+            "report": {
+                "summary": report.get("summary"),
+                "insights": report.get("insights", []),
+                "statistics": report.get("statistics", {}),
+                "visualization_suggestions": report.get(
+                    "visualization_suggestions", []
+                ),
+                "markdown": report.get("markdown"),
+            },
+            "metadata": {
+                "execution_time_seconds": round(execution_time, 2),
+                "result_count": len(results),
+                "truncated": governed.truncated,
+                "data_limitations": governed.limitations,
+                "cache_hit": False,
+                "results_cache_hit": results_cache_hit,
+                "cache_key": response_key,
+                "cost": {
+                    "query_generation": query_cost,
+                    "report_generation": report_cost,
+                    "total_cost_usd": round(
+                        query_cost.get("total_cost_usd", 0)
+                        + report_cost.get("total_cost_usd", 0),
+                        6,
+                    ),
+                },
+                "governor": governed.summary(),
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+        }
+
+        # Step 6: Cache the response for this user and prompt
+        self._cache_result(self._response_cache, response_key, response)
+
+        logger.info(
+            f"Query executed successfully: {len(results)} results in {execution_time:.2f}s, "
+            f"cost: ${response['metadata']['cost']['total_cost_usd']:.6f}"
+        )
+
+        return response
 
     async def _execute_mongodb_query(
-        self, collection_name: str, pipeline: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        self,
+        collection_name: str,
+        pipeline: List[Dict[str, Any]],
+        user_role: str = "user",
+    ) -> GovernedResult:
         """
-        Execute MongoDB aggregation pipeline.
+        Execute MongoDB aggregation pipeline through the query governor.
 
         Args:
             collection_name: Collection to query
             pipeline: Aggregation pipeline
+            user_role: User's role (selects the allowDiskUse policy)
 
         Returns:
-            List of result documents
+            GovernedResult with serialized result documents
 
         Raises:
+            QueryRejectedError: If the governor refuses the pipeline
             QueryExecutionError: If execution fails
         """
         try:
-            collection = self.db[collection_name]
-
-            # Execute aggregation
-            cursor = collection.aggregate(pipeline)
-            results = await cursor.to_list(length=None)
-
-            # Convert ObjectId to string for JSON serialization
-            results = self._serialize_results(results)
-
-            logger.info(f"Query returned {len(results)} documents")
-
-            return results
-
+            governed = await self.governor.execute(
+                collection_name, pipeline, user_role=user_role
+            )
+        except QueryGovernorError:
+            raise
         except Exception as e:
             logger.error(f"MongoDB query execution failed: {e}")
             raise QueryExecutionError(f"Database query failed: {str(e)}")
 
+        # Convert ObjectId to string for JSON serialization
+        governed.results = self._serialize_results(governed.results)
+
+        logger.info(
+            f"Query returned {len(governed.results)} documents "
+            f"({governed.result_bytes} bytes, truncated={governed.truncated})"
+        )
+
+        return governed
+
     def _serialize_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Serialize MongoDB results for JSON response.
@@ -275,66 +352,63 @@ class QueryEngine:
 
         return [serialize_value(doc) for doc in results]
 
-    def _generate_cache_key(self, user_prompt: str, user_id: str) -> str:
+    @staticmethod
+    def _response_key(cache_key: str, user_id: str, user_prompt: str) -> str:
         """
-        Generate cache key for query.
+        Cache key for a full response: the governor key plus who asked what.
 
         Args:
-            user_prompt: User's prompt
-            user_id: User ID
+            cache_key: Governor cache key (normalized pipeline + data version)
+            user_id: Requesting user
+            user_prompt: The question the report answers
 
         Returns:
-            Cache key (hash)
+            SHA-256 hex digest
         """
-        # Include user_id to separate cache by user
-        cache_input = f"{user_id}:{user_prompt}".encode("utf-8")
-        return hashlib.sha256(cache_input).hexdigest()
+        raw = "\x00".join((cache_key, user_id or "", user_prompt.strip()))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
     def _get_cached_result(
-        self, user_prompt: str, user_id: str
-    ) -> Optional[Dict[str, Any]]:
+        self, cache: Dict[str, Dict[str, Any]], cache_key: str
+    ) -> Optional[Any]:
         """
-        Get cached result if available and not expired.
+        Get cached entry if available and not expired.
 
         Args:
-            user_prompt: User's prompt
-            user_id: User ID
+            cache: ``_result_cache`` (governed results) or ``_response_cache``
+            cache_key: Key within that cache
 
         Returns:
-            Cached result or None
+            The cached value or None
         """
-        cache_key = self._generate_cache_key(user_prompt, user_id)
-
-        if cache_key not in self._result_cache:
+        if cache_key not in cache:
             return None
 
-        cached_entry = self._result_cache[cache_key]
+        cached_entry = cache[cache_key]
         cached_time = cached_entry.get("timestamp")
 
         # Check if cache is still valid
         if datetime.utcnow() - cached_time > self.cache_ttl:
             # Expired, remove from cache
-            del self._result_cache[cache_key]
+            del cache[cache_key]
             logger.info(f"Cache expired for key: {cache_key[:16]}...")
             return None
 
         logger.info(f"Cache hit for key: {cache_key[:16]}...")
-        return cached_entry.get("result")
+        return cached_entry["result"]
 
     def _cache_result(
-        self, user_prompt: str, user_id: str, result: Dict[str, Any]
+        self, cache: Dict[str, Dict[str, Any]], cache_key: str, result: Any
     ) -> None:
         """
-        Cache query result.
+        Cache a governed result or a full response.
 
         Args:
-            user_prompt: User's prompt
-            user_id: User ID
-            result: Result to cache
+            cache: ``_result_cache`` (governed results) or ``_response_cache``
+            cache_key: Key within that cache
+            result: Value to cache
         """
-        cache_key = self._generate_cache_key(user_prompt, user_id)
-
-        self._result_cache[cache_key] = {
+        cache[cache_key] = {
             "result": result,
             "timestamp": datetime.utcnow(),
         }
@@ -342,9 +416,10 @@ class QueryEngine:
         logger.info(f"Result cached with key: {cache_key[:16]}...")
 
     def clear_cache(self) -> None:
-        """Clear all cached results"""
-        cache_size = len(self._result_cache)
+        """Clear all cached results and responses"""
+        cache_size = len(self._result_cache) + len(self._response_cache)
         self._result_cache.clear()
+        self._response_cache.clear()
         logger.info(f"Cleared {cache_size} cached results")
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -352,19 +427,22 @@ class QueryEngine:
         Get cache statistics.
 
         Returns:
-            Dict with cache stats
+            Dict with cache stats (entry counts cover both caches)
         """
         now = datetime.utcnow()
+        entries = list(self._result_cache.values()) + list(
+            self._response_cache.values()
+        )
         valid_entries = sum(
-            1
-            for entry in self._result_cache.values()
-            if now - entry["timestamp"] <= self.cache_ttl
+            1 for entry in entries if now - entry["timestamp"] <= self.cache_ttl
         )
 
         return {
-            "total_entries": len(self._result_cache),
+            "total_entries": len(entries),
             "valid_entries": valid_entries,
-            "expired_entries": len(self._result_cache) - valid_entries,
+            "expired_entries": len(entries) - valid_entries,
+            "result_entries": len(self._result_cache),
+            "response_entries": len(self._response_cache),
             "cache_ttl_minutes": self.cache_ttl.total_seconds() / 60,
         }
 
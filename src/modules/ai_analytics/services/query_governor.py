@@ -0,0 +1,425 @@
+"""
+Query Governor
+
+Cost controls for LLM-generated aggregation pipelines.  QueryValidator keeps
+dangerous operators out; the governor keeps *expensive* pipelines from hurting
+the cluster:
+
+- Plans every pipeline with ``explain`` first.  Collection scans on large
+  collections are rewritten to a bounded window of the most recent documents
+  (or rejected when they cannot be), and ``$lookup`` joins on unindexed
+  foreign fields of large collections are rejected outright.
+- Never hides what it cut: a scan window, a row cap that was reached or a
+  byte budget that ran out marks the result ``truncated`` and lists the
+  limitation, so the report and the response can say the data is partial.
+- Caps the result set with a trailing ``$limit``, runs with ``maxTimeMS`` and
+  a per-role ``allowDiskUse`` policy, and reads from a secondary by default.
+- Streams results in cursor batches and stops at a byte budget instead of
+  materialising the whole result with ``to_list(length=None)``.
+- Builds result-cache keys from the normalized pipeline plus a cheap data
+  version of every collection it reads.
+- Limits how many AI queries a single user can have in flight.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import bson
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReadPreference
+from pymongo.errors import ExecutionTimeout, OperationFailure
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+# Stages MongoDB requires to be first in the pipeline; a scan window cannot be
+# prepended to them.
+FIRST_STAGE_ONLY = {"$geoNear", "$search", "$searchMeta", "$collStats", "$indexStats"}
+
+# How long collection sizes and index lists are trusted before re-reading.
+METADATA_TTL_SECONDS = 300
+
+
+class QueryGovernorError(Exception):
+    """Base class for governor refusals"""
+
+    pass
+
+
+class QueryRejectedError(QueryGovernorError):
+    """Raised when a pipeline is too expensive to run"""
+
+    pass
+
+
+class QueryConcurrencyError(QueryGovernorError):
+    """Raised when a user already has the maximum number of queries running"""
+
+    pass
+
+
+@dataclass
+class GovernorPolicy:
+    """Limits applied to every governed pipeline."""
+
+    max_time_ms: int = 5000
+    max_results: int = 1000
+    max_result_bytes: int = 4 * 1024 * 1024
+    batch_size: int = 200
+    large_collection_docs: int = 50_000
+    scan_window: int = 50_000
+    rewrite_collection_scans: bool = True
+    allow_disk_use_roles: Tuple[str, ...] = ("admin", "super_admin")
+    read_preference: str = "secondaryPreferred"
+    per_user_concurrency: int = 2
+
+    @classmethod
+    def from_settings(cls) -> "GovernorPolicy":
+        return cls(
+            max_time_ms=settings.AI_QUERY_MAX_TIME_MS,
+            max_results=settings.AI_QUERY_MAX_RESULTS,
+            max_result_bytes=settings.AI_QUERY_MAX_RESULT_BYTES,
+            large_collection_docs=settings.AI_QUERY_LARGE_COLLECTION_DOCS,
+            scan_window=settings.AI_QUERY_SCAN_WINDOW,
+            read_preference=settings.AI_QUERY_READ_PREFERENCE,
+            per_user_concurrency=settings.AI_QUERY_PER_USER_CONCURRENCY,
+        )
+
+
+@dataclass
+class GovernedResult:
+    """Outcome of a governed pipeline run."""
+
+    pipeline: List[Dict[str, Any]]
+    results: List[Dict[str, Any]]
+    truncated: bool = False
+    result_bytes: int = 0
+    rewrites: List[str] = field(default_factory=list)
+    plan: Dict[str, Any] = field(default_factory=dict)
+    limitations: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "truncated": self.truncated,
+            "limitations": self.limitations,
+            "result_bytes": self.result_bytes,
+            "rewrites": self.rewrites,
+            "plan": self.plan,
+        }
+
+
+def normalize_pipeline(collection: str, pipeline: List[Dict[str, Any]]) -> str:
+    """
+    Canonical text form of a pipeline.
+
+    Key order inside stages does not change what a pipeline returns, so two
+    generations that only differ in key order share one cache entry.
+    """
+    return json.dumps(
+        {"collection": collection, "pipeline": pipeline},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def lookup_collections(pipeline: List[Dict[str, Any]]) -> List[str]:
+    """Collections joined in via ``$lookup``."""
+    return [
+        stage["$lookup"]["from"]
+        for stage in pipeline
+        if isinstance(stage.get("$lookup"), dict) and "from" in stage["$lookup"]
+    ]
+
+
+def winning_plan_stages(explain: Any, in_winning: bool = False) -> List[str]:
+    """
+    Every plan stage name inside the winning plan(s) of an explain document.
+
+    Handles both the classic (``stages[0].$cursor.queryPlanner``) and the
+    slot-based (``queryPlanner.winningPlan.queryPlan``) explain layouts;
+    rejected plans are ignored.
+    """
+    stages: List[str] = []
+    if isinstance(explain, dict):
+        if in_winning and isinstance(explain.get("stage"), str):
+            stages.append(explain["stage"])
+        for key, value in explain.items():
+            if key == "rejectedPlans":
+                continue
+            stages.extend(
+                winning_plan_stages(value, in_winning or key == "winningPlan")
+            )
+    elif isinstance(explain, list):
+        for item in explain:
+            stages.extend(winning_plan_stages(item, in_winning))
+    return stages
+
+
+class QueryGovernor:
+    """
+    Plans, bounds and runs AI-generated aggregation pipelines.
+
+    One instance per QueryEngine; holds the short-lived collection metadata
+    cache and the per-user in-flight counters.
+    """
+
+    def __init__(
+        self, db: AsyncIOMotorDatabase, policy: Optional[GovernorPolicy] = None
+    ):
+        self.db = db
+        self.policy = policy or GovernorPolicy.from_settings()
+        self._in_flight: Dict[str, int] = {}
+        self._doc_counts: Dict[str, Tuple[float, int]] = {}
+        self._index_keys: Dict[str, Tuple[float, List[str]]] = {}
+
+    # ------------------------------------------------------------------
+    # Concurrency
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def user_slot(self, user_id: str):
+        """Hold one of the user's concurrent-query slots for the block."""
+        running = self._in_flight.get(user_id, 0)
+        if running >= self.policy.per_user_concurrency:
+            raise QueryConcurrencyError(
+                f"You already have {running} AI queries running "
+                f"(max {self.policy.per_user_concurrency}); wait for one to finish"
+            )
+        self._in_flight[user_id] = running + 1
+        try:
+            yield
+        finally:
+            remaining = self._in_flight.get(user_id, 1) - 1
+            if remaining > 0:
+                self._in_flight[user_id] = remaining
+            else:
+                self._in_flight.pop(user_id, None)
+
+    # ------------------------------------------------------------------
+    # Collection metadata
+    # ------------------------------------------------------------------
+
+    async def _doc_count(self, collection: str) -> int:
+        cached = self._doc_counts.get(collection)
+        if cached and time.monotonic() - cached[0] < METADATA_TTL_SECONDS:
+            return cached[1]
+        count = await self.db[collection].estimated_document_count()
+        self._doc_counts[collection] = (time.monotonic(), count)
+        return count
+
+    async def _leading_index_fields(self, collection: str) -> List[str]:
+        cached = self._index_keys.get(collection)
+        if cached and time.monotonic() - cached[0] < METADATA_TTL_SECONDS:
+            return cached[1]
+        info = await self.db[collection].index_information()
+        fields = [spec["key"][0][0] for spec in info.values() if spec.get("key")]
+        self._index_keys[collection] = (time.monotonic(), fields)
+        return fields
+
+    async def data_version(
+        self, collection: str, pipeline: List[Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """
+        Cheap change marker for every collection the pipeline reads.
+
+        Document count plus newest ``_id`` catches inserts and deletes with
+        two metadata/index-only reads; in-place updates are bounded by the
+        caller's cache TTL.
+        """
+        version = {}
+        for name in sorted({collection, *lookup_collections(pipeline)}):
+            count = await self.db[name].estimated_document_count()
+            newest = await self.db[name].find_one({}, {"_id": 1}, sort=[("_id", -1)])
+            version[name] = f"{count}:{newest['_id'] if newest else ''}"
+        return version
+
+    async def cache_key(self, collection: str, pipeline: List[Dict[str, Any]]) -> str:
+        """Result-cache key: normalized pipeline + data version."""
+        version = await self.data_version(collection, pipeline)
+        material = normalize_pipeline(collection, pipeline) + json.dumps(
+            version, sort_keys=True
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    async def _explain(
+        self, collection: str, pipeline: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.db.command(
+                "explain",
+                {"aggregate": collection, "pipeline": pipeline, "cursor": {}},
+                verbosity="queryPlanner",
+                maxTimeMS=self.policy.max_time_ms,
+            )
+        except OperationFailure as e:
+            # maxTimeMS and the result caps still bound the run.
+            logger.warning(f"Explain failed for {collection}, running unplanned: {e}")
+            return None
+
+    async def plan(
+        self, collection: str, pipeline: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, Any]]:
+        """
+        Inspect and bound a pipeline.
+
+        Returns:
+            (pipeline to run, human-readable rewrites, plan summary)
+
+        Raises:
+            QueryRejectedError: If the pipeline is too expensive to run
+        """
+        pipeline = list(pipeline)
+        rewrites: List[str] = []
+        scan_window: Optional[int] = None
+        result_cap: Optional[int] = None
+
+        for stage in pipeline:
+            lookup = stage.get("$lookup")
+            if not isinstance(lookup, dict) or "foreignField" not in lookup:
+                continue
+            foreign, field_name = lookup["from"], lookup["foreignField"]
+            if field_name == "_id":
+                continue
+            if field_name in await self._leading_index_fields(foreign):
+                continue
+            if await self._doc_count(foreign) > self.policy.large_collection_docs:
+                raise QueryRejectedError(
+                    f"$lookup into '{foreign}' joins on unindexed field "
+                    f"'{field_name}'; narrow the question or join on an indexed field"
+                )
+
+        doc_count = await self._doc_count(collection)
+        explain = await self._explain(collection, pipeline)
+        stages = winning_plan_stages(explain) if explain else []
+        collection_scan = "COLLSCAN" in stages
+
+        if collection_scan and doc_count > self.policy.large_collection_docs:
+            first = next(iter(pipeline[0]), None) if pipeline else None
+            if not self.policy.rewrite_collection_scans or first in FIRST_STAGE_ONLY:
+                raise QueryRejectedError(
+                    f"Query would scan all {doc_count:,} documents in "
+                    f"'{collection}'; add a filter on an indexed field"
+                )
+            scan_window = self.policy.scan_window
+            pipeline[:0] = [
+                {"$sort": {"_id": -1}},
+                {"$limit": scan_window},
+            ]
+            rewrites.append(
+                f"Collection scan limited to the {self.policy.scan_window:,} "
+                f"most recent documents of {doc_count:,}"
+            )
+
+        last = pipeline[-1] if pipeline else {}
+        if not (
+            isinstance(last.get("$limit"), int)
+            and last["$limit"] <= self.policy.max_results
+        ):
+            result_cap = self.policy.max_results
+            pipeline.append({"$limit": result_cap})
+            rewrites.append(f"Results capped at {self.policy.max_results}")
+
+        summary = {
+            "collection_docs": doc_count,
+            "stages": sorted(set(stages)),
+            "collection_scan": collection_scan,
+            "explained": explain is not None,
+            "scan_window": scan_window,
+            "result_cap": result_cap,
+        }
+        return pipeline, rewrites, summary
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def execute(
+        self, collection: str, pipeline: List[Dict[str, Any]], user_role: str = "user"
+    ) -> GovernedResult:
+        """
+        Plan and run a pipeline under the policy's time, size and read limits.
+
+        Raises:
+            QueryRejectedError: If planning rejects the pipeline or it runs
+                past ``max_time_ms``
+        """
+        governed, rewrites, plan = await self.plan(collection, pipeline)
+
+        read_preference = READ_PREFERENCES.get(
+            self.policy.read_preference, ReadPreference.SECONDARY_PREFERRED
+        )
+        target = self.db[collection].with_options(read_preference=read_preference)
+        cursor = target.aggregate(
+            governed,
+            maxTimeMS=self.policy.max_time_ms,
+            allowDiskUse=user_role in self.policy.allow_disk_use_roles,
+            batchSize=self.policy.batch_size,
+        )
+
+        results: List[Dict[str, Any]] = []
+        total_bytes = 0
+        truncated = False
+        try:
+            async for doc in cursor:
+                size = len(bson.encode(doc))
+                if total_bytes + size > self.policy.max_result_bytes:
+                    truncated = True
+                    break
+                results.append(doc)
+                total_bytes += size
+        except ExecutionTimeout:
+            raise QueryRejectedError(
+                f"Query exceeded its {self.policy.max_time_ms} ms time budget; "
+                "narrow the question"
+            )
+        finally:
+            await cursor.close()
+
+        limitations: List[str] = []
+        if plan["scan_window"]:
+            limitations.append(
+                f"Only the {plan['scan_window']:,} most recent of "
+                f"{plan['collection_docs']:,} documents in '{collection}' were "
+                "read; totals, counts and averages cover that window only"
+            )
+        if plan["result_cap"] and len(results) >= plan["result_cap"]:
+            limitations.append(
+                f"Results stopped at the {plan['result_cap']:,}-row cap; "
+                "further rows were not returned"
+            )
+        if truncated:
+            rewrites.append(
+                f"Results truncated at {self.policy.max_result_bytes:,} bytes"
+            )
+            limitations.append(
+                f"Results stopped at the {self.policy.max_result_bytes:,}-byte "
+                "budget; further rows were not returned"
+            )
+        return GovernedResult(
+            pipeline=governed,
+            results=results,
+            truncated=bool(limitations),
+            limitations=limitations,
+            result_bytes=total_bytes,
+            rewrites=rewrites,
+            plan=plan,
+        )
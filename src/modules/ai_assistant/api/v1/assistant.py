@@ -83,6 +83,7 @@ async def chat(
                 user_role=current_user.role,
                 conversation_id=request_body.conversation_id,
                 context=request_body.context,
+                organization_id=current_user.organizationId,
             ):
                 yield event
         except Exception as exc:
@@ -1,8 +1,9 @@
 """
 AI Assistant — Conversation and Message models.
 
-Stored in MongoDB collection `ai_assistant_conversations`.
-Each document holds the full message history for one conversation.
+Conversation headers are stored in MongoDB collection `ai_assistant_conversations`;
+the messages themselves live in fixed-size bucket documents in
+`ai_assistant_message_buckets` (see conversation_repository.py).
 A user may have at most HISTORY_LIMIT conversations; oldest is evicted on overflow.
 """
 
@@ -37,22 +38,28 @@ class Message(BaseModel):
 
 class Conversation(BaseModel):
     """
-    Full conversation document stored in MongoDB.
+    Conversation header plus (some of) its messages.
 
     Fields:
-        conversation_id: UUID string — primary identifier.
-        user_id:         Owner — enforced at all query points.
-        title:           First 80 chars of the opening user message.
-        messages:        Ordered list of user + assistant turns.
-        context:         ChatContext snapshot saved at creation time.
-        created_at:      Creation timestamp.
-        updated_at:      Last message timestamp (updated on each turn).
+        conversation_id:      UUID string — primary identifier.
+        user_id:              Owner — enforced at all query points.
+        title:                First 80 chars of the opening user message.
+        messages:             Ordered user + assistant turns loaded from the
+                              message buckets (the requested tail, or all of
+                              them). Never persisted on the header document.
+        message_count:        Total messages in the conversation.
+        last_message_preview: Start of the most recent message.
+        context:              ChatContext snapshot saved at creation time.
+        created_at:           Creation timestamp.
+        updated_at:           Last message timestamp (updated on each turn).
     """
 
     conversation_id: str
     user_id: str
     title: str = Field(default="New conversation", max_length=120)
     messages: List[Message] = Field(default_factory=list)
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
     context: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -70,5 +77,6 @@ class ConversationSummary(BaseModel):
     conversation_id: str
     title: str
     message_count: int
+    last_message_preview: Optional[str] = None
     created_at: datetime
     updated_at: datetime
@@ -4,7 +4,8 @@ AI Assistant — Claude Service (Phase A)
 Wraps the Anthropic Python SDK's AsyncAnthropic client to provide:
   - Streaming responses via async generator
   - Prompt caching on system prompt + tool definitions
-  - Bounded tool-use loop (max MAX_TOOL_TURNS per user message)
+  - Bounded tool-use loop (max MAX_TOOL_TURNS per user message); the tool
+    calls of one turn run concurrently through the shared AI tool runtime
   - SSE event emission for text chunks, tool events, and completion
   - Cost tracking via CostTracker
 
@@ -28,12 +29,13 @@ from typing import Any, AsyncGenerator, Dict, List, Optional
 import anthropic
 
 from src.config.settings import settings
+from src.core.ai_tools import ToolCall, ToolRuntime
 
 from ..models.chat_request import ChatContext
 from .context_composer import build_system_prompt
 from .conversation_repository import ConversationRepository, get_conversation_repository
 from .cost_tracker import CostTracker, get_cost_tracker
-from .tool_definitions import get_tool_definitions
+from .tool_definitions import TOOL_SPECS, get_tool_definitions
 from .tool_executor import execute_tool
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,8 @@ logger = logging.getLogger(__name__)
 # Maximum tool-use turns per user message to prevent runaway loops.
 MAX_TOOL_TURNS = 8
 
+_tool_runtime = ToolRuntime("ai_assistant", TOOL_SPECS)
+
 
 def _make_sse_event(data: Dict[str, Any]) -> str:
     """
@@ -110,6 +114,7 @@ class ClaudeAssistantService:
         user_role: str,
         conversation_id: Optional[str],
         context: ChatContext,
+        organization_id: Optional[str] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Stream a Claude response for a user message.
@@ -126,6 +131,7 @@ class ClaudeAssistantService:
             user_role:        User role string for QueryValidator permission checks.
             conversation_id:  Existing conversation to continue (None = new).
             context:          Farm/block scoping for context building.
+            organization_id:  Scope of the shared tool result cache.
 
         Yields:
             Newline-terminated JSON strings (SSE event bodies).
@@ -137,10 +143,15 @@ class ClaudeAssistantService:
         # 1. Build or resume conversation
         # ------------------------------------------------------------------
         history_limit: int = settings.AI_ASSISTANT_HISTORY_LIMIT
+        max_turns = settings.AI_ASSISTANT_MAX_TURNS * 2  # each turn = user + assistant
         conversation = None
 
         if conversation_id:
-            conversation = await self._repo.get(conversation_id, user_id)
+            # Only the tail that survives the MAX_TURNS cut below is loaded;
+            # the new user message takes the last slot.
+            conversation = await self._repo.get(
+                conversation_id, user_id, last_n=max_turns - 1
+            )
             if conversation is None:
                 # Conversation not found or belongs to another user — start fresh.
                 logger.warning(
@@ -184,7 +195,6 @@ class ClaudeAssistantService:
 
         # Enforce MAX_TURNS: keep only the last AI_ASSISTANT_MAX_TURNS turns.
         # Reason: Prevents unbounded memory growth and runaway token costs.
-        max_turns = settings.AI_ASSISTANT_MAX_TURNS * 2  # each turn = user + assistant
         if len(messages) > max_turns:
             messages = messages[-max_turns:]
 
@@ -271,48 +281,49 @@ class ClaudeAssistantService:
                 # Append Claude's response (including tool_use blocks) to messages
                 messages.append({"role": "assistant", "content": final.content})
 
-                # Execute each tool and collect results
-                tool_result_content = []
-                for tool_block in tool_use_blocks:
-                    tool_name = tool_block.name
-                    tool_input = tool_block.input
-                    tool_use_id = tool_block.id
+                calls = [
+                    ToolCall(name=block.name, input=block.input, id=block.id)
+                    for block in tool_use_blocks
+                ]
 
-                    # Emit tool_use event so frontend can show "checking…" indicator
+                # Emit tool_use events so frontend can show "checking…" indicators
+                for call in calls:
                     yield _make_sse_event(
-                        {"type": "tool_use", "name": tool_name, "input": tool_input}
+                        {"type": "tool_use", "name": call.name, "input": call.input}
                     )
 
-                    # Execute the tool
-                    total_tool_calls += 1
-                    try:
-                        result = await execute_tool(
-                            tool_name=tool_name,
-                            tool_input=tool_input,
-                            user_id=user_id,
-                            user_role=user_role,
-                            conversation_history=messages,
-                        )
-                    except Exception as exc:
-                        logger.error(
-                            "Tool %s failed for user %s: %s",
-                            tool_name,
-                            user_id,
-                            exc,
-                            exc_info=True,
-                        )
-                        result = {"error": f"Tool execution failed: {str(exc)}"}
-
-                    # Emit tool_result event
+                # Execute the turn's tools — read-only calls run concurrently
+                total_tool_calls += len(calls)
+                outcomes = await _tool_runtime.run(
+                    calls,
+                    lambda call: execute_tool(
+                        tool_name=call.name,
+                        tool_input=call.input,
+                        user_id=user_id,
+                        user_role=user_role,
+                        conversation_history=messages,
+                    ),
+                    scope=organization_id,
+                    user_id=user_id,
+                    role=user_role,
+                )
+
+                tool_result_content = []
+                for outcome in outcomes:
                     yield _make_sse_event(
-                        {"type": "tool_result", "name": tool_name, "output": result}
+                        {
+                            "type": "tool_result",
+                            "name": outcome.call.name,
+                            "output": outcome.result,
+                            "latency_ms": round(outcome.latency_ms, 1),
+                            "cached": outcome.cached,
+                        }
                     )
-
                     tool_result_content.append(
                         {
                             "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": json.dumps(result, default=str),
+                            "tool_use_id": outcome.call.id,
+                            "content": json.dumps(outcome.result, default=str),
                         }
                     )
 
@@ -1,19 +1,35 @@
 """
 AI Assistant — Conversation Repository (Phase C)
 
-Persists conversations to MongoDB collection `ai_assistant_conversations`.
+Persists conversations to MongoDB.
 Enforces the last-3-per-user limit: when a 4th conversation is created,
 the oldest one (by updated_at) is deleted automatically.
 
-Document structure mirrors the Conversation Pydantic model.
+Storage layout:
+  - `ai_assistant_conversations` holds one small header per conversation
+    (title, context, timestamps, `message_count`, `last_message_preview`).
+    Listing conversations reads headers only.
+  - `ai_assistant_message_buckets` holds the messages, BUCKET_SIZE per
+    document, keyed by (conversation_id, seq). Message n lives in bucket
+    n // BUCKET_SIZE, so no document grows without bound and reading the
+    last N turns touches at most ceil(N / BUCKET_SIZE) + 1 buckets.
+
+Conversations written before bucketing keep their messages in an embedded
+`messages` array on the header. Reads handle both layouts; the first append
+to a legacy conversation moves its array into buckets (idempotently) before
+writing the new turn.
+
 All queries are user-scoped — cross-user isolation is enforced at the DB level.
 """
 
 import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
 
+from src.core.indexes import declare_index
 from src.services.database import mongodb
 
 from ..models.conversation import (
@@ -26,6 +42,18 @@ from ..models.conversation import (
 logger = logging.getLogger(__name__)
 
 _COLLECTION = "ai_assistant_conversations"
+_BUCKETS = "ai_assistant_message_buckets"
+
+# Messages per bucket document. Assistant replies are capped at
+# AI_ASSISTANT_MAX_TOKENS, so a full bucket stays well under 16MB.
+BUCKET_SIZE = 100
+
+# Characters of the latest message kept on the header for list views.
+PREVIEW_LENGTH = 120
+
+declare_index(_COLLECTION, "conversation_id", unique=True)
+declare_index(_COLLECTION, [("user_id", 1), ("updated_at", -1)])
+declare_index(_BUCKETS, [("conversation_id", 1), ("seq", 1)], unique=True)
 
 
 class ConversationRepository:
@@ -34,7 +62,7 @@ class ConversationRepository:
 
     Methods:
         create:          Create a new conversation (evicts oldest if over limit).
-        get:             Load a single conversation by ID (user-scoped).
+        get:             Load a conversation by ID with all or the last N messages.
         list_summaries:  List the user's conversations as lightweight summaries.
         append_messages: Append user + assistant messages to an existing conversation.
         delete:          Delete a conversation by ID (user-scoped).
@@ -83,7 +111,9 @@ class ConversationRepository:
             updated_at=now,
         )
 
-        doc = conversation.model_dump()
+        # Reason: messages live in the bucket collection; a `messages` field on
+        # the header marks a legacy (pre-bucketing) conversation.
+        doc = conversation.model_dump(exclude={"messages"})
         await collection.insert_one(doc)
         logger.debug(
             "Created conversation %s for user %s", conversation.conversation_id, user_id
@@ -94,13 +124,20 @@ class ConversationRepository:
     # Read
     # ------------------------------------------------------------------
 
-    async def get(self, conversation_id: str, user_id: str) -> Optional[Conversation]:
+    async def get(
+        self,
+        conversation_id: str,
+        user_id: str,
+        last_n: Optional[int] = None,
+    ) -> Optional[Conversation]:
         """
         Load a conversation by ID, enforcing user ownership.
 
         Args:
             conversation_id: UUID string of the conversation.
             user_id:         Must match the stored user_id field.
+            last_n:          Only load the most recent `last_n` messages
+                             (None = the whole history, 0 = header only).
 
         Returns:
             Conversation object, or None if not found / wrong owner.
@@ -112,13 +149,31 @@ class ConversationRepository:
         )
         if not doc:
             return None
-        return Conversation(**doc)
+
+        legacy = doc.pop("messages", None)
+        if legacy is not None:
+            # Pre-bucketing conversation — everything is already on the header.
+            doc.setdefault("message_count", len(legacy))
+            if legacy and doc.get("last_message_preview") is None:
+                doc["last_message_preview"] = self._make_preview(
+                    legacy[-1].get("content", "")
+                )
+            messages = legacy
+        elif last_n == 0:
+            messages = []
+        else:
+            messages = await self._read_messages(conversation_id, user_id, last_n)
+
+        if last_n is not None:
+            messages = messages[-last_n:] if last_n > 0 else []
+        return Conversation(**doc, messages=messages)
 
     async def list_summaries(self, user_id: str) -> List[ConversationSummary]:
         """
         Return lightweight summaries of all conversations owned by user_id.
 
-        Sorted by updated_at descending (most recent first).
+        Sorted by updated_at descending (most recent first). Reads header
+        fields only — no message documents are touched.
 
         Args:
             user_id: Authenticated user ID.
@@ -135,7 +190,11 @@ class ConversationRepository:
                     "_id": 0,
                     "conversation_id": 1,
                     "title": 1,
-                    "messages": 1,
+                    "message_count": 1,
+                    "last_message_preview": 1,
+                    # Legacy headers have no message_count; size the embedded
+                    # array server-side instead of shipping it to the API.
+                    "legacy_count": {"$size": {"$ifNull": ["$messages", []]}},
                     "created_at": 1,
                     "updated_at": 1,
                 },
@@ -150,7 +209,8 @@ class ConversationRepository:
                 ConversationSummary(
                     conversation_id=doc["conversation_id"],
                     title=doc.get("title", ""),
-                    message_count=len(doc.get("messages", [])),
+                    message_count=doc.get("message_count", doc.get("legacy_count", 0)),
+                    last_message_preview=doc.get("last_message_preview"),
                     created_at=doc["created_at"],
                     updated_at=doc["updated_at"],
                 )
@@ -171,13 +231,16 @@ class ConversationRepository:
         """
         Append a user turn and the corresponding assistant turn to a conversation.
 
+        The header's `message_count` is incremented first, which reserves the
+        two message positions atomically; the messages are then pushed into
+        the bucket(s) owning those positions.
+
         Args:
             conversation_id:   UUID of the conversation.
             user_id:           Must match the stored user_id (ownership check).
             user_message:      The user's input text.
             assistant_message: The assistant's full response text.
         """
-        db = mongodb.get_database()
         now = datetime.utcnow()
 
         user_msg = Message(
@@ -190,20 +253,21 @@ class ConversationRepository:
             content=assistant_message,
             timestamp=now,
         )
+        new_messages = [user_msg.model_dump(), assistant_msg.model_dump()]
+
+        header = await self._reserve(conversation_id, user_id, new_messages, now)
+        if header is None and await self._migrate_legacy(conversation_id, user_id):
+            header = await self._reserve(conversation_id, user_id, new_messages, now)
+        if header is None:
+            logger.warning(
+                "append_messages: conversation %s not found for user %s",
+                conversation_id,
+                user_id,
+            )
+            return
 
-        await db[_COLLECTION].update_one(
-            {"conversation_id": conversation_id, "user_id": user_id},
-            {
-                "$push": {
-                    "messages": {
-                        "$each": [
-                            user_msg.model_dump(),
-                            assistant_msg.model_dump(),
-                        ]
-                    }
-                },
-                "$set": {"updated_at": now},
-            },
+        await self._write_to_buckets(
+            conversation_id, user_id, header.get("message_count", 0), new_messages
         )
 
     # ------------------------------------------------------------------
@@ -212,7 +276,7 @@ class ConversationRepository:
 
     async def delete(self, conversation_id: str, user_id: str) -> bool:
         """
-        Delete a conversation by ID.
+        Delete a conversation and its message buckets by ID.
 
         Args:
             conversation_id: UUID of the conversation to delete.
@@ -227,6 +291,9 @@ class ConversationRepository:
         )
         deleted = result.deleted_count > 0
         if deleted:
+            await db[_BUCKETS].delete_many(
+                {"conversation_id": conversation_id, "user_id": user_id}
+            )
             logger.debug(
                 "Deleted conversation %s for user %s", conversation_id, user_id
             )
@@ -236,6 +303,152 @@ class ConversationRepository:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    async def _reserve(
+        self,
+        conversation_id: str,
+        user_id: str,
+        new_messages: List[Dict[str, Any]],
+        now: datetime,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Claim positions for `new_messages` on a bucketed header.
+
+        Returns:
+            The header as it was BEFORE the increment (its message_count is
+            the first reserved position), or None if there is no bucketed
+            header — missing, wrong owner, or still legacy.
+        """
+        db = mongodb.get_database()
+        return await db[_COLLECTION].find_one_and_update(
+            {
+                "conversation_id": conversation_id,
+                "user_id": user_id,
+                "messages": {"$exists": False},
+            },
+            {
+                "$inc": {"message_count": len(new_messages)},
+                "$set": {
+                    "updated_at": now,
+                    "last_message_preview": self._make_preview(
+                        new_messages[-1]["content"]
+                    ),
+                },
+            },
+            projection={"_id": 0, "message_count": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+
+    async def _write_to_buckets(
+        self,
+        conversation_id: str,
+        user_id: str,
+        first_position: int,
+        messages: List[Dict[str, Any]],
+        initial: bool = False,
+    ) -> None:
+        """
+        Push messages occupying positions first_position.. into their buckets.
+
+        Each stored message carries its position as `n` so concurrent appends
+        that land in the same bucket can still be read back in order.
+
+        Args:
+            initial: Only write buckets that do not exist yet (legacy
+                     migration, where re-running must not duplicate messages).
+        """
+        db = mongodb.get_database()
+        by_bucket: Dict[int, List[Dict[str, Any]]] = {}
+        for offset, message in enumerate(messages):
+            position = first_position + offset
+            by_bucket.setdefault(position // BUCKET_SIZE, []).append(
+                {**message, "n": position}
+            )
+
+        for seq, chunk in sorted(by_bucket.items()):
+            key = {"conversation_id": conversation_id, "seq": seq}
+            on_insert = {"user_id": user_id, "created_at": datetime.utcnow()}
+            if initial:
+                update = {"$setOnInsert": {**on_insert, "messages": chunk}}
+            else:
+                update = {
+                    "$push": {"messages": {"$each": chunk}},
+                    "$setOnInsert": on_insert,
+                }
+            await db[_BUCKETS].update_one(key, update, upsert=True)
+
+    async def _read_messages(
+        self, conversation_id: str, user_id: str, last_n: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Read messages back from the buckets, oldest first.
+
+        With `last_n`, only the newest buckets that can contain those
+        messages are fetched (one extra covers a partially filled last bucket).
+        """
+        db = mongodb.get_database()
+        cursor = db[_BUCKETS].find(
+            {"conversation_id": conversation_id, "user_id": user_id},
+            {"_id": 0, "seq": 1, "messages": 1},
+        )
+        if last_n is None:
+            buckets = await cursor.sort("seq", 1).to_list(length=None)
+        else:
+            wanted = -(-last_n // BUCKET_SIZE) + 1
+            buckets = await cursor.sort("seq", -1).limit(wanted).to_list(length=wanted)
+            buckets.reverse()
+
+        messages = []
+        for bucket in buckets:
+            messages.extend(sorted(bucket.get("messages", []), key=lambda m: m["n"]))
+        return messages
+
+    async def _migrate_legacy(self, conversation_id: str, user_id: str) -> bool:
+        """
+        Move a legacy header's embedded `messages` array into buckets.
+
+        Buckets are written with $setOnInsert before the array is unset, so a
+        crash or a concurrent migration never loses or duplicates messages.
+
+        Returns:
+            True if the conversation exists in bucketed form afterwards.
+        """
+        db = mongodb.get_database()
+        doc = await db[_COLLECTION].find_one(
+            {"conversation_id": conversation_id, "user_id": user_id},
+            {"_id": 0, "messages": 1},
+        )
+        if doc is None:
+            return False
+        legacy = doc.get("messages")
+        if legacy is None:
+            return True  # already migrated by someone else
+
+        await self._write_to_buckets(conversation_id, user_id, 0, legacy, initial=True)
+        await db[_COLLECTION].update_one(
+            {
+                "conversation_id": conversation_id,
+                "user_id": user_id,
+                "messages": {"$exists": True},
+            },
+            {
+                "$unset": {"messages": ""},
+                "$set": {
+                    "message_count": len(legacy),
+                    "last_message_preview": (
+                        self._make_preview(legacy[-1].get("content", ""))
+                        if legacy
+                        else None
+                    ),
+                },
+            },
+        )
+        logger.info(
+            "Migrated conversation %s to bucketed storage (%d messages)",
+            conversation_id,
+            len(legacy),
+        )
+        return True
+
     async def _evict_if_needed(self, user_id: str, limit: int) -> None:
         """
         Delete the oldest conversation if the user is at or above the limit.
@@ -262,6 +475,9 @@ class ConversationRepository:
             await db[_COLLECTION].delete_one(
                 {"conversation_id": old_id, "user_id": user_id}
             )
+            await db[_BUCKETS].delete_many(
+                {"conversation_id": old_id, "user_id": user_id}
+            )
             logger.debug(
                 "Evicted conversation %s for user %s (limit=%d)",
                 old_id,
@@ -287,6 +503,23 @@ class ConversationRepository:
             title = title[: max_length - 1] + "…"
         return title or "New conversation"
 
+    @staticmethod
+    def _make_preview(message: str, max_length: int = PREVIEW_LENGTH) -> str:
+        """
+        Single-line preview of a message for conversation lists.
+
+        Args:
+            message:    Raw message text.
+            max_length: Maximum character length for the preview.
+
+        Returns:
+            Whitespace-collapsed text, truncated with ellipsis if needed.
+        """
+        preview = " ".join(message.split())
+        if len(preview) > max_length:
+            preview = preview[: max_length - 1] + "…"
+        return preview
+
 
 # ---------------------------------------------------------------------------
 # Singleton factory
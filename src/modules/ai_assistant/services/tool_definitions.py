@@ -23,6 +23,21 @@ Prompt caching:
 
 from typing import Any, Dict, List
 
+from src.core.ai_tools import ToolSpec
+
+# Side-effect class and shared result-cache TTL per tool (src/core/ai_tools).
+# query_mongodb is not cached here — the ai_analytics QueryEngine already
+# keeps its own per-user result cache.
+TOOL_SPECS = [
+    ToolSpec("query_mongodb"),
+    ToolSpec("get_equipment_list", cache_ttl_seconds=120),
+    ToolSpec("get_sensor_readings", cache_ttl_seconds=15),
+    ToolSpec("get_alerts", cache_ttl_seconds=15),
+    ToolSpec("get_automations", cache_ttl_seconds=60),
+    ToolSpec("get_lab_readings", cache_ttl_seconds=60),
+    ToolSpec("get_lab_latest", cache_ttl_seconds=30),
+]
+
 
 def get_tool_definitions() -> List[Dict[str, Any]]:
     """
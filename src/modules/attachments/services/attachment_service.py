@@ -58,6 +58,8 @@ from typing import Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from src.core.indexes import declare_index, ensure_collection_indexes
+
 from ..models.attachment import (
     ALLOWED_MIME_TYPES,
     CANONICAL_EXTENSION,
@@ -73,6 +75,15 @@ logger = logging.getLogger(__name__)
 _COLLECTION = "document_attachments"
 _HEADERS_COL = "document_headers"
 
+# Index: (organizationId, docType, docId, deletedAt) covers the primary list
+# query pattern; fileId is the download/delete lookup key.
+declare_index(
+    _COLLECTION,
+    [("organizationId", 1), ("docType", 1), ("docId", 1), ("deletedAt", 1)],
+    name="ix_attachments_org_doc",
+)
+declare_index(_COLLECTION, [("fileId", 1)], unique=True, name="ix_attachments_file_id")
+
 # ---------------------------------------------------------------------------
 # Sales v2 collection dispatch (T-200.x)
 # ---------------------------------------------------------------------------
@@ -399,29 +410,12 @@ class AttachmentService:
 
     async def ensure_indexes(self) -> None:
         """
-        Create the compound index on document_attachments if it does not
-        already exist.
+        Create any declared document_attachments index that is missing.
 
-        Index: (organizationId, docType, docId, deletedAt)
-        This covers the primary list query pattern efficiently.
-
-        Should be called once at application startup.
+        The indexes are declared at module import and reconciled by the API
+        startup; this is only needed by processes that bypass that path.
         """
-        collection = self._db[_COLLECTION]
-        await collection.create_index(
-            [
-                ("organizationId", 1),
-                ("docType", 1),
-                ("docId", 1),
-                ("deletedAt", 1),
-            ],
-            name="ix_attachments_org_doc",
-        )
-        await collection.create_index(
-            [("fileId", 1)],
-            unique=True,
-            name="ix_attachments_file_id",
-        )
+        await ensure_collection_indexes(self._db, _COLLECTION)
         logger.info("[Attachments] Indexes ensured on document_attachments")
 
     # ------------------------------------------------------------------
@@ -19,6 +19,7 @@ from ...models.customer import (
 from ...services.customer import CustomerService
 from ...middleware.auth import get_current_active_user, require_permission, CurrentUser
 from ...utils.responses import SuccessResponse, PaginatedResponse, PaginationMeta
+from src.core.search.schemas import AutocompleteResponse
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +134,31 @@ async def search_customers(
     )
 
 
+@router.get(
+    "/autocomplete",
+    response_model=AutocompleteResponse,
+    summary="Autocomplete customers",
+    description="Suggest customers for a partially typed name, company, email or code. Requires crm.view permission.",
+)
+async def autocomplete_customers(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    current_user: CurrentUser = Depends(require_permission("crm.view")),
+    service: CustomerService = Depends(),
+):
+    """
+    Autocomplete customers
+
+    - **q**: Typed prefix (required); every word must start a word of the
+      customer's name, company, email or code
+    - **limit**: Maximum suggestions (default: 10, max: 50)
+    - **cursor**: Keyset cursor from the previous page (optional)
+    """
+    page = await service.autocomplete_customers(q, limit, cursor)
+    return AutocompleteResponse.from_page(page)
+
+
 @router.get(
     "/{customer_id}",
     response_model=SuccessResponse[Customer],
@@ -10,11 +10,33 @@ from uuid import UUID
 from datetime import datetime
 import logging
 
+from src.core import search as search_index
+from src.core.search import (
+    SearchEntity,
+    SearchHit,
+    SearchPage,
+    register_search_entity,
+)
+from src.core.sequences import Counter, allocate, next_value
+
 from ...models.customer import Customer, CustomerCreate, CustomerUpdate, CustomerStatus
 from ..database import crm_db
 
 logger = logging.getLogger(__name__)
 
+# Customer codes ("C001", …) are handed out from per-worker prefetched
+# blocks: unique, but not gapless and not strictly in creation order.
+CUSTOMER_CODE_COUNTER = Counter("counters", "customer_sequence", prefetch=True)
+
+SEARCH_ENTITY = register_search_entity(
+    SearchEntity(
+        name="customers",
+        collection="customers",
+        id_field="customerId",
+        fields=("name", "company", "email", "customerCode"),
+    )
+)
+
 
 class CustomerRepository:
     """Repository for Customer data access"""
@@ -28,24 +50,15 @@ class CustomerRepository:
 
     async def _get_next_customer_sequence(self) -> int:
         """
-        Get next customer sequence number using atomic increment.
+        Get next customer sequence number.
 
-        Uses a counters collection to maintain an atomic counter for customer codes.
+        Served from this worker's prefetched block of the customer code
+        counter (see src.core.sequences).
 
         Returns:
             Next sequence number for customer code
         """
-        db = crm_db.get_database()
-
-        # Use findOneAndUpdate with upsert to atomically get and increment
-        result = await db.counters.find_one_and_update(
-            {"_id": "customer_sequence"},
-            {"$inc": {"value": 1}},
-            upsert=True,
-            return_document=True,
-        )
-
-        return result["value"]
+        return await next_value(crm_db.get_database(), CUSTOMER_CODE_COUNTER)
 
     async def create(self, customer_data: CustomerCreate, created_by: UUID) -> Customer:
         """
@@ -80,12 +93,62 @@ class CustomerRepository:
         customer_doc["createdBy"] = str(customer_doc["createdBy"])
 
         await collection.insert_one(customer_doc)
+        await search_index.reindex(
+            crm_db.get_database(), SEARCH_ENTITY.name, [customer.customerId]
+        )
 
         logger.info(
             f"Created customer: {customer.customerId} with code {customer_code}"
         )
         return customer
 
+    async def create_many(
+        self, customers_data: List[CustomerCreate], created_by: UUID
+    ) -> List[Customer]:
+        """
+        Create several customers, reserving all their codes in one counter
+        round trip (bulk imports).
+
+        Args:
+            customers_data: Customer creation data, in code order
+            created_by: ID of the user creating the customers
+
+        Returns:
+            Created customers
+        """
+        if not customers_data:
+            return []
+        db = crm_db.get_database()
+        codes = await allocate(db, CUSTOMER_CODE_COUNTER, len(customers_data))
+
+        now = datetime.utcnow()
+        customers: List[Customer] = []
+        docs = []
+        for sequence, customer_data in zip(codes, customers_data):
+            customer = Customer(
+                **customer_data.model_dump(),
+                customerCode=f"C{sequence:03d}",
+                createdBy=created_by,
+                createdAt=now,
+                updatedAt=now,
+            )
+            doc = customer.model_dump(by_alias=True)
+            doc["customerId"] = str(doc["customerId"])
+            doc["createdBy"] = str(doc["createdBy"])
+            customers.append(customer)
+            docs.append(doc)
+
+        await self._get_collection().insert_many(docs, ordered=False)
+        await search_index.reindex(
+            db, SEARCH_ENTITY.name, [c.customerId for c in customers]
+        )
+
+        logger.info(
+            f"Created {len(customers)} customers with codes "
+            f"C{codes.start:03d}..C{codes[-1]:03d}"
+        )
+        return customers
+
     async def get_by_id(self, customer_id: UUID) -> Optional[Customer]:
         """
         Get customer by ID
@@ -149,7 +212,9 @@ class CustomerRepository:
     ) -> tuple[List[Customer], int]:
         """
         Search customers by name, email, or company using text search
-        with regex fallback for partial matching
+        with regex fallback for partial matching.  When the shared search
+        index is enabled for customers, typo-tolerant ranked search is used
+        instead (total is then an estimate).
 
         Args:
             search_term: Search term to match
@@ -161,6 +226,16 @@ class CustomerRepository:
         """
         import re
 
+        db = crm_db.get_database()
+        if await search_index.use_search_index(db, SEARCH_ENTITY.name):
+            page = await search_index.search(
+                db, SEARCH_ENTITY.name, search_term, limit=limit, skip=skip
+            )
+            docs = await search_index.fetch_hits(
+                db, SEARCH_ENTITY.name, page, {"_id": 0}
+            )
+            return [Customer(**doc) for doc in docs], page.estimated_total
+
         collection = self._get_collection()
 
         # First try MongoDB text search (faster for word matching)
@@ -205,6 +280,36 @@ class CustomerRepository:
 
         return customers, total
 
+    async def autocomplete(
+        self, prefix: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> SearchPage:
+        """
+        Suggest customers with a name, company, email or code word starting
+        with each word of ``prefix``
+
+        Before the search index is enabled for customers this falls back to
+        the first page of ``search`` (no cursor).
+
+        Args:
+            prefix: What the user typed so far
+            limit: Maximum number of suggestions
+            cursor: nextCursor of the previous page
+
+        Returns:
+            SearchPage of suggestions
+        """
+        db = crm_db.get_database()
+        if await search_index.use_search_index(db, SEARCH_ENTITY.name):
+            return await search_index.autocomplete(
+                db, SEARCH_ENTITY.name, prefix, limit=limit, cursor=cursor
+            )
+
+        customers, total = await self.search(prefix, 0, limit)
+        return SearchPage(
+            hits=[SearchHit(str(c.customerId), c.name, 1.0) for c in customers],
+            estimated_total=total,
+        )
+
     async def update(
         self, customer_id: UUID, update_data: CustomerUpdate
     ) -> Optional[Customer]:
@@ -231,6 +336,9 @@ class CustomerRepository:
         )
 
         if result.modified_count > 0:
+            await search_index.reindex(
+                crm_db.get_database(), SEARCH_ENTITY.name, [customer_id]
+            )
             logger.info(f"Updated customer: {customer_id}")
             return await self.get_by_id(customer_id)
 
@@ -251,6 +359,9 @@ class CustomerRepository:
         result = await collection.delete_one({"customerId": str(customer_id)})
 
         if result.deleted_count > 0:
+            await search_index.reindex(
+                crm_db.get_database(), SEARCH_ENTITY.name, [customer_id]
+            )
             logger.info(f"Deleted customer: {customer_id}")
             return True
 
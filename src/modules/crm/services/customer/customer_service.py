@@ -12,10 +12,31 @@ import logging
 
 from ...models.customer import Customer, CustomerCreate, CustomerUpdate, CustomerStatus
 from .customer_repository import CustomerRepository
+from src.core.propagation import (
+    DenormalizedField,
+    PropagationTarget,
+    enqueue_propagation,
+    register_denormalized_field,
+)
+from src.core.search import SearchPage
 from src.services.database import mongodb
 
 logger = logging.getLogger(__name__)
 
+# Sales orders carry the customer's name; renames reach them asynchronously.
+CUSTOMER_NAME_FIELD = register_denormalized_field(
+    DenormalizedField(
+        name="customer.name",
+        source_collection="customers",
+        source_id_field="customerId",
+        targets=(
+            PropagationTarget(
+                "sales_orders", match_field="customerId", paths={"customerName": "name"}
+            ),
+        ),
+    )
+)
+
 
 class CustomerService:
     """Service for Customer business logic"""
@@ -140,14 +161,37 @@ class CustomerService:
 
         return customers, total, total_pages
 
+    async def autocomplete_customers(
+        self, prefix: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> SearchPage:
+        """
+        Suggest customers for a partially typed name, company, email or code
+
+        Args:
+            prefix: What the user typed so far
+            limit: Maximum number of suggestions (1-50)
+            cursor: nextCursor of the previous page
+
+        Returns:
+            SearchPage of suggestions
+
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            return await self.repository.autocomplete(prefix, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     async def update_customer(
         self, customer_id: UUID, update_data: CustomerUpdate
     ) -> Customer:
         """
-        Update a customer with cascading updates to related entities.
+        Update a customer.
 
-        When customer name is updated, all related sales orders are updated
-        to reflect the new customerName (denormalized field).
+        When the name changes, a ``customer.name`` propagation is queued so
+        related sales orders' denormalized customerName follows shortly after
+        (see src.core.propagation); the request does not wait for it.
 
         Args:
             customer_id: Customer ID
@@ -182,43 +226,15 @@ class CustomerService:
                 detail=f"Customer {customer_id} not found",
             )
 
-        # Cascade name update to related sales orders
+        # Related sales orders pick up the new name in the background
         if name_changed:
-            await self._cascade_customer_name_update(customer_id, updated_customer.name)
+            await enqueue_propagation(
+                mongodb.get_database(), CUSTOMER_NAME_FIELD.name, customer_id
+            )
 
         logger.info(f"Customer updated: {customer_id}")
         return updated_customer
 
-    async def _cascade_customer_name_update(
-        self, customer_id: UUID, new_name: str
-    ) -> int:
-        """
-        Cascade customer name update to all related sales orders.
-
-        Updates the denormalized customerName field in all orders
-        belonging to this customer.
-
-        Args:
-            customer_id: Customer ID
-            new_name: New customer name
-
-        Returns:
-            Number of orders updated
-        """
-        db = mongodb.get_database()
-
-        result = await db.sales_orders.update_many(
-            {"customerId": str(customer_id)}, {"$set": {"customerName": new_name}}
-        )
-
-        if result.modified_count > 0:
-            logger.info(
-                f"Cascaded customer name update to {result.modified_count} "
-                f"sales orders for customer {customer_id}"
-            )
-
-        return result.modified_count
-
     async def delete_customer(self, customer_id: UUID) -> dict:
         """
         Delete a customer with sales order cascade handling.
@@ -9,6 +9,7 @@ import logging
 
 # Import shared database manager from core
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +38,9 @@ class CRMDatabaseManager:
             logger.info("[CRM Module] Initializing CRM indexes...")
 
             # The core MongoDB manager already connected in main.py startup
-            # We just need to create our module-specific indexes
-            await cls._create_indexes()
+            # We just need to declare our module-specific indexes; they are
+            # reconciled against the database once per boot (src.core.indexes)
+            cls._declare_indexes()
 
             logger.info("[CRM Module] CRM indexes initialized")
 
@@ -47,32 +49,30 @@ class CRMDatabaseManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for CRM collections"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for CRM collections"""
         try:
-            # Get shared database instance from core
-            db = mongodb.get_database()
-
             # Customers collection
-            await db.customers.create_index("customerId", unique=True)
-            await db.customers.create_index("customerCode", unique=True)
-            await db.customers.create_index("email")
-            await db.customers.create_index("phone")
-            await db.customers.create_index("company")
-            await db.customers.create_index("type")
-            await db.customers.create_index("status")
-            await db.customers.create_index("createdBy")
-            await db.customers.create_index("tags")
-            await db.customers.create_index([("createdAt", -1)])
+            declare_index("customers", "customerId", unique=True)
+            declare_index("customers", "customerCode", unique=True)
+            declare_index("customers", "email")
+            declare_index("customers", "phone")
+            declare_index("customers", "company")
+            declare_index("customers", "type")
+            declare_index("customers", "status")
+            declare_index("customers", "createdBy")
+            declare_index("customers", "tags")
+            declare_index("customers", [("createdAt", -1)])
             # Text search index for name, email, company
-            await db.customers.create_index(
+            declare_index(
+                "customers",
                 [("name", "text"), ("email", "text"), ("company", "text")],
                 name="customer_search_text",
             )
 
-            logger.info("[CRM Module] MongoDB indexes created successfully")
+            logger.info("[CRM Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[CRM Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[CRM Module] Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
@@ -4,7 +4,7 @@ Block Harvest API Routes
 Endpoints for recording and managing harvest events.
 """
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from typing import Optional
 from uuid import UUID
 from datetime import date, datetime
@@ -156,6 +156,7 @@ async def submit_harvest_batch(
     farm_id: UUID,
     block_id: UUID,
     request: HarvestBatchSubmitRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: CurrentUser = Depends(require_permission("farm.operate")),
 ):
     """
@@ -179,9 +180,16 @@ async def submit_harvest_batch(
     - `qualityGrade` must be omitted for waste lines (harvest waste is not
       graded) — supplying one is rejected (400), not silently dropped
 
+    **Idempotency**: send an `Idempotency-Key` header (or `idempotencyKey`
+    in the body) generated on the device; resubmitting with the same key
+    returns the original result with `replayed: true` instead of recording
+    the harvest twice. Reusing a key for different lines is rejected (409).
+
     See `Docs/2-Working-Progress/plant-library-product-extension-design.md`
     §3/§5 for the full design.
     """
+    if idempotency_key:
+        request = request.model_copy(update={"idempotencyKey": idempotency_key})
     response = await HarvestService.submit_harvest_batch(
         farm_id,
         block_id,
@@ -728,20 +728,15 @@ async def preview_empty_virtual_block(
             status_code=status.HTTP_404_NOT_FOUND, detail="Parent block not found"
         )
 
-    # Count tasks
-    db = farm_db.get_database()
-
-    completed_count = await db.farm_tasks.count_documents(
-        {"blockId": str(block_id), "status": "completed"}
-    )
+    # Count tasks (stored tasks and recurring series occurrences)
+    from ...services.task.task_repository import TaskRepository
 
-    in_progress_count = await db.farm_tasks.count_documents(
-        {"blockId": str(block_id), "status": "in_progress"}
-    )
+    db = farm_db.get_database()
 
-    pending_count = await db.farm_tasks.count_documents(
-        {"blockId": str(block_id), "status": "pending"}
-    )
+    task_counts = await TaskRepository.count_by_status_for_block(block_id)
+    completed_count = task_counts.get("completed", 0)
+    in_progress_count = task_counts.get("in_progress", 0)
+    pending_count = task_counts.get("pending", 0)
 
     # Count harvests
     harvest_count = await db.block_harvests.count_documents({"blockId": str(block_id)})
@@ -56,6 +56,8 @@ async def chat(
             farm_id=farm_id,
             block_id=block_id,
             user_id=current_user.userId,
+            organization_id=current_user.organizationId,
+            user_role=current_user.role,
         )
         return response
     except Exception as e:
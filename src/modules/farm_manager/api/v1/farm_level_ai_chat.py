@@ -59,6 +59,8 @@ async def chat(
             conversation_history=[m.model_dump() for m in body.conversation_history],
             farm_id=farm_id,
             user_id=current_user.userId,
+            organization_id=current_user.organizationId,
+            user_role=current_user.role,
         )
         return response
     except Exception as e:
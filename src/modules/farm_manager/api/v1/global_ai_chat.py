@@ -46,6 +46,8 @@ async def chat(
             message=body.message,
             conversation_history=[m.model_dump() for m in body.conversation_history],
             user_id=current_user.userId,
+            organization_id=current_user.organizationId,
+            user_role=current_user.role,
         )
         return response
     except Exception as e:
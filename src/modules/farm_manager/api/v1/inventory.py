@@ -23,6 +23,11 @@ from ...models.farming_year_config import (
     DEFAULT_FARMING_YEAR_START_MONTH,
 )
 from ...services.inventory.returned_repository import ReturnedInventoryRepository
+from ...services.inventory.input_search import (
+    SEARCH_ENTITY as INPUT_SEARCH_ENTITY,
+    search_input_inventory,
+)
+from src.core import search as search_index
 
 from src.modules.farm_manager.models.inventory import (
     # Enums
@@ -742,7 +747,7 @@ async def delete_harvest_inventory(
 # ============================================================================
 #
 # Rows here are created only by the harvest batch-submission routing
-# (HarvestService._route_process_line, see block_harvests.py's POST .../batch
+# (HarvestService._processing_document, see block_harvests.py's POST .../batch
 # endpoint) — never by a standalone create endpoint in this stage. This is a
 # read-only listing for visibility/verification; write access follows the
 # harvest-routing path exclusively (see design doc §3/§3.1).
@@ -833,6 +838,30 @@ async def list_input_inventory(
         # If farm_id provided without scope, filter by farm
         query["farmId"] = str(farm_id)
 
+    skip = (page - 1) * per_page
+
+    # Reason: the search index filters on equality only, so the "default
+    # inventory" / "any farm" scopes and the low-stock flag keep the $regex path
+    if search and not low_stock_only and (scope is None or farm_id):
+        indexed = await search_input_inventory(
+            db,
+            str(org_id),
+            search,
+            farm_id=str(farm_id) if farm_id else None,
+            category=category.value if category else None,
+            skip=skip,
+            limit=per_page,
+        )
+        if indexed is not None:
+            items, total = indexed
+            return {
+                "items": [serialize_doc(item) for item in items],
+                "total": total,
+                "page": page,
+                "perPage": per_page,
+                "totalPages": (total + per_page - 1) // per_page,
+            }
+
     if category:
         query["category"] = category.value
     if low_stock_only:
@@ -844,7 +873,6 @@ async def list_input_inventory(
             {"sku": {"$regex": search, "$options": "i"}},
         ]
 
-    skip = (page - 1) * per_page
     total = await db.inventory_input.count_documents(query)
     items = (
         await db.inventory_input.find(query)
@@ -1023,6 +1051,7 @@ async def create_input_inventory(
 
     doc = inventory.model_dump(mode="json")
     await db.inventory_input.insert_one(doc)
+    await search_index.reindex(db, INPUT_SEARCH_ENTITY.name, [doc["inventoryId"]])
 
     # Record movement
     await record_movement(
@@ -1115,6 +1144,7 @@ async def update_input_inventory(
     await db.inventory_input.update_one(
         {"inventoryId": str(inventory_id)}, {"$set": update_data}
     )
+    await search_index.reindex(db, INPUT_SEARCH_ENTITY.name, [inventory_id])
 
     updated = await db.inventory_input.find_one({"inventoryId": str(inventory_id)})
     return serialize_doc(updated)
@@ -1130,6 +1160,7 @@ async def delete_input_inventory(
     result = await db.inventory_input.delete_one({"inventoryId": str(inventory_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Input inventory item not found")
+    await search_index.reindex(db, INPUT_SEARCH_ENTITY.name, [inventory_id])
 
 
 # Record usage of input item
@@ -2017,6 +2048,8 @@ async def transfer_inventory(
     # Insert destination inventory
     await collection.insert_one(dest_inventory_data)
     dest_inventory_id = UUID(dest_inventory_data["inventoryId"])
+    if transfer.inventoryType == InventoryType.INPUT:
+        await search_index.reindex(db, INPUT_SEARCH_ENTITY.name, [dest_inventory_id])
 
     # Record movement for destination
     await record_movement(
@@ -5,6 +5,7 @@ Endpoints for the Operations Task Manager - farmer task management system.
 """
 
 from fastapi import APIRouter, Depends, Query, status, HTTPException
+from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
 
@@ -38,6 +39,12 @@ async def get_my_tasks(
     status_filter: Optional[TaskStatus] = Query(
         None, alias="status", description="Filter by status"
     ),
+    scheduledFrom: Optional[datetime] = Query(
+        None, description="Only tasks scheduled at or after this date"
+    ),
+    scheduledTo: Optional[datetime] = Query(
+        None, description="Only tasks scheduled before this date"
+    ),
     current_user: CurrentUser = Depends(get_current_active_user),
 ):
     """
@@ -49,11 +56,17 @@ async def get_my_tasks(
     **Query Parameters**:
     - `farm_id`: Filter tasks for a specific farm (optional)
     - `status`: Filter by task status (optional)
+    - `scheduledFrom` / `scheduledTo`: Scheduled-date window (optional); recurring
+      tasks are expanded for this window
 
     **Response**: List of tasks sorted by scheduled date
     """
     tasks = await TaskService.get_my_tasks(
-        user_id=UUID(current_user.userId), farm_id=farm_id, status=status_filter
+        user_id=UUID(current_user.userId),
+        farm_id=farm_id,
+        status=status_filter,
+        scheduled_from=scheduledFrom,
+        scheduled_to=scheduledTo,
     )
 
     return SuccessResponse(data=tasks, message=f"Retrieved {len(tasks)} tasks")
@@ -94,6 +107,12 @@ async def list_farm_tasks(
     farmingYear: Optional[int] = Query(
         None, description="Filter by farming year (e.g., 2025 for Aug 2025 - Jul 2026)"
     ),
+    scheduledFrom: Optional[datetime] = Query(
+        None, description="Only tasks scheduled at or after this date"
+    ),
+    scheduledTo: Optional[datetime] = Query(
+        None, description="Only tasks scheduled before this date"
+    ),
     current_user: CurrentUser = Depends(get_current_active_user),
 ):
     """
@@ -104,6 +123,8 @@ async def list_farm_tasks(
     - `perPage`: Items per page (default: 50, max: 100)
     - `status`: Filter by task status (optional)
     - `farmingYear`: Filter by farming year (optional, e.g., 2025 for Aug 2025 - Jul 2026)
+    - `scheduledFrom` / `scheduledTo`: Scheduled-date window (optional, default
+      90 days either side of now); recurring tasks are expanded for this window
 
     **Note**: The farming year filter returns tasks for blocks planted in that farming year.
 
@@ -115,6 +136,8 @@ async def list_farm_tasks(
         page=page,
         per_page=perPage,
         farming_year=farmingYear,
+        scheduled_from=scheduledFrom,
+        scheduled_to=scheduledTo,
     )
 
     return response
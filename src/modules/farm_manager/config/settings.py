@@ -59,6 +59,12 @@ class Settings(BaseSettings):
     WEATHERBIT_CACHE_TTL_CURRENT: int = 300  # 5 minutes for current weather
     WEATHERBIT_CACHE_TTL_FORECAST: int = 3600  # 1 hour for forecast
 
+    # Watchdog: max simultaneous MCP reachability probes per process, across
+    # every running check (scheduled and manual)
+    WATCHDOG_MCP_PROBE_CONCURRENCY: int = int(
+        os.getenv("WATCHDOG_MCP_PROBE_CONCURRENCY", "20")
+    )
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -214,6 +214,16 @@ class HarvestBatchSubmitRequest(BaseModel):
     farmingYear: Optional[int] = Field(
         None, description="Farming year (auto-calculated from harvestDate if omitted)"
     )
+    idempotencyKey: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=200,
+        description=(
+            "Client-generated key for this submission (e.g. a UUID made on "
+            "the field device). Resubmitting with the same key returns the "
+            "original result instead of recording the harvest twice."
+        ),
+    )
 
 
 class HarvestBatchLineResult(BaseModel):
@@ -237,6 +247,11 @@ class HarvestBatchSubmitResponse(BaseModel):
     blockId: UUID
     harvestDate: datetime
     lines: List[HarvestBatchLineResult]
+    replayed: bool = Field(
+        False,
+        description="True when this is the stored result of an earlier "
+        "submission with the same idempotencyKey (nothing was written)",
+    )
 
 
 # ============================================================================
@@ -213,6 +213,14 @@ class FarmTask(FarmTaskCreate):
         None, description="Block cycle that generated this task"
     )
 
+    # Recurring series occurrence (see FarmTaskSeries)
+    seriesId: Optional[UUID] = Field(
+        None, description="Series this task is an occurrence of"
+    )
+    occurrenceIndex: Optional[int] = Field(
+        None, description="0-based position of the occurrence in its series"
+    )
+
     # Multi-industry scoping
     divisionId: Optional[str] = Field(None, description="Division scope")
     organizationId: Optional[str] = Field(None, description="Organization scope")
@@ -254,6 +262,62 @@ class FarmTask(FarmTaskCreate):
         }
 
 
+class FarmTaskSeries(BaseModel):
+    """
+    Recurring auto-task stored as a rule instead of one document per day.
+
+    Occurrence ``i`` is scheduled at ``startDate + i * intervalDays`` and is
+    expanded on read; it only gets a farm_tasks document (an override) once a
+    worker starts, completes or edits it.  See services/task/task_series.py.
+    """
+
+    seriesId: UUID = Field(..., description="Unique series identifier")
+    farmId: UUID = Field(..., description="Farm ID")
+    blockId: UUID = Field(..., description="Block ID")
+    taskType: TaskType = Field(..., description="Type of every occurrence")
+    title: Optional[str] = Field(None, description="Occurrence title")
+    description: Optional[str] = Field(
+        None, description="Occurrence description; '{n}' becomes the 1-based number"
+    )
+    priority: TaskPriority = Field(TaskPriority.MEDIUM, description="Task priority")
+    assignedTo: Optional[UUID] = Field(None, description="User ID (null for auto)")
+    triggerStateChange: Optional[str] = Field(
+        None, description="Block status offered on completion"
+    )
+
+    # Rule
+    startDate: datetime = Field(..., description="Scheduled date of occurrence 0")
+    intervalDays: int = Field(1, description="Days between occurrences", gt=0)
+    count: int = Field(..., description="Number of occurrences", ge=0, le=0xFFFF)
+    dueOffsetSeconds: Optional[int] = Field(
+        None, description="Occurrence dueDate = scheduledDate + offset"
+    )
+    exceptions: List[int] = Field(
+        default_factory=list, description="Deleted occurrence indexes"
+    )
+    materialized: List[int] = Field(
+        default_factory=list,
+        description="Occurrence indexes that have a farm_tasks document",
+    )
+    cancelledAfter: Optional[datetime] = Field(
+        None, description="Occurrences scheduled after this are cancelled"
+    )
+
+    # Auto-generation tracking
+    isAutoGenerated: bool = Field(True, description="Was series auto-generated")
+    generatedFromCycleId: Optional[UUID] = Field(
+        None, description="Block cycle that generated this series"
+    )
+
+    # Multi-industry scoping
+    divisionId: Optional[str] = Field(None, description="Division scope")
+    organizationId: Optional[str] = Field(None, description="Organization scope")
+
+    # Timestamps
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
 class HarvestEntryCreate(BaseModel):
     """Schema for adding a harvest entry to a daily_harvest task"""
 
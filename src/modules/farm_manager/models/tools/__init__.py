@@ -6,4 +6,5 @@ Pydantic models for the Fertilizer Cost Calculator tool:
 - PriceOverride / ResolvedPrice
 - CalculationList
 - Calculator request / response types
+- Demand forecast response types
 """
@@ -0,0 +1,74 @@
+"""
+Fertilizer Demand Forecast Models
+
+Types returned by the season-wide fertilizer demand forecast and its API
+endpoints.
+"""
+
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class DemandSeries(BaseModel):
+    """
+    Daily demand for one chemical (or unmatched schedule ingredient).
+
+    Args:
+        chemicalId: Matched chemical ID; None if the ingredient is unmatched
+            or its unit cannot be converted to the chemical's default unit.
+        name: Chemical name, or the ingredient name from the schedule.
+        unit: Unit of every quantity in the series.
+        total: Sum of ``daily``.
+        daily: Quantity needed on each forecast day, starting at startDate.
+    """
+
+    chemicalId: Optional[UUID] = Field(
+        None, description="Matched chemical ID; None if unmatched"
+    )
+    name: str = Field(..., description="Chemical / ingredient name")
+    unit: str = Field(..., description="Quantity unit")
+    total: float = Field(..., ge=0, description="Total over the forecast window")
+    daily: List[float] = Field(
+        default_factory=list, description="Quantity per day from startDate"
+    )
+
+
+class FarmDemand(BaseModel):
+    """
+    Forecast demand for one farm.
+
+    Args:
+        farmId: Farm identifier.
+        farmName: Human-readable farm name.
+        blockCount: Planted blocks that contributed to the forecast.
+        series: Per-chemical daily demand (chemicals with zero demand omitted).
+    """
+
+    farmId: UUID = Field(..., description="Farm identifier")
+    farmName: str = Field(..., description="Farm name")
+    blockCount: int = Field(..., ge=0, description="Contributing blocks")
+    series: List[DemandSeries] = Field(default_factory=list)
+
+
+class DemandForecastResponse(BaseModel):
+    """
+    Day-by-day fertilizer demand across all planted blocks.
+
+    Args:
+        startDate: First forecast day.
+        days: Number of forecast days.
+        blockCount: Planted blocks that contributed to the forecast.
+        organization: Per-chemical daily demand summed over all farms.
+        farms: Per-farm breakdown.
+        warnings: Non-fatal issues (blocks without points, missing schedules).
+    """
+
+    startDate: date = Field(..., description="First forecast day")
+    days: int = Field(..., ge=1, description="Forecast horizon in days")
+    blockCount: int = Field(0, ge=0, description="Contributing blocks")
+    organization: List[DemandSeries] = Field(default_factory=list)
+    farms: List[FarmDemand] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)
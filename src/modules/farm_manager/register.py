@@ -7,8 +7,11 @@ by the plugin system to register this module with the main application.
 
 from fastapi import FastAPI
 import logging
+from functools import partial
 from typing import Optional
 
+from src.core.jobs import JobDefinition, get_job_runner
+
 from .api import api_router
 from .services.database import farm_db
 from .config.settings import settings
@@ -21,7 +24,7 @@ async def startup_hook():
     Module startup hook - Called when module is loaded
 
     This connects to the database and performs any necessary initialization,
-    including starting the weather cache background refresh.
+    including registering the module's background jobs with the job runner.
     """
     logger.info(
         f"[Farm Module] Starting {settings.MODULE_NAME} v{settings.MODULE_VERSION}"
@@ -34,58 +37,99 @@ async def startup_hook():
         logger.error(f"[Farm Module] Failed to connect to database: {e}")
         raise
 
-    # Initialize weather cache service with background refresh
+    # Background jobs run on the platform's leader-elected job runner
+    # (src.core.jobs), which main.py starts once every module has registered.
+    # Registration only — no worker starts its own loop.
+    runner = get_job_runner()
+    db = farm_db.get_database()
+
+    # Weather cache refresh (hourly)
     try:
         from .services.weather.weather_cache_service import WeatherCacheService
 
-        db = farm_db.get_database()
         weather_cache = await WeatherCacheService.initialize(db)
-
-        # Start background refresh (every hour = 3600 seconds)
-        await weather_cache.start_background_refresh(interval_seconds=3600)
-        logger.info(
-            "[Farm Module] Weather cache service initialized with hourly refresh"
-        )
+        runner.register(weather_cache.job_definition(interval_seconds=3600))
+        logger.info("[Farm Module] Weather cache refresh job registered (hourly)")
     except Exception as e:
         logger.error(f"[Farm Module] Failed to initialize weather cache: {e}")
         # Don't raise - weather cache is not critical for startup
 
-    # Initialize AI Dashboard scheduler with 4-hour inspection cycle
+    # AI Dashboard inspection (4-hour cycle)
     try:
         from .services.ai_dashboard.scheduler import AIDashboardScheduler
 
-        db = farm_db.get_database()
         ai_dashboard = await AIDashboardScheduler.initialize(db)
-        await ai_dashboard.start()
-        logger.info("[Farm Module] AI Dashboard scheduler started (4h interval)")
+        runner.register(ai_dashboard.job_definition())
+        logger.info("[Farm Module] AI Dashboard job registered (4h interval)")
     except Exception as e:
         logger.error(f"[Farm Module] Failed to initialize AI Dashboard scheduler: {e}")
         # Don't raise - AI Dashboard is not critical for startup
 
-    # Initialize Watchdog scheduler for periodic monitoring + Telegram notifications
+    # Watchdog checks + Telegram notifications (interval from DB config)
     try:
         from .services.watchdog.scheduler import WatchdogScheduler
 
-        db = farm_db.get_database()
         watchdog = await WatchdogScheduler.initialize(db)
-        await watchdog.start()
-        logger.info("[Farm Module] Watchdog scheduler started")
+        runner.register(watchdog.job_definition())
+        logger.info("[Farm Module] Watchdog job registered")
     except Exception as e:
         logger.error(f"[Farm Module] Failed to initialize Watchdog scheduler: {e}")
         # Don't raise - Watchdog is not critical for startup
 
-    # Initialize SenseHub Sync Service (every 3h, under the 4h watchdog stale threshold)
+    # SenseHub sync (every 3h, under the 4h watchdog stale threshold)
     try:
         from .services.sensehub.sync_service import SenseHubSyncService
 
-        db = farm_db.get_database()
         sensehub_sync = await SenseHubSyncService.initialize(db)
-        await sensehub_sync.start_background_sync(interval_seconds=10800)
-        logger.info("[Farm Module] SenseHub sync service started (3h interval)")
+        runner.register(sensehub_sync.job_definition(interval_seconds=10800))
+        logger.info("[Farm Module] SenseHub sync job registered (3h interval)")
     except Exception as e:
         logger.error(f"[Farm Module] Failed to initialize SenseHub sync: {e}")
         # Don't raise - SenseHub sync is not critical for startup
 
+    # Daily harvest aggregation at 23:00 UTC (was cron/run-harvest-aggregation.sh).
+    # Reason: catch_up=False — aggregation works on "today", so replaying a
+    # missed 23:00 run after midnight would aggregate the wrong day.
+    from .services.task.harvest_aggregator import HarvestAggregatorService
+
+    runner.register(
+        JobDefinition(
+            name="farm.harvest_aggregation",
+            func=HarvestAggregatorService.run_daily_aggregation,
+            cron="0 23 * * *",
+            catch_up=False,
+            description="Aggregate today's daily harvest tasks",
+        )
+    )
+
+    # AI context snapshots: hooked farm/block writes mark them dirty and chat
+    # requests rebuild on read; this repairs anything written around the hooks.
+    from .services.ai_context import rebuild_all_snapshots
+
+    runner.register(
+        JobDefinition(
+            name="farm.ai_context_repair",
+            func=partial(rebuild_all_snapshots, db),
+            interval_seconds=900,
+            description="Rebuild every AI chat context snapshot from farms and blocks",
+        )
+    )
+
+    # Expired harvest inventory -> waste.  Registered disabled (expiry is
+    # manual for now); POST /api/v1/admin/jobs/farm.inventory_expiry/run
+    # triggers it on the leader.
+    from .services.block.expiry_cron import process_expired_harvest_inventory
+
+    runner.register(
+        JobDefinition(
+            name="farm.inventory_expiry",
+            func=partial(process_expired_harvest_inventory, db),
+            cron="0 2 * * *",
+            enabled=False,
+            description="Move expired sellable harvest stock to waste",
+        )
+    )
+
 
 async def shutdown_hook():
     """
@@ -95,45 +139,8 @@ async def shutdown_hook():
     """
     logger.info("[Farm Module] Shutting down")
 
-    # Stop weather cache background refresh
-    try:
-        from .services.weather.weather_cache_service import get_weather_cache_service
-
-        weather_cache = get_weather_cache_service()
-        await weather_cache.stop_background_refresh()
-        logger.info("[Farm Module] Weather cache background refresh stopped")
-    except Exception as e:
-        logger.error(f"[Farm Module] Error stopping weather cache: {e}")
-
-    # Stop AI Dashboard scheduler
-    try:
-        from .services.ai_dashboard.scheduler import AIDashboardScheduler
-
-        ai_scheduler = AIDashboardScheduler.get_instance()
-        await ai_scheduler.stop()
-        logger.info("[Farm Module] AI Dashboard scheduler stopped")
-    except Exception as e:
-        logger.error(f"[Farm Module] Error stopping AI Dashboard scheduler: {e}")
-
-    # Stop Watchdog scheduler
-    try:
-        from .services.watchdog.scheduler import WatchdogScheduler
-
-        watchdog_scheduler = WatchdogScheduler.get_instance()
-        await watchdog_scheduler.stop()
-        logger.info("[Farm Module] Watchdog scheduler stopped")
-    except Exception as e:
-        logger.error(f"[Farm Module] Error stopping Watchdog scheduler: {e}")
-
-    # Stop SenseHub sync service
-    try:
-        from .services.sensehub.sync_service import SenseHubSyncService
-
-        sensehub_sync = SenseHubSyncService.get_instance()
-        await sensehub_sync.stop_background_sync()
-        logger.info("[Farm Module] SenseHub sync service stopped")
-    except Exception as e:
-        logger.error(f"[Farm Module] Error stopping SenseHub sync: {e}")
+    # Background jobs are stopped by main.py's shutdown handler (the job
+    # runner), before any database connection is closed.
 
     await farm_db.disconnect()
     logger.info("[Farm Module] Database disconnected")
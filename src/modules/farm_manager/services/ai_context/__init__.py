@@ -0,0 +1,24 @@
+"""
+AI Context Snapshots
+
+Incrementally maintained, prompt-ready farm summaries for the AI chat
+context builders.
+"""
+
+from .snapshot_service import (
+    get_farm_snapshot,
+    get_platform_snapshot,
+    mark_context_dirty,
+    rebuild_all_snapshots,
+    refresh_farm_snapshot,
+    refresh_platform_snapshot,
+)
+
+__all__ = [
+    "get_farm_snapshot",
+    "get_platform_snapshot",
+    "mark_context_dirty",
+    "rebuild_all_snapshots",
+    "refresh_farm_snapshot",
+    "refresh_platform_snapshot",
+]
@@ -0,0 +1,323 @@
+"""
+AI Context Snapshots
+
+Prompt-ready farm summaries for the AI chat system prompts (global, hub and
+farm-level).  Instead of scanning every farm and counting its blocks on each
+chat message, the rendered text is kept in ``ai_context_snapshots``:
+
+  - ``farm:<farmId>`` — one document per farm: identity, block counts, the
+    platform summary row and the farm-level block table.
+  - ``platform``      — the summary rows of every active farm plus totals.
+
+Write paths that change what a snapshot renders (farm and block writes,
+SenseHub connect/disconnect) call ``mark_context_dirty``, which stamps
+``markedAt`` on the farm and platform documents.  Readers rebuild a document
+whose ``markedAt`` is not older than its ``builtAt`` before returning it, so
+prompt assembly is one ``_id`` read in the steady state and never serves a
+summary that predates a hooked write.  The ``farm.ai_context_repair`` job
+rebuilds everything periodically for writes that bypass the hooks.
+
+``version`` only increments when the rendered text changes, so a farm whose
+data did not change keeps a byte-identical prompt prefix between turns.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from src.core.indexes import declare_index
+
+from ..database import farm_db
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "ai_context_snapshots"
+PLATFORM_ID = "platform"
+
+declare_index(
+    COLLECTION, [("kind", 1), ("isActive", 1), ("farmName", 1)], name="kind_active"
+)
+
+# Reason: concurrent first requests after a mark would otherwise all rebuild
+# the platform summary at once.
+_platform_lock = asyncio.Lock()
+
+
+def _farm_key(farm_id: Any) -> str:
+    return f"farm:{farm_id}"
+
+
+def _is_stale(doc: Optional[dict]) -> bool:
+    """True when a snapshot is missing, never built, or marked since built."""
+    if not doc or "builtAt" not in doc:
+        return True
+    marked_at = doc.get("markedAt")
+    return marked_at is not None and marked_at >= doc["builtAt"]
+
+
+def _location_str(farm: dict) -> str:
+    location = farm.get("location", {})
+    if isinstance(location, dict):
+        city = location.get("city", "")
+        country = location.get("country", "")
+        return ", ".join(filter(None, [city, country])) or "Unknown"
+    return str(location) if location else "Unknown"
+
+
+def _sensehub_connected(block: dict) -> bool:
+    """Return True when a block has an enabled, connected SenseHub controller."""
+    iot = block.get("iotController") or {}
+    return bool(iot.get("enabled")) and iot.get("connectionStatus") == "connected"
+
+
+def _render_block_table(blocks: List[dict]) -> str:
+    if not blocks:
+        return "  No active blocks found on this farm."
+
+    rows: list[str] = []
+    for block in blocks:
+        block_code = block.get("blockCode", "?")
+        block_name = block.get("name", block_code)
+        state = block.get("state", "unknown")
+        block_type = block.get("blockType", "unknown")
+        crop_name = block.get("targetCropName", "—")
+        plant_count = block.get("actualPlantCount", 0) or 0
+        connected_flag = "YES" if _sensehub_connected(block) else "no"
+
+        rows.append(
+            f"  | {block_code:<12} | {block_name:<20} | {state:<12} | "
+            f"{block_type:<12} | {crop_name:<20} | {plant_count:>6} plants | "
+            f"SenseHub: {connected_flag}"
+        )
+
+    header = (
+        "  | BlockCode     | Name                 | State        | "
+        "Type         | Crop                 | Plants        | IoT"
+    )
+    return header + "\n" + "  " + "-" * 110 + "\n" + "\n".join(rows)
+
+
+def _render_farm(farm: dict, blocks: List[dict]) -> Dict[str, Any]:
+    """Snapshot fields for one farm and its active blocks (sorted by code)."""
+    farm_name = farm.get("name", "Unknown Farm")
+    location = _location_str(farm)
+    block_count = len(blocks)
+    connected_count = sum(1 for b in blocks if _sensehub_connected(b))
+
+    return {
+        "kind": "farm",
+        "farmId": farm.get("farmId"),
+        "organizationId": farm.get("organizationId"),
+        "isActive": bool(farm.get("isActive", True)),
+        "farmName": farm_name,
+        "location": location,
+        "totalArea": farm.get("totalArea", 0),
+        "areaUnit": farm.get("areaUnit", "sqm"),
+        "blockCount": block_count,
+        "connectedCount": connected_count,
+        "row": (
+            f"  - {farm_name} | {location} | {block_count} blocks | "
+            f"{connected_count} SenseHub-connected"
+        ),
+        "blockTable": _render_block_table(blocks),
+    }
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256("\x1f".join(map(str, parts)).encode()).hexdigest()
+
+
+async def _store(
+    db,
+    key: str,
+    fields: Dict[str, Any],
+    digest: str,
+    built_at: datetime,
+    previous_digest: Optional[str],
+) -> Dict[str, Any]:
+    """Write a rebuilt snapshot, bumping ``version`` only if its text changed."""
+    update: Dict[str, Any] = {
+        "$set": {**fields, "contentHash": digest, "builtAt": built_at}
+    }
+    if digest != previous_digest:
+        update["$inc"] = {"version": 1}
+    await db[COLLECTION].update_one({"_id": key}, update, upsert=True)
+    return await db[COLLECTION].find_one({"_id": key})
+
+
+async def mark_context_dirty(db, farm_ids: Iterable[Any]) -> None:
+    """
+    Flag the snapshots of ``farm_ids`` (and the platform summary) for rebuild.
+
+    Never raises: a stale AI prompt must not fail the write that caused it.
+
+    Args:
+        db: Motor database handle
+        farm_ids: Farm IDs (UUID or str) whose blocks or farm document changed
+    """
+    now = datetime.utcnow()
+    try:
+        for farm_id in {str(f) for f in farm_ids if f}:
+            await db[COLLECTION].update_one(
+                {"_id": _farm_key(farm_id)},
+                {
+                    "$set": {"markedAt": now},
+                    "$setOnInsert": {"kind": "farm", "farmId": farm_id},
+                },
+                upsert=True,
+            )
+        await db[COLLECTION].update_one(
+            {"_id": PLATFORM_ID}, {"$set": {"markedAt": now}}
+        )
+    except Exception as e:
+        logger.warning(f"[AI Context] Could not mark snapshots dirty: {e}")
+
+
+async def refresh_farm_snapshot(db, farm_id: Any) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild one farm's snapshot from the farm and its active blocks.
+
+    Returns:
+        The stored snapshot, or None (and the snapshot removed) if the farm
+        no longer exists.
+    """
+    built_at = datetime.utcnow()
+    key = _farm_key(farm_id)
+
+    farm = await db.farms.find_one({"farmId": str(farm_id)})
+    if not farm:
+        await db[COLLECTION].delete_one({"_id": key})
+        return None
+
+    blocks = (
+        await db.blocks.find({"farmId": str(farm_id), "isActive": True})
+        .sort("blockCode", 1)
+        .to_list(length=None)
+    )
+    fields = _render_farm(farm, blocks)
+    previous = await db[COLLECTION].find_one({"_id": key}, {"contentHash": 1})
+    return await _store(
+        db,
+        key,
+        fields,
+        _digest(fields),
+        built_at,
+        (previous or {}).get("contentHash"),
+    )
+
+
+async def refresh_platform_snapshot(db) -> Dict[str, Any]:
+    """Rebuild stale farm snapshots, then the platform summary from all farms."""
+    built_at = datetime.utcnow()
+    collection = db[COLLECTION]
+
+    stale = await collection.find(
+        {"kind": "farm", "$expr": {"$gte": ["$markedAt", "$builtAt"]}},
+        {"farmId": 1},
+    ).to_list(length=None)
+    for doc in stale:
+        await refresh_farm_snapshot(db, doc["farmId"])
+
+    farms = (
+        await collection.find(
+            {"kind": "farm", "isActive": True},
+            {"row": 1, "blockCount": 1, "connectedCount": 1},
+        )
+        .sort("farmName", 1)
+        .to_list(length=None)
+    )
+
+    fields = {
+        "kind": "platform",
+        "farmCount": len(farms),
+        "blockCount": sum(f.get("blockCount", 0) for f in farms),
+        "connectedCount": sum(f.get("connectedCount", 0) for f in farms),
+        "summary": "\n".join(f["row"] for f in farms),
+    }
+    previous = await collection.find_one({"_id": PLATFORM_ID}, {"contentHash": 1})
+    return await _store(
+        db,
+        PLATFORM_ID,
+        fields,
+        _digest(fields),
+        built_at,
+        (previous or {}).get("contentHash"),
+    )
+
+
+async def rebuild_all_snapshots(db) -> Dict[str, Any]:
+    """
+    Rebuild every farm snapshot and the platform summary.
+
+    Reads all farms and all active blocks in one pass each (no farm cap),
+    drops snapshots of farms that no longer exist, and returns the platform
+    snapshot.  Used on first use and by the ``farm.ai_context_repair`` job.
+    """
+    built_at = datetime.utcnow()
+    collection = db[COLLECTION]
+
+    blocks_by_farm: Dict[str, List[dict]] = defaultdict(list)
+    async for block in db.blocks.find({"isActive": True}).sort(
+        [("farmId", 1), ("blockCode", 1)]
+    ):
+        blocks_by_farm[block.get("farmId")].append(block)
+
+    previous = {
+        doc["_id"]: doc.get("contentHash")
+        async for doc in collection.find({"kind": "farm"}, {"contentHash": 1})
+    }
+
+    farm_ids: List[str] = []
+    async for farm in db.farms.find({}):
+        farm_id = farm.get("farmId")
+        if not farm_id:
+            continue
+        farm_ids.append(farm_id)
+        fields = _render_farm(farm, blocks_by_farm.get(farm_id, []))
+        key = _farm_key(farm_id)
+        await _store(db, key, fields, _digest(fields), built_at, previous.get(key))
+
+    await collection.delete_many({"kind": "farm", "farmId": {"$nin": farm_ids}})
+    logger.info(f"[AI Context] Rebuilt snapshots for {len(farm_ids)} farm(s)")
+    return await refresh_platform_snapshot(db)
+
+
+async def get_platform_snapshot() -> Dict[str, Any]:
+    """
+    Return the platform summary snapshot, rebuilding it first if stale.
+
+    Keys: ``summary`` (one row per active farm, sorted by name),
+    ``farmCount``, ``blockCount``, ``connectedCount``, ``version``.
+    """
+    db = farm_db.get_database()
+    doc = await db[COLLECTION].find_one({"_id": PLATFORM_ID})
+    if not _is_stale(doc):
+        return doc
+
+    async with _platform_lock:
+        doc = await db[COLLECTION].find_one({"_id": PLATFORM_ID})
+        if doc is None or "builtAt" not in doc:
+            return await rebuild_all_snapshots(db)
+        if _is_stale(doc):
+            return await refresh_platform_snapshot(db)
+        return doc
+
+
+async def get_farm_snapshot(farm_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Return one farm's snapshot, rebuilding it first if stale.
+
+    Returns:
+        Snapshot dict (``farmName``, ``location``, ``totalArea``,
+        ``areaUnit``, ``blockCount``, ``connectedCount``, ``blockTable``,
+        ``version``), or None if the farm does not exist.
+    """
+    db = farm_db.get_database()
+    doc = await db[COLLECTION].find_one({"_id": _farm_key(farm_id)})
+    if _is_stale(doc):
+        doc = await refresh_farm_snapshot(db, farm_id)
+    return doc
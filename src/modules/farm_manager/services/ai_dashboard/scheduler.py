@@ -1,14 +1,16 @@
 """
 AI Dashboard Scheduler
 
-Runs automated farm inspections every 4 hours in a background asyncio task.
+Runs automated farm inspections every 4 hours via the platform job runner
+(src.core.jobs), so only the elected leader worker inspects.
 Follows the singleton pattern established by WeatherCacheService.
 """
 
-import asyncio
 import logging
 from typing import Optional
 
+from src.core.jobs import JobDefinition
+
 from .service import AIDashboardService
 
 logger = logging.getLogger(__name__)
@@ -18,25 +20,18 @@ class AIDashboardScheduler:
     """
     Singleton background scheduler for periodic AI Dashboard inspections.
 
-    Starts one asyncio task that waits 60 seconds after app startup (to allow
-    full initialisation), runs an initial inspection, then repeats every 4 hours.
-
     Usage::
 
         # In app startup:
         scheduler = await AIDashboardScheduler.initialize(db)
-        await scheduler.start()
-
-        # In app shutdown:
-        await AIDashboardScheduler.get_instance().stop()
+        get_job_runner().register(scheduler.job_definition())
     """
 
     INTERVAL_SECONDS: int = 4 * 3600  # 4 hours
+    JOB_NAME: str = "farm.ai_dashboard_inspection"
 
     _instance: Optional["AIDashboardScheduler"] = None
     _db = None
-    _task: Optional[asyncio.Task] = None
-    _is_running: bool = False
 
     # -------------------------------------------------------------------------
     # Singleton access
@@ -57,7 +52,7 @@ class AIDashboardScheduler:
     @classmethod
     async def initialize(cls, db) -> "AIDashboardScheduler":
         """
-        Initialise the scheduler with a database connection and create indexes.
+        Initialise the scheduler with a database connection and declare indexes.
 
         Args:
             db: Motor async MongoDB database instance.
@@ -68,86 +63,44 @@ class AIDashboardScheduler:
         instance = cls.get_instance()
         instance._db = db
 
-        # Reason: Ensure collection indexes exist before first inspection run
-        await AIDashboardService._create_indexes(db)
+        # Reason: declared here, reconciled once per boot by src.core.indexes
+        AIDashboardService._declare_indexes()
 
         logger.info("[AIDashboardScheduler] Initialised")
         return instance
 
     # -------------------------------------------------------------------------
-    # Lifecycle
+    # Job runner integration
     # -------------------------------------------------------------------------
 
-    async def start(self) -> None:
+    async def run_once(self) -> dict:
         """
-        Start the background inspection loop.
-
-        Idempotent — calling start() when already running has no effect.
+        Run one scheduled inspection.
 
         Returns:
-            None
+            Short summary of the stored report for the job run log.
         """
-        if self._is_running:
-            logger.warning("[AIDashboardScheduler] Already running, skipping start()")
-            return
-
-        self._is_running = True
-
-        async def run_loop() -> None:
-            """
-            Background loop: initial inspection after startup delay, then periodic.
-            """
-            logger.info(
-                f"[AIDashboardScheduler] Started "
-                f"(interval={self.INTERVAL_SECONDS}s)"
-            )
-
-            # Wait for the app to finish starting up before the first run
-            await asyncio.sleep(60)
-
-            # Initial inspection
-            try:
-                service = AIDashboardService(self._db)
-                await service.run_inspection(triggered_by="scheduler_startup")
-            except Exception as exc:
-                logger.error(f"[AIDashboardScheduler] Initial inspection failed: {exc}")
-
-            while self._is_running:
-                try:
-                    await asyncio.sleep(self.INTERVAL_SECONDS)
-
-                    if not self._is_running:
-                        break
-
-                    service = AIDashboardService(self._db)
-                    await service.run_inspection(triggered_by="scheduler")
-
-                except asyncio.CancelledError:
-                    logger.info("[AIDashboardScheduler] Task cancelled")
-                    break
-                except Exception as exc:
-                    logger.error(f"[AIDashboardScheduler] Inspection error: {exc}")
-                    # Reason: Wait before retrying to avoid tight failure loops
-                    await asyncio.sleep(300)
-
-        self._task = asyncio.create_task(run_loop())
-        logger.info("[AIDashboardScheduler] Background task created")
-
-    async def stop(self) -> None:
+        service = AIDashboardService(self._db)
+        report = await service.run_inspection(triggered_by="scheduler")
+        return {
+            "reportId": report.reportId,
+            "status": report.status,
+            "durationSeconds": report.durationSeconds,
+        }
+
+    def job_definition(self) -> JobDefinition:
         """
-        Stop the background inspection loop gracefully.
+        Job definition for src.core.jobs: first run 60s after boot (to allow
+        full initialisation), then every 4 hours on the elected leader only.
 
         Returns:
-            None
+            JobDefinition for the AI Dashboard inspection.
         """
-        self._is_running = False
-
-        if self._task is not None:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
-
-        logger.info("[AIDashboardScheduler] Stopped")
+        return JobDefinition(
+            name=self.JOB_NAME,
+            func=self.run_once,
+            interval_seconds=self.INTERVAL_SECONDS,
+            startup_delay_seconds=60,
+            jitter_seconds=60,
+            description="AI Dashboard farm inspection",
+        )
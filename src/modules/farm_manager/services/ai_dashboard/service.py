@@ -9,6 +9,8 @@ import logging
 from datetime import datetime
 from typing import List, Optional, Tuple
 
+from src.core.indexes import declare_index
+
 from .data_collector import DataCollector
 from .models import DashboardReport, InspectionRawData
 from .report_generator import ReportGenerator
@@ -36,43 +38,40 @@ class AIDashboardService:
     # -------------------------------------------------------------------------
 
     @staticmethod
-    async def _create_indexes(db) -> None:
+    def _declare_indexes() -> None:
         """
-        Create MongoDB indexes for the ai_dashboard_reports collection.
+        Declare MongoDB indexes for the ai_dashboard_reports collection.
 
-        Creates:
+        Declares:
           - Unique index on reportId
           - TTL index on startedAt (30-day retention)
           - Compound index on status + completedAt for fast latest-report queries
 
-        Args:
-            db: Motor async MongoDB database instance.
-
         Returns:
             None
         """
         try:
-            collection = db[COLLECTION_NAME]
-
             # Unique index on reportId for safe upserts
-            await collection.create_index("reportId", unique=True)
+            declare_index(COLLECTION_NAME, "reportId", unique=True)
 
             # TTL index: auto-expire reports older than 30 days
-            await collection.create_index(
+            declare_index(
+                COLLECTION_NAME,
                 "startedAt",
                 expireAfterSeconds=2592000,  # 30 days
                 name="ttl_startedAt",
             )
 
             # Compound index to support get_latest() query
-            await collection.create_index(
+            declare_index(
+                COLLECTION_NAME,
                 [("status", 1), ("completedAt", -1)],
                 name="status_completedAt",
             )
 
-            logger.info("[AIDashboardService] MongoDB indexes created")
+            logger.info("[AIDashboardService] MongoDB indexes declared")
         except Exception as exc:
-            logger.error(f"[AIDashboardService] Index creation error: {exc}")
+            logger.error(f"[AIDashboardService] Index declaration error: {exc}")
             # Non-fatal: indexes are optional for correctness
 
     # -------------------------------------------------------------------------
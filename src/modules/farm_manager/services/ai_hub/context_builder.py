@@ -7,85 +7,47 @@ Builds section-specific system prompts for each of the four Hub personalities:
   - Report:   Structured report generation at any level of detail (read-only).
   - Advise:   Agricultural advisory using sensor data + expert knowledge (read-only).
 
-All sections share a platform-wide farm summary table loaded fresh from MongoDB.
+All sections share a platform-wide farm summary table read from the AI
+context snapshot (services.ai_context).
 """
 
 import logging
 from datetime import datetime
 
-from ..database import farm_db
+from ..ai_context import get_platform_snapshot
 
 logger = logging.getLogger(__name__)
 
 
 async def _build_platform_farm_summary() -> str:
     """
-    Load all active farms and produce a markdown-style summary table.
+    Produce the platform farm summary from the AI context snapshot.
 
-    Returns a multi-line string listing each farm with its location,
-    block count, and number of SenseHub-connected blocks.
+    Returns a multi-line string listing each active farm with its location,
+    block count, and number of SenseHub-connected blocks, plus totals.
 
     Returns:
         Farm summary string to embed in system prompts.
     """
-    db = farm_db.get_database()
-
-    farms_cursor = db.farms.find({"isActive": True})
-    farms = await farms_cursor.to_list(length=500)
-
-    if not farms:
+    snapshot = await get_platform_snapshot()
+    if not snapshot.get("farmCount"):
         return "  (No active farms found in the platform)"
 
-    rows: list[str] = []
-    total_blocks = 0
-    total_connected = 0
-
-    for farm in farms:
-        farm_id_str = farm.get("farmId", "")
-        farm_name = farm.get("name", "Unknown Farm")
-
-        location = farm.get("location", {})
-        if isinstance(location, dict):
-            city = location.get("city", "")
-            country = location.get("country", "")
-            location_str = ", ".join(filter(None, [city, country])) or "Unknown"
-        else:
-            location_str = str(location) if location else "Unknown"
-
-        block_count = await db.blocks.count_documents(
-            {"farmId": farm_id_str, "isActive": True}
-        )
-        connected_count = await db.blocks.count_documents(
-            {
-                "farmId": farm_id_str,
-                "isActive": True,
-                "iotController.enabled": True,
-                "iotController.connectionStatus": "connected",
-            }
-        )
-
-        total_blocks += block_count
-        total_connected += connected_count
-
-        rows.append(
-            f"  - {farm_name} | {location_str} | "
-            f"{block_count} blocks | {connected_count} SenseHub-connected"
-        )
-
-    rows.append(
-        f"\n  TOTALS: {len(farms)} farms | {total_blocks} blocks | "
-        f"{total_connected} SenseHub-connected"
+    return (
+        f"{snapshot['summary']}\n"
+        f"\n  TOTALS: {snapshot['farmCount']} farms | "
+        f"{snapshot.get('blockCount', 0)} blocks | "
+        f"{snapshot.get('connectedCount', 0)} SenseHub-connected"
     )
 
-    return "\n".join(rows)
-
 
 async def build_hub_system_prompt(section: str) -> str:
     """
     Build the section-specific system prompt for the AI Hub assistant.
 
-    Loads a live platform farm summary and combines it with the appropriate
-    role description and tool instructions for the requested section.
+    Reads the platform farm summary snapshot and combines it with the
+    appropriate role description and tool instructions for the requested
+    section.
 
     Args:
         section: One of "control", "monitor", "report", "advise".
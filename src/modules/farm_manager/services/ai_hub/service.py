@@ -30,6 +30,7 @@ from vertexai.generative_models import (
 )
 
 from src.config.settings import settings
+from src.core.ai_tools import ToolCall, ToolRuntime, invalidate_tool_results
 from ..database import farm_db
 from ..sensehub import SenseHubConnectionService
 from ..farm_ai.pending_actions import (
@@ -52,7 +53,12 @@ from ..farm_level_ai.tool_executor import (
     execute_read_tool as farm_level_execute_read_tool,
 )
 from .context_builder import build_hub_system_prompt
-from .tool_definitions import get_gemini_tools, WRITE_TOOL_NAMES, GLOBAL_TOOL_NAMES
+from .tool_definitions import (
+    TOOL_SPECS,
+    get_gemini_tools,
+    WRITE_TOOL_NAMES,
+    GLOBAL_TOOL_NAMES,
+)
 from .models import AIHubChatResponse, AIHubSection
 from ..farm_ai.models import PendingAction
 
@@ -61,6 +67,8 @@ logger = logging.getLogger(__name__)
 # Maximum tool-use loop iterations to prevent runaway Gemini loops
 MAX_TOOL_ROUNDS = 5
 
+_tool_runtime = ToolRuntime("ai_hub", TOOL_SPECS)
+
 
 def _init_vertexai() -> None:
     """
@@ -146,6 +154,41 @@ def _describe_hub_write_action(tool_name: str, tool_input: dict) -> tuple[str, s
     return f"{prefix} Execute {tool_name}", "high"
 
 
+async def _execute_hub_read_tool(call: ToolCall) -> dict:
+    """
+    Route a hub read tool to the executor that implements it.
+
+    Global read tools go to the global_ai executor, which accepts
+    (farm_name, block_code) parameter patterns. Farm-level read tools need a
+    farm_id UUID, resolved from the farm_name parameter; without one, the
+    global executor is tried as a best-effort fallback (it can handle tools
+    like get_block_automations that exist only at farm level).
+
+    Args:
+        call: The read tool call.
+
+    Returns:
+        Tool execution result as a plain dict.
+    """
+    if call.name in GLOBAL_TOOL_NAMES:
+        return await global_execute_tool(tool_name=call.name, tool_input=call.input)
+
+    farm_name_param = call.input.get("farm_name", "")
+    if not farm_name_param:
+        return await global_execute_tool(tool_name=call.name, tool_input=call.input)
+
+    try:
+        farm_id_str, _ = await resolve_farm_by_name(farm_name_param)
+        return await farm_level_execute_read_tool(
+            farm_id=UUID(farm_id_str),
+            tool_name=call.name,
+            tool_input=call.input,
+        )
+    except (ValueError, Exception) as e:
+        logger.warning(f"Farm-level read tool '{call.name}' failed: {e}")
+        return {"error": str(e)}
+
+
 class AIHubService:
     """
     Orchestrates Vertex AI Gemini API calls for the unified AI Hub interface.
@@ -161,6 +204,8 @@ class AIHubService:
         conversation_history: list[dict],
         section: AIHubSection,
         user_id: str,
+        organization_id: Optional[str] = None,
+        user_role: Optional[str] = None,
     ) -> AIHubChatResponse:
         """
         Process a user chat message through the AI Hub for the given section.
@@ -177,6 +222,8 @@ class AIHubService:
              - Global read tools: execute via global_ai tool executor.
              - Farm-level read tools: resolve farm_id first, then execute via
                farm_level_ai executor (only for tools that require a farm scope).
+             - A round's read tools run concurrently through the shared tool
+               runtime.
           8. Log to ai_hub_chat_log collection in MongoDB.
           9. Return AIHubChatResponse.
 
@@ -184,7 +231,10 @@ class AIHubService:
             message: User's chat message.
             conversation_history: Previous messages as [{role, content}, ...].
             section: Hub section ("control", "monitor", "report", "advise").
-            user_id: Authenticated user ID (used for logging only).
+            user_id: Current user ID (logging and the tool result cache key).
+            organization_id: Scope of the shared tool result cache; without
+                one tool results are not cached.
+            user_role: Current user's role (tool result cache key).
 
         Returns:
             AIHubChatResponse with message, section, optional pending_action,
@@ -233,6 +283,7 @@ class AIHubService:
         )
 
         tools_used: list[str] = []
+        tool_calls_log: list[dict] = []
         pending_action: Optional[PendingAction] = None
         final_text = ""
 
@@ -257,14 +308,35 @@ class AIHubService:
                     # No more tool calls — extract final text and exit loop
                     break
 
+                # Reason: Gemini returns a MapComposite; cast to plain dict
+                # so downstream code can .get() / iterate it normally.
+                calls = [
+                    ToolCall(
+                        name=fc_part.function_call.name,
+                        input=dict(fc_part.function_call.args),
+                    )
+                    for fc_part in function_calls
+                ]
+                tools_used.extend(call.name for call in calls)
+
+                # Read tools: execute now, concurrently. Write tools never run
+                # here — they become pending actions below.
+                outcomes = await _tool_runtime.run(
+                    [c for c in calls if c.name not in WRITE_TOOL_NAMES],
+                    _execute_hub_read_tool,
+                    scope=organization_id,
+                    user_id=user_id,
+                    role=user_role,
+                )
+                tool_calls_log.extend(outcome.to_log() for outcome in outcomes)
+                read_results = iter(outcome.result for outcome in outcomes)
+
+                # Build the responses in the order Gemini asked for them
                 function_responses: list[Part] = []
 
-                for fc_part in function_calls:
-                    tool_name: str = fc_part.function_call.name
-                    # Reason: Gemini returns a MapComposite; cast to plain dict
-                    # so downstream code can .get() / iterate it normally.
-                    tool_input: dict = dict(fc_part.function_call.args)
-                    tools_used.append(tool_name)
+                for call in calls:
+                    tool_name = call.name
+                    tool_input = call.input
 
                     if tool_name in WRITE_TOOL_NAMES:
                         # Write tool: resolve farm + block, store pending action.
@@ -313,56 +385,11 @@ class AIHubService:
                             )
                         )
 
-                    elif tool_name in GLOBAL_TOOL_NAMES:
-                        # Global read tool: execute via global_ai executor which
-                        # accepts (farm_name, block_code) parameter patterns.
-                        result = await global_execute_tool(
-                            tool_name=tool_name,
-                            tool_input=tool_input,
-                        )
-
-                        function_responses.append(
-                            Part.from_function_response(
-                                name=tool_name,
-                                response=result,
-                            )
-                        )
-
                     else:
-                        # Farm-level read tool: these require a farm_id UUID.
-                        # Resolve the farm from the farm_name parameter if present,
-                        # otherwise fall back to the global executor which can handle
-                        # tools like get_block_automations that exist only at farm level.
-                        farm_name_param = tool_input.get("farm_name", "")
-
-                        if farm_name_param:
-                            try:
-                                farm_id_str, _ = await resolve_farm_by_name(
-                                    farm_name_param
-                                )
-                                farm_uuid = UUID(farm_id_str)
-                                result = await farm_level_execute_read_tool(
-                                    farm_id=farm_uuid,
-                                    tool_name=tool_name,
-                                    tool_input=tool_input,
-                                )
-                            except (ValueError, Exception) as e:
-                                logger.warning(
-                                    f"Farm-level read tool '{tool_name}' failed: {e}"
-                                )
-                                result = {"error": str(e)}
-                        else:
-                            # No farm_name in input — attempt global executor
-                            # as a best-effort fallback
-                            result = await global_execute_tool(
-                                tool_name=tool_name,
-                                tool_input=tool_input,
-                            )
-
                         function_responses.append(
                             Part.from_function_response(
                                 name=tool_name,
-                                response=result,
+                                response=next(read_results),
                             )
                         )
 
@@ -419,6 +446,7 @@ class AIHubService:
                     "userMessage": message,
                     "assistantMessage": final_text,
                     "toolsUsed": tools_used,
+                    "toolCalls": tool_calls_log,
                     "hasPendingAction": pending_action is not None,
                     "timestamp": datetime.utcnow(),
                 }
@@ -512,6 +540,8 @@ class AIHubService:
                 tool_name=action_data["tool_name"],
                 tool_input=action_data["tool_input"],
             )
+            # Cached tool results in every chat may now be stale.
+            invalidate_tool_results()
 
             # Refresh cached token if using HTTP client (MCP clients skip this)
             try:
@@ -17,8 +17,12 @@ Key design decisions:
 
 from vertexai.generative_models import FunctionDeclaration, Tool
 
+from src.core.ai_tools import SideEffect, ToolSpec
+
 from ..global_ai.tool_definitions import GLOBAL_READ_TOOLS
+from ..global_ai.tool_definitions import TOOL_SPECS as GLOBAL_TOOL_SPECS
 from ..farm_level_ai.tool_definitions import READ_TOOLS as FARM_LEVEL_READ_TOOLS
+from ..farm_level_ai.tool_definitions import TOOL_SPECS as FARM_LEVEL_TOOL_SPECS
 from ..farm_level_ai.tool_definitions import WRITE_TOOLS as FARM_LEVEL_WRITE_TOOLS
 
 # ---------------------------------------------------------------------------
@@ -79,6 +83,18 @@ WRITE_TOOL_NAMES: set[str] = {t["name"] for t in HUB_WRITE_TOOLS}
 # Set of global read tool names for routing to the global executor
 GLOBAL_TOOL_NAMES: set[str] = {t["name"] for t in GLOBAL_READ_TOOLS}
 
+# Side-effect class and shared result-cache TTL per hub tool — the spec of
+# whichever executor serves the tool (src/core/ai_tools).
+TOOL_SPECS = (
+    GLOBAL_TOOL_SPECS
+    + [
+        spec
+        for spec in FARM_LEVEL_TOOL_SPECS
+        if spec.side_effect is SideEffect.READ and spec.name not in GLOBAL_TOOL_NAMES
+    ]
+    + [ToolSpec(name, SideEffect.WRITE) for name in sorted(WRITE_TOOL_NAMES)]
+)
+
 
 def get_gemini_tools(section: str) -> list[Tool]:
     """
@@ -30,6 +30,7 @@ from ...models.block_analytics import (
 from .block_repository_new import BlockRepository
 from .harvest_repository import HarvestRepository
 from .alert_repository import AlertRepository
+from ..task.task_repository import TaskRepository
 from ..plant_data.plant_data_enhanced_repository import PlantDataEnhancedRepository
 from ..database import farm_db
 
@@ -392,21 +393,23 @@ class BlockAnalyticsService:
         """Calculate task analytics"""
         logger.info(f"[Analytics] Calculating task analytics for block {block.blockId}")
 
-        db = farm_db.get_database()
-
-        # Build query for tasks related to this block
-        query: Dict[str, Any] = {"blockId": str(block.blockId)}
-
-        # Add date filters if specified
-        if start_date or end_date:
-            query["scheduledDate"] = {}
-            if start_date:
-                query["scheduledDate"]["$gte"] = start_date
-            if end_date:
-                query["scheduledDate"]["$lte"] = end_date
-
-        # Get all tasks
-        tasks = await db.farm_tasks.find(query).to_list(length=1000)
+        # Get all tasks related to this block (stored tasks and recurring
+        # series occurrences), as documents; end_date is inclusive
+        tasks = [
+            {
+                **task.model_dump(),
+                "status": task.status.value,
+                "taskType": task.taskType.value,
+            }
+            for task in await TaskRepository.list_by_block(
+                block.blockId,
+                scheduled_from=start_date,
+                scheduled_to=(
+                    end_date + timedelta(microseconds=1) if end_date else None
+                ),
+                limit=1000,
+            )
+        ]
 
         logger.info(f"[Analytics] Found {len(tasks)} tasks")
 
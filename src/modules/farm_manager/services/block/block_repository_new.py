@@ -26,6 +26,9 @@ from ...models.block import (
     StatusChange,
     BlockKPI,
 )
+from src.core.sequences import Counter, CounterNotFoundError, next_value
+
+from ..ai_context import mark_context_dirty
 from ..database import farm_db
 
 # Plant Library Phase 2: resolving a planted variety -> its mother product,
@@ -43,25 +46,27 @@ class BlockRepository:
 
     @staticmethod
     async def get_next_sequence_number(farm_id: UUID) -> int:
-        """Get next sequence number for a farm's blocks (atomic operation)"""
-        db = farm_db.get_database()
+        """
+        Get next sequence number for a farm's blocks (atomic operation).
 
-        # Use findOneAndUpdate with atomic increment
-        result = await db.farms.find_one_and_update(
-            {"farmId": str(farm_id)},
-            {"$inc": {"nextBlockSequence": 1}},
-            return_document=True,
+        The counter is the farm's own ``nextBlockSequence`` field. It is not
+        prefetched: block codes are few per farm and read in order, so a
+        worker block's unused numbers would show up as jumps in them.
+        """
+        db = farm_db.get_database()
+        counter = Counter(
+            "farms", {"farmId": str(farm_id)}, "nextBlockSequence", upsert=False
         )
 
-        if not result or "nextBlockSequence" not in result:
+        try:
+            return await next_value(db, counter)
+        except CounterNotFoundError:
             # Initialize if not exists
             await db.farms.update_one(
                 {"farmId": str(farm_id)}, {"$set": {"nextBlockSequence": 2}}
             )
             return 1
 
-        return result["nextBlockSequence"]
-
     @staticmethod
     async def get_farm_code(farm_id: UUID) -> str:
         """Get farm code for generating block codes"""
@@ -191,6 +196,7 @@ class BlockRepository:
         if not result.inserted_id:
             raise Exception("Failed to create block")
 
+        await mark_context_dirty(db, [farm_id])
         logger.info(f"[Block Repository] Created block: {block.blockId} ({block_code})")
         return block
 
@@ -345,7 +351,10 @@ class BlockRepository:
             return None
 
         logger.info(f"[Block Repository] Updated block: {block_id}")
-        return await BlockRepository.get_by_id(block_id)
+        block = await BlockRepository.get_by_id(block_id)
+        if block:
+            await mark_context_dirty(db, [block.farmId])
+        return block
 
     @staticmethod
     async def update_status(
@@ -490,6 +499,7 @@ class BlockRepository:
         if result.matched_count == 0:
             return None
 
+        await mark_context_dirty(db, [current_block.farmId])
         logger.info(
             f"[Block Repository] Updated block status: {block_id} -> {new_status.value}"
         )
@@ -641,7 +651,21 @@ class BlockRepository:
         if result.matched_count == 0:
             return None
 
-        # Recalculate efficiency from the updated values
+        updated_block = await BlockRepository.refresh_yield_efficiency(block_id)
+
+        logger.info(
+            f"[Block Repository] Incremented block KPI: {block_id} "
+            f"(yield: {yield_kg_delta:+.2f} kg, harvests: {harvest_count_delta:+d})"
+        )
+        return updated_block
+
+    @staticmethod
+    async def refresh_yield_efficiency(block_id: UUID) -> Optional[Block]:
+        """
+        Recalculate kpi.yieldEfficiencyPercent from the stored actual and
+        predicted yield (after an $inc of actualYieldKg).
+        """
+        db = farm_db.get_database()
         updated_block = await BlockRepository.get_by_id(block_id)
         if updated_block and updated_block.kpi.predictedYieldKg > 0:
             efficiency = (
@@ -652,11 +676,6 @@ class BlockRepository:
                 {"$set": {"kpi.yieldEfficiencyPercent": round(efficiency, 2)}},
             )
             updated_block = await BlockRepository.get_by_id(block_id)
-
-        logger.info(
-            f"[Block Repository] Incremented block KPI: {block_id} "
-            f"(yield: {yield_kg_delta:+.2f} kg, harvests: {harvest_count_delta:+d})"
-        )
         return updated_block
 
     @staticmethod
@@ -698,14 +717,16 @@ class BlockRepository:
         """Soft delete a block"""
         db = farm_db.get_database()
 
-        result = await db.blocks.update_one(
+        deleted = await db.blocks.find_one_and_update(
             {"blockId": str(block_id)},
             {"$set": {"isActive": False, "updatedAt": datetime.utcnow()}},
+            projection={"farmId": 1},
         )
 
-        if result.matched_count == 0:
+        if deleted is None:
             return False
 
+        await mark_context_dirty(db, [deleted.get("farmId")])
         logger.info(f"[Block Repository] Soft deleted block: {block_id}")
         return True
 
@@ -843,6 +864,7 @@ class BlockRepository:
         if not result.inserted_id:
             raise Exception("Failed to create virtual block")
 
+        await mark_context_dirty(db, [parent.farmId])
         logger.info(
             f"[Block Repository] Created virtual block: {virtual_block.blockId} ({block_code})"
         )
@@ -869,7 +891,7 @@ class BlockRepository:
         """
         db = farm_db.get_database()
 
-        result = await db.blocks.update_one(
+        parent = await db.blocks.find_one_and_update(
             {"blockId": str(parent_id), "isActive": True},
             {
                 "$inc": {"availableArea": -allocated_area},
@@ -880,11 +902,14 @@ class BlockRepository:
                 },
                 "$push": {"childBlockIds": child_id},
             },
+            projection={"farmId": 1},
         )
 
-        if result.matched_count == 0:
+        if parent is None:
             raise Exception(f"Failed to update parent block: {parent_id}")
 
+        await mark_context_dirty(db, [parent.get("farmId")])
+
         logger.info(
             f"[Block Repository] Updated parent {parent_id}: "
             f"allocated {allocated_area} to child {child_id}, counter={new_counter}"
@@ -992,9 +1017,12 @@ class BlockRepository:
         """
         db = farm_db.get_database()
 
-        result = await db.blocks.delete_one({"blockId": str(block_id)})
+        deleted = await db.blocks.find_one_and_delete(
+            {"blockId": str(block_id)}, projection={"farmId": 1}
+        )
 
-        if result.deleted_count > 0:
+        if deleted is not None:
+            await mark_context_dirty(db, [deleted.get("farmId")])
             logger.info(f"[Block Repository] Hard deleted block: {block_id}")
             return True
         else:
@@ -423,36 +423,28 @@ class BlockService:
         # PHASE 3: Check for pending tasks that should trigger this state change
         # Warn user if they're manually changing status when tasks exist that would do it automatically
         if not status_update.force:
-            from ..database import farm_db
-
-            db = farm_db.get_database()
+            from ..task.task_repository import TaskRepository
+            from ...models.farm_task import TaskStatus
 
             # Query for pending tasks that would trigger this state transition
-            pending_tasks = await db.farm_tasks.find(
-                {
-                    "blockId": str(block_id),
-                    "status": "pending",
-                    "triggerStateChange": new_status.value,
-                }
-            ).to_list(length=100)
+            # (stored tasks and recurring series occurrences)
+            pending_tasks = await TaskRepository.list_by_block(
+                block_id,
+                status=TaskStatus.PENDING,
+                trigger_state_change=new_status.value,
+                limit=100,
+            )
 
             if pending_tasks:
                 # Format task list for error message
                 task_list = []
                 for task in pending_tasks:
-                    task_title = task.get("title", task.get("taskType", "Unknown task"))
-                    task_type = task.get("taskType", "unknown")
-                    scheduled = task.get("scheduledDate", "Not scheduled")
                     task_list.append(
                         {
-                            "taskId": task["taskId"],
-                            "title": task_title,
-                            "taskType": task_type,
-                            "scheduledDate": (
-                                scheduled.isoformat()
-                                if isinstance(scheduled, datetime)
-                                else str(scheduled)
-                            ),
+                            "taskId": str(task.taskId),
+                            "title": task.title or task.taskType.value,
+                            "taskType": task.taskType.value,
+                            "scheduledDate": task.scheduledDate.isoformat(),
                         }
                     )
 
@@ -468,15 +460,17 @@ class BlockService:
         else:
             # PHASE 3: When force=true, auto-complete all pending tasks for this block
             # since we're manually overriding the workflow
-            from ..database import farm_db
+            from ..task.task_repository import TaskRepository
             from ...models.farm_task import TaskStatus, TaskData
 
-            db = farm_db.get_database()
+            # Recurring series end here: their future occurrences read as
+            # cancelled, the ones already due are completed below
+            await TaskRepository.cancel_series_for_block(block_id)
 
             # Find ALL pending tasks for this block (not just ones that trigger new state)
-            all_pending_tasks = await db.farm_tasks.find(
-                {"blockId": str(block_id), "status": "pending"}
-            ).to_list(length=100)
+            all_pending_tasks = await TaskRepository.list_by_block(
+                block_id, status=TaskStatus.PENDING, limit=100
+            )
 
             if all_pending_tasks:
                 logger.info(
@@ -486,26 +480,17 @@ class BlockService:
 
                 # Auto-complete each task
                 for task in all_pending_tasks:
-                    task_id = task["taskId"]
-                    task_title = task.get("title", "Unknown task")
-
-                    # Update task to completed status
-                    await db.farm_tasks.update_one(
-                        {"taskId": task_id},
-                        {
-                            "$set": {
-                                "status": TaskStatus.COMPLETED.value,
-                                "completedBy": str(user_id),
-                                "completedByEmail": user_email,
-                                "completedAt": datetime.utcnow(),
-                                "taskData": {
-                                    "notes": f"Auto-completed due to manual state transition from {current_block.state.value} to {new_status.value}",
-                                    "photoUrls": [],
-                                    "triggerTransition": False,
-                                },
-                                "updatedAt": datetime.utcnow(),
-                            }
-                        },
+                    task_id = task.taskId
+                    task_title = task.title or "Unknown task"
+
+                    # Update task to completed status (materializes occurrences)
+                    await TaskRepository.complete_task(
+                        task_id,
+                        user_id,
+                        user_email,
+                        TaskData(
+                            notes=f"Auto-completed due to manual state transition from {current_block.state.value} to {new_status.value}",
+                        ),
                     )
 
                     logger.info(
@@ -1082,32 +1067,25 @@ class BlockService:
         Returns:
             Number of tasks auto-completed
         """
-        from ..database import farm_db
+        from ..task.task_repository import TaskRepository
         from ...models.farm_task import TaskType, TaskStatus
 
-        db = farm_db.get_database()
+        # The daily harvest series ends here: occurrences from now on read as
+        # cancelled, the ones already due are completed below
+        await TaskRepository.cancel_series_for_block(block_id, [TaskType.DAILY_HARVEST])
 
         # Find all pending daily harvest tasks for this block
-        pending_tasks = await db.farm_tasks.find(
-            {
-                "blockId": str(block_id),
-                "taskType": TaskType.DAILY_HARVEST.value,
-                "status": TaskStatus.PENDING.value,
-            }
-        ).to_list(length=1000)
+        pending_tasks = await TaskRepository.list_by_block(
+            block_id,
+            status=TaskStatus.PENDING,
+            task_type=TaskType.DAILY_HARVEST,
+            limit=1000,
+        )
 
         auto_completed_count = 0
 
         for task in pending_tasks:
-            task_id = task["taskId"]
-
-            # Auto-complete the task with a note explaining why
-            update_data = {
-                "status": TaskStatus.COMPLETED.value,
-                "completedAt": datetime.utcnow(),
-                "completedBy": str(user_id),
-                "updatedAt": datetime.utcnow(),
-            }
+            task_id = task.taskId
 
             # Add completion note explaining auto-completion
             auto_complete_note = (
@@ -1115,24 +1093,24 @@ class BlockService:
                 f"Harvesting period ended. Completed by {user_email}."
             )
 
-            # Preserve existing notes and add auto-completion note
-            if "taskData" not in task or task["taskData"] is None:
-                task["taskData"] = {}
-
-            existing_notes = task["taskData"].get("notes", "")
-            if existing_notes:
-                update_data["taskData.notes"] = (
-                    f"{existing_notes}\n\n{auto_complete_note}"
-                )
-            else:
-                update_data["taskData.notes"] = auto_complete_note
+            # Preserve existing notes and harvest entries
+            existing_notes = task.taskData.notes
+            task_data = task.taskData.model_copy(
+                update={
+                    "notes": (
+                        f"{existing_notes}\n\n{auto_complete_note}"
+                        if existing_notes
+                        else auto_complete_note
+                    )
+                }
+            )
 
-            # Update the task
-            result = await db.farm_tasks.update_one(
-                {"taskId": task_id}, {"$set": update_data}
+            # Update the task (materializes series occurrences)
+            completed = await TaskRepository.complete_task(
+                task_id, user_id, user_email, task_data
             )
 
-            if result.modified_count > 0:
+            if completed:
                 auto_completed_count += 1
                 logger.info(
                     f"[Block Service] Auto-completed task {task_id} for block {block_id}"
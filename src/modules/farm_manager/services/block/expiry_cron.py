@@ -8,145 +8,391 @@ and still carry availableQuantity > 0.  For each such row the job:
   2. Zeroes availableQuantity on the inventory_harvest row.
   3. Appends an inventory_movements audit record.
 
-This is invoked at 02:00 UTC every day by the cron service via the
-POST /api/v1/farm/inventory/admin/process-expired endpoint.
+Rows are processed in batches (keyset-paginated on inventoryId): one
+``insert_many`` for waste, one for movements and one ``bulk_write`` for the
+harvest updates, inside a single transaction per batch when the server
+supports it (replica set / mongos).
+
+Crash safety / no double expiry
+-------------------------------
+- Each harvest update is conditional on the ``availableQuantity`` that was
+  read, so a row is only zeroed once.  If any row changed under us the batch
+  transaction is aborted and the batch re-read.
+- The same update bumps the row's ``expiryCount``.  wasteId and
+  movementId are derived from ``inventoryId + expiryCount`` (uuid5), both
+  unique-indexed: records written twice (recovery after a crash) are
+  duplicate-key no-ops, while a row that is restocked and expires again —
+  even with the same date and quantity — gets fresh ids.
+- Without transactions (standalone mongod) the harvest update also sets a
+  ``pendingExpiry`` claim; the records are written only for rows whose
+  claim landed, then the claim is cleared.  The next run first completes
+  any claim a crashed run left behind.
+
+This runs as the ``farm.inventory_expiry`` job (src.core.jobs) or on demand
+via POST /api/v1/farm/inventory/admin/process-expired.
 """
 
+import time
 from datetime import datetime
-from typing import Optional
-from uuid import uuid4
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import NAMESPACE_URL, uuid5
 import logging
 
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
 from ...models.inventory import WasteSourceType, DisposalMethod
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_ATTEMPTS = 3
+
+# Mongo duplicate-key error code
+_DUPLICATE_KEY = 11000
+
+# Claim marker on inventory_harvest used when transactions are unavailable
+PENDING_FIELD = "pendingExpiry"
+
+
+class _BatchConflict(Exception):
+    """A harvest row changed between read and update; retry the batch."""
+
+
+def _expiry_key(inv: dict) -> str:
+    # Reason: expiryCount is bumped by the update that zeroes the row, so
+    # every expiry event of a row gets its own ids, while a re-run after a
+    # crash (update not applied, or claim recovered) maps to the same ones.
+    # Date and quantity alone collide when a return restores the same stock.
+    return f"{inv.get('inventoryId')}:{inv.get('expiryCount') or 0}"
+
+
+def expiry_waste_id(inv: dict) -> str:
+    """Deterministic wasteId for expiring ``inv`` (same on every re-run)."""
+    return str(uuid5(NAMESPACE_URL, f"a64:expiry-waste:{_expiry_key(inv)}"))
+
+
+def expiry_movement_id(inv: dict) -> str:
+    """Deterministic movementId for expiring ``inv``."""
+    return str(uuid5(NAMESPACE_URL, f"a64:expiry-movement:{_expiry_key(inv)}"))
+
+
+def _build_docs(
+    inv: dict, now_iso: str, extra_set: Optional[dict] = None
+) -> Tuple[dict, dict, UpdateOne]:
+    """Waste doc, movement doc and conditional harvest update for one row."""
+    expired_qty = inv.get("availableQuantity", 0)
+    inventory_id = inv.get("inventoryId", "unknown")
+    waste_id = expiry_waste_id(inv)
+
+    # 1. Waste record — raw dict so we don't depend on the Pydantic model's
+    #    required fields (recordedBy is System=None here).
+    waste_doc = {
+        "wasteId": waste_id,
+        "organizationId": inv.get("organizationId"),
+        "farmId": inv.get("farmId"),
+        "sourceType": WasteSourceType.EXPIRED.value,
+        "sourceInventoryId": inventory_id,
+        "sourceOrderId": None,
+        "sourceReturnId": None,
+        "sourceBlockId": inv.get("blockId"),
+        "plantName": inv.get("plantName", "Unknown"),
+        "variety": inv.get("variety"),
+        "quantity": expired_qty,
+        "unit": inv.get("unit", "kg"),
+        "originalGrade": inv.get("qualityGrade"),
+        "wasteReason": (
+            f"Auto-moved from sellable stock — expiry {inv.get('expiryDate')}"
+        ),
+        "wasteDate": now_iso,
+        "disposalMethod": DisposalMethod.PENDING.value,
+        "disposalDate": None,
+        "disposalNotes": None,
+        "estimatedValue": None,
+        "currency": inv.get("currency", "AED"),
+        "notes": None,
+        # System-generated; no human user — recordedBy is absent
+        # (field is required on WasteInventory Pydantic model but
+        # we bypass Pydantic here to allow system-driven inserts).
+        "recordedBy": None,
+        "divisionId": inv.get("divisionId"),
+        "createdAt": now_iso,
+        "updatedAt": now_iso,
+    }
+
+    # 2. Zero availableQuantity; reduce quantity by the expired amount so the
+    #    total stored qty stays accurate.  Conditional on the qty and the
+    #    expiry count we read.
+    prior_qty = inv.get("quantity", expired_qty)
+    update = UpdateOne(
+        {
+            "inventoryId": inventory_id,
+            "availableQuantity": expired_qty,
+            "expiryCount": inv.get("expiryCount"),
+        },
+        {
+            "$set": {
+                "quantity": max(0.0, prior_qty - expired_qty),
+                "availableQuantity": 0,
+                "updatedAt": now_iso,
+                **(extra_set or {}),
+            },
+            "$inc": {"expiryCount": 1},
+        },
+    )
+
+    # 3. Audit movement record
+    movement_doc = {
+        "movementId": expiry_movement_id(inv),
+        "inventoryId": inventory_id,
+        "inventoryType": "harvest",
+        "movementType": "waste",
+        "quantityBefore": expired_qty,
+        "quantityChange": -expired_qty,
+        "quantityAfter": 0,
+        "organizationId": inv.get("organizationId"),
+        "reason": f"Expired — auto-moved to waste (wasteId={waste_id})",
+        "referenceId": waste_id,
+        "performedBy": None,  # System
+        "performedAt": now_iso,
+    }
+    return waste_doc, movement_doc, update
+
+
+async def _insert_idempotent(collection, docs: List[dict]) -> int:
+    """insert_many that treats duplicate keys (an earlier run) as done."""
+    if not docs:
+        return 0
+    try:
+        result = await collection.insert_many(docs, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(e.get("code") != _DUPLICATE_KEY for e in errors):
+            raise
+        return exc.details.get("nInserted", 0)
+
+
+async def supports_transactions(db) -> bool:
+    """True when connected to a replica set member or mongos."""
+    try:
+        hello = await db.command("hello")
+    except Exception:
+        return False
+    return bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+
+
+async def _expire_batch_transactional(db, rows: List[dict], now_iso: str) -> int:
+    """
+    Expire one batch in a single transaction.  Returns the rows moved.
+
+    Raises:
+        _BatchConflict: A row changed since it was read (transaction aborted).
+    """
+    built = [_build_docs(inv, now_iso) for inv in rows]
+
+    try:
+        async with await db.client.start_session() as session:
+            async with session.start_transaction():
+                result = await db.inventory_harvest.bulk_write(
+                    [u for _, _, u in built], ordered=False, session=session
+                )
+                if result.matched_count != len(built):
+                    # Reason: raising inside start_transaction() aborts it, so
+                    # none of this batch's writes become visible.
+                    raise _BatchConflict()
+                # Reason: plain insert_many — a duplicate key inside a
+                # transaction aborts it server-side, so it cannot be skipped.
+                await db.inventory_waste.insert_many(
+                    [w for w, _, _ in built], ordered=False, session=session
+                )
+                await db.inventory_movements.insert_many(
+                    [m for _, m, _ in built], ordered=False, session=session
+                )
+        return result.modified_count
+    except OperationFailure as exc:
+        # WriteConflict with another writer on the same rows — retryable.
+        if exc.has_error_label("TransientTransactionError"):
+            raise _BatchConflict() from exc
+        raise
+
 
-async def process_expired_harvest_inventory(db) -> dict:
+async def _complete_claimed(db, rows: List[dict], now_iso: str) -> int:
+    """Write waste/movement records for claimed rows, then release the claim."""
+    if not rows:
+        return 0
+    built = [_build_docs(inv, now_iso) for inv in rows]
+    await _insert_idempotent(db.inventory_waste, [w for w, _, _ in built])
+    await _insert_idempotent(db.inventory_movements, [m for _, m, _ in built])
+    await db.inventory_harvest.update_many(
+        {"inventoryId": {"$in": [inv["inventoryId"] for inv in rows]}},
+        {"$unset": {PENDING_FIELD: ""}},
+    )
+    return len(rows)
+
+
+async def _expire_batch_claimed(db, rows: List[dict], now_iso: str) -> int:
+    """
+    Expire one batch without transactions: zero the rows and leave a
+    ``pendingExpiry`` claim in the same update, then write the records and
+    clear the claim.  A crash in between is finished by
+    ``_recover_pending_expiries`` on the next run.
+    """
+    claims = []
+    for inv in rows:
+        claim = {
+            PENDING_FIELD: {
+                "wasteId": expiry_waste_id(inv),
+                "availableQuantity": inv.get("availableQuantity", 0),
+                "quantity": inv.get("quantity", inv.get("availableQuantity", 0)),
+                "expiryCount": inv.get("expiryCount"),
+            }
+        }
+        claims.append(_build_docs(inv, now_iso, extra_set=claim)[2])
+    await db.inventory_harvest.bulk_write(claims, ordered=False)
+
+    # Only rows whose conditional update matched carry our claim.
+    claimed_ids = {
+        doc["inventoryId"]
+        for doc in await db.inventory_harvest.find(
+            {
+                "inventoryId": {"$in": [inv["inventoryId"] for inv in rows]},
+                f"{PENDING_FIELD}.wasteId": {
+                    "$in": [expiry_waste_id(inv) for inv in rows]
+                },
+            },
+            {"_id": 0, "inventoryId": 1},
+        ).to_list(length=None)
+    }
+    return await _complete_claimed(
+        db, [inv for inv in rows if inv["inventoryId"] in claimed_ids], now_iso
+    )
+
+
+async def _recover_pending_expiries(db, now_iso: str) -> int:
+    """Finish claims left behind by a run that crashed (non-transactional)."""
+    pending = await db.inventory_harvest.find(
+        {PENDING_FIELD: {"$exists": True}}
+    ).to_list(length=None)
+    rows = [
+        {
+            **row,
+            "availableQuantity": row[PENDING_FIELD]["availableQuantity"],
+            "quantity": row[PENDING_FIELD]["quantity"],
+            "expiryCount": row[PENDING_FIELD].get("expiryCount"),
+        }
+        for row in pending
+    ]
+    recovered = await _complete_claimed(db, rows, now_iso)
+    if recovered:
+        logger.warning(f"[Expiry Cron] Recovered {recovered} interrupted expiries")
+    return recovered
+
+
+async def process_expired_harvest_inventory(
+    db,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_transactions: Optional[bool] = None,
+) -> dict:
     """
     Find all inventory_harvest rows whose expiryDate has passed and still have
-    availableQuantity > 0, then move them to inventory_waste.
+    availableQuantity > 0, then move them to inventory_waste in batches.
 
     Args:
         db: AsyncIOMotorDatabase instance (e.g. from farm_db.get_database()).
+        batch_size: Rows per batch / transaction.
+        use_transactions: Force transactions on/off; None auto-detects.
 
     Returns:
         Dict with keys:
-          - moved: number of rows processed
-          - skipped: number of rows skipped due to zero/negative qty
-          - errors: number of rows that raised an exception
+          - moved: number of rows moved to waste
+          - skipped: rows whose stock changed or was already expired by a
+            concurrent run
+          - errors: number of rows in batches that failed
+          - batches, durationSeconds, rowsPerSecond: throughput
     """
+    started = time.perf_counter()
     now = datetime.utcnow()
     now_iso = now.isoformat()
+    if use_transactions is None:
+        use_transactions = await supports_transactions(db)
 
     # Match rows that have an expiryDate in the past AND still hold sellable stock.
     # expiryDate is stored as an ISO-8601 string ("YYYY-MM-DD" or full datetime).
     # Lexicographic comparison works correctly for ISO-8601 date strings.
-    cursor = db.inventory_harvest.find(
-        {
-            "expiryDate": {"$lte": now_iso, "$ne": None, "$exists": True},
-            "availableQuantity": {"$gt": 0},
-        }
-    )
+    base_query: Dict[str, Any] = {
+        "expiryDate": {"$lte": now_iso, "$ne": None, "$exists": True},
+        "availableQuantity": {"$gt": 0},
+    }
 
-    moved = 0
+    moved = 0 if use_transactions else await _recover_pending_expiries(db, now_iso)
     skipped = 0
     errors = 0
+    batches = 0
+    last_id: Optional[str] = None
+    expire_batch = (
+        _expire_batch_transactional if use_transactions else _expire_batch_claimed
+    )
 
-    async for inv in cursor:
-        expired_qty = inv.get("availableQuantity", 0)
-
-        if expired_qty <= 0:
-            # Race condition guard — another process may have zeroed it
-            skipped += 1
-            continue
-
-        inventory_id = inv.get("inventoryId", "unknown")
-
-        try:
-            waste_id = str(uuid4())
-
-            # 1. Build waste record — insert raw dict so we don't depend on the
-            #    Pydantic model's required fields (recordedBy is System=None here).
-            waste_doc = {
-                "wasteId": waste_id,
-                "organizationId": inv.get("organizationId"),
-                "farmId": inv.get("farmId"),
-                "sourceType": WasteSourceType.EXPIRED.value,
-                "sourceInventoryId": inventory_id,
-                "sourceOrderId": None,
-                "sourceReturnId": None,
-                "sourceBlockId": inv.get("blockId"),
-                "plantName": inv.get("plantName", "Unknown"),
-                "variety": inv.get("variety"),
-                "quantity": expired_qty,
-                "unit": inv.get("unit", "kg"),
-                "originalGrade": inv.get("qualityGrade"),
-                "wasteReason": (
-                    f"Auto-moved from sellable stock — expiry {inv.get('expiryDate')}"
-                ),
-                "wasteDate": now_iso,
-                "disposalMethod": DisposalMethod.PENDING.value,
-                "disposalDate": None,
-                "disposalNotes": None,
-                "estimatedValue": None,
-                "currency": inv.get("currency", "AED"),
-                "notes": None,
-                # System-generated; no human user — recordedBy is absent
-                # (field is required on WasteInventory Pydantic model but
-                # we bypass Pydantic here to allow system-driven inserts).
-                "recordedBy": None,
-                "divisionId": inv.get("divisionId"),
-                "createdAt": now_iso,
-                "updatedAt": now_iso,
-            }
-            await db.inventory_waste.insert_one(waste_doc)
-
-            # 2. Zero availableQuantity; reduce quantity by the expired amount
-            #    so the total stored qty stays accurate.
-            prior_qty = inv.get("quantity", expired_qty)
-            await db.inventory_harvest.update_one(
-                {"inventoryId": inventory_id},
-                {
-                    "$set": {
-                        "quantity": max(0.0, prior_qty - expired_qty),
-                        "availableQuantity": 0,
-                        "updatedAt": now_iso,
-                    }
-                },
-            )
-
-            # 3. Audit movement record
-            movement_doc = {
-                "movementId": str(uuid4()),
-                "inventoryId": inventory_id,
-                "inventoryType": "harvest",
-                "movementType": "waste",
-                "quantityBefore": expired_qty,
-                "quantityChange": -expired_qty,
-                "quantityAfter": 0,
-                "organizationId": inv.get("organizationId"),
-                "reason": f"Expired — auto-moved to waste (wasteId={waste_id})",
-                "referenceId": waste_id,
-                "performedBy": None,  # System
-                "performedAt": now_iso,
-            }
-            await db.inventory_movements.insert_one(movement_doc)
-
-            moved += 1
-            logger.info(
-                f"[Expiry Cron] Moved expired inventory {inventory_id} "
-                f"({expired_qty} {inv.get('unit', 'kg')}) → waste {waste_id}"
-            )
+    while True:
+        query = dict(base_query)
+        if last_id is not None:
+            query["inventoryId"] = {"$gt": last_id}
+        rows = (
+            await db.inventory_harvest.find(query)
+            .sort("inventoryId", ASCENDING)
+            .limit(batch_size)
+            .to_list(length=batch_size)
+        )
+        if not rows:
+            break
+        batches += 1
+        last_id = rows[-1]["inventoryId"]
 
-        except Exception as exc:
-            errors += 1
-            logger.error(
-                f"[Expiry Cron] Failed to process inventory {inventory_id}: {exc}",
-                exc_info=True,
-            )
+        for attempt in range(1, MAX_BATCH_ATTEMPTS + 1):
+            try:
+                count = await expire_batch(db, rows, now_iso)
+                moved += count
+                skipped += len(rows) - count
+                break
+            except _BatchConflict:
+                # Re-read just this batch's rows; anything no longer expired
+                # (sold, expired by a concurrent run) drops out.
+                ids = [r["inventoryId"] for r in rows]
+                fresh = await db.inventory_harvest.find(
+                    {**base_query, "inventoryId": {"$in": ids}}
+                ).to_list(length=len(ids))
+                skipped += len(rows) - len(fresh)
+                rows = fresh
+                if not rows:
+                    break
+                if attempt == MAX_BATCH_ATTEMPTS:
+                    errors += len(rows)
+                    logger.error(
+                        f"[Expiry Cron] Batch ending {last_id} kept conflicting; "
+                        f"{len(rows)} rows left for the next run"
+                    )
+            except (OperationFailure, BulkWriteError) as exc:
+                errors += len(rows)
+                logger.error(
+                    f"[Expiry Cron] Batch ending {last_id} failed: {exc}",
+                    exc_info=True,
+                )
+                break
 
+    duration = time.perf_counter() - started
+    stats = {
+        "moved": moved,
+        "skipped": skipped,
+        "errors": errors,
+        "batches": batches,
+        "transactional": use_transactions,
+        "durationSeconds": round(duration, 3),
+        "rowsPerSecond": round(moved / duration, 1) if duration > 0 else None,
+    }
     logger.info(
-        f"[Expiry Cron] Completed — moved={moved}, skipped={skipped}, errors={errors}"
+        f"[Expiry Cron] Completed — moved={moved}, skipped={skipped}, "
+        f"errors={errors}, batches={batches}, "
+        f"{stats['rowsPerSecond']} rows/s"
     )
-    return {"moved": moved, "skipped": skipped, "errors": errors}
+    return stats
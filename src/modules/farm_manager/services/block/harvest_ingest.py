@@ -0,0 +1,209 @@
+"""
+Harvest Batch Ingestion
+
+Writes a validated multi-line harvest submission (see
+HarvestService.submit_harvest_batch) in a fixed number of round trips,
+whatever its line count: every block_harvests, inventory_harvest,
+inventory_movements, processing_inventory and inventory_waste document is
+built in memory beforehand and written with one ``insert_many`` per
+collection, and the block KPI gets one aggregated ``$inc`` — all inside a
+single transaction when the server supports it (replica set / mongos), so a
+submission lands completely or not at all.
+
+Idempotency
+-----------
+Offline field devices resubmit when they never saw the response, so a
+submission may carry an idempotency key.  The harvestBatchId is then derived
+from block + key (uuid5), every record id from the batch id and the line
+position, and the submission is stored in ``harvest_submissions`` (_id =
+harvestBatchId) together with its response:
+
+- same key again: the stored response is returned and nothing is written;
+- same key, different lines: 409;
+- two concurrent submissions with one key: the second transaction fails on
+  the submission _id and replays the first.
+
+Without transactions (standalone mongod) the submission is first claimed as
+``pending``, the records are inserted with duplicate keys ignored (so a retry
+after a crash completes them), and exactly one caller flips the claim to
+``complete`` and applies the KPI ``$inc``.  Submissions are kept for
+``SUBMISSION_TTL_SECONDS`` (TTL index on createdAt).
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from uuid import NAMESPACE_URL, UUID, uuid5
+import logging
+
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from .expiry_cron import _insert_idempotent, supports_transactions
+
+logger = logging.getLogger(__name__)
+
+SUBMISSIONS_COLLECTION = "harvest_submissions"
+SUBMISSION_TTL_SECONDS = 30 * 24 * 3600  # replay window for field devices
+
+MAX_ATTEMPTS = 3
+
+# Server capability, resolved on first use
+_transactions_supported: Optional[bool] = None
+
+
+def submission_batch_id(block_id: UUID, idempotency_key: str) -> UUID:
+    """Deterministic harvestBatchId for a keyed submission on a block."""
+    return uuid5(NAMESPACE_URL, f"a64:harvest-batch:{block_id}:{idempotency_key}")
+
+
+def line_record_id(batch_id: UUID, line_index: int, kind: str) -> UUID:
+    """Deterministic id of one record written for line ``line_index``."""
+    return uuid5(NAMESPACE_URL, f"a64:harvest-line:{batch_id}:{line_index}:{kind}")
+
+
+def payload_fingerprint(request) -> str:
+    """Hash of a submission's content (everything but the key itself)."""
+    payload = request.model_dump_json(exclude={"idempotencyKey"})
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class HarvestIngestPlan:
+    """Every document one submission writes, plus its block KPI delta."""
+
+    block_id: UUID
+    harvests: List[dict] = field(default_factory=list)
+    inventory: List[dict] = field(default_factory=list)
+    movements: List[dict] = field(default_factory=list)
+    processing: List[dict] = field(default_factory=list)
+    waste: List[dict] = field(default_factory=list)
+    yield_kg: float = 0.0
+    harvest_count: int = 0
+
+    def collections(self) -> Iterator[Tuple[str, List[dict]]]:
+        for name, docs in (
+            ("block_harvests", self.harvests),
+            ("inventory_harvest", self.inventory),
+            ("inventory_movements", self.movements),
+            ("processing_inventory", self.processing),
+            ("inventory_waste", self.waste),
+        ):
+            if docs:
+                yield name, docs
+
+
+async def find_submission(db, batch_id: UUID) -> Optional[dict]:
+    """The stored submission for ``batch_id``, if any."""
+    return await db[SUBMISSIONS_COLLECTION].find_one({"_id": str(batch_id)})
+
+
+async def _apply_kpi(db, plan: HarvestIngestPlan, session=None) -> None:
+    if not plan.harvest_count:
+        return
+    kwargs = {"session": session} if session is not None else {}
+    await db.blocks.update_one(
+        {"blockId": str(plan.block_id), "isActive": True},
+        {
+            "$inc": {
+                "kpi.actualYieldKg": plan.yield_kg,
+                "kpi.totalHarvests": plan.harvest_count,
+            },
+            "$set": {"updatedAt": datetime.utcnow()},
+        },
+        **kwargs,
+    )
+
+
+async def _ingest_transactional(
+    db, plan: HarvestIngestPlan, submission: Optional[dict]
+) -> bool:
+    try:
+        async with await db.client.start_session() as session:
+            async with session.start_transaction():
+                if submission is not None:
+                    await db[SUBMISSIONS_COLLECTION].insert_one(
+                        {**submission, "status": "complete"}, session=session
+                    )
+                for name, docs in plan.collections():
+                    await db[name].insert_many(docs, session=session)
+                await _apply_kpi(db, plan, session=session)
+    except DuplicateKeyError:
+        # Reason: raising inside start_transaction() aborted it; the key was
+        # submitted concurrently and that submission won.
+        if submission is None:
+            raise
+        return False
+    return True
+
+
+async def _ingest_sequential(
+    db, plan: HarvestIngestPlan, submission: Optional[dict]
+) -> bool:
+    if submission is not None:
+        try:
+            await db[SUBMISSIONS_COLLECTION].insert_one(
+                {**submission, "status": "pending"}
+            )
+        except DuplicateKeyError:
+            existing = await find_submission(db, submission["_id"])
+            if existing and existing.get("status") == "complete":
+                return False
+            # Pending: an earlier attempt crashed (or is still running) —
+            # the inserts below are duplicate-safe, so finish it
+    for name, docs in plan.collections():
+        await _insert_idempotent(db[name], docs)
+    if submission is not None:
+        result = await db[SUBMISSIONS_COLLECTION].update_one(
+            {"_id": submission["_id"], "status": "pending"},
+            {"$set": {"status": "complete", "completedAt": datetime.utcnow()}},
+        )
+        if result.matched_count == 0:
+            return False  # a concurrent attempt completed it (and its KPI)
+    await _apply_kpi(db, plan)
+    return True
+
+
+async def ingest_harvest_batch(
+    db,
+    plan: HarvestIngestPlan,
+    submission: Optional[dict] = None,
+    use_transactions: Optional[bool] = None,
+) -> bool:
+    """
+    Write ``plan`` and record ``submission`` — in one transaction when the
+    server supports it, else duplicate-safe and resumable (module docstring).
+
+    Args:
+        db: Farm Motor database.
+        plan: Documents and KPI delta of the submission.
+        submission: harvest_submissions document for a keyed submission
+            (``_id`` = harvestBatchId, with its response); None otherwise.
+        use_transactions: Force transactions on/off; None auto-detects.
+
+    Returns:
+        True when written now, False when a submission with the same id had
+        already been written (nothing was written; replay the stored one).
+    """
+    global _transactions_supported
+    if use_transactions is None:
+        if _transactions_supported is None:
+            _transactions_supported = await supports_transactions(db)
+        use_transactions = _transactions_supported
+    if not use_transactions:
+        return await _ingest_sequential(db, plan, submission)
+
+    attempt = 1
+    while True:
+        try:
+            return await _ingest_transactional(db, plan, submission)
+        except OperationFailure as exc:
+            # WriteConflict on the block KPI with a concurrent submission
+            if attempt == MAX_ATTEMPTS or not exc.has_error_label(
+                "TransientTransactionError"
+            ):
+                raise
+        logger.info(
+            f"[Harvest Ingest] Transaction retry {attempt} for block {plan.block_id}"
+        )
+        attempt += 1
@@ -21,6 +21,7 @@ from ...models.farming_year_config import (
     DEFAULT_FARMING_YEAR_START_MONTH,
 )
 from ..database import farm_db
+from src.core.finance.pnl_dirty import mark_pnl_months_dirty
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +59,67 @@ def _normalize_legacy_harvest(harvest_doc: dict) -> dict:
 class HarvestRepository:
     """Repository for BlockHarvest data access"""
 
+    @staticmethod
+    async def farming_year_start_month() -> int:
+        """Farming year start month from system_config (default when unset)."""
+        db = farm_db.get_database()
+        config_doc = await db.system_config.find_one(
+            {"configType": "farming_year_config"}
+        )
+        return (
+            config_doc.get("farmingYearStartMonth", DEFAULT_FARMING_YEAR_START_MONTH)
+            if config_doc
+            else DEFAULT_FARMING_YEAR_START_MONTH
+        )
+
+    @staticmethod
+    def build(
+        harvest_data: BlockHarvestCreate,
+        farm_id: UUID,
+        user_id: UUID,
+        user_email: str,
+        *,
+        start_month: int = DEFAULT_FARMING_YEAR_START_MONTH,
+        product_id: Optional[UUID] = None,
+        product_name: Optional[str] = None,
+        harvest_batch_id: Optional[UUID] = None,
+        harvest_id: Optional[UUID] = None,
+    ) -> BlockHarvest:
+        """
+        Build (not insert) a harvest record; farmingYear is derived from
+        harvestDate and ``start_month`` when the request omits it.
+        """
+        harvest_data_dict = harvest_data.model_dump()
+        if harvest_data_dict.get("farmingYear") is None:
+            harvest_data_dict["farmingYear"] = get_farming_year(
+                harvest_data.harvestDate, start_month
+            )
+        if harvest_id is not None:
+            harvest_data_dict["harvestId"] = harvest_id
+        return BlockHarvest(
+            **harvest_data_dict,
+            farmId=farm_id,
+            recordedBy=user_id,
+            recordedByEmail=user_email,
+            productId=product_id,
+            productName=product_name,
+            harvestBatchId=harvest_batch_id,
+        )
+
+    @staticmethod
+    def to_document(harvest: BlockHarvest) -> dict:
+        """Storage shape of a harvest record (UUIDs as strings)."""
+        harvest_dict = harvest.model_dump()
+        harvest_dict["harvestId"] = str(harvest_dict["harvestId"])
+        harvest_dict["blockId"] = str(harvest_dict["blockId"])
+        harvest_dict["farmId"] = str(harvest_dict["farmId"])
+        harvest_dict["recordedBy"] = str(harvest_dict["recordedBy"])
+        if harvest_dict.get("productId") is not None:
+            harvest_dict["productId"] = str(harvest_dict["productId"])
+        if harvest_dict.get("harvestBatchId") is not None:
+            harvest_dict["harvestBatchId"] = str(harvest_dict["harvestBatchId"])
+        return harvest_dict
+
     @staticmethod
     async def create(
         harvest_data: BlockHarvestCreate,
@@ -91,48 +153,27 @@ class HarvestRepository:
         farm_id = block["farmId"]
 
         # Auto-calculate farmingYear if not provided
-        harvest_data_dict = harvest_data.model_dump()
-        if harvest_data_dict.get("farmingYear") is None:
-            # Get farming year start month from config (if available in DB)
-            config_doc = await db.system_config.find_one(
-                {"configType": "farming_year_config"}
-            )
-            start_month = (
-                config_doc.get(
-                    "farmingYearStartMonth", DEFAULT_FARMING_YEAR_START_MONTH
-                )
-                if config_doc
-                else DEFAULT_FARMING_YEAR_START_MONTH
-            )
-            harvest_data_dict["farmingYear"] = get_farming_year(
-                harvest_data.harvestDate, start_month
-            )
-
-        # Create harvest document
-        harvest = BlockHarvest(
-            **harvest_data_dict,
-            farmId=UUID(farm_id),
-            recordedBy=user_id,
-            recordedByEmail=user_email,
-            productId=product_id,
-            productName=product_name,
-            harvestBatchId=harvest_batch_id,
+        start_month = DEFAULT_FARMING_YEAR_START_MONTH
+        if harvest_data.farmingYear is None:
+            start_month = await HarvestRepository.farming_year_start_month()
+
+        harvest = HarvestRepository.build(
+            harvest_data,
+            UUID(farm_id),
+            user_id,
+            user_email,
+            start_month=start_month,
+            product_id=product_id,
+            product_name=product_name,
+            harvest_batch_id=harvest_batch_id,
         )
-
-        harvest_dict = harvest.model_dump()
-        harvest_dict["harvestId"] = str(harvest_dict["harvestId"])
-        harvest_dict["blockId"] = str(harvest_dict["blockId"])
-        harvest_dict["farmId"] = str(harvest_dict["farmId"])
-        harvest_dict["recordedBy"] = str(harvest_dict["recordedBy"])
-        if harvest_dict.get("productId") is not None:
-            harvest_dict["productId"] = str(harvest_dict["productId"])
-        if harvest_dict.get("harvestBatchId") is not None:
-            harvest_dict["harvestBatchId"] = str(harvest_dict["harvestBatchId"])
+        harvest_dict = HarvestRepository.to_document(harvest)
 
         result = await db.block_harvests.insert_one(harvest_dict)
 
         if not result.inserted_id:
             raise Exception("Failed to create harvest record")
+        await mark_pnl_months_dirty(db, [harvest_dict.get("harvestDate")])
 
         logger.info(
             f"[Harvest Repository] Created harvest: {harvest.harvestId} for block {harvest.blockId} (farmingYear={harvest.farmingYear})"
@@ -257,12 +298,17 @@ class HarvestRepository:
         if not update_dict:
             return await HarvestRepository.get_by_id(harvest_id)
 
-        result = await db.block_harvests.update_one(
-            {"harvestId": str(harvest_id)}, {"$set": update_dict}
+        previous = await db.block_harvests.find_one_and_update(
+            {"harvestId": str(harvest_id)},
+            {"$set": update_dict},
+            projection={"harvestDate": 1},
         )
 
-        if result.matched_count == 0:
+        if previous is None:
             return None
+        await mark_pnl_months_dirty(
+            db, [previous.get("harvestDate"), update_dict.get("harvestDate")]
+        )
 
         logger.info(f"[Harvest Repository] Updated harvest: {harvest_id}")
         return await HarvestRepository.get_by_id(harvest_id)
@@ -272,10 +318,13 @@ class HarvestRepository:
         """Delete a harvest record"""
         db = farm_db.get_database()
 
-        result = await db.block_harvests.delete_one({"harvestId": str(harvest_id)})
+        deleted = await db.block_harvests.find_one_and_delete(
+            {"harvestId": str(harvest_id)}, projection={"harvestDate": 1}
+        )
 
-        if result.deleted_count == 0:
+        if deleted is None:
             return False
+        await mark_pnl_months_dirty(db, [deleted.get("harvestDate")])
 
         logger.info(f"[Harvest Repository] Deleted harvest: {harvest_id}")
         return True
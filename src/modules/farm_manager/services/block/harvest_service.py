@@ -43,9 +43,18 @@ from ...models.farming_year_config import (
     DEFAULT_FARMING_YEAR_START_MONTH,
 )
 from .harvest_repository import HarvestRepository
+from .harvest_ingest import (
+    HarvestIngestPlan,
+    find_submission,
+    ingest_harvest_batch,
+    line_record_id,
+    payload_fingerprint,
+    submission_batch_id,
+)
 from .block_repository_new import BlockRepository
 from ..database import farm_db
 from ..plant_data.plant_mother_repository import PlantMotherRepository
+from src.core.finance.pnl_dirty import mark_pnl_months_dirty
 
 logger = logging.getLogger(__name__)
 
@@ -163,6 +172,42 @@ class HarvestService:
         """
         db = farm_db.get_database()
 
+        # Use passed organization_id, or try to get from block/farm
+        org_id = organization_id
+        if not org_id:
+            org_id = getattr(block, "organizationId", None)
+        if not org_id:
+            # Fallback: try to get from farm
+            farm_doc = await db.farms.find_one({"farmId": str(harvest.farmId)})
+            if farm_doc:
+                org_id = farm_doc.get("organizationId")
+
+        inventory_doc, movement_doc = HarvestService._inventory_documents(
+            harvest, block, user_id, org_id, product_name_override
+        )
+        await db.inventory_harvest.insert_one(inventory_doc)
+        await db.inventory_movements.insert_one(movement_doc)
+
+        logger.info(
+            f"[Harvest Service] Created new harvest inventory batch: {inventory_doc['inventoryId']} "
+            f"({harvest.quantityKg}kg of {inventory_doc['plantName']})"
+        )
+
+    @staticmethod
+    def _inventory_documents(
+        harvest: BlockHarvest,
+        block,
+        user_id: UUID,
+        org_id: Optional[str],
+        product_name_override: Optional[str] = None,
+        *,
+        inventory_id: Optional[UUID] = None,
+        movement_id: Optional[UUID] = None,
+    ) -> Tuple[dict, dict]:
+        """
+        Build the inventory_harvest batch and its ADDITION movement for a
+        harvest (see _add_to_inventory).  Ids are generated unless given.
+        """
         # Map quality grade from BlockHarvest to Inventory
         inventory_grade = HarvestService._map_quality_grade(harvest.qualityGrade)
 
@@ -181,16 +226,6 @@ class HarvestService:
         plant_data_id = getattr(block, "targetCrop", None)
         product_type = "fresh"  # Default to fresh
 
-        # Use passed organization_id, or try to get from block/farm
-        org_id = organization_id
-        if not org_id:
-            org_id = getattr(block, "organizationId", None)
-        if not org_id:
-            # Fallback: try to get from farm
-            farm_doc = await db.farms.find_one({"farmId": str(harvest.farmId)})
-            if farm_doc:
-                org_id = farm_doc.get("organizationId")
-
         # Compute farmingYear from the harvest date so the Inventory module's
         # year filter matches new rows out of the box.
         harvest_date_dt = harvest.harvestDate
@@ -204,6 +239,7 @@ class HarvestService:
         # `expiryDate = harvest_date_dt + timedelta(days=shelfLifeDays)` here.
         # Currently expiryDate stays None until manually set on the row.
         inventory_item = HarvestInventory(
+            inventoryId=inventory_id or uuid4(),
             farmId=harvest.farmId,
             organizationId=org_id,
             inventoryScope=InventoryScope.FARM,  # Farm-specific inventory
@@ -231,12 +267,9 @@ class HarvestService:
             sourceHarvestId=harvest.harvestId,  # Link back to original harvest
         )
 
-        # Insert into inventory
-        doc = inventory_item.model_dump(mode="json")
-        await db.inventory_harvest.insert_one(doc)
-
         # Record movement (audit row for traceability)
         movement = InventoryMovement(
+            movementId=movement_id or uuid4(),
             inventoryId=inventory_item.inventoryId,
             inventoryType=InventoryType.HARVEST,
             movementType=MovementType.ADDITION,
@@ -249,11 +282,9 @@ class HarvestService:
             performedBy=user_id,
             performedAt=datetime.utcnow(),
         )
-        await db.inventory_movements.insert_one(movement.model_dump(mode="json"))
-
-        logger.info(
-            f"[Harvest Service] Created new harvest inventory batch: {inventory_item.inventoryId} "
-            f"({harvest.quantityKg}kg of {plant_name})"
+        return (
+            inventory_item.model_dump(mode="json"),
+            movement.model_dump(mode="json"),
         )
 
     @staticmethod
@@ -510,7 +541,24 @@ class HarvestService:
         All lines are validated up-front, before anything is written, so a
         single bad line rejects the whole submission rather than partially
         routing lines then failing partway through.
+
+        The submission is written in bulk (see harvest_ingest.py): every
+        record is built first, then inserted with one insert_many per
+        collection and one KPI $inc, in a single transaction. With
+        request.idempotencyKey set, a resubmission returns the original
+        response (replayed=True) instead of recording the harvest again.
         """
+        key = request.idempotencyKey
+        if key:
+            stored = await find_submission(
+                farm_db.get_database(), submission_batch_id(block_id, key)
+            )
+            if stored is not None:
+                replay = HarvestService._replay_submission(stored, farm_id, request)
+                # A pending one (standalone mongod, interrupted) is resumed below
+                if stored.get("status") == "complete":
+                    return replay
+
         block = await BlockRepository.get_by_id(block_id)
         if not block:
             raise HTTPException(404, f"Block not found: {block_id}")
@@ -589,43 +637,87 @@ class HarvestService:
                 detail="Could not resolve an organization for this block/user",
             )
 
-        harvest_batch_id = uuid4()
+        if key:
+            harvest_batch_id = submission_batch_id(block_id, key)
+        else:
+            harvest_batch_id = uuid4()
+        start_month = DEFAULT_FARMING_YEAR_START_MONTH
+        if request.farmingYear is None:
+            start_month = await HarvestRepository.farming_year_start_month()
+
+        plan = HarvestIngestPlan(block_id=block_id)
         results: List[HarvestBatchLineResult] = []
 
-        for line, product in resolved_lines:
+        for line_index, (line, product) in enumerate(resolved_lines):
             if product.category == ProductCategory.SELLABLE:
-                record_id = await HarvestService._route_sellable_line(
-                    block_id=block_id,
-                    request=request,
-                    line=line,
-                    product=product,
+                harvest = HarvestRepository.build(
+                    BlockHarvestCreate(
+                        blockId=block_id,
+                        harvestDate=request.harvestDate,
+                        quantityKg=line.quantity,
+                        qualityGrade=line.qualityGrade,
+                        notes=line.notes,
+                        farmingYear=request.farmingYear,
+                    ),
+                    farm_id,
+                    user_id,
+                    user_email,
+                    start_month=start_month,
+                    product_id=product.productId,
+                    product_name=product.name,
                     harvest_batch_id=harvest_batch_id,
-                    user_id=user_id,
-                    user_email=user_email,
+                    harvest_id=line_record_id(harvest_batch_id, line_index, "harvest"),
+                )
+                inventory_doc, movement_doc = HarvestService._inventory_documents(
+                    harvest,
+                    block,
+                    user_id,
+                    organization_id,
+                    product.name,
+                    inventory_id=line_record_id(
+                        harvest_batch_id, line_index, "inventory"
+                    ),
+                    movement_id=line_record_id(
+                        harvest_batch_id, line_index, "movement"
+                    ),
                 )
+                plan.harvests.append(HarvestRepository.to_document(harvest))
+                plan.inventory.append(inventory_doc)
+                plan.movements.append(movement_doc)
+                plan.yield_kg += line.quantity
+                plan.harvest_count += 1
+                record_id = harvest.harvestId
                 destination = "block_harvests"
             elif product.category == ProductCategory.PROCESS:
-                record_id = await HarvestService._route_process_line(
-                    block=block,
-                    farm_id=farm_id,
-                    request=request,
-                    line=line,
-                    product=product,
-                    harvest_batch_id=harvest_batch_id,
-                    organization_id=organization_id,
-                    user_id=user_id,
+                record_id = line_record_id(harvest_batch_id, line_index, "process")
+                plan.processing.append(
+                    HarvestService._processing_document(
+                        block=block,
+                        farm_id=farm_id,
+                        request=request,
+                        line=line,
+                        product=product,
+                        harvest_batch_id=harvest_batch_id,
+                        organization_id=organization_id,
+                        user_id=user_id,
+                        inventory_id=record_id,
+                    )
                 )
                 destination = "processing_inventory"
             else:  # ProductCategory.WASTE
-                record_id = await HarvestService._route_waste_line(
-                    block=block,
-                    farm_id=farm_id,
-                    request=request,
-                    line=line,
-                    product=product,
-                    harvest_batch_id=harvest_batch_id,
-                    organization_id=organization_id,
-                    user_id=user_id,
+                record_id = line_record_id(harvest_batch_id, line_index, "waste")
+                plan.waste.append(
+                    HarvestService._waste_document(
+                        block=block,
+                        farm_id=farm_id,
+                        request=request,
+                        line=line,
+                        product=product,
+                        harvest_batch_id=harvest_batch_id,
+                        organization_id=organization_id,
+                        user_id=user_id,
+                        waste_id=record_id,
+                    )
                 )
                 destination = "inventory_waste"
 
@@ -643,55 +735,69 @@ class HarvestService:
                 )
             )
 
-        logger.info(
-            f"[Harvest Service] Recorded harvest batch {harvest_batch_id} for "
-            f"block {block_id}: {len(results)} line(s) "
-            f"({sum(1 for r in results if r.destination == 'block_harvests')} "
-            "sellable, "
-            f"{sum(1 for r in results if r.destination == 'processing_inventory')} "
-            "process, "
-            f"{sum(1 for r in results if r.destination == 'inventory_waste')} waste)"
-        )
-
-        return HarvestBatchSubmitResponse(
+        response = HarvestBatchSubmitResponse(
             harvestBatchId=harvest_batch_id,
             blockId=block_id,
             harvestDate=request.harvestDate,
             lines=results,
         )
+        submission = None
+        if key:
+            submission = {
+                "_id": str(harvest_batch_id),
+                "idempotencyKey": key,
+                "fingerprint": payload_fingerprint(request),
+                "farmId": str(farm_id),
+                "blockId": str(block_id),
+                "organizationId": organization_id,
+                "submittedBy": str(user_id),
+                "response": response.model_dump(mode="json"),
+                "createdAt": datetime.utcnow(),
+            }
 
-    @staticmethod
-    async def _route_sellable_line(
-        *,
-        block_id: UUID,
-        request: HarvestBatchSubmitRequest,
-        line: HarvestBatchLineCreate,
-        product,
-        harvest_batch_id: UUID,
-        user_id: UUID,
-        user_email: str,
-    ) -> UUID:
-        """Sellable -> block_harvests row -> inventory_harvest FIFO batch."""
-        harvest_create = BlockHarvestCreate(
-            blockId=block_id,
-            harvestDate=request.harvestDate,
-            quantityKg=line.quantity,
-            qualityGrade=line.qualityGrade,
-            notes=line.notes,
-            farmingYear=request.farmingYear,
-        )
-        harvest = await HarvestService.record_harvest(
-            harvest_create,
-            user_id,
-            user_email,
-            product_id=product.productId,
-            product_name=product.name,
-            harvest_batch_id=harvest_batch_id,
+        db = farm_db.get_database()
+        if not await ingest_harvest_batch(db, plan, submission):
+            # Same key submitted concurrently (or resumed): theirs stands
+            return HarvestService._replay_submission(
+                await find_submission(db, harvest_batch_id), farm_id, request
+            )
+
+        if plan.harvest_count:
+            await BlockRepository.refresh_yield_efficiency(block_id)
+            await mark_pnl_months_dirty(db, [request.harvestDate])
+
+        logger.info(
+            f"[Harvest Service] Recorded harvest batch {harvest_batch_id} for "
+            f"block {block_id}: {len(results)} line(s) "
+            f"({len(plan.harvests)} sellable, {len(plan.processing)} process, "
+            f"{len(plan.waste)} waste)"
         )
-        return harvest.harvestId
+
+        return response
+
+    @staticmethod
+    def _replay_submission(
+        stored: Optional[dict], farm_id: UUID, request: HarvestBatchSubmitRequest
+    ) -> HarvestBatchSubmitResponse:
+        """Stored response of an earlier submission with the same key."""
+        if (
+            stored is None
+            or stored.get("farmId") != str(farm_id)
+            or stored.get("fingerprint") != payload_fingerprint(request)
+        ):
+            raise HTTPException(
+                status_code=409,
+                detail=(
+                    f"Idempotency key '{request.idempotencyKey}' was already "
+                    "used for a different harvest submission"
+                ),
+            )
+        response = HarvestBatchSubmitResponse.model_validate(stored["response"])
+        response.replayed = True
+        return response
 
     @staticmethod
-    async def _route_process_line(
+    def _processing_document(
         *,
         block,
         farm_id: UUID,
@@ -701,11 +807,11 @@ class HarvestService:
         harvest_batch_id: UUID,
         organization_id: str,
         user_id: UUID,
-    ) -> UUID:
+        inventory_id: UUID,
+    ) -> dict:
         """Process -> NEW processing_inventory row (not block_harvests)."""
-        db = farm_db.get_database()
-
         processing_item = ProcessingInventory(
+            inventoryId=inventory_id,
             organizationId=organization_id,
             farmId=farm_id,
             blockId=block.blockId,
@@ -719,17 +825,10 @@ class HarvestService:
             notes=line.notes,
             createdBy=user_id,
         )
-        doc = processing_item.model_dump(mode="json")
-        await db.processing_inventory.insert_one(doc)
-
-        logger.info(
-            f"[Harvest Service] Created processing inventory batch: "
-            f"{processing_item.inventoryId} ({line.quantity}kg of {product.name})"
-        )
-        return processing_item.inventoryId
+        return processing_item.model_dump(mode="json")
 
     @staticmethod
-    async def _route_waste_line(
+    def _waste_document(
         *,
         block,
         farm_id: UUID,
@@ -739,17 +838,17 @@ class HarvestService:
         harvest_batch_id: UUID,
         organization_id: str,
         user_id: UUID,
-    ) -> UUID:
+        waste_id: UUID,
+    ) -> dict:
         """
         Waste -> inventory_waste DIRECTLY (never block_harvests). Mirrors
         the shape of the single live migrated row: sourceType='harvest',
         sourceBlockId=block, plantName set from the PRODUCT name (design
         doc §4.3), originalGrade left null (waste lines are not graded).
         """
-        db = farm_db.get_database()
-
         block_code = getattr(block, "blockCode", None) or str(block.blockId)
         waste_item = WasteInventory(
+            wasteId=waste_id,
             organizationId=organization_id,
             farmId=farm_id,
             sourceType=WasteSourceType.HARVEST,
@@ -768,14 +867,7 @@ class HarvestService:
             notes=line.notes,
             recordedBy=user_id,
         )
-        doc = waste_item.model_dump(mode="json")
-        await db.inventory_waste.insert_one(doc)
-
-        logger.info(
-            f"[Harvest Service] Created harvest waste record: "
-            f"{waste_item.wasteId} ({line.quantity}kg of {product.name})"
-        )
-        return waste_item.wasteId
+        return waste_item.model_dump(mode="json")
 
     # ==================== Batch lookup (design doc §7) ====================
 
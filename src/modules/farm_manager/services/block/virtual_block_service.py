@@ -569,7 +569,14 @@ class VirtualBlockService:
             {"blockId": str(virtual_block_id), "status": "pending"}
         )
 
-        tasks_deleted = delete_result.deleted_count
+        # Pending occurrences of the virtual block's recurring series go with
+        # the series; completed overrides were transferred above
+        from ..task.task_repository import TaskRepository
+
+        tasks_deleted = (
+            delete_result.deleted_count
+            + await TaskRepository.delete_series_for_block(virtual_block_id)
+        )
 
         logger.info(
             f"[Virtual Block Service] Transferred {tasks_transferred} completed tasks, "
@@ -17,6 +17,7 @@ from typing import Dict, Any, Optional, List
 from uuid import UUID
 import logging
 
+from ..services.ai_context import mark_context_dirty
 from ..services.database import farm_db
 
 logger = logging.getLogger(__name__)
@@ -229,6 +230,7 @@ class CascadeDeletionService:
         if tasks_count > 0:
             await db.farm_tasks.delete_many({"blockId": block_id_str})
             logger.info(f"[Cascade Delete] Deleted {tasks_count} tasks")
+        await db.farm_task_series.delete_many({"blockId": block_id_str})
 
         # 8. Delete the block itself
         await db.blocks.delete_one({"blockId": block_id_str})
@@ -278,6 +280,8 @@ class CascadeDeletionService:
                         {"blockId": parent_id_str}, {"$set": update}
                     )
 
+        await mark_context_dirty(db, [block.get("farmId")])
+
         return {
             "success": True,
             "blockId": block_id_str,
@@ -410,6 +414,7 @@ class CascadeDeletionService:
         # 6. Delete the farm itself
         await db.farms.delete_one({"farmId": farm_id_str})
         logger.info(f"[Cascade Delete] Deleted farm: {farm_id}")
+        await mark_context_dirty(db, [farm_id_str])
 
         return {
             "success": True,
@@ -516,6 +521,14 @@ class CascadeDeletionService:
             }
         )
         stats["orphanedTasksCleaned"] = result.deleted_count
+        await db.farm_task_series.delete_many(
+            {
+                "$or": [
+                    {"farmId": {"$nin": list(valid_farm_ids)}},
+                    {"blockId": {"$nin": list(valid_block_ids)}},
+                ]
+            }
+        )
 
         logger.info(f"[Cleanup] Complete: {stats}")
 
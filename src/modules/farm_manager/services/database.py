@@ -10,6 +10,7 @@ import logging
 
 # Import shared database manager from core
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ class FarmDatabaseManager:
     - block_cycles
     - stock_inventory
     - farm_assignments
+    - farm_tasks, farm_task_series
 
     Note: This now delegates to the core MongoDB manager for actual connection management.
     The core manager handles connection pooling, health checks, and shutdown.
@@ -48,8 +50,9 @@ class FarmDatabaseManager:
             logger.info("[Farm Module] Initializing farm management indexes...")
 
             # The core MongoDB manager already connected in main.py startup
-            # We just need to create our module-specific indexes
-            await cls._create_indexes()
+            # We just need to declare our module-specific indexes; they are
+            # reconciled against the database once per boot (src.core.indexes)
+            cls._declare_indexes()
 
             logger.info("[Farm Module] Farm management indexes initialized")
 
@@ -58,322 +61,358 @@ class FarmDatabaseManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for farm management collections"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for farm management collections"""
         try:
-            # Get shared database instance from core
-            db = mongodb.get_database()
-
             # Farms collection
-            await db.farms.create_index("farmId", unique=True)
-            await db.farms.create_index("managerId")
-            await db.farms.create_index("isActive")
-            await db.farms.create_index([("createdAt", -1)])
+            declare_index("farms", "farmId", unique=True)
+            declare_index("farms", "managerId")
+            declare_index("farms", "isActive")
+            declare_index("farms", [("createdAt", -1)])
 
             # Blocks collection
-            await db.blocks.create_index("blockId", unique=True)
-            await db.blocks.create_index("farmId")
-            await db.blocks.create_index("state")
-            await db.blocks.create_index("currentPlanting")
-            await db.blocks.create_index("currentCycleId")
-            await db.blocks.create_index("estimatedHarvestDate")
-            await db.blocks.create_index([("createdAt", -1)])
-            await db.blocks.create_index(
-                [("farmId", 1), ("farmingYearPlanted", 1)]
+            declare_index("blocks", "blockId", unique=True)
+            declare_index("blocks", "farmId")
+            declare_index("blocks", "state")
+            declare_index("blocks", "currentPlanting")
+            declare_index("blocks", "currentCycleId")
+            declare_index("blocks", "estimatedHarvestDate")
+            declare_index("blocks", [("createdAt", -1)])
+            declare_index(
+                "blocks", [("farmId", 1), ("farmingYearPlanted", 1)]
             )  # For farming year queries
 
             # Plant data collection
-            await db.plant_data.create_index("plantDataId", unique=True)
-            await db.plant_data.create_index("plantName")
-            await db.plant_data.create_index("plantType")
-            await db.plant_data.create_index("tags")
-            await db.plant_data.create_index([("createdAt", -1)])
+            declare_index("plant_data", "plantDataId", unique=True)
+            declare_index("plant_data", "plantName")
+            declare_index("plant_data", "plantType")
+            declare_index("plant_data", "tags")
+            declare_index("plant_data", [("createdAt", -1)])
 
             # Plant mothers collection (Plant Library Phase 1 - product/SKU level,
             # groups plant_data_enhanced varieties for harvest/inventory/sales rollup)
-            await db.plant_mothers.create_index("plantMotherId", unique=True)
-            await db.plant_mothers.create_index("organizationId")
-            await db.plant_mothers.create_index("plantName")
-            await db.plant_mothers.create_index("isActive")
-            await db.plant_mothers.create_index([("createdAt", -1)])
+            declare_index("plant_mothers", "plantMotherId", unique=True)
+            declare_index("plant_mothers", "organizationId")
+            declare_index("plant_mothers", "plantName")
+            declare_index("plant_mothers", "isActive")
+            declare_index("plant_mothers", [("createdAt", -1)])
             # Plant Library product extension Stage 1 (see
             # Docs/2-Working-Progress/plant-library-product-extension-design.md
             # §4.5) — supports looking up a mother by an embedded product id.
-            await db.plant_mothers.create_index("products.productId")
+            declare_index("plant_mothers", "products.productId")
 
             # plant_data_enhanced.motherPlantId and blocks.productMotherId are
             # missing today, making every mother->variety lookup and the whole
             # cascade_rename (plant_mother_repository.py) a collection scan.
             # Pure additive performance fixes, no behaviour change — added
             # here regardless of the product extension itself (design §4.5).
-            await db.plant_data_enhanced.create_index("motherPlantId")
-            await db.blocks.create_index("productMotherId")
+            declare_index("plant_data_enhanced", "motherPlantId")
+            declare_index("blocks", "productMotherId")
 
             # Plantings collection
-            await db.plantings.create_index("plantingId", unique=True)
-            await db.plantings.create_index("blockId")
-            await db.plantings.create_index("farmId")
-            await db.plantings.create_index("status")
-            await db.plantings.create_index("estimatedHarvestStartDate")
-            await db.plantings.create_index([("createdAt", -1)])
+            declare_index("plantings", "plantingId", unique=True)
+            declare_index("plantings", "blockId")
+            declare_index("plantings", "farmId")
+            declare_index("plantings", "status")
+            declare_index("plantings", "estimatedHarvestStartDate")
+            declare_index("plantings", [("createdAt", -1)])
 
             # Daily harvests collection
-            await db.daily_harvests.create_index("dailyHarvestId", unique=True)
-            await db.daily_harvests.create_index("cycleId")
-            await db.daily_harvests.create_index("plantingId")
-            await db.daily_harvests.create_index("blockId")
-            await db.daily_harvests.create_index("farmId")
-            await db.daily_harvests.create_index("harvestDate")
-            await db.daily_harvests.create_index([("createdAt", -1)])
+            declare_index("daily_harvests", "dailyHarvestId", unique=True)
+            declare_index("daily_harvests", "cycleId")
+            declare_index("daily_harvests", "plantingId")
+            declare_index("daily_harvests", "blockId")
+            declare_index("daily_harvests", "farmId")
+            declare_index("daily_harvests", "harvestDate")
+            declare_index("daily_harvests", [("createdAt", -1)])
 
             # Harvests collection (aggregated summaries)
-            await db.harvests.create_index("harvestId", unique=True)
-            await db.harvests.create_index("plantingId")
-            await db.harvests.create_index("blockId")
-            await db.harvests.create_index("farmId")
-            await db.harvests.create_index("cycleId")
-            await db.harvests.create_index([("harvestEndDate", -1)])
-            await db.harvests.create_index([("createdAt", -1)])
+            declare_index("harvests", "harvestId", unique=True)
+            declare_index("harvests", "plantingId")
+            declare_index("harvests", "blockId")
+            declare_index("harvests", "farmId")
+            declare_index("harvests", "cycleId")
+            declare_index("harvests", [("harvestEndDate", -1)])
+            declare_index("harvests", [("createdAt", -1)])
 
             # Alerts collection
-            await db.alerts.create_index("alertId", unique=True)
-            await db.alerts.create_index("cycleId")
-            await db.alerts.create_index("blockId")
-            await db.alerts.create_index("farmId")
-            await db.alerts.create_index("severity")
-            await db.alerts.create_index("status")
-            await db.alerts.create_index("triggeredBy")
-            await db.alerts.create_index([("triggeredAt", -1)])
-            await db.alerts.create_index("escalated")
+            declare_index("alerts", "alertId", unique=True)
+            declare_index("alerts", "cycleId")
+            declare_index("alerts", "blockId")
+            declare_index("alerts", "farmId")
+            declare_index("alerts", "severity")
+            declare_index("alerts", "status")
+            declare_index("alerts", "triggeredBy")
+            declare_index("alerts", [("triggeredAt", -1)])
+            declare_index("alerts", "escalated")
 
             # Block cycles collection (CRITICAL for historical data)
-            await db.block_cycles.create_index("cycleId", unique=True)
-            await db.block_cycles.create_index("blockId")
-            await db.block_cycles.create_index("farmId")
-            await db.block_cycles.create_index("cycleNumber")
-            await db.block_cycles.create_index("plantingId")
-            await db.block_cycles.create_index("status")
-            await db.block_cycles.create_index([("createdAt", -1)])
-            await db.block_cycles.create_index([("completedAt", -1)])
+            declare_index("block_cycles", "cycleId", unique=True)
+            declare_index("block_cycles", "blockId")
+            declare_index("block_cycles", "farmId")
+            declare_index("block_cycles", "cycleNumber")
+            declare_index("block_cycles", "plantingId")
+            declare_index("block_cycles", "status")
+            declare_index("block_cycles", [("createdAt", -1)])
+            declare_index("block_cycles", [("completedAt", -1)])
             # Compound index for block history queries
-            await db.block_cycles.create_index([("blockId", 1), ("cycleNumber", -1)])
+            declare_index("block_cycles", [("blockId", 1), ("cycleNumber", -1)])
 
             # Stock inventory collection
-            await db.stock_inventory.create_index("inventoryId", unique=True)
-            await db.stock_inventory.create_index("farmId")
-            await db.stock_inventory.create_index("plantDataId")
-            await db.stock_inventory.create_index("blockId")
-            await db.stock_inventory.create_index("cycleId")
-            await db.stock_inventory.create_index("dailyHarvestId")
-            await db.stock_inventory.create_index("qualityGrade")
-            await db.stock_inventory.create_index("harvestDate")
-            await db.stock_inventory.create_index([("createdAt", -1)])
+            declare_index("stock_inventory", "inventoryId", unique=True)
+            declare_index("stock_inventory", "farmId")
+            declare_index("stock_inventory", "plantDataId")
+            declare_index("stock_inventory", "blockId")
+            declare_index("stock_inventory", "cycleId")
+            declare_index("stock_inventory", "dailyHarvestId")
+            declare_index("stock_inventory", "qualityGrade")
+            declare_index("stock_inventory", "harvestDate")
+            declare_index("stock_inventory", [("createdAt", -1)])
             # Compound index for FIFO queries
-            await db.stock_inventory.create_index(
-                [("farmId", 1), ("plantDataId", 1), ("harvestDate", 1)]
+            declare_index(
+                "stock_inventory",
+                [("farmId", 1), ("plantDataId", 1), ("harvestDate", 1)],
             )
 
             # Farm assignments collection
-            await db.farm_assignments.create_index("assignmentId", unique=True)
-            await db.farm_assignments.create_index("userId")
-            await db.farm_assignments.create_index("farmId")
-            await db.farm_assignments.create_index("isActive")
+            declare_index("farm_assignments", "assignmentId", unique=True)
+            declare_index("farm_assignments", "userId")
+            declare_index("farm_assignments", "farmId")
+            declare_index("farm_assignments", "isActive")
             # Compound unique index to prevent duplicate assignments
-            await db.farm_assignments.create_index(
-                [("userId", 1), ("farmId", 1)], unique=True
+            declare_index(
+                "farm_assignments", [("userId", 1), ("farmId", 1)], unique=True
             )
 
+            # Farm tasks collection; taskId unique so a series occurrence is
+            # materialized once (services/task/task_series.py)
+            declare_index("farm_tasks", "taskId", unique=True)
+            declare_index("farm_tasks", [("farmId", 1), ("scheduledDate", 1)])
+            declare_index("farm_tasks", [("blockId", 1), ("scheduledDate", 1)])
+            declare_index("farm_tasks", "generatedFromCycleId")
+            declare_index("farm_tasks", "seriesId")
+
+            # Recurring task series (one rule instead of a document per day)
+            declare_index("farm_task_series", "seriesId", unique=True)
+            declare_index("farm_task_series", "farmId")
+            declare_index("farm_task_series", "blockId")
+            declare_index("farm_task_series", "generatedFromCycleId")
+
             # Product catalog collection (Master product database)
-            await db.products.create_index("productId", unique=True)
-            await db.products.create_index("organizationId")
-            await db.products.create_index("category")
-            await db.products.create_index("name")
-            await db.products.create_index([("organizationId", 1), ("category", 1)])
-            await db.products.create_index([("createdAt", -1)])
+            declare_index("products", "productId", unique=True)
+            declare_index("products", "organizationId")
+            declare_index("products", "category")
+            declare_index("products", "name")
+            declare_index("products", [("organizationId", 1), ("category", 1)])
+            declare_index("products", [("createdAt", -1)])
 
             # Harvest inventory collection
-            await db.inventory_harvest.create_index("inventoryId", unique=True)
-            await db.inventory_harvest.create_index("farmId")
-            await db.inventory_harvest.create_index("organizationId")
-            await db.inventory_harvest.create_index("inventoryScope")
-            await db.inventory_harvest.create_index("blockId")
-            await db.inventory_harvest.create_index("plantDataId")
-            await db.inventory_harvest.create_index("qualityGrade")
-            await db.inventory_harvest.create_index([("harvestDate", -1)])
-            await db.inventory_harvest.create_index([("createdAt", -1)])
+            declare_index("inventory_harvest", "inventoryId", unique=True)
+            declare_index("inventory_harvest", "farmId")
+            declare_index("inventory_harvest", "organizationId")
+            declare_index("inventory_harvest", "inventoryScope")
+            declare_index("inventory_harvest", "blockId")
+            declare_index("inventory_harvest", "plantDataId")
+            declare_index("inventory_harvest", "qualityGrade")
+            declare_index("inventory_harvest", [("harvestDate", -1)])
+            declare_index("inventory_harvest", [("createdAt", -1)])
             # Compound indexes for default inventory queries
-            await db.inventory_harvest.create_index(
-                [("organizationId", 1), ("inventoryScope", 1)]
+            declare_index(
+                "inventory_harvest", [("organizationId", 1), ("inventoryScope", 1)]
             )
-            await db.inventory_harvest.create_index(
-                [("organizationId", 1), ("farmId", 1)]
-            )
-            await db.inventory_harvest.create_index(
-                [("organizationId", 1), ("plantDataId", 1), ("inventoryScope", 1)]
+            declare_index("inventory_harvest", [("organizationId", 1), ("farmId", 1)])
+            declare_index(
+                "inventory_harvest",
+                [("organizationId", 1), ("plantDataId", 1), ("inventoryScope", 1)],
             )
+            # Interrupted expiry claims (services/block/expiry_cron.py)
+            declare_index("inventory_harvest", "pendingExpiry.wasteId", sparse=True)
+            # FEFO batch picking for sales orders
+            # (sales/services/sales/stock_reservation.py)
+            for fefo_collection in ("inventory_harvest", "inventory_returned"):
+                declare_index(
+                    fefo_collection,
+                    [
+                        ("organizationId", 1),
+                        ("plantName", 1),
+                        ("qualityGrade", 1),
+                        ("expiryDate", 1),
+                    ],
+                    name="fefo",
+                )
 
             # Input inventory collection
-            await db.inventory_input.create_index("inventoryId", unique=True)
-            await db.inventory_input.create_index("farmId")
-            await db.inventory_input.create_index("organizationId")
-            await db.inventory_input.create_index("inventoryScope")
-            await db.inventory_input.create_index("productId")
-            await db.inventory_input.create_index("category")
-            await db.inventory_input.create_index("isLowStock")
-            await db.inventory_input.create_index([("createdAt", -1)])
+            declare_index("inventory_input", "inventoryId", unique=True)
+            declare_index("inventory_input", "farmId")
+            declare_index("inventory_input", "organizationId")
+            declare_index("inventory_input", "inventoryScope")
+            declare_index("inventory_input", "productId")
+            declare_index("inventory_input", "category")
+            declare_index("inventory_input", "isLowStock")
+            declare_index("inventory_input", [("createdAt", -1)])
             # Compound indexes for default inventory queries
-            await db.inventory_input.create_index(
-                [("organizationId", 1), ("inventoryScope", 1)]
-            )
-            await db.inventory_input.create_index(
-                [("organizationId", 1), ("category", 1), ("inventoryScope", 1)]
+            declare_index(
+                "inventory_input", [("organizationId", 1), ("inventoryScope", 1)]
             )
-            await db.inventory_input.create_index(
-                [("organizationId", 1), ("isLowStock", 1)]
-            )
-            await db.inventory_input.create_index(
-                [("organizationId", 1), ("farmId", 1)]
+            declare_index(
+                "inventory_input",
+                [("organizationId", 1), ("category", 1), ("inventoryScope", 1)],
             )
+            declare_index("inventory_input", [("organizationId", 1), ("isLowStock", 1)])
+            declare_index("inventory_input", [("organizationId", 1), ("farmId", 1)])
 
             # Asset inventory collection
-            await db.inventory_asset.create_index("inventoryId", unique=True)
-            await db.inventory_asset.create_index("farmId")
-            await db.inventory_asset.create_index("organizationId")
-            await db.inventory_asset.create_index("inventoryScope")
-            await db.inventory_asset.create_index("category")
-            await db.inventory_asset.create_index("status")
-            await db.inventory_asset.create_index("maintenanceOverdue")
-            await db.inventory_asset.create_index([("createdAt", -1)])
-            await db.inventory_asset.create_index("currentAllocation.allocatedTo")
-            await db.inventory_asset.create_index("currentAllocation.farmId")
+            declare_index("inventory_asset", "inventoryId", unique=True)
+            declare_index("inventory_asset", "farmId")
+            declare_index("inventory_asset", "organizationId")
+            declare_index("inventory_asset", "inventoryScope")
+            declare_index("inventory_asset", "category")
+            declare_index("inventory_asset", "status")
+            declare_index("inventory_asset", "maintenanceOverdue")
+            declare_index("inventory_asset", [("createdAt", -1)])
+            declare_index("inventory_asset", "currentAllocation.allocatedTo")
+            declare_index("inventory_asset", "currentAllocation.farmId")
             # Compound indexes for default inventory queries
-            await db.inventory_asset.create_index(
-                [("organizationId", 1), ("inventoryScope", 1)]
+            declare_index(
+                "inventory_asset", [("organizationId", 1), ("inventoryScope", 1)]
             )
-            await db.inventory_asset.create_index(
-                [("organizationId", 1), ("status", 1), ("inventoryScope", 1)]
+            declare_index(
+                "inventory_asset",
+                [("organizationId", 1), ("status", 1), ("inventoryScope", 1)],
             )
-            await db.inventory_asset.create_index(
-                [("organizationId", 1), ("currentAllocation.farmId", 1)]
+            declare_index(
+                "inventory_asset",
+                [("organizationId", 1), ("currentAllocation.farmId", 1)],
             )
 
             # Inventory movements collection
-            await db.inventory_movements.create_index("movementId", unique=True)
-            await db.inventory_movements.create_index("inventoryId")
-            await db.inventory_movements.create_index("inventoryType")
-            await db.inventory_movements.create_index("movementType")
-            await db.inventory_movements.create_index("organizationId")
-            await db.inventory_movements.create_index([("performedAt", -1)])
+            declare_index("inventory_movements", "movementId", unique=True)
+            declare_index("inventory_movements", "inventoryId")
+            declare_index("inventory_movements", "inventoryType")
+            declare_index("inventory_movements", "movementType")
+            declare_index("inventory_movements", "organizationId")
+            declare_index("inventory_movements", [("performedAt", -1)])
             # Transfer tracking indexes
-            await db.inventory_movements.create_index(
-                [("fromScope", 1), ("toScope", 1)]
-            )
-            await db.inventory_movements.create_index("fromFarmId")
-            await db.inventory_movements.create_index("toFarmId")
+            declare_index("inventory_movements", [("fromScope", 1), ("toScope", 1)])
+            declare_index("inventory_movements", "fromFarmId")
+            declare_index("inventory_movements", "toFarmId")
             # Compound indexes for transfer queries
-            await db.inventory_movements.create_index(
-                [("organizationId", 1), ("movementType", 1), ("performedAt", -1)]
+            declare_index(
+                "inventory_movements",
+                [("organizationId", 1), ("movementType", 1), ("performedAt", -1)],
             )
-            await db.inventory_movements.create_index(
-                [("inventoryId", 1), ("movementType", 1), ("performedAt", -1)]
+            declare_index(
+                "inventory_movements",
+                [("inventoryId", 1), ("movementType", 1), ("performedAt", -1)],
             )
-            await db.inventory_movements.create_index(
-                [("fromFarmId", 1), ("movementType", 1), ("performedAt", -1)]
+            declare_index(
+                "inventory_movements",
+                [("fromFarmId", 1), ("movementType", 1), ("performedAt", -1)],
             )
-            await db.inventory_movements.create_index(
-                [("toFarmId", 1), ("movementType", 1), ("performedAt", -1)]
+            declare_index(
+                "inventory_movements",
+                [("toFarmId", 1), ("movementType", 1), ("performedAt", -1)],
             )
 
             # Block harvests collection
-            await db.block_harvests.create_index("harvestId", unique=True)
-            await db.block_harvests.create_index("blockId")
-            await db.block_harvests.create_index("farmId")
-            await db.block_harvests.create_index("harvestDate")
-            await db.block_harvests.create_index("farmingYear")
-            await db.block_harvests.create_index([("createdAt", -1)])
+            declare_index("block_harvests", "harvestId", unique=True)
+            declare_index("block_harvests", "blockId")
+            declare_index("block_harvests", "farmId")
+            declare_index("block_harvests", "harvestDate")
+            declare_index("block_harvests", "farmingYear")
+            declare_index("block_harvests", [("createdAt", -1)])
             # Compound indexes for farming year queries (Feature #376)
-            await db.block_harvests.create_index([("blockId", 1), ("farmingYear", 1)])
-            await db.block_harvests.create_index([("farmId", 1), ("farmingYear", 1)])
+            declare_index("block_harvests", [("blockId", 1), ("farmingYear", 1)])
+            declare_index("block_harvests", [("farmId", 1), ("farmingYear", 1)])
             # Plant Library product extension Stage 3 (design doc §4.5) —
             # productId/harvestBatchId are optional (null on 13,947 legacy
             # rows) but indexed regardless: the batch-lookup endpoint filters
             # on harvestBatchId, and productId backs future per-product yield
             # queries.
-            await db.block_harvests.create_index("productId")
-            await db.block_harvests.create_index("harvestBatchId")
+            declare_index("block_harvests", "productId")
+            declare_index("block_harvests", "harvestBatchId")
+            # Idempotent batch submissions (services/block/harvest_ingest.py):
+            # _id is the harvestBatchId; kept for the field-device replay window
+            declare_index(
+                "harvest_submissions",
+                "createdAt",
+                expireAfterSeconds=30 * 24 * 3600,  # SUBMISSION_TTL_SECONDS
+            )
 
             # Processing inventory collection (Plant Library product
             # extension Stage 3, design doc §4.4) — destination for
             # `process`-category harvest lines, deliberately separate from
             # inventory_harvest (sellable stock only, see §3.1).
-            await db.processing_inventory.create_index("inventoryId", unique=True)
-            await db.processing_inventory.create_index("organizationId")
-            await db.processing_inventory.create_index("farmId")
-            await db.processing_inventory.create_index("blockId")
-            await db.processing_inventory.create_index("productId")
-            await db.processing_inventory.create_index("harvestBatchId")
-            await db.processing_inventory.create_index([("harvestDate", -1)])
-            await db.processing_inventory.create_index([("createdAt", -1)])
+            declare_index("processing_inventory", "inventoryId", unique=True)
+            declare_index("processing_inventory", "organizationId")
+            declare_index("processing_inventory", "farmId")
+            declare_index("processing_inventory", "blockId")
+            declare_index("processing_inventory", "productId")
+            declare_index("processing_inventory", "harvestBatchId")
+            declare_index("processing_inventory", [("harvestDate", -1)])
+            declare_index("processing_inventory", [("createdAt", -1)])
 
             # Waste inventory collection — new indexes for the Plant Library
             # product extension Stage 3 routing (design doc §4.5): the
             # batch-lookup endpoint filters harvest-sourced waste by block +
             # date and groups by harvestBatchId.
-            await db.inventory_waste.create_index("harvestBatchId")
-            await db.inventory_waste.create_index("sourceBlockId")
+            declare_index("inventory_waste", "harvestBatchId")
+            # Unique wasteId backs the expiry job's deterministic ids (a re-run
+            # after a crash must not insert a second waste record).
+            declare_index("inventory_waste", "wasteId", unique=True)
+            declare_index("inventory_waste", "sourceBlockId")
 
             # Block archives collection (Feature #378)
-            await db.block_archives.create_index("archiveId", unique=True)
-            await db.block_archives.create_index("blockId")
-            await db.block_archives.create_index("farmId")
-            await db.block_archives.create_index("targetCrop")
-            await db.block_archives.create_index("farmingYearPlanted")
-            await db.block_archives.create_index("farmingYearHarvested")
-            await db.block_archives.create_index([("plantedDate", -1)])
-            await db.block_archives.create_index([("archivedAt", -1)])
+            declare_index("block_archives", "archiveId", unique=True)
+            declare_index("block_archives", "blockId")
+            declare_index("block_archives", "farmId")
+            declare_index("block_archives", "targetCrop")
+            declare_index("block_archives", "farmingYearPlanted")
+            declare_index("block_archives", "farmingYearHarvested")
+            declare_index("block_archives", [("plantedDate", -1)])
+            declare_index("block_archives", [("archivedAt", -1)])
             # Compound indexes for farming year queries on archives
-            await db.block_archives.create_index(
-                [("farmId", 1), ("farmingYearPlanted", 1)]
-            )
-            await db.block_archives.create_index(
-                [("farmId", 1), ("farmingYearHarvested", 1)]
-            )
-            await db.block_archives.create_index(
-                [("blockId", 1), ("farmingYearPlanted", 1)]
+            declare_index("block_archives", [("farmId", 1), ("farmingYearPlanted", 1)])
+            declare_index(
+                "block_archives", [("farmId", 1), ("farmingYearHarvested", 1)]
             )
+            declare_index("block_archives", [("blockId", 1), ("farmingYearPlanted", 1)])
 
             # ---------------------------------------------------------------
             # Fertilizer Cost Calculator collections
             # ---------------------------------------------------------------
 
             # fertilizer_chemicals — master chemical catalog
-            await db.fertilizer_chemicals.create_index("chemicalId", unique=True)
-            await db.fertilizer_chemicals.create_index("organizationId")
-            await db.fertilizer_chemicals.create_index(
+            declare_index("fertilizer_chemicals", "chemicalId", unique=True)
+            declare_index("fertilizer_chemicals", "organizationId")
+            declare_index(
+                "fertilizer_chemicals",
                 [("organizationId", 1), ("archivedAt", 1), ("name", 1)],
                 collation={"locale": "en", "strength": 2},  # case-insensitive
             )
-            await db.fertilizer_chemicals.create_index("archivedAt")
-            await db.fertilizer_chemicals.create_index([("createdAt", -1)])
+            declare_index("fertilizer_chemicals", "archivedAt")
+            declare_index("fertilizer_chemicals", [("createdAt", -1)])
 
             # fertilizer_price_overrides — per-org price per chemical
-            await db.fertilizer_price_overrides.create_index("overrideId", unique=True)
-            await db.fertilizer_price_overrides.create_index("organizationId")
-            await db.fertilizer_price_overrides.create_index(
+            declare_index("fertilizer_price_overrides", "overrideId", unique=True)
+            declare_index("fertilizer_price_overrides", "organizationId")
+            declare_index(
+                "fertilizer_price_overrides",
                 [("chemicalId", 1), ("organizationId", 1)],
                 unique=True,
             )
 
             # fertilizer_calculation_lists — saved lists
-            await db.fertilizer_calculation_lists.create_index("listId", unique=True)
-            await db.fertilizer_calculation_lists.create_index("organizationId")
-            await db.fertilizer_calculation_lists.create_index(
-                [("organizationId", 1), ("createdAt", -1)]
+            declare_index("fertilizer_calculation_lists", "listId", unique=True)
+            declare_index("fertilizer_calculation_lists", "organizationId")
+            declare_index(
+                "fertilizer_calculation_lists",
+                [("organizationId", 1), ("createdAt", -1)],
             )
 
-            logger.info("[Farm Module] MongoDB indexes created successfully")
+            logger.info("[Farm Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Farm Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Farm Module] Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
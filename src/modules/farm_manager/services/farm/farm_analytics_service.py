@@ -26,7 +26,7 @@ from ...models.block_analytics import TimePeriod
 from ..block.block_repository_new import BlockRepository
 from ..block.harvest_repository import HarvestRepository
 from ..block.alert_repository import AlertRepository
-from ..database import farm_db
+from ..task.task_repository import TaskRepository
 
 logger = logging.getLogger(__name__)
 
@@ -299,7 +299,6 @@ class FarmAnalyticsService:
         """Calculate comparison data for each block"""
         logger.info(f"[Farm Analytics] Calculating block comparison data")
 
-        db = farm_db.get_database()
         comparison_items: List[BlockComparisonItem] = []
 
         for block in blocks:
@@ -308,13 +307,11 @@ class FarmAnalyticsService:
             if block.plantedDate:
                 days_in_cycle = (datetime.utcnow() - block.plantedDate).days
 
-            # Get task completion rate
-            tasks = await db.farm_tasks.find({"blockId": str(block.blockId)}).to_list(
-                length=1000
-            )
+            # Get task completion rate (recurring series occurrences included)
+            task_counts = await TaskRepository.count_by_status_for_block(block.blockId)
 
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for t in tasks if t.get("status") == "completed")
+            total_tasks = sum(task_counts.values())
+            completed_tasks = task_counts.get("completed", 0)
             task_completion_rate = (
                 (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
             )
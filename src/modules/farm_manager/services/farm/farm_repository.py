@@ -11,6 +11,7 @@ from datetime import datetime
 import logging
 
 from ...models.farm import Farm, FarmCreate, FarmUpdate
+from ..ai_context import mark_context_dirty
 from ..database import farm_db
 
 logger = logging.getLogger(__name__)
@@ -86,6 +87,7 @@ class FarmRepository:
         farm_doc["nextBlockSequence"] = 1
 
         await collection.insert_one(farm_doc)
+        await mark_context_dirty(farm_db.get_database(), [farm.farmId])
 
         logger.info(f"Created farm: {farm.farmId} with code {farm_code}")
         return farm
@@ -197,6 +199,7 @@ class FarmRepository:
         )
 
         if result.modified_count > 0:
+            await mark_context_dirty(farm_db.get_database(), [farm_id])
             logger.info(f"Updated farm: {farm_id}")
             return await self.get_by_id(farm_id)
 
@@ -220,6 +223,7 @@ class FarmRepository:
         )
 
         if result.modified_count > 0:
+            await mark_context_dirty(farm_db.get_database(), [farm_id])
             logger.info(f"Deleted (soft) farm: {farm_id}")
             return True
 
@@ -20,9 +20,10 @@ from vertexai.generative_models import (
 )
 
 from src.config.settings import settings
+from src.core.ai_tools import ToolCall, ToolRuntime, invalidate_tool_results
 from ..sensehub import SenseHubConnectionService
 from .context_builder import build_system_prompt
-from .tool_definitions import get_gemini_tools, WRITE_TOOL_NAMES
+from .tool_definitions import TOOL_SPECS, get_gemini_tools, WRITE_TOOL_NAMES
 from .tool_executor import execute_read_tool, execute_write_tool, describe_write_action
 from .pending_actions import (
     store_pending_action,
@@ -42,6 +43,8 @@ logger = logging.getLogger(__name__)
 # Max tool-use loop iterations to prevent runaway
 MAX_TOOL_ROUNDS = 5
 
+_tool_runtime = ToolRuntime("farm_ai", TOOL_SPECS)
+
 
 def _init_vertexai() -> None:
     """
@@ -73,6 +76,8 @@ class FarmAIChatService:
         farm_id: UUID,
         block_id: UUID,
         user_id: str,
+        organization_id: Optional[str] = None,
+        user_role: Optional[str] = None,
     ) -> FarmAIChatResponse:
         """
         Process a user chat message through Gemini with farm context and tools.
@@ -82,7 +87,8 @@ class FarmAIChatService:
           2. Convert conversation history to Gemini ``Content`` objects.
           3. Start a Gemini chat session.
           4. Send the user message; enter a tool-execution loop.
-          5. For read tools: execute immediately and feed results back.
+          5. For read tools: execute immediately (concurrently, through the
+             shared tool runtime) and feed results back.
           6. For write tools: store a pending action and feed a placeholder back.
           7. Return the final text response.
 
@@ -91,7 +97,10 @@ class FarmAIChatService:
             conversation_history: Previous messages as ``[{role, content}, ...]``.
             farm_id: Farm UUID.
             block_id: Block UUID.
-            user_id: Current user ID (used for logging only).
+            user_id: Current user ID (logging and the tool result cache key).
+            organization_id: Scope of the shared tool result cache; without
+                one tool results are not cached.
+            user_role: Current user's role (tool result cache key).
 
         Returns:
             FarmAIChatResponse with message, optional pending_action, metadata.
@@ -155,9 +164,20 @@ class FarmAIChatService:
         )
 
         tools_used: list[str] = []
+        tool_calls_log: list[dict] = []
         pending_action: Optional[PendingAction] = None
         final_text = ""
 
+        async def run_read_tool(call: ToolCall) -> dict:
+            # web_search doesn't need SenseHub; other tools do.
+            if call.name == "web_search":
+                return await execute_read_tool(client, call.name, call.input)
+            if client:
+                return await execute_read_tool(
+                    client, call.name, call.input, block_id=str(block_id)
+                )
+            return {"error": "SenseHub not connected"}
+
         try:
             # Send the user message to Gemini
             response = await chat.send_message_async(
@@ -179,15 +199,42 @@ class FarmAIChatService:
                     # No more tool calls - extract final text and exit
                     break
 
-                # Process each function call in this round
+                # Reason: Gemini returns a MapComposite; cast to plain dict
+                # so downstream tool executor code can .get() / iterate it.
+                calls = [
+                    ToolCall(
+                        name=fc_part.function_call.name,
+                        input=dict(fc_part.function_call.args),
+                    )
+                    for fc_part in function_calls
+                ]
+                tools_used.extend(call.name for call in calls)
+
+                # Read tools: execute now, concurrently. Write tools never run
+                # here — they become pending actions below.
+                read_calls = [c for c in calls if c.name not in WRITE_TOOL_NAMES]
+                outcomes = await _tool_runtime.run(
+                    read_calls,
+                    run_read_tool,
+                    scope=organization_id,
+                    user_id=user_id,
+                    role=user_role,
+                    context_key=str(block_id),
+                )
+                tool_calls_log.extend(outcome.to_log() for outcome in outcomes)
+                if client and read_calls:
+                    # Refresh cached auth token after SenseHub calls
+                    await SenseHubConnectionService._update_token_cache(
+                        farm_id, block_id, client
+                    )
+                read_results = iter(outcome.result for outcome in outcomes)
+
+                # Build the responses in the order Gemini asked for them
                 function_responses: list[Part] = []
 
-                for fc_part in function_calls:
-                    tool_name: str = fc_part.function_call.name
-                    # Reason: Gemini returns a MapComposite; cast to plain dict
-                    # so downstream tool executor code can .get() / iterate it.
-                    tool_input: dict = dict(fc_part.function_call.args)
-                    tools_used.append(tool_name)
+                for call in calls:
+                    tool_name = call.name
+                    tool_input = call.input
 
                     if tool_name in WRITE_TOOL_NAMES:
                         # Write tool: store pending action, feed placeholder back.
@@ -218,32 +265,12 @@ class FarmAIChatService:
                         )
 
                     else:
-                        # Read tool: execute immediately and return result.
-                        # web_search doesn't need SenseHub; other tools do.
-                        if tool_name == "web_search":
-                            result = await execute_read_tool(
-                                client, tool_name, tool_input
-                            )
-                        elif client:
-                            result = await execute_read_tool(
-                                client,
-                                tool_name,
-                                tool_input,
-                                block_id=str(block_id),
-                            )
-                            # Refresh cached auth token after SenseHub call
-                            await SenseHubConnectionService._update_token_cache(
-                                farm_id, block_id, client
-                            )
-                        else:
-                            result = {"error": "SenseHub not connected"}
-
                         function_responses.append(
                             Part.from_function_response(
                                 name=tool_name,
                                 # Reason: response must be a plain dict, not a
                                 # JSON string.  tool_executor already returns dicts.
-                                response=result,
+                                response=next(read_results),
                             )
                         )
 
@@ -295,6 +322,7 @@ class FarmAIChatService:
                     "userMessage": message,
                     "assistantMessage": final_text,
                     "toolsUsed": tools_used,
+                    "toolCalls": tool_calls_log,
                     "hasPendingAction": pending_action is not None,
                     "timestamp": datetime.utcnow(),
                 }
@@ -370,6 +398,8 @@ class FarmAIChatService:
                 action_data["tool_name"],
                 action_data["tool_input"],
             )
+            # Cached tool results in every chat may now be stale.
+            invalidate_tool_results()
             await SenseHubConnectionService._update_token_cache(
                 farm_id, block_id, client
             )
@@ -13,6 +13,8 @@ expected by Gemini.
 from google.cloud.aiplatform_v1beta1 import types as aiplatform_types
 from vertexai.generative_models import FunctionDeclaration, Tool
 
+from src.core.ai_tools import SideEffect, ToolSpec
+
 # Tools that execute without user confirmation
 READ_TOOLS = [
     {
@@ -197,6 +199,18 @@ WRITE_TOOL_NAMES = {t["name"] for t in WRITE_TOOLS}
 # All tools combined (order: reads first, then writes)
 ALL_TOOLS = READ_TOOLS + WRITE_TOOLS
 
+# Side-effect class and shared result-cache TTL per tool (src/core/ai_tools).
+# Live SenseHub state gets a short TTL; it mostly saves repeats across the
+# rounds of one conversation.
+TOOL_SPECS = [
+    ToolSpec("get_equipment_list", cache_ttl_seconds=120),
+    ToolSpec("get_sensor_readings", cache_ttl_seconds=15),
+    ToolSpec("get_automations", cache_ttl_seconds=60),
+    ToolSpec("get_alerts", cache_ttl_seconds=15),
+    ToolSpec("get_system_status", cache_ttl_seconds=15),
+    ToolSpec("web_search", cache_ttl_seconds=600),
+] + [ToolSpec(name, SideEffect.WRITE) for name in sorted(WRITE_TOOL_NAMES)]
+
 
 def get_gemini_tools() -> list[Tool]:
     """
@@ -1,9 +1,10 @@
 """
 Farm-Level AI Chat - Context Builder
 
-Builds the system prompt for the farm-level AI by loading the farm and ALL
-active blocks from MongoDB.  Provides a high-level overview so the AI can
-answer questions about any block and coordinate multi-block operations.
+Builds the system prompt for the farm-level AI from the farm's context
+snapshot (services.ai_context): farm identity plus a pre-rendered table of
+ALL active blocks.  Provides a high-level overview so the AI can answer
+questions about any block and coordinate multi-block operations.
 """
 
 import logging
@@ -11,25 +12,19 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from ..database import farm_db
+from ..ai_context import get_farm_snapshot
 
 logger = logging.getLogger(__name__)
 
 
-def _sensehub_connected(block: dict) -> bool:
-    """Return True when a block's iotController reports a connected status."""
-    iot = block.get("iotController") or {}
-    return iot.get("connectionStatus") == "connected"
-
-
 async def build_farm_system_prompt(
     farm_id: UUID,
 ) -> tuple[str, Optional[dict]]:
     """
     Build the farm-level AI system prompt with context for all active blocks.
 
-    Loads the farm document and all its active blocks from MongoDB, then
-    composes a system prompt that includes:
+    Reads the farm's context snapshot, then composes a system prompt that
+    includes:
     - Farm identity and summary statistics
     - A table of all blocks with state, crop, SenseHub status
     - Operating instructions for the AI
@@ -42,11 +37,8 @@ async def build_farm_system_prompt(
         farm_summary_dict has keys: farm_name, block_count, connected_blocks.
         Returns a generic error prompt with None summary if farm is not found.
     """
-    db = farm_db.get_database()
-
-    # Load farm document
-    farm = await db.farms.find_one({"farmId": str(farm_id)})
-    if not farm:
+    snapshot = await get_farm_snapshot(farm_id)
+    if not snapshot:
         logger.warning(f"Farm {farm_id} not found when building system prompt")
         return (
             "You are a farm-level AI assistant. The requested farm was not found. "
@@ -54,49 +46,13 @@ async def build_farm_system_prompt(
             None,
         )
 
-    farm_name = farm.get("name", "Unknown Farm")
-    farm_location = farm.get("location", "")
-    farm_area = farm.get("totalArea", 0)
-    farm_area_unit = farm.get("areaUnit", "sqm")
-
-    # Load all active blocks for this farm
-    cursor = db.blocks.find({"farmId": str(farm_id), "isActive": True}).sort(
-        "blockCode", 1
-    )
-    blocks = await cursor.to_list(length=500)
-
-    total_blocks = len(blocks)
-    connected_blocks = sum(1 for b in blocks if _sensehub_connected(b))
-
-    # Build block summary table
-    block_rows: list[str] = []
-    for block in blocks:
-        block_code = block.get("blockCode", "?")
-        block_name = block.get("name", block_code)
-        state = block.get("state", "unknown")
-        block_type = block.get("blockType", "unknown")
-        crop_name = block.get("targetCropName", "—")
-        plant_count = block.get("actualPlantCount", 0) or 0
-
-        connected_flag = "YES" if _sensehub_connected(block) else "no"
-
-        block_rows.append(
-            f"  | {block_code:<12} | {block_name:<20} | {state:<12} | "
-            f"{block_type:<12} | {crop_name:<20} | {plant_count:>6} plants | "
-            f"SenseHub: {connected_flag}"
-        )
-
-    if block_rows:
-        block_table_header = (
-            "  | BlockCode     | Name                 | State        | "
-            "Type         | Crop                 | Plants        | IoT"
-        )
-        block_table_sep = "  " + "-" * 110
-        block_table = (
-            block_table_header + "\n" + block_table_sep + "\n" + "\n".join(block_rows)
-        )
-    else:
-        block_table = "  No active blocks found on this farm."
+    farm_name = snapshot.get("farmName", "Unknown Farm")
+    farm_location = snapshot.get("location", "")
+    farm_area = snapshot.get("totalArea", 0)
+    farm_area_unit = snapshot.get("areaUnit", "sqm")
+    total_blocks = snapshot.get("blockCount", 0)
+    connected_blocks = snapshot.get("connectedCount", 0)
+    block_table = snapshot.get("blockTable", "")
 
     # Farm summary for response metadata
     farm_summary_dict = {
@@ -21,6 +21,7 @@ from vertexai.generative_models import (
 )
 
 from src.config.settings import settings
+from src.core.ai_tools import ToolCall, ToolRuntime, invalidate_tool_results
 from ..database import farm_db
 from ..sensehub import SenseHubConnectionService
 from ..farm_ai.pending_actions import (
@@ -30,7 +31,7 @@ from ..farm_ai.pending_actions import (
 )
 from ..farm_ai.models import ConfirmActionResponse
 from .context_builder import build_farm_system_prompt
-from .tool_definitions import get_gemini_tools, WRITE_TOOL_NAMES
+from .tool_definitions import TOOL_SPECS, get_gemini_tools, WRITE_TOOL_NAMES
 from .tool_executor import (
     execute_read_tool,
     execute_write_tool,
@@ -49,6 +50,8 @@ logger = logging.getLogger(__name__)
 # Maximum tool-use loop iterations to prevent runaway Gemini loops
 MAX_TOOL_ROUNDS = 5
 
+_tool_runtime = ToolRuntime("farm_level_ai", TOOL_SPECS)
+
 
 def _init_vertexai() -> None:
     """
@@ -78,6 +81,8 @@ class FarmLevelAIChatService:
         conversation_history: list[dict],
         farm_id: UUID,
         user_id: str,
+        organization_id: Optional[str] = None,
+        user_role: Optional[str] = None,
     ) -> FarmLevelAIChatResponse:
         """
         Process a user chat message at the farm level through Gemini with full
@@ -94,7 +99,8 @@ class FarmLevelAIChatService:
           7. Enter tool-use loop (MAX_TOOL_ROUNDS):
              - Write tools: resolve block_code to block_id, store pending action,
                feed placeholder back to Gemini.
-             - Read tools: execute immediately via execute_read_tool.
+             - Read tools: execute immediately via execute_read_tool, the
+               round's reads concurrently through the shared tool runtime.
           8. Log interaction to farm_ai_chat_log (scope: "farm").
           9. Return FarmLevelAIChatResponse.
 
@@ -102,7 +108,10 @@ class FarmLevelAIChatService:
             message: User's chat message.
             conversation_history: Previous messages as [{role, content}, ...].
             farm_id: Farm UUID.
-            user_id: Current user ID (used for logging only).
+            user_id: Current user ID (logging and the tool result cache key).
+            organization_id: Scope of the shared tool result cache; without
+                one tool results are not cached.
+            user_role: Current user's role (tool result cache key).
 
         Returns:
             FarmLevelAIChatResponse with message, optional pending_action,
@@ -167,6 +176,7 @@ class FarmLevelAIChatService:
         )
 
         tools_used: list[str] = []
+        tool_calls_log: list[dict] = []
         pending_action: Optional[PendingAction] = None
         final_text = ""
 
@@ -191,14 +201,40 @@ class FarmLevelAIChatService:
                     # No more tool calls — extract final text and exit loop
                     break
 
+                # Reason: Gemini returns a MapComposite; cast to plain dict
+                # so downstream code can .get() / iterate it normally.
+                calls = [
+                    ToolCall(
+                        name=fc_part.function_call.name,
+                        input=dict(fc_part.function_call.args),
+                    )
+                    for fc_part in function_calls
+                ]
+                tools_used.extend(call.name for call in calls)
+
+                # Read tools: execute now, concurrently. Write tools never run
+                # here — they become pending actions below.
+                outcomes = await _tool_runtime.run(
+                    [c for c in calls if c.name not in WRITE_TOOL_NAMES],
+                    lambda call: execute_read_tool(
+                        farm_id=farm_id,
+                        tool_name=call.name,
+                        tool_input=call.input,
+                    ),
+                    scope=organization_id,
+                    user_id=user_id,
+                    role=user_role,
+                    context_key=str(farm_id),
+                )
+                tool_calls_log.extend(outcome.to_log() for outcome in outcomes)
+                read_results = iter(outcome.result for outcome in outcomes)
+
+                # Build the responses in the order Gemini asked for them
                 function_responses: list[Part] = []
 
-                for fc_part in function_calls:
-                    tool_name: str = fc_part.function_call.name
-                    # Reason: Gemini returns a MapComposite; cast to plain dict
-                    # so downstream code can .get() / iterate it normally.
-                    tool_input: dict = dict(fc_part.function_call.args)
-                    tools_used.append(tool_name)
+                for call in calls:
+                    tool_name = call.name
+                    tool_input = call.input
 
                     if tool_name in WRITE_TOOL_NAMES:
                         # Write tool: resolve block_code to block_id now so
@@ -243,19 +279,12 @@ class FarmLevelAIChatService:
                         )
 
                     else:
-                        # Read tool: execute immediately
-                        result = await execute_read_tool(
-                            farm_id=farm_id,
-                            tool_name=tool_name,
-                            tool_input=tool_input,
-                        )
-
                         function_responses.append(
                             Part.from_function_response(
                                 name=tool_name,
                                 # Reason: response must be a plain dict, not a
                                 # JSON string. execute_read_tool already returns dicts.
-                                response=result,
+                                response=next(read_results),
                             )
                         )
 
@@ -307,6 +336,7 @@ class FarmLevelAIChatService:
                     "userMessage": message,
                     "assistantMessage": final_text,
                     "toolsUsed": tools_used,
+                    "toolCalls": tool_calls_log,
                     "hasPendingAction": pending_action is not None,
                     "timestamp": datetime.utcnow(),
                 }
@@ -386,6 +416,8 @@ class FarmLevelAIChatService:
                 tool_name=action_data["tool_name"],
                 tool_input=action_data["tool_input"],
             )
+            # Cached tool results in every chat may now be stale.
+            invalidate_tool_results()
 
             # Refresh cached token if using HTTP client (MCP clients skip this)
             try:
@@ -13,6 +13,8 @@ to avoid duplication.
 
 from vertexai.generative_models import FunctionDeclaration, Tool
 
+from src.core.ai_tools import SideEffect, ToolSpec
+
 # Re-use the Google Search tool builder from the block-level module
 from ..farm_ai.tool_definitions import get_google_search_tool  # noqa: F401
 
@@ -386,6 +388,18 @@ WRITE_TOOL_NAMES: set[str] = {t["name"] for t in WRITE_TOOLS}
 # All tools combined (reads first, then writes)
 ALL_TOOLS = READ_TOOLS + WRITE_TOOLS
 
+# Side-effect class and shared result-cache TTL per tool (src/core/ai_tools).
+TOOL_SPECS = [
+    ToolSpec("get_farm_overview", cache_ttl_seconds=60),
+    ToolSpec("get_block_equipment", cache_ttl_seconds=120),
+    ToolSpec("get_block_sensor_readings", cache_ttl_seconds=15),
+    ToolSpec("get_block_automations", cache_ttl_seconds=60),
+    ToolSpec("get_block_alerts", cache_ttl_seconds=15),
+    ToolSpec("get_all_blocks_alerts", cache_ttl_seconds=15),
+    ToolSpec("get_block_system_status", cache_ttl_seconds=15),
+    ToolSpec("web_search", cache_ttl_seconds=600),
+] + [ToolSpec(name, SideEffect.WRITE) for name in sorted(WRITE_TOOL_NAMES)]
+
 
 def get_gemini_tools(include_write: bool = True) -> list[Tool]:
     """
@@ -1,14 +1,15 @@
 """
 Global AI Chat - Context Builder
 
-Builds the system prompt for the global monitoring assistant by loading
-a summary of all farms and their connected block counts from MongoDB.
+Builds the system prompt for the global monitoring assistant from the
+platform context snapshot (one row per active farm with its block and
+SenseHub-connected counts), maintained by services.ai_context.
 """
 
 import logging
 from datetime import datetime
 
-from ..database import farm_db
+from ..ai_context import get_platform_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -17,55 +18,14 @@ async def build_global_system_prompt() -> str:
     """
     Build the system prompt for the global farm monitoring AI assistant.
 
-    Loads all farms from MongoDB and computes per-farm block counts and
-    SenseHub-connected block counts to include in the prompt as context.
+    Embeds the platform snapshot's per-farm summary rows (block counts and
+    SenseHub-connected block counts) as context.
 
     Returns:
         System prompt string with farm summary table embedded.
     """
-    db = farm_db.get_database()
-
-    # Load all active farms
-    farms_cursor = db.farms.find({"isActive": True})
-    farms = await farms_cursor.to_list(length=500)
-
-    farm_rows: list[str] = []
-
-    for farm in farms:
-        farm_id_str = farm.get("farmId", "")
-        farm_name = farm.get("name", "Unknown Farm")
-        location = farm.get("location", {})
-        if isinstance(location, dict):
-            city = location.get("city", "")
-            country = location.get("country", "")
-            location_str = ", ".join(filter(None, [city, country])) or "Unknown"
-        else:
-            location_str = str(location) if location else "Unknown"
-
-        # Count all active blocks for this farm
-        block_count = await db.blocks.count_documents(
-            {"farmId": farm_id_str, "isActive": True}
-        )
-
-        # Count SenseHub-connected blocks (enabled IoT controller present)
-        connected_count = await db.blocks.count_documents(
-            {
-                "farmId": farm_id_str,
-                "isActive": True,
-                "iotController.enabled": True,
-                "iotController.connectionStatus": "connected",
-            }
-        )
-
-        farm_rows.append(
-            f"  - {farm_name} | {location_str} | {block_count} blocks | "
-            f"{connected_count} SenseHub-connected"
-        )
-
-    if farm_rows:
-        farm_summary = "\n".join(farm_rows)
-    else:
-        farm_summary = "  (No active farms found)"
+    snapshot = await get_platform_snapshot()
+    farm_summary = snapshot.get("summary") or "  (No active farms found)"
 
     today = datetime.utcnow().strftime("%Y-%m-%d")
 
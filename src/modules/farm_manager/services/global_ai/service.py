@@ -10,6 +10,7 @@ tool_definitions.py and executed by tool_executor.py.
 
 import logging
 from datetime import datetime
+from typing import Optional
 
 import vertexai
 from google.api_core.exceptions import GoogleAPICallError
@@ -21,8 +22,9 @@ from vertexai.generative_models import (
 )
 
 from src.config.settings import settings
+from src.core.ai_tools import ToolCall, ToolRuntime
 from .context_builder import build_global_system_prompt
-from .tool_definitions import get_gemini_tools
+from .tool_definitions import TOOL_SPECS, get_gemini_tools
 from .tool_executor import execute_tool
 from .models import GlobalAIChatResponse
 from ..database import farm_db
@@ -32,6 +34,8 @@ logger = logging.getLogger(__name__)
 # Max tool-use loop iterations to prevent runaway API calls
 MAX_TOOL_ROUNDS = 5
 
+_tool_runtime = ToolRuntime("global_ai", TOOL_SPECS)
+
 
 def _init_vertexai() -> None:
     """
@@ -63,6 +67,8 @@ class GlobalAIChatService:
         message: str,
         conversation_history: list[dict],
         user_id: str,
+        organization_id: Optional[str] = None,
+        user_role: Optional[str] = None,
     ) -> GlobalAIChatResponse:
         """
         Process a user chat message through Gemini with global farm context.
@@ -74,14 +80,18 @@ class GlobalAIChatService:
           4. Convert conversation history to Gemini Content objects.
           5. Create GenerativeModel with system instruction baked in.
           6. Enter tool-use loop (MAX_TOOL_ROUNDS):
-             - All tools are read-only; execute immediately and feed back.
+             - All tools are read-only; run the round's calls concurrently
+               through the shared tool runtime and feed the results back.
           7. Log interaction to MongoDB.
           8. Return GlobalAIChatResponse.
 
         Args:
             message: User's chat message.
             conversation_history: Previous messages as [{role, content}, ...].
-            user_id: Current user ID (used for audit logging only).
+            user_id: Current user ID (logging and the tool result cache key).
+            organization_id: Scope of the shared tool result cache; without
+                one tool results are not cached.
+            user_role: Current user's role (tool result cache key).
 
         Returns:
             GlobalAIChatResponse with message text and tools_used list.
@@ -129,6 +139,7 @@ class GlobalAIChatService:
         )
 
         tools_used: list[str] = []
+        tool_calls_log: list[dict] = []
         final_text = ""
 
         try:
@@ -152,27 +163,36 @@ class GlobalAIChatService:
                     # No more tool calls — extract final text and exit
                     break
 
-                # Process each function call in this round
-                function_responses: list[Part] = []
-
-                for fc_part in function_calls:
-                    tool_name: str = fc_part.function_call.name
-                    # Reason: Gemini returns a MapComposite; cast to plain dict
-                    # so downstream executor code can .get() / iterate it.
-                    tool_input: dict = dict(fc_part.function_call.args)
-                    tools_used.append(tool_name)
-
-                    # All tools are read-only — execute immediately
-                    result = await execute_tool(tool_name, tool_input)
-
-                    function_responses.append(
-                        Part.from_function_response(
-                            name=tool_name,
-                            # Reason: response must be a plain dict, not a
-                            # JSON string. execute_tool already returns dicts.
-                            response=result,
-                        )
+                # Reason: Gemini returns a MapComposite; cast to plain dict
+                # so downstream executor code can .get() / iterate it.
+                calls = [
+                    ToolCall(
+                        name=fc_part.function_call.name,
+                        input=dict(fc_part.function_call.args),
                     )
+                    for fc_part in function_calls
+                ]
+                tools_used.extend(call.name for call in calls)
+
+                # All tools are read-only — run this round's calls concurrently
+                outcomes = await _tool_runtime.run(
+                    calls,
+                    lambda call: execute_tool(call.name, call.input),
+                    scope=organization_id,
+                    user_id=user_id,
+                    role=user_role,
+                )
+                tool_calls_log.extend(outcome.to_log() for outcome in outcomes)
+
+                function_responses: list[Part] = [
+                    Part.from_function_response(
+                        name=outcome.call.name,
+                        # Reason: response must be a plain dict, not a
+                        # JSON string. execute_tool already returns dicts.
+                        response=outcome.result,
+                    )
+                    for outcome in outcomes
+                ]
 
                 # Send all function responses back to Gemini in a single turn
                 response = await chat.send_message_async(
@@ -219,6 +239,7 @@ class GlobalAIChatService:
                     "userMessage": message,
                     "assistantMessage": final_text,
                     "toolsUsed": tools_used,
+                    "toolCalls": tool_calls_log,
                     "timestamp": datetime.utcnow(),
                 }
             )
@@ -12,6 +12,8 @@ assistant which has the appropriate confirmation flow.
 
 from vertexai.generative_models import FunctionDeclaration, Tool
 
+from src.core.ai_tools import ToolSpec
+
 # Reason: Reuse the shared Google Search grounding tool helper.
 from ..farm_ai.tool_definitions import (
     get_google_search_tool,
@@ -182,6 +184,18 @@ GLOBAL_READ_TOOLS = [
 ]
 
 
+# Side-effect class and shared result-cache TTL per tool (src/core/ai_tools).
+TOOL_SPECS = [
+    ToolSpec("get_all_farms", cache_ttl_seconds=60),
+    ToolSpec("get_farm_blocks", cache_ttl_seconds=60),
+    ToolSpec("get_block_equipment_list", cache_ttl_seconds=120),
+    ToolSpec("get_block_sensors", cache_ttl_seconds=15),
+    ToolSpec("get_farm_alerts", cache_ttl_seconds=15),
+    ToolSpec("get_all_alerts", cache_ttl_seconds=15),
+    ToolSpec("web_search", cache_ttl_seconds=600),
+]
+
+
 def get_gemini_tools() -> list[Tool]:
     """
     Convert GLOBAL_READ_TOOLS definitions to a Gemini-compatible Tool list.
@@ -0,0 +1,64 @@
+"""
+Input Inventory Search
+
+Registers input inventory items (fertilizers, seeds, chemicals…) with the
+shared search index (src.core.search) and holds the list-endpoint query used
+when the index is enabled for ``inventory_input``.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core import search as search_index
+from src.core.search import SearchEntity, register_search_entity
+
+SEARCH_ENTITY = register_search_entity(
+    SearchEntity(
+        name="inventory_input",
+        collection="inventory_input",
+        id_field="inventoryId",
+        fields=("itemName", "brand", "sku"),
+        scope_field="organizationId",
+        filter_fields=("farmId", "category"),
+    )
+)
+
+
+async def search_input_inventory(
+    db,
+    organization_id: str,
+    text: str,
+    *,
+    farm_id: Optional[str] = None,
+    category: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Ranked, typo-tolerant search of an organisation's input inventory.
+
+    Args:
+        db: Motor database handle
+        organization_id: Owning organisation
+        text: Search text (item name, brand or SKU)
+        farm_id: Only this farm's items, if given
+        category: Only this InputCategory value, if given
+        skip: Items to skip
+        limit: Page size
+
+    Returns:
+        (documents in rank order, estimated total), or None when the index
+        is not enabled for input inventory (callers use their $regex query).
+    """
+    if not await search_index.use_search_index(db, SEARCH_ENTITY.name):
+        return None
+    page = await search_index.search(
+        db,
+        SEARCH_ENTITY.name,
+        text,
+        scope=organization_id,
+        filters={"farmId": farm_id, "category": category},
+        limit=limit,
+        skip=skip,
+    )
+    docs = await search_index.fetch_hits(db, SEARCH_ENTITY.name, page)
+    return docs, page.estimated_total
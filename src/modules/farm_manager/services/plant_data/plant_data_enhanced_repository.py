@@ -16,9 +16,22 @@ from ...models.plant_data_enhanced import (
     FarmTypeEnum,
 )
 from ..database import farm_db
+from src.core import search as search_index
+from src.core.search import SearchEntity, register_search_entity
 
 logger = logging.getLogger(__name__)
 
+SEARCH_ENTITY = register_search_entity(
+    SearchEntity(
+        name="plant_data",
+        collection="plant_data_enhanced",
+        id_field="plantDataId",
+        fields=("plantName", "scientificName", "varietyName", "tags"),
+        filter_fields=("organizationId", "isActive"),
+        include=lambda doc: doc.get("deletedAt") is None,
+    )
+)
+
 
 class PlantDataEnhancedRepository:
     """Repository for enhanced PlantData data access with comprehensive filtering"""
@@ -92,6 +105,7 @@ class PlantDataEnhancedRepository:
 
         if not result.inserted_id:
             raise Exception("Failed to create enhanced plant data")
+        await search_index.reindex(db, SEARCH_ENTITY.name, [plant_dict["plantDataId"]])
 
         logger.info(
             f"[PlantData Enhanced Repository] Created plant data: "
@@ -269,6 +283,38 @@ class PlantDataEnhancedRepository:
         db = farm_db.get_database()
         import re
 
+        # Reason: the search index only carries the org and active flag, so
+        # any other filter keeps the $regex query below
+        only_indexed_filters = not any(
+            [
+                include_deleted,
+                farm_type,
+                min_growth_cycle is not None,
+                max_growth_cycle is not None,
+                tags,
+                created_by,
+                contributor,
+                target_region,
+            ]
+        )
+        if (
+            search
+            and only_indexed_filters
+            and await search_index.use_search_index(db, SEARCH_ENTITY.name)
+        ):
+            page = await search_index.search(
+                db,
+                SEARCH_ENTITY.name,
+                search,
+                filters={"organizationId": organization_id, "isActive": is_active},
+                limit=limit,
+                skip=skip,
+            )
+            plant_docs = await search_index.fetch_hits(db, SEARCH_ENTITY.name, page)
+            return [PlantDataEnhanced(**doc) for doc in plant_docs], (
+                page.estimated_total
+            )
+
         # Build query
         query: Dict[str, Any] = {}
 
@@ -409,6 +455,7 @@ class PlantDataEnhancedRepository:
 
         if result.matched_count == 0:
             return None
+        await search_index.reindex(db, SEARCH_ENTITY.name, [plant_data_id])
 
         logger.info(
             f"[PlantData Enhanced Repository] Updated plant data: "
@@ -437,6 +484,7 @@ class PlantDataEnhancedRepository:
 
         if result.matched_count == 0:
             return False
+        await search_index.reindex(db, SEARCH_ENTITY.name, [plant_data_id])
 
         logger.info(
             f"[PlantData Enhanced Repository] Soft deleted plant data: {plant_data_id}"
@@ -498,6 +546,7 @@ class PlantDataEnhancedRepository:
 
         if result.deleted_count == 0:
             return False
+        await search_index.reindex(db, SEARCH_ENTITY.name, [plant_data_id])
 
         logger.warning(
             f"[PlantData Enhanced Repository] HARD DELETED plant data: {plant_data_id}"
@@ -599,6 +648,9 @@ class PlantDataEnhancedRepository:
 
         if not result.inserted_ids:
             raise Exception("Bulk insert failed")
+        await search_index.reindex(
+            db, SEARCH_ENTITY.name, [d["plantDataId"] for d in plant_dicts]
+        )
 
         logger.info(
             f"[PlantData Enhanced Repository] Bulk created {len(plant_objects)} plant data records"
@@ -25,11 +25,58 @@ from ...models.plant_mother import (
     PlantMotherUpdate,
     PlantProduct,
 )
+from src.core.propagation import (
+    DenormalizedField,
+    PropagationTarget,
+    register_denormalized_field,
+)
 from ..database import farm_db
 from .plant_data_enhanced_repository import PlantDataEnhancedRepository
 
 logger = logging.getLogger(__name__)
 
+# A renamed mother's plantName/scientificName is pushed down onto its
+# denormalized copies (by the propagation engine, after the request), so
+# downstream display stays consistent with the product record instead of
+# freezing on a stale name:
+#
+# - plant_data_enhanced (varieties): plantName + scientificName, matched by
+#   motherPlantId. Not scoped to isActive/deletedAt — an inactive or
+#   soft-deleted variety should still show the correct product name if it's
+#   ever surfaced again, not a stale one.
+# - blocks: productName only, matched by productMotherId. blocks never
+#   stored scientificName in the first place (only
+#   productMotherId/productName — see models/block.py).
+# - block_archives: productName only, same reasoning as blocks (historical
+#   cycles should still read the current product name, not the one at time
+#   of archival).
+MOTHER_NAME_FIELD = register_denormalized_field(
+    DenormalizedField(
+        name="plant_mother.name",
+        source_collection="plant_mothers",
+        source_id_field="plantMotherId",
+        targets=(
+            PropagationTarget(
+                PlantDataEnhancedRepository.COLLECTION,
+                match_field="motherPlantId",
+                paths={"plantName": "plantName", "scientificName": "scientificName"},
+                stamp_updated_at=True,
+            ),
+            PropagationTarget(
+                "blocks",
+                match_field="productMotherId",
+                paths={"productName": "plantName"},
+                stamp_updated_at=True,
+            ),
+            PropagationTarget(
+                "block_archives",
+                match_field="productMotherId",
+                paths={"productName": "plantName"},
+            ),
+        ),
+    )
+)
+
 
 class PlantMotherRepository:
     """Repository for mother-plant (product) data access"""
@@ -327,61 +374,6 @@ class PlantMotherRepository:
             )
         return result.matched_count > 0
 
-    @staticmethod
-    async def cascade_rename(
-        plant_mother_id: UUID,
-        plant_name: str,
-        scientific_name: Optional[str],
-    ) -> Dict[str, int]:
-        """
-        Push a renamed mother's plantName/scientificName down onto its
-        denormalized copies, so downstream display stays consistent with
-        the product record instead of freezing on a stale name:
-
-        - plant_data_enhanced (varieties): plantName + scientificName,
-          matched by motherPlantId. Not scoped to isActive/deletedAt — an
-          inactive or soft-deleted variety should still show the correct
-          product name if it's ever surfaced again, not a stale one.
-        - blocks: productName only, matched by productMotherId. blocks
-          never stored scientificName in the first place (only
-          productMotherId/productName — see models/block.py), so there is
-          nothing to cascade there for a scientificName-only change.
-        - block_archives: productName only, matched by productMotherId,
-          same reasoning as blocks (historical cycles should still read the
-          current product name, not the one at time of archival).
-
-        Returns:
-            Dict of modified counts per collection, for logging.
-        """
-        db = farm_db.get_database()
-        mother_id_str = str(plant_mother_id)
-        now = datetime.utcnow()
-
-        varieties_result = await db[PlantDataEnhancedRepository.COLLECTION].update_many(
-            {"motherPlantId": mother_id_str},
-            {
-                "$set": {
-                    "plantName": plant_name,
-                    "scientificName": scientific_name,
-                    "updatedAt": now,
-                }
-            },
-        )
-        blocks_result = await db.blocks.update_many(
-            {"productMotherId": mother_id_str},
-            {"$set": {"productName": plant_name, "updatedAt": now}},
-        )
-        archives_result = await db.block_archives.update_many(
-            {"productMotherId": mother_id_str},
-            {"$set": {"productName": plant_name}},
-        )
-
-        return {
-            "varietiesUpdated": varieties_result.modified_count,
-            "blocksUpdated": blocks_result.modified_count,
-            "blockArchivesUpdated": archives_result.modified_count,
-        }
-
     # ==================== Stage 1: products[] ====================
 
     @staticmethod
@@ -28,7 +28,9 @@ from ...models.plant_mother import (
     ProductUnit,
 )
 from ...models.plant_data_enhanced import PlantDataEnhanced, PlantDataEnhancedCreate
-from .plant_mother_repository import PlantMotherRepository
+from src.core.propagation import enqueue_propagation
+from ..database import farm_db
+from .plant_mother_repository import MOTHER_NAME_FIELD, PlantMotherRepository
 from .plant_data_enhanced_repository import PlantDataEnhancedRepository
 from .plant_data_enhanced_service import PlantDataEnhancedService
 
@@ -159,10 +161,11 @@ class PlantMotherService:
         plant_mother_id: UUID, update_data: PlantMotherUpdate
     ) -> PlantMother:
         """
-        Update a mother plant. When plantName/scientificName change, cascades
-        the new values down onto its varieties (plant_data_enhanced) and
-        blocks'/block_archives' denormalized productName, so downstream
-        display never freezes on a stale product name.
+        Update a mother plant. When plantName/scientificName change, queues
+        a ``plant_mother.name`` propagation that carries the new values down
+        onto its varieties (plant_data_enhanced) and blocks'/block_archives'
+        denormalized productName shortly after, so downstream display never
+        freezes on a stale product name (see MOTHER_NAME_FIELD).
 
         Raises:
             HTTPException: 404 if not found; 409 if renaming onto a name
@@ -199,12 +202,12 @@ class PlantMotherService:
             )
 
         if name_changed:
-            cascade_counts = await PlantMotherRepository.cascade_rename(
-                plant_mother_id, updated.plantName, updated.scientificName
+            await enqueue_propagation(
+                farm_db.get_database(), MOTHER_NAME_FIELD.name, plant_mother_id
             )
             logger.info(
-                f"[PlantMother Service] Cascaded rename for mother "
-                f"{plant_mother_id} ('{updated.plantName}'): {cascade_counts}"
+                f"[PlantMother Service] Queued rename propagation for mother "
+                f"{plant_mother_id} ('{updated.plantName}')"
             )
 
         logger.info(f"[PlantMother Service] Updated mother plant: {plant_mother_id}")
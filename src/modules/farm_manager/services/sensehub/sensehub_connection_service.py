@@ -12,6 +12,7 @@ from uuid import UUID
 
 from fastapi import HTTPException
 
+from ..ai_context import mark_context_dirty
 from ..database import farm_db
 from .sensehub_client import SenseHubClient
 from .sensehub_mcp_client import SenseHubMCPClient
@@ -129,6 +130,7 @@ class SenseHubConnectionService:
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Block not found")
 
+        await mark_context_dirty(db, [farm_id])
         version = health.get("version", "unknown")
 
         return {
@@ -160,6 +162,7 @@ class SenseHubConnectionService:
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Block not found")
 
+        await mark_context_dirty(db, [farm_id])
         return {"status": "disconnected"}
 
     @staticmethod
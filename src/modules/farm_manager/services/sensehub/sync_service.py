@@ -6,8 +6,8 @@ all IoT-connected SenseHub instances and persists them to MongoDB.  When
 SenseHub is offline, dashboards and AI tools fall back to cached data.
 
 Follows the WeatherCacheService / WatchdogScheduler singleton pattern:
-  - asyncio background task with configurable interval
-  - Redis distributed lock to prevent duplicate runs across Uvicorn workers
+  - scheduled on the leader-elected job runner (src.core.jobs), so only one
+    Uvicorn worker syncs per cycle
   - Per-block error isolation (one failure doesn't stop the full sync)
   - 90-day TTL on all cached data
 
@@ -24,14 +24,16 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 
+from src.core.indexes import declare_index
+from src.core.jobs import JobDefinition, get_job_runner
+
 from ..database import farm_db
 from .sensehub_connection_service import SenseHubConnectionService
 
 logger = logging.getLogger(__name__)
 
-# Redis lock key to prevent multiple workers from syncing simultaneously
-LOCK_KEY = "sensehub:sync_lock"
-LOCK_TTL_SECONDS = 600  # 10 minutes (sync can take a while)
+# Hard stop for a single scheduled sync (replaces the old 10-minute Redis lock TTL)
+SYNC_TIMEOUT_SECONDS = 3600
 
 # TTL for cached data in seconds (90 days)
 CACHE_TTL_SECONDS = 90 * 24 * 60 * 60
@@ -167,16 +169,13 @@ class SenseHubSyncService:
     Usage::
 
         service = await SenseHubSyncService.initialize(db)
-        await service.start_background_sync()
-
-        # On shutdown:
-        await SenseHubSyncService.get_instance().stop_background_sync()
+        get_job_runner().register(service.job_definition())
     """
 
+    JOB_NAME = "farm.sensehub_sync"
+
     _instance: Optional["SenseHubSyncService"] = None
     _db = None
-    _task: Optional[asyncio.Task] = None
-    _is_running: bool = False
     _last_sync: Optional[datetime] = None
     _last_sync_result: Optional[dict] = None
     _last_reconcile_result: Optional[dict] = None
@@ -191,185 +190,128 @@ class SenseHubSyncService:
     async def initialize(cls, db) -> "SenseHubSyncService":
         instance = cls.get_instance()
         instance._db = db
-        await instance._create_indexes()
+        cls._declare_indexes()
         logger.info("[SenseHubSync] Initialized")
         return instance
 
     # =========================================================================
-    # Index creation
+    # Index declarations
     # =========================================================================
 
-    async def _create_indexes(self) -> None:
-        if self._db is None:
-            return
-
+    @staticmethod
+    def _declare_indexes() -> None:
         try:
             # --- sensehub_equipment_cache ---
-            eq_col = self._db["sensehub_equipment_cache"]
-            await eq_col.create_index(
+            declare_index(
+                "sensehub_equipment_cache",
                 [("blockId", 1), ("equipmentId", 1)],
                 unique=True,
                 name="uniq_block_equipment",
             )
-            await eq_col.create_index("farmId", name="idx_farmId")
-            await eq_col.create_index(
+            declare_index("sensehub_equipment_cache", "farmId", name="idx_farmId")
+            declare_index(
+                "sensehub_equipment_cache",
                 "syncedAt",
                 expireAfterSeconds=CACHE_TTL_SECONDS,
                 name="ttl_syncedAt",
             )
-            await eq_col.create_index(
+            declare_index(
+                "sensehub_equipment_cache",
                 [("blockId", 1), ("type", 1)],
                 name="idx_block_type",
             )
 
             # --- sensehub_lab_cache ---
-            lab_col = self._db["sensehub_lab_cache"]
-            await lab_col.create_index(
+            declare_index(
+                "sensehub_lab_cache",
                 [("blockId", 1), ("nutrient", 1), ("zone", 1), ("timestamp", 1)],
                 unique=True,
                 name="uniq_block_nutrient_zone_ts",
             )
-            await lab_col.create_index("farmId", name="idx_farmId")
-            await lab_col.create_index(
+            declare_index("sensehub_lab_cache", "farmId", name="idx_farmId")
+            declare_index(
+                "sensehub_lab_cache",
                 "syncedAt",
                 expireAfterSeconds=CACHE_TTL_SECONDS,
                 name="ttl_syncedAt",
             )
-            await lab_col.create_index(
+            declare_index(
+                "sensehub_lab_cache",
                 [("blockId", 1), ("zone", 1), ("timestamp", -1)],
                 name="idx_block_zone_ts",
             )
 
             # --- sensehub_alerts_cache ---
-            alert_col = self._db["sensehub_alerts_cache"]
-            await alert_col.create_index(
+            declare_index(
+                "sensehub_alerts_cache",
                 [("blockId", 1), ("alertId", 1)],
                 unique=True,
                 name="uniq_block_alert",
             )
-            await alert_col.create_index("farmId", name="idx_farmId")
-            await alert_col.create_index(
+            declare_index("sensehub_alerts_cache", "farmId", name="idx_farmId")
+            declare_index(
+                "sensehub_alerts_cache",
                 "syncedAt",
                 expireAfterSeconds=CACHE_TTL_SECONDS,
                 name="ttl_syncedAt",
             )
-            await alert_col.create_index(
+            declare_index(
+                "sensehub_alerts_cache",
                 [("blockId", 1), ("severity", 1)],
                 name="idx_block_severity",
             )
 
             # --- sensehub_snapshots_cache ---
-            snap_col = self._db["sensehub_snapshots_cache"]
-            await snap_col.create_index(
+            declare_index(
+                "sensehub_snapshots_cache",
                 [("blockId", 1), ("cameraId", 1), ("snapshotId", 1)],
                 unique=True,
                 name="uniq_block_camera_snapshot",
             )
-            await snap_col.create_index("farmId", name="idx_farmId")
-            await snap_col.create_index(
+            declare_index("sensehub_snapshots_cache", "farmId", name="idx_farmId")
+            declare_index(
+                "sensehub_snapshots_cache",
                 "syncedAt",
                 expireAfterSeconds=SNAPSHOT_TTL_SECONDS,
                 name="ttl_syncedAt",
             )
-            await snap_col.create_index(
+            declare_index(
+                "sensehub_snapshots_cache",
                 [("blockId", 1), ("cameraId", 1), ("capturedAt", -1)],
                 name="idx_block_camera_captured",
             )
 
             # --- sensehub_sync_log ---
-            log_col = self._db["sensehub_sync_log"]
-            await log_col.create_index("syncId", unique=True, name="uniq_syncId")
-            await log_col.create_index(
+            declare_index(
+                "sensehub_sync_log", "syncId", unique=True, name="uniq_syncId"
+            )
+            declare_index(
+                "sensehub_sync_log",
                 "startedAt",
                 expireAfterSeconds=CACHE_TTL_SECONDS,
                 name="ttl_startedAt",
             )
 
-            logger.info("[SenseHubSync] MongoDB indexes created/verified")
+            logger.info("[SenseHubSync] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[SenseHubSync] Index creation error: {e}")
-
-    # =========================================================================
-    # Redis distributed lock
-    # =========================================================================
-
-    async def _acquire_lock(self) -> bool:
-        try:
-            from src.core.cache.redis_cache import get_redis_cache
-
-            cache = await get_redis_cache()
-            if not cache.is_available or not cache._redis:
-                return True  # No Redis = fall back to running
-
-            acquired = await cache._redis.set(
-                LOCK_KEY, "1", nx=True, ex=LOCK_TTL_SECONDS
-            )
-            return bool(acquired)
-        except Exception as e:
-            logger.warning(f"[SenseHubSync] Lock acquire failed: {e}")
-            return True
-
-    async def _release_lock(self) -> None:
-        try:
-            from src.core.cache.redis_cache import get_redis_cache
-
-            cache = await get_redis_cache()
-            if cache.is_available and cache._redis:
-                await cache._redis.delete(LOCK_KEY)
-        except Exception:
-            pass
+            logger.error(f"[SenseHubSync] Index declaration error: {e}")
 
     # =========================================================================
-    # Background sync loop
+    # Job runner integration
     # =========================================================================
 
-    async def start_background_sync(
+    def job_definition(
         self, interval_seconds: int = DEFAULT_SYNC_INTERVAL
-    ) -> None:
-        if self._is_running:
-            logger.warning("[SenseHubSync] Already running, skipping start()")
-            return
-
-        self._is_running = True
-
-        async def sync_loop() -> None:
-            logger.info("[SenseHubSync] Background sync started")
-            await asyncio.sleep(STARTUP_DELAY)
-
-            while self._is_running:
-                try:
-                    if not await self._acquire_lock():
-                        logger.debug(
-                            "[SenseHubSync] Another worker holds the lock, skipping"
-                        )
-                    else:
-                        try:
-                            await self.run_sync()
-                        finally:
-                            await self._release_lock()
-
-                    await asyncio.sleep(interval_seconds)
-
-                except asyncio.CancelledError:
-                    logger.info("[SenseHubSync] Task cancelled")
-                    break
-                except Exception as exc:
-                    logger.error(f"[SenseHubSync] Loop error: {exc}")
-                    await asyncio.sleep(300)
-
-        self._task = asyncio.create_task(sync_loop())
-        logger.info("[SenseHubSync] Background task created")
-
-    async def stop_background_sync(self) -> None:
-        self._is_running = False
-        if self._task is not None:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
-        logger.info("[SenseHubSync] Stopped")
+    ) -> JobDefinition:
+        """Job definition for src.core.jobs (leader-only, one run at a time)."""
+        return JobDefinition(
+            name=self.JOB_NAME,
+            func=self.run_sync,
+            interval_seconds=interval_seconds,
+            startup_delay_seconds=STARTUP_DELAY,
+            timeout_seconds=SYNC_TIMEOUT_SECONDS,
+            description="SenseHub equipment/alerts/lab/snapshot sync",
+        )
 
     # =========================================================================
     # Core sync logic
@@ -1321,8 +1263,10 @@ class SenseHubSyncService:
     # =========================================================================
 
     def get_status(self) -> dict:
+        runner = get_job_runner()
         return {
-            "isRunning": self._is_running,
+            "isRunning": runner.is_running
+            and runner.get_job(self.JOB_NAME) is not None,
             "lastSync": self._last_sync.isoformat() if self._last_sync else None,
             "lastSyncResult": self._last_sync_result,
             "lastReconcileResult": self._last_reconcile_result,
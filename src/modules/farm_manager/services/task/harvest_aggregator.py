@@ -4,6 +4,10 @@ Harvest Aggregator Service
 Daily cron job to aggregate daily harvest tasks.
 Runs at 23:00 (11 PM) every day to finalize the day's harvest entries
 and generate the next day's task if block is still in HARVESTING state.
+
+Tasks being aggregated are always stored documents (starting a series
+occurrence materializes it). For a series, "the next day's task" is its next
+occurrence; the series is only extended when its window has run out.
 """
 
 from datetime import datetime, timedelta
@@ -88,27 +92,40 @@ class HarvestAggregatorService:
                             # Generate task for tomorrow
                             tomorrow = today_start + timedelta(days=1)
 
-                            next_task_data = FarmTaskCreate(
-                                farmId=task.farmId,
-                                blockId=task.blockId,
-                                taskType=TaskType.DAILY_HARVEST,
-                                scheduledDate=tomorrow,
-                                dueDate=tomorrow.replace(hour=23, minute=59, second=59),
-                                assignedTo=None,
-                                description=f"Daily harvest for {block.get('name', block.get('blockCode'))}",
-                            )
-
-                            # Create next day's task
-                            next_task = await TaskRepository.create(
-                                next_task_data,
-                                is_auto_generated=True,
-                                generated_from_cycle_id=task.generatedFromCycleId,
-                            )
-
-                            stats["new_tasks_generated"] += 1
-                            logger.info(
-                                f"Generated next day's harvest task {next_task.taskId} for block {task.blockId}"
-                            )
+                            if task.seriesId:
+                                # Tomorrow is the series' next occurrence
+                                # unless its window has run out
+                                if await TaskRepository.extend_series(
+                                    task.seriesId, tomorrow
+                                ):
+                                    stats["new_tasks_generated"] += 1
+                                    logger.info(
+                                        f"Extended harvest series {task.seriesId} for block {task.blockId}"
+                                    )
+                            else:
+                                next_task_data = FarmTaskCreate(
+                                    farmId=task.farmId,
+                                    blockId=task.blockId,
+                                    taskType=TaskType.DAILY_HARVEST,
+                                    scheduledDate=tomorrow,
+                                    dueDate=tomorrow.replace(
+                                        hour=23, minute=59, second=59
+                                    ),
+                                    assignedTo=None,
+                                    description=f"Daily harvest for {block.get('name', block.get('blockCode'))}",
+                                )
+
+                                # Create next day's task
+                                next_task = await TaskRepository.create(
+                                    next_task_data,
+                                    is_auto_generated=True,
+                                    generated_from_cycle_id=task.generatedFromCycleId,
+                                )
+
+                                stats["new_tasks_generated"] += 1
+                                logger.info(
+                                    f"Generated next day's harvest task {next_task.taskId} for block {task.blockId}"
+                                )
 
                     except Exception as e:
                         logger.error(
@@ -10,9 +10,10 @@ from uuid import UUID
 from datetime import datetime, timedelta
 import logging
 
-from ...models.farm_task import FarmTaskCreate, TaskType, FarmTask
+from ...models.farm_task import FarmTaskCreate, FarmTaskSeries, TaskType, FarmTask
 from ...models.block import BlockStatus
 from .task_repository import TaskRepository
+from .task_series import expand_series, new_series_id
 from ..database import farm_db
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ class TaskGeneratorService:
         1. Planting
         2. Fruiting check (if plant has fruiting stage)
         3. Harvest readiness check
-        4. Daily harvest tasks (one per day in harvest window)
+        4. Daily harvest tasks (one series covering the harvest window)
         5. Harvest completion check
         6. Cleaning
 
@@ -182,7 +183,7 @@ class TaskGeneratorService:
             )
 
             # 4. DAILY HARVEST TASKS
-            # Create one task per day in harvest window
+            # One recurring series for the harvest window
             daily_harvest_tasks = (
                 await TaskGeneratorService._generate_daily_harvest_tasks(
                     farm_id=farm_id,
@@ -266,6 +267,9 @@ class TaskGeneratorService:
         """
         Generate daily harvest tasks for the harvest window
 
+        Stored as one farm_task_series rule; the returned tasks are its
+        occurrences, which only get documents once workers touch them.
+
         Args:
             farm_id: Farm ID
             block_id: Block ID
@@ -281,28 +285,22 @@ class TaskGeneratorService:
         # In future, get this from plant data
         harvest_period_days = 30
 
-        daily_tasks = []
-
-        # Create one task per day
-        for day_offset in range(harvest_period_days):
-            task_date = harvest_start_date + timedelta(days=day_offset)
-
-            daily_harvest_task = FarmTaskCreate(
+        end_of_day = harvest_start_date.replace(hour=23, minute=59, second=59)
+        series = await TaskRepository.create_series(
+            FarmTaskSeries(
+                seriesId=new_series_id(),
                 farmId=farm_id,
                 blockId=block_id,
                 taskType=TaskType.DAILY_HARVEST,
-                scheduledDate=task_date,
-                dueDate=task_date.replace(hour=23, minute=59, second=59),  # End of day
-                assignedTo=None,
-                description=f"Daily harvest for {block_name} - Day {day_offset + 1}",
+                description=f"Daily harvest for {block_name} - Day {{n}}",
+                startDate=harvest_start_date,
+                intervalDays=1,
+                count=harvest_period_days,
+                dueOffsetSeconds=int((end_of_day - harvest_start_date).total_seconds()),
+                generatedFromCycleId=cycle_id,
             )
-
-            task = await TaskRepository.create(
-                daily_harvest_task,
-                is_auto_generated=True,
-                generated_from_cycle_id=cycle_id,
-            )
-            daily_tasks.append(task)
+        )
+        daily_tasks = expand_series(series)
 
         logger.info(
             f"Generated {len(daily_tasks)} daily harvest tasks for block {block_id}"
@@ -366,23 +364,28 @@ class TaskGeneratorService:
             )
             total_rescheduled += count
 
-            # Reschedule DAILY_HARVEST tasks
-            # Get existing daily harvest tasks count
+            # Reschedule DAILY_HARVEST tasks: one update of the series rule
+            count = await TaskRepository.reschedule_series_for_cycle(
+                cycle_id, TaskType.DAILY_HARVEST, harvest_date
+            )
+            total_rescheduled += count
+
+            # Per-day documents of cycles generated before series existed
             existing_tasks = await db.farm_tasks.count_documents(
                 {
                     "generatedFromCycleId": str(cycle_id),
                     "taskType": TaskType.DAILY_HARVEST.value,
+                    "seriesId": None,
                 }
             )
-
-            # Generate new dates for all daily harvest tasks
-            new_harvest_dates = [
-                harvest_date + timedelta(days=i) for i in range(existing_tasks)
-            ]
-            count = await TaskRepository.reschedule_tasks_for_cycle(
-                cycle_id, TaskType.DAILY_HARVEST, new_harvest_dates
-            )
-            total_rescheduled += count
+            if existing_tasks:
+                new_harvest_dates = [
+                    harvest_date + timedelta(days=i) for i in range(existing_tasks)
+                ]
+                count = await TaskRepository.reschedule_tasks_for_cycle(
+                    cycle_id, TaskType.DAILY_HARVEST, new_harvest_dates
+                )
+                total_rescheduled += count
 
             # Reschedule HARVEST_COMPLETION task
             harvest_end_estimate = harvest_date + timedelta(days=30)
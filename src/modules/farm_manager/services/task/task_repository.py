@@ -6,12 +6,15 @@ Handles all database operations for farm tasks.
 
 from typing import List, Optional, Tuple, Dict
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
+from pymongo.errors import DuplicateKeyError
+
 from ...models.farm_task import (
     FarmTask,
     FarmTaskCreate,
+    FarmTaskSeries,
     FarmTaskUpdate,
     FarmTaskWithDetails,
     TaskType,
@@ -23,9 +26,151 @@ from ...models.farm_task import (
     TaskData,
 )
 from ..database import farm_db
+from .task_series import (
+    SERIES_COLLECTION,
+    build_occurrence,
+    count_virtual,
+    expand_series,
+    index_on_or_after,
+    is_virtual,
+    split_occurrence_id,
+)
 
 logger = logging.getLogger(__name__)
 
+_DAY_MS = 24 * 3600 * 1000
+
+
+def _task_document(task: FarmTask) -> dict:
+    """FarmTask as stored in farm_tasks (UUIDs as strings)."""
+    task_dict = task.model_dump()
+    task_dict["taskId"] = str(task_dict["taskId"])
+    task_dict["farmId"] = str(task_dict["farmId"])
+    task_dict["blockId"] = str(task_dict["blockId"])
+    if task_dict.get("assignedTo"):
+        task_dict["assignedTo"] = str(task_dict["assignedTo"])
+    if task_dict.get("completedBy"):
+        task_dict["completedBy"] = str(task_dict["completedBy"])
+    if task_dict.get("generatedFromCycleId"):
+        task_dict["generatedFromCycleId"] = str(task_dict["generatedFromCycleId"])
+    if task_dict.get("seriesId"):
+        task_dict["seriesId"] = str(task_dict["seriesId"])
+
+    # Convert task data properly
+    if task_dict.get("taskData"):
+        task_data_obj = task_dict["taskData"]
+        if task_data_obj.get("harvestEntries"):
+            for entry in task_data_obj["harvestEntries"]:
+                entry["entryId"] = str(entry["entryId"])
+                entry["userId"] = str(entry["userId"])
+        if task_data_obj.get("totalHarvest") and task_data_obj["totalHarvest"].get(
+            "contributors"
+        ):
+            task_data_obj["totalHarvest"]["contributors"] = [
+                str(uid) for uid in task_data_obj["totalHarvest"]["contributors"]
+            ]
+    return task_dict
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored dates are naive UTC; make window bounds comparable to them."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def _load_series(db, query: Dict) -> List[FarmTaskSeries]:
+    series_list = []
+    async for doc in db[SERIES_COLLECTION].find(query):
+        doc.pop("_id", None)
+        series_list.append(FarmTaskSeries(**doc))
+    return series_list
+
+
+def _sorted_tasks(tasks: List[FarmTask], sort: List[Tuple[str, int]]) -> List[FarmTask]:
+    # Stable sorts from the last key to the first == multi-key sort
+    for field, direction in reversed(sort):
+        tasks.sort(key=lambda t: getattr(t, field), reverse=direction < 0)
+    return tasks
+
+
+async def _read_tasks(
+    db,
+    query: Dict,
+    series_query: Dict,
+    sort: List[Tuple[str, int]],
+    status: Optional[TaskStatus] = None,
+    scheduled_from: Optional[datetime] = None,
+    scheduled_to: Optional[datetime] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[List[FarmTask], int]:
+    """
+    farm_tasks documents matching ``query`` plus the virtual occurrences of the
+    series matching ``series_query``, filtered by status and scheduled-date
+    window [scheduled_from, scheduled_to), merged in ``sort`` order.
+
+    Returns:
+        Tuple of (tasks[skip:skip + limit], total count)
+    """
+    scheduled_from = _naive_utc(scheduled_from)
+    scheduled_to = _naive_utc(scheduled_to)
+    if status:
+        query["status"] = status.value
+    window: Dict = {}
+    if scheduled_from is not None:
+        window["$gte"] = scheduled_from
+    if scheduled_to is not None:
+        window["$lt"] = scheduled_to
+    if window:
+        query["scheduledDate"] = window
+
+    virtual: List[FarmTask] = []
+    for series in await _load_series(db, series_query):
+        virtual.extend(expand_series(series, scheduled_from, scheduled_to, status))
+
+    cursor = db.farm_tasks.find(query).sort(sort)
+    if limit is not None:
+        # The merged page can't hold more stored tasks than this
+        cursor = cursor.limit(skip + limit)
+    tasks = []
+    async for task_doc in cursor:
+        task_doc.pop("_id", None)
+        tasks.append(FarmTask(**task_doc))
+
+    # An override inserted just before its series recorded it is read once
+    stored = {t.taskId for t in tasks}
+    virtual = [t for t in virtual if t.taskId not in stored]
+    stored_total = (
+        await db.farm_tasks.count_documents(query) if limit is not None else len(tasks)
+    )
+    merged = _sorted_tasks(tasks + virtual, sort) if virtual else tasks
+    end = None if limit is None else skip + limit
+    return merged[skip:end], stored_total + len(virtual)
+
+
+async def _cancel_series(db, series_query: Dict, now: datetime) -> int:
+    """
+    Cut off the open series matching ``series_query`` at ``now``.
+
+    Returns:
+        Number of virtual occurrences that now read as cancelled
+    """
+    series_query = {**series_query, "cancelledAfter": None}
+    series_list = await _load_series(db, series_query)
+    if not series_list:
+        return 0
+    cancelled = 0
+    for series in series_list:
+        cancelled += count_virtual(
+            series.model_copy(update={"cancelledAfter": now}),
+            TaskStatus.CANCELLED,
+        )
+    await db[SERIES_COLLECTION].update_many(
+        series_query, {"$set": {"cancelledAfter": now, "updatedAt": now}}
+    )
+    return cancelled
+
 
 async def _enrich_tasks_with_block_farm(
     tasks: List[FarmTask],
@@ -117,31 +262,7 @@ class TaskRepository:
             generatedFromCycleId=generated_from_cycle_id,
         )
 
-        # Convert UUIDs to strings for MongoDB
-        task_dict = task.model_dump()
-        task_dict["taskId"] = str(task_dict["taskId"])
-        task_dict["farmId"] = str(task_dict["farmId"])
-        task_dict["blockId"] = str(task_dict["blockId"])
-        if task_dict.get("assignedTo"):
-            task_dict["assignedTo"] = str(task_dict["assignedTo"])
-        if task_dict.get("completedBy"):
-            task_dict["completedBy"] = str(task_dict["completedBy"])
-        if task_dict.get("generatedFromCycleId"):
-            task_dict["generatedFromCycleId"] = str(task_dict["generatedFromCycleId"])
-
-        # Convert task data properly
-        if task_dict.get("taskData"):
-            task_data_obj = task_dict["taskData"]
-            if task_data_obj.get("harvestEntries"):
-                for entry in task_data_obj["harvestEntries"]:
-                    entry["entryId"] = str(entry["entryId"])
-                    entry["userId"] = str(entry["userId"])
-            if task_data_obj.get("totalHarvest") and task_data_obj["totalHarvest"].get(
-                "contributors"
-            ):
-                task_data_obj["totalHarvest"]["contributors"] = [
-                    str(uid) for uid in task_data_obj["totalHarvest"]["contributors"]
-                ]
+        task_dict = _task_document(task)
 
         result = await db.farm_tasks.insert_one(task_dict)
 
@@ -153,33 +274,140 @@ class TaskRepository:
         )
         return task
 
+    @staticmethod
+    async def create_series(series: FarmTaskSeries) -> FarmTaskSeries:
+        """
+        Create a recurring task series (one document for all its occurrences)
+
+        Args:
+            series: Series rule; seriesId from task_series.new_series_id()
+
+        Returns:
+            Created FarmTaskSeries
+        """
+        db = farm_db.get_database()
+
+        series_dict = series.model_dump()
+        for key in ("seriesId", "farmId", "blockId", "assignedTo"):
+            if series_dict.get(key):
+                series_dict[key] = str(series_dict[key])
+        if series_dict.get("generatedFromCycleId"):
+            series_dict["generatedFromCycleId"] = str(
+                series_dict["generatedFromCycleId"]
+            )
+
+        await db[SERIES_COLLECTION].insert_one(series_dict)
+
+        logger.info(
+            f"Created task series {series.seriesId} ({series.taskType}, "
+            f"{series.count} occurrences) for block {series.blockId}"
+        )
+        return series
+
+    @staticmethod
+    async def get_series(series_id: UUID) -> Optional[FarmTaskSeries]:
+        """Get a task series by ID"""
+        db = farm_db.get_database()
+
+        series_doc = await db[SERIES_COLLECTION].find_one({"seriesId": str(series_id)})
+        if not series_doc:
+            return None
+
+        series_doc.pop("_id", None)
+        return FarmTaskSeries(**series_doc)
+
+    @staticmethod
+    async def _get_virtual(task_id: UUID) -> Optional[FarmTask]:
+        """The series occurrence ``task_id`` names, if it has no document yet."""
+        series_id, index = split_occurrence_id(task_id)
+        if index < 0:
+            return None
+        series = await TaskRepository.get_series(series_id)
+        if not series or not is_virtual(series, index):
+            return None
+        return build_occurrence(series, index)
+
     @staticmethod
     async def get_by_id(task_id: UUID) -> Optional[FarmTask]:
-        """Get task by ID"""
+        """Get task by ID (a stored task or a series occurrence)"""
         db = farm_db.get_database()
 
         task_doc = await db.farm_tasks.find_one({"taskId": str(task_id)})
         if not task_doc:
-            return None
+            return await TaskRepository._get_virtual(task_id)
 
         # Remove MongoDB _id
         task_doc.pop("_id", None)
 
         return FarmTask(**task_doc)
 
+    @staticmethod
+    async def materialize(task_id: UUID) -> Optional[FarmTask]:
+        """
+        Give a series occurrence its own farm_tasks document (override)
+
+        Called before an occurrence is started, completed or edited; the
+        document keeps the occurrence's taskId. A no-op for stored tasks.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            The stored task, or None if not found
+        """
+        db = farm_db.get_database()
+
+        task_doc = await db.farm_tasks.find_one({"taskId": str(task_id)})
+        if task_doc:
+            task_doc.pop("_id", None)
+            return FarmTask(**task_doc)
+
+        task = await TaskRepository._get_virtual(task_id)
+        if not task:
+            return None
+
+        try:
+            await db.farm_tasks.insert_one(_task_document(task))
+        except DuplicateKeyError:
+            pass  # materialized concurrently; same document
+        await db[SERIES_COLLECTION].update_one(
+            {"seriesId": str(task.seriesId)},
+            {"$addToSet": {"materialized": task.occurrenceIndex}},
+        )
+
+        logger.info(
+            f"Materialized occurrence {task.occurrenceIndex} of series {task.seriesId}"
+        )
+        return task
+
+    @staticmethod
+    async def _update_task(db, task_id: UUID, update) -> bool:
+        """update_one on a task, materializing a series occurrence first."""
+        result = await db.farm_tasks.update_one({"taskId": str(task_id)}, update)
+        if result.matched_count == 0 and await TaskRepository.materialize(task_id):
+            result = await db.farm_tasks.update_one({"taskId": str(task_id)}, update)
+        return result.matched_count > 0
+
     @staticmethod
     async def get_by_farm(
         farm_id: UUID,
+        scheduled_from: datetime,
+        scheduled_to: datetime,
         status: Optional[TaskStatus] = None,
         page: int = 1,
         per_page: int = 50,
         farming_year: Optional[int] = None,
     ) -> Tuple[List[FarmTask], int]:
         """
-        Get tasks for a farm
+        Get tasks for a farm scheduled in a window (stored tasks and series
+        occurrences)
+
+        The window is required: every series of the farm is expanded for it.
 
         Args:
             farm_id: Farm ID
+            scheduled_from: Window start (inclusive)
+            scheduled_to: Window end (exclusive)
             status: Optional status filter
             page: Page number
             per_page: Results per page
@@ -192,8 +420,6 @@ class TaskRepository:
 
         # Build query
         query: Dict = {"farmId": str(farm_id)}
-        if status:
-            query["status"] = status.value
 
         # Filter by farming year - find blocks planted in this farming year
         if farming_year is not None:
@@ -214,25 +440,19 @@ class TaskRepository:
                 # No blocks with this farming year, return empty result
                 return [], 0
 
-        # Get total count
-        total = await db.farm_tasks.count_documents(query)
-
-        # Get paginated results sorted by scheduled date
-        skip = (page - 1) * per_page
-        cursor = (
-            db.farm_tasks.find(query)
-            .sort("scheduledDate", 1)
-            .skip(skip)
-            .limit(per_page)
+        # Paginated results sorted by scheduled date
+        return await _read_tasks(
+            db,
+            query,
+            dict(query),
+            [("scheduledDate", 1)],
+            status=status,
+            scheduled_from=scheduled_from,
+            scheduled_to=scheduled_to,
+            skip=(page - 1) * per_page,
+            limit=per_page,
         )
 
-        tasks = []
-        async for task_doc in cursor:
-            task_doc.pop("_id", None)
-            tasks.append(FarmTask(**task_doc))
-
-        return tasks, total
-
     @staticmethod
     async def get_by_block(
         block_id: UUID,
@@ -242,7 +462,7 @@ class TaskRepository:
         sort_by: str = "scheduledDate",
     ) -> Tuple[List[FarmTask], int]:
         """
-        Get tasks for a block
+        Get tasks for a block (stored tasks and series occurrences)
 
         Args:
             block_id: Block ID
@@ -258,48 +478,151 @@ class TaskRepository:
 
         # Build query
         query: Dict = {"blockId": str(block_id)}
-        if status:
-            query["status"] = status.value
-
-        # Get total count
-        total = await db.farm_tasks.count_documents(query)
 
         # Determine sort configuration
-        # Priority sort: high > medium > low (ascending order since h < l < m alphabetically doesn't work)
-        # We use a custom sort for priority: high=1, medium=2, low=3
-        skip = (page - 1) * per_page
-
         if sort_by == "priority":
             # For priority sorting, we need to sort by priority value
             # high < medium < low alphabetically, so ascending gives us the right order
-            cursor = (
-                db.farm_tasks.find(query)
-                .sort([("priority", 1), ("scheduledDate", 1)])
-                .skip(skip)
-                .limit(per_page)
-            )
+            sort = [("priority", 1), ("scheduledDate", 1)]
         elif sort_by == "createdAt":
-            cursor = (
-                db.farm_tasks.find(query)
-                .sort("createdAt", -1)
-                .skip(skip)
-                .limit(per_page)
-            )
+            sort = [("createdAt", -1)]
         else:
             # Default: scheduledDate
-            cursor = (
-                db.farm_tasks.find(query)
-                .sort("scheduledDate", 1)
-                .skip(skip)
-                .limit(per_page)
-            )
+            sort = [("scheduledDate", 1)]
+
+        return await _read_tasks(
+            db,
+            query,
+            dict(query),
+            sort,
+            status=status,
+            skip=(page - 1) * per_page,
+            limit=per_page,
+        )
 
-        tasks = []
-        async for task_doc in cursor:
-            task_doc.pop("_id", None)
-            tasks.append(FarmTask(**task_doc))
+    @staticmethod
+    async def list_by_block(
+        block_id: UUID,
+        status: Optional[TaskStatus] = None,
+        scheduled_from: Optional[datetime] = None,
+        scheduled_to: Optional[datetime] = None,
+        task_type: Optional[TaskType] = None,
+        trigger_state_change: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[FarmTask]:
+        """
+        Tasks of a block, oldest scheduled first (stored tasks and series
+        occurrences)
 
-        return tasks, total
+        Args:
+            block_id: Block ID
+            status: Optional status filter
+            scheduled_from: Optional window start (inclusive)
+            scheduled_to: Optional window end (exclusive)
+            task_type: Optional task type filter
+            trigger_state_change: Optional filter on the block status the
+                task offers on completion
+            limit: Optional maximum number of tasks
+
+        Returns:
+            List of tasks
+        """
+        db = farm_db.get_database()
+
+        query: Dict = {"blockId": str(block_id)}
+        if task_type:
+            query["taskType"] = task_type.value
+        if trigger_state_change:
+            query["triggerStateChange"] = trigger_state_change
+
+        tasks, _ = await _read_tasks(
+            db,
+            query,
+            dict(query),
+            [("scheduledDate", 1)],
+            status=status,
+            scheduled_from=scheduled_from,
+            scheduled_to=scheduled_to,
+            limit=limit,
+        )
+        return tasks
+
+    @staticmethod
+    async def count_by_status_for_block(block_id: UUID) -> Dict[str, int]:
+        """
+        Number of tasks of a block per status value (stored tasks and series
+        occurrences)
+
+        Args:
+            block_id: Block ID
+
+        Returns:
+            Dict of status value -> count (statuses without tasks are absent)
+        """
+        db = farm_db.get_database()
+
+        counts: Dict[str, int] = {}
+        async for row in db.farm_tasks.aggregate(
+            [
+                {"$match": {"blockId": str(block_id)}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ]
+        ):
+            counts[row["_id"]] = row["count"]
+
+        for series in await _load_series(db, {"blockId": str(block_id)}):
+            for status in (TaskStatus.PENDING, TaskStatus.CANCELLED):
+                virtual = count_virtual(series, status)
+                if virtual:
+                    counts[status.value] = counts.get(status.value, 0) + virtual
+        return counts
+
+    @staticmethod
+    async def cancel_series_for_block(
+        block_id: UUID, task_types: Optional[List[TaskType]] = None
+    ) -> int:
+        """
+        Cut off a block's open series at now
+
+        Occurrences scheduled from now on read as cancelled; earlier ones
+        keep their status. Stored tasks are left to the caller.
+
+        Args:
+            block_id: Block ID
+            task_types: Optional task types to limit the series to
+
+        Returns:
+            Number of occurrences cancelled
+        """
+        db = farm_db.get_database()
+
+        series_query: Dict = {"blockId": str(block_id)}
+        if task_types:
+            series_query["taskType"] = {"$in": [tt.value for tt in task_types]}
+
+        cancelled = await _cancel_series(db, series_query, datetime.utcnow())
+        logger.info(f"Cancelled {cancelled} series occurrences for block {block_id}")
+        return cancelled
+
+    @staticmethod
+    async def delete_series_for_block(block_id: UUID) -> int:
+        """
+        Delete a block's series; their stored overrides are left to the caller
+
+        Args:
+            block_id: Block ID
+
+        Returns:
+            Number of pending occurrences removed with the series
+        """
+        db = farm_db.get_database()
+
+        removed = sum(
+            count_virtual(series, TaskStatus.PENDING)
+            for series in await _load_series(db, {"blockId": str(block_id)})
+        )
+        await db[SERIES_COLLECTION].delete_many({"blockId": str(block_id)})
+        return removed
 
     @staticmethod
     async def get_by_user(
@@ -343,15 +666,23 @@ class TaskRepository:
 
     @staticmethod
     async def get_my_tasks(
-        farm_id: UUID, user_id: UUID, status: Optional[TaskStatus] = None
+        farm_id: UUID,
+        user_id: UUID,
+        status: Optional[TaskStatus] = None,
+        scheduled_from: Optional[datetime] = None,
+        scheduled_to: Optional[datetime] = None,
     ) -> List[FarmTask]:
         """
         Get tasks visible to a user (auto-tasks for their farms + tasks assigned to them)
 
+        Series occurrences are included alongside stored tasks.
+
         Args:
             farm_id: Farm ID
             user_id: User ID
             status: Optional status filter
+            scheduled_from: Optional window start (inclusive)
+            scheduled_to: Optional window end (exclusive)
 
         Returns:
             List of tasks
@@ -366,16 +697,15 @@ class TaskRepository:
             ]
         }
 
-        if status:
-            query["status"] = status.value
-
-        cursor = db.farm_tasks.find(query).sort("scheduledDate", 1)
-
-        tasks = []
-        async for task_doc in cursor:
-            task_doc.pop("_id", None)
-            tasks.append(FarmTask(**task_doc))
-
+        tasks, _ = await _read_tasks(
+            db,
+            query,
+            dict(query),
+            [("scheduledDate", 1)],
+            status=status,
+            scheduled_from=scheduled_from,
+            scheduled_to=scheduled_to,
+        )
         return tasks
 
     @staticmethod
@@ -394,15 +724,20 @@ class TaskRepository:
 
         farm_id_strs = [str(fid) for fid in farm_ids]
 
-        query: Dict = {
-            "status": TaskStatus.PENDING.value,
+        visible: Dict = {
             "$or": [
                 {"farmId": {"$in": farm_id_strs}, "assignedTo": None},  # Auto-tasks
                 {"assignedTo": str(user_id)},  # Assigned tasks
             ],
         }
 
-        return await db.farm_tasks.count_documents(query)
+        count = await db.farm_tasks.count_documents(
+            {**visible, "status": TaskStatus.PENDING.value}
+        )
+        # Pending series occurrences without a document
+        for series in await _load_series(db, visible):
+            count += count_virtual(series, TaskStatus.PENDING)
+        return count
 
     @staticmethod
     async def update(task_id: UUID, update_data: FarmTaskUpdate) -> Optional[FarmTask]:
@@ -437,11 +772,7 @@ class TaskRepository:
         # Add updatedAt timestamp
         update_dict["updatedAt"] = datetime.utcnow()
 
-        result = await db.farm_tasks.update_one(
-            {"taskId": str(task_id)}, {"$set": update_dict}
-        )
-
-        if result.matched_count == 0:
+        if not await TaskRepository._update_task(db, task_id, {"$set": update_dict}):
             return None
 
         return await TaskRepository.get_by_id(task_id)
@@ -473,11 +804,7 @@ class TaskRepository:
             "updatedAt": datetime.utcnow(),
         }
 
-        result = await db.farm_tasks.update_one(
-            {"taskId": str(task_id)}, {"$set": update_dict}
-        )
-
-        if result.matched_count == 0:
+        if not await TaskRepository._update_task(db, task_id, {"$set": update_dict}):
             return None
 
         logger.info(f"Task {task_id} completed by {user_email}")
@@ -511,15 +838,14 @@ class TaskRepository:
         entry_dict["userId"] = str(entry_dict["userId"])
 
         # Add to harvestEntries array (keep status as pending - will auto-complete at 11 PM)
-        result = await db.farm_tasks.update_one(
-            {"taskId": str(task_id)},
+        if not await TaskRepository._update_task(
+            db,
+            task_id,
             {
                 "$push": {"taskData.harvestEntries": entry_dict},
                 "$set": {"updatedAt": datetime.utcnow()},
             },
-        )
-
-        if result.matched_count == 0:
+        ):
             return None
 
         logger.info(
@@ -586,11 +912,7 @@ class TaskRepository:
         # Convert contributors to strings for MongoDB
         update_dict["taskData.totalHarvest"]["contributors"] = contributors
 
-        result = await db.farm_tasks.update_one(
-            {"taskId": str(task_id)}, {"$set": update_dict}
-        )
-
-        if result.matched_count == 0:
+        if not await TaskRepository._update_task(db, task_id, {"$set": update_dict}):
             return None
 
         # Create harvest record and update block KPI
@@ -697,7 +1019,9 @@ class TaskRepository:
         """
         Cancel future auto-generated tasks for a block cycle
 
-        Used when harvest ends early or block is reset.
+        Used when harvest ends early or block is reset. Series of the cycle
+        are cut off at now; their stored occurrences are cancelled like any
+        other task.
 
         Args:
             cycle_id: Block cycle ID
@@ -709,26 +1033,35 @@ class TaskRepository:
         db = farm_db.get_database()
 
         task_type_values = [tt.value for tt in task_types]
+        now = datetime.utcnow()
 
         result = await db.farm_tasks.update_many(
             {
                 "generatedFromCycleId": str(cycle_id),
                 "taskType": {"$in": task_type_values},
                 "status": TaskStatus.PENDING.value,
-                "scheduledDate": {"$gt": datetime.utcnow()},
+                "scheduledDate": {"$gt": now},
             },
             {
                 "$set": {
                     "status": TaskStatus.CANCELLED.value,
-                    "updatedAt": datetime.utcnow(),
+                    "updatedAt": now,
                 }
             },
         )
+        cancelled = result.modified_count
 
-        logger.info(
-            f"Cancelled {result.modified_count} future tasks for cycle {cycle_id}"
+        cancelled += await _cancel_series(
+            db,
+            {
+                "generatedFromCycleId": str(cycle_id),
+                "taskType": {"$in": task_type_values},
+            },
+            now,
         )
-        return result.modified_count
+
+        logger.info(f"Cancelled {cancelled} future tasks for cycle {cycle_id}")
+        return cancelled
 
     @staticmethod
     async def reschedule_tasks_for_cycle(
@@ -737,6 +1070,8 @@ class TaskRepository:
         """
         Reschedule auto-generated tasks when block timeline changes
 
+        Series occurrences are left to reschedule_series_for_cycle.
+
         Args:
             cycle_id: Block cycle ID
             task_type: Task type to reschedule
@@ -753,6 +1088,7 @@ class TaskRepository:
                 "generatedFromCycleId": str(cycle_id),
                 "taskType": task_type.value,
                 "status": TaskStatus.PENDING.value,
+                "seriesId": None,
             }
         ).sort("scheduledDate", 1)
 
@@ -780,6 +1116,96 @@ class TaskRepository:
         )
         return updated_count
 
+    @staticmethod
+    async def reschedule_series_for_cycle(
+        cycle_id: UUID, task_type: TaskType, new_start_date: datetime
+    ) -> int:
+        """
+        Move the series of a block cycle to a new start date
+
+        One update of the series rule; pending stored occurrences follow the
+        rule (one update per series that has any).
+
+        Args:
+            cycle_id: Block cycle ID
+            task_type: Task type of the series
+            new_start_date: New scheduled date of occurrence 0
+
+        Returns:
+            Number of occurrences rescheduled
+        """
+        db = farm_db.get_database()
+        now = datetime.utcnow()
+
+        series_query = {
+            "generatedFromCycleId": str(cycle_id),
+            "taskType": task_type.value,
+        }
+        series_list = await _load_series(db, series_query)
+        if not series_list:
+            return 0
+
+        await db[SERIES_COLLECTION].update_many(
+            series_query, {"$set": {"startDate": new_start_date, "updatedAt": now}}
+        )
+
+        rescheduled = 0
+        for series in series_list:
+            rescheduled += count_virtual(series)
+            if not series.materialized:
+                continue
+            # startDate + occurrenceIndex * interval, computed server-side
+            offset = {"$multiply": ["$occurrenceIndex", series.intervalDays * _DAY_MS]}
+            new_dates: Dict = {
+                "scheduledDate": {"$add": [new_start_date, offset]},
+                "updatedAt": now,
+            }
+            if series.dueOffsetSeconds is not None:
+                new_dates["dueDate"] = {
+                    "$add": [new_start_date, offset, series.dueOffsetSeconds * 1000]
+                }
+            result = await db.farm_tasks.update_many(
+                {
+                    "seriesId": str(series.seriesId),
+                    "status": TaskStatus.PENDING.value,
+                },
+                [{"$set": new_dates}],
+            )
+            rescheduled += result.modified_count
+
+        logger.info(
+            f"Rescheduled {len(series_list)} {task_type} series "
+            f"({rescheduled} occurrences) for cycle {cycle_id}"
+        )
+        return rescheduled
+
+    @staticmethod
+    async def extend_series(series_id: UUID, through: datetime) -> bool:
+        """
+        Grow a series so that it has an occurrence on or after ``through``
+
+        Used by the harvest aggregator when a block is still harvesting at
+        the end of its series window.
+
+        Returns:
+            True if the series was extended
+        """
+        db = farm_db.get_database()
+
+        series = await TaskRepository.get_series(series_id)
+        if not series or series.cancelledAfter is not None:
+            return False
+
+        needed = index_on_or_after(series, _naive_utc(through)) + 1
+        if needed <= series.count:
+            return False
+
+        result = await db[SERIES_COLLECTION].update_one(
+            {"seriesId": str(series_id), "count": {"$lt": needed}},
+            {"$set": {"count": needed, "updatedAt": datetime.utcnow()}},
+        )
+        return result.modified_count > 0
+
     @staticmethod
     async def delete(task_id: UUID) -> bool:
         """
@@ -799,4 +1225,16 @@ class TaskRepository:
             logger.info(f"Deleted farm task: {task_id}")
             return True
 
+        # A series occurrence without a document becomes an exception
+        task = await TaskRepository._get_virtual(task_id)
+        if task:
+            await db[SERIES_COLLECTION].update_one(
+                {"seriesId": str(task.seriesId)},
+                {"$addToSet": {"exceptions": task.occurrenceIndex}},
+            )
+            logger.info(
+                f"Deleted occurrence {task.occurrenceIndex} of series {task.seriesId}"
+            )
+            return True
+
         return False
@@ -0,0 +1,164 @@
+"""
+Recurring Task Series
+
+A recurring auto-task (the daily harvest window) is one farm_task_series
+rule rather than one farm_tasks document per day:
+
+    startDate, intervalDays, count      occurrence i is scheduled at
+                                        startDate + i * intervalDays
+    exceptions                          deleted occurrence indexes
+    materialized                        indexes that have a farm_tasks override
+    cancelledAfter                      occurrences after it read as cancelled
+
+Occurrences are expanded on read for the requested date window.  An
+occurrence only gets a farm_tasks document (its override, carrying seriesId
+and occurrenceIndex) when a worker starts, completes or edits it; from then on
+that document is the occurrence.  Rescheduling a series is one update of
+``startDate``.
+
+Occurrence ids
+--------------
+Virtual occurrences must be addressable by taskId like any task (get, start,
+add harvest entry), so their ids are derived from the series id: a series id
+is a uuid4 whose low 16 bits are zero, and occurrence ``i`` is that id with
+``i + 1`` in those bits.  ``split_occurrence_id`` recovers (seriesId, index)
+from a taskId without a lookup table; the override document keeps the same
+taskId, so the id is stable across materialization.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from ...models.farm_task import FarmTask, FarmTaskSeries, TaskStatus
+
+SERIES_COLLECTION = "farm_task_series"
+
+_INDEX_BITS = 0xFFFF
+
+
+def new_series_id() -> UUID:
+    """A fresh series id (uuid4 with the occurrence bits cleared)."""
+    return UUID(int=uuid4().int & ~_INDEX_BITS)
+
+
+def occurrence_task_id(series_id: UUID, index: int) -> UUID:
+    """taskId of occurrence ``index`` of a series."""
+    return UUID(int=series_id.int | (index + 1))
+
+
+def split_occurrence_id(task_id: UUID) -> Tuple[UUID, int]:
+    """(seriesId, index) a taskId would be an occurrence of; index -1 if none."""
+    return UUID(int=task_id.int & ~_INDEX_BITS), (task_id.int & _INDEX_BITS) - 1
+
+
+def occurrence_date(series: FarmTaskSeries, index: int) -> datetime:
+    """Scheduled date of occurrence ``index``."""
+    return series.startDate + timedelta(days=index * series.intervalDays)
+
+
+def index_on_or_after(series: FarmTaskSeries, when: datetime) -> int:
+    """Index of the first occurrence scheduled at or after ``when``."""
+    if when <= series.startDate:
+        return 0
+    step = timedelta(days=series.intervalDays)
+    return -(-(when - series.startDate) // step)
+
+
+def occurrence_status(series: FarmTaskSeries, index: int) -> TaskStatus:
+    """Status of an occurrence that has no override document."""
+    if series.cancelledAfter and occurrence_date(series, index) > (
+        series.cancelledAfter
+    ):
+        return TaskStatus.CANCELLED
+    return TaskStatus.PENDING
+
+
+def is_virtual(series: FarmTaskSeries, index: int) -> bool:
+    """Whether occurrence ``index`` exists and has no override document."""
+    return (
+        0 <= index < series.count
+        and index not in series.exceptions
+        and index not in series.materialized
+    )
+
+
+def build_occurrence(series: FarmTaskSeries, index: int) -> FarmTask:
+    """Occurrence ``index`` as a task (as it reads before any override)."""
+    scheduled = occurrence_date(series, index)
+    return FarmTask(
+        taskId=occurrence_task_id(series.seriesId, index),
+        farmId=series.farmId,
+        blockId=series.blockId,
+        taskType=series.taskType,
+        title=series.title,
+        scheduledDate=scheduled,
+        dueDate=(
+            scheduled + timedelta(seconds=series.dueOffsetSeconds)
+            if series.dueOffsetSeconds is not None
+            else None
+        ),
+        priority=series.priority,
+        assignedTo=series.assignedTo,
+        description=(
+            series.description.replace("{n}", str(index + 1))
+            if series.description
+            else None
+        ),
+        triggerStateChange=series.triggerStateChange,
+        status=occurrence_status(series, index),
+        isAutoGenerated=series.isAutoGenerated,
+        generatedFromCycleId=series.generatedFromCycleId,
+        seriesId=series.seriesId,
+        occurrenceIndex=index,
+        divisionId=series.divisionId,
+        organizationId=series.organizationId,
+        createdAt=series.createdAt,
+        updatedAt=series.updatedAt,
+    )
+
+
+def expand_series(
+    series: FarmTaskSeries,
+    scheduled_from: Optional[datetime] = None,
+    scheduled_to: Optional[datetime] = None,
+    status: Optional[TaskStatus] = None,
+) -> List[FarmTask]:
+    """
+    Virtual occurrences of ``series`` scheduled in [scheduled_from,
+    scheduled_to), in schedule order.
+
+    Occurrences with an override document are skipped: the farm_tasks query
+    of the same read returns them.
+    """
+    first = index_on_or_after(series, scheduled_from) if scheduled_from else 0
+    last = (
+        min(series.count, index_on_or_after(series, scheduled_to))
+        if scheduled_to
+        else series.count
+    )
+    occurrences = []
+    for index in range(first, last):
+        if not is_virtual(series, index):
+            continue
+        if status is not None and occurrence_status(series, index) != status:
+            continue
+        occurrences.append(build_occurrence(series, index))
+    return occurrences
+
+
+def count_virtual(series: FarmTaskSeries, status: Optional[TaskStatus] = None) -> int:
+    """Number of virtual occurrences (with ``status``) without expanding them."""
+    if status not in (None, TaskStatus.PENDING, TaskStatus.CANCELLED):
+        return 0
+    indexes = range(series.count)
+    if status is not None:
+        # First index scheduled after cancelledAfter
+        cut = (
+            index_on_or_after(series, series.cancelledAfter + timedelta(microseconds=1))
+            if series.cancelledAfter is not None
+            else series.count
+        )
+        indexes = indexes[cut:] if status == TaskStatus.CANCELLED else indexes[:cut]
+    hidden = set(series.exceptions) | set(series.materialized)
+    return len(indexes) - sum(1 for i in hidden if i in indexes)
@@ -6,7 +6,7 @@ Handles task management operations with validation and business rules.
 
 from typing import List, Optional, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
 from ...models.farm_task import (
@@ -26,6 +26,9 @@ from ..database import farm_db
 
 logger = logging.getLogger(__name__)
 
+# Farm task lists without an explicit window cover this far either side of now
+FARM_TASK_WINDOW = timedelta(days=90)
+
 
 class TaskService:
     """Service for farm task operations"""
@@ -116,6 +119,8 @@ class TaskService:
         page: int = 1,
         per_page: int = 50,
         farming_year: Optional[int] = None,
+        scheduled_from: Optional[datetime] = None,
+        scheduled_to: Optional[datetime] = None,
     ) -> PaginatedResponse[FarmTaskWithDetails]:
         """
         Get tasks for a farm, enriched with block/farm context for the
@@ -127,12 +132,23 @@ class TaskService:
             page: Page number
             per_page: Results per page
             farming_year: Optional farming year filter (filters by block's farmingYearPlanted)
+            scheduled_from: Window start (inclusive); defaults to
+                FARM_TASK_WINDOW before now
+            scheduled_to: Window end (exclusive); defaults to
+                FARM_TASK_WINDOW after now
 
         Returns:
             PaginatedResponse with paginated enriched tasks
         """
+        now = datetime.utcnow()
         tasks, total = await TaskRepository.get_by_farm(
-            farm_id, status, page, per_page, farming_year
+            farm_id,
+            scheduled_from or now - FARM_TASK_WINDOW,
+            scheduled_to or now + FARM_TASK_WINDOW,
+            status=status,
+            page=page,
+            per_page=per_page,
+            farming_year=farming_year,
         )
         total_pages = (total + per_page - 1) // per_page if total > 0 else 1
 
@@ -183,6 +199,8 @@ class TaskService:
         user_id: UUID,
         farm_id: Optional[UUID] = None,
         status: Optional[TaskStatus] = None,
+        scheduled_from: Optional[datetime] = None,
+        scheduled_to: Optional[datetime] = None,
     ) -> List[FarmTaskWithDetails]:
         """
         Get tasks visible to a user, enriched with block/farm context for
@@ -195,6 +213,8 @@ class TaskService:
             user_id: User ID
             farm_id: Optional farm filter
             status: Optional status filter
+            scheduled_from: Optional window start (inclusive)
+            scheduled_to: Optional window end (exclusive)
 
         Returns:
             List of tasks with block/farm context attached
@@ -226,7 +246,9 @@ class TaskService:
         # Get tasks for each farm
         all_tasks = []
         for fid in farm_ids:
-            tasks = await TaskRepository.get_my_tasks(fid, user_id, status)
+            tasks = await TaskRepository.get_my_tasks(
+                fid, user_id, status, scheduled_from, scheduled_to
+            )
             all_tasks.extend(tasks)
 
         # Sort by scheduled date
@@ -6,6 +6,7 @@ Services:
 - ChemicalsService         (discover from plant library)
 - PriceBook                (resolve prices from overrides / inventory)
 - FertilizerCalculator     (pure calculation engine)
+- FertilizerForecast       (NumPy day-by-day demand forecast)
 - ExcelHandler             (openpyxl export / import)
 - CalculationListsRepository (CRUD on saved lists)
 """
@@ -8,6 +8,12 @@ Export:
   - "Calculation" sheet: per-crop blocks with ingredient rows + subtotals
   - "Warnings" sheet: if any warnings exist
 
+Forecast export:
+  export_demand_forecast(forecast) → bytes (.xlsx)
+  - "Daily Demand" sheet: one row per day, one column per chemical (org total)
+  - "Per Farm" sheet: forecast-window totals per farm and chemical
+  - "Warnings" sheet: if any warnings exist
+
 Import:
   import_crops(file_bytes) → ParsedImport
   - Reads first sheet, expects "Crop Name", "Points", and optionally "Net Yield (kg)"
@@ -25,7 +31,7 @@ Template:
 import math
 import re
 from io import BytesIO
-from datetime import date
+from datetime import date, timedelta
 from typing import List, Optional
 
 from openpyxl import Workbook, load_workbook
@@ -39,6 +45,7 @@ from ...models.tools.calculator_request import (
     ParsedImportItem,
     SkippedRow,
 )
+from ...models.tools.demand_forecast import DemandForecastResponse
 
 # ---------------------------------------------------------------------------
 # Colour constants
@@ -453,6 +460,101 @@ def _write_per_input_sheet(wb: Workbook, response: CalculateResponse) -> None:
         ws.cell(row=current_row, column=5, value="N/A (missing prices)").font = gt_font
 
 
+def export_demand_forecast(forecast: DemandForecastResponse) -> bytes:
+    """
+    Produce a .xlsx file from a DemandForecastResponse.
+
+    Workbook layout:
+    - Sheet "Daily Demand": Date column plus one column per chemical
+      ("Name (unit)") with the organisation-wide quantity for each day and a
+      TOTAL row at the bottom.
+    - Sheet "Per Farm": Farm | Blocks | Chemical | Total Qty | Unit rows.
+    - Sheet "Warnings": one warning per row, only if warnings exist.
+
+    Args:
+        forecast: DemandForecastResponse from the forecast engine.
+
+    Returns:
+        Raw bytes of the .xlsx file.
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Daily Demand"
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill("solid", fgColor=_HEADER_BG)
+
+    def write_headers(sheet, headers: List[str]) -> None:
+        for col_idx, label in enumerate(headers, start=1):
+            cell = sheet.cell(row=1, column=col_idx, value=label)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal="center")
+
+    series = forecast.organization
+    write_headers(ws, ["Date"] + [f"{s.name} ({s.unit})" for s in series])
+    ws.column_dimensions["A"].width = 12
+    for col_idx in range(2, len(series) + 2):
+        ws.column_dimensions[get_column_letter(col_idx)].width = 18
+    ws.freeze_panes = "B2"
+
+    for day in range(forecast.days):
+        row = day + 2
+        day_cell = ws.cell(
+            row=row, column=1, value=forecast.startDate + timedelta(days=day)
+        )
+        day_cell.number_format = "yyyy-mm-dd"
+        for col_idx, s in enumerate(series, start=2):
+            cell = ws.cell(row=row, column=col_idx, value=s.daily[day])
+            cell.number_format = _FMT_DECIMAL
+
+    total_row = forecast.days + 2
+    total_fill = PatternFill("solid", fgColor=_GRAND_BG)
+    total_font = Font(bold=True)
+    ws.cell(row=total_row, column=1, value="TOTAL")
+    for col_idx, s in enumerate([None] + series, start=1):
+        cell = ws.cell(row=total_row, column=col_idx)
+        if s is not None:
+            cell.value = s.total
+            cell.number_format = _FMT_DECIMAL
+        cell.fill = total_fill
+        cell.font = total_font
+
+    # -- Per Farm sheet --
+    ws_farm = wb.create_sheet(title="Per Farm")
+    write_headers(ws_farm, ["Farm", "Blocks", "Chemical", "Total Qty", "Unit"])
+    for col_idx, width in enumerate([30, 8, 36, 14, 8], start=1):
+        ws_farm.column_dimensions[get_column_letter(col_idx)].width = width
+    current_row = 2
+    crop_fill = PatternFill("solid", fgColor=_CROP_BG)
+    for farm in forecast.farms:
+        for c_idx in range(1, 6):
+            ws_farm.cell(row=current_row, column=c_idx).fill = crop_fill
+        ws_farm.cell(row=current_row, column=1, value=farm.farmName).font = Font(
+            bold=True
+        )
+        ws_farm.cell(row=current_row, column=2, value=farm.blockCount)
+        current_row += 1
+        for s in farm.series:
+            ws_farm.cell(row=current_row, column=3, value=s.name)
+            qty_cell = ws_farm.cell(row=current_row, column=4, value=s.total)
+            qty_cell.number_format = _FMT_DECIMAL
+            ws_farm.cell(row=current_row, column=5, value=s.unit)
+            current_row += 1
+
+    # -- Warnings sheet --
+    if forecast.warnings:
+        ws_warn = wb.create_sheet(title="Warnings")
+        ws_warn.column_dimensions["A"].width = 80
+        ws_warn.cell(row=1, column=1, value="Warnings").font = Font(bold=True)
+        for i, w in enumerate(forecast.warnings, start=2):
+            ws_warn.cell(row=i, column=1, value=w)
+
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
 def _is_net_yield_header(header_str: str) -> bool:
     """
     Return True if header_str matches the "Net Yield" family of column names.
@@ -0,0 +1,485 @@
+"""
+Fertilizer Demand Forecast
+
+Season-wide, day-by-day fertilizer demand for procurement.
+
+The calculator (fertilizer_calculator.py) answers "how much does one cycle of
+crop X on N points need in total".  The forecast answers "how much of each
+chemical will every planted block need on each of the next D days":
+
+1. Each plant's fertigationSchedule is compiled ONCE per plant-data version
+   into a NumPy matrix ``[cycle_day, ingredient]`` of per-point quantities
+   applied on that day (same rule semantics as the calculator, so a matrix
+   column sums to the calculator's per-point total).  Compiled schedules are
+   kept in an in-process LRU keyed by (plantDataId, dataVersion, updatedAt).
+2. Planted blocks are reduced to (farm, plant, day offset, points).  Blocks
+   sharing a farm, plant and planting day are merged, and each distinct
+   group adds one scaled slice of its schedule matrix into a
+   ``[farm, day, ingredient]`` demand array.
+3. Ingredients are mapped to catalog chemicals (name/alias match, unit
+   converted to the chemical's defaultUnit) with one matrix product, and the
+   organisation series is the sum over farms.
+
+Planting day: plantedDate for planted blocks; for PLANNED blocks the
+expected "planted" date from expectedStatusChanges.  Points per block are
+actualPlantCount / yieldInfo.seedsPerPlantingPoint (rounded up), the inverse
+of the calculator's yield estimate.
+
+Unlike the calculator, the forecast is read-only: unknown ingredient names
+are reported under their schedule name but are never auto-discovered.
+"""
+
+import logging
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from ...models.plant_data_enhanced import FertigationRuleTypeEnum
+from ...models.tools.demand_forecast import (
+    DemandForecastResponse,
+    DemandSeries,
+    FarmDemand,
+)
+from ...services.database import farm_db
+from .chemicals_service import ChemicalsService
+from .fertilizer_calculator import _convert_to_default_unit
+
+logger = logging.getLogger(__name__)
+
+MAX_FORECAST_DAYS = 366
+
+# Compiled schedules kept in memory; one entry per plant-data version.
+_SCHEDULE_CACHE_SIZE = 1024
+
+_PLANT_PROJECTION = {
+    "plantDataId": 1,
+    "plantName": 1,
+    "growthCycle": 1,
+    "growthCycleDays": 1,
+    "fertigationSchedule": 1,
+    "yieldInfo": 1,
+    "dataVersion": 1,
+    "updatedAt": 1,
+}
+
+_BLOCK_PROJECTION = {
+    "blockId": 1,
+    "farmId": 1,
+    "state": 1,
+    "targetCrop": 1,
+    "actualPlantCount": 1,
+    "plantedDate": 1,
+    "expectedStatusChanges": 1,
+}
+
+
+@dataclass(frozen=True)
+class CompiledSchedule:
+    """
+    A fertigation schedule as a day × ingredient application matrix.
+
+    Attributes:
+        plant_data_id: Source plant.
+        plant_name: Crop name (for warnings).
+        cycle_days: Growth cycle length; matrix rows cover days 0..cycle_days.
+        ingredients: (key, display_name, unit) per matrix column, where key is
+            the lower-case ingredient name.
+        matrix: float64 array ``(cycle_days + 1, len(ingredients))`` of
+            per-point quantities applied on each cycle day.
+        plants_per_point: yieldInfo.seedsPerPlantingPoint (≥ 1).
+    """
+
+    plant_data_id: str
+    plant_name: str
+    cycle_days: int
+    ingredients: Tuple[Tuple[str, str, str], ...]
+    matrix: np.ndarray
+    plants_per_point: float
+
+
+@dataclass(frozen=True)
+class Planting:
+    """One planted block reduced to what the forecast needs."""
+
+    farm_index: int
+    plant_data_id: str
+    planted_on: date
+    points: float
+
+
+_schedule_cache: "OrderedDict[Tuple, CompiledSchedule]" = OrderedDict()
+
+
+def compile_schedule(plant: dict) -> Optional[CompiledSchedule]:
+    """
+    Compile a plant's fertigationSchedule into a day × ingredient matrix.
+
+    Interval rules apply on activeDayStart, +frequencyDays, … up to
+    min(activeDayEnd or card dayEnd, cycle_days); custom rules apply on each
+    application day ≤ cycle_days.  Cards starting after the cycle are
+    skipped, exactly as in the calculator.
+
+    Args:
+        plant: plant_data_enhanced document.
+
+    Returns:
+        CompiledSchedule, or None if the plant has no cycle length.
+    """
+    growth_cycle = plant.get("growthCycle") or {}
+    cycle_days = int(
+        growth_cycle.get("totalCycleDays") or plant.get("growthCycleDays") or 0
+    )
+    if cycle_days <= 0:
+        return None
+
+    columns: Dict[str, int] = {}
+    ingredients: List[Tuple[str, str, str]] = []
+    entries: List[Tuple[int, int, float]] = []  # (day, column, dosage)
+
+    def add(day: int, ing: dict) -> None:
+        name = (ing.get("name") or "").strip()
+        if not name:
+            return
+        key = name.lower()
+        if key not in columns:
+            columns[key] = len(ingredients)
+            ingredients.append((key, name, (ing.get("unit") or "g").strip()))
+        entries.append((day, columns[key], float(ing.get("dosagePerPoint") or 0)))
+
+    fertigation = plant.get("fertigationSchedule") or {}
+    for card in fertigation.get("cards") or []:
+        if card.get("dayStart", 0) > cycle_days:
+            continue
+        effective_card_end = min(card.get("dayEnd", 0), cycle_days)
+
+        for rule in card.get("rules") or []:
+            rule_type = rule.get("type", "")
+            if rule_type == FertigationRuleTypeEnum.INTERVAL.value:
+                freq = rule.get("frequencyDays")
+                start = rule.get("activeDayStart", 0) or 0
+                end = rule.get("activeDayEnd", effective_card_end)
+                if end is None:
+                    end = effective_card_end
+                if not freq or start > cycle_days:
+                    continue
+                for day in range(start, min(end, cycle_days) + 1, freq):
+                    for ing in rule.get("ingredients") or []:
+                        add(day, ing)
+            elif rule_type == FertigationRuleTypeEnum.CUSTOM.value:
+                for app in rule.get("applications") or []:
+                    day = app.get("day", 0) or 0
+                    if day > cycle_days:
+                        continue
+                    for ing in app.get("ingredients") or []:
+                        add(day, ing)
+
+    matrix = np.zeros((cycle_days + 1, len(ingredients)))
+    if entries:
+        days, cols, dosages = (np.array(v) for v in zip(*entries))
+        # Reason: clip negative days into day 0 so the total still matches
+        # the calculator, which counts them.
+        np.add.at(matrix, (np.clip(days, 0, cycle_days), cols), dosages)
+
+    yield_info = plant.get("yieldInfo") or {}
+    return CompiledSchedule(
+        plant_data_id=str(plant.get("plantDataId")),
+        plant_name=plant.get("plantName", str(plant.get("plantDataId"))),
+        cycle_days=cycle_days,
+        ingredients=tuple(ingredients),
+        matrix=matrix,
+        plants_per_point=float(yield_info.get("seedsPerPlantingPoint") or 1),
+    )
+
+
+def get_compiled_schedule(plant: dict) -> Optional[CompiledSchedule]:
+    """Return the cached compiled schedule for this plant-data version."""
+    key = (
+        str(plant.get("plantDataId")),
+        plant.get("dataVersion"),
+        str(plant.get("updatedAt")),
+    )
+    cached = _schedule_cache.get(key)
+    if cached is not None:
+        _schedule_cache.move_to_end(key)
+        return cached
+
+    compiled = compile_schedule(plant)
+    if compiled is not None:
+        _schedule_cache[key] = compiled
+        while len(_schedule_cache) > _SCHEDULE_CACHE_SIZE:
+            _schedule_cache.popitem(last=False)
+    return compiled
+
+
+def forecast_demand(
+    plantings: Sequence[Planting],
+    schedules: Dict[str, CompiledSchedule],
+    farm_count: int,
+    start: date,
+    days: int,
+) -> Tuple[List[Tuple[str, str, str]], np.ndarray]:
+    """
+    Sum per-farm daily ingredient demand over a forecast window.
+
+    Args:
+        plantings: Planted blocks (farm_index in [0, farm_count)).
+        schedules: Compiled schedule per plantDataId.
+        farm_count: Number of farms (first axis of the result).
+        start: First forecast day.
+        days: Forecast horizon.
+
+    Returns:
+        (ingredients, demand) where ingredients is the (key, name, unit) of
+        each column and demand is ``[farm, day, ingredient]``.  Ingredients
+        with the same key and unit across plants share a column.
+    """
+    columns: Dict[Tuple[str, str], int] = {}
+    ingredients: List[Tuple[str, str, str]] = []
+    by_plant: Dict[str, List[Planting]] = {}
+    for planting in plantings:
+        if planting.plant_data_id in schedules:
+            by_plant.setdefault(planting.plant_data_id, []).append(planting)
+
+    per_plant: List[Tuple[np.ndarray, np.ndarray]] = []  # (column indices, demand)
+    for plant_id, group in by_plant.items():
+        schedule = schedules[plant_id]
+        if not schedule.ingredients:
+            continue
+        cols = []
+        for key, name, unit in schedule.ingredients:
+            if (key, unit) not in columns:
+                columns[(key, unit)] = len(ingredients)
+                ingredients.append((key, name, unit))
+            cols.append(columns[(key, unit)])
+
+        farms = np.fromiter((p.farm_index for p in group), dtype=np.int64)
+        points = np.fromiter((p.points for p in group), dtype=np.float64)
+        offsets = np.fromiter(
+            ((start - p.planted_on).days for p in group), dtype=np.int64
+        )
+
+        # Merge blocks planted on the same day on the same farm
+        group_keys = np.stack([farms, offsets], axis=1)
+        unique_keys, inverse = np.unique(group_keys, axis=0, return_inverse=True)
+        weights = np.bincount(inverse.ravel(), weights=points)
+
+        plant_demand = np.zeros((farm_count, days, len(cols)))
+        matrix = schedule.matrix
+        for (farm, offset), weight in zip(unique_keys.tolist(), weights.tolist()):
+            # Forecast day t is cycle day offset + t; keep 0 <= offset + t <= cycle
+            t0 = max(0, -offset)
+            t1 = min(days, schedule.cycle_days + 1 - offset)
+            if t0 >= t1:
+                continue
+            plant_demand[farm, t0:t1] += weight * matrix[offset + t0 : offset + t1]
+        per_plant.append((np.array(cols), plant_demand))
+
+    demand = np.zeros((farm_count, days, len(ingredients)))
+    for cols, plant_demand in per_plant:
+        demand[:, :, cols] += plant_demand
+    return ingredients, demand
+
+
+# ---------------------------------------------------------------------------
+# Database-backed entry point
+# ---------------------------------------------------------------------------
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        except ValueError:
+            return None
+    return None
+
+
+def _planting_day(block: dict) -> Optional[date]:
+    planted = _as_date(block.get("plantedDate"))
+    if planted is None and block.get("state") == "planned":
+        planted = _as_date((block.get("expectedStatusChanges") or {}).get("planted"))
+    return planted
+
+
+async def _chemical_mapping(
+    ingredients: List[Tuple[str, str, str]], organization_id: UUID
+) -> Tuple[List[Tuple[Optional[UUID], str, str]], np.ndarray]:
+    """
+    Map ingredient columns onto output series (catalog chemicals where the
+    name and unit resolve, otherwise the ingredient itself).
+
+    Returns:
+        (series, mapping) where series is (chemicalId, name, unit) per output
+        column and ``demand @ mapping`` converts ingredient quantities into
+        output quantities.
+    """
+    active_by_name, _ = await ChemicalsService.build_chemical_lookup(organization_id)
+
+    series: List[Tuple[Optional[UUID], str, str]] = []
+    index: Dict[Tuple, int] = {}
+    mapping = np.zeros((len(ingredients), len(ingredients)))
+    for i, (key, name, unit) in enumerate(ingredients):
+        chemical = active_by_name.get(key)
+        converted = (1.0, unit, False)
+        if chemical is not None:
+            converted = _convert_to_default_unit(1.0, unit, chemical.defaultUnit)
+        factor, target_unit, ok = converted
+        if ok:
+            out_key = ("chemical", str(chemical.chemicalId))
+            out = (chemical.chemicalId, chemical.name, target_unit)
+        else:
+            out_key = ("ingredient", key, unit)
+            out = (None, name, unit)
+        if out_key not in index:
+            index[out_key] = len(series)
+            series.append(out)
+        mapping[i, index[out_key]] = factor
+    return series, mapping[:, : len(series)]
+
+
+def _series(
+    meta: List[Tuple[Optional[UUID], str, str]], demand: np.ndarray
+) -> List[DemandSeries]:
+    """Build DemandSeries for every output column with non-zero demand."""
+    totals = demand.sum(axis=0)
+    order = sorted(range(len(meta)), key=lambda j: meta[j][1].lower())
+    return [
+        DemandSeries(
+            chemicalId=meta[j][0],
+            name=meta[j][1],
+            unit=meta[j][2],
+            total=round(float(totals[j]), 6),
+            daily=np.round(demand[:, j], 6).tolist(),
+        )
+        for j in order
+        if totals[j] > 0
+    ]
+
+
+async def forecast_fertilizer_demand(
+    organization_id: UUID,
+    start: Optional[date] = None,
+    days: int = 90,
+    farm_ids: Optional[List[UUID]] = None,
+) -> DemandForecastResponse:
+    """
+    Forecast daily fertilizer demand for every planted block.
+
+    Args:
+        organization_id: Organisation scope (farms without an organisation
+            are included, as elsewhere in the farm module).
+        start: First forecast day (default: today, UTC).
+        days: Horizon, 1 – MAX_FORECAST_DAYS.
+        farm_ids: Restrict to these farms.
+
+    Returns:
+        DemandForecastResponse with organisation and per-farm daily series.
+    """
+    db = farm_db.get_database()
+    start = start or datetime.utcnow().date()
+    days = max(1, min(days, MAX_FORECAST_DAYS))
+    warnings: List[str] = []
+
+    farm_query: dict = {
+        "isActive": True,
+        "organizationId": {"$in": [str(organization_id), None]},
+    }
+    if farm_ids:
+        farm_query["farmId"] = {"$in": [str(f) for f in farm_ids]}
+    farms = await db.farms.find(farm_query, {"farmId": 1, "name": 1}).to_list(
+        length=None
+    )
+    farm_index = {f["farmId"]: i for i, f in enumerate(farms)}
+
+    blocks = await db.blocks.find(
+        {
+            "farmId": {"$in": list(farm_index)},
+            "isActive": True,
+            "targetCrop": {"$ne": None},
+        },
+        _BLOCK_PROJECTION,
+    ).to_list(length=None)
+
+    plant_ids = sorted({str(b["targetCrop"]) for b in blocks})
+    plants = await db.plant_data_enhanced.find(
+        {"plantDataId": {"$in": plant_ids}, "deletedAt": None}, _PLANT_PROJECTION
+    ).to_list(length=None)
+    schedules: Dict[str, CompiledSchedule] = {}
+    for plant in plants:
+        compiled = get_compiled_schedule(plant)
+        if compiled is not None:
+            schedules[compiled.plant_data_id] = compiled
+
+    plantings: List[Planting] = []
+    blocks_per_farm = [0] * len(farms)
+    skipped_no_date = skipped_no_points = 0
+    missing_plants = set()
+    window_end = start + timedelta(days=days)
+    for block in blocks:
+        schedule = schedules.get(str(block["targetCrop"]))
+        if schedule is None:
+            missing_plants.add(str(block["targetCrop"]))
+            continue
+        planted_on = _planting_day(block)
+        if planted_on is None:
+            skipped_no_date += 1
+            continue
+        plant_count = block.get("actualPlantCount") or 0
+        if plant_count <= 0:
+            skipped_no_points += 1
+            continue
+        if planted_on >= window_end or (
+            planted_on + timedelta(days=schedule.cycle_days) < start
+        ):
+            continue
+        index = farm_index[block["farmId"]]
+        blocks_per_farm[index] += 1
+        plantings.append(
+            Planting(
+                farm_index=index,
+                plant_data_id=schedule.plant_data_id,
+                planted_on=planted_on,
+                points=math.ceil(plant_count / schedule.plants_per_point),
+            )
+        )
+
+    if missing_plants:
+        warnings.append(
+            f"{len(missing_plants)} crop(s) have no plant data or cycle length "
+            f"— their blocks are not forecast"
+        )
+    if skipped_no_date:
+        warnings.append(f"{skipped_no_date} block(s) have no planting date — skipped")
+    if skipped_no_points:
+        warnings.append(f"{skipped_no_points} block(s) have no plant count — skipped")
+
+    ingredients, demand = forecast_demand(plantings, schedules, len(farms), start, days)
+    series_meta, mapping = await _chemical_mapping(ingredients, organization_id)
+    farm_demand = demand @ mapping  # [farm, day, series]
+
+    return DemandForecastResponse(
+        startDate=start,
+        days=days,
+        blockCount=len(plantings),
+        organization=_series(series_meta, farm_demand.sum(axis=0)),
+        farms=[
+            FarmDemand(
+                farmId=farm["farmId"],
+                farmName=farm.get("name", "Unknown Farm"),
+                blockCount=blocks_per_farm[i],
+                series=_series(series_meta, farm_demand[i]),
+            )
+            for i, farm in enumerate(farms)
+            if blocks_per_farm[i]
+        ],
+        warnings=warnings,
+    )
@@ -7,18 +7,16 @@ from datetime import datetime
 from typing import List
 
 from ..models import WatchdogIssue, CheckType, Severity
+from .base import BaseChecker, iter_batches
 
 logger = logging.getLogger(__name__)
 
 
-class AlertChecker:
+class AlertChecker(BaseChecker):
     """Check for active alerts above severity threshold."""
 
-    def __init__(self, db):
-        self.db = db
-
     async def run(self) -> List[WatchdogIssue]:
-        """Query alerts collection for active high/critical alerts."""
+        """Stream active high/critical alerts; no cap on how many are checked."""
         cursor = self.db["alerts"].find(
             {
                 "status": "active",
@@ -26,34 +24,14 @@ class AlertChecker:
             }
         )
 
-        alerts = await cursor.to_list(length=200)
-        if not alerts:
-            return []
-
-        # Collect block IDs for name lookups
-        block_ids = list({a.get("blockId") for a in alerts if a.get("blockId")})
-        blocks_map = {}
-        farms_map = {}
-
-        if block_ids:
-            blocks_cursor = self.db["blocks"].find(
-                {"blockId": {"$in": block_ids}},
-                {"blockId": 1, "name": 1, "farmId": 1},
-            )
-            async for block in blocks_cursor:
-                blocks_map[block["blockId"]] = block
-
-            farm_ids = list(
-                {b.get("farmId") for b in blocks_map.values() if b.get("farmId")}
-            )
-            if farm_ids:
-                farms_cursor = self.db["farms"].find(
-                    {"farmId": {"$in": farm_ids}},
-                    {"farmId": 1, "name": 1},
-                )
-                async for farm in farms_cursor:
-                    farms_map[farm["farmId"]] = farm.get("name", "Unknown Farm")
+        issues: List[WatchdogIssue] = []
+        async for alerts in iter_batches(cursor):
+            self.scanned += len(alerts)
+            await self.lookup.load_blocks(a.get("blockId") for a in alerts)
+            issues.extend(self._issues_for(alerts))
+        return issues
 
+    def _issues_for(self, alerts: List[dict]) -> List[WatchdogIssue]:
         issues: List[WatchdogIssue] = []
 
         for alert in alerts:
@@ -63,9 +41,8 @@ class AlertChecker:
             )
 
             block_id = alert.get("blockId", "")
-            block_info = blocks_map.get(block_id, {})
-            block_name = block_info.get("name", "Unknown Block")
-            farm_name = farms_map.get(block_info.get("farmId"), "Unknown Farm")
+            block_name = self.lookup.block_name(block_id)
+            farm_name = self.lookup.farm_name_for_block(block_id)
 
             # Calculate "since" time
             created = alert.get("createdAt")
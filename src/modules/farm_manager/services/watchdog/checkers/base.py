@@ -0,0 +1,39 @@
+"""
+Shared checker plumbing: streamed scans in batches + per-run lookup cache.
+"""
+
+from typing import AsyncIterator, List, Optional
+
+from ..lookup import WatchdogLookupCache
+
+# Documents pulled from a cursor before enriching/emitting issues.  Bounds
+# memory per checker while never truncating the scan.
+SCAN_BATCH_SIZE = 500
+
+
+async def iter_batches(
+    cursor, size: int = SCAN_BATCH_SIZE
+) -> AsyncIterator[List[dict]]:
+    """Yield lists of up to ``size`` documents until the cursor is exhausted."""
+    batch: List[dict] = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class BaseChecker:
+    """
+    Base for watchdog checkers.
+
+    ``scanned`` counts the documents (or probes) a run examined; the service
+    reports it next to the checker's duration and issue count.
+    """
+
+    def __init__(self, db, lookup: Optional[WatchdogLookupCache] = None):
+        self.db = db
+        self.lookup = lookup if lookup is not None else WatchdogLookupCache(db)
+        self.scanned = 0
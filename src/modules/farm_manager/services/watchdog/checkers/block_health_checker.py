@@ -7,20 +7,18 @@ from datetime import datetime, timedelta
 from typing import List
 
 from ..models import WatchdogIssue, CheckType, Severity
+from .base import BaseChecker, iter_batches
 
 logger = logging.getLogger(__name__)
 
 STALE_IOT_THRESHOLD_HOURS = 4
 
 
-class BlockHealthChecker:
+class BlockHealthChecker(BaseChecker):
     """Check for blocks in ALERT state or with stale IoT sync."""
 
-    def __init__(self, db):
-        self.db = db
-
     async def run(self) -> List[WatchdogIssue]:
-        """Check block health conditions."""
+        """Stream unhealthy blocks; no cap on how many are checked."""
         issues: List[WatchdogIssue] = []
 
         stale_cutoff = datetime.utcnow() - timedelta(hours=STALE_IOT_THRESHOLD_HOURS)
@@ -45,25 +43,21 @@ class BlockHealthChecker:
             },
         )
 
-        blocks = await cursor.to_list(length=500)
-        if not blocks:
-            return []
-
-        # Farm name lookup
-        farm_ids = list({b.get("farmId") for b in blocks if b.get("farmId")})
-        farms_map = {}
-        if farm_ids:
-            farms_cursor = self.db["farms"].find(
-                {"farmId": {"$in": farm_ids}},
-                {"farmId": 1, "name": 1},
-            )
-            async for farm in farms_cursor:
-                farms_map[farm["farmId"]] = farm.get("name", "Unknown Farm")
+        async for blocks in iter_batches(cursor):
+            self.scanned += len(blocks)
+            self.lookup.prime_blocks(blocks)
+            await self.lookup.load_farms(b.get("farmId") for b in blocks)
+            issues.extend(self._issues_for(blocks, stale_cutoff))
+        return issues
 
+    def _issues_for(
+        self, blocks: List[dict], stale_cutoff: datetime
+    ) -> List[WatchdogIssue]:
+        issues: List[WatchdogIssue] = []
         for block in blocks:
             block_id = block.get("blockId", "")
             block_name = block.get("name", "Unknown Block")
-            farm_name = farms_map.get(block.get("farmId"), "Unknown Farm")
+            farm_name = self.lookup.farm_name(block.get("farmId"))
 
             # Block in ALERT state
             if block.get("currentState") == "ALERT":
@@ -7,18 +7,16 @@ from datetime import datetime
 from typing import List
 
 from ..models import WatchdogIssue, CheckType, Severity
+from .base import BaseChecker, iter_batches
 
 logger = logging.getLogger(__name__)
 
 
-class LateItemsChecker:
+class LateItemsChecker(BaseChecker):
     """Check for overdue harvests based on block_cycles collection."""
 
-    def __init__(self, db):
-        self.db = db
-
     async def run(self) -> List[WatchdogIssue]:
-        """Query block_cycles for late harvests."""
+        """Stream late block_cycles; no cap on how many are checked."""
         now = datetime.utcnow()
 
         cursor = self.db["block_cycles"].find(
@@ -32,34 +30,14 @@ class LateItemsChecker:
             }
         )
 
-        cycles = await cursor.to_list(length=200)
-        if not cycles:
-            return []
-
-        # Collect block IDs and farm IDs for name lookups
-        block_ids = list({c.get("blockId") for c in cycles if c.get("blockId")})
-        blocks_map = {}
-        farms_map = {}
-
-        if block_ids:
-            blocks_cursor = self.db["blocks"].find(
-                {"blockId": {"$in": block_ids}},
-                {"blockId": 1, "name": 1, "farmId": 1},
-            )
-            async for block in blocks_cursor:
-                blocks_map[block["blockId"]] = block
-
-            farm_ids = list(
-                {b.get("farmId") for b in blocks_map.values() if b.get("farmId")}
-            )
-            if farm_ids:
-                farms_cursor = self.db["farms"].find(
-                    {"farmId": {"$in": farm_ids}},
-                    {"farmId": 1, "name": 1},
-                )
-                async for farm in farms_cursor:
-                    farms_map[farm["farmId"]] = farm.get("name", "Unknown Farm")
+        issues: List[WatchdogIssue] = []
+        async for cycles in iter_batches(cursor):
+            self.scanned += len(cycles)
+            await self.lookup.load_blocks(c.get("blockId") for c in cycles)
+            issues.extend(self._issues_for(cycles, now))
+        return issues
 
+    def _issues_for(self, cycles: List[dict], now: datetime) -> List[WatchdogIssue]:
         issues: List[WatchdogIssue] = []
 
         for cycle in cycles:
@@ -80,9 +58,8 @@ class LateItemsChecker:
                 severity = Severity.MEDIUM
 
             block_id = cycle.get("blockId", "")
-            block_info = blocks_map.get(block_id, {})
-            block_name = block_info.get("name", "Unknown Block")
-            farm_name = farms_map.get(block_info.get("farmId"), "Unknown Farm")
+            block_name = self.lookup.block_name(block_id)
+            farm_name = self.lookup.farm_name_for_block(block_id)
             stage = cycle.get("currentStage", "unknown")
             est_str = est.strftime("%b %d") if est else "N/A"
 
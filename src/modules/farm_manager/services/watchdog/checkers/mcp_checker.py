@@ -4,30 +4,38 @@ MCP Reachability Checker - Probes MCP endpoints for IoT-connected blocks.
 
 import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 
 import httpx
 
+from ....config.settings import settings
 from ..models import WatchdogIssue, CheckType, Severity
+from .base import BaseChecker, iter_batches
 
 logger = logging.getLogger(__name__)
 
-MAX_CONCURRENCY = 5
 TIMEOUT_SECONDS = 3
 
+# Process-wide probe budget: concurrent watchdog runs (scheduled + manual)
+# share it instead of each opening its own set of sockets.
+_probe_budget: Optional[asyncio.Semaphore] = None
 
-class MCPChecker:
-    """Check MCP server reachability for all IoT-connected blocks."""
 
-    def __init__(self, db):
-        self.db = db
+def get_probe_budget() -> asyncio.Semaphore:
+    """Return the process-wide MCP probe semaphore."""
+    global _probe_budget
+    if _probe_budget is None:
+        _probe_budget = asyncio.Semaphore(settings.WATCHDOG_MCP_PROBE_CONCURRENCY)
+    return _probe_budget
+
+
+class MCPChecker(BaseChecker):
+    """Check MCP server reachability for all IoT-connected blocks."""
 
     async def run(self) -> List[WatchdogIssue]:
         """Probe MCP endpoints and return issues for unreachable servers."""
-        blocks_col = self.db["blocks"]
-
         # Find blocks with IoT controllers enabled and MCP port set
-        cursor = blocks_col.find(
+        cursor = self.db["blocks"].find(
             {
                 "iotController.enabled": True,
                 "iotController.mcpPort": {"$exists": True, "$ne": None},
@@ -40,56 +48,55 @@ class MCPChecker:
             },
         )
 
-        blocks = await cursor.to_list(length=500)
-        if not blocks:
-            return []
-
-        # Enrich with farm names
-        farm_ids = list({b["farmId"] for b in blocks if b.get("farmId")})
-        farms_map = {}
-        if farm_ids:
-            farms_cursor = self.db["farms"].find(
-                {"farmId": {"$in": farm_ids}},
-                {"farmId": 1, "name": 1},
-            )
-            async for farm in farms_cursor:
-                farms_map[farm["farmId"]] = farm.get("name", "Unknown Farm")
-
-        # Probe each block with concurrency limit
-        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
         issues: List[WatchdogIssue] = []
+        budget = get_probe_budget()
+        limits = httpx.Limits(
+            max_connections=settings.WATCHDOG_MCP_PROBE_CONCURRENCY,
+            max_keepalive_connections=0,
+        )
 
-        async def probe_block(block: dict):
-            iot = block.get("iotController", {})
-            address = iot.get("address", "")
-            port = iot.get("mcpPort")
-            if not address or not port:
-                return
-
-            url = f"http://{address}:{port}/mcp"
-            async with semaphore:
-                try:
-                    async with httpx.AsyncClient(timeout=TIMEOUT_SECONDS) as client:
-                        resp = await client.get(url)
-                        if resp.status_code < 500:
-                            return  # Reachable
-                except Exception:
-                    pass  # Unreachable
-
-            farm_name = farms_map.get(block.get("farmId"), "Unknown Farm")
-            block_name = block.get("name", "Unknown Block")
-            issues.append(
-                WatchdogIssue(
-                    checkType=CheckType.MCP_REACHABILITY,
-                    severity=Severity.HIGH,
-                    title="MCP Server Unreachable",
-                    description=f"Farm: {farm_name} > Block {block_name}\nServer: {address}:{port}",
-                    entityId=block.get("blockId"),
-                    farmName=farm_name,
-                    blockName=block_name,
-                    extra={"address": address, "port": port},
+        # Reason: one client per run (not per probe) — connection setup is
+        # most of the cost of a 3s-timeout reachability GET.
+        async with httpx.AsyncClient(timeout=TIMEOUT_SECONDS, limits=limits) as client:
+            async for blocks in iter_batches(cursor):
+                self.lookup.prime_blocks(blocks)
+                await self.lookup.load_farms(b.get("farmId") for b in blocks)
+                results = await asyncio.gather(
+                    *[self._probe_block(client, budget, b) for b in blocks],
+                    return_exceptions=True,
                 )
-            )
+                issues.extend(r for r in results if isinstance(r, WatchdogIssue))
 
-        await asyncio.gather(*[probe_block(b) for b in blocks], return_exceptions=True)
         return issues
+
+    async def _probe_block(
+        self, client: httpx.AsyncClient, budget: asyncio.Semaphore, block: dict
+    ) -> Optional[WatchdogIssue]:
+        iot = block.get("iotController", {})
+        address = iot.get("address", "")
+        port = iot.get("mcpPort")
+        if not address or not port:
+            return None
+
+        url = f"http://{address}:{port}/mcp"
+        async with budget:
+            self.scanned += 1
+            try:
+                resp = await client.get(url)
+                if resp.status_code < 500:
+                    return None  # Reachable
+            except Exception:
+                pass  # Unreachable
+
+        farm_name = self.lookup.farm_name(block.get("farmId"))
+        block_name = block.get("name", "Unknown Block")
+        return WatchdogIssue(
+            checkType=CheckType.MCP_REACHABILITY,
+            severity=Severity.HIGH,
+            title="MCP Server Unreachable",
+            description=f"Farm: {farm_name} > Block {block_name}\nServer: {address}:{port}",
+            entityId=block.get("blockId"),
+            farmName=farm_name,
+            blockName=block_name,
+            extra={"address": address, "port": port},
+        )
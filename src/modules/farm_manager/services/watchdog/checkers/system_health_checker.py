@@ -8,21 +8,20 @@ from typing import List
 import httpx
 
 from ..models import WatchdogIssue, CheckType, Severity
+from .base import BaseChecker
 
 logger = logging.getLogger(__name__)
 
 HEALTH_URL = "http://localhost:8000/api/health"
 
 
-class SystemHealthChecker:
+class SystemHealthChecker(BaseChecker):
     """Check internal system health endpoint."""
 
-    def __init__(self, db):
-        self.db = db
-
     async def run(self) -> List[WatchdogIssue]:
         """Hit the health endpoint and report failures."""
         issues: List[WatchdogIssue] = []
+        self.scanned = 1
 
         try:
             async with httpx.AsyncClient(timeout=5.0) as client:
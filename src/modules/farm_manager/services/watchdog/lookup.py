@@ -0,0 +1,115 @@
+"""
+Watchdog Lookup Cache - Per-run block/farm name enrichment shared by checkers.
+
+Checkers run concurrently and most of them need "Farm: X > Block Y" for the
+same handful of blocks.  One cache per run means every block and farm is
+fetched at most once, in batched ``$in`` queries, no matter how many checkers
+ask for it.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, Optional
+
+# Max ids per $in query (keeps each query document well below 16MB and
+# lets the server use the index efficiently).
+LOOKUP_BATCH_SIZE = 1000
+
+BLOCK_PROJECTION = {"_id": 0, "blockId": 1, "name": 1, "farmId": 1}
+FARM_PROJECTION = {"_id": 0, "farmId": 1, "name": 1}
+
+UNKNOWN_BLOCK = "Unknown Block"
+UNKNOWN_FARM = "Unknown Farm"
+
+
+class WatchdogLookupCache:
+    """
+    Block / farm name cache for a single watchdog run.
+
+    Not shared across runs: a block renamed between runs must show its new
+    name in the next alert.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._blocks: Dict[str, Optional[dict]] = {}
+        self._farms: Dict[str, Optional[str]] = {}
+        self._block_lock = asyncio.Lock()
+        self._farm_lock = asyncio.Lock()
+        self.queries = 0
+
+    # ------------------------------------------------------------------
+    # Priming (checkers that already scanned ``blocks``)
+    # ------------------------------------------------------------------
+
+    def prime_blocks(self, blocks: Iterable[dict]) -> None:
+        """Record block documents a checker already fetched."""
+        for block in blocks:
+            block_id = block.get("blockId")
+            if block_id and self._blocks.get(block_id) is None:
+                self._blocks[block_id] = {
+                    "blockId": block_id,
+                    "name": block.get("name"),
+                    "farmId": block.get("farmId"),
+                }
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def load_blocks(self, block_ids: Iterable[str]) -> None:
+        """Fetch any not-yet-cached blocks and their farms."""
+        block_ids = list(block_ids)
+        async with self._block_lock:
+            missing = sorted({b for b in block_ids if b and b not in self._blocks})
+            for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+                chunk = missing[start : start + LOOKUP_BATCH_SIZE]
+                self.queries += 1
+                async for block in self.db["blocks"].find(
+                    {"blockId": {"$in": chunk}}, BLOCK_PROJECTION
+                ):
+                    self._blocks[block["blockId"]] = block
+                for block_id in chunk:
+                    self._blocks.setdefault(block_id, None)
+
+        await self.load_farms(
+            b.get("farmId")
+            for b in (self._blocks.get(block_id) for block_id in block_ids)
+            if b
+        )
+
+    async def load_farms(self, farm_ids: Iterable[str]) -> None:
+        """Fetch any not-yet-cached farm names."""
+        async with self._farm_lock:
+            missing = sorted({f for f in farm_ids if f and f not in self._farms})
+            for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+                chunk = missing[start : start + LOOKUP_BATCH_SIZE]
+                self.queries += 1
+                async for farm in self.db["farms"].find(
+                    {"farmId": {"$in": chunk}}, FARM_PROJECTION
+                ):
+                    self._farms[farm["farmId"]] = farm.get("name", UNKNOWN_FARM)
+                for farm_id in chunk:
+                    self._farms.setdefault(farm_id, None)
+
+    # ------------------------------------------------------------------
+    # Reads (call after load_*)
+    # ------------------------------------------------------------------
+
+    def block(self, block_id: Optional[str]) -> Dict[str, Any]:
+        return (self._blocks.get(block_id) if block_id else None) or {}
+
+    def block_name(self, block_id: Optional[str]) -> str:
+        return self.block(block_id).get("name") or UNKNOWN_BLOCK
+
+    def farm_name(self, farm_id: Optional[str]) -> str:
+        return (self._farms.get(farm_id) if farm_id else None) or UNKNOWN_FARM
+
+    def farm_name_for_block(self, block_id: Optional[str]) -> str:
+        return self.farm_name(self.block(block_id).get("farmId"))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "blocksCached": len(self._blocks),
+            "farmsCached": len(self._farms),
+            "lookupQueries": self.queries,
+        }
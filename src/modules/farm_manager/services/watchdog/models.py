@@ -105,6 +105,16 @@ class WatchdogIssue(BaseModel):
         return f"{self.checkType.value}:{self.entityId or 'global'}"
 
 
+class CheckerRunStats(BaseModel):
+    """Per-checker timing and volume for one watchdog run."""
+
+    name: str
+    durationMs: float = 0.0
+    scanned: int = 0
+    issues: int = 0
+    error: Optional[str] = None
+
+
 class WatchdogRunResult(BaseModel):
     """Result of a single watchdog run."""
 
@@ -116,6 +126,8 @@ class WatchdogRunResult(BaseModel):
     skippedByCooldown: int = 0
     errors: List[str] = Field(default_factory=list)
     triggeredBy: str = "scheduler"
+    checkers: List[CheckerRunStats] = Field(default_factory=list)
+    lookupStats: Optional[dict] = None
 
 
 class NotificationLog(BaseModel):
@@ -1,28 +1,25 @@
 """
-Watchdog Scheduler - Singleton asyncio background loop with dynamic interval from DB config.
+Watchdog Scheduler - Singleton job with dynamic interval from DB config.
 
-Uses a Redis distributed lock so only ONE Uvicorn worker runs the check
-per cycle (multiple workers each start their own scheduler instance).
+Runs on the platform job runner (src.core.jobs), so only the elected leader
+worker runs the check per cycle.
 """
 
-import asyncio
 import logging
-import os
 from datetime import datetime
 from typing import Optional
 
+from src.core.jobs import JobDefinition, get_job_runner
+
 from .config_service import WatchdogConfigService
 from .service import WatchdogService
 
 logger = logging.getLogger(__name__)
 
-LOCK_KEY = "watchdog:scheduler_lock"
-LOCK_TTL_SECONDS = 120  # Lock auto-expires in 2 minutes (safety net)
-
 
 class WatchdogScheduler:
     """
-    Singleton background scheduler for periodic watchdog checks.
+    Singleton scheduler for periodic watchdog checks.
 
     Re-reads checkIntervalMinutes from DB each cycle so admin changes
     take effect without restart.
@@ -30,16 +27,13 @@ class WatchdogScheduler:
     Usage::
 
         scheduler = await WatchdogScheduler.initialize(db)
-        await scheduler.start()
-
-        # On shutdown:
-        await WatchdogScheduler.get_instance().stop()
+        get_job_runner().register(scheduler.job_definition())
     """
 
+    JOB_NAME = "farm.watchdog"
+
     _instance: Optional["WatchdogScheduler"] = None
     _db = None
-    _task: Optional[asyncio.Task] = None
-    _is_running: bool = False
     _last_run: Optional[datetime] = None
     _last_result: Optional[dict] = None
 
@@ -54,94 +48,56 @@ class WatchdogScheduler:
         instance = cls.get_instance()
         instance._db = db
 
-        # Ensure indexes
-        service = WatchdogService(db)
-        await service.create_indexes()
+        # Declare indexes (reconciled once per boot by src.core.indexes)
+        WatchdogService.declare_indexes()
 
         logger.info("[WatchdogScheduler] Initialised")
         return instance
 
-    async def _acquire_lock(self, interval: int) -> bool:
-        """Try to acquire a Redis distributed lock. Returns True if acquired."""
-        try:
-            from src.core.cache.redis_cache import get_redis_cache
-
-            cache = await get_redis_cache()
-            if not cache.is_available or not cache._redis:
-                # Redis unavailable — fall back to running (better noisy than silent)
-                return True
-
-            # SET NX with TTL = lock duration (interval or fallback)
-            ttl = min(interval, LOCK_TTL_SECONDS)
-            acquired = await cache._redis.set(LOCK_KEY, "1", nx=True, ex=ttl)
-            return bool(acquired)
-        except Exception as e:
-            logger.warning(f"[WatchdogScheduler] Lock acquire failed: {e}")
-            return True  # Fall back to running if Redis errors
-
-    async def start(self) -> None:
-        """Start the background watchdog loop. Idempotent."""
-        if self._is_running:
-            logger.warning("[WatchdogScheduler] Already running, skipping start()")
-            return
-
-        self._is_running = True
-
-        async def run_loop() -> None:
-            logger.info("[WatchdogScheduler] Started")
-
-            # Wait for app to finish starting up
-            await asyncio.sleep(30)
-
-            while self._is_running:
-                try:
-                    # Read interval from DB each cycle
-                    config_svc = WatchdogConfigService(self._db)
-                    config = await config_svc.get_config()
-                    interval = config.checkIntervalMinutes * 60
-
-                    if config.enabled:
-                        # Acquire distributed lock so only 1 worker runs per cycle
-                        if not await self._acquire_lock(interval):
-                            logger.debug(
-                                "[WatchdogScheduler] Another worker holds the lock, skipping"
-                            )
-                        else:
-                            service = WatchdogService(self._db)
-                            result = await service.run_check(triggered_by="scheduler")
-                            self._last_run = datetime.utcnow()
-                            self._last_result = result.model_dump()
-                    else:
-                        logger.debug("[WatchdogScheduler] Watchdog disabled, sleeping")
-
-                    await asyncio.sleep(interval)
-
-                except asyncio.CancelledError:
-                    logger.info("[WatchdogScheduler] Task cancelled")
-                    break
-                except Exception as exc:
-                    logger.error(f"[WatchdogScheduler] Error: {exc}")
-                    await asyncio.sleep(300)  # Wait before retry
-
-        self._task = asyncio.create_task(run_loop())
-        logger.info("[WatchdogScheduler] Background task created")
-
-    async def stop(self) -> None:
-        """Stop the background loop gracefully."""
-        self._is_running = False
-        if self._task is not None:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
-        logger.info("[WatchdogScheduler] Stopped")
+    async def resolve_interval(self) -> int:
+        """
+        Current check interval in seconds.
+
+        Re-read from DB after every run so admin changes take effect without
+        restart.
+        """
+        config = await WatchdogConfigService(self._db).get_config()
+        return config.checkIntervalMinutes * 60
+
+    async def run_once(self) -> dict:
+        """
+        Run one scheduled check, unless the watchdog is disabled in config.
+
+        Returns:
+            Check result (or ``{"skipped": "disabled"}``).
+        """
+        config = await WatchdogConfigService(self._db).get_config()
+        if not config.enabled:
+            logger.debug("[WatchdogScheduler] Watchdog disabled, skipping")
+            return {"skipped": "disabled"}
+
+        service = WatchdogService(self._db)
+        result = await service.run_check(triggered_by="scheduler")
+        self._last_run = datetime.utcnow()
+        self._last_result = result.model_dump()
+        return self._last_result
+
+    def job_definition(self) -> JobDefinition:
+        """Job definition for src.core.jobs (leader-only, DB-driven interval)."""
+        return JobDefinition(
+            name=self.JOB_NAME,
+            func=self.run_once,
+            interval_resolver=self.resolve_interval,
+            startup_delay_seconds=30,
+            description="Farm watchdog check + Telegram notifications",
+        )
 
     def get_status(self) -> dict:
         """Return scheduler status for the API."""
+        runner = get_job_runner()
         return {
-            "isRunning": self._is_running,
+            "isRunning": runner.is_running
+            and runner.get_job(self.JOB_NAME) is not None,
             "lastRun": self._last_run.isoformat() if self._last_run else None,
             "lastResult": self._last_result,
         }
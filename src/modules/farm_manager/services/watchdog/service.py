@@ -2,11 +2,19 @@
 Watchdog Service - Orchestrates checkers, applies cooldown, sends Telegram notifications.
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Tuple
 
+from pymongo import UpdateOne
+
+from src.core.indexes import declare_index
+
+from .lookup import WatchdogLookupCache
 from .models import (
+    CheckerRunStats,
     WatchdogIssue,
     WatchdogRunResult,
     WatchdogConfig,
@@ -33,6 +41,7 @@ CHECKERS = {
 }
 
 NOTIFICATIONS_COLLECTION = "watchdog_notifications"
+COOLDOWN_BATCH_SIZE = 1000
 MAX_MESSAGE_LENGTH = 4096
 
 
@@ -43,14 +52,16 @@ class WatchdogService:
         self.db = db
         self.config_service = WatchdogConfigService(db)
 
-    async def create_indexes(self):
-        """Ensure required indexes exist on watchdog_notifications."""
-        col = self.db[NOTIFICATIONS_COLLECTION]
-        await col.create_index(
+    @staticmethod
+    def declare_indexes() -> None:
+        """Declare required indexes on watchdog_notifications."""
+        declare_index(
+            NOTIFICATIONS_COLLECTION,
             [("issueKey", 1), ("cooldownExpiresAt", 1)],
             name="issueKey_cooldown",
         )
-        await col.create_index(
+        declare_index(
+            NOTIFICATIONS_COLLECTION,
             "sentAt",
             name="sentAt_ttl",
             expireAfterSeconds=7 * 24 * 3600,  # 7 days TTL
@@ -70,21 +81,21 @@ class WatchdogService:
             result.completedAt = datetime.utcnow()
             return result
 
-        # Collect issues from enabled checkers
-        all_issues: List[WatchdogIssue] = []
-
-        for check_name in config.enabledChecks:
-            checker_cls = CHECKERS.get(check_name)
-            if not checker_cls:
-                continue
+        # Run enabled checkers concurrently; they share one lookup cache so
+        # each block/farm name is fetched once per run.
+        lookup = WatchdogLookupCache(self.db)
+        names = [name for name in config.enabledChecks if name in CHECKERS]
+        outcomes = await asyncio.gather(
+            *[self._run_checker(name, lookup) for name in names]
+        )
 
-            try:
-                checker = checker_cls(self.db)
-                issues = await checker.run()
-                all_issues.extend(issues)
-            except Exception as e:
-                logger.error(f"[Watchdog] Checker '{check_name}' failed: {e}")
-                result.errors.append(f"{check_name}: {str(e)}")
+        all_issues: List[WatchdogIssue] = []
+        for stats, issues in outcomes:
+            result.checkers.append(stats)
+            all_issues.extend(issues)
+            if stats.error:
+                result.errors.append(f"{stats.name}: {stats.error}")
+        result.lookupStats = lookup.stats()
 
         # Filter by severity threshold
         all_issues = [
@@ -105,15 +116,22 @@ class WatchdogService:
         now = datetime.utcnow()
         col = self.db[NOTIFICATIONS_COLLECTION]
 
-        for issue in all_issues:
-            key = issue.issue_key
-            existing = await col.find_one(
+        # One query for every issue key instead of one find_one per issue
+        on_cooldown = set()
+        keys = list({issue.issue_key for issue in all_issues})
+        for start in range(0, len(keys), COOLDOWN_BATCH_SIZE):
+            cursor = col.find(
                 {
-                    "issueKey": key,
+                    "issueKey": {"$in": keys[start : start + COOLDOWN_BATCH_SIZE]},
                     "cooldownExpiresAt": {"$gt": now},
-                }
+                },
+                {"_id": 0, "issueKey": 1},
             )
-            if existing:
+            async for doc in cursor:
+                on_cooldown.add(doc["issueKey"])
+
+        for issue in all_issues:
+            if issue.issue_key in on_cooldown:
                 result.skippedByCooldown += 1
             else:
                 issues_to_send.append(issue)
@@ -140,6 +158,7 @@ class WatchdogService:
         # Log each issue
         cooldown_expires = now + timedelta(minutes=config.notificationCooldownMinutes)
 
+        operations = []
         for issue in issues_to_send:
             log_entry = NotificationLog(
                 issueKey=issue.issue_key,
@@ -151,11 +170,14 @@ class WatchdogService:
                 sentAt=now,
                 cooldownExpiresAt=cooldown_expires,
             )
-            await col.update_one(
-                {"issueKey": issue.issue_key},
-                {"$set": log_entry.model_dump()},
-                upsert=True,
+            operations.append(
+                UpdateOne(
+                    {"issueKey": issue.issue_key},
+                    {"$set": log_entry.model_dump()},
+                    upsert=True,
+                )
             )
+        await col.bulk_write(operations, ordered=False)
 
         result.sentIssues = len(issues_to_send)
         result.completedAt = datetime.utcnow()
@@ -166,6 +188,24 @@ class WatchdogService:
         )
         return result
 
+    async def _run_checker(
+        self, name: str, lookup: WatchdogLookupCache
+    ) -> Tuple[CheckerRunStats, List[WatchdogIssue]]:
+        """Run one checker, timing it; failures are reported, not raised."""
+        checker = CHECKERS[name](self.db, lookup)
+        stats = CheckerRunStats(name=name)
+        started = time.perf_counter()
+        issues: List[WatchdogIssue] = []
+        try:
+            issues = await checker.run()
+        except Exception as e:
+            logger.error(f"[Watchdog] Checker '{name}' failed: {e}")
+            stats.error = str(e)
+        stats.durationMs = round((time.perf_counter() - started) * 1000, 1)
+        stats.scanned = checker.scanned
+        stats.issues = len(issues)
+        return stats, issues
+
     def _format_message(self, issues: List[WatchdogIssue], now: datetime) -> str:
         """Format issues into a Telegram HTML message."""
         lines = [
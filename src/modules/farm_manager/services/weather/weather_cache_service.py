@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 
+from src.core.indexes import declare_index
+from src.core.jobs import JobDefinition, get_job_runner
+
 from ...config.settings import settings
 from ...models.weather import AgriWeatherData
 from ..farm.farm_repository import FarmRepository
@@ -31,6 +34,7 @@ class WeatherCacheService:
 
     COLLECTION_NAME = "weather_cache"
     CACHE_TTL_HOURS = 1  # Cache valid for 1 hour
+    JOB_NAME = "farm.weather_refresh"
 
     _instance: Optional["WeatherCacheService"] = None
     _db = None
@@ -64,31 +68,41 @@ class WeatherCacheService:
         logger.info("WeatherCacheService initialized")
         return instance
 
+    @classmethod
+    def _declare_indexes(cls) -> None:
+        """Declare MongoDB indexes for weather cache"""
+        # Index on farmId for fast lookups
+        declare_index(cls.COLLECTION_NAME, "farmId", unique=True)
+
+        # TTL index to auto-expire old entries (2 hours - gives buffer beyond refresh)
+        declare_index(
+            cls.COLLECTION_NAME,
+            "updatedAt",
+            expireAfterSeconds=7200,  # 2 hours
+            name="ttl_updatedAt",
+        )
+
     async def _create_indexes(self) -> None:
-        """Create MongoDB indexes for weather cache"""
+        """Drop the legacy updatedAt index and declare the cache indexes"""
         if self._db is None:
             return
 
         try:
             collection = self._db[self.COLLECTION_NAME]
 
-            # Index on farmId for fast lookups
-            await collection.create_index("farmId", unique=True)
-
-            # Drop existing updatedAt index if it exists (to allow TTL index)
+            # Drop existing updatedAt index if it exists (to allow TTL index).
+            # Reason: the reconciler treats an index with the same keys under
+            # another name as present, so the legacy non-TTL index must go
+            # before ttl_updatedAt can be built.
             try:
                 await collection.drop_index("updatedAt_1")
             except Exception:
                 pass  # Index doesn't exist, which is fine
 
-            # TTL index to auto-expire old entries (2 hours - gives buffer beyond refresh)
-            await collection.create_index(
-                "updatedAt", expireAfterSeconds=7200, name="ttl_updatedAt"  # 2 hours
-            )
-
-            logger.info("Weather cache indexes created")
+            self._declare_indexes()
+            logger.info("Weather cache indexes declared")
         except Exception as e:
-            logger.error(f"Error creating weather cache indexes: {e}")
+            logger.error(f"Error declaring weather cache indexes: {e}")
 
     async def get_cached_weather(self, farm_id: UUID) -> Optional[AgriWeatherData]:
         """
@@ -331,9 +345,29 @@ class WeatherCacheService:
 
         return summary
 
+    def job_definition(self, interval_seconds: int = 3600) -> JobDefinition:
+        """
+        Job definition for src.core.jobs — the platform API's refresh path.
+        Only the elected leader worker refreshes, instead of every worker.
+
+        Args:
+            interval_seconds: Refresh interval (default: 3600 = 1 hour)
+        """
+        return JobDefinition(
+            name=self.JOB_NAME,
+            func=self.refresh_all_farms,
+            interval_seconds=interval_seconds,
+            startup_delay_seconds=10,
+            jitter_seconds=30,
+            description="Refresh cached weather for every farm with a location",
+        )
+
     async def start_background_refresh(self, interval_seconds: int = 3600) -> None:
         """
-        Start background task to refresh weather cache periodically
+        Start background task to refresh weather cache periodically.
+
+        In-process loop used by the standalone farm service; the platform API
+        registers job_definition() with the job runner instead.
 
         Args:
             interval_seconds: Refresh interval (default: 3600 = 1 hour)
@@ -430,7 +464,11 @@ class WeatherCacheService:
                     if newest and newest.get("updatedAt")
                     else None
                 ),
-                "backgroundRefreshRunning": self._is_running,
+                "backgroundRefreshRunning": self._is_running
+                or (
+                    get_job_runner().is_running
+                    and get_job_runner().get_job(self.JOB_NAME) is not None
+                ),
                 "cacheCollectionName": self.COLLECTION_NAME,
             }
 
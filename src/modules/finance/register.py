@@ -8,15 +8,18 @@ from fastapi import FastAPI
 import logging
 from typing import Optional
 
+from src.core.jobs import JobDefinition, get_job_runner
+
 from .api import api_router
 from .services.database import finance_db
+from .services.finance.pnl_facts import PnLFactsService
 from .config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
 async def startup_hook() -> None:
-    """Module startup hook — creates indexes and confirms DB access."""
+    """Module startup hook — creates indexes, confirms DB access, registers jobs."""
     logger.info(
         f"[Finance Module] Starting {settings.MODULE_NAME} v{settings.MODULE_VERSION}"
     )
@@ -27,6 +30,26 @@ async def startup_hook() -> None:
         logger.error(f"[Finance Module] Failed during startup: {e}")
         raise
 
+    # P&L fact table upkeep (services/finance/pnl_facts.py)
+    facts = PnLFactsService()
+    runner = get_job_runner()
+    runner.register(
+        JobDefinition(
+            name="finance.pnl_facts_refresh",
+            func=facts.refresh_dirty,
+            interval_seconds=60,
+            description="Rebuild P&L fact months marked dirty by sales/harvest writes",
+        )
+    )
+    runner.register(
+        JobDefinition(
+            name="finance.pnl_facts_repair",
+            func=facts.rebuild_all,
+            cron="30 1 * * *",
+            description="Rebuild the whole P&L fact table from source collections",
+        )
+    )
+
 
 async def shutdown_hook() -> None:
     """Module shutdown hook."""
@@ -7,6 +7,7 @@ Delegates to the shared core MongoDB connection.
 import logging
 
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -24,66 +25,90 @@ class FinanceDatabaseManager:
         """Initialize Finance module indexes."""
         try:
             logger.info("[Finance Module] Initializing Finance indexes...")
-            await cls._create_indexes()
+            cls._declare_indexes()
             logger.info("[Finance Module] Finance indexes initialized")
         except Exception as e:
             logger.error(f"[Finance Module] Error initializing Finance indexes: {e}")
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
+    def _declare_indexes(cls) -> None:
         """
-        Create indexes needed for P&L aggregation queries.
+        Declare indexes needed for P&L aggregation queries.
 
         All indexes are created idempotently (existing indexes are not recreated).
         """
         try:
-            db = mongodb.get_database()
-
             # --- sales_order_lines ---
             # Composite index for per-farm/year revenue aggregation
-            await db.sales_order_lines.create_index(
+            declare_index(
+                "sales_order_lines",
                 [("farmId", 1), ("farmingYear", 1)],
                 name="sol_farmId_farmingYear",
                 background=True,
             )
             # Index for priceSource filtering
-            await db.sales_order_lines.create_index(
-                [("metadata.priceSource", 1)], name="sol_priceSource", background=True
+            declare_index(
+                "sales_order_lines",
+                [("metadata.priceSource", 1)],
+                name="sol_priceSource",
+                background=True,
             )
             # Index for orderRef lookups (joining to sales_orders)
-            await db.sales_order_lines.create_index(
-                [("orderRef", 1)], name="sol_orderRef", background=True
+            declare_index(
+                "sales_order_lines",
+                [("orderRef", 1)],
+                name="sol_orderRef",
+                background=True,
             )
             # Composite for by-month queries
-            await db.sales_order_lines.create_index(
+            declare_index(
+                "sales_order_lines",
                 [("createdAt", 1), ("farmId", 1)],
                 name="sol_createdAt_farmId",
                 background=True,
             )
 
             # --- purchase_register ---
-            await db.purchase_register.create_index(
+            declare_index(
+                "purchase_register",
                 [("buyerEntity", 1), ("date", 1)],
                 name="pr_buyerEntity_date",
                 background=True,
             )
-            await db.purchase_register.create_index(
+            declare_index(
+                "purchase_register",
                 [("items.mappedCropName", 1)],
                 name="pr_items_mappedCropName",
                 background=True,
             )
 
             # --- inventory_movements ---
-            await db.inventory_movements.create_index(
+            declare_index(
+                "inventory_movements",
                 [("type", 1), ("movementDate", 1)],
                 name="im_type_movementDate",
                 background=True,
             )
 
-            logger.info("[Finance Module] MongoDB indexes created successfully")
+            # --- pnl_monthly_facts (services/finance/pnl_facts.py) ---
+            declare_index(
+                "pnl_monthly_facts",
+                [("category", 1), ("month", 1), ("farmId", 1)],
+                name="pmf_category_month_farmId",
+                background=True,
+            )
+            # Stale-fact sweep after a month rebuild
+            declare_index(
+                "pnl_monthly_facts",
+                [("month", 1), ("refreshedAt", 1)],
+                name="pmf_month_refreshedAt",
+                background=True,
+            )
+
+            logger.info("[Finance Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Finance Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Finance Module] Error declaring MongoDB indexes: {e}")
             # Do not raise — indexes are not critical for startup
 
     @classmethod
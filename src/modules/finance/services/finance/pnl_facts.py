@@ -0,0 +1,392 @@
+"""
+Finance Module - P&L Monthly Facts
+
+Builds and maintains ``pnl_monthly_facts``, the pre-aggregated table every
+P&L endpoint reads instead of re-scanning the raw collections.
+
+One fact document per
+(organizationId, month, category, farmId, cropName, priceSource,
+farmingYear, paymentStatus).  Unused dimensions are None.  Categories:
+
+  revenue           sales_order_lines by createdAt month
+                    (revenueGross/Tax/Net, paidAmount, lineCount, kgSold,
+                    orderRefs, firstAt/lastAt)
+  cogs_crop, cogs_farm, opex_maintenance, opex_logistics, opex_other
+                    purchase_register items by voucher date month (amount);
+                    classified ONCE here, by _classify_item
+  orders            sales_orders by orderDate month (orderCount)
+  harvest           block_harvests by harvestDate month (kgHarvested)
+
+``orderRefs`` is kept per fact because order counts are distinct counts and
+cannot be summed across facts; readers union the arrays.
+
+Freshness
+---------
+- Ops write paths mark months dirty (src/core/finance/pnl_dirty.py); the
+  ``finance.pnl_facts_refresh`` job rebuilds just those months.
+- ``finance.pnl_facts_repair`` rebuilds everything nightly, covering the
+  import scripts that write sales_order_lines / purchase_register directly.
+  Run it by hand after an import: POST /api/v1/admin/jobs/finance.pnl_facts_repair/run
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ReplaceOne
+
+from src.core.finance.pnl_dirty import DIRTY_COLLECTION, month_key
+from src.services.database import mongodb
+
+logger = logging.getLogger(__name__)
+
+FACTS_COLLECTION = "pnl_monthly_facts"
+
+REVENUE = "revenue"
+ORDERS = "orders"
+HARVEST = "harvest"
+CROP_COGS = "cogs_crop"
+# Purchase items without mappedCropName.
+OVERHEAD_CATEGORIES = ("cogs_farm", "opex_maintenance", "opex_logistics", "opex_other")
+COST_CATEGORIES = (CROP_COGS,) + OVERHEAD_CATEGORIES
+
+WRITE_BATCH_SIZE = 1000
+
+# (date field, projection) per source collection
+_SOURCES = {
+    "sales_order_lines": (
+        "createdAt",
+        {
+            "_id": 0,
+            "organizationId": 1,
+            "createdAt": 1,
+            "farmId": 1,
+            "cropName": 1,
+            "farmingYear": 1,
+            "metadata.priceSource": 1,
+            "excel_data.totalAmountAfterTax": 1,
+            "excel_data.vatAmount": 1,
+            "excel_data.paidAmount": 1,
+            "totalKg": 1,
+            "orderRef": 1,
+        },
+    ),
+    "purchase_register": (
+        "date",
+        {"_id": 0, "organizationId": 1, "date": 1, "items": 1},
+    ),
+    "sales_orders": (
+        "orderDate",
+        {
+            "_id": 0,
+            "organizationId": 1,
+            "orderDate": 1,
+            "farmId": 1,
+            "farmingYear": 1,
+            "paymentStatus": 1,
+        },
+    ),
+    "block_harvests": (
+        "harvestDate",
+        {
+            "_id": 0,
+            "organizationId": 1,
+            "harvestDate": 1,
+            "farmId": 1,
+            "quantityKg": 1,
+        },
+    ),
+}
+
+_MEASURES = {
+    REVENUE: {
+        "revenueGross": 0.0,
+        "revenueTax": 0.0,
+        "revenueNet": 0.0,
+        "paidAmount": 0.0,
+        "lineCount": 0,
+        "kgSold": 0.0,
+        "firstAt": None,
+        "lastAt": None,
+    },
+    ORDERS: {"orderCount": 0},
+    HARVEST: {"kgHarvested": 0.0},
+}
+
+# ---------------------------------------------------------------------------
+# Item classification (write time only)
+# ---------------------------------------------------------------------------
+
+# Keywords in purchase_register item names that classify as OPEX (not COGS).
+# The check is case-insensitive substring match.
+OPEX_KEYWORDS: Tuple[str, ...] = (
+    "service",
+    "repair",
+    "maintenance",
+    "labor",
+    "labour",
+    "salary",
+    "wage",
+    "insurance",
+    "rent",
+    "lease",
+    "fuel",
+    "transport",
+    "freight",
+    "vehicle",
+    "admin",
+    "office",
+    "utility",
+    "electricity",
+)
+
+# Keywords that specifically indicate maintenance opex
+MAINTENANCE_KEYWORDS: Tuple[str, ...] = (
+    "repair",
+    "maintenance",
+    "service",
+)
+
+# Keywords that indicate logistics opex
+LOGISTICS_KEYWORDS: Tuple[str, ...] = (
+    "fuel",
+    "transport",
+    "freight",
+    "vehicle",
+    "delivery",
+)
+
+
+def _classify_item(item_name: str) -> str:
+    """
+    Classify a purchase_register item name into one of:
+      'cogs_crop'   — has mappedCropName (handled separately)
+      'cogs_farm'   — farm overhead (fertilizer, seed, pesticide, etc.)
+      'opex_maintenance'
+      'opex_logistics'
+      'opex_other'
+
+    This function is only called when mappedCropName is None.
+    """
+    lower = item_name.lower()
+    for kw in MAINTENANCE_KEYWORDS:
+        if kw in lower:
+            return "opex_maintenance"
+    for kw in LOGISTICS_KEYWORDS:
+        if kw in lower:
+            return "opex_logistics"
+    for kw in OPEX_KEYWORDS:
+        if kw in lower:
+            return "opex_other"
+    # Default: treat as farm overhead COGS
+    return "cogs_farm"
+
+
+def _num(value: Any) -> float:
+    """Numeric value, or 0 for null / missing (the $ifNull(..., 0) the old pipelines used)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return 0
+
+
+def month_bounds(month: str):
+    """[start, next month start) datetimes for a ``YYYY-MM`` key."""
+    year, mon = int(month[:4]), int(month[5:7])
+    start = datetime(year, mon, 1)
+    end = datetime(year + 1, 1, 1) if mon == 12 else datetime(year, mon + 1, 1)
+    return start, end
+
+
+class _FactSet:
+    """Facts being accumulated for one rebuild."""
+
+    def __init__(self) -> None:
+        self.facts: Dict[str, Dict[str, Any]] = {}
+        self._order_refs: Dict[str, set] = {}
+
+    def fact(
+        self,
+        doc: Dict[str, Any],
+        date_field: str,
+        category: str,
+        farm_id: Optional[str] = None,
+        crop_name: Optional[str] = None,
+        price_source: Optional[str] = None,
+        farming_year: Optional[int] = None,
+        payment_status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        org_id = doc.get("organizationId")
+        month = month_key(doc.get(date_field))
+        key = json.dumps(
+            [
+                org_id,
+                month,
+                category,
+                farm_id,
+                crop_name,
+                price_source,
+                farming_year,
+                payment_status,
+            ],
+            default=str,
+        )
+        fact = self.facts.get(key)
+        if fact is None:
+            fact = {
+                "_id": key,
+                "organizationId": org_id,
+                "month": month,
+                "category": category,
+                "farmId": farm_id,
+                "cropName": crop_name,
+                "priceSource": price_source,
+                "farmingYear": farming_year,
+                "paymentStatus": payment_status,
+                **_MEASURES.get(category, {"amount": 0.0}),
+            }
+            self.facts[key] = fact
+        return fact
+
+    def add_line(self, line: Dict[str, Any]) -> None:
+        excel = line.get("excel_data") or {}
+        fact = self.fact(
+            line,
+            "createdAt",
+            REVENUE,
+            farm_id=line.get("farmId"),
+            crop_name=line.get("cropName"),
+            price_source=(line.get("metadata") or {}).get("priceSource"),
+            farming_year=line.get("farmingYear"),
+        )
+        after_tax = _num(excel.get("totalAmountAfterTax"))
+        vat = _num(excel.get("vatAmount"))
+        fact["revenueGross"] += after_tax - vat
+        fact["revenueTax"] += vat
+        fact["revenueNet"] += after_tax
+        fact["paidAmount"] += _num(excel.get("paidAmount"))
+        fact["lineCount"] += 1
+        fact["kgSold"] += _num(line.get("totalKg"))
+        if "orderRef" in line:
+            self._order_refs.setdefault(fact["_id"], set()).add(line["orderRef"])
+        created = line.get("createdAt")
+        if isinstance(created, datetime):
+            if fact["firstAt"] is None or created < fact["firstAt"]:
+                fact["firstAt"] = created
+            if fact["lastAt"] is None or created > fact["lastAt"]:
+                fact["lastAt"] = created
+
+    def add_purchase(self, voucher: Dict[str, Any]) -> None:
+        items = voucher.get("items") or []
+        for item in items if isinstance(items, list) else [items]:
+            crop = item.get("mappedCropName")
+            category = CROP_COGS if crop else _classify_item(item.get("name") or "")
+            fact = self.fact(
+                voucher, "date", category, crop_name=crop if crop else None
+            )
+            fact["amount"] += _num(item.get("amount"))
+
+    def add_order(self, order: Dict[str, Any]) -> None:
+        self.fact(
+            order,
+            "orderDate",
+            ORDERS,
+            farm_id=order.get("farmId"),
+            farming_year=order.get("farmingYear"),
+            payment_status=order.get("paymentStatus"),
+        )["orderCount"] += 1
+
+    def add_harvest(self, harvest: Dict[str, Any]) -> None:
+        self.fact(harvest, "harvestDate", HARVEST, farm_id=harvest.get("farmId"))[
+            "kgHarvested"
+        ] += _num(harvest.get("quantityKg"))
+
+    def documents(self, refreshed_at: datetime) -> List[Dict[str, Any]]:
+        docs = []
+        for key, fact in self.facts.items():
+            if fact["category"] == REVENUE:
+                refs = self._order_refs.get(key, set())
+                fact["orderRefs"] = sorted(refs, key=lambda r: (r is None, str(r)))
+            fact["refreshedAt"] = refreshed_at
+            docs.append(fact)
+        return docs
+
+
+class PnLFactsService:
+    """Rebuilds ``pnl_monthly_facts`` from the raw P&L source collections."""
+
+    def __init__(self, db=None) -> None:
+        self._db = db
+
+    def _get_db(self):
+        if self._db is None:
+            self._db = mongodb.get_database()
+        return self._db
+
+    async def _build(self, month: Optional[str]) -> _FactSet:
+        """Stream every source (one month, or everything when None) into facts."""
+        db = self._get_db()
+        facts = _FactSet()
+        adders = {
+            "sales_order_lines": facts.add_line,
+            "purchase_register": facts.add_purchase,
+            "sales_orders": facts.add_order,
+            "block_harvests": facts.add_harvest,
+        }
+        for collection, (date_field, projection) in _SOURCES.items():
+            query: Dict[str, Any] = {}
+            if month is not None:
+                start, end = month_bounds(month)
+                query[date_field] = {"$gte": start, "$lt": end}
+            async for doc in db[collection].find(query, projection):
+                adders[collection](doc)
+        return facts
+
+    async def _write(self, facts: _FactSet, scope: Dict[str, Any]) -> Dict[str, int]:
+        """Upsert the rebuilt facts, then drop facts in ``scope`` not rebuilt."""
+        coll = self._get_db()[FACTS_COLLECTION]
+        refreshed_at = datetime.utcnow()
+        docs = facts.documents(refreshed_at)
+        for start in range(0, len(docs), WRITE_BATCH_SIZE):
+            await coll.bulk_write(
+                [
+                    ReplaceOne({"_id": d["_id"]}, d, upsert=True)
+                    for d in docs[start : start + WRITE_BATCH_SIZE]
+                ],
+                ordered=False,
+            )
+        stale = await coll.delete_many({**scope, "refreshedAt": {"$lt": refreshed_at}})
+        return {"facts": len(docs), "removed": stale.deleted_count}
+
+    async def refresh_month(self, month: str) -> Dict[str, int]:
+        """Rebuild the facts of one ``YYYY-MM`` month."""
+        facts = await self._build(month)
+        return await self._write(facts, {"month": month})
+
+    async def rebuild_all(self) -> Dict[str, Any]:
+        """Rebuild the whole table (nightly repair)."""
+        started = time.monotonic()
+        facts = await self._build(None)
+        stats = await self._write(facts, {})
+        stats["durationSeconds"] = round(time.monotonic() - started, 3)
+        logger.info(f"[PnL Facts] Full rebuild: {stats}")
+        return stats
+
+    async def refresh_dirty(self) -> Dict[str, Any]:
+        """Rebuild every month marked dirty by an ops write path."""
+        dirty = self._get_db()[DIRTY_COLLECTION]
+        marks = await dirty.find({}).sort("_id", 1).to_list(length=None)
+        refreshed = []
+        for mark in marks:
+            await self.refresh_month(mark["_id"])
+            # Keep the mark if another write landed while we rebuilt.
+            await dirty.delete_one(
+                {"_id": mark["_id"], "markedAt": {"$lte": mark["markedAt"]}}
+            )
+            refreshed.append(mark["_id"])
+        if refreshed:
+            logger.info(f"[PnL Facts] Refreshed months: {', '.join(refreshed)}")
+        return {"months": refreshed}
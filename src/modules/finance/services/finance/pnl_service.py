@@ -6,6 +6,10 @@ All aggregation logic for the P&L dashboard endpoints.
 Design notes
 ------------
 - All DB reads are read-only (no writes).
+- Endpoints read the pre-aggregated pnl_monthly_facts table (see pnl_facts.py):
+  each is a few small $group stages over facts. Date ranges that split a month,
+  and requests made before the first fact rebuild, fall back to aggregating
+  the source collections directly (the *_from_source methods).
 - Revenue is sourced from sales_order_lines.excel_data (the enriched per-line data).
   Lines with null excel_data contribute 0 to monetary totals but are still counted.
 - COGS uses Option B: purchase_register items with mappedCropName are crop-direct;
@@ -19,81 +23,28 @@ Design notes
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.services.database import mongodb
 
+from .pnl_facts import (
+    COST_CATEGORIES,
+    CROP_COGS,
+    FACTS_COLLECTION,
+    HARVEST,
+    ORDERS,
+    OVERHEAD_CATEGORIES,
+    REVENUE,
+    _classify_item,
+)
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# Item classification helpers
+# Rounding helpers
 # ---------------------------------------------------------------------------
 
-# Keywords in purchase_register item names that classify as OPEX (not COGS).
-# The check is case-insensitive substring match.
-OPEX_KEYWORDS: Tuple[str, ...] = (
-    "service",
-    "repair",
-    "maintenance",
-    "labor",
-    "labour",
-    "salary",
-    "wage",
-    "insurance",
-    "rent",
-    "lease",
-    "fuel",
-    "transport",
-    "freight",
-    "vehicle",
-    "admin",
-    "office",
-    "utility",
-    "electricity",
-)
-
-# Keywords that specifically indicate maintenance opex
-MAINTENANCE_KEYWORDS: Tuple[str, ...] = (
-    "repair",
-    "maintenance",
-    "service",
-)
-
-# Keywords that indicate logistics opex
-LOGISTICS_KEYWORDS: Tuple[str, ...] = (
-    "fuel",
-    "transport",
-    "freight",
-    "vehicle",
-    "delivery",
-)
-
-
-def _classify_item(item_name: str) -> str:
-    """
-    Classify a purchase_register item name into one of:
-      'cogs_crop'   — has mappedCropName (handled separately)
-      'cogs_farm'   — farm overhead (fertilizer, seed, pesticide, etc.)
-      'opex_maintenance'
-      'opex_logistics'
-      'opex_other'
-
-    This function is only called when mappedCropName is None.
-    """
-    lower = item_name.lower()
-    for kw in MAINTENANCE_KEYWORDS:
-        if kw in lower:
-            return "opex_maintenance"
-    for kw in LOGISTICS_KEYWORDS:
-        if kw in lower:
-            return "opex_logistics"
-    for kw in OPEX_KEYWORDS:
-        if kw in lower:
-            return "opex_other"
-    # Default: treat as farm overhead COGS
-    return "cogs_farm"
-
 
 def _safe_round(value: float, decimals: int = 2) -> float:
     """Round a float to `decimals` places, returning 0.0 if value is NaN/None."""
@@ -144,6 +95,9 @@ class PnLService:
     data dict that the route handler will wrap in the response model.
     """
 
+    # Set once pnl_monthly_facts is seen non-empty (it is never emptied).
+    _facts_built = False
+
     def __init__(self) -> None:
         self._db = None
 
@@ -298,7 +252,7 @@ class PnLService:
                 }
             },
         ]
-        items = await db.purchase_register.aggregate(pipeline).to_list(10000)
+        items = await db.purchase_register.aggregate(pipeline).to_list(None)
 
         cogs_crop = 0.0
         cogs_farm = 0.0
@@ -431,10 +385,13 @@ class PnLService:
         return start, end
 
     # ------------------------------------------------------------------
-    # Public endpoint methods
+    # Source-collection fallbacks
+    #
+    # Used for date ranges that split a month (facts are monthly) and
+    # before the first fact rebuild has run.
     # ------------------------------------------------------------------
 
-    async def get_summary(
+    async def _summary_from_source(
         self,
         farm_id: Optional[str] = None,
         farming_year: Optional[int] = None,
@@ -526,7 +483,7 @@ class PnLService:
             "period": {"start": period_start, "end": period_end},
         }
 
-    async def get_by_month(
+    async def _by_month_from_source(
         self,
         farm_id: Optional[str] = None,
         farming_year: Optional[int] = None,
@@ -569,7 +526,7 @@ class PnLService:
             },
             {"$sort": {"_id.year": 1, "_id.month": 1}},
         ]
-        rows = await db.sales_order_lines.aggregate(pipeline).to_list(200)
+        rows = await db.sales_order_lines.aggregate(pipeline).to_list(None)
 
         # Build a month -> purchase costs lookup (simplified: spread total evenly)
         pr_match: Dict[str, Any] = {}
@@ -589,7 +546,7 @@ class PnLService:
                 }
             },
         ]
-        pr_rows = await db.purchase_register.aggregate(pr_pipeline).to_list(200)
+        pr_rows = await db.purchase_register.aggregate(pr_pipeline).to_list(None)
         pr_by_month: Dict[str, float] = {}
         for pr in pr_rows:
             key = f"{pr['_id']['year']:04d}-{pr['_id']['month']:02d}"
@@ -620,7 +577,7 @@ class PnLService:
 
         return buckets
 
-    async def get_by_farm(
+    async def _by_farm_from_source(
         self,
         farming_year: Optional[int] = None,
         start_date: Optional[date] = None,
@@ -632,7 +589,7 @@ class PnLService:
         db = self._get_db()
 
         # Get all farms
-        all_farms = await db.farms.find({}, {"farmId": 1, "name": 1}).to_list(100)
+        all_farms = await self._all_farms()
         farm_map: Dict[str, str] = {
             f["farmId"]: f.get("name", "Unknown") for f in all_farms if f.get("farmId")
         }
@@ -662,7 +619,7 @@ class PnLService:
                 }
             },
         ]
-        rows = await db.sales_order_lines.aggregate(pipeline).to_list(100)
+        rows = await db.sales_order_lines.aggregate(pipeline).to_list(None)
         revenue_by_farm: Dict[str, Dict[str, Any]] = {}
         for row in rows:
             revenue_by_farm[row["_id"]] = {
@@ -720,7 +677,7 @@ class PnLService:
         buckets.sort(key=lambda x: x["revenue"], reverse=True)
         return buckets
 
-    async def get_by_crop(
+    async def _by_crop_from_source(
         self,
         farm_id: Optional[str] = None,
         farming_year: Optional[int] = None,
@@ -773,7 +730,7 @@ class PnLService:
                 }
             },
         ]
-        pr_rows = await db.purchase_register.aggregate(pr_pipeline).to_list(200)
+        pr_rows = await db.purchase_register.aggregate(pr_pipeline).to_list(None)
         cogs_by_crop: Dict[str, float] = {
             r["_id"]: _safe_round(r["cogs"]) for r in pr_rows
         }
@@ -799,6 +756,555 @@ class PnLService:
 
         return buckets
 
+    # ------------------------------------------------------------------
+    # Fact-table reads (pnl_monthly_facts)
+    # ------------------------------------------------------------------
+
+    async def _facts_ready(
+        self, start_date: Optional[date], end_date: Optional[date]
+    ) -> bool:
+        """
+        True when the request can be answered from monthly facts: the range
+        covers whole months and the fact table has been built.
+        """
+        if start_date and start_date.day != 1:
+            return False
+        if end_date and (end_date + timedelta(days=1)).day != 1:
+            return False
+        if not PnLService._facts_built:
+            db = self._get_db()
+            PnLService._facts_built = (
+                await db[FACTS_COLLECTION].find_one({}, {"_id": 1}) is not None
+            )
+        return PnLService._facts_built
+
+    async def _facts(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        db = self._get_db()
+        return await db[FACTS_COLLECTION].aggregate(pipeline).to_list(None)
+
+    @staticmethod
+    def _fact_match(
+        categories: Tuple[str, ...],
+        farm_id: Optional[str] = None,
+        farming_year: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_imputed: bool = True,
+        price_source_filter: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """$match over facts mirroring the filters of the source queries."""
+        match: Dict[str, Any] = {"category": {"$in": list(categories)}}
+        if farm_id:
+            match["farmId"] = farm_id
+        if farming_year:
+            match["farmingYear"] = farming_year
+        month: Dict[str, Any] = {}
+        if start_date:
+            month["$gte"] = f"{start_date.year:04d}-{start_date.month:02d}"
+        if end_date:
+            month["$lte"] = f"{end_date.year:04d}-{end_date.month:02d}"
+        if month:
+            match["month"] = month
+        if price_source_filter:
+            match["priceSource"] = price_source_filter
+        elif not include_imputed and categories == (REVENUE,):
+            match["priceSource"] = {"$in": ["excel_match", "excel_alias_match"]}
+        return match
+
+    @staticmethod
+    def _distinct_orders(ref_lists: List[List[Any]]) -> int:
+        """Distinct order refs across the orderRefs arrays of several facts."""
+        refs: set = set()
+        for ref_list in ref_lists:
+            refs.update(ref_list or [])
+        return len(refs)
+
+    async def _all_farms(self) -> List[Dict[str, Any]]:
+        db = self._get_db()
+        return await db.farms.find({}, {"farmId": 1, "name": 1}).to_list(None)
+
+    # ------------------------------------------------------------------
+    # Public endpoint methods
+    # ------------------------------------------------------------------
+
+    async def get_summary(
+        self,
+        farm_id: Optional[str] = None,
+        farming_year: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_imputed: bool = True,
+        price_source_filter: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Aggregate data for the /summary endpoint."""
+        if not await self._facts_ready(start_date, end_date):
+            return await self._summary_from_source(
+                farm_id,
+                farming_year,
+                start_date,
+                end_date,
+                include_imputed,
+                price_source_filter,
+            )
+
+        revenue_rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (REVENUE,),
+                        farm_id,
+                        farming_year,
+                        start_date,
+                        end_date,
+                        include_imputed,
+                        price_source_filter,
+                    )
+                },
+                {
+                    "$group": {
+                        "_id": "$priceSource",
+                        "gross": {"$sum": "$revenueGross"},
+                        "tax": {"$sum": "$revenueTax"},
+                        "net": {"$sum": "$revenueNet"},
+                        "paidAmount": {"$sum": "$paidAmount"},
+                        "lineCount": {"$sum": "$lineCount"},
+                        "kgSold": {"$sum": "$kgSold"},
+                    }
+                },
+            ]
+        )
+        cost_rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        COST_CATEGORIES, start_date=start_date, end_date=end_date
+                    )
+                },
+                {"$group": {"_id": "$category", "amount": {"$sum": "$amount"}}},
+            ]
+        )
+        order_rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (ORDERS,), farm_id, farming_year, start_date, end_date
+                    )
+                },
+                {"$group": {"_id": "$paymentStatus", "count": {"$sum": "$orderCount"}}},
+            ]
+        )
+        harvest_rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (HARVEST,), farm_id, start_date=start_date, end_date=end_date
+                    )
+                },
+                {"$group": {"_id": None, "total": {"$sum": "$kgHarvested"}}},
+            ]
+        )
+
+        # Revenue
+        totals = {
+            k: 0.0 for k in ("gross", "tax", "net", "paidAmount", "lineCount", "kgSold")
+        }
+        by_source_raw: Dict[str, float] = {
+            "excel_match": 0.0,
+            "excel_alias_match": 0.0,
+            "imputed_customer_crop_avg": 0.0,
+            "no_data": 0.0,
+        }
+        for row in revenue_rows:
+            for k in totals:
+                totals[k] += row.get(k) or 0.0
+            key = row["_id"] or "unknown"
+            by_source_raw[key] = by_source_raw.get(key, 0.0) + (row.get("net") or 0.0)
+        net_revenue = _safe_round(totals["net"])
+        paid = _safe_round(totals["paidAmount"])
+
+        # Costs
+        costs = {category: 0.0 for category in COST_CATEGORIES}
+        for row in cost_rows:
+            costs[row["_id"]] = _safe_round(row["amount"])
+        total_cogs = costs["cogs_crop"] + costs["cogs_farm"]
+        total_opex = (
+            costs["opex_maintenance"] + costs["opex_logistics"] + costs["opex_other"]
+        )
+        gross_profit = _safe_round(net_revenue - total_cogs)
+        operating_profit = _safe_round(gross_profit - total_opex)
+
+        # Orders
+        order_counts = {"paid": 0, "pending": 0, "partial": 0}
+        total_orders = 0
+        for row in order_rows:
+            n = int(row["count"])
+            total_orders += n
+            if (row["_id"] or "unknown") in order_counts:
+                order_counts[row["_id"]] += n
+        order_counts["total"] = total_orders
+
+        # Period
+        if start_date and end_date:
+            period_start = start_date.isoformat()
+            period_end = end_date.isoformat()
+        else:
+            bounds = await self._facts(
+                [
+                    {"$match": self._fact_match((REVENUE,), farm_id, farming_year)},
+                    {
+                        "$group": {
+                            "_id": None,
+                            "minDate": {"$min": "$firstAt"},
+                            "maxDate": {"$max": "$lastAt"},
+                        }
+                    },
+                ]
+            )
+            row = bounds[0] if bounds else {}
+            period_start = (
+                row["minDate"].date().isoformat() if row.get("minDate") else None
+            )
+            period_end = (
+                row["maxDate"].date().isoformat() if row.get("maxDate") else None
+            )
+
+        return {
+            "revenue": {
+                "gross": _safe_round(totals["gross"]),
+                "tax": _safe_round(totals["tax"]),
+                "net": net_revenue,
+                "lineCount": int(totals["lineCount"]),
+                "paidAmount": paid,
+                "unpaidAmount": _safe_round(max(net_revenue - paid, 0.0)),
+                "collectionRate": (
+                    _safe_round(paid / net_revenue) if net_revenue > 0 else 0.0
+                ),
+                "bySource": {k: _safe_round(v) for k, v in by_source_raw.items()},
+            },
+            "cogs": {
+                "total": _safe_round(total_cogs),
+                "allocatedByCrop": costs["cogs_crop"],
+                "allocatedByFarm": costs["cogs_farm"],
+                # inventory_movements totalCost is excluded due to data quality issue
+                # (migration computed it using baseQuantity in mg, not kg quantity).
+                "unallocatedOverhead": 0.0,
+            },
+            "grossProfit": gross_profit,
+            "grossMarginPercent": _margin(gross_profit, net_revenue),
+            "opex": {
+                "total": _safe_round(total_opex),
+                "logistics": costs["opex_logistics"],
+                "maintenance": costs["opex_maintenance"],
+                "labor": 0.0,
+                "other": costs["opex_other"],
+            },
+            "operatingProfit": operating_profit,
+            "operatingMarginPercent": _margin(operating_profit, net_revenue),
+            "kg": {
+                "sold": _safe_round(totals["kgSold"]),
+                "harvested": _safe_round(
+                    harvest_rows[0]["total"] if harvest_rows else 0.0
+                ),
+            },
+            "orders": order_counts,
+            "period": {"start": period_start, "end": period_end},
+        }
+
+    async def get_by_month(
+        self,
+        farm_id: Optional[str] = None,
+        farming_year: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_imputed: bool = True,
+        price_source_filter: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate monthly P&L buckets."""
+        if not await self._facts_ready(start_date, end_date):
+            return await self._by_month_from_source(
+                farm_id,
+                farming_year,
+                start_date,
+                end_date,
+                include_imputed,
+                price_source_filter,
+            )
+
+        rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (REVENUE,),
+                        farm_id,
+                        farming_year,
+                        start_date,
+                        end_date,
+                        include_imputed,
+                        price_source_filter,
+                    )
+                },
+                {
+                    "$group": {
+                        "_id": "$month",
+                        "revenue": {"$sum": "$revenueNet"},
+                        "kgSold": {"$sum": "$kgSold"},
+                        "orderRefs": {"$push": "$orderRefs"},
+                    }
+                },
+                {"$sort": {"_id": 1}},
+            ]
+        )
+        # All purchase items count as monthly COGS here (unclassified), as before.
+        cost_rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        COST_CATEGORIES, start_date=start_date, end_date=end_date
+                    )
+                },
+                {"$group": {"_id": "$month", "totalCost": {"$sum": "$amount"}}},
+            ]
+        )
+        cost_by_month = {r["_id"]: _safe_round(r["totalCost"]) for r in cost_rows}
+
+        buckets: List[Dict[str, Any]] = []
+        for row in rows:
+            ym = row["_id"]
+            if ym is None:
+                continue  # lines without a createdAt cannot be bucketed
+            revenue = _safe_round(row["revenue"])
+            cogs = cost_by_month.get(ym, 0.0)
+            opex = 0.0
+            gross = _safe_round(revenue - cogs)
+            buckets.append(
+                {
+                    "yearMonth": ym,
+                    "revenue": revenue,
+                    "cogs": cogs,
+                    "opex": opex,
+                    "grossProfit": gross,
+                    "netProfit": _safe_round(gross - opex),
+                    "kgSold": _safe_round(row["kgSold"]),
+                    "orderCount": self._distinct_orders(row["orderRefs"]),
+                }
+            )
+        return buckets
+
+    async def get_by_farm(
+        self,
+        farming_year: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_imputed: bool = True,
+        price_source_filter: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate P&L per farm. Includes all farms even with zero revenue."""
+        if not await self._facts_ready(start_date, end_date):
+            return await self._by_farm_from_source(
+                farming_year,
+                start_date,
+                end_date,
+                include_imputed,
+                price_source_filter,
+            )
+
+        farm_map: Dict[str, str] = {
+            f["farmId"]: f.get("name", "Unknown")
+            for f in await self._all_farms()
+            if f.get("farmId")
+        }
+        rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (REVENUE,),
+                        None,
+                        farming_year,
+                        start_date,
+                        end_date,
+                        include_imputed,
+                        price_source_filter,
+                    )
+                },
+                {
+                    "$group": {
+                        "_id": "$farmId",
+                        "revenue": {"$sum": "$revenueNet"},
+                        "kgSold": {"$sum": "$kgSold"},
+                        "orderRefs": {"$push": "$orderRefs"},
+                    }
+                },
+            ]
+        )
+        revenue_by_farm = {
+            row["_id"]: {
+                "revenue": _safe_round(row["revenue"]),
+                "kgSold": _safe_round(row["kgSold"]),
+                "orderCount": self._distinct_orders(row["orderRefs"]),
+            }
+            for row in rows
+        }
+        total_revenue = sum(v["revenue"] for v in revenue_by_farm.values()) or 1.0
+
+        overhead = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        OVERHEAD_CATEGORIES, start_date=start_date, end_date=end_date
+                    )
+                },
+                {"$group": {"_id": None, "total": {"$sum": "$amount"}}},
+            ]
+        )
+        total_farm_cogs = float(overhead[0]["total"] if overhead else 0.0)
+
+        buckets: List[Dict[str, Any]] = []
+        for farm_id, farm_name in farm_map.items():
+            data = revenue_by_farm.get(
+                farm_id, {"revenue": 0.0, "kgSold": 0.0, "orderCount": 0}
+            )
+            revenue = data["revenue"]
+            # Allocate farm COGS proportionally by revenue share
+            farm_share = revenue / total_revenue if revenue > 0 else 0.0
+            cogs = _safe_round(total_farm_cogs * farm_share)
+            gross = _safe_round(revenue - cogs)
+            buckets.append(
+                {
+                    "farmId": farm_id,
+                    "farmName": farm_name,
+                    "revenue": revenue,
+                    "cogs": cogs,
+                    "grossProfit": gross,
+                    "marginPercent": _margin(gross, revenue),
+                    "kgSold": data["kgSold"],
+                    "orderCount": data["orderCount"],
+                }
+            )
+
+        buckets.sort(key=lambda x: x["revenue"], reverse=True)
+        return buckets
+
+    async def get_by_crop(
+        self,
+        farm_id: Optional[str] = None,
+        farming_year: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_imputed: bool = True,
+        price_source_filter: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate top 20 crops by revenue."""
+        if not await self._facts_ready(start_date, end_date):
+            return await self._by_crop_from_source(
+                farm_id,
+                farming_year,
+                start_date,
+                end_date,
+                include_imputed,
+                price_source_filter,
+            )
+
+        rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (REVENUE,),
+                        farm_id,
+                        farming_year,
+                        start_date,
+                        end_date,
+                        include_imputed,
+                        price_source_filter,
+                    )
+                },
+                {
+                    "$group": {
+                        "_id": "$cropName",
+                        "revenue": {"$sum": "$revenueNet"},
+                        "kgSold": {"$sum": "$kgSold"},
+                    }
+                },
+                {"$sort": {"revenue": -1}},
+                {"$limit": 20},
+            ]
+        )
+        # Crop-direct COGS is all-time, as before (purchase items carry no farm).
+        cogs_rows = await self._facts(
+            [
+                {"$match": {"category": CROP_COGS}},
+                {"$group": {"_id": "$cropName", "cogs": {"$sum": "$amount"}}},
+            ]
+        )
+        cogs_by_crop = {r["_id"]: _safe_round(r["cogs"]) for r in cogs_rows}
+
+        buckets: List[Dict[str, Any]] = []
+        for row in rows:
+            crop = row["_id"] or "Unknown"
+            revenue = _safe_round(row["revenue"])
+            kg = _safe_round(row["kgSold"])
+            cogs = cogs_by_crop.get(crop, 0.0)
+            buckets.append(
+                {
+                    "cropName": crop,
+                    "revenue": revenue,
+                    "cogs": cogs,
+                    "grossProfit": _safe_round(revenue - cogs),
+                    "kgSold": kg,
+                    "avgPricePerKg": _safe_round(revenue / kg) if kg > 0 else 0.0,
+                }
+            )
+        return buckets
+
+    async def get_revenue_sources(
+        self,
+        farm_id: Optional[str] = None,
+        farming_year: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Breakdown by price-source confidence level."""
+        if not await self._facts_ready(start_date, end_date):
+            return await self._revenue_sources_from_source(
+                farm_id, farming_year, start_date, end_date
+            )
+
+        rows = await self._facts(
+            [
+                {
+                    "$match": self._fact_match(
+                        (REVENUE,), farm_id, farming_year, start_date, end_date
+                    )
+                },
+                {
+                    "$group": {
+                        "_id": "$priceSource",
+                        "lineCount": {"$sum": "$lineCount"},
+                        "revenue": {"$sum": "$revenueNet"},
+                        "orderRefs": {"$push": "$orderRefs"},
+                    }
+                },
+            ]
+        )
+
+        result: Dict[str, Dict[str, Any]] = {
+            key: {"lineCount": 0, "revenue": 0.0, "orderCount": 0}
+            for key in (
+                "excel_match",
+                "excel_alias_match",
+                "imputed_customer_crop_avg",
+                "no_data",
+            )
+        }
+        for row in rows:
+            entry = result.setdefault(
+                row["_id"] or "no_data",
+                {"lineCount": 0, "revenue": 0.0, "orderCount": 0},
+            )
+            entry["lineCount"] += int(row["lineCount"])
+            entry["revenue"] = _safe_round(entry["revenue"] + row["revenue"])
+            entry["orderCount"] += self._distinct_orders(row["orderRefs"])
+        return result
+
     async def get_ar_aging(
         self,
         farm_id: Optional[str] = None,
@@ -853,8 +1359,6 @@ class PnLService:
             },
             {"$match": {"outstanding": {"$gt": 0}}},
         ]
-        orders = await db.sales_orders.aggregate(pipeline).to_list(10000)
-
         current = {"count": 0, "amount": 0.0}
         aging_30_60 = {"count": 0, "amount": 0.0}
         aging_60_90 = {"count": 0, "amount": 0.0}
@@ -863,7 +1367,7 @@ class PnLService:
         # Per-customer aggregation
         customer_map: Dict[str, Dict[str, Any]] = {}
 
-        for order in orders:
+        async for order in db.sales_orders.aggregate(pipeline):
             age = int(order.get("ageDays") or 0)
             outstanding = _safe_round(float(order.get("outstanding") or 0.0))
             cid = str(order.get("customerId", "unknown"))
@@ -937,7 +1441,7 @@ class PnLService:
             "byCustomer": top_customers,
         }
 
-    async def get_revenue_sources(
+    async def _revenue_sources_from_source(
         self,
         farm_id: Optional[str] = None,
         farming_year: Optional[int] = None,
@@ -29,6 +29,8 @@ from typing import Any, Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from src.core.indexes import declare_index, ensure_collection_indexes
+
 logger = logging.getLogger(__name__)
 
 _COLLECTION = "finance_outbox"
@@ -37,6 +39,14 @@ _STATUS_PROCESSING = "processing"
 _STATUS_PROCESSED = "processed"
 _STATUS_FAILED = "failed"
 
+# (status, createdAt) — consumer polling for pending events.
+declare_index(
+    _COLLECTION, [("status", 1), ("createdAt", 1)], name="ix_outbox_status_created"
+)
+# eventId (unique) — deduplication; prevents duplicate events from
+# misconfigured producers.
+declare_index(_COLLECTION, "eventId", unique=True, name="ix_outbox_eventId_unique")
+
 
 class OutboxRepository:
     """
@@ -53,29 +63,17 @@ class OutboxRepository:
     @staticmethod
     async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
         """
-        Create the required indexes on the finance_outbox collection.
-
-        Safe to call on every startup — MongoDB is idempotent for
-        index creation when the index already exists.
+        Create any declared finance_outbox index that is missing.
 
-        Indexes:
-            (status, createdAt) — consumer polling for pending events.
-            eventId (unique)    — deduplication; prevents duplicate events
-                                  from misconfigured producers.
+        The indexes are declared at module import (see above) and reconciled
+        by the API startup; call this from processes that bypass that path.
+        Only missing indexes are created — a warm database costs one
+        listIndexes round trip.
 
         Args:
             db: Motor async database instance.
         """
-        coll = db[_COLLECTION]
-        await coll.create_index(
-            [("status", 1), ("createdAt", 1)],
-            name="ix_outbox_status_created",
-        )
-        await coll.create_index(
-            "eventId",
-            unique=True,
-            name="ix_outbox_eventId_unique",
-        )
+        await ensure_collection_indexes(db, _COLLECTION)
         logger.info("[FinanceBridge] finance_outbox indexes ensured")
 
     # ------------------------------------------------------------------
@@ -43,6 +43,7 @@ from ...services.accession.accession_service import AccessionService
 from ...services.database import ACCESSIONS, genetics_db
 from ...services.line.line_service import LineService
 from ...services.medium.medium_service import MediumService
+from ...services.public_info.snapshot_service import PublicInfoSnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -1238,6 +1239,9 @@ async def _bump_labelled_vessel_count(
         {"accessionId": accession_id},
         {"$set": {"labelledVesselCount": new_count, "updatedAt": datetime.utcnow()}},
     )
+    # The public page range-checks scanned ordinals against this count
+    if new_count != current_count:
+        await PublicInfoSnapshotService.invalidate(accession_ids=[accession_id])
 
 
 def _printer_label_for_size(size: str) -> str:
@@ -74,14 +74,27 @@ each is enforced below:
    only ~1.1e15 wide — and this holds for an authenticated caller too, for
    every failure mode that still applies to them, so the 404 shape itself
    can never be used to fingerprint which tier a caller is in.
-5. **Cache-Control: no-store** on every response this router returns,
-   success or error — lineage changes, and a proxy holding a stale tree (or
-   a stale "not found") is worse than a slow page.
+5. **Never served stale.** Lineage changes, and a proxy holding a stale
+   tree (or a stale "not found") is worse than a slow page. Errors and the
+   authenticated tier are ``Cache-Control: no-store``. The anonymous tier is
+   ``no-cache`` with a strong ``ETag`` and ``Vary: Authorization``: a cache
+   may keep the body but must revalidate it on every scan, and gets a 304
+   only while the page is unchanged.
+
+Pages are precomputed. The first scan of a token assembles the page and
+stores it in ``genetic_public_snapshots`` (see
+``services/public_info/snapshot_service.py``); later scans are served from
+that one document — the anonymous body byte for byte, the authenticated
+tier as an overlay of the snapshot's privileged section. Every write to a
+record a page was built from (the accession, its ancestors and graph
+neighbours, its line, medium batch, propagation event, protocol, or the
+tenant's ``PublicInfoPageConfig``) invalidates it.
 """
 
+import hashlib
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -98,13 +111,17 @@ from ...middleware.auth import CurrentUser, get_current_user
 from ...models.accession import Accession
 from ...models.lineage import AncestryStep, LineageGraph
 from ...services.accession.accession_service import AccessionService
-from ...services.accession.vessel_resolver import resolve_vessel
+from ...services.accession.vessel_resolver import MAX_SPLIT_DEPTH
 from ...services.common import doc_to_model
 from ...services.database import ACCESSIONS, genetics_db
 from ...services.line.line_service import LineService
 from ...services.lineage.lineage_service import LineageService
 from ...services.medium.medium_service import MediumService
 from ...services.propagation.propagation_service import PropagationService
+from ...services.public_info.snapshot_service import (
+    PublicInfoSnapshotService,
+    dependency_keys,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +137,9 @@ _PROTOCOLS_COLLECTION = "protocols"
 # to prevent.
 _NOT_FOUND_DETAIL = "No record found for this label."
 _NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+# Anonymous success responses only (rule 5). `Vary` keeps a cache from
+# answering an authenticated request with the anonymous body it holds.
+_REVALIDATE_HEADERS = {"Cache-Control": "no-cache", "Vary": "Authorization"}
 
 
 def _not_found() -> HTTPException:
@@ -152,7 +172,7 @@ def _client_ip(request: Request) -> str:
 async def enforce_public_rate_limit(request: Request) -> None:
     """FastAPI dependency: 30 req/min per IP, independent of the guest tier.
 
-    ``RateLimitMiddleware`` already wraps every request in the app and would
+    The request pipeline already rate limits every request in the app and would
     apply *some* IP-based limit here via ``settings.RATE_LIMIT_GUEST`` — but
     that number is an operator-tunable platform default, not the number this
     security-sensitive public route is specified against. Coupling the two
@@ -597,11 +617,34 @@ async def _get_public_config(organization_id: Optional[str]) -> PublicInfoPageCo
 # than 500 when a denormalised reference (line, medium batch, propagation
 # event, protocol, operator) is missing or stale, matching the "never raise
 # on malformed data" philosophy vessel_resolver.py documents for the same
-# reason. The token/org/range gate above is the only place this route is
-# allowed to 404.
+# reason. The token/org/range gate in `_handle_public_info` is the only place
+# this route is allowed to 404.
+#
+# Everything here runs once per snapshot build, not once per scan (see
+# `_build_page`), and always assembles the fully-opened content — the
+# anonymous tier's gated variants are derived from it afterwards. Each
+# builder records the records it read on the `_PageBuild` it is handed, so
+# the stored page is invalidated when any of them changes, and marks the
+# build degraded when a lookup failed for a reason other than the record
+# being gone — a blank field caused by a database hiccup must not be stored
+# and served until the snapshot expires.
 # ---------------------------------------------------------------------------
 
 
+class _PageBuild:
+    """What one snapshot build read, and whether every read succeeded."""
+
+    def __init__(self) -> None:
+        self.deps: Set[str] = set()
+        self.complete = True
+
+    def depends_on(self, **ids: Iterable[Optional[str]]) -> None:
+        self.deps |= dependency_keys(**ids)
+
+    def degraded(self) -> None:
+        self.complete = False
+
+
 async def _build_line_info(line_id: str) -> PublicLineInfo:
     try:
         line = await LineService.get_line(line_id)
@@ -619,8 +662,10 @@ async def _build_line_info(line_id: str) -> PublicLineInfo:
 
 
 async def _build_medium_info(
-    medium_batch_id: Optional[str], show_ingredients: bool
+    medium_batch_id: Optional[str],
 ) -> Optional[PublicMediumInfo]:
+    """Medium batch with its ingredients — the authenticated tier's content;
+    ``_gate_for_anonymous`` drops the ingredients unless the tenant shows them."""
     if not medium_batch_id:
         return None
     try:
@@ -628,25 +673,23 @@ async def _build_medium_info(
     except HTTPException:
         return None
 
-    ingredients = None
-    if show_ingredients:
-        ingredients = [
+    return PublicMediumInfo(
+        batchCode=batch.batchCode,
+        recipeName=batch.recipeName,
+        ingredients=[
             PublicIngredientInfo(
                 name=ingredient.name,
                 amount=ingredient.amount,
                 unit=ingredient.unit.value if ingredient.unit else None,
             )
             for ingredient in batch.ingredientsSnapshot
-        ]
-
-    return PublicMediumInfo(
-        batchCode=batch.batchCode,
-        recipeName=batch.recipeName,
-        ingredients=ingredients,
+        ],
     )
 
 
-async def _fetch_protocol_steps(protocol_id: str) -> Optional[List[str]]:
+async def _fetch_protocol_steps(
+    protocol_id: str, build: _PageBuild
+) -> Optional[List[str]]:
     """Best-effort step text for the pinned protocol.
 
     Reads the live ``protocols`` collection directly (matching
@@ -655,8 +698,10 @@ async def _fetch_protocol_steps(protocol_id: str) -> Optional[List[str]]:
     Note this reads the *current* document, not the version pinned on the
     event — same limitation ``protocolRef`` already carries by only pinning
     code/title/version rather than a content snapshot; not something this
-    route can fix.
+    route can fix. Because it is the live document, the page depends on the
+    protocol itself and not just on the event that cites it.
     """
+    build.depends_on(protocol_ids=[protocol_id])
     db = genetics_db.get_database()
     try:
         doc = await db[_PROTOCOLS_COLLECTION].find_one({"protocolId": protocol_id})
@@ -664,6 +709,7 @@ async def _fetch_protocol_steps(protocol_id: str) -> Optional[List[str]]:
         logger.warning(
             "[public.genetics] protocol steps lookup failed for %s", protocol_id
         )
+        build.degraded()
         return None
     if not doc:
         return None
@@ -674,8 +720,10 @@ async def _fetch_protocol_steps(protocol_id: str) -> Optional[List[str]]:
 
 
 async def _build_protocol_info(
-    source_event_id: Optional[str], show_steps: bool
+    source_event_id: Optional[str], build: _PageBuild
 ) -> Optional[PublicProtocolInfo]:
+    """Pinned protocol with its steps — the authenticated tier's content;
+    ``_gate_for_anonymous`` drops the steps unless the tenant shows them."""
     if not source_event_id:
         return None
     try:
@@ -688,8 +736,8 @@ async def _build_protocol_info(
         return None
 
     steps = None
-    if show_steps and ref.get("protocolId"):
-        steps = await _fetch_protocol_steps(ref["protocolId"])
+    if ref.get("protocolId"):
+        steps = await _fetch_protocol_steps(ref["protocolId"], build)
 
     return PublicProtocolInfo(
         code=ref.get("code"),
@@ -699,21 +747,27 @@ async def _build_protocol_info(
     )
 
 
-async def _build_operator(
-    created_by: Optional[str], show_full_name: bool
-) -> Optional[str]:
+async def _operator_names(
+    created_by: Optional[str], build: _PageBuild
+) -> Tuple[Optional[str], Optional[str]]:
+    """The creating operator as ``(full name, initials)``; both None when
+    unknown. Users live outside this module and nothing here hears about a
+    rename, so a stored page carries the old name until it expires
+    (``PUBLIC_SNAPSHOT_TTL_HOURS``)."""
     if not created_by:
-        return None
+        return None, None
     try:
         user = await UserService.get_user_by_id(created_by)
     except Exception:
         logger.warning("[public.genetics] operator lookup failed for %s", created_by)
-        return None
+        build.degraded()
+        return None, None
     if not user or not user.firstName or not user.lastName:
-        return None
-    if show_full_name:
-        return f"{user.firstName} {user.lastName}"
-    return f"{user.firstName[0]}.{user.lastName[0]}."
+        return None, None
+    return (
+        f"{user.firstName} {user.lastName}",
+        f"{user.firstName[0]}.{user.lastName[0]}.",
+    )
 
 
 def _primary_from_vessel_no(accession: Accession) -> Optional[int]:
@@ -755,7 +809,9 @@ def _vessel_no_cited_by_child(
     return None
 
 
-async def _build_lineage(accession: Accession) -> List[PublicLineageStep]:
+async def _build_lineage(
+    accession: Accession, build: _PageBuild
+) -> List[PublicLineageStep]:
     """Ancestry breadcrumb, newest first, built from LineageService's
     existing capped BFS walk — spec §5.2: "reuses LineageService's existing
     BFS walk and its MAX_LINEAGE_DEPTH / MAX_LINEAGE_NODES caps, no new
@@ -769,6 +825,7 @@ async def _build_lineage(accession: Accession) -> List[PublicLineageStep]:
         chain = await LineageService.get_ancestry(accession.id)
     except Exception:
         logger.warning("[public.genetics] ancestry lookup failed for %s", accession.id)
+        build.degraded()
         return []
 
     ordered: List[AncestryStep] = list(reversed(chain.steps))
@@ -781,11 +838,13 @@ async def _build_lineage(accession: Accession) -> List[PublicLineageStep]:
     # same batched accession lookup LineageService itself uses internally —
     # not a new traversal, just reading fields AncestryStep doesn't carry.
     step_ids = [step.accessionId for step in ordered if step.accessionId]
+    build.depends_on(accession_ids=step_ids)
     accessions_by_id: Dict[str, Accession] = {}
     if step_ids:
         try:
             accessions_by_id = await AccessionService.get_many(step_ids)
         except Exception:
+            build.degraded()
             accessions_by_id = {}
 
     provenance_map: Dict[str, str] = {}
@@ -833,15 +892,16 @@ PUBLIC_LINEAGE_NODES = 60
 
 
 async def _build_lineage_graph(
-    accession: Accession, authenticated: bool = False
-) -> Union[PublicLineageGraph, AuthenticatedLineageGraph]:
+    accession: Accession, build: _PageBuild
+) -> Tuple[PublicLineageGraph, List[Dict[str, str]]]:
     """Bounded lineage DAG centred on the resolved (scanned) accession.
 
     Reuses ``LineageService.build_graph`` verbatim — no new traversal code —
     with the public-only caps above. ``accession`` here is always the
-    already-resolved accession (post ``resolve_vessel``), so the graph is
-    centred on whichever record actually holds the scanned physical vessel,
-    not the one the token originally addressed.
+    accession a page is being built for; a vessel scan that follows a split
+    is served the split-off record's own page, so the graph is centred on
+    whichever record actually holds the scanned physical vessel, not the
+    one the token originally addressed.
 
     UUID -> code translation (the part that matters): ``LineageNode`` /
     ``LineageEdge`` carry internal accession UUIDs so a cross's second parent
@@ -854,12 +914,13 @@ async def _build_lineage_graph(
     null "unknown parent" stub — is dropped rather than emitted with a
     dangling id.
 
-    ``authenticated=True`` (T-806 part 3) returns the
-    ``AuthenticatedLineageGraph`` shape instead — same nodes and edges, plus
-    each node's own ``publicToken`` — via one additional batched fetch of the
-    surviving nodes' own ``Accession`` records. That fetch only ever runs for
-    an authenticated caller; an anonymous request never queries, let alone
-    returns, a single ``publicToken`` beyond the one it already presented.
+    Returns the anonymous graph plus each surviving node's own
+    ``publicToken`` as ``{"code", "token"}`` pairs (T-806 part 3). The pairs
+    are kept in the snapshot's privileged section and only ever reach a
+    response through ``_assemble_authenticated_info``, which builds the
+    ``AuthenticatedLineageGraph`` from them; an anonymous caller is served
+    the stored anonymous body and never a single ``publicToken`` beyond the
+    one it already presented.
     """
     try:
         graph: LineageGraph = await LineageService.build_graph(
@@ -872,7 +933,12 @@ async def _build_lineage_graph(
         logger.warning(
             "[public.genetics] lineage graph build failed for %s", accession.id
         )
-        return AuthenticatedLineageGraph() if authenticated else PublicLineageGraph()
+        build.degraded()
+        return PublicLineageGraph(), []
+
+    # Every node the walk reached, shown or not: a change to any of them can
+    # change which nodes survive the cap below.
+    build.depends_on(accession_ids=[n.accessionId for n in graph.nodes])
 
     nodes = graph.nodes
     truncated = graph.truncated
@@ -889,74 +955,40 @@ async def _build_lineage_graph(
 
     code_by_id: Dict[str, str] = {n.accessionId: n.accessionCode for n in nodes}
 
-    # T-806 part 3: authenticated only — every surviving node's own Accession
-    # record, fetched once in a batch, purely to read `publicToken` off it.
-    # `LineageNode` is deliberately trimmed (spec §5.2 rule 3) and carries no
-    # token; this is the only place in the whole route that reads
-    # `publicToken` off anything other than the caller's own scanned token,
-    # and it never runs unless `authenticated` is True.
-    tokens_by_id: Dict[str, str] = {}
-    if authenticated and code_by_id:
+    # One batched fetch of every surviving node's own Accession record, for
+    # two fields `LineageNode` is deliberately trimmed of (spec §5.2 rule 3):
+    # `publicToken` for the authenticated tier's clickable tree, and (T-805b,
+    # graph half) `parents`, so each edge can read `ParentRef.vesselNo` off
+    # its `to` accession. Same `AccessionService.get_many` the ancestry
+    # breadcrumb above already uses, not new traversal code.
+    node_accessions: Dict[str, Accession] = {}
+    if code_by_id:
         try:
             node_accessions = await AccessionService.get_many(list(code_by_id.keys()))
         except Exception:
             logger.warning(
-                "[public.genetics] batched node fetch for lineage-graph tokens failed for %s",
+                "[public.genetics] batched node fetch for the lineage graph failed for %s",
                 accession.id,
             )
+            build.degraded()
             node_accessions = {}
-        tokens_by_id = {aid: acc.publicToken for aid, acc in node_accessions.items()}
-
-    if authenticated:
-        public_nodes: List[BaseModel] = [
-            AuthenticatedLineageGraphNode(
-                code=n.accessionCode,
-                generationLabel=n.generationLabel,
-                form=n.form.value,
-                status=n.status.value,
-                isScanned=n.isRoot,
-                depth=n.depth,
-                token=tokens_by_id.get(n.accessionId, ""),
-            )
-            for n in nodes
-        ]
-    else:
-        public_nodes = [
-            PublicLineageGraphNode(
-                code=n.accessionCode,
-                generationLabel=n.generationLabel,
-                form=n.form.value,
-                status=n.status.value,
-                isScanned=n.isRoot,
-                depth=n.depth,
-            )
-            for n in nodes
-        ]
-
-    # T-805b (graph half): `LineageNode` is deliberately trimmed and carries
-    # no `parents` — `build_graph` reads full `Accession` objects internally
-    # to assemble the graph but does not return them. A second batched fetch
-    # (same `AccessionService.get_many` the ancestry breadcrumb above already
-    # uses, not new traversal code) pulls back each edge's `to` accession so
-    # its `parents` list is available to read `ParentRef.vesselNo` off.
-    # Scoped to edges that will actually survive translation below — no point
-    # fetching a child whose edge is about to be dropped for a UUID that
-    # never became a node.
-    child_ids = {
-        edge.toAccessionId
-        for edge in graph.edges
-        if edge.fromAccessionId in code_by_id and edge.toAccessionId in code_by_id
-    }
-    children_by_id: Dict[str, Accession] = {}
-    if child_ids:
-        try:
-            children_by_id = await AccessionService.get_many(list(child_ids))
-        except Exception:
-            logger.warning(
-                "[public.genetics] batched child fetch for lineage-graph vessel numbers failed for %s",
-                accession.id,
-            )
-            children_by_id = {}
+
+    public_nodes = [
+        PublicLineageGraphNode(
+            code=n.accessionCode,
+            generationLabel=n.generationLabel,
+            form=n.form.value,
+            status=n.status.value,
+            isScanned=n.isRoot,
+            depth=n.depth,
+        )
+        for n in nodes
+    ]
+    node_tokens = [
+        {"code": n.accessionCode, "token": node_accessions[n.accessionId].publicToken}
+        for n in nodes
+        if n.accessionId in node_accessions
+    ]
 
     public_edges: List[PublicLineageGraphEdge] = []
     for edge in graph.edges:
@@ -972,118 +1004,297 @@ async def _build_lineage_graph(
                 to=to_code,
                 kind=edge.kind,
                 fromVesselNo=_vessel_no_cited_by_child(
-                    children_by_id.get(edge.toAccessionId), edge.fromAccessionId
+                    node_accessions.get(edge.toAccessionId), edge.fromAccessionId
                 ),
             )
         )
 
-    if authenticated:
-        return AuthenticatedLineageGraph(
-            nodes=public_nodes, edges=public_edges, truncated=truncated
-        )
-    return PublicLineageGraph(
-        nodes=public_nodes, edges=public_edges, truncated=truncated
+    return (
+        PublicLineageGraph(nodes=public_nodes, edges=public_edges, truncated=truncated),
+        node_tokens,
     )
 
 
-async def _assemble_anonymous_info(
-    accession: Accession,
-    vessel_no: Optional[int],
-    labelled_vessel_count: int,
-    split_off: bool,
+async def _load_splits(accession: Accession, build: _PageBuild) -> List[Dict[str, Any]]:
+    """The records split off this batch and the vessel ordinals each took —
+    what ``_resolve_vessel_page`` walks in place of
+    ``vessel_resolver.resolve_vessel``'s query per hop. Not best-effort: a
+    page stored without its splits would send a scan of a split-off vessel
+    to the wrong record until it expired, so a failure here fails the build.
+    """
+    db = genetics_db.get_database()
+    splits: List[Dict[str, Any]] = []
+    async for doc in db[ACCESSIONS].find(
+        {"splitFromAccessionId": accession.id},
+        {"accessionId": 1, "publicToken": 1, "sourceVesselNumbers": 1},
+    ):
+        build.depends_on(accession_ids=[doc.get("accessionId")])
+        splits.append(
+            {
+                "token": doc.get("publicToken"),
+                "vesselNumbers": list(doc.get("sourceVesselNumbers") or []),
+            }
+        )
+    return splits
+
+
+def _gate_for_anonymous(
+    medium: Optional[PublicMediumInfo],
+    protocol: Optional[PublicProtocolInfo],
+    operator_names: Tuple[Optional[str], Optional[str]],
+    facility: Optional[str],
     config: PublicInfoPageConfig,
-) -> PublicAccessionInfo:
-    """Assembles the anonymous-tier shape — unchanged from T-804/T-805.
-    ``medium``/``protocol``/``operator``/``facility`` remain gated by the
-    tenant's own ``PublicInfoPageConfig`` flags exactly as before. See
-    ``_assemble_authenticated_info`` for the tier that ignores those flags.
+) -> Tuple[
+    Optional[PublicMediumInfo],
+    Optional[PublicProtocolInfo],
+    Optional[str],
+    Optional[str],
+]:
+    """The anonymous tier's ``medium``/``protocol``/``operator``/``facility``
+    — the fully-opened content cut down by the tenant's
+    ``PublicInfoPageConfig`` flags, exactly as T-804/T-805 gated them. The
+    authenticated tier ignores those flags entirely (spec rule C) and takes
+    the ungated values from the snapshot's privileged section instead."""
+    if medium is not None and not config.showMediumIngredients:
+        medium = medium.model_copy(update={"ingredients": None})
+    if protocol is not None and not config.showProtocolSteps:
+        protocol = protocol.model_copy(update={"steps": None})
+    full_name, initials = operator_names
+    operator = full_name if config.showOperatorName else initials
+    return medium, protocol, operator, facility if config.showFacilityName else None
+
+
+def _etag(content: bytes) -> str:
+    return '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+
+
+async def _build_page(
+    accession: Accession, config: PublicInfoPageConfig
+) -> Dict[str, Any]:
+    """Assemble and store the snapshot for one accession's label.
+
+    The stored document holds, per token:
+
+    - ``body`` — the anonymous ``PublicAccessionInfo`` (with ``vessel`` null)
+      already serialised, plus its strong ``etag``. This is what a batch-level
+      anonymous scan is sent, byte for byte.
+    - ``privileged`` — the only material the authenticated tier adds: the
+      accession id, the ungated medium/protocol/operator/facility, and the
+      lineage graph's node tokens. Never read on the anonymous path.
+    - the routing facts the handler gates on before either tier is built:
+      ``accessionId``, ``enabled``, ``labelledVesselCount``, ``fromVesselNo``
+      and ``splits``.
+
+    The snapshot is stored only when every lookup succeeded; a degraded page
+    is still served to the caller that triggered the build.
     """
-    line_info = await _build_line_info(accession.lineId)
-    medium_info = await _build_medium_info(
-        accession.mediumBatchId, config.showMediumIngredients
+    generation = await PublicInfoSnapshotService.generation()
+    build = _PageBuild()
+    build.depends_on(
+        accession_ids=[accession.id],
+        line_ids=[accession.lineId],
+        batch_ids=[accession.mediumBatchId],
+        event_ids=[accession.sourceEventId],
+        organization_ids=[accession.organizationId],
     )
-    protocol_info = await _build_protocol_info(
-        accession.sourceEventId, config.showProtocolSteps
-    )
-    operator = await _build_operator(accession.createdBy, config.showOperatorName)
-    facility = accession.location.facility if config.showFacilityName else None
-    lineage = await _build_lineage(accession)
-    lineage_graph = await _build_lineage_graph(accession, authenticated=False)
-
-    vessel = None
-    if vessel_no is not None:
-        vessel = PublicVesselInfo(
-            number=vessel_no,
-            of=labelled_vessel_count,
-            splitOff=split_off,
-            fromVesselNo=_primary_from_vessel_no(accession),
-        )
 
-    return PublicAccessionInfo(
+    line_info = await _build_line_info(accession.lineId)
+    medium_info = await _build_medium_info(accession.mediumBatchId)
+    protocol_info = await _build_protocol_info(accession.sourceEventId, build)
+    operator_names = await _operator_names(accession.createdBy, build)
+    lineage = await _build_lineage(accession, build)
+    lineage_graph, node_tokens = await _build_lineage_graph(accession, build)
+    splits = await _load_splits(accession, build)
+
+    medium, protocol, operator, facility = _gate_for_anonymous(
+        medium_info,
+        protocol_info,
+        operator_names,
+        accession.location.facility,
+        config,
+    )
+    body = PublicAccessionInfo(
         accessionCode=accession.accessionCode,
-        vessel=vessel,
+        vessel=None,
         generationLabel=accession.generationLabel,
         line=line_info,
         form=accession.form.value,
         status=accession.status.value,
         acquiredAt=accession.acquiredAt,
-        medium=medium_info,
-        protocol=protocol_info,
+        medium=medium,
+        protocol=protocol,
         operator=operator,
         facility=facility,
         lineage=lineage,
         lineageGraph=lineage_graph,
+    ).model_dump_json(by_alias=True)
+
+    page = {
+        "accessionId": accession.id,
+        "enabled": config.enabled,
+        "labelledVesselCount": accession.labelledVesselCount,
+        "fromVesselNo": _primary_from_vessel_no(accession),
+        "splits": splits,
+        "body": body,
+        "etag": _etag(body.encode()),
+        "privileged": {
+            "accessionId": accession.id,
+            "medium": medium_info.model_dump() if medium_info else None,
+            "protocol": protocol_info.model_dump() if protocol_info else None,
+            "operator": operator_names[0],
+            "facility": accession.location.facility,
+            "nodeTokens": node_tokens,
+        },
+    }
+    if build.complete:
+        await PublicInfoSnapshotService.save(
+            accession.publicToken, page, build.deps, generation
+        )
+    return page
+
+
+async def _load_page(token: str) -> Optional[Dict[str, Any]]:
+    """The snapshot for a token, building it on a miss; None for an unknown
+    token. A hit is the one ``find_one`` by ``_id`` that serves most scans."""
+    normalized = token.strip().upper()
+    if not normalized:
+        return None
+    page = await PublicInfoSnapshotService.get(normalized)
+    if page is not None:
+        return page
+    accession = await _load_accession_by_token(normalized)
+    if accession is None:
+        return None
+    config = await _get_public_config(accession.organizationId)
+    return await _build_page(accession, config)
+
+
+async def _resolve_vessel_page(page: Dict[str, Any], vessel_no: int) -> Dict[str, Any]:
+    """Follow splits forward to the page of the record that currently holds
+    this ordinal — ``vessel_resolver.resolve_vessel``'s walk (spec §4.1),
+    read off each page's stored ``splits`` instead of one query per hop,
+    under the same ``MAX_SPLIT_DEPTH`` ceiling and the same never-raise
+    contract: a split whose page cannot be loaded ends the walk where it is.
+    """
+    current = page
+    for _ in range(MAX_SPLIT_DEPTH):
+        child_token = next(
+            (
+                split["token"]
+                for split in current.get("splits") or []
+                if vessel_no in split["vesselNumbers"]
+            ),
+            None,
+        )
+        child = await _load_page(child_token) if child_token else None
+        if child is None:
+            return current
+        current = child
+
+    logger.warning(
+        f"[public.genetics] Split-chain depth exceeded {MAX_SPLIT_DEPTH} while "
+        f"resolving vessel #{vessel_no} from accession {page['accessionId']}; "
+        f"stopping at {current['accessionId']} rather than looping further"
     )
+    return current
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 If-None-Match: weak comparison against any listed tag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _anonymous_response(
+    request: Request, page: Dict[str, Any], vessel: Optional[PublicVesselInfo]
+) -> Response:
+    """The anonymous tier, straight from the snapshot. A batch-level scan is
+    the stored body as-is; a vessel scan adds the one field that varies by
+    ordinal. Either way the ETag is the hash of the exact bytes sent, so a
+    client or proxy revalidating gets a 304 with no body until the page is
+    rebuilt."""
+    if vessel is None:
+        content = page["body"].encode()
+        etag = page["etag"]
+    else:
+        info = PublicAccessionInfo.model_validate_json(page["body"])
+        content = (
+            info.model_copy(update={"vessel": vessel})
+            .model_dump_json(by_alias=True)
+            .encode()
+        )
+        etag = _etag(content)
+
+    headers = {"ETag": etag, **_REVALIDATE_HEADERS}
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
-async def _assemble_authenticated_info(
-    accession: Accession,
-    vessel_no: Optional[int],
-    labelled_vessel_count: int,
-    split_off: bool,
+def _assemble_authenticated_info(
+    page: Dict[str, Any], vessel: Optional[PublicVesselInfo]
 ) -> AuthenticatedAccessionInfo:
-    """Assembles the authenticated-tier shape (T-806 part 3).
-
-    Deliberately takes no ``PublicInfoPageConfig`` — spec rule C: those flags
-    gate what a stranger on the public internet sees, not what a logged-in
-    member of the tenant's own staff sees. Every gated builder below is
-    called with its flag forced ``True`` (or, for ``facility``, read
-    unconditionally rather than behind a flag at all), which is the whole of
-    what distinguishes this function from ``_assemble_anonymous_info`` aside
-    from ``accessionId`` and the lineage graph's node tokens.
+    """Assembles the authenticated-tier shape (T-806 part 3) as an overlay on
+    the stored anonymous body — no further queries.
+
+    Still field by field (rule 1): everything with zero token/UUID risk is
+    copied from the parsed anonymous body, and ``medium``/``protocol``/
+    ``operator``/``facility`` are replaced with the ungated versions from the
+    snapshot's privileged section — spec rule C: the tenant's
+    ``PublicInfoPageConfig`` flags gate what a stranger on the public
+    internet sees, not what a logged-in member of the tenant's own staff
+    sees. ``accessionId`` and the lineage graph's node tokens come from the
+    same section and are what distinguishes this shape structurally.
     """
-    line_info = await _build_line_info(accession.lineId)
-    medium_info = await _build_medium_info(accession.mediumBatchId, True)
-    protocol_info = await _build_protocol_info(accession.sourceEventId, True)
-    operator = await _build_operator(accession.createdBy, True)
-    facility = accession.location.facility
-    lineage = await _build_lineage(accession)
-    lineage_graph = await _build_lineage_graph(accession, authenticated=True)
-
-    vessel = None
-    if vessel_no is not None:
-        vessel = PublicVesselInfo(
-            number=vessel_no,
-            of=labelled_vessel_count,
-            splitOff=split_off,
-            fromVesselNo=_primary_from_vessel_no(accession),
-        )
+    public = PublicAccessionInfo.model_validate_json(page["body"])
+    privileged = page["privileged"]
+    token_by_code = {
+        pair["code"]: pair["token"] for pair in privileged.get("nodeTokens") or []
+    }
 
     return AuthenticatedAccessionInfo(
-        accessionId=accession.id,
-        accessionCode=accession.accessionCode,
+        accessionId=privileged["accessionId"],
+        accessionCode=public.accessionCode,
         vessel=vessel,
-        generationLabel=accession.generationLabel,
-        line=line_info,
-        form=accession.form.value,
-        status=accession.status.value,
-        acquiredAt=accession.acquiredAt,
-        medium=medium_info,
-        protocol=protocol_info,
-        operator=operator,
-        facility=facility,
-        lineage=lineage,
-        lineageGraph=lineage_graph,
+        generationLabel=public.generationLabel,
+        line=public.line,
+        form=public.form,
+        status=public.status,
+        acquiredAt=public.acquiredAt,
+        medium=(
+            PublicMediumInfo.model_validate(privileged["medium"])
+            if privileged.get("medium")
+            else None
+        ),
+        protocol=(
+            PublicProtocolInfo.model_validate(privileged["protocol"])
+            if privileged.get("protocol")
+            else None
+        ),
+        operator=privileged.get("operator"),
+        facility=privileged.get("facility"),
+        lineage=public.lineage,
+        lineageGraph=AuthenticatedLineageGraph(
+            nodes=[
+                AuthenticatedLineageGraphNode(
+                    code=node.code,
+                    generationLabel=node.generationLabel,
+                    form=node.form,
+                    status=node.status,
+                    isScanned=node.isScanned,
+                    depth=node.depth,
+                    token=token_by_code.get(node.code, ""),
+                )
+                for node in public.lineageGraph.nodes
+            ],
+            edges=public.lineageGraph.edges,
+            truncated=public.lineageGraph.truncated,
+        ),
     )
 
 
@@ -1095,70 +1306,66 @@ async def _assemble_authenticated_info(
 async def _handle_public_info(
     token: str,
     vessel_no_raw: Optional[str],
+    request: Request,
     response: Response,
     current_user: Optional[CurrentUser],
-) -> Union[PublicAccessionInfo, AuthenticatedAccessionInfo]:
+) -> Union[Response, AuthenticatedAccessionInfo]:
     response.headers["Cache-Control"] = "no-store"
 
-    accession = await _load_accession_by_token(token)
-    if accession is None:
-        raise _not_found()
-
-    config = await _get_public_config(accession.organizationId)
-
-    # `enabled=False` is a *public-exposure* switch, not an access-control
-    # gate — spec rule C. It exists so a tenant can pull its labels off the
-    # open internet (e.g. a compliance concern, or a lab that decides QR
-    # scanning was a mistake) without that decision also locking its own
-    # logged-in staff out of a page they use operationally. An anonymous
-    # caller gets the exact same 404 as an unknown token, byte for byte
-    # (rule 4); an authenticated one is deliberately exempted from this
-    # check entirely and falls through to the range/resolution logic below
-    # like any other request. This is the one place the two tiers can
-    # diverge on whether a 404 happens at all — everything else in this
-    # function (unknown token above; range/parse checks below) applies
-    # identically regardless of `current_user`, so that divergence can never
-    # be used to fingerprint *why* a request failed, only *whether* the
-    # tenant has opted this specific label out of public exposure.
-    if not config.enabled and current_user is None:
-        raise _not_found()
-
-    vessel_no: Optional[int] = None
-    if vessel_no_raw is not None:
-        try:
-            vessel_no = int(vessel_no_raw)
-        except ValueError:
+    try:
+        page = await _load_page(token)
+        if page is None:
             raise _not_found()
-        if vessel_no < 1 or vessel_no > accession.labelledVesselCount:
+
+        # `enabled=False` is a *public-exposure* switch, not an access-control
+        # gate — spec rule C. It exists so a tenant can pull its labels off the
+        # open internet (e.g. a compliance concern, or a lab that decides QR
+        # scanning was a mistake) without that decision also locking its own
+        # logged-in staff out of a page they use operationally. An anonymous
+        # caller gets the exact same 404 as an unknown token, byte for byte
+        # (rule 4); an authenticated one is deliberately exempted from this
+        # check entirely and falls through to the range/resolution logic below
+        # like any other request. This is the one place the two tiers can
+        # diverge on whether a 404 happens at all — everything else in this
+        # function (unknown token above; range/parse checks below) applies
+        # identically regardless of `current_user`, so that divergence can
+        # never be used to fingerprint *why* a request failed, only *whether*
+        # the tenant has opted this specific label out of public exposure.
+        # The flag is stored on the page, and a config change invalidates
+        # every page of that tenant (`org:` dependency), so a stored page
+        # never outlives the switch being turned off.
+        if not page["enabled"] and current_user is None:
             raise _not_found()
 
-    try:
-        resolved = accession
-        split_off = False
+        vessel_no: Optional[int] = None
+        if vessel_no_raw is not None:
+            try:
+                vessel_no = int(vessel_no_raw)
+            except ValueError:
+                raise _not_found()
+            if vessel_no < 1 or vessel_no > page["labelledVesselCount"]:
+                raise _not_found()
+
+        resolved = page
+        vessel = None
         if vessel_no is not None:
-            resolved = await resolve_vessel(accession, vessel_no)
-            split_off = resolved.id != accession.id
+            resolved = await _resolve_vessel_page(page, vessel_no)
+            vessel = PublicVesselInfo(
+                number=vessel_no,
+                of=page["labelledVesselCount"],
+                splitOff=resolved["accessionId"] != page["accessionId"],
+                fromVesselNo=resolved["fromVesselNo"],
+            )
 
         # The tier split (spec §5.2 rule 3 / T-806 part 3): two distinct
-        # assembly functions, two distinct response models — never one
-        # shape with fields conditionally nulled. `current_user` reaching
-        # here already means `_optional_current_user` positively validated
-        # an active session; anything short of that is `None` and takes the
+        # assembly paths, two distinct response models — never one shape
+        # with fields conditionally nulled. `current_user` reaching here
+        # already means `_optional_current_user` positively validated an
+        # active session; anything short of that is `None` and takes the
         # anonymous branch, no matter what the caller's request looked like.
         if current_user is not None:
-            return await _assemble_authenticated_info(
-                resolved,
-                vessel_no,
-                accession.labelledVesselCount,
-                split_off,
-            )
-        return await _assemble_anonymous_info(
-            resolved,
-            vessel_no,
-            accession.labelledVesselCount,
-            split_off,
-            config,
-        )
+            return _assemble_authenticated_info(resolved, vessel)
+        return _anonymous_response(request, resolved, vessel)
     except HTTPException:
         raise
     except Exception:
@@ -1189,16 +1396,19 @@ async def _handle_public_info(
         "genetics-label-qr-spec.md §5.2 and this module's docstring (T-806 "
         "part 3) for the exact tier boundary. `response_model` is "
         "deliberately unset — the two hand-built shapes below are the "
-        "leakage guard, not FastAPI's response filtering (spec rule 1)."
+        "leakage guard, not FastAPI's response filtering (spec rule 1). "
+        "Anonymous responses carry a strong ETag and answer a matching "
+        "If-None-Match with 304."
     ),
     dependencies=[Depends(enforce_public_rate_limit)],
 )
 async def get_public_batch_info(
     token: str,
+    request: Request,
     response: Response,
     current_user: Optional[CurrentUser] = Depends(_optional_current_user),
-) -> Union[PublicAccessionInfo, AuthenticatedAccessionInfo]:
-    return await _handle_public_info(token, None, response, current_user)
+) -> Union[Response, AuthenticatedAccessionInfo]:
+    return await _handle_public_info(token, None, request, response, current_user)
 
 
 @router.get(
@@ -1216,17 +1426,19 @@ async def get_public_batch_info(
         "and this module's docstring (T-806 part 3) for the exact tier "
         "boundary. `response_model` is deliberately unset — the two "
         "hand-built shapes below are the leakage guard, not FastAPI's "
-        "response filtering (spec rule 1)."
+        "response filtering (spec rule 1). Anonymous responses carry a "
+        "strong ETag and answer a matching If-None-Match with 304."
     ),
     dependencies=[Depends(enforce_public_rate_limit)],
 )
 async def get_public_vessel_info(
     token: str,
     vessel_no: str,
+    request: Request,
     response: Response,
     current_user: Optional[CurrentUser] = Depends(_optional_current_user),
-) -> Union[PublicAccessionInfo, AuthenticatedAccessionInfo]:
-    return await _handle_public_info(token, vessel_no, response, current_user)
+) -> Union[Response, AuthenticatedAccessionInfo]:
+    return await _handle_public_info(token, vessel_no, request, response, current_user)
 
 
 __all__ = ["router", "PublicAccessionInfo", "AuthenticatedAccessionInfo"]
@@ -32,6 +32,11 @@ class Settings(BaseSettings):
     MAX_LINEAGE_DEPTH: int = 25
     MAX_LINEAGE_NODES: int = 500
 
+    # Lifetime of a precomputed public label page. Writes that change a page
+    # invalidate it immediately; this only bounds how long a change nothing
+    # invalidates (an operator renaming themselves) can stay visible.
+    PUBLIC_SNAPSHOT_TTL_HOURS: int = 24
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -34,6 +34,7 @@ from ..common import (
 )
 from ..database import ACCESSIONS, genetics_db
 from ..line.line_service import LineService
+from ..public_info.snapshot_service import PublicInfoSnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -166,6 +167,11 @@ class AccessionService:
                     detail="Failed to create accession",
                 )
 
+        # New descendant of its parents: their public pages draw it in the graph
+        await PublicInfoSnapshotService.invalidate(
+            accession_ids=[p.accessionId for p in accession.parents]
+        )
+
         logger.info(
             f"[AccessionService] Created accession {accession.accessionCode} "
             f"on line {line.code} by user {getattr(current_user, 'userId', None)}"
@@ -293,6 +299,7 @@ class AccessionService:
         await db[ACCESSIONS].update_one(
             {_ID_KEY: accession_id}, {"$set": update_fields}
         )
+        await PublicInfoSnapshotService.invalidate(accession_ids=[accession_id])
 
         logger.info(
             f"[AccessionService] Updated accession {accession_id}: {list(update_fields.keys())}"
@@ -426,6 +433,8 @@ class AccessionService:
                 "$set": {"updatedAt": datetime.utcnow()},
             },
         )
+        # The source's page routes the split-off ordinals to the new record
+        await PublicInfoSnapshotService.invalidate(accession_ids=[accession_id])
 
         logger.info(
             f"[AccessionService] Split {data.quantity} {source.unit} out of "
@@ -8,6 +8,7 @@ Uses the shared MongoDB connection from core services.
 import logging
 
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ PROPAGATIONS = "propagation_events"
 RECIPES = "medium_recipes"
 BATCHES = "medium_batches"
 OBSERVATIONS = "genetic_observations"
+PUBLIC_SNAPSHOTS = "genetic_public_snapshots"
 
 
 class GeneticsDatabaseManager:
@@ -33,6 +35,7 @@ class GeneticsDatabaseManager:
     - medium_recipes
     - medium_batches
     - genetic_observations
+    - genetic_public_snapshots
 
     Note: Delegates to the core MongoDB manager for actual connection
     management. The core manager handles pooling, health checks and shutdown.
@@ -48,104 +51,107 @@ class GeneticsDatabaseManager:
         """
         try:
             logger.info("[Genetics Module] Initializing genetics repository indexes...")
-            await cls._create_indexes()
+            cls._declare_indexes()
             logger.info("[Genetics Module] Genetics repository indexes initialized")
         except Exception as e:
             logger.error(f"[Genetics Module] Error initializing genetics indexes: {e}")
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
+    def _declare_indexes(cls) -> None:
         """
-        Create database indexes for the genetics collections.
+        Declare database indexes for the genetics collections.
 
         Index choices follow the read paths: repo home lists lines, line detail
         lists accessions by line, and lineage traversal walks parents/children
         one hop at a time.
         """
         try:
-            db = mongodb.get_database()
-
             # --- genetic_lines -------------------------------------------------
-            await db[LINES].create_index("lineId", unique=True)
-            await db[LINES].create_index("code", unique=True)
-            await db[LINES].create_index("kind")
-            await db[LINES].create_index("parentLineId")
-            await db[LINES].create_index("isActive")
-            await db[LINES].create_index("tags")
-            await db[LINES].create_index([("commonName", 1)])
-            await db[LINES].create_index([("createdAt", -1)])
+            declare_index(LINES, "lineId", unique=True)
+            declare_index(LINES, "code", unique=True)
+            declare_index(LINES, "kind")
+            declare_index(LINES, "parentLineId")
+            declare_index(LINES, "isActive")
+            declare_index(LINES, "tags")
+            declare_index(LINES, [("commonName", 1)])
+            declare_index(LINES, [("createdAt", -1)])
 
             # --- genetic_accessions --------------------------------------------
-            await db[ACCESSIONS].create_index("accessionId", unique=True)
-            await db[ACCESSIONS].create_index("accessionCode", unique=True)
+            declare_index(ACCESSIONS, "accessionId", unique=True)
+            declare_index(ACCESSIONS, "accessionCode", unique=True)
             # T-804 — opaque key the unauthenticated public label page resolves
             # through; must be unique so a collision on mint is even possible
             # to detect (see AccessionService.create_accession retry).
-            await db[ACCESSIONS].create_index("publicToken", unique=True)
-            await db[ACCESSIONS].create_index("lineId")
-            await db[ACCESSIONS].create_index("status")
-            await db[ACCESSIONS].create_index("form")
-            await db[ACCESSIONS].create_index("mediumBatchId")
-            await db[ACCESSIONS].create_index("sourceEventId")
+            declare_index(ACCESSIONS, "publicToken", unique=True)
+            declare_index(ACCESSIONS, "lineId")
+            declare_index(ACCESSIONS, "status")
+            declare_index(ACCESSIONS, "form")
+            declare_index(ACCESSIONS, "mediumBatchId")
+            declare_index(ACCESSIONS, "sourceEventId")
             # T-804 — written today (batch split) but never indexed. The public
             # resolver walk queries it on every scan of a split-off vessel, so
             # it needs one regardless of the split's own indexing needs.
-            await db[ACCESSIONS].create_index("splitFromAccessionId")
+            declare_index(ACCESSIONS, "splitFromAccessionId")
             # Lineage traversal walks children by parent id — the hot path for
             # the graph endpoint, hence a dedicated index on the nested field.
-            await db[ACCESSIONS].create_index("parents.accessionId")
+            declare_index(ACCESSIONS, "parents.accessionId")
             # "What is in this room right now" — the inventory read path for
             # lab / spawn / incubation rooms, which hold many items at once.
-            await db[ACCESSIONS].create_index("location.roomId")
-            await db[ACCESSIONS].create_index("location.facilityId")
-            await db[ACCESSIONS].create_index([("location.roomId", 1), ("status", 1)])
-            await db[ACCESSIONS].create_index([("lineId", 1), ("cloneGeneration", 1)])
-            await db[ACCESSIONS].create_index([("lineId", 1), ("status", 1)])
-            await db[ACCESSIONS].create_index([("createdAt", -1)])
+            declare_index(ACCESSIONS, "location.roomId")
+            declare_index(ACCESSIONS, "location.facilityId")
+            declare_index(ACCESSIONS, [("location.roomId", 1), ("status", 1)])
+            declare_index(ACCESSIONS, [("lineId", 1), ("cloneGeneration", 1)])
+            declare_index(ACCESSIONS, [("lineId", 1), ("status", 1)])
+            declare_index(ACCESSIONS, [("createdAt", -1)])
 
             # --- propagation_events --------------------------------------------
-            await db[PROPAGATIONS].create_index("eventId", unique=True)
-            await db[PROPAGATIONS].create_index("method")
-            await db[PROPAGATIONS].create_index("reproductionMode")
-            await db[PROPAGATIONS].create_index("parents.accessionId")
-            await db[PROPAGATIONS].create_index("resultAccessionIds")
-            await db[PROPAGATIONS].create_index("sourceLineIds")
-            await db[PROPAGATIONS].create_index("mediumBatchId")
-            await db[PROPAGATIONS].create_index([("performedAt", -1)])
+            declare_index(PROPAGATIONS, "eventId", unique=True)
+            declare_index(PROPAGATIONS, "method")
+            declare_index(PROPAGATIONS, "reproductionMode")
+            declare_index(PROPAGATIONS, "parents.accessionId")
+            declare_index(PROPAGATIONS, "resultAccessionIds")
+            declare_index(PROPAGATIONS, "sourceLineIds")
+            declare_index(PROPAGATIONS, "mediumBatchId")
+            declare_index(PROPAGATIONS, [("performedAt", -1)])
 
             # --- medium_recipes -------------------------------------------------
-            await db[RECIPES].create_index("recipeId", unique=True)
-            await db[RECIPES].create_index("code", unique=True)
-            await db[RECIPES].create_index("type")
-            await db[RECIPES].create_index("isActive")
+            declare_index(RECIPES, "recipeId", unique=True)
+            declare_index(RECIPES, "code", unique=True)
+            declare_index(RECIPES, "type")
+            declare_index(RECIPES, "isActive")
             # Answers "every accession grown on a medium containing X" from the
             # recipe side — the experiment readout query.
-            await db[RECIPES].create_index("additives.name")
-            await db[RECIPES].create_index("ingredients.name")
+            declare_index(RECIPES, "additives.name")
+            declare_index(RECIPES, "ingredients.name")
 
             # --- medium_batches -------------------------------------------------
-            await db[BATCHES].create_index("batchId", unique=True)
-            await db[BATCHES].create_index("batchCode", unique=True)
-            await db[BATCHES].create_index("recipeId")
-            await db[BATCHES].create_index("status")
-            await db[BATCHES].create_index("additivesSnapshot.name")
-            await db[BATCHES].create_index([("preparedAt", -1)])
+            declare_index(BATCHES, "batchId", unique=True)
+            declare_index(BATCHES, "batchCode", unique=True)
+            declare_index(BATCHES, "recipeId")
+            declare_index(BATCHES, "status")
+            declare_index(BATCHES, "additivesSnapshot.name")
+            declare_index(BATCHES, [("preparedAt", -1)])
 
             # --- genetic_observations -------------------------------------------
-            await db[OBSERVATIONS].create_index("observationId", unique=True)
-            await db[OBSERVATIONS].create_index("accessionId")
-            await db[OBSERVATIONS].create_index("lineId")
-            await db[OBSERVATIONS].create_index("type")
-            await db[OBSERVATIONS].create_index("isNovelTrait")
-            await db[OBSERVATIONS].create_index(
-                [("accessionId", 1), ("observedAt", -1)]
-            )
-            await db[OBSERVATIONS].create_index([("observedAt", -1)])
-
-            logger.info("[Genetics Module] MongoDB indexes created successfully")
+            declare_index(OBSERVATIONS, "observationId", unique=True)
+            declare_index(OBSERVATIONS, "accessionId")
+            declare_index(OBSERVATIONS, "lineId")
+            declare_index(OBSERVATIONS, "type")
+            declare_index(OBSERVATIONS, "isNovelTrait")
+            declare_index(OBSERVATIONS, [("accessionId", 1), ("observedAt", -1)])
+            declare_index(OBSERVATIONS, [("observedAt", -1)])
+
+            # --- genetic_public_snapshots ---------------------------------------
+            # Keyed by publicToken as _id. Invalidation deletes by dependency
+            # key; the TTL index is the backstop for dependencies nothing
+            # invalidates (an operator's name).
+            declare_index(PUBLIC_SNAPSHOTS, "deps")
+            declare_index(PUBLIC_SNAPSHOTS, "expiresAt", expireAfterSeconds=0)
+
+            logger.info("[Genetics Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Genetics Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Genetics Module] Error declaring MongoDB indexes: {e}")
             # Reason: Indexes are not critical for startup; log and continue
 
     @classmethod
@@ -14,6 +14,7 @@ from fastapi import HTTPException, status
 from ...models.line import Line, LineCreate, LineStats, LineUpdate, LineWithStats
 from ..common import doc_to_model, model_to_doc, scope_fields, slugify_code
 from ..database import ACCESSIONS, LINES, OBSERVATIONS, PROPAGATIONS, genetics_db
+from ..public_info.snapshot_service import PublicInfoSnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -244,6 +245,7 @@ class LineService:
 
         update_fields["updatedAt"] = datetime.utcnow()
         await db[LINES].update_one({_ID_KEY: line_id}, {"$set": update_fields})
+        await PublicInfoSnapshotService.invalidate(line_ids=[line_id])
 
         logger.info(
             f"[LineService] Updated line {line_id}: {list(update_fields.keys())}"
@@ -579,6 +581,9 @@ class LineService:
                 {"observationId": {"$in": preview["observationIds"]}}
             )
         await db[LINES].delete_one({_ID_KEY: line_id})
+        await PublicInfoSnapshotService.invalidate(
+            accession_ids=preview["accessionIds"], line_ids=[line_id]
+        )
 
         logger.warning(
             f"[LineService] CASCADE PURGED line {line.code} ({line_id}) — "
@@ -33,6 +33,7 @@ import logging
 from typing import Any, Dict, List, Set
 
 from ..database import ACCESSIONS, LINES, OBSERVATIONS, PROPAGATIONS, genetics_db
+from ..public_info.snapshot_service import PublicInfoSnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -191,6 +192,9 @@ class MaintenanceService:
             )
         if event_ids:
             await db[PROPAGATIONS].delete_many({"eventId": {"$in": event_ids}})
+        await PublicInfoSnapshotService.invalidate(
+            accession_ids=accession_ids, event_ids=event_ids
+        )
 
         logger.warning(
             f"[MaintenanceService] Deleted orphans: "
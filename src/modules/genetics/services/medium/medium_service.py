@@ -35,6 +35,7 @@ from ..common import (
 )
 from ..database import ACCESSIONS, BATCHES, RECIPES, genetics_db
 from ..protocol_link import build_protocol_ref
+from ..public_info.snapshot_service import PublicInfoSnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -301,6 +302,7 @@ class MediumService:
         update_fields["updatedAt"] = datetime.utcnow()
         db = genetics_db.get_database()
         await db[BATCHES].update_one({_BATCH_ID_KEY: batch_id}, {"$set": update_fields})
+        await PublicInfoSnapshotService.invalidate(batch_ids=[batch_id])
         return await MediumService.get_batch(batch_id)
 
     # =======================================================================
@@ -39,6 +39,7 @@ from ..accession.accession_service import AccessionService
 from ..common import doc_to_model, model_to_doc, scope_fields
 from ..database import ACCESSIONS, PROPAGATIONS, genetics_db
 from ..protocol_link import build_protocol_ref
+from ..public_info.snapshot_service import PublicInfoSnapshotService
 from ..line.line_service import LineService
 
 logger = logging.getLogger(__name__)
@@ -266,6 +267,9 @@ class PropagationService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to record propagation",
             )
+        await PublicInfoSnapshotService.invalidate(
+            accession_ids=[p.id for p in parents]
+        )
 
         logger.info(
             f"[PropagationService] {data.method.value} "
@@ -518,6 +522,12 @@ class PropagationService:
             accessions_updated = cascade_result.matched_count
             accessions_skipped = len(event.resultAccessionIds) - accessions_updated
 
+        # The date shows on the children's pages and, as a lineage step, on
+        # every page below them — all of which depend on the children
+        await PublicInfoSnapshotService.invalidate(
+            accession_ids=event.resultAccessionIds, event_ids=[event_id]
+        )
+
         logger.info(
             f"[PropagationService] Amended event {event_id} performedAt "
             f"{old_performed_at.isoformat()} -> {data.performedAt.isoformat()} "
@@ -0,0 +1,163 @@
+"""
+Genetics Repo Module - Public Info Page Snapshots
+
+The public label route (``api/v1/public.py``) renders the same page for
+every scan of a label, and a tour or an audit scans the same labels over and
+over. Each render costs a dozen queries (accession, tenant config, line,
+medium batch, event, protocol, operator, the ancestry walk and the lineage
+graph), so the route stores what it assembled here, keyed by the label's
+``publicToken``, and a repeat scan is one ``find_one`` by ``_id``.
+
+A snapshot lists the records it was built from as dependency keys
+(``accession:<id>``, ``line:<id>``, ``batch:<id>``, ``event:<id>``,
+``protocol:<id>``, ``org:<id>``). Every service that writes one of those
+records calls ``invalidate`` with the ids it touched, which deletes every
+snapshot depending on them; the next scan rebuilds.
+
+A build that overlaps a write could otherwise store a page assembled from
+data the write has just replaced, after the write's invalidation already
+ran. A generation counter closes that window: ``invalidate`` bumps it
+before deleting, and ``save`` withdraws a snapshot whose build started under
+an older generation. The same number is stored on each snapshot as its
+version.
+
+Everything here is best-effort. A failed read is a cache miss, a failed
+save just means the next scan rebuilds, and a failed invalidation is logged
+and left to ``PUBLIC_SNAPSHOT_TTL_HOURS`` — none of them may fail the scan
+or the write that triggered them.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ...config.settings import settings
+from ..database import PUBLIC_SNAPSHOTS, genetics_db
+
+logger = logging.getLogger(__name__)
+
+# Lives in the snapshot collection itself. Public tokens are Crockford base32,
+# so no token can collide with this _id.
+_GENERATION_ID = "~generation"
+
+
+def dependency_keys(
+    accession_ids: Iterable[Optional[str]] = (),
+    line_ids: Iterable[Optional[str]] = (),
+    batch_ids: Iterable[Optional[str]] = (),
+    event_ids: Iterable[Optional[str]] = (),
+    protocol_ids: Iterable[Optional[str]] = (),
+    organization_ids: Iterable[Optional[str]] = (),
+) -> Set[str]:
+    """The dependency keys for a set of record ids (falsy ids are skipped)."""
+    keys: Set[str] = set()
+    for prefix, ids in (
+        ("accession", accession_ids),
+        ("line", line_ids),
+        ("batch", batch_ids),
+        ("event", event_ids),
+        ("protocol", protocol_ids),
+        ("org", organization_ids),
+    ):
+        keys.update(f"{prefix}:{record_id}" for record_id in ids if record_id)
+    return keys
+
+
+class PublicInfoSnapshotService:
+    """Storage and invalidation for precomputed public label pages."""
+
+    @staticmethod
+    async def get(token: str) -> Optional[Dict[str, Any]]:
+        """The stored snapshot for a normalised token, or None on a miss."""
+        db = genetics_db.get_database()
+        try:
+            return await db[PUBLIC_SNAPSHOTS].find_one({"_id": token})
+        except Exception as e:
+            logger.warning(f"[PublicInfoSnapshot] read failed for a token: {e}")
+            return None
+
+    @staticmethod
+    async def generation() -> int:
+        """Current generation; read before a build starts and passed to save."""
+        db = genetics_db.get_database()
+        try:
+            doc = await db[PUBLIC_SNAPSHOTS].find_one({"_id": _GENERATION_ID})
+        except Exception as e:
+            logger.warning(f"[PublicInfoSnapshot] generation read failed: {e}")
+            return -1
+        return int((doc or {}).get("value", 0))
+
+    @staticmethod
+    async def save(
+        token: str,
+        snapshot: Dict[str, Any],
+        deps: Set[str],
+        generation: int,
+    ) -> None:
+        """Store a snapshot built under ``generation``.
+
+        Withdrawn again if an invalidation ran while it was being built — it
+        may hold data that invalidation was meant to remove.
+        """
+        if generation < 0:
+            return
+        db = genetics_db.get_database()
+        now = datetime.utcnow()
+        doc = {
+            **snapshot,
+            "deps": sorted(deps),
+            "version": generation,
+            "builtAt": now,
+            "expiresAt": now + timedelta(hours=settings.PUBLIC_SNAPSHOT_TTL_HOURS),
+        }
+        try:
+            await db[PUBLIC_SNAPSHOTS].replace_one({"_id": token}, doc, upsert=True)
+            if await PublicInfoSnapshotService.generation() != generation:
+                await db[PUBLIC_SNAPSHOTS].delete_one(
+                    {"_id": token, "version": generation}
+                )
+        except Exception as e:
+            logger.warning(f"[PublicInfoSnapshot] save failed for a token: {e}")
+
+    @staticmethod
+    async def invalidate(
+        accession_ids: Iterable[Optional[str]] = (),
+        line_ids: Iterable[Optional[str]] = (),
+        batch_ids: Iterable[Optional[str]] = (),
+        event_ids: Iterable[Optional[str]] = (),
+        protocol_ids: Iterable[Optional[str]] = (),
+        organization_ids: Iterable[Optional[str]] = (),
+    ) -> None:
+        """Drop every snapshot built from any of the given records.
+
+        Call after the write has been applied, never before — a scan between
+        an early invalidation and the write would rebuild from the old data.
+        """
+        keys: List[str] = sorted(
+            dependency_keys(
+                accession_ids=accession_ids,
+                line_ids=line_ids,
+                batch_ids=batch_ids,
+                event_ids=event_ids,
+                protocol_ids=protocol_ids,
+                organization_ids=organization_ids,
+            )
+        )
+        if not keys:
+            return
+        db = genetics_db.get_database()
+        try:
+            await db[PUBLIC_SNAPSHOTS].update_one(
+                {"_id": _GENERATION_ID}, {"$inc": {"value": 1}}, upsert=True
+            )
+            result = await db[PUBLIC_SNAPSHOTS].delete_many({"deps": {"$in": keys}})
+            if result.deleted_count:
+                logger.debug(
+                    f"[PublicInfoSnapshot] Invalidated {result.deleted_count} "
+                    f"snapshot(s) for {keys}"
+                )
+        except Exception as e:
+            logger.warning(
+                f"[PublicInfoSnapshot] invalidation failed for {keys}: {e} — "
+                f"affected pages stay stale until they expire"
+            )
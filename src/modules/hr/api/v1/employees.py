@@ -33,6 +33,7 @@ from src.modules.hr.utils.responses import (
     PaginatedResponse,
     PaginationMeta,
 )
+from src.core.search.schemas import AutocompleteResponse
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +121,24 @@ async def search_employees(
     )
 
 
+@router.get(
+    "/autocomplete",
+    response_model=AutocompleteResponse,
+    summary="Autocomplete employees",
+    description="Suggest employees for a partially typed name, email, department or code. Requires hr.view permission.",
+)
+async def autocomplete_employees(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    current_user: CurrentUser = Depends(require_permission("hr.view")),
+    service: EmployeeService = Depends(),
+):
+    """Autocomplete employees"""
+    page = await service.autocomplete_employees(q, limit, cursor)
+    return AutocompleteResponse.from_page(page)
+
+
 @router.get(
     "/{employee_id}",
     response_model=SuccessResponse[Employee],
@@ -4,16 +4,15 @@ HR Module - Authentication Middleware
 Integrates with A64Core authentication system.
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 import logging
 
-from src.modules.hr.config.settings import settings
 from src.modules.hr.services.database import hr_db
 
-# Import core API settings for JWT verification (SECRET_KEY must match)
-from src.config.settings import settings as core_settings
+# Core token verification (shared cache, revocation checks)
+from src.core.tokens import claims_for_request
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +44,7 @@ class CurrentUser:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    request: Request = None,
 ) -> CurrentUser:
     """
     Get current authenticated user from JWT token
@@ -67,11 +67,10 @@ async def get_current_user(
     )
 
     try:
-        # Decode JWT token using core API's SECRET_KEY
+        # Verified once per request and cached across requests by the core
+        # token verifier (which also rejects revoked tokens)
         token = credentials.credentials
-        payload = jwt.decode(
-            token, core_settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = claims_for_request(token, request.state if request else None)
 
         user_id: str = payload.get("userId")
         if user_id is None:
@@ -9,6 +9,7 @@ import logging
 
 # Import shared database manager from core
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +42,9 @@ class HRDatabaseManager:
             logger.info("[HR Module] Initializing HR indexes...")
 
             # The core MongoDB manager already connected in main.py startup
-            # We just need to create our module-specific indexes
-            await cls._create_indexes()
+            # We just need to declare our module-specific indexes; they are
+            # reconciled against the database once per boot (src.core.indexes)
+            cls._declare_indexes()
 
             logger.info("[HR Module] HR indexes initialized")
 
@@ -51,23 +53,21 @@ class HRDatabaseManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for HR collections"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for HR collections"""
         try:
-            # Get shared database instance from core
-            db = mongodb.get_database()
-
             # Employees collection
-            await db.employees.create_index("employeeId", unique=True)
-            await db.employees.create_index("employeeCode", unique=True)
-            await db.employees.create_index("email")
-            await db.employees.create_index("department")
-            await db.employees.create_index("position")
-            await db.employees.create_index("status")
-            await db.employees.create_index("createdBy")
-            await db.employees.create_index([("createdAt", -1)])
+            declare_index("employees", "employeeId", unique=True)
+            declare_index("employees", "employeeCode", unique=True)
+            declare_index("employees", "email")
+            declare_index("employees", "department")
+            declare_index("employees", "position")
+            declare_index("employees", "status")
+            declare_index("employees", "createdBy")
+            declare_index("employees", [("createdAt", -1)])
             # Text search index for firstName, lastName, email, department
-            await db.employees.create_index(
+            declare_index(
+                "employees",
                 [
                     ("firstName", "text"),
                     ("lastName", "text"),
@@ -78,39 +78,39 @@ class HRDatabaseManager:
             )
 
             # Employee contracts collection
-            await db.employee_contracts.create_index("contractId", unique=True)
-            await db.employee_contracts.create_index("employeeId")
-            await db.employee_contracts.create_index("type")
-            await db.employee_contracts.create_index("status")
-            await db.employee_contracts.create_index([("startDate", -1)])
-            await db.employee_contracts.create_index([("createdAt", -1)])
+            declare_index("employee_contracts", "contractId", unique=True)
+            declare_index("employee_contracts", "employeeId")
+            declare_index("employee_contracts", "type")
+            declare_index("employee_contracts", "status")
+            declare_index("employee_contracts", [("startDate", -1)])
+            declare_index("employee_contracts", [("createdAt", -1)])
 
             # Employee visas collection
-            await db.employee_visas.create_index("visaId", unique=True)
-            await db.employee_visas.create_index("employeeId")
-            await db.employee_visas.create_index("country")
-            await db.employee_visas.create_index("status")
-            await db.employee_visas.create_index([("expiryDate", -1)])
-            await db.employee_visas.create_index([("createdAt", -1)])
+            declare_index("employee_visas", "visaId", unique=True)
+            declare_index("employee_visas", "employeeId")
+            declare_index("employee_visas", "country")
+            declare_index("employee_visas", "status")
+            declare_index("employee_visas", [("expiryDate", -1)])
+            declare_index("employee_visas", [("createdAt", -1)])
 
             # Employee insurance collection
-            await db.employee_insurance.create_index("insuranceId", unique=True)
-            await db.employee_insurance.create_index("employeeId")
-            await db.employee_insurance.create_index("type")
-            await db.employee_insurance.create_index("provider")
-            await db.employee_insurance.create_index([("startDate", -1)])
-            await db.employee_insurance.create_index([("createdAt", -1)])
+            declare_index("employee_insurance", "insuranceId", unique=True)
+            declare_index("employee_insurance", "employeeId")
+            declare_index("employee_insurance", "type")
+            declare_index("employee_insurance", "provider")
+            declare_index("employee_insurance", [("startDate", -1)])
+            declare_index("employee_insurance", [("createdAt", -1)])
 
             # Employee performance collection
-            await db.employee_performance.create_index("reviewId", unique=True)
-            await db.employee_performance.create_index("employeeId")
-            await db.employee_performance.create_index("reviewerId")
-            await db.employee_performance.create_index([("reviewDate", -1)])
-            await db.employee_performance.create_index([("createdAt", -1)])
+            declare_index("employee_performance", "reviewId", unique=True)
+            declare_index("employee_performance", "employeeId")
+            declare_index("employee_performance", "reviewerId")
+            declare_index("employee_performance", [("reviewDate", -1)])
+            declare_index("employee_performance", [("createdAt", -1)])
 
-            logger.info("[HR Module] MongoDB indexes created successfully")
+            logger.info("[HR Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[HR Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[HR Module] Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
@@ -19,9 +19,40 @@ from src.modules.hr.models.employee import (
     EmployeeStatus,
 )
 from src.modules.hr.services.database import hr_db
+from src.core import search as search_index
+from src.core.search import (
+    SearchEntity,
+    SearchHit,
+    SearchPage,
+    register_search_entity,
+)
+from src.core.sequences import Counter, next_value
 
 logger = logging.getLogger(__name__)
 
+# Employee codes ("E001", …) are handed out from per-worker prefetched
+# blocks: unique, but not gapless and not strictly in creation order.
+EMPLOYEE_CODE_COUNTER = Counter("counters", "employee_sequence", prefetch=True)
+
+SEARCH_ENTITY = register_search_entity(
+    SearchEntity(
+        name="employees",
+        collection="employees",
+        id_field="employeeId",
+        fields=(
+            "firstName",
+            "lastName",
+            "arabicFirstName",
+            "arabicLastName",
+            "email",
+            "department",
+            "position",
+            "employeeCode",
+        ),
+        label_fields=("firstName", "lastName"),
+    )
+)
+
 
 def _build_employee_safe(employee_doc: dict) -> Optional[Employee]:
     """
@@ -54,24 +85,15 @@ class EmployeeRepository:
 
     async def _get_next_employee_sequence(self) -> int:
         """
-        Get next employee sequence number using atomic increment.
+        Get next employee sequence number.
 
-        Uses a counters collection to maintain an atomic counter for employee codes.
+        Served from this worker's prefetched block of the employee code
+        counter (see src.core.sequences).
 
         Returns:
             Next sequence number for employee code
         """
-        db = hr_db.get_database()
-
-        # Use findOneAndUpdate with upsert to atomically get and increment
-        result = await db.counters.find_one_and_update(
-            {"_id": "employee_sequence"},
-            {"$inc": {"value": 1}},
-            upsert=True,
-            return_document=True,
-        )
-
-        return result["value"]
+        return await next_value(hr_db.get_database(), EMPLOYEE_CODE_COUNTER)
 
     async def create(self, employee_data: EmployeeCreate, created_by: UUID) -> Employee:
         """
@@ -112,6 +134,9 @@ class EmployeeRepository:
             )
 
         await collection.insert_one(employee_doc)
+        await search_index.reindex(
+            hr_db.get_database(), SEARCH_ENTITY.name, [employee.employeeId]
+        )
 
         logger.info(
             f"Created employee: {employee.employeeId} with code {employee_code}"
@@ -192,7 +217,9 @@ class EmployeeRepository:
         self, search_term: str, skip: int = 0, limit: int = 20
     ) -> tuple[List[Employee], int]:
         """
-        Search employees by name, email, or department using text search
+        Search employees by name, email, or department using text search.
+        When the shared search index is enabled for employees, typo-tolerant
+        ranked search is used instead (total is then an estimate).
 
         Args:
             search_term: Search term to match
@@ -202,24 +229,35 @@ class EmployeeRepository:
         Returns:
             Tuple of (list of employees, total count)
         """
-        collection = self._get_collection()
-
-        # Use MongoDB text search
-        query = {"$text": {"$search": search_term}}
-
-        # Get total count
-        total = await collection.count_documents(query)
-
-        # Get employees with text score sorting
-        cursor = (
-            collection.find(query, {"score": {"$meta": "textScore"}})
-            .sort([("score", {"$meta": "textScore"})])
-            .skip(skip)
-            .limit(limit)
-        )
+        db = hr_db.get_database()
+        if await search_index.use_search_index(db, SEARCH_ENTITY.name):
+            page = await search_index.search(
+                db, SEARCH_ENTITY.name, search_term, limit=limit, skip=skip
+            )
+            docs = await search_index.fetch_hits(
+                db, SEARCH_ENTITY.name, page, {"_id": 0}
+            )
+            total = page.estimated_total
+        else:
+            collection = self._get_collection()
+
+            # Use MongoDB text search
+            query = {"$text": {"$search": search_term}}
+
+            # Get total count
+            total = await collection.count_documents(query)
+
+            # Get employees with text score sorting
+            docs = (
+                await collection.find(query, {"score": {"$meta": "textScore"}})
+                .sort([("score", {"$meta": "textScore"})])
+                .skip(skip)
+                .limit(limit)
+                .to_list(length=limit)
+            )
 
         employees = []
-        async for employee_doc in cursor:
+        for employee_doc in docs:
             employee_doc.pop("_id", None)
             employee_doc.pop("score", None)  # Remove score field
             # Convert datetime back to date
@@ -233,6 +271,39 @@ class EmployeeRepository:
 
         return employees, total
 
+    async def autocomplete(
+        self, prefix: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> SearchPage:
+        """
+        Suggest employees with a name, email, department, position or code
+        word starting with each word of ``prefix``
+
+        Before the search index is enabled for employees this falls back to
+        the first page of ``search`` (no cursor).
+
+        Args:
+            prefix: What the user typed so far
+            limit: Maximum number of suggestions
+            cursor: nextCursor of the previous page
+
+        Returns:
+            SearchPage of suggestions
+        """
+        db = hr_db.get_database()
+        if await search_index.use_search_index(db, SEARCH_ENTITY.name):
+            return await search_index.autocomplete(
+                db, SEARCH_ENTITY.name, prefix, limit=limit, cursor=cursor
+            )
+
+        employees, total = await self.search(prefix, 0, limit)
+        return SearchPage(
+            hits=[
+                SearchHit(str(e.employeeId), f"{e.firstName} {e.lastName}", 1.0)
+                for e in employees
+            ],
+            estimated_total=total,
+        )
+
     async def update(
         self, employee_id: UUID, update_data: EmployeeUpdate
     ) -> Optional[Employee]:
@@ -265,6 +336,9 @@ class EmployeeRepository:
         )
 
         if result.modified_count > 0:
+            await search_index.reindex(
+                hr_db.get_database(), SEARCH_ENTITY.name, [employee_id]
+            )
             logger.info(f"Updated employee: {employee_id}")
             return await self.get_by_id(employee_id)
 
@@ -285,6 +359,9 @@ class EmployeeRepository:
         result = await collection.delete_one({"employeeId": str(employee_id)})
 
         if result.deleted_count > 0:
+            await search_index.reindex(
+                hr_db.get_database(), SEARCH_ENTITY.name, [employee_id]
+            )
             logger.info(f"Deleted employee: {employee_id}")
             return True
 
@@ -18,6 +18,7 @@ from src.modules.hr.models.employee import (
 )
 from src.modules.hr.services.employee.employee_repository import EmployeeRepository
 from src.modules.hr.services.database import hr_db
+from src.core.search import SearchPage
 
 logger = logging.getLogger(__name__)
 
@@ -151,6 +152,28 @@ class EmployeeService:
 
         return employees, total, total_pages
 
+    async def autocomplete_employees(
+        self, prefix: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> SearchPage:
+        """
+        Suggest employees for a partially typed name, email, department or code
+
+        Args:
+            prefix: What the user typed so far
+            limit: Maximum number of suggestions (1-50)
+            cursor: nextCursor of the previous page
+
+        Returns:
+            SearchPage of suggestions
+
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            return await self.repository.autocomplete(prefix, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     async def update_employee(
         self, employee_id: UUID, update_data: EmployeeUpdate
     ) -> Employee:
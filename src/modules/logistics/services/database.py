@@ -9,6 +9,7 @@ import logging
 
 # Import shared database manager from core
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +40,9 @@ class LogisticsDatabaseManager:
             logger.info("[Logistics Module] Initializing Logistics indexes...")
 
             # The core MongoDB manager already connected in main.py startup
-            # We just need to create our module-specific indexes
-            await cls._create_indexes()
+            # We just need to declare our module-specific indexes; they are
+            # reconciled against the database once per boot (src.core.indexes)
+            cls._declare_indexes()
 
             logger.info("[Logistics Module] Logistics indexes initialized")
 
@@ -51,34 +53,34 @@ class LogisticsDatabaseManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for Logistics collections"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for Logistics collections"""
         try:
-            # Get shared database instance from core
-            db = mongodb.get_database()
-
             # Vehicles collection
-            await db.vehicles.create_index("vehicleId", unique=True)
-            await db.vehicles.create_index("vehicleCode", unique=True)
-            await db.vehicles.create_index("licensePlate", unique=True, sparse=True)
-            await db.vehicles.create_index("type")
-            await db.vehicles.create_index("status")
-            await db.vehicles.create_index("ownership")
-            await db.vehicles.create_index("createdBy")
-            await db.vehicles.create_index([("createdAt", -1)])
+            declare_index("vehicles", "vehicleId", unique=True)
+            declare_index("vehicles", "vehicleCode", unique=True)
+            declare_index("vehicles", "licensePlate", unique=True, sparse=True)
+            declare_index("vehicles", "type")
+            declare_index("vehicles", "status")
+            declare_index("vehicles", "ownership")
+            declare_index("vehicles", "createdBy")
+            declare_index("vehicles", [("createdAt", -1)])
             # Text search index for name, licensePlate
-            await db.vehicles.create_index(
-                [("name", "text"), ("licensePlate", "text")], name="vehicle_search_text"
+            declare_index(
+                "vehicles",
+                [("name", "text"), ("licensePlate", "text")],
+                name="vehicle_search_text",
             )
 
             # Routes collection
-            await db.routes.create_index("routeId", unique=True)
-            await db.routes.create_index("routeCode", unique=True)
-            await db.routes.create_index("isActive")
-            await db.routes.create_index("createdBy")
-            await db.routes.create_index([("createdAt", -1)])
+            declare_index("routes", "routeId", unique=True)
+            declare_index("routes", "routeCode", unique=True)
+            declare_index("routes", "isActive")
+            declare_index("routes", "createdBy")
+            declare_index("routes", [("createdAt", -1)])
             # Text search index for name, origin, destination
-            await db.routes.create_index(
+            declare_index(
+                "routes",
                 [
                     ("name", "text"),
                     ("origin.name", "text"),
@@ -88,21 +90,21 @@ class LogisticsDatabaseManager:
             )
 
             # Shipments collection
-            await db.shipments.create_index("shipmentId", unique=True)
-            await db.shipments.create_index("shipmentCode", unique=True)
-            await db.shipments.create_index("routeId")
-            await db.shipments.create_index("vehicleId")
-            await db.shipments.create_index("driverId")
-            await db.shipments.create_index("status")
-            await db.shipments.create_index([("scheduledDate", -1)])
-            await db.shipments.create_index([("createdAt", -1)])
+            declare_index("shipments", "shipmentId", unique=True)
+            declare_index("shipments", "shipmentCode", unique=True)
+            declare_index("shipments", "routeId")
+            declare_index("shipments", "vehicleId")
+            declare_index("shipments", "driverId")
+            declare_index("shipments", "status")
+            declare_index("shipments", [("scheduledDate", -1)])
+            declare_index("shipments", [("createdAt", -1)])
             # Farming year indexes for filtering by year
-            await db.shipments.create_index("farmingYear")
-            await db.shipments.create_index([("status", 1), ("farmingYear", 1)])
+            declare_index("shipments", "farmingYear")
+            declare_index("shipments", [("status", 1), ("farmingYear", 1)])
 
-            logger.info("[Logistics Module] MongoDB indexes created successfully")
+            logger.info("[Logistics Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Logistics Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Logistics Module] Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
@@ -9,6 +9,7 @@ import logging
 
 # Import shared database manager from core
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +41,9 @@ class MarketingDatabaseManager:
             logger.info("[Marketing Module] Initializing Marketing indexes...")
 
             # The core MongoDB manager already connected in main.py startup
-            # We just need to create our module-specific indexes
-            await cls._create_indexes()
+            # We just need to declare our module-specific indexes; they are
+            # reconciled against the database once per boot (src.core.indexes)
+            cls._declare_indexes()
 
             logger.info("[Marketing Module] Marketing indexes initialized")
 
@@ -52,73 +54,74 @@ class MarketingDatabaseManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for Marketing collections"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for Marketing collections"""
         try:
-            # Get shared database instance from core
-            db = mongodb.get_database()
-
             # Marketing Budgets collection
-            await db.marketing_budgets.create_index("budgetId", unique=True)
-            await db.marketing_budgets.create_index("name")
-            await db.marketing_budgets.create_index("year")
-            await db.marketing_budgets.create_index("quarter")
-            await db.marketing_budgets.create_index("status")
-            await db.marketing_budgets.create_index("createdBy")
-            await db.marketing_budgets.create_index([("createdAt", -1)])
+            declare_index("marketing_budgets", "budgetId", unique=True)
+            declare_index("marketing_budgets", "name")
+            declare_index("marketing_budgets", "year")
+            declare_index("marketing_budgets", "quarter")
+            declare_index("marketing_budgets", "status")
+            declare_index("marketing_budgets", "createdBy")
+            declare_index("marketing_budgets", [("createdAt", -1)])
             # Text search index for budget name
-            await db.marketing_budgets.create_index(
-                [("name", "text")], name="budget_search_text"
+            declare_index(
+                "marketing_budgets", [("name", "text")], name="budget_search_text"
             )
 
             # Marketing Campaigns collection
-            await db.marketing_campaigns.create_index("campaignId", unique=True)
-            await db.marketing_campaigns.create_index("campaignCode", unique=True)
-            await db.marketing_campaigns.create_index("name")
-            await db.marketing_campaigns.create_index("budgetId")
-            await db.marketing_campaigns.create_index("status")
-            await db.marketing_campaigns.create_index("startDate")
-            await db.marketing_campaigns.create_index("endDate")
-            await db.marketing_campaigns.create_index("createdBy")
-            await db.marketing_campaigns.create_index([("createdAt", -1)])
+            declare_index("marketing_campaigns", "campaignId", unique=True)
+            declare_index("marketing_campaigns", "campaignCode", unique=True)
+            declare_index("marketing_campaigns", "name")
+            declare_index("marketing_campaigns", "budgetId")
+            declare_index("marketing_campaigns", "status")
+            declare_index("marketing_campaigns", "startDate")
+            declare_index("marketing_campaigns", "endDate")
+            declare_index("marketing_campaigns", "createdBy")
+            declare_index("marketing_campaigns", [("createdAt", -1)])
             # Text search index for campaign name and description
-            await db.marketing_campaigns.create_index(
+            declare_index(
+                "marketing_campaigns",
                 [("name", "text"), ("description", "text"), ("campaignCode", "text")],
                 name="campaign_search_text",
             )
 
             # Marketing Channels collection
-            await db.marketing_channels.create_index("channelId", unique=True)
-            await db.marketing_channels.create_index("name")
-            await db.marketing_channels.create_index("type")
-            await db.marketing_channels.create_index("platform")
-            await db.marketing_channels.create_index("isActive")
-            await db.marketing_channels.create_index("createdBy")
-            await db.marketing_channels.create_index([("createdAt", -1)])
+            declare_index("marketing_channels", "channelId", unique=True)
+            declare_index("marketing_channels", "name")
+            declare_index("marketing_channels", "type")
+            declare_index("marketing_channels", "platform")
+            declare_index("marketing_channels", "isActive")
+            declare_index("marketing_channels", "createdBy")
+            declare_index("marketing_channels", [("createdAt", -1)])
             # Text search index for channel name and platform
-            await db.marketing_channels.create_index(
-                [("name", "text"), ("platform", "text")], name="channel_search_text"
+            declare_index(
+                "marketing_channels",
+                [("name", "text"), ("platform", "text")],
+                name="channel_search_text",
             )
 
             # Marketing Events collection
-            await db.marketing_events.create_index("eventId", unique=True)
-            await db.marketing_events.create_index("eventCode", unique=True)
-            await db.marketing_events.create_index("name")
-            await db.marketing_events.create_index("type")
-            await db.marketing_events.create_index("campaignId")
-            await db.marketing_events.create_index("status")
-            await db.marketing_events.create_index("date")
-            await db.marketing_events.create_index("createdBy")
-            await db.marketing_events.create_index([("date", -1)])
+            declare_index("marketing_events", "eventId", unique=True)
+            declare_index("marketing_events", "eventCode", unique=True)
+            declare_index("marketing_events", "name")
+            declare_index("marketing_events", "type")
+            declare_index("marketing_events", "campaignId")
+            declare_index("marketing_events", "status")
+            declare_index("marketing_events", "date")
+            declare_index("marketing_events", "createdBy")
+            declare_index("marketing_events", [("date", -1)])
             # Text search index for event name and location
-            await db.marketing_events.create_index(
+            declare_index(
+                "marketing_events",
                 [("name", "text"), ("location", "text"), ("eventCode", "text")],
                 name="event_search_text",
             )
 
-            logger.info("[Marketing Module] MongoDB indexes created successfully")
+            logger.info("[Marketing Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Marketing Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Marketing Module] Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
@@ -9,6 +9,7 @@ import logging
 from typing import Optional
 
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -40,100 +41,92 @@ class MushroomDatabaseManager:
         """
         try:
             logger.info("[Mushroom Module] Initializing mushroom management indexes...")
-            await cls._create_indexes()
+            cls._declare_indexes()
             logger.info("[Mushroom Module] Mushroom management indexes initialized")
         except Exception as e:
             logger.error(f"[Mushroom Module] Error initializing mushroom indexes: {e}")
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
+    def _declare_indexes(cls) -> None:
         """
-        Create database indexes for mushroom management collections.
+        Declare database indexes for mushroom management collections.
 
         Raises:
             Exception: Logged but not re-raised; indexes are not critical for startup.
         """
         try:
-            db = mongodb.get_database()
-
             # mushroom_facilities collection
-            await db.mushroom_facilities.create_index("facilityId", unique=True)
-            await db.mushroom_facilities.create_index("managerId")
-            await db.mushroom_facilities.create_index("status")
-            await db.mushroom_facilities.create_index("facilityType")
-            await db.mushroom_facilities.create_index([("createdAt", -1)])
+            declare_index("mushroom_facilities", "facilityId", unique=True)
+            declare_index("mushroom_facilities", "managerId")
+            declare_index("mushroom_facilities", "status")
+            declare_index("mushroom_facilities", "facilityType")
+            declare_index("mushroom_facilities", [("createdAt", -1)])
 
             # growing_rooms collection
-            await db.growing_rooms.create_index("roomId", unique=True)
-            await db.growing_rooms.create_index("facilityId")
-            await db.growing_rooms.create_index("currentPhase")
-            await db.growing_rooms.create_index("strainId")
-            await db.growing_rooms.create_index("substrateBatchId")
-            await db.growing_rooms.create_index([("createdAt", -1)])
+            declare_index("growing_rooms", "roomId", unique=True)
+            declare_index("growing_rooms", "facilityId")
+            declare_index("growing_rooms", "currentPhase")
+            declare_index("growing_rooms", "strainId")
+            declare_index("growing_rooms", "substrateBatchId")
+            declare_index("growing_rooms", [("createdAt", -1)])
             # Compound index for facility-room lookups
-            await db.growing_rooms.create_index(
-                [("facilityId", 1), ("roomCode", 1)], unique=True
+            declare_index(
+                "growing_rooms", [("facilityId", 1), ("roomCode", 1)], unique=True
             )
 
             # mushroom_strains collection
-            await db.mushroom_strains.create_index("strainId", unique=True)
-            await db.mushroom_strains.create_index("commonName")
-            await db.mushroom_strains.create_index("difficultyLevel")
-            await db.mushroom_strains.create_index("isActive")
-            await db.mushroom_strains.create_index([("createdAt", -1)])
+            declare_index("mushroom_strains", "strainId", unique=True)
+            declare_index("mushroom_strains", "commonName")
+            declare_index("mushroom_strains", "difficultyLevel")
+            declare_index("mushroom_strains", "isActive")
+            declare_index("mushroom_strains", [("createdAt", -1)])
 
             # substrate_batches collection
-            await db.substrate_batches.create_index("batchId", unique=True)
-            await db.substrate_batches.create_index("facilityId")
-            await db.substrate_batches.create_index("status")
-            await db.substrate_batches.create_index("batchCode")
-            await db.substrate_batches.create_index([("createdAt", -1)])
+            declare_index("substrate_batches", "batchId", unique=True)
+            declare_index("substrate_batches", "facilityId")
+            declare_index("substrate_batches", "status")
+            declare_index("substrate_batches", "batchCode")
+            declare_index("substrate_batches", [("createdAt", -1)])
 
             # mushroom_harvests collection
-            await db.mushroom_harvests.create_index("harvestId", unique=True)
-            await db.mushroom_harvests.create_index("roomId")
-            await db.mushroom_harvests.create_index("facilityId")
-            await db.mushroom_harvests.create_index("flushNumber")
-            await db.mushroom_harvests.create_index("qualityGrade")
-            await db.mushroom_harvests.create_index([("harvestedAt", -1)])
+            declare_index("mushroom_harvests", "harvestId", unique=True)
+            declare_index("mushroom_harvests", "roomId")
+            declare_index("mushroom_harvests", "facilityId")
+            declare_index("mushroom_harvests", "flushNumber")
+            declare_index("mushroom_harvests", "qualityGrade")
+            declare_index("mushroom_harvests", [("harvestedAt", -1)])
             # Lineage attribution — supports the yield-by-line rollup.
-            await db.mushroom_harvests.create_index("accessionId")
-            await db.mushroom_harvests.create_index("lineId")
-            await db.mushroom_harvests.create_index(
-                [("lineId", 1), ("cloneGeneration", 1)]
-            )
-            await db.mushroom_harvests.create_index([("createdAt", -1)])
+            declare_index("mushroom_harvests", "accessionId")
+            declare_index("mushroom_harvests", "lineId")
+            declare_index("mushroom_harvests", [("lineId", 1), ("cloneGeneration", 1)])
+            declare_index("mushroom_harvests", [("createdAt", -1)])
             # Compound index for room harvest queries
-            await db.mushroom_harvests.create_index([("roomId", 1), ("flushNumber", 1)])
-            await db.mushroom_harvests.create_index(
-                [("facilityId", 1), ("harvestedAt", -1)]
-            )
+            declare_index("mushroom_harvests", [("roomId", 1), ("flushNumber", 1)])
+            declare_index("mushroom_harvests", [("facilityId", 1), ("harvestedAt", -1)])
 
             # room_environment_logs collection
-            await db.room_environment_logs.create_index("logId", unique=True)
-            await db.room_environment_logs.create_index("roomId")
-            await db.room_environment_logs.create_index("facilityId")
-            await db.room_environment_logs.create_index("isOutOfRange")
-            await db.room_environment_logs.create_index([("recordedAt", -1)])
+            declare_index("room_environment_logs", "logId", unique=True)
+            declare_index("room_environment_logs", "roomId")
+            declare_index("room_environment_logs", "facilityId")
+            declare_index("room_environment_logs", "isOutOfRange")
+            declare_index("room_environment_logs", [("recordedAt", -1)])
             # Compound index for latest reading queries
-            await db.room_environment_logs.create_index(
-                [("roomId", 1), ("recordedAt", -1)]
-            )
+            declare_index("room_environment_logs", [("roomId", 1), ("recordedAt", -1)])
 
             # contamination_reports collection
-            await db.contamination_reports.create_index("reportId", unique=True)
-            await db.contamination_reports.create_index("roomId")
-            await db.contamination_reports.create_index("facilityId")
-            await db.contamination_reports.create_index("contaminationType")
-            await db.contamination_reports.create_index("severity")
-            await db.contamination_reports.create_index("isResolved")
-            await db.contamination_reports.create_index([("reportedAt", -1)])
-            await db.contamination_reports.create_index([("createdAt", -1)])
-
-            logger.info("[Mushroom Module] MongoDB indexes created successfully")
+            declare_index("contamination_reports", "reportId", unique=True)
+            declare_index("contamination_reports", "roomId")
+            declare_index("contamination_reports", "facilityId")
+            declare_index("contamination_reports", "contaminationType")
+            declare_index("contamination_reports", "severity")
+            declare_index("contamination_reports", "isResolved")
+            declare_index("contamination_reports", [("reportedAt", -1)])
+            declare_index("contamination_reports", [("createdAt", -1)])
+
+            logger.info("[Mushroom Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Mushroom Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Mushroom Module] Error declaring MongoDB indexes: {e}")
             # Reason: Indexes are not critical for startup; log and continue
 
     @classmethod
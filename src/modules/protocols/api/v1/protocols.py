@@ -10,6 +10,10 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query, status
 
+from src.modules.genetics.services.public_info.snapshot_service import (
+    PublicInfoSnapshotService,
+)
+
 from ...models.protocol import (
     ApprovalRequest,
     Protocol,
@@ -137,6 +141,10 @@ async def update_protocol(
     current_user: CurrentUser = Depends(require_permission("protocols.author")),
 ) -> SuccessResponse[Protocol]:
     protocol = await ProtocolService.update_protocol(protocol_id, payload)
+    # Genetics' public label pages show the live steps of the protocol a
+    # propagation cites. Called here rather than from ProtocolService, which
+    # has no reason to know about genetics (see genetics' protocol_link.py).
+    await PublicInfoSnapshotService.invalidate(protocol_ids=[protocol_id])
     return SuccessResponse(data=protocol, message="Protocol updated")
 
 
@@ -7,6 +7,7 @@ Manages the ``protocols`` collection. Uses the shared MongoDB connection.
 import logging
 
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,29 +21,28 @@ class ProtocolsDatabaseManager:
     async def connect(cls) -> None:
         try:
             logger.info("[Protocols Module] Initializing protocol indexes...")
-            await cls._create_indexes()
+            cls._declare_indexes()
             logger.info("[Protocols Module] Protocol indexes initialized")
         except Exception as e:
             logger.error(f"[Protocols Module] Error initializing indexes: {e}")
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
+    def _declare_indexes(cls) -> None:
         try:
-            db = mongodb.get_database()
-            await db[PROTOCOLS].create_index("protocolId", unique=True)
-            await db[PROTOCOLS].create_index("code", unique=True)
-            await db[PROTOCOLS].create_index("category")
-            await db[PROTOCOLS].create_index("status")
-            await db[PROTOCOLS].create_index("tags")
+            declare_index(PROTOCOLS, "protocolId", unique=True)
+            declare_index(PROTOCOLS, "code", unique=True)
+            declare_index(PROTOCOLS, "category")
+            declare_index(PROTOCOLS, "status")
+            declare_index(PROTOCOLS, "tags")
             # The in-context lookup: "which active SOPs apply here". Compound
             # with status because only ACTIVE ones are ever offered at the bench.
-            await db[PROTOCOLS].create_index("appliesTo")
-            await db[PROTOCOLS].create_index([("appliesTo", 1), ("status", 1)])
-            await db[PROTOCOLS].create_index([("createdAt", -1)])
-            logger.info("[Protocols Module] MongoDB indexes created successfully")
+            declare_index(PROTOCOLS, "appliesTo")
+            declare_index(PROTOCOLS, [("appliesTo", 1), ("status", 1)])
+            declare_index(PROTOCOLS, [("createdAt", -1)])
+            logger.info("[Protocols Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Protocols Module] Error creating indexes: {e}")
+            logger.error(f"[Protocols Module] Error declaring indexes: {e}")
             # Reason: indexes are not critical for startup; log and continue
 
     @classmethod
@@ -31,6 +31,7 @@ from src.modules.farm_manager.utils.responses import (
 )
 from src.modules.farm_manager.services.database import farm_db
 from src.core.finance.company_resolver import resolve_company_code
+from src.core.search.schemas import AutocompleteResponse
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +110,63 @@ async def list_purchase_items(
     )
 
 
+@router.get(
+    "/purchase-items/autocomplete",
+    response_model=AutocompleteResponse,
+    summary="Autocomplete purchase items",
+    description="Suggest purchase items for a partially typed name, code, barcode or manufacturer.",
+)
+async def autocomplete_purchase_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    organization_id: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    item_type: Optional[str] = Query(None, description="Filter by itemType"),
+    is_active: Optional[bool] = Query(None),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    service: PurchaseItemService = Depends(_get_service),
+) -> AutocompleteResponse:
+    """
+    Suggest purchase items for a partially typed name, code, barcode or
+    manufacturer.
+
+    Args:
+        q: What the user typed so far.
+        organization_id: Override org — defaults to current_user.organizationId.
+        limit: Maximum suggestions (max 50).
+        cursor: nextCursor of the previous page.
+        item_type: Filter by itemType value.
+        is_active: Filter by active status.
+        current_user: Authenticated user.
+        service: PurchaseItemService dependency.
+
+    Returns:
+        Suggestions with a keyset cursor and an estimated total.
+
+    Raises:
+        HTTPException 400: If no organisation or a malformed cursor is given.
+    """
+    org_id = organization_id or current_user.organizationId
+    if not org_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="organization_id is required",
+        )
+
+    try:
+        page = await service.autocomplete_items(
+            org_id,
+            q,
+            limit=limit,
+            cursor=cursor,
+            item_type=item_type,
+            is_active=is_active,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return AutocompleteResponse.from_page(page)
+
+
 @router.post(
     "/purchase-items",
     response_model=SuccessResponse[PurchaseItemResponse],
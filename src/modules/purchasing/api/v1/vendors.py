@@ -27,6 +27,7 @@ from src.modules.farm_manager.utils.responses import (
 )
 from src.modules.farm_manager.services.database import farm_db
 from src.core.finance.company_resolver import resolve_company_code
+from src.core.search.schemas import AutocompleteResponse
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +105,57 @@ async def list_vendors(
     )
 
 
+@router.get(
+    "/vendors/autocomplete",
+    response_model=AutocompleteResponse,
+    summary="Autocomplete vendors",
+    description="Suggest vendors for a partially typed name, code, contact or TRN. All authenticated users.",
+)
+async def autocomplete_vendors(
+    q: str = Query(..., min_length=1, max_length=100),
+    organization_id: Optional[str] = Query(
+        None, description="Filter by organization ID"
+    ),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    service: VendorService = Depends(_get_service),
+) -> AutocompleteResponse:
+    """
+    Suggest vendors for a partially typed name, code, contact or TRN.
+
+    Args:
+        q: What the user typed so far.
+        organization_id: Override org — defaults to current_user.organizationId.
+        limit: Maximum suggestions (max 50).
+        cursor: nextCursor of the previous page.
+        is_active: Filter by active status.
+        current_user: Authenticated user.
+        service: VendorService dependency.
+
+    Returns:
+        Suggestions with a keyset cursor and an estimated total.
+
+    Raises:
+        HTTPException 400: If no organisation or a malformed cursor is given.
+    """
+    org_id = organization_id or current_user.organizationId
+    if not org_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="organization_id is required",
+        )
+
+    try:
+        page = await service.autocomplete_vendors(
+            org_id, q, limit=limit, cursor=cursor, is_active=is_active
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return AutocompleteResponse.from_page(page)
+
+
 @router.post(
     "/vendors",
     response_model=SuccessResponse[VendorResponse],
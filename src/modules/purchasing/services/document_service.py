@@ -85,6 +85,8 @@ from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
 
 from src.core.documents.document_status import DocumentStatus, assert_legal_transition
 from src.core.finance import get_tax_percent
+from src.core.inventory import StockMovement, post_movements
+from src.core.sequences import Counter, next_value
 
 from ..models.document import (
     APCreate,
@@ -153,6 +155,10 @@ _DOC_TYPE_PO: str = "PO"
 _DOC_TYPE_GR: str = "GR"
 _DOC_TYPE_AP_INVOICE: str = "AP_INVOICE"
 
+# Item types whose receipts are valued on the inventory ledger (services and
+# fixed-asset acquisitions are not stock).
+_STOCKED_ITEM_TYPES = frozenset({"raw_material", "consumable"})
+
 # ---------------------------------------------------------------------------
 # Tolerant status parser (migration window helper — T-200.21)
 #
@@ -909,16 +915,10 @@ async def _next_doc_number(
         Formatted document number string.
     """
     year = datetime.now(tz=timezone.utc).year
-    counter_id = f"{company_code}:{doc_type}:{year}"
-
-    result = await db[_COUNTERS_COL].find_one_and_update(
-        {"_id": counter_id},
-        {"$inc": {"counter": 1}},
-        upsert=True,
-        return_document=True,
-        session=session,
+    counter = Counter(
+        _COUNTERS_COL, f"{company_code}:{doc_type}:{year}", "counter", gapless=True
     )
-    n = result["counter"]
+    n = await next_value(db, counter, session=session)
     return f"{doc_type}-{year}-{n:04d}"
 
 
@@ -3518,7 +3518,9 @@ class DocumentService:
 
         This is the primary accounting event for Phase B.  All steps are atomic:
           1. Decrement openQuantity on each linked PO line by the received qty.
-          2. Update GR header status to Posted (set postedAt, postedBy).
+          2. Update GR header status to Posted (set postedAt, postedBy) and
+             receive stocked lines on the inventory valuation ledger at their
+             net unit price (moving-average cost).
           3. If all PO lines reach openQuantity == 0, transition PO → Closed
              and emit po_state_changed for the PO.
           4. Emit purchase_received outbox event (stores postedEventId on header).
@@ -3647,6 +3649,12 @@ class DocumentService:
             )
             assert updated_gr is not None
 
+            # Step 2b: receive stock on the valuation ledger.  Conflicts with a
+            # concurrent posting abort the transaction (InventoryConflictError).
+            receipts = self._gr_stock_movements(org_id, header, gr_lines, posted_by)
+            if receipts:
+                await post_movements(self._db, receipts, session=session)
+
             # Step 3: if fully received, close the PO and emit po_state_changed
             # Reason: PO close kept inside transaction to maintain outbox atomicity
             # (the po_state_changed event and the PO header update commit together).
@@ -3741,6 +3749,52 @@ class DocumentService:
             **_header_to_gr_response(updated_gr).model_dump(), lines=lines_resp
         )
 
+    @staticmethod
+    def _gr_stock_movements(
+        org_id: str,
+        header: Dict[str, Any],
+        gr_lines: List[Dict[str, Any]],
+        posted_by: str,
+    ) -> List[StockMovement]:
+        """
+        Ledger receipts for the stocked lines of a GR being posted.
+
+        The warehouse is the line's, else the header's; lines with neither
+        are not valued (logged), as are non-stock item types.
+        """
+        movements: List[StockMovement] = []
+        for ln in gr_lines:
+            if ln.get("itemType", "raw_material") not in _STOCKED_ITEM_TYPES:
+                continue
+            quantity = Decimal(str(ln.get("quantity", 0)))
+            warehouse_id = ln.get("warehouseId") or header.get("warehouseId")
+            if quantity <= 0 or not ln.get("itemId"):
+                continue
+            if not warehouse_id:
+                logger.warning(
+                    "[DocumentService] GR %s line %s has no warehouse — "
+                    "receipt not valued on the inventory ledger",
+                    header.get("docNumber", header.get("docId")),
+                    ln.get("lineId"),
+                )
+                continue
+            movements.append(
+                StockMovement(
+                    organization_id=org_id,
+                    item_id=ln["itemId"],
+                    warehouse_id=warehouse_id,
+                    quantity=quantity,
+                    movement_type="goods_receipt",
+                    unit_cost=Decimal(str(ln.get("lineNet", 0))) / quantity,
+                    source_doc_type=_DOC_TYPE_GR,
+                    source_doc_entry=header["docId"],
+                    source_doc_number=header.get("docNumber", ""),
+                    source_line_id=ln.get("lineId"),
+                    posted_by=posted_by,
+                )
+            )
+        return movements
+
     async def soft_delete_gr(self, org_id: str, doc_id: str, deleted_by: str) -> bool:
         """
         Soft-delete a Draft GR.
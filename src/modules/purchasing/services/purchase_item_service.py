@@ -14,6 +14,14 @@ from typing import Any, Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from src.core import search as search_index
+from src.core.search import (
+    SearchEntity,
+    SearchHit,
+    SearchPage,
+    register_search_entity,
+)
+
 from ..models.purchase_item import (
     PurchaseItemCreate,
     PurchaseItemResponse,
@@ -24,6 +32,18 @@ logger = logging.getLogger(__name__)
 
 _COLLECTION = "purchase_items"
 
+SEARCH_ENTITY = register_search_entity(
+    SearchEntity(
+        name="purchase_items",
+        collection=_COLLECTION,
+        id_field="itemId",
+        fields=("name", "itemCode", "barcode", "manufacturer"),
+        scope_field="organizationId",
+        filter_fields=("isActive", "itemType"),
+        include=lambda doc: doc.get("deletedAt") is None,
+    )
+)
+
 
 def _next_item_code(existing_count: int) -> str:
     """
@@ -102,13 +122,37 @@ class PurchaseItemService:
             organization_id: Filter items to this org.
             page: Page number (1-based).
             per_page: Items per page.
-            search: Optional substring match on name or itemCode.
+            search: Optional substring match on name or itemCode (ranked,
+                typo-tolerant match on name, code, barcode and manufacturer
+                when the search index is enabled for purchase_items; total is
+                then an estimate).
             item_type: Filter by itemType if supplied.
             is_active: Filter by active status if supplied.
 
         Returns:
             Dict with 'items', 'total', 'page', 'perPage', 'totalPages'.
         """
+        offset = (page - 1) * per_page
+        if search and await search_index.use_search_index(self._db, SEARCH_ENTITY.name):
+            result = await search_index.search(
+                self._db,
+                SEARCH_ENTITY.name,
+                search,
+                scope=organization_id,
+                filters={"isActive": is_active, "itemType": item_type or None},
+                limit=per_page,
+                skip=offset,
+            )
+            docs = await search_index.fetch_hits(self._db, SEARCH_ENTITY.name, result)
+            total = result.estimated_total
+            return {
+                "items": [_doc_to_response(d) for d in docs],
+                "total": total,
+                "page": page,
+                "perPage": per_page,
+                "totalPages": max(1, -(-total // per_page)),
+            }
+
         query: Dict[str, Any] = {
             "organizationId": organization_id,
             "deletedAt": None,
@@ -124,7 +168,6 @@ class PurchaseItemService:
             ]
 
         total = await self._col.count_documents(query)
-        offset = (page - 1) * per_page
         cursor = self._col.find(query).sort("itemCode", 1).skip(offset).limit(per_page)
         docs = await cursor.to_list(length=per_page)
 
@@ -136,6 +179,60 @@ class PurchaseItemService:
             "totalPages": max(1, -(-total // per_page)),
         }
 
+    async def autocomplete_items(
+        self,
+        organization_id: str,
+        prefix: str,
+        *,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        item_type: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ) -> SearchPage:
+        """
+        Suggest purchase items whose name, code, barcode or manufacturer words
+        start with each word of ``prefix``.
+
+        Before the search index is enabled for purchase_items this falls back
+        to the first page of ``list_items`` (no cursor).
+
+        Args:
+            organization_id: Scope suggestions to this org.
+            prefix: What the user typed so far.
+            limit: Maximum number of suggestions.
+            cursor: nextCursor of the previous page.
+            item_type: Filter by itemType if supplied.
+            is_active: Filter by active status if supplied.
+
+        Returns:
+            SearchPage of suggestions.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        if await search_index.use_search_index(self._db, SEARCH_ENTITY.name):
+            return await search_index.autocomplete(
+                self._db,
+                SEARCH_ENTITY.name,
+                prefix,
+                scope=organization_id,
+                filters={"isActive": is_active, "itemType": item_type or None},
+                limit=limit,
+                cursor=cursor,
+            )
+
+        result = await self.list_items(
+            organization_id,
+            per_page=limit,
+            search=prefix,
+            item_type=item_type,
+            is_active=is_active,
+        )
+        return SearchPage(
+            hits=[SearchHit(i.itemId, i.name, 1.0) for i in result["items"]],
+            estimated_total=result["total"],
+        )
+
     async def get_item(
         self, organization_id: str, item_id: str
     ) -> Optional[PurchaseItemResponse]:
@@ -219,6 +316,7 @@ class PurchaseItemService:
         }
 
         await self._col.insert_one(doc)
+        await search_index.reindex(self._db, SEARCH_ENTITY.name, [item_id])
 
         # Emit outbox event (best-effort)
         await self._emit_event(
@@ -278,6 +376,7 @@ class PurchaseItemService:
 
         updated_doc = await self._col.find_one({"itemId": item_id})
         assert updated_doc is not None
+        await search_index.reindex(self._db, SEARCH_ENTITY.name, [item_id])
 
         await self._emit_event(
             item_id=item_id,
@@ -329,6 +428,7 @@ class PurchaseItemService:
                 }
             },
         )
+        await search_index.reindex(self._db, SEARCH_ENTITY.name, [item_id])
 
         await self._emit_event(
             item_id=item_id,
@@ -14,12 +14,32 @@ from typing import Any, Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from src.core import search as search_index
+from src.core.search import (
+    SearchEntity,
+    SearchHit,
+    SearchPage,
+    register_search_entity,
+)
+
 from ..models.vendor import VendorCreate, VendorResponse, VendorUpdate
 
 logger = logging.getLogger(__name__)
 
 _COLLECTION = "vendors"
 
+SEARCH_ENTITY = register_search_entity(
+    SearchEntity(
+        name="vendors",
+        collection=_COLLECTION,
+        id_field="vendorId",
+        fields=("name", "vendorCode", "contactName", "trn"),
+        scope_field="organizationId",
+        filter_fields=("isActive",),
+        include=lambda doc: doc.get("deletedAt") is None,
+    )
+)
+
 
 def _next_vendor_code(existing_count: int) -> str:
     """
@@ -108,13 +128,37 @@ class VendorService:
             organization_id: Filter vendors to this org.
             page: Page number (1-based).
             per_page: Items per page.
-            search: Optional substring match on name or vendorCode.
+            search: Optional substring match on name or vendorCode (ranked,
+                typo-tolerant match on name, code, contact and TRN when the
+                search index is enabled for vendors; total is then an
+                estimate).
             is_active: Filter by active status if supplied.
 
         Returns:
             Dict with 'items' (list of VendorResponse), 'total', 'page',
             'perPage', 'totalPages'.
         """
+        offset = (page - 1) * per_page
+        if search and await search_index.use_search_index(self._db, SEARCH_ENTITY.name):
+            result = await search_index.search(
+                self._db,
+                SEARCH_ENTITY.name,
+                search,
+                scope=organization_id,
+                filters={"isActive": is_active},
+                limit=per_page,
+                skip=offset,
+            )
+            docs = await search_index.fetch_hits(self._db, SEARCH_ENTITY.name, result)
+            total = result.estimated_total
+            return {
+                "items": [_doc_to_response(d) for d in docs],
+                "total": total,
+                "page": page,
+                "perPage": per_page,
+                "totalPages": max(1, -(-total // per_page)),
+            }
+
         # Reason: only return non-deleted vendors by default
         query: Dict[str, Any] = {
             "organizationId": organization_id,
@@ -130,7 +174,6 @@ class VendorService:
             ]
 
         total = await self._col.count_documents(query)
-        offset = (page - 1) * per_page
         cursor = (
             self._col.find(query).sort("vendorCode", 1).skip(offset).limit(per_page)
         )
@@ -144,6 +187,54 @@ class VendorService:
             "totalPages": max(1, -(-total // per_page)),
         }
 
+    async def autocomplete_vendors(
+        self,
+        organization_id: str,
+        prefix: str,
+        *,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ) -> SearchPage:
+        """
+        Suggest vendors whose name, code, contact or TRN words start with
+        each word of ``prefix``.
+
+        Before the search index is enabled for vendors this falls back to the
+        first page of ``list_vendors`` (no cursor).
+
+        Args:
+            organization_id: Scope suggestions to this org.
+            prefix: What the user typed so far.
+            limit: Maximum number of suggestions.
+            cursor: nextCursor of the previous page.
+            is_active: Filter by active status if supplied.
+
+        Returns:
+            SearchPage of suggestions.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        if await search_index.use_search_index(self._db, SEARCH_ENTITY.name):
+            return await search_index.autocomplete(
+                self._db,
+                SEARCH_ENTITY.name,
+                prefix,
+                scope=organization_id,
+                filters={"isActive": is_active},
+                limit=limit,
+                cursor=cursor,
+            )
+
+        result = await self.list_vendors(
+            organization_id, per_page=limit, search=prefix, is_active=is_active
+        )
+        return SearchPage(
+            hits=[SearchHit(v.vendorId, v.name, 1.0) for v in result["items"]],
+            estimated_total=result["total"],
+        )
+
     async def get_vendor(
         self, organization_id: str, vendor_id: str
     ) -> Optional[VendorResponse]:
@@ -236,6 +327,7 @@ class VendorService:
         }
 
         await self._col.insert_one(doc)
+        await search_index.reindex(self._db, SEARCH_ENTITY.name, [vendor_id])
 
         # Emit outbox event (best-effort)
         await self._emit_event(
@@ -305,6 +397,7 @@ class VendorService:
 
         updated_doc = await self._col.find_one({"vendorId": vendor_id})
         assert updated_doc is not None
+        await search_index.reindex(self._db, SEARCH_ENTITY.name, [vendor_id])
 
         # Emit outbox event (best-effort)
         await self._emit_event(
@@ -362,6 +455,7 @@ class VendorService:
                 }
             },
         )
+        await search_index.reindex(self._db, SEARCH_ENTITY.name, [vendor_id])
 
         # Emit soft-delete outbox event (best-effort)
         await self._emit_event(
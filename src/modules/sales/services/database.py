@@ -9,6 +9,7 @@ import logging
 
 # Import shared database manager from core
 from src.services.database import mongodb
+from src.core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +40,9 @@ class SalesDatabaseManager:
             logger.info("[Sales Module] Initializing Sales indexes...")
 
             # The core MongoDB manager already connected in main.py startup
-            # We just need to create our module-specific indexes
-            await cls._create_indexes()
+            # We just need to declare our module-specific indexes; they are
+            # reconciled against the database once per boot (src.core.indexes)
+            cls._declare_indexes()
 
             logger.info("[Sales Module] Sales indexes initialized")
 
@@ -49,27 +51,25 @@ class SalesDatabaseManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for Sales collections"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for Sales collections"""
         try:
-            # Get shared database instance from core
-            db = mongodb.get_database()
-
             # Sales Orders collection
-            await db.sales_orders.create_index("orderId", unique=True)
-            await db.sales_orders.create_index("orderCode", unique=True)
-            await db.sales_orders.create_index("customerId")
-            await db.sales_orders.create_index("customerName")
-            await db.sales_orders.create_index("status")
-            await db.sales_orders.create_index("paymentStatus")
-            await db.sales_orders.create_index("orderDate")
-            await db.sales_orders.create_index("createdBy")
-            await db.sales_orders.create_index([("createdAt", -1)])
+            declare_index("sales_orders", "orderId", unique=True)
+            declare_index("sales_orders", "orderCode", unique=True)
+            declare_index("sales_orders", "customerId")
+            declare_index("sales_orders", "customerName")
+            declare_index("sales_orders", "status")
+            declare_index("sales_orders", "paymentStatus")
+            declare_index("sales_orders", "orderDate")
+            declare_index("sales_orders", "createdBy")
+            declare_index("sales_orders", [("createdAt", -1)])
             # Farming year indexes for filtering sales by year
-            await db.sales_orders.create_index("farmingYear")
-            await db.sales_orders.create_index([("customerId", 1), ("farmingYear", 1)])
+            declare_index("sales_orders", "farmingYear")
+            declare_index("sales_orders", [("customerId", 1), ("farmingYear", 1)])
             # Text search index for customer name and order code
-            await db.sales_orders.create_index(
+            declare_index(
+                "sales_orders",
                 [("customerName", "text"), ("orderCode", "text")],
                 name="sales_order_search_text",
             )
@@ -77,24 +77,25 @@ class SalesDatabaseManager:
             # Note: inventory_harvest indexes are now owned by farm_manager module.
 
             # Purchase Orders collection
-            await db.purchase_orders.create_index("purchaseOrderId", unique=True)
-            await db.purchase_orders.create_index("poCode", unique=True)
-            await db.purchase_orders.create_index("supplierId")
-            await db.purchase_orders.create_index("supplierName")
-            await db.purchase_orders.create_index("status")
-            await db.purchase_orders.create_index("orderDate")
-            await db.purchase_orders.create_index("expectedDeliveryDate")
-            await db.purchase_orders.create_index("createdBy")
-            await db.purchase_orders.create_index([("createdAt", -1)])
+            declare_index("purchase_orders", "purchaseOrderId", unique=True)
+            declare_index("purchase_orders", "poCode", unique=True)
+            declare_index("purchase_orders", "supplierId")
+            declare_index("purchase_orders", "supplierName")
+            declare_index("purchase_orders", "status")
+            declare_index("purchase_orders", "orderDate")
+            declare_index("purchase_orders", "expectedDeliveryDate")
+            declare_index("purchase_orders", "createdBy")
+            declare_index("purchase_orders", [("createdAt", -1)])
             # Text search index for supplier name and PO code
-            await db.purchase_orders.create_index(
+            declare_index(
+                "purchase_orders",
                 [("supplierName", "text"), ("poCode", "text")],
                 name="purchase_order_search_text",
             )
 
-            logger.info("[Sales Module] MongoDB indexes created successfully")
+            logger.info("[Sales Module] MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"[Sales Module] Error creating MongoDB indexes: {e}")
+            logger.error(f"[Sales Module] Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
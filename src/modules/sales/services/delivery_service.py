@@ -34,12 +34,15 @@ the commitment when it was created); however unit_cost IS re-snapshotted.
 
 Moving-average cost
 --------------------
-Unit cost is sourced from the inventory_balances collection using:
-    get_moving_avg_cost(db, item_id, warehouse_id, org_id) → Decimal
+Draft unit costs are read for all lines at once from inventory_balances
+(``_get_moving_avg_costs``).  At OPEN-transition the issues are posted to the
+inventory valuation ledger (src.core.inventory), which values them at the
+moving average at that moment; that value is the line's COGS.  Cancelling
+receives the goods back at the value they left with.
 
 If no inventory_balances record exists (item never received via GR), unit_cost
-defaults to Decimal("0.00").  This is flagged in the audit log.  Finance will
-see $0 COGS JEs until inventory is seeded — expected behavior in dev/test.
+defaults to Decimal("0.00").  This is flagged in the log.  Finance will
+see $0 COGS JEs until a GR posts — expected behavior in dev/test.
 
 Outbox event
 ------------
@@ -52,7 +55,8 @@ Collections used
   deliveries_v2              — one document per Delivery header + embedded lines
   deliveries_v2_audit        — append-only audit trail
   sales_orders_v2            — source SO collection (delivered_qty updates)
-  inventory_balances         — moving-avg cost source (read-only from this service)
+  inventory_balances         — moving-avg cost source (via src.core.inventory)
+  inventory_ledger           — valuation ledger (via src.core.inventory)
   inventory_movements        — one row per line per transition (write)
   finance_outbox             — OutboxWriter destination
 """
@@ -64,12 +68,13 @@ import uuid
 from datetime import date, datetime, timezone
 from decimal import ROUND_HALF_UP, Decimal
 from math import ceil
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from src.core.documents.doc_number import next_doc_number
 from src.core.documents.document_status import DocumentStatus, assert_legal_transition
+from src.core.inventory import StockMovement, get_balances, post_movements
 
 from ._finance_ext_client import get_item_finance_ext as _get_item_finance_ext
 
@@ -89,7 +94,6 @@ logger = logging.getLogger(__name__)
 _DN_COL = "deliveries_v2"
 _AUDIT_COL = "deliveries_v2_audit"
 _SO_COL = "sales_orders_v2"
-_INV_BAL_COL = "inventory_balances"
 _INV_MOV_COL = "inventory_movements"
 _OUTBOX_TOLERANCE = Decimal("0.0001")
 _TWOPLACES = Decimal("0.01")
@@ -132,50 +136,42 @@ def _to_dt(d: date) -> datetime:
     return datetime(d.year, d.month, d.day, 0, 0, 0, tzinfo=timezone.utc)
 
 
-async def _get_moving_avg_cost(
+async def _get_moving_avg_costs(
     db: AsyncIOMotorDatabase,
-    item_id: str,
-    warehouse_id: str,
+    pairs: List[Tuple[str, str]],
     org_id: str,
-) -> Decimal:
+) -> Dict[Tuple[str, str], Decimal]:
     """
-    Fetch the current moving-average unit cost for an item/warehouse combination.
+    Fetch the current moving-average unit cost of every item/warehouse pair.
 
-    Reads from the inventory_balances collection.  If no record exists, returns
-    Decimal("0.00") (item not yet received via GR — COGS will be $0 until seeded).
+    One query for all pairs.  Pairs with no inventory_balances record get
+    Decimal("0.00") (item not yet received via GR — COGS will be $0 until a
+    GR posts).
 
     Args:
-        db:           Motor database instance.
-        item_id:      FK to items collection.
-        warehouse_id: Warehouse the item is stored in.
-        org_id:       Organisation scope.
+        db:     Motor database instance.
+        pairs:  (item_id, warehouse_id) per line.
+        org_id: Organisation scope.
 
     Returns:
-        Moving-average unit cost as Decimal, or Decimal("0.00") if not found.
+        {(item_id, warehouse_id): moving-average unit cost}, 2 d.p.
     """
-    record = await db[_INV_BAL_COL].find_one(
-        {
-            "itemId": item_id,
-            "warehouseId": warehouse_id,
-            "organizationId": org_id,
-        }
-    )
-    if record is None:
-        logger.warning(
-            "[DeliveryService] No inventory_balances record for item=%s warehouse=%s org=%s "
-            "— using unit_cost=0.00 (COGS will be $0 until GR seeds the balance)",
-            item_id,
-            warehouse_id,
-            org_id,
-        )
-        return Decimal("0.00")
-
-    raw_cost = (
-        record.get("avgCost")
-        or record.get("avg_cost")
-        or record.get("movingAvgCost", 0)
-    )
-    return Decimal(str(raw_cost)).quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+    balances = await get_balances(db, org_id, pairs)
+    costs: Dict[Tuple[str, str], Decimal] = {}
+    for pair in pairs:
+        balance = balances.get(pair)
+        if balance is None:
+            logger.warning(
+                "[DeliveryService] No inventory_balances record for item=%s warehouse=%s org=%s "
+                "— using unit_cost=0.00 (COGS will be $0 until GR seeds the balance)",
+                pair[0],
+                pair[1],
+                org_id,
+            )
+            costs[pair] = Decimal("0.00")
+        else:
+            costs[pair] = balance.avg_cost.quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+    return costs
 
 
 def _build_line_doc(
@@ -690,16 +686,16 @@ async def create_delivery_from_so(
                 f"exceeds available open_qty={float(open_qty):.4f}"
             )
 
-    # Step 3: Fetch moving-avg unit cost per line (tentative at Draft creation).
+    # Step 3: Fetch moving-avg unit costs (tentative at Draft creation).
+    unit_costs = await _get_moving_avg_costs(
+        db, [(dl.item_id, dl.warehouse_id) for dl in payload.lines], org_id
+    )
     computed_lines: List[Dict[str, Any]] = []
     for i, dl in enumerate(payload.lines, start=1):
-        unit_cost = await _get_moving_avg_cost(
-            db, item_id=dl.item_id, warehouse_id=dl.warehouse_id, org_id=org_id
-        )
         line_doc = _build_line_doc(
             dl,
             line_number=i,
-            unit_cost=unit_cost,
+            unit_cost=unit_costs[(dl.item_id, dl.warehouse_id)],
             so_doc_entry=so_doc_entry,
             so_doc_number=so_raw.get("docNumber", ""),
         )
@@ -958,6 +954,9 @@ async def update_delivery(
         }
 
         # Build the new line set.
+        unit_costs = await _get_moving_avg_costs(
+            db, [(dl.item_id, dl.warehouse_id) for dl in payload.lines], org_id
+        )
         new_lines: List[Dict[str, Any]] = []
         for i, dl in enumerate(payload.lines, start=1):
             so_line = so_lines_map.get(dl.so_line_id)
@@ -972,13 +971,10 @@ async def update_delivery(
                     f"exceeds available open_qty={float(open_qty):.4f}"
                 )
 
-            unit_cost = await _get_moving_avg_cost(
-                db, item_id=dl.item_id, warehouse_id=dl.warehouse_id, org_id=org_id
-            )
             line_doc = _build_line_doc(
                 dl,
                 line_number=i,
-                unit_cost=unit_cost,
+                unit_cost=unit_costs[(dl.item_id, dl.warehouse_id)],
                 so_doc_entry=so_doc_entry,
                 so_doc_number=so_raw.get("docNumber", ""),
             )
@@ -1137,21 +1133,36 @@ async def transition_status(
     if current_status == DocumentStatus.DRAFT and new_status == DocumentStatus.OPEN:
         delivery_lines = raw.get("lines", [])
 
-        # Step 1: Re-snapshot unit_cost at OPEN-transition time.
+        # Step 1: Issue the goods on the valuation ledger; the moving average
+        # at this moment becomes the final unit_cost and the value issued the
+        # line's COGS.
+        posted = await post_movements(
+            db,
+            [
+                StockMovement(
+                    organization_id=org_id,
+                    item_id=ln["itemId"],
+                    warehouse_id=ln["warehouseId"],
+                    quantity=-Decimal(str(ln["quantity"])),
+                    movement_type="delivery",
+                    source_doc_type=_DOC_TYPE,
+                    source_doc_entry=doc_entry,
+                    source_doc_number=raw.get("docNumber", ""),
+                    source_line_id=ln["lineId"],
+                    posted_by=user_id,
+                )
+                for ln in delivery_lines
+            ],
+        )
         updated_lines: List[Dict[str, Any]] = []
-        for ln in delivery_lines:
-            final_cost = await _get_moving_avg_cost(
-                db,
-                item_id=ln["itemId"],
-                warehouse_id=ln["warehouseId"],
-                org_id=org_id,
+        for ln, issue in zip(delivery_lines, posted):
+            updated_ln = dict(ln)
+            updated_ln["unitCost"] = float(
+                issue.unit_cost.quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
             )
-            final_line_cogs = (Decimal(str(ln["quantity"])) * final_cost).quantize(
-                _TWOPLACES, rounding=ROUND_HALF_UP
+            updated_ln["lineCogs"] = float(
+                (-issue.value).quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
             )
-            updated_ln = dict(ln)
-            updated_ln["unitCost"] = float(final_cost)
-            updated_ln["lineCogs"] = float(final_line_cogs)
             updated_lines.append(updated_ln)
 
         final_total_cogs = sum(
@@ -1353,7 +1364,28 @@ async def transition_status(
     elif new_status == DocumentStatus.CANCELLED:
         delivery_lines = raw.get("lines", [])
 
-        # Step 1: Restore inventory — insert reversing movements (qty positive).
+        # Step 1: Restore inventory at the value it left with, then insert
+        # reversing movements (qty positive).
+        await post_movements(
+            db,
+            [
+                StockMovement(
+                    organization_id=org_id,
+                    item_id=ln["itemId"],
+                    warehouse_id=ln["warehouseId"],
+                    quantity=Decimal(str(ln["quantity"])),
+                    movement_type="delivery_reversal",
+                    unit_cost=Decimal(str(ln.get("lineCogs", 0)))
+                    / Decimal(str(ln["quantity"])),
+                    source_doc_type=_DOC_TYPE,
+                    source_doc_entry=doc_entry,
+                    source_doc_number=raw.get("docNumber", ""),
+                    source_line_id=ln["lineId"],
+                    posted_by=user_id,
+                )
+                for ln in delivery_lines
+            ],
+        )
         for ln in delivery_lines:
             restore_doc = {
                 "movementId": str(uuid.uuid4()),
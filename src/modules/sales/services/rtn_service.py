@@ -13,7 +13,8 @@ Responsibilities
 - Hard-delete a DRAFT Return.
 - Status transitions:
   - DRAFT → OPEN: the primary inventory event.
-    1. Re-snapshot unit_cost from inventory_balances (moving avg cost).
+    1. Receive the goods on the inventory valuation ledger (src.core.inventory)
+       at the moving average cost at that moment; that becomes unit_cost.
        NOTE: The unit_cost choice is CURRENT MOVING AVERAGE, not the original
        Delivery's snapshotted cost. Rationale: using current avg preserves
        correct inventory balance accounting at the time of return. The COGS
@@ -27,7 +28,7 @@ Responsibilities
     5. Emit return_posted outbox event.
     6. Audit-log.
   - OPEN → CANCELLED:
-    1. Reverse inventory restoration (negative movement).
+    1. Reverse inventory restoration (ledger issue + negative movement).
     2. Decrement source Delivery line returnedQty.
     3. Decrement RR line consumedQty (if RR was base), reopen RR if needed.
     4. Emit return_cancelled event.
@@ -39,7 +40,8 @@ Collections used
   returns_v2_audit        — append-only audit trail
   return_requests_v2      — source RR (consumedQty updates)
   deliveries_v2           — source Delivery (returnedQty updates)
-  inventory_balances      — moving-avg cost source (read-only)
+  inventory_balances      — moving-avg cost source (via src.core.inventory)
+  inventory_ledger        — valuation ledger (via src.core.inventory)
   inventory_movements     — one row per line per transition (write)
   finance_outbox          — OutboxWriter destination
 """
@@ -51,12 +53,13 @@ import uuid
 from datetime import date, datetime, timezone
 from decimal import ROUND_HALF_UP, Decimal
 from math import ceil
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from src.core.documents.doc_number import next_doc_number
 from src.core.documents.document_status import DocumentStatus, assert_legal_transition
+from src.core.inventory import StockMovement, get_balances, post_movements
 
 from ..models.returns import (
     ReturnCreate,
@@ -76,7 +79,6 @@ _RTN_COL = "returns_v2"
 _AUDIT_COL = "returns_v2_audit"
 _RR_COL = "return_requests_v2"
 _DN_COL = "deliveries_v2"
-_INV_BAL_COL = "inventory_balances"
 _INV_MOV_COL = "inventory_movements"
 _TWOPLACES = Decimal("0.01")
 _TOLERANCE = Decimal("0.0001")
@@ -132,14 +134,13 @@ def _norm_refs(refs: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     return [_norm_ref(r) for r in refs if r is not None]
 
 
-async def _get_moving_avg_cost(
+async def _get_moving_avg_costs(
     db: AsyncIOMotorDatabase,
-    item_id: str,
-    warehouse_id: str,
+    pairs: List[Tuple[str, str]],
     org_id: str,
-) -> Decimal:
+) -> Dict[Tuple[str, str], Decimal]:
     """
-    Fetch the current moving-average unit cost for an item/warehouse combination.
+    Fetch the current moving-average unit cost of every item/warehouse pair.
 
     For the Return, we use the CURRENT moving average cost (not the original
     Delivery's snapshotted cost). This is technically correct for inventory
@@ -147,37 +148,31 @@ async def _get_moving_avg_cost(
     docstring for the design rationale.
 
     Args:
-        db:           Motor database instance.
-        item_id:      FK to items collection.
-        warehouse_id: Warehouse the goods come back into.
-        org_id:       Organisation scope.
+        db:     Motor database instance.
+        pairs:  (item_id, warehouse_id) per line — the warehouse the goods
+                come back into.
+        org_id: Organisation scope.
 
     Returns:
-        Moving-average unit cost as Decimal, or Decimal("0.00") if not found.
+        {(item_id, warehouse_id): moving-average unit cost}, 2 d.p.;
+        Decimal("0.00") where no balance exists.
     """
-    record = await db[_INV_BAL_COL].find_one(
-        {
-            "itemId": item_id,
-            "warehouseId": warehouse_id,
-            "organizationId": org_id,
-        }
-    )
-    if record is None:
-        logger.warning(
-            "[ReturnService] No inventory_balances record for item=%s warehouse=%s org=%s "
-            "— using unit_cost=0.00",
-            item_id,
-            warehouse_id,
-            org_id,
-        )
-        return Decimal("0.00")
-
-    raw_cost = (
-        record.get("avgCost")
-        or record.get("avg_cost")
-        or record.get("movingAvgCost", 0)
-    )
-    return Decimal(str(raw_cost)).quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+    balances = await get_balances(db, org_id, pairs)
+    costs: Dict[Tuple[str, str], Decimal] = {}
+    for pair in pairs:
+        balance = balances.get(pair)
+        if balance is None:
+            logger.warning(
+                "[ReturnService] No inventory_balances record for item=%s warehouse=%s org=%s "
+                "— using unit_cost=0.00",
+                pair[0],
+                pair[1],
+                org_id,
+            )
+            costs[pair] = Decimal("0.00")
+        else:
+            costs[pair] = balance.avg_cost.quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+    return costs
 
 
 def _compute_line_amounts(
@@ -540,12 +535,14 @@ async def create_return_from_request(
                 )
 
     # Build lines with tentative unit_cost
+    unit_costs = await _get_moving_avg_costs(
+        db, [(rl.item_id, rl.warehouse_id) for rl in payload.lines], org_id
+    )
     computed_lines: List[Dict[str, Any]] = []
     for i, rl in enumerate(payload.lines, start=1):
-        unit_cost = await _get_moving_avg_cost(
-            db, item_id=rl.item_id, warehouse_id=rl.warehouse_id, org_id=org_id
+        line_doc = _build_line_doc(
+            rl, line_number=i, unit_cost=unit_costs[(rl.item_id, rl.warehouse_id)]
         )
-        line_doc = _build_line_doc(rl, line_number=i, unit_cost=unit_cost)
         computed_lines.append(line_doc)
 
     totals = _build_totals(computed_lines)
@@ -645,12 +642,14 @@ async def create_return_direct(
         ReturnResponse for the newly-created DRAFT Return.
     """
     # Build lines with tentative unit_cost
+    unit_costs = await _get_moving_avg_costs(
+        db, [(rl.item_id, rl.warehouse_id) for rl in payload.lines], org_id
+    )
     computed_lines: List[Dict[str, Any]] = []
     for i, rl in enumerate(payload.lines, start=1):
-        unit_cost = await _get_moving_avg_cost(
-            db, item_id=rl.item_id, warehouse_id=rl.warehouse_id, org_id=org_id
+        line_doc = _build_line_doc(
+            rl, line_number=i, unit_cost=unit_costs[(rl.item_id, rl.warehouse_id)]
         )
-        line_doc = _build_line_doc(rl, line_number=i, unit_cost=unit_cost)
         computed_lines.append(line_doc)
 
     totals = _build_totals(computed_lines)
@@ -859,12 +858,18 @@ async def update_return(
             updates[db_key] = value
 
     if payload.lines is not None:
+        unit_costs = await _get_moving_avg_costs(
+            db, [(rl.item_id, rl.warehouse_id) for rl in payload.lines], org_id
+        )
         new_lines: List[Dict[str, Any]] = []
         for i, rl in enumerate(payload.lines, start=1):
-            unit_cost = await _get_moving_avg_cost(
-                db, item_id=rl.item_id, warehouse_id=rl.warehouse_id, org_id=org_id
+            new_lines.append(
+                _build_line_doc(
+                    rl,
+                    line_number=i,
+                    unit_cost=unit_costs[(rl.item_id, rl.warehouse_id)],
+                )
             )
-            new_lines.append(_build_line_doc(rl, line_number=i, unit_cost=unit_cost))
         updates["lines"] = new_lines
         updates["totals"] = _build_totals(new_lines)
 
@@ -978,21 +983,35 @@ async def transition_status(
     if current_status == DocumentStatus.DRAFT and new_status == DocumentStatus.OPEN:
         return_lines = raw.get("lines", [])
 
-        # Step 1: Re-snapshot unit_cost at OPEN-transition time (current avg cost).
+        # Step 1: Receive the goods on the valuation ledger at the current
+        # moving average cost, which becomes the final unit_cost.
+        posted = await post_movements(
+            db,
+            [
+                StockMovement(
+                    organization_id=org_id,
+                    item_id=ln["itemId"],
+                    warehouse_id=ln["warehouseId"],
+                    quantity=Decimal(str(ln.get("returnedQty", 0))),
+                    movement_type="return",
+                    source_doc_type=_DOC_TYPE,
+                    source_doc_entry=doc_entry,
+                    source_doc_number=raw.get("docNumber", ""),
+                    source_line_id=ln["lineId"],
+                    posted_by=user_id,
+                )
+                for ln in return_lines
+            ],
+        )
         updated_lines: List[Dict[str, Any]] = []
-        for ln in return_lines:
-            final_cost = await _get_moving_avg_cost(
-                db,
-                item_id=ln["itemId"],
-                warehouse_id=ln["warehouseId"],
-                org_id=org_id,
-            )
-            final_line_cogs = (
-                Decimal(str(ln.get("returnedQty", 0))) * final_cost
-            ).quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+        for ln, receipt in zip(return_lines, posted):
             updated_ln = dict(ln)
-            updated_ln["unitCost"] = float(final_cost)
-            updated_ln["lineCogs"] = float(final_line_cogs)
+            updated_ln["unitCost"] = float(
+                receipt.unit_cost.quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+            )
+            updated_ln["lineCogs"] = float(
+                receipt.value.quantize(_TWOPLACES, rounding=ROUND_HALF_UP)
+            )
             updated_lines.append(updated_ln)
 
         # Step 2: Restore inventory — insert inventory_movements rows (qty positive).
@@ -1210,7 +1229,26 @@ async def transition_status(
     elif new_status == DocumentStatus.CANCELLED:
         return_lines = raw.get("lines", [])
 
-        # Step 1: Reverse inventory — insert negative movements.
+        # Step 1: Reverse inventory — issue the goods again on the valuation
+        # ledger, then insert negative movements.
+        await post_movements(
+            db,
+            [
+                StockMovement(
+                    organization_id=org_id,
+                    item_id=ln["itemId"],
+                    warehouse_id=ln["warehouseId"],
+                    quantity=-Decimal(str(ln.get("returnedQty", 0))),
+                    movement_type="return_reversal",
+                    source_doc_type=_DOC_TYPE,
+                    source_doc_entry=doc_entry,
+                    source_doc_number=raw.get("docNumber", ""),
+                    source_line_id=ln["lineId"],
+                    posted_by=user_id,
+                )
+                for ln in return_lines
+            ],
+        )
         for ln in return_lines:
             reversal_doc = {
                 "movementId": str(uuid.uuid4()),
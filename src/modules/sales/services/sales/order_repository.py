@@ -17,6 +17,7 @@ from ...models.sales_order import (
     SalesOrderStatus,
 )
 from ..database import sales_db
+from src.core.finance.pnl_dirty import mark_pnl_months_dirty
 from src.modules.farm_manager.models.farming_year_config import (
     get_farming_year,
     DEFAULT_FARMING_YEAR_START_MONTH,
@@ -175,6 +176,9 @@ class OrderRepository:
                     alloc["farmId"] = str(alloc["farmId"])
 
         await collection.insert_one(order_doc)
+        await mark_pnl_months_dirty(
+            sales_db.get_database(), [order_doc.get("orderDate")]
+        )
 
         logger.info(f"Created sales order: {order.orderId} with code {order_code}")
         return order
@@ -287,11 +291,19 @@ class OrderRepository:
 
         update_dict["updatedAt"] = datetime.utcnow()
 
-        result = await collection.update_one(
-            {"orderId": str(order_id)}, {"$set": update_dict}
+        # Reason: read the pre-update orderDate so a re-dated order refreshes
+        # the P&L facts of the month it left as well as the one it joined.
+        previous = await collection.find_one_and_update(
+            {"orderId": str(order_id)},
+            {"$set": update_dict},
+            projection={"orderDate": 1},
         )
 
-        if result.modified_count > 0:
+        if previous is not None:
+            await mark_pnl_months_dirty(
+                sales_db.get_database(),
+                [previous.get("orderDate"), update_dict.get("orderDate")],
+            )
             logger.info(f"Updated sales order: {order_id}")
             return await self.get_by_id(order_id)
 
@@ -335,9 +347,14 @@ class OrderRepository:
         """
         collection = self._get_collection()
 
-        result = await collection.delete_one({"orderId": str(order_id)})
+        deleted = await collection.find_one_and_delete(
+            {"orderId": str(order_id)}, projection={"orderDate": 1}
+        )
 
-        if result.deleted_count > 0:
+        if deleted is not None:
+            await mark_pnl_months_dirty(
+                sales_db.get_database(), [deleted.get("orderDate")]
+            )
             logger.info(f"Deleted sales order: {order_id}")
             return True
 
@@ -12,16 +12,20 @@ Phase 4 additions:
   - Allocation-aware release on CANCELLED transition
   - Two-step delete: preview + confirm with per-batch decisions
   - Report Return: creates inventory_returned (sellable) or inventory_waste (spoiled)
+  - Reserve / release / deduct as guarded $inc bulk writes (stock_reservation),
+    with FEFO batch picking for lines that name no batch
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
 from fastapi import HTTPException, status
+from pymongo import ReturnDocument
 import logging
 
 from ...models.sales_order import (
     SalesOrder,
+    OrderItemAllocation,
     SalesOrderCreate,
     SalesOrderUpdate,
     SalesOrderStatus,
@@ -35,6 +39,16 @@ from ...models.sales_order import (
     ReportReturnStockChanges,
 )
 from .order_repository import OrderRepository
+from .stock_reservation import (
+    COLLECTIONS,
+    DEDUCT,
+    RELEASE,
+    RowKey,
+    StockLeg,
+    StockShortfall,
+    apply_stock_action,
+    reserve_fefo,
+)
 from ..database import sales_db
 from src.core.cache import get_redis_cache
 from src.modules.farm_manager.services.database import farm_db
@@ -97,18 +111,7 @@ async def _lookup_source_row(
     return None
 
 
-async def _update_source_row(
-    db, inventory_source: str, inventory_id: str, update: dict
-) -> None:
-    """Apply a $set update to the correct inventory collection."""
-    collection = (
-        db.inventory_harvest if inventory_source == "harvest" else db.inventory_returned
-    )
-    await collection.update_one({"inventoryId": inventory_id}, {"$set": update})
-
-
-async def _write_movement(
-    db,
+def _movement_doc(
     *,
     inventory_id: str,
     inventory_source: str,
@@ -120,12 +123,11 @@ async def _write_movement(
     reference_id: str,
     reason: str,
     performed_by: str,
-) -> None:
+) -> dict:
     """
-    Insert an inventory_movements audit record.
+    Build an inventory_movements audit record.
 
     Args:
-        db: Motor database instance.
         inventory_id: Source inventory row UUID string.
         inventory_source: 'harvest' or 'returned'.
         movement_type: MovementType enum value.
@@ -138,7 +140,7 @@ async def _write_movement(
         performed_by: User UUID string.
     """
     inventory_type_str = "harvest" if inventory_source == "harvest" else "returned"
-    doc = {
+    return {
         "movementId": str(uuid4()),
         "inventoryId": inventory_id,
         "inventoryType": inventory_type_str,
@@ -152,7 +154,82 @@ async def _write_movement(
         "performedBy": performed_by,
         "performedAt": _now_iso(),
     }
-    await db.inventory_movements.insert_one(doc)
+
+
+async def _write_movement(db, **fields) -> None:
+    """Insert one inventory_movements audit record (see _movement_doc)."""
+    await db.inventory_movements.insert_one(_movement_doc(**fields))
+
+
+async def _write_leg_movements(
+    db,
+    legs: List[StockLeg],
+    rows: Dict[RowKey, dict],
+    *,
+    field: str,
+    sign: int,
+    movement_type: MovementType,
+    reference_id: str,
+    reason: str,
+    performed_by: str,
+) -> None:
+    """
+    One audit record per leg, all inserted with a single insert_many.
+
+    ``rows`` are the rows after the stock action; before/after of each leg
+    are derived from them backwards, so several legs on one row chain.
+    """
+    running = {key: row.get(field, 0) for key, row in rows.items()}
+    docs = []
+    for leg in reversed(legs):
+        row = rows.get(leg.key)
+        if row is None:
+            continue
+        qty_after = running[leg.key]
+        qty_before = qty_after - sign * leg.quantity
+        running[leg.key] = qty_before
+        docs.append(
+            _movement_doc(
+                inventory_id=leg.inventory_id,
+                inventory_source=leg.source,
+                movement_type=movement_type,
+                qty_before=qty_before,
+                qty_change=sign * leg.quantity,
+                qty_after=qty_after,
+                organization_id=row.get("organizationId", ""),
+                reference_id=reference_id,
+                reason=reason,
+                performed_by=performed_by,
+            )
+        )
+    if docs:
+        await db.inventory_movements.insert_many(list(reversed(docs)))
+
+
+def _order_legs(order: SalesOrder) -> List[StockLeg]:
+    """
+    Stock legs of every line that names its batches.
+
+    Lines with per-batch allocations contribute one leg per allocation;
+    pre-Phase-4 lines with only item.inventoryId one harvest leg.
+    """
+    legs: List[StockLeg] = []
+    for item_idx, item in enumerate(order.items):
+        if item.allocations:
+            legs.extend(
+                StockLeg(
+                    alloc.inventorySource,
+                    str(alloc.inventoryId),
+                    alloc.quantity,
+                    item_idx,
+                )
+                for alloc in item.allocations
+            )
+        elif item.inventoryId:
+            legs.append(
+                StockLeg("harvest", str(item.inventoryId), item.quantity, item_idx)
+            )
+    return legs
 
 
 class OrderService:
@@ -162,20 +239,22 @@ class OrderService:
         self.repository = OrderRepository()
 
     # -----------------------------------------------------------------------
-    # Phase 4 — Allocation-aware reservation
+    # Phase 4 — Allocation-aware reservation (stock_reservation engine)
     # -----------------------------------------------------------------------
 
     async def _reserve_allocations(self, order: SalesOrder, performed_by: str) -> None:
         """
-        Reserve inventory against every OrderItemAllocation on a confirmed order.
+        Reserve inventory for every line of a confirmed order, all or nothing.
 
-        Skips items with an empty allocations list (legacy orders without the
-        linked-stock flow).  Raises 422 immediately if any allocation fails
-        validation.  On partial success (mid-loop DB error), attempts best-effort
-        rollback and raises 500.
+        Lines with allocations reserve those batches; legacy lines with only
+        item.inventoryId reserve that harvest row; lines with neither are
+        allocated FEFO (soonest expiry first) from the organisation's
+        sellable stock of that product and grade, and the chosen batches are
+        stored on the order as its allocations.
 
-        Limitation: without MongoDB transactions, rollback is best-effort.
-        The inventory_movements audit log can be used to reconstruct state.
+        Every row is reserved with a guarded ``$inc`` in one bulk write (see
+        stock_reservation), so concurrent orders cannot oversell a batch and
+        a failure leaves nothing reserved.
 
         Args:
             order: The fully-built SalesOrder object (not yet inserted / just inserted).
@@ -183,252 +262,156 @@ class OrderService:
 
         Raises:
             HTTPException 422: If a batch row is missing or has insufficient stock.
-            HTTPException 500: If a DB error occurs mid-walk (rollback attempted).
         """
         db = farm_db.get_database()
-        processed: list[tuple[str, str, float]] = []  # (source, id, qty) for rollback
-
-        for item_idx, item in enumerate(order.items):
-            if not item.allocations:
-                # Reason: legacy order or draft order — no per-batch allocation data
-                continue
-
-            for alloc in item.allocations:
-                inv_id = str(alloc.inventoryId)
-                source = alloc.inventorySource
-
-                row = await _lookup_source_row(db, source, inv_id)
-
-                # --- Validation ---
-                if row is None:
-                    raise HTTPException(
-                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                        detail=(
-                            f"Line item {item_idx}: inventory row not found "
-                            f"(source={source}, id={inv_id})"
-                        ),
-                    )
-
-                available = row.get("availableQuantity", 0)
-                if alloc.quantity > available:
-                    raise HTTPException(
-                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                        detail=(
-                            f"Line item {item_idx}: insufficient stock for "
-                            f"'{item.productName}' batch {inv_id}. "
-                            f"Available: {available:.2f}, requested: {alloc.quantity:.2f}."
-                        ),
-                    )
+        explicit = _order_legs(order)
+        fefo_lines = [
+            {
+                "organization_id": order.organizationId,
+                "plant_name": item.productName,
+                "quantity": item.quantity,
+                "quality_grade": item.qualityGrade,
+                "line_index": item_idx,
+            }
+            for item_idx, item in enumerate(order.items)
+            if not item.allocations and not item.inventoryId and order.organizationId
+        ]
 
-                # --- Execute reservation ---
-                old_available = available
-                old_reserved = row.get("reservedQuantity", 0)
-                new_available = old_available - alloc.quantity
-                new_reserved = old_reserved + alloc.quantity
-
-                try:
-                    await _update_source_row(
-                        db,
-                        source,
-                        inv_id,
-                        {
-                            "availableQuantity": new_available,
-                            "reservedQuantity": new_reserved,
-                            "updatedAt": _now_iso(),
-                        },
-                    )
-                    await _write_movement(
-                        db,
-                        inventory_id=inv_id,
-                        inventory_source=source,
-                        movement_type=MovementType.RESERVATION,
-                        qty_before=old_available,
-                        qty_change=-alloc.quantity,
-                        qty_after=new_available,
-                        organization_id=row.get("organizationId", ""),
-                        reference_id=str(order.orderId),
-                        reason=f"Reserved for order {order.orderCode}",
-                        performed_by=performed_by,
-                    )
-                    processed.append((source, inv_id, alloc.quantity))
-                    logger.info(
-                        "Reserved %.2f from %s/%s for order %s",
-                        alloc.quantity,
-                        source,
-                        inv_id,
-                        order.orderId,
-                    )
-                except Exception as exc:
-                    logger.error(
-                        "Reservation mid-walk failure for %s/%s: %s",
-                        source,
-                        inv_id,
-                        exc,
-                    )
-                    # Best-effort rollback of successfully processed allocations
-                    await self._rollback_reservations(
-                        db, processed, str(order.orderId), performed_by
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=(
-                            f"Reservation failed mid-walk at line item {item_idx} / batch {inv_id}. "
-                            "Partial rollback attempted. Check inventory_movements for audit trail."
-                        ),
-                    ) from exc
+        try:
+            planned, rows = await reserve_fefo(db, fefo_lines, explicit)
+        except StockShortfall as exc:
+            leg, row = exc.legs[0]
+            item = order.items[leg.line_index]
+            if row is None:
+                detail = (
+                    f"Line item {leg.line_index}: inventory row not found "
+                    f"(source={leg.source}, id={leg.inventory_id})"
+                )
+            else:
+                detail = (
+                    f"Line item {leg.line_index}: insufficient stock for "
+                    f"'{item.productName}'"
+                    + ("" if "inventoryId" not in row else f" batch {leg.inventory_id}")
+                    + f". Available: {row.get('availableQuantity', 0):.2f}, "
+                    f"requested: {leg.quantity:.2f}."
+                )
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
+            ) from exc
+
+        if planned:
+            await self._store_fefo_allocations(order, planned)
+        legs = explicit + [leg for leg, _ in planned]
+        await _write_leg_movements(
+            db,
+            legs,
+            rows,
+            field="availableQuantity",
+            sign=-1,
+            movement_type=MovementType.RESERVATION,
+            reference_id=str(order.orderId),
+            reason=f"Reserved for order {order.orderCode}",
+            performed_by=performed_by,
+        )
+        logger.info(
+            "Reserved %d batch(es) for order %s (%d FEFO)",
+            len(legs),
+            order.orderId,
+            len(planned),
+        )
 
-    async def _rollback_reservations(
-        self,
-        db,
-        processed: list,
-        order_id: str,
-        performed_by: str,
+    async def _store_fefo_allocations(
+        self, order: SalesOrder, planned: List[Tuple[StockLeg, dict]]
     ) -> None:
+        """Record FEFO-picked batches as the allocations of their lines."""
+        by_line: Dict[int, List[OrderItemAllocation]] = {}
+        for leg, row in planned:
+            by_line.setdefault(leg.line_index, []).append(
+                OrderItemAllocation(
+                    inventorySource=leg.source,
+                    inventoryId=UUID(leg.inventory_id),
+                    farmId=row.get("farmId"),
+                    farmName=row.get("farmName"),
+                    quantity=leg.quantity,
+                )
+            )
+        for item_idx, allocations in by_line.items():
+            order.items[item_idx].allocations = allocations
+        collection = sales_db.get_collection("sales_orders")
+        await collection.update_one(
+            {"orderId": str(order.orderId)},
+            {
+                "$set": {
+                    f"items.{item_idx}.allocations": [
+                        a.model_dump(mode="json") for a in allocations
+                    ]
+                    for item_idx, allocations in by_line.items()
+                }
+            },
+        )
+
+    async def _release_legs(
+        self, legs: List[StockLeg], order_ref: str
+    ) -> Dict[RowKey, dict]:
         """
-        Reverse already-applied reservations after a mid-walk failure.
+        Release reservations, skipping rows whose reservation is already gone.
 
-        Args:
-            db: Motor database instance.
-            processed: List of (source, inv_id, qty) tuples processed before the failure.
-            order_id: Order UUID string for audit records.
-            performed_by: User UUID string.
+        Rows that are missing or hold less reservedQuantity than the leg
+        (released before, or edited by hand) are logged and left alone; the
+        others are released in one bulk write.
         """
-        for source, inv_id, qty in processed:
-            try:
-                row = await _lookup_source_row(db, source, inv_id)
-                if row is None:
-                    continue
-                old_available = row.get("availableQuantity", 0)
-                old_reserved = row.get("reservedQuantity", 0)
-                await _update_source_row(
-                    db,
-                    source,
-                    inv_id,
-                    {
-                        "availableQuantity": old_available + qty,
-                        "reservedQuantity": max(0, old_reserved - qty),
-                        "updatedAt": _now_iso(),
-                    },
-                )
-                await _write_movement(
-                    db,
-                    inventory_id=inv_id,
-                    inventory_source=source,
-                    movement_type=MovementType.RESTORATION,
-                    qty_before=old_available,
-                    qty_change=qty,
-                    qty_after=old_available + qty,
-                    organization_id=row.get("organizationId", ""),
-                    reference_id=order_id,
-                    reason=f"Rollback: reservation failed for order {order_id}",
-                    performed_by=performed_by,
+        db = farm_db.get_database()
+        try:
+            return await apply_stock_action(db, RELEASE, legs)
+        except StockShortfall as exc:
+            skipped = {leg.key for leg, _ in exc.legs}
+            for leg, row in exc.legs:
+                logger.warning(
+                    "Release: %s/%s for order %s has %s reserved, expected %.2f — skipped",
+                    leg.source,
+                    leg.inventory_id,
+                    order_ref,
+                    "no row" if row is None else row.get("reservedQuantity", 0),
+                    leg.quantity,
                 )
-            except Exception as exc:
-                logger.error("Rollback failed for %s/%s: %s", source, inv_id, exc)
+            return await apply_stock_action(
+                db, RELEASE, [leg for leg in legs if leg.key not in skipped]
+            )
 
     async def _release_allocations(self, order: SalesOrder, performed_by: str) -> None:
         """
-        Release (restore) all allocation reservations — used on CANCELLED transition
-        and on delete-confirm for active batches.
+        Release (restore) all reservations of an order — used on CANCELLED
+        transition.
 
-        Falls back to legacy item.inventoryId for orders without allocations.
+        Covers allocation lines and legacy item.inventoryId lines alike, in
+        one guarded bulk write.
 
         Args:
             order: The order whose reservations should be released.
             performed_by: User UUID string for audit records.
         """
-        db = farm_db.get_database()
-
-        for item in order.items:
-            if item.allocations:
-                for alloc in item.allocations:
-                    inv_id = str(alloc.inventoryId)
-                    source = alloc.inventorySource
-                    row = await _lookup_source_row(db, source, inv_id)
-                    if row is None:
-                        logger.warning(
-                            "Release: row %s/%s not found for order %s",
-                            source,
-                            inv_id,
-                            order.orderId,
-                        )
-                        continue
-
-                    old_available = row.get("availableQuantity", 0)
-                    old_reserved = row.get("reservedQuantity", 0)
-                    new_available = old_available + alloc.quantity
-                    new_reserved = max(0, old_reserved - alloc.quantity)
-
-                    await _update_source_row(
-                        db,
-                        source,
-                        inv_id,
-                        {
-                            "availableQuantity": new_available,
-                            "reservedQuantity": new_reserved,
-                            "updatedAt": _now_iso(),
-                        },
-                    )
-                    await _write_movement(
-                        db,
-                        inventory_id=inv_id,
-                        inventory_source=source,
-                        movement_type=MovementType.RESTORATION,
-                        qty_before=old_available,
-                        qty_change=alloc.quantity,
-                        qty_after=new_available,
-                        organization_id=row.get("organizationId", ""),
-                        reference_id=str(order.orderId),
-                        reason=f"Released reservation for cancelled order {order.orderCode}",
-                        performed_by=performed_by,
-                    )
-                    logger.info(
-                        "Released %.2f from %s/%s for order %s",
-                        alloc.quantity,
-                        source,
-                        inv_id,
-                        order.orderId,
-                    )
-            elif item.inventoryId:
-                # Legacy path — inventory_harvest only
-                inv_id = str(item.inventoryId)
-                row = await db.inventory_harvest.find_one({"inventoryId": inv_id})
-                if row is None:
-                    continue
-                old_available = row.get("availableQuantity", 0)
-                old_reserved = row.get("reservedQuantity", 0)
-                new_reserved = max(0, old_reserved - item.quantity)
-                new_available = old_available + item.quantity
-                await db.inventory_harvest.update_one(
-                    {"inventoryId": inv_id},
-                    {
-                        "$set": {
-                            "availableQuantity": new_available,
-                            "reservedQuantity": new_reserved,
-                            "updatedAt": _now_iso(),
-                        }
-                    },
-                )
-                await _write_movement(
-                    db,
-                    inventory_id=inv_id,
-                    inventory_source="harvest",
-                    movement_type=MovementType.RESTORATION,
-                    qty_before=old_available,
-                    qty_change=item.quantity,
-                    qty_after=new_available,
-                    organization_id=row.get("organizationId", ""),
-                    reference_id=str(order.orderId),
-                    reason=f"Released reservation for cancelled order {order.orderCode}",
-                    performed_by=performed_by,
-                )
+        legs = _order_legs(order)
+        rows = await self._release_legs(legs, str(order.orderId))
+        await _write_leg_movements(
+            farm_db.get_database(),
+            [leg for leg in legs if leg.key in rows],
+            rows,
+            field="availableQuantity",
+            sign=1,
+            movement_type=MovementType.RESTORATION,
+            reference_id=str(order.orderId),
+            reason=f"Released reservation for cancelled order {order.orderCode}",
+            performed_by=performed_by,
+        )
+        logger.info("Released %d batch(es) for order %s", len(rows), order.orderId)
 
     async def _deduct_allocations(self, order: SalesOrder, performed_by: str) -> None:
         """
         Physically deduct allocated quantities from inventory when order ships.
 
-        Validates that neither quantity nor reservedQuantity would go negative.
-        Raises 409 if validation fails.
+        Every row is deducted with a guarded ``$inc`` (quantity and
+        reservedQuantity must cover the leg) in one bulk write; if any row
+        falls short nothing is deducted.
 
         Args:
             order: The order transitioning to SHIPPED.
@@ -438,230 +421,50 @@ class OrderService:
             HTTPException 409: If deduction would push any value negative.
         """
         db = farm_db.get_database()
-
-        for item_idx, item in enumerate(order.items):
-            if item.allocations:
-                for alloc in item.allocations:
-                    inv_id = str(alloc.inventoryId)
-                    source = alloc.inventorySource
-                    row = await _lookup_source_row(db, source, inv_id)
-                    if row is None:
-                        logger.warning(
-                            "Deduct: row %s/%s not found for order %s",
-                            source,
-                            inv_id,
-                            order.orderId,
-                        )
-                        continue
-
-                    current_qty = row.get("quantity", 0)
-                    current_reserved = row.get("reservedQuantity", 0)
-
-                    if current_qty - alloc.quantity < 0:
-                        raise HTTPException(
-                            status_code=status.HTTP_409_CONFLICT,
-                            detail=(
-                                f"Line item {item_idx}: deduction of {alloc.quantity:.2f} from "
-                                f"batch {inv_id} would result in negative quantity "
-                                f"(current: {current_qty:.2f})."
-                            ),
-                        )
-                    if current_reserved - alloc.quantity < 0:
-                        raise HTTPException(
-                            status_code=status.HTTP_409_CONFLICT,
-                            detail=(
-                                f"Line item {item_idx}: deduction of {alloc.quantity:.2f} from "
-                                f"batch {inv_id} would result in negative reservedQuantity "
-                                f"(current: {current_reserved:.2f})."
-                            ),
-                        )
-
-                    new_qty = current_qty - alloc.quantity
-                    new_reserved = current_reserved - alloc.quantity
-                    new_available = row.get(
-                        "availableQuantity", 0
-                    )  # available unchanged — it was already reduced on reservation
-
-                    await _update_source_row(
-                        db,
-                        source,
-                        inv_id,
-                        {
-                            "quantity": new_qty,
-                            "reservedQuantity": new_reserved,
-                            "updatedAt": _now_iso(),
-                        },
-                    )
-                    await _write_movement(
-                        db,
-                        inventory_id=inv_id,
-                        inventory_source=source,
-                        movement_type=MovementType.SHIPMENT,
-                        qty_before=current_qty,
-                        qty_change=-alloc.quantity,
-                        qty_after=new_qty,
-                        organization_id=row.get("organizationId", ""),
-                        reference_id=str(order.orderId),
-                        reason=f"Shipped — order {order.orderCode}",
-                        performed_by=performed_by,
-                    )
-                    logger.info(
-                        "Deducted %.2f from %s/%s for shipped order %s",
-                        alloc.quantity,
-                        source,
-                        inv_id,
-                        order.orderId,
-                    )
-            elif item.inventoryId:
-                # Legacy path — inventory_harvest only
-                inv_id = str(item.inventoryId)
-                row = await db.inventory_harvest.find_one({"inventoryId": inv_id})
-                if row is None:
-                    continue
-                current_qty = row.get("quantity", 0)
-                current_reserved = row.get("reservedQuantity", 0)
-                new_qty = max(0, current_qty - item.quantity)
-                new_reserved = max(0, current_reserved - item.quantity)
-                await db.inventory_harvest.update_one(
-                    {"inventoryId": inv_id},
-                    {
-                        "$set": {
-                            "quantity": new_qty,
-                            "reservedQuantity": new_reserved,
-                            "updatedAt": _now_iso(),
-                        }
-                    },
+        legs = _order_legs(order)
+        try:
+            rows = await apply_stock_action(db, DEDUCT, legs)
+        except StockShortfall as exc:
+            leg, row = exc.legs[0]
+            if row is None:
+                detail = (
+                    f"Line item {leg.line_index}: batch {leg.inventory_id} "
+                    f"({leg.source}) not found."
                 )
-                await _write_movement(
-                    db,
-                    inventory_id=inv_id,
-                    inventory_source="harvest",
-                    movement_type=MovementType.SHIPMENT,
-                    qty_before=current_qty,
-                    qty_change=-item.quantity,
-                    qty_after=new_qty,
-                    organization_id=row.get("organizationId", ""),
-                    reference_id=str(order.orderId),
-                    reason=f"Shipped — order {order.orderCode}",
-                    performed_by=performed_by,
+            else:
+                field = (
+                    "quantity"
+                    if row.get("quantity", 0) < leg.quantity
+                    else "reservedQuantity"
+                )
+                detail = (
+                    f"Line item {leg.line_index}: deduction of {leg.quantity:.2f} from "
+                    f"batch {leg.inventory_id} would result in negative {field} "
+                    f"(current: {row.get(field, 0):.2f})."
                 )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=detail
+            ) from exc
+
+        await _write_leg_movements(
+            db,
+            legs,
+            rows,
+            field="quantity",
+            sign=-1,
+            movement_type=MovementType.SHIPMENT,
+            reference_id=str(order.orderId),
+            reason=f"Shipped — order {order.orderCode}",
+            performed_by=performed_by,
+        )
+        logger.info(
+            "Deducted %d batch(es) for shipped order %s", len(legs), order.orderId
+        )
 
     # -----------------------------------------------------------------------
     # Legacy helpers (kept for backward compatibility with non-allocation orders)
     # -----------------------------------------------------------------------
 
-    async def _reserve_inventory_for_order(self, order: SalesOrder) -> None:
-        """
-        Legacy reservation path — uses item.inventoryId (pre-Phase-4 orders).
-
-        Only called by confirm_order for orders that have no allocations at all
-        on any item.  New orders use _reserve_allocations.
-
-        Args:
-            order: The sales order to reserve inventory for.
-        """
-        db = farm_db.get_database()
-
-        for item in order.items:
-            if not item.inventoryId:
-                continue
-
-            inventory_item = await db.inventory_harvest.find_one(
-                {"inventoryId": str(item.inventoryId)}
-            )
-            if not inventory_item:
-                logger.warning(
-                    f"Inventory item {item.inventoryId} not found for order {order.orderId}"
-                )
-                continue
-
-            available = inventory_item.get("availableQuantity", 0)
-            if item.quantity > available:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient inventory for {item.productName}. Available: {available}, Requested: {item.quantity}",
-                )
-
-            current_reserved = inventory_item.get("reservedQuantity", 0)
-            new_reserved = current_reserved + item.quantity
-            new_available = available - item.quantity
-
-            await db.inventory_harvest.update_one(
-                {"inventoryId": str(item.inventoryId)},
-                {
-                    "$set": {
-                        "reservedQuantity": new_reserved,
-                        "availableQuantity": new_available,
-                        "updatedAt": _now_iso(),
-                    }
-                },
-            )
-
-            movement = InventoryMovement(
-                movementId=uuid4(),
-                inventoryId=item.inventoryId,
-                inventoryType=InventoryType.HARVEST,
-                movementType=MovementType.RESERVATION,
-                quantityBefore=inventory_item.get("quantity", 0),
-                quantityChange=0,
-                quantityAfter=inventory_item.get("quantity", 0),
-                organizationId=UUID(inventory_item.get("organizationId")),
-                reason=f"Reserved for order {order.orderCode}",
-                referenceId=str(order.orderId),
-                performedBy=order.createdBy,
-                performedAt=datetime.utcnow(),
-            )
-            await db.inventory_movements.insert_one(movement.model_dump(mode="json"))
-
-    async def _release_inventory_reservation(self, order: SalesOrder) -> None:
-        """
-        Legacy release path — uses item.inventoryId (pre-Phase-4 orders).
-        Kept to support old confirm_order path.
-        """
-        db = farm_db.get_database()
-
-        for item in order.items:
-            if not item.inventoryId:
-                continue
-
-            inventory_item = await db.inventory_harvest.find_one(
-                {"inventoryId": str(item.inventoryId)}
-            )
-            if not inventory_item:
-                continue
-
-            current_reserved = inventory_item.get("reservedQuantity", 0)
-            current_available = inventory_item.get("availableQuantity", 0)
-            new_reserved = max(0, current_reserved - item.quantity)
-            new_available = current_available + item.quantity
-
-            await db.inventory_harvest.update_one(
-                {"inventoryId": str(item.inventoryId)},
-                {
-                    "$set": {
-                        "reservedQuantity": new_reserved,
-                        "availableQuantity": new_available,
-                        "updatedAt": _now_iso(),
-                    }
-                },
-            )
-
-            movement = InventoryMovement(
-                movementId=uuid4(),
-                inventoryId=item.inventoryId,
-                inventoryType=InventoryType.HARVEST,
-                movementType=MovementType.RETURN,
-                quantityBefore=inventory_item.get("quantity", 0),
-                quantityChange=0,
-                quantityAfter=inventory_item.get("quantity", 0),
-                organizationId=UUID(inventory_item.get("organizationId")),
-                reason=f"Released reservation for cancelled order {order.orderCode}",
-                referenceId=str(order.orderId),
-                performedBy=order.createdBy,
-                performedAt=datetime.utcnow(),
-            )
-            await db.inventory_movements.insert_one(movement.model_dump(mode="json"))
-
     async def _fulfill_inventory_for_order(self, order: SalesOrder) -> None:
         """
         Legacy deduction path — uses item.inventoryId (pre-Phase-4 orders).
@@ -808,14 +611,9 @@ class OrderService:
 
             order = await self.repository.create(order_data, created_by)
 
-            # Reserve inventory for CONFIRMED (or higher) orders with allocations
-            if order.status not in (SalesOrderStatus.DRAFT,) and any(
-                item.allocations for item in order.items
-            ):
+            # Reserve inventory for CONFIRMED (or higher) orders
+            if order.status not in (SalesOrderStatus.DRAFT,):
                 await self._reserve_allocations(order, str(created_by))
-            elif order.status not in (SalesOrderStatus.DRAFT,):
-                # Legacy path — item.inventoryId without per-batch allocations
-                await self._reserve_inventory_for_order(order)
 
             logger.info("Sales order created: %s by user %s", order.orderId, created_by)
             await self._invalidate_sales_dashboard_cache()
@@ -960,11 +758,7 @@ class OrderService:
             new_status == SalesOrderStatus.CANCELLED
             and order.status in _RESERVED_STATUSES
         ):
-            # Release reservations — prefer allocation-aware path
-            if any(item.allocations for item in order.items):
-                await self._release_allocations(order, performed_by)
-            else:
-                await self._release_inventory_reservation(order)
+            await self._release_allocations(order, performed_by)
             logger.info(
                 "Released inventory reservations for cancelled order %s", order_id
             )
@@ -1024,11 +818,7 @@ class OrderService:
                 detail=f"Order cannot be confirmed. Current status: {order.status.value}",
             )
 
-        # Prefer allocation-aware reservation
-        if any(item.allocations for item in order.items):
-            await self._reserve_allocations(order, str(confirmed_by))
-        else:
-            await self._reserve_inventory_for_order(order)
+        await self._reserve_allocations(order, str(confirmed_by))
 
         updated_order = await self.repository.update_status(
             order_id, SalesOrderStatus.CONFIRMED
@@ -1182,6 +972,7 @@ class OrderService:
         restored_kg = 0.0
         revived_batches: list[str] = []
         wasted_kg = 0.0
+        release_legs: List[StockLeg] = []
 
         for item_idx, item in enumerate(order.items):
             for alloc in item.allocations:
@@ -1214,32 +1005,9 @@ class OrderService:
                     if row is None:
                         # Should not normally happen since we set action=waste for missing rows
                         continue
-                    old_available = row.get("availableQuantity", 0)
-                    old_reserved = row.get("reservedQuantity", 0)
-                    new_available = old_available + alloc.quantity
-                    new_reserved = max(0, old_reserved - alloc.quantity)
-                    await _update_source_row(
-                        db,
-                        source,
-                        inv_id,
-                        {
-                            "availableQuantity": new_available,
-                            "reservedQuantity": new_reserved,
-                            "updatedAt": now_iso,
-                        },
-                    )
-                    await _write_movement(
-                        db,
-                        inventory_id=inv_id,
-                        inventory_source=source,
-                        movement_type=MovementType.RESTORATION,
-                        qty_before=old_available,
-                        qty_change=alloc.quantity,
-                        qty_after=new_available,
-                        organization_id=row.get("organizationId", ""),
-                        reference_id=str(order_id),
-                        reason=f"Restored on order deletion — order {order.orderCode}",
-                        performed_by=performed_by,
+                    # Released together after the loop (one guarded bulk write)
+                    release_legs.append(
+                        StockLeg(source, inv_id, alloc.quantity, item_idx)
                     )
                     restored_kg += alloc.quantity
 
@@ -1281,40 +1049,42 @@ class OrderService:
                                 }
                             },
                         )
-                        # Restore source row: bump quantity and update expiryDate
+                        # Restore source row: bump quantity and update expiryDate;
+                        # the allocation itself is released with the others
                         if row is not None:
-                            old_qty = row.get("quantity", 0)
-                            old_available = row.get("availableQuantity", 0)
-                            old_reserved = row.get("reservedQuantity", 0)
-                            new_qty = old_qty + revived_qty
-                            new_available = old_available + revived_qty
-                            new_reserved = max(0, old_reserved - alloc.quantity)
-                            await _update_source_row(
-                                db,
-                                source,
-                                inv_id,
+                            revived_row = await db[
+                                COLLECTIONS[source]
+                            ].find_one_and_update(
+                                {"inventoryId": inv_id},
                                 {
-                                    "quantity": new_qty,
-                                    "availableQuantity": new_available
-                                    + alloc.quantity,  # restore allocation too
-                                    "reservedQuantity": new_reserved,
-                                    "expiryDate": decision.expiryDate.isoformat(),
-                                    "updatedAt": now_iso,
+                                    "$inc": {
+                                        "quantity": revived_qty,
+                                        "availableQuantity": revived_qty,
+                                    },
+                                    "$set": {
+                                        "expiryDate": decision.expiryDate.isoformat(),
+                                        "updatedAt": now_iso,
+                                    },
                                 },
+                                return_document=ReturnDocument.AFTER,
                             )
+                            new_available = revived_row.get("availableQuantity", 0)
                             await _write_movement(
                                 db,
                                 inventory_id=inv_id,
                                 inventory_source=source,
                                 movement_type=MovementType.RESTORATION,
-                                qty_before=old_available,
-                                qty_change=revived_qty + alloc.quantity,
-                                qty_after=new_available + alloc.quantity,
+                                qty_before=new_available - revived_qty,
+                                qty_change=revived_qty,
+                                qty_after=new_available,
                                 organization_id=row.get("organizationId", ""),
                                 reference_id=str(order_id),
                                 reason=f"Revived batch on order deletion — new expiry {decision.expiryDate.date()}",
                                 performed_by=performed_by,
                             )
+                            release_legs.append(
+                                StockLeg(source, inv_id, alloc.quantity, item_idx)
+                            )
                         revived_batches.append(inv_id)
                         restored_kg += alloc.quantity
 
@@ -1371,6 +1141,20 @@ class OrderService:
                         )
                     wasted_kg += alloc.quantity
 
+        if release_legs:
+            rows = await self._release_legs(release_legs, str(order_id))
+            await _write_leg_movements(
+                db,
+                [leg for leg in release_legs if leg.key in rows],
+                rows,
+                field="availableQuantity",
+                sign=1,
+                movement_type=MovementType.RESTORATION,
+                reference_id=str(order_id),
+                reason=f"Restored on order deletion — order {order.orderCode}",
+                performed_by=performed_by,
+            )
+
         # Soft-delete the order (CANCELLED + deletedAt)
         collection = sales_db.get_collection("sales_orders")
         await collection.update_one(
@@ -0,0 +1,406 @@
+"""
+Stock Reservation Engine
+
+Reserves, releases and deducts sales-order stock on inventory_harvest and
+inventory_returned rows without read-modify-write:
+
+  reserve   availableQuantity -= q, reservedQuantity += q
+            guarded by availableQuantity >= q
+  release   availableQuantity += q, reservedQuantity -= q
+            guarded by reservedQuantity >= q
+  deduct    quantity -= q, reservedQuantity -= q
+            guarded by quantity >= q and reservedQuantity >= q
+
+All legs of an order (summed per row) go to the server as one ``bulk_write``
+of conditional ``$inc`` updates per collection, inside one transaction when
+the server supports it (replica set / mongos).  If any guard fails the
+transaction is aborted, so an order is reserved completely or not at all and
+concurrent orders can never push a row below zero.  On a standalone mongod
+each row gets its own conditional update and the rows already applied are
+reverted when a later one fails.
+
+FEFO
+----
+``plan_fefo`` picks batches for a line with no explicit allocation:
+sellable rows of the plant/grade ordered by expiryDate (soonest first, rows
+without an expiry last, then oldest harvest), read through the
+(organizationId, plantName, qualityGrade, expiryDate) "fefo" index on both
+collections (declared with the farm indexes).  ``reserve_fefo`` plans all
+of an order's FEFO lines against one shared map of what its explicit legs
+and earlier lines already claim, and re-plans when a batch is taken by a
+concurrent order between planning and reserving.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+
+from src.modules.farm_manager.services.block.expiry_cron import supports_transactions
+
+logger = logging.getLogger(__name__)
+
+RESERVE = "reserve"
+RELEASE = "release"
+DEDUCT = "deduct"
+
+COLLECTIONS = {"harvest": "inventory_harvest", "returned": "inventory_returned"}
+
+MAX_ATTEMPTS = 3
+
+# FEFO re-plans when planned batches were taken by concurrent orders; each
+# re-plan follows another order's reservation, so this only bounds livelock
+MAX_REPLANS = 50
+
+# Server capability, resolved on first use
+_transactions_supported: Optional[bool] = None
+
+# (source, inventoryId)
+RowKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class StockLeg:
+    """A quantity of one inventory row, for one order line."""
+
+    source: str  # 'harvest' | 'returned'
+    inventory_id: str
+    quantity: float
+    line_index: int = 0
+
+    @property
+    def key(self) -> RowKey:
+        return (self.source, self.inventory_id)
+
+
+class StockShortfall(Exception):
+    """
+    A guard failed: a row is missing or lacks the quantity.
+
+    Attributes:
+        action: reserve / release / deduct.
+        legs: (leg, current row or None) for each row that fell short.
+    """
+
+    def __init__(self, action: str, legs: List[Tuple[StockLeg, Optional[dict]]]):
+        self.action = action
+        self.legs = legs
+        super().__init__(
+            f"{action}: insufficient stock on "
+            + ", ".join(f"{leg.source}/{leg.inventory_id}" for leg, _ in legs)
+        )
+
+
+class _Aborted(Exception):
+    """A guard failed inside the transaction; it has been rolled back."""
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _merge(legs: Iterable[StockLeg]) -> Dict[RowKey, StockLeg]:
+    """Sum legs on the same row (keeping the first line index)."""
+    merged: Dict[RowKey, StockLeg] = {}
+    for leg in legs:
+        if leg.source not in COLLECTIONS:
+            raise ValueError(f"Unknown inventory source '{leg.source}'")
+        current = merged.get(leg.key)
+        merged[leg.key] = (
+            leg
+            if current is None
+            else StockLeg(
+                leg.source,
+                leg.inventory_id,
+                current.quantity + leg.quantity,
+                current.line_index,
+            )
+        )
+    return merged
+
+
+def _guard(action: str, qty: float) -> dict:
+    if action == RESERVE:
+        return {"availableQuantity": {"$gte": qty}}
+    if action == RELEASE:
+        return {"reservedQuantity": {"$gte": qty}}
+    return {"quantity": {"$gte": qty}, "reservedQuantity": {"$gte": qty}}
+
+
+def _increments(action: str, qty: float) -> dict:
+    if action == RESERVE:
+        return {"availableQuantity": -qty, "reservedQuantity": qty}
+    if action == RELEASE:
+        return {"availableQuantity": qty, "reservedQuantity": -qty}
+    return {"quantity": -qty, "reservedQuantity": -qty}
+
+
+def _update(action: str, qty: float, now_iso: str) -> dict:
+    return {"$inc": _increments(action, qty), "$set": {"updatedAt": now_iso}}
+
+
+def _by_collection(merged: Dict[RowKey, StockLeg]) -> Dict[str, List[StockLeg]]:
+    grouped: Dict[str, List[StockLeg]] = {}
+    for leg in merged.values():
+        grouped.setdefault(COLLECTIONS[leg.source], []).append(leg)
+    return grouped
+
+
+async def _read_rows(
+    db, merged: Dict[RowKey, StockLeg], session=None
+) -> Dict[RowKey, dict]:
+    """Current rows of ``merged``, one query per collection."""
+    source_of = {name: source for source, name in COLLECTIONS.items()}
+    rows: Dict[RowKey, dict] = {}
+    for name, legs in _by_collection(merged).items():
+        cursor = db[name].find(
+            {"inventoryId": {"$in": [leg.inventory_id for leg in legs]}},
+            session=session,
+        )
+        for row in await cursor.to_list(length=None):
+            rows[(source_of[name], row["inventoryId"])] = row
+    return rows
+
+
+def _shortfalls(
+    action: str, merged: Dict[RowKey, StockLeg], rows: Dict[RowKey, dict]
+) -> List[Tuple[StockLeg, Optional[dict]]]:
+    short = []
+    for key, leg in merged.items():
+        row = rows.get(key)
+        if row is None or any(
+            row.get(field, 0) < bound["$gte"]
+            for field, bound in _guard(action, leg.quantity).items()
+        ):
+            short.append((leg, row))
+    return short
+
+
+async def _transactions(db) -> bool:
+    global _transactions_supported
+    if _transactions_supported is None:
+        _transactions_supported = await supports_transactions(db)
+    return _transactions_supported
+
+
+async def _apply_transactional(
+    db, action: str, merged: Dict[RowKey, StockLeg], now_iso: str
+) -> Dict[RowKey, dict]:
+    async with await db.client.start_session() as session:
+        async with session.start_transaction():
+            for name, legs in _by_collection(merged).items():
+                result = await db[name].bulk_write(
+                    [
+                        UpdateOne(
+                            {
+                                "inventoryId": leg.inventory_id,
+                                **_guard(action, leg.quantity),
+                            },
+                            _update(action, leg.quantity, now_iso),
+                        )
+                        for leg in legs
+                    ],
+                    ordered=False,
+                    session=session,
+                )
+                if result.matched_count != len(legs):
+                    # Reason: raising inside start_transaction() aborts it.
+                    raise _Aborted()
+            # Same snapshot as the writes: exact after-state for the audit
+            return await _read_rows(db, merged, session=session)
+
+
+async def _apply_sequential(
+    db, action: str, merged: Dict[RowKey, StockLeg], now_iso: str
+) -> Dict[RowKey, dict]:
+    applied: List[StockLeg] = []
+    rows: Dict[RowKey, dict] = {}
+    for leg in merged.values():
+        row = await db[COLLECTIONS[leg.source]].find_one_and_update(
+            {"inventoryId": leg.inventory_id, **_guard(action, leg.quantity)},
+            _update(action, leg.quantity, now_iso),
+            return_document=ReturnDocument.AFTER,
+        )
+        if row is None:
+            for done in reversed(applied):
+                await db[COLLECTIONS[done.source]].update_one(
+                    {"inventoryId": done.inventory_id},
+                    {
+                        "$inc": {
+                            f: -v for f, v in _increments(action, done.quantity).items()
+                        },
+                        "$set": {"updatedAt": now_iso},
+                    },
+                )
+            raise _Aborted()
+        applied.append(leg)
+        rows[leg.key] = row
+    return rows
+
+
+async def apply_stock_action(
+    db, action: str, legs: Iterable[StockLeg]
+) -> Dict[RowKey, dict]:
+    """
+    Apply ``action`` to every leg atomically (all or none).
+
+    Args:
+        db: Farm Motor database (inventory collections).
+        action: RESERVE, RELEASE or DEDUCT.
+        legs: The rows and quantities; legs on the same row are summed.
+
+    Returns:
+        The rows after the update, keyed by (source, inventoryId).
+
+    Raises:
+        StockShortfall: A row is missing or lacks the quantity.
+    """
+    merged = _merge(legs)
+    if not merged:
+        return {}
+    transactional = await _transactions(db)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        now_iso = _now_iso()
+        try:
+            if transactional:
+                return await _apply_transactional(db, action, merged, now_iso)
+            return await _apply_sequential(db, action, merged, now_iso)
+        except _Aborted:
+            pass
+        except OperationFailure as exc:
+            # WriteConflict with a concurrent order on the same rows
+            if not exc.has_error_label("TransientTransactionError"):
+                raise
+            continue
+        short = _shortfalls(action, merged, await _read_rows(db, merged))
+        if short:
+            raise StockShortfall(action, short)
+        # Every guard holds again (a concurrent order was rolled back): retry
+        logger.info("Stock %s retry %d after a transient shortfall", action, attempt)
+    raise StockShortfall(action, [(leg, None) for leg in merged.values()])
+
+
+# ---------------------------------------------------------------------------
+# FEFO
+# ---------------------------------------------------------------------------
+
+
+def _fefo_order(row: dict) -> tuple:
+    expiry = row.get("expiryDate")
+    return (expiry is None, str(expiry or ""), str(row.get("harvestDate") or ""))
+
+
+async def plan_fefo(
+    db,
+    *,
+    organization_id: str,
+    plant_name: str,
+    quantity: float,
+    quality_grade: Optional[str] = None,
+    line_index: int = 0,
+    claimed: Optional[Dict[RowKey, float]] = None,
+) -> List[Tuple[StockLeg, dict]]:
+    """
+    FEFO batches covering ``quantity`` of a plant (and grade).
+
+    Args:
+        claimed: Quantity per row already claimed by other legs of the same
+            order. Only what is left of each row is planned, and this line's
+            picks are added to the map, so several lines planned against one
+            map never claim the same stock twice.
+
+    Returns:
+        (leg, row) per batch used, soonest expiry first.
+
+    Raises:
+        StockShortfall: Sellable stock does not cover ``quantity``.
+    """
+    query: dict = {
+        "organizationId": organization_id,
+        "plantName": plant_name,
+        "availableQuantity": {"$gt": 0},
+        "$or": [{"expiryDate": None}, {"expiryDate": {"$gt": _now_iso()}}],
+    }
+    if quality_grade:
+        query["qualityGrade"] = quality_grade
+    candidates: List[Tuple[str, dict]] = []
+    for source, name in COLLECTIONS.items():
+        cursor = db[name].find(query).sort([("expiryDate", ASCENDING)])
+        candidates.extend((source, row) for row in await cursor.to_list(length=None))
+    candidates.sort(key=lambda c: _fefo_order(c[1]))
+
+    if claimed is None:
+        claimed = {}
+    plan: List[Tuple[StockLeg, dict]] = []
+    remaining = quantity
+    for source, row in candidates:
+        if remaining <= 1e-9:
+            break
+        key = (source, row["inventoryId"])
+        free = row.get("availableQuantity", 0) - claimed.get(key, 0)
+        if free <= 1e-9:
+            continue
+        take = min(remaining, free)
+        plan.append((StockLeg(source, row["inventoryId"], take, line_index), row))
+        claimed[key] = claimed.get(key, 0) + take
+        remaining -= take
+    if remaining > 1e-9:
+        available = quantity - remaining
+        raise StockShortfall(
+            RESERVE,
+            [
+                (
+                    StockLeg("harvest", plant_name, quantity, line_index),
+                    {"plantName": plant_name, "availableQuantity": available},
+                )
+            ],
+        )
+    return plan
+
+
+async def reserve_fefo(
+    db,
+    lines: List[dict],
+    explicit: Iterable[StockLeg] = (),
+) -> Tuple[List[Tuple[StockLeg, dict]], Dict[RowKey, dict]]:
+    """
+    Plan FEFO batches for ``lines`` and reserve them with ``explicit`` legs.
+
+    Args:
+        db: Farm Motor database.
+        lines: ``plan_fefo`` keyword arguments, one dict per order line.
+        explicit: Legs of lines that name their batches.
+
+    Returns:
+        (planned (leg, row) pairs, rows after reservation).
+
+    Raises:
+        StockShortfall: Sellable stock is short, or an explicit leg is.
+    """
+    explicit = list(explicit)
+    attempt = 0
+    while True:
+        attempt += 1
+        planned: List[Tuple[StockLeg, dict]] = []
+        # Reason: every line plans against what the explicit legs and the
+        # lines before it left over, not against each row's full stock.
+        claimed: Dict[RowKey, float] = {
+            key: leg.quantity for key, leg in _merge(explicit).items()
+        }
+        for line in lines:
+            planned.extend(await plan_fefo(db, claimed=claimed, **line))
+        try:
+            rows = await apply_stock_action(
+                db, RESERVE, explicit + [leg for leg, _ in planned]
+            )
+            return planned, rows
+        except StockShortfall as exc:
+            planned_keys = {leg.key for leg, _ in planned}
+            if attempt == MAX_REPLANS or any(
+                leg.key not in planned_keys for leg, _ in exc.legs
+            ):
+                raise
+            # A planned batch was taken meanwhile: plan again
@@ -18,6 +18,7 @@ from __future__ import annotations
 import uuid
 from datetime import date, datetime, timezone
 from decimal import Decimal
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -96,6 +97,28 @@ class _FakeCollection:
         copy = dict(doc)
         self._docs.append(copy)
 
+    async def insert_many(self, docs: List[Dict[str, Any]], **kwargs: Any) -> None:
+        self._docs.extend(dict(d) for d in docs)
+
+    async def bulk_write(self, operations: List[Any], **kwargs: Any) -> Any:
+        """UpdateOne operations only (inventory balance updates)."""
+        matched = upserted = 0
+        for op in operations:
+            for doc in self._docs:
+                if _matches(doc, op._filter):
+                    _apply_update(doc, op._doc)
+                    matched += 1
+                    break
+            else:
+                if op._upsert:
+                    new_doc = {
+                        k: v for k, v in op._filter.items() if not isinstance(v, dict)
+                    }
+                    _apply_update(new_doc, op._doc)
+                    self._docs.append(new_doc)
+                    upserted += 1
+        return SimpleNamespace(matched_count=matched, upserted_count=upserted)
+
     async def delete_one(self, query: Dict[str, Any], **kwargs: Any) -> None:
         for i, doc in enumerate(self._docs):
             if _matches(doc, query):
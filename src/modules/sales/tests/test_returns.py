@@ -35,6 +35,7 @@ from __future__ import annotations
 import uuid
 from datetime import date, datetime, timezone
 from decimal import Decimal
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock, patch
 
@@ -97,6 +98,28 @@ class _FakeCollection:
     async def insert_one(self, doc, **kwargs):
         self._docs.append(dict(doc))
 
+    async def insert_many(self, docs, **kwargs):
+        self._docs.extend(dict(d) for d in docs)
+
+    async def bulk_write(self, operations, **kwargs):
+        """UpdateOne operations only (inventory balance updates)."""
+        matched = upserted = 0
+        for op in operations:
+            for doc in self._docs:
+                if _matches(doc, op._filter):
+                    _apply_update_simple(doc, op._doc)
+                    matched += 1
+                    break
+            else:
+                if op._upsert:
+                    new_doc = {
+                        k: v for k, v in op._filter.items() if not isinstance(v, dict)
+                    }
+                    _apply_update_simple(new_doc, op._doc)
+                    self._docs.append(new_doc)
+                    upserted += 1
+        return SimpleNamespace(matched_count=matched, upserted_count=upserted)
+
     async def delete_one(self, query, **kwargs):
         for i, doc in enumerate(self._docs):
             if _matches(doc, query):
@@ -181,6 +204,8 @@ def _matches(doc, query):
                 return False
             if "$lte" in val and doc_val is not None and doc_val > val["$lte"]:
                 return False
+            if "$in" in val and doc_val not in val["$in"]:
+                return False
         else:
             if doc.get(key) != val:
                 return False
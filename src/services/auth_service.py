@@ -24,8 +24,8 @@ from ..models.user import (
     MFALoginResponse,
 )
 from ..utils.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
@@ -39,6 +39,7 @@ from ..utils.email import (
     send_password_reset,
     send_welcome_email,
 )
+from ..core.tokens import revoke_refresh_token, revoke_session, revoke_user_tokens
 from .database import mongodb
 from .cf_access_service import CFAccessIdentity
 from . import deployment_settings_service
@@ -137,8 +138,8 @@ class AuthService:
         # Generate user ID
         user_id = str(uuid.uuid4())
 
-        # Hash password (bcrypt with cost factor 12)
-        password_hash = hash_password(user_data.password)
+        # Hash password (bcrypt with cost factor 12, in the crypto pool)
+        password_hash = await hash_password_async(user_data.password)
 
         # Create user document
         user_doc = {
@@ -224,13 +225,14 @@ class AuthService:
 
         db = mongodb.get_database()
 
-        # Generate tokens for auto-login
+        # Generate tokens for auto-login (the access token belongs to the
+        # refresh token's session, so logging it out revokes both)
+        refresh_token, token_id = create_refresh_token(user_id=user.userId)
+
         access_token = create_access_token(
-            user_id=user.userId, email=user.email, role=user.role
+            user_id=user.userId, email=user.email, role=user.role, session_id=token_id
         )
 
-        refresh_token, token_id = create_refresh_token(user_id=user.userId)
-
         # Store refresh token in database
         refresh_token_doc = {
             "tokenId": token_id,
@@ -300,7 +302,7 @@ class AuthService:
             raise pending_activation_exception()
 
         # Verify password
-        if not verify_password(credentials.password, user_doc["passwordHash"]):
+        if not await AuthService._check_login_password(user_doc, credentials.password):
             logger.warning(f"Failed login attempt for: {credentials.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
@@ -383,16 +385,21 @@ class AuthService:
         # Generate new tokens
         role = UserRole(user_doc["role"])
 
+        new_refresh_token, new_token_id = create_refresh_token(user_id=user_id)
+
         new_access_token = create_access_token(
-            user_id=user_id, email=user_doc["email"], role=role
+            user_id=user_id, email=user_doc["email"], role=role, session_id=new_token_id
         )
 
-        new_refresh_token, new_token_id = create_refresh_token(user_id=user_id)
-
         # Revoke old refresh token (one-time use)
         await db.refresh_tokens.update_one(
             {"tokenId": token_id}, {"$set": {"isRevoked": True}}
         )
+        await revoke_refresh_token(
+            db,
+            token_id,
+            token_doc.get("expiresAt") or datetime.utcnow() + timedelta(days=7),
+        )
 
         # Store new refresh token
         new_refresh_token_doc = {
@@ -469,12 +476,19 @@ class AuthService:
                 await db.refresh_tokens.update_one(
                     {"tokenId": token_payload["tokenId"]}, {"$set": {"isRevoked": True}}
                 )
+                # Also the access tokens issued with it
+                await revoke_session(
+                    db,
+                    token_payload["tokenId"],
+                    datetime.utcnow() + timedelta(days=7),
+                )
                 logger.info(f"Refresh token revoked for user: {user_id}")
         else:
             # Revoke all tokens for user
             await db.refresh_tokens.update_many(
                 {"userId": user_id, "isRevoked": False}, {"$set": {"isRevoked": True}}
             )
+            await revoke_user_tokens(db, user_id, "logout")
             logger.info(f"All refresh tokens revoked for user: {user_id}")
 
         return True
@@ -769,7 +783,7 @@ class AuthService:
             )
 
         # Hash new password
-        password_hash = hash_password(new_password)
+        password_hash = await hash_password_async(new_password)
 
         # Update user password
         result = await db.users.update_one(
@@ -788,10 +802,11 @@ class AuthService:
             {"$set": {"isUsed": True, "usedAt": datetime.utcnow()}},
         )
 
-        # Revoke all refresh tokens for security
+        # Revoke all refresh tokens for security, and issued access tokens
         await db.refresh_tokens.update_many(
             {"userId": user_id, "isRevoked": False}, {"$set": {"isRevoked": True}}
         )
+        await revoke_user_tokens(db, user_id, "password_reset")
 
         logger.info(f"Password reset successfully for user: {user_id}")
         return True
@@ -836,7 +851,7 @@ class AuthService:
             raise pending_activation_exception()
 
         # Verify password
-        if not verify_password(credentials.password, user_doc["passwordHash"]):
+        if not await AuthService._check_login_password(user_doc, credentials.password):
             logger.warning(f"Failed login attempt for: {credentials.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
@@ -901,6 +916,33 @@ class AuthService:
             message="MFA verification required. Please enter your authenticator code.",
         )
 
+    @staticmethod
+    async def _check_login_password(user_doc: dict, password: str) -> bool:
+        """
+        Verify a login password in the crypto pool, rehashing if outdated
+
+        When BCRYPT_ROUNDS has changed since the stored hash was made, the
+        password is rehashed at the new cost while it is known and the new
+        hash saved, so cost upgrades roll out as users sign in.
+
+        Raises:
+            HTTPException: 429 if the crypto pool is saturated
+        """
+        is_valid, new_hash = await verify_and_update_password(
+            password, user_doc["passwordHash"]
+        )
+        if is_valid and new_hash:
+            db = mongodb.get_database()
+            await db.users.update_one(
+                {
+                    "userId": user_doc["userId"],
+                    "passwordHash": user_doc["passwordHash"],
+                },
+                {"$set": {"passwordHash": new_hash}},
+            )
+            logger.info(f"Password rehashed at current cost for: {user_doc['email']}")
+        return is_valid
+
     @staticmethod
     async def _issue_tokens_for_user(
         user_doc: Dict[str, Any],
@@ -935,12 +977,14 @@ class AuthService:
         email = user_doc["email"]
         role = UserRole(user_doc["role"])
 
-        # Create access token (1 hour expiry)
-        access_token = create_access_token(user_id=user_id, email=email, role=role)
-
         # Create refresh token (7 days expiry)
         refresh_token, token_id = create_refresh_token(user_id=user_id)
 
+        # Create access token (1 hour expiry) in the refresh token's session
+        access_token = create_access_token(
+            user_id=user_id, email=email, role=role, session_id=token_id
+        )
+
         # Store refresh token in database
         refresh_token_doc = {
             "tokenId": token_id,
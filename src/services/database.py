@@ -11,6 +11,7 @@ from typing import Optional
 import logging
 
 from ..config.settings import settings
+from ..core.indexes import declare_index
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +50,7 @@ class MongoDBManager:
             logger.info(f"Connected to MongoDB database: {settings.MONGODB_DB_NAME}")
 
             # Create indexes
-            await cls._create_indexes()
+            cls._declare_indexes()
 
         except ConnectionFailure as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
@@ -59,8 +60,8 @@ class MongoDBManager:
             raise
 
     @classmethod
-    async def _create_indexes(cls) -> None:
-        """Create database indexes for optimal query performance"""
+    def _declare_indexes(cls) -> None:
+        """Declare database indexes for optimal query performance"""
         try:
             # Users collection indexes
             #
@@ -79,56 +80,77 @@ class MongoDBManager:
             # both can coexist safely, and once that script drops
             # "email_1", this call is simply a no-op against the
             # already-existing index of the same name/spec.
-            await cls.db.users.create_index(
+            declare_index(
+                "users",
                 "email",
                 unique=True,
                 partialFilterExpression={"deletedAt": None},
                 name="email_live_unique",
             )
-            await cls.db.users.create_index("userId", unique=True)
-            await cls.db.users.create_index("role")
-            await cls.db.users.create_index([("createdAt", -1)])
+            declare_index("users", "userId", unique=True)
+            declare_index("users", "role")
+            declare_index("users", [("createdAt", -1)])
 
             # Refresh tokens collection indexes
-            await cls.db.refresh_tokens.create_index("tokenId", unique=True)
-            await cls.db.refresh_tokens.create_index("userId")
-            await cls.db.refresh_tokens.create_index(
-                "expiresAt", expireAfterSeconds=0  # TTL index for automatic deletion
+            declare_index("refresh_tokens", "tokenId", unique=True)
+            declare_index("refresh_tokens", "userId")
+            declare_index(
+                "refresh_tokens",
+                "expiresAt",
+                expireAfterSeconds=0,  # TTL index for automatic deletion
             )
 
             # Verification tokens collection indexes
-            await cls.db.verification_tokens.create_index("tokenId", unique=True)
-            await cls.db.verification_tokens.create_index("userId")
-            await cls.db.verification_tokens.create_index("email")
-            await cls.db.verification_tokens.create_index("tokenType")
-            await cls.db.verification_tokens.create_index(
-                "expiresAt", expireAfterSeconds=0  # TTL index for automatic deletion
+            declare_index("verification_tokens", "tokenId", unique=True)
+            declare_index("verification_tokens", "userId")
+            declare_index("verification_tokens", "email")
+            declare_index("verification_tokens", "tokenType")
+            declare_index(
+                "verification_tokens",
+                "expiresAt",
+                expireAfterSeconds=0,  # TTL index for automatic deletion
             )
 
             # Installed modules collection indexes (Module Management System)
-            await cls.db.installed_modules.create_index("module_name", unique=True)
-            await cls.db.installed_modules.create_index("status")
-            await cls.db.installed_modules.create_index("health")
-            await cls.db.installed_modules.create_index("installed_by_user_id")
-            await cls.db.installed_modules.create_index([("installed_at", -1)])
-            await cls.db.installed_modules.create_index([("updated_at", -1)])
-            await cls.db.installed_modules.create_index("container_id")
+            declare_index("installed_modules", "module_name", unique=True)
+            declare_index("installed_modules", "status")
+            declare_index("installed_modules", "health")
+            declare_index("installed_modules", "installed_by_user_id")
+            declare_index("installed_modules", [("installed_at", -1)])
+            declare_index("installed_modules", [("updated_at", -1)])
+            declare_index("installed_modules", "container_id")
 
             # Module audit log collection indexes (Module Management System)
-            await cls.db.module_audit_log.create_index("module_name")
-            await cls.db.module_audit_log.create_index("operation")
-            await cls.db.module_audit_log.create_index("user_id")
-            await cls.db.module_audit_log.create_index("status")
-            await cls.db.module_audit_log.create_index([("timestamp", -1)])
-            await cls.db.module_audit_log.create_index(
+            declare_index("module_audit_log", "module_name")
+            declare_index("module_audit_log", "operation")
+            declare_index("module_audit_log", "user_id")
+            declare_index("module_audit_log", "status")
+            declare_index("module_audit_log", [("timestamp", -1)])
+            declare_index(
+                "module_audit_log",
                 "timestamp",
                 expireAfterSeconds=7776000,  # TTL index: 90 days (90*24*60*60)
             )
 
+            # Module jobs collection indexes (background installs).  At most
+            # one active job per module; finished jobs expire after 7 days.
+            declare_index("module_jobs", "job_id", unique=True)
+            declare_index(
+                "module_jobs",
+                "module_name",
+                unique=True,
+                partialFilterExpression={"active": True},
+            )
+            declare_index(
+                "module_jobs",
+                "finished_at",
+                expireAfterSeconds=604800,  # TTL index: 7 days (7*24*60*60)
+            )
+
             # AI query log collection indexes (AI Analytics cost tracking)
-            await cls.db.ai_query_log.create_index("user_id")
-            await cls.db.ai_query_log.create_index([("timestamp", -1)])
-            await cls.db.ai_query_log.create_index([("user_id", 1), ("timestamp", -1)])
+            declare_index("ai_query_log", "user_id")
+            declare_index("ai_query_log", [("timestamp", -1)])
+            declare_index("ai_query_log", [("user_id", 1), ("timestamp", -1)])
 
             # =================================================================
             # MFA (Multi-Factor Authentication) Collection Indexes
@@ -136,11 +158,11 @@ class MongoDBManager:
 
             # user_mfa collection - stores TOTP secrets and MFA configuration per user
             # One MFA record per user (userId is unique index)
-            await cls.db.user_mfa.create_index("mfaId", unique=True)
-            await cls.db.user_mfa.create_index("userId", unique=True)
-            await cls.db.user_mfa.create_index("isEnabled")
-            await cls.db.user_mfa.create_index([("createdAt", -1)])
-            await cls.db.user_mfa.create_index([("updatedAt", -1)])
+            declare_index("user_mfa", "mfaId", unique=True)
+            declare_index("user_mfa", "userId", unique=True)
+            declare_index("user_mfa", "isEnabled")
+            declare_index("user_mfa", [("createdAt", -1)])
+            declare_index("user_mfa", [("updatedAt", -1)])
             logger.info("MFA user_mfa collection indexes created")
 
             # mfa_pending_tokens collection - short-lived MFA login challenges
@@ -157,9 +179,10 @@ class MongoDBManager:
             # A stale challenge is not directly exploitable (verification
             # re-checks expiry and isUsed), but an unbounded collection of
             # login-adjacent tokens is not something to keep by accident.
-            await cls.db.mfa_pending_tokens.create_index("tokenId", unique=True)
-            await cls.db.mfa_pending_tokens.create_index("userId")
-            await cls.db.mfa_pending_tokens.create_index(
+            declare_index("mfa_pending_tokens", "tokenId", unique=True)
+            declare_index("mfa_pending_tokens", "userId")
+            declare_index(
+                "mfa_pending_tokens",
                 "expiresAt",
                 expireAfterSeconds=0,  # TTL uses the expiresAt value directly
             )
@@ -167,46 +190,45 @@ class MongoDBManager:
 
             # mfa_backup_codes collection - stores hashed backup codes
             # Multiple codes per user, lookup by userId + codeHash
-            await cls.db.mfa_backup_codes.create_index("codeId", unique=True)
-            await cls.db.mfa_backup_codes.create_index("userId")
-            await cls.db.mfa_backup_codes.create_index([("userId", 1), ("codeHash", 1)])
-            await cls.db.mfa_backup_codes.create_index("isUsed")
-            await cls.db.mfa_backup_codes.create_index([("userId", 1), ("isUsed", 1)])
+            declare_index("mfa_backup_codes", "codeId", unique=True)
+            declare_index("mfa_backup_codes", "userId")
+            declare_index("mfa_backup_codes", [("userId", 1), ("codeHash", 1)])
+            declare_index("mfa_backup_codes", "isUsed")
+            declare_index("mfa_backup_codes", [("userId", 1), ("isUsed", 1)])
             # TTL index: automatically delete used backup codes after 90 days
-            await cls.db.mfa_backup_codes.create_index(
+            declare_index(
+                "mfa_backup_codes",
                 "expiresAt",
                 expireAfterSeconds=0,  # TTL uses expiresAt field value directly
             )
             logger.info("MFA mfa_backup_codes collection indexes created")
 
             # mfa_audit_log collection - security audit trail for MFA actions
-            await cls.db.mfa_audit_log.create_index("logId", unique=True)
-            await cls.db.mfa_audit_log.create_index("userId")
-            await cls.db.mfa_audit_log.create_index("action")
-            await cls.db.mfa_audit_log.create_index([("timestamp", -1)])
-            await cls.db.mfa_audit_log.create_index([("userId", 1), ("timestamp", -1)])
-            await cls.db.mfa_audit_log.create_index([("userId", 1), ("action", 1)])
-            await cls.db.mfa_audit_log.create_index(
-                "performedBy"
-            )  # For admin action lookups
+            declare_index("mfa_audit_log", "logId", unique=True)
+            declare_index("mfa_audit_log", "userId")
+            declare_index("mfa_audit_log", "action")
+            declare_index("mfa_audit_log", [("timestamp", -1)])
+            declare_index("mfa_audit_log", [("userId", 1), ("timestamp", -1)])
+            declare_index("mfa_audit_log", [("userId", 1), ("action", 1)])
+            declare_index("mfa_audit_log", "performedBy")  # For admin action lookups
             # Optional: TTL index for log retention (keep 1 year = 31536000 seconds)
             # Uncomment if you want automatic log cleanup:
-            # await cls.db.mfa_audit_log.create_index(
+            # declare_index("mfa_audit_log",
             #     "timestamp",
             #     expireAfterSeconds=31536000  # 1 year retention
             # )
             logger.info("MFA mfa_audit_log collection indexes created")
 
             # Admin audit log collection indexes (admin actions including MFA reset)
-            await cls.db.admin_audit_log.create_index("action")
-            await cls.db.admin_audit_log.create_index("performedBy")
-            await cls.db.admin_audit_log.create_index("targetUserId")
-            await cls.db.admin_audit_log.create_index([("timestamp", -1)])
+            declare_index("admin_audit_log", "action")
+            declare_index("admin_audit_log", "performedBy")
+            declare_index("admin_audit_log", "targetUserId")
+            declare_index("admin_audit_log", [("timestamp", -1)])
             logger.info("Admin audit log collection indexes created")
 
-            logger.info("MongoDB indexes created successfully")
+            logger.info("MongoDB indexes declared")
         except Exception as e:
-            logger.error(f"Error creating MongoDB indexes: {e}")
+            logger.error(f"Error declaring MongoDB indexes: {e}")
             # Don't raise - indexes are not critical for startup
 
     @classmethod
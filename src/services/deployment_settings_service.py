@@ -79,7 +79,7 @@ from fastapi import HTTPException, status
 
 from ..config.settings import settings
 from ..models.user import UserRole
-from ..utils.security import verify_password
+from ..utils.security import verify_password_async
 from .database import mongodb
 
 logger = logging.getLogger(__name__)
@@ -423,7 +423,7 @@ async def update(
     if (
         not user_doc
         or not user_doc.get("passwordHash")
-        or not verify_password(current_password, user_doc["passwordHash"])
+        or not await verify_password_async(current_password, user_doc["passwordHash"])
     ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
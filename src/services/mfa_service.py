@@ -7,13 +7,14 @@ Following security best practices for MFA implementation
 Security Features:
 - TOTP secrets are encrypted at rest using Fernet (AES-128-CBC + HMAC)
 - PBKDF2 key derivation from SECRET_KEY with 100k iterations
-- Backup codes are SHA-256 hashed before storage
+- Backup codes are stored as HMAC-SHA256 digests keyed from SECRET_KEY
 - NEVER returns raw secrets in API responses after initial setup
 """
 
 import pyotp
 import secrets
 import hashlib
+import hmac
 import logging
 import base64
 import io
@@ -120,6 +121,30 @@ def decrypt_totp_secret(encrypted_secret: str) -> str:
         raise ValueError("Failed to decrypt MFA secret") from e
 
 
+# =============================================================================
+# Backup Code Hashing
+# =============================================================================
+
+# Key label for backup-code HMACs (isolated from the TOTP encryption key)
+BACKUP_CODE_HMAC_LABEL = b"a64core_mfa_backup_code_v1"
+BACKUP_CODE_DIGEST_PREFIX = "hmac1$"
+
+
+def _backup_code_digest(formatted_code: str) -> str:
+    """
+    Keyed digest of a backup code (format XXXX-XXXX) for storage and lookup.
+
+    Codes carry only 32 bits of entropy, so a bare hash of one is reversible
+    by brute force from a database dump; keyed with a secret derived from
+    SECRET_KEY it is not, while verification stays a single HMAC.
+    """
+    key = hmac.new(
+        settings.SECRET_KEY.encode(), BACKUP_CODE_HMAC_LABEL, hashlib.sha256
+    ).digest()
+    digest = hmac.new(key, formatted_code.encode(), hashlib.sha256).hexdigest()
+    return BACKUP_CODE_DIGEST_PREFIX + digest
+
+
 class MFAService:
     """Service for managing TOTP-based MFA"""
 
@@ -331,7 +356,7 @@ class MFAService:
         Returns:
             Tuple of (plain_codes, hashed_codes)
             plain_codes: Human-readable codes to show user (format: XXXX-XXXX)
-            hashed_codes: SHA-256 hashed codes to store in database
+            hashed_codes: Keyed HMAC digests to store in database
         """
         plain_codes = []
         hashed_codes = []
@@ -344,8 +369,7 @@ class MFAService:
             plain_codes.append(formatted_code)
 
             # Hash the code for secure storage
-            code_hash = hashlib.sha256(formatted_code.encode()).hexdigest()
-            hashed_codes.append(code_hash)
+            hashed_codes.append(_backup_code_digest(formatted_code))
 
         return plain_codes, hashed_codes
 
@@ -374,11 +398,15 @@ class MFAService:
         else:
             formatted = f"{normalized[:4]}-{normalized[4:]}"
 
-        code_hash = hashlib.sha256(formatted.encode()).hexdigest()
-
-        for i, stored_hash in enumerate(hashed_codes):
-            if stored_hash == code_hash:
-                return True, i
+        # One keyed digest plus, for codes issued before HMAC hashing, the
+        # legacy bare SHA-256 -- then a lookup, not a scan of slow hashes.
+        index = {stored: i for i, stored in enumerate(hashed_codes)}
+        for candidate in (
+            _backup_code_digest(formatted),
+            hashlib.sha256(formatted.encode()).hexdigest(),
+        ):
+            if candidate in index:
+                return True, index[candidate]
 
         return False, -1
 
@@ -562,7 +590,7 @@ class MFAService:
         Raises:
             HTTPException: 400 if MFA not enabled or invalid credentials
         """
-        from ..utils.security import verify_password
+        from ..utils.security import verify_password_async
 
         db = mongodb.get_database()
 
@@ -582,7 +610,7 @@ class MFAService:
             )
 
         # Verify password
-        if not verify_password(password, user_doc["passwordHash"]):
+        if not await verify_password_async(password, user_doc["passwordHash"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password"
             )
@@ -712,18 +740,19 @@ class MFAService:
         is_valid, code_index = self.verify_backup_code(code, backup_codes)
 
         if is_valid:
-            # Remove used backup code
-            backup_codes.pop(code_index)
+            # Remove used backup code; conditional on it still being stored
+            # so two concurrent logins cannot both spend it
+            used_code = backup_codes.pop(code_index)
             remaining_codes = len(backup_codes)
-            await db.users.update_one(
-                {"userId": user_id},
+            result = await db.users.update_one(
+                {"userId": user_id, "mfaBackupCodes": used_code},
                 {
-                    "$set": {
-                        "mfaBackupCodes": backup_codes,
-                        "updatedAt": datetime.utcnow(),
-                    }
+                    "$pull": {"mfaBackupCodes": used_code},
+                    "$set": {"updatedAt": datetime.utcnow()},
                 },
             )
+            if result.modified_count == 0:
+                return False, False, -1
             logger.info(
                 f"Backup code used for user: {user_id}. {remaining_codes} codes remaining."
             )
@@ -796,7 +825,7 @@ class MFAService:
             HTTPException: 400 if MFA not enabled or invalid code
             HTTPException: 401 if password is invalid
         """
-        from ..utils.security import verify_password
+        from ..utils.security import verify_password_async
 
         db = mongodb.get_database()
 
@@ -816,7 +845,7 @@ class MFAService:
 
         # Verify password (required for full authentication)
         if password:
-            if not verify_password(password, user_doc["passwordHash"]):
+            if not await verify_password_async(password, user_doc["passwordHash"]):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password"
                 )
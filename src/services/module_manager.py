@@ -11,6 +11,12 @@ This service provides:
 - docker-compose.yml manipulation
 - NGINX routing configuration
 - Security enforcement (RBAC, resource limits, sandboxing)
+- Background install jobs with progress polling
+
+Docker calls never run on the event loop: they go through the module ops
+thread pool (src/services/module_ops.py) with timeouts, and container state
+shown by the status and list endpoints comes from the event-fed
+``container_states`` cache rather than the daemon.
 
 Security Features:
 - Docker image validation (trusted registries only)
@@ -34,6 +40,10 @@ Usage:
     )
     result = await manager.install_module(config, user_id, user_email)
 
+    # Install in the background and poll the job
+    job = await manager.start_install(config, user_id, user_email)
+    job = await manager.get_job(job.job_id)
+
     # Get module status
     status = await manager.get_module_status("analytics")
 
@@ -43,19 +53,26 @@ Usage:
 
 import os
 import re
+import time
 import yaml
+import asyncio
 import logging
 import platform
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
 import docker
 from docker.errors import DockerException, ImageNotFound, APIError
+from pymongo.errors import DuplicateKeyError
 
+from ..config.settings import settings
 from ..models.module import (
     ModuleConfig,
     ModuleInDB,
+    ModuleJob,
+    ModuleJobStatus,
     ModuleResponse,
     ModuleStatusResponse,
     ModuleStatus,
@@ -67,6 +84,7 @@ from ..utils.license_validator import LicenseValidator
 from ..services.database import mongodb
 from ..services.port_manager import PortManager
 from ..services.proxy_manager import get_proxy_manager
+from ..services.module_ops import ModuleOpTimeout, container_states, module_ops
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +138,65 @@ MAX_MODULES_PER_USER = int(os.getenv("MAX_MODULES_PER_USER", "10"))
 # Installation timeout
 MODULE_INSTALL_TIMEOUT = int(os.getenv("MODULE_INSTALL_TIMEOUT", "300"))
 
+# An install job whose progress has not moved for this long is abandoned
+# (its worker died) and no longer blocks a new install of the module
+INSTALL_JOB_STALE_AFTER = timedelta(seconds=2 * MODULE_INSTALL_TIMEOUT)
+
+# Progress reporter of an install: (step, percent)
+ProgressCallback = Callable[[str, int], Awaitable[None]]
+
+
+def _resource_usage(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Status-response usage fields from a ``container.stats()`` sample."""
+    # CPU usage
+    cpu_delta = (
+        stats["cpu_stats"]["cpu_usage"]["total_usage"]
+        - stats["precpu_stats"]["cpu_usage"]["total_usage"]
+    )
+    system_delta = stats["cpu_stats"].get("system_cpu_usage", 0) - stats[
+        "precpu_stats"
+    ].get("system_cpu_usage", 0)
+    num_cpus = len(stats["cpu_stats"]["cpu_usage"].get("percpu_usage", [0]))
+    cpu_percent = (
+        (cpu_delta / system_delta) * num_cpus * 100.0 if system_delta > 0 else 0.0
+    )
+
+    # Memory usage (MB)
+    memory_usage = stats["memory_stats"].get("usage", 0) / (1024 * 1024)
+    memory_limit = stats["memory_stats"].get("limit", 0) / (1024 * 1024)
+
+    # Network usage
+    networks = stats.get("networks", {})
+    return {
+        "cpu_usage_percent": round(cpu_percent, 2),
+        "memory_usage_mb": round(memory_usage, 2),
+        "memory_limit_mb": round(memory_limit, 2),
+        "network_rx_bytes": sum(net.get("rx_bytes", 0) for net in networks.values()),
+        "network_tx_bytes": sum(net.get("tx_bytes", 0) for net in networks.values()),
+    }
+
+
+def _live_status(module_doc: Dict[str, Any], state: Optional[Dict[str, Any]]):
+    """
+    (status, health) of a module, with its cached container state applied.
+
+    The database records the outcome of the last operation; the cache knows
+    whether the container has since stopped or turned unhealthy.
+    """
+    status = module_doc.get("status", ModuleStatus.ERROR)
+    health = module_doc.get("health", ModuleHealth.UNKNOWN)
+    if state is None:
+        return status, health
+    if status in (ModuleStatus.RUNNING, ModuleStatus.STOPPED):
+        status = (
+            ModuleStatus.RUNNING
+            if state.get("container_state") in ("running", "restarting")
+            else ModuleStatus.STOPPED
+        )
+    if state.get("health") in (ModuleHealth.HEALTHY, ModuleHealth.UNHEALTHY):
+        health = state["health"]
+    return status, health
+
 
 # =============================================================================
 # Module Manager Class
@@ -158,6 +235,10 @@ class ModuleManager:
         # Database (lazy initialization)
         self._db = None
 
+        # Running install jobs and usage samples (strong refs for the tasks)
+        self._background: set = set()
+        self._sampling: set = set()
+
         logger.info(
             "ModuleManager initialized (Docker client will connect on first use)"
         )
@@ -190,6 +271,33 @@ class ModuleManager:
             self._db = mongodb.get_database()
         return self._db
 
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    # =========================================================================
+    # Container State Cache
+    # =========================================================================
+
+    def start_container_watch(
+        self, client_factory: Optional[Callable[[], Any]] = None
+    ) -> None:
+        """
+        Start feeding ``container_states`` from the Docker event stream.
+
+        Args:
+            client_factory: Docker client factory for the subscription
+                (default: a dedicated client on DOCKER_SOCKET).
+        """
+        container_states.start(
+            client_factory or (lambda: docker.DockerClient(base_url=DOCKER_SOCKET))
+        )
+
+    def stop_container_watch(self) -> None:
+        container_states.stop()
+
     # =========================================================================
     # Module Installation
     # =========================================================================
@@ -200,10 +308,14 @@ class ModuleManager:
         user_id: str,
         user_email: str,
         user_role: str = "super_admin",
+        progress: Optional[ProgressCallback] = None,
     ) -> Dict[str, any]:
         """
         Install a module from Docker image.
 
+        Runs to completion in the caller; the API starts it as a background
+        job instead (``start_install``).
+
         Steps:
         1. Validate license key
         2. Check module limits
@@ -220,6 +332,7 @@ class ModuleManager:
             user_id: User ID performing installation
             user_email: User email
             user_role: User role (must be super_admin)
+            progress: Awaited with (step, percent) as the install advances
 
         Returns:
             Dictionary with installation result
@@ -231,13 +344,19 @@ class ModuleManager:
         start_time = datetime.utcnow()
         module_name = config.module_name
 
+        async def report(step: str, percent: int) -> None:
+            if progress is not None:
+                await progress(step, percent)
+
         try:
             logger.info(f"Starting module installation: {module_name} by {user_email}")
 
             # Ensure Docker client is initialized
-            self._ensure_docker_client()
+            await report("connecting", 5)
+            await module_ops.run(self._ensure_docker_client)
 
             # Step 1: Validate license key
+            await report("validating_license", 10)
             logger.info(f"Validating license key for {module_name}")
             license_result = await self.license_validator.validate_license(
                 config.license_key, module_name, config.version
@@ -287,6 +406,7 @@ class ModuleManager:
             self._validate_docker_image(config.docker_image)
 
             # Step 5: Get or pull Docker image
+            await report("pulling_image", 20)
             logger.info(f"Getting Docker image: {config.docker_image}")
             try:
                 # Check if image exists locally (especially for localhost registry)
@@ -302,7 +422,9 @@ class ModuleManager:
                         f"Checking local image cache for: {config.docker_image}"
                     )
                     try:
-                        image = self.docker_client.images.get(config.docker_image)
+                        image = await module_ops.run(
+                            self.docker_client.images.get, config.docker_image
+                        )
                         logger.info(f"Found local image: {image.id[:12]}")
                     except ImageNotFound:
                         error = f"Local Docker image not found: {config.docker_image}. Build it first with: docker build -t {config.docker_image} ."
@@ -323,7 +445,11 @@ class ModuleManager:
                     logger.info(
                         f"Pulling image from remote registry: {config.docker_image}"
                     )
-                    image = self.docker_client.images.pull(config.docker_image)
+                    image = await module_ops.run(
+                        self.docker_client.images.pull,
+                        config.docker_image,
+                        timeout=MODULE_INSTALL_TIMEOUT,
+                    )
                     logger.info(f"Docker image pulled successfully: {image.id[:12]}")
 
             except ImageNotFound:
@@ -340,7 +466,7 @@ class ModuleManager:
                     start_time,
                 )
                 raise ValueError(error)
-            except DockerException as e:
+            except (DockerException, ModuleOpTimeout) as e:
                 error = f"Failed to get Docker image: {str(e)}"
                 await self._log_audit(
                     user_id,
@@ -356,6 +482,7 @@ class ModuleManager:
                 raise RuntimeError(error)
 
             # Step 6: Allocate ports automatically (if port_manager available)
+            await report("allocating_ports", 60)
             allocated_ports = {}
             proxy_route = None
 
@@ -413,6 +540,7 @@ class ModuleManager:
             logger.info(f"Module record created in database: {module_name}")
 
             # Step 9: Create container with security configuration
+            await report("creating_container", 70)
             logger.info(f"Creating Docker container for {module_name}")
             container = await self._create_container(config, image, allocated_ports)
 
@@ -433,6 +561,7 @@ class ModuleManager:
             logger.info(f"Container started: {container.name} ({container.id[:12]})")
 
             # Step 10: Create reverse proxy route (if proxy_route available)
+            await report("configuring_proxy", 90)
             if proxy_route and allocated_ports:
                 # Get primary internal port (first key in allocated_ports)
                 # Note: allocated_ports is {internal_port: external_port}
@@ -502,10 +631,10 @@ class ModuleManager:
                     "$set": {
                         "status": ModuleStatus.ERROR,
                         "error_message": str(e),
-                        "error_count": {"$inc": 1},
                         "last_error_at": datetime.utcnow(),
                         "updated_at": datetime.utcnow(),
-                    }
+                    },
+                    "$inc": {"error_count": 1},
                 },
             )
 
@@ -537,10 +666,10 @@ class ModuleManager:
                     "$set": {
                         "status": ModuleStatus.ERROR,
                         "error_message": str(e),
-                        "error_count": {"$inc": 1},
                         "last_error_at": datetime.utcnow(),
                         "updated_at": datetime.utcnow(),
-                    }
+                    },
+                    "$inc": {"error_count": 1},
                 },
             )
 
@@ -681,7 +810,7 @@ class ModuleManager:
         memory_limit = config.memory_limit  # Already in format "512m" or "1g"
 
         # Auto-detect the correct Docker network (use the one the API container is on)
-        network_mode = self._get_platform_network()
+        network_mode = await module_ops.run(self._get_platform_network)
         logger.info(f"Using Docker network: {network_mode}")
 
         # Detect security profile
@@ -761,8 +890,12 @@ class ModuleManager:
 
         try:
             # Create and start container
-            container = self.docker_client.containers.run(**container_config)
+            container = await module_ops.run(
+                partial(self.docker_client.containers.run, **container_config)
+            )
             logger.info(f"Container created: {container_name} ({container.id[:12]})")
+            # Visible to the status endpoint before its "start" event arrives
+            container_states.put(container)
             return container
 
         except APIError as e:
@@ -772,6 +905,142 @@ class ModuleManager:
             logger.error(f"Unexpected error creating container: {e}")
             raise RuntimeError(f"Failed to create container: {str(e)}") from e
 
+    # =========================================================================
+    # Background Install Jobs
+    # =========================================================================
+
+    async def start_install(
+        self,
+        config: ModuleConfig,
+        user_id: str,
+        user_email: str,
+        user_role: str = "super_admin",
+    ) -> ModuleJob:
+        """
+        Validate an install request and run the install as a background job.
+
+        The cheap checks run here so the request fails fast; the rest of
+        ``install_module`` (license validation, image pull, container start,
+        proxy route) runs in a task on this worker, recording its step and
+        progress in ``module_jobs`` for any worker to serve to pollers.
+
+        Args:
+            config: Module configuration
+            user_id: User ID performing installation
+            user_email: User email
+            user_role: User role (must be super_admin)
+
+        Returns:
+            The created job
+
+        Raises:
+            ValueError: If the module is installed, being installed, or its
+                image is not acceptable
+        """
+        module_name = config.module_name
+
+        existing = await self.db.installed_modules.find_one(
+            {"module_name": module_name}
+        )
+        if existing:
+            raise ValueError(f"Module '{module_name}' is already installed")
+        self._validate_docker_image(config.docker_image)
+
+        # Release the claim of an install whose worker died mid-way
+        now = datetime.utcnow()
+        await self.db.module_jobs.update_many(
+            {
+                "module_name": module_name,
+                "active": True,
+                "updated_at": {"$lt": now - INSTALL_JOB_STALE_AFTER},
+            },
+            {
+                "$set": {
+                    "status": ModuleJobStatus.FAILED,
+                    "error": "Abandoned: no progress reported",
+                    "finished_at": now,
+                },
+                "$unset": {"active": ""},
+            },
+        )
+
+        job = ModuleJob(
+            operation="install",
+            module_name=module_name,
+            requested_by_user_id=user_id,
+            requested_by_email=user_email,
+        )
+        try:
+            # Unique on module_name among active jobs: one install at a time
+            await self.db.module_jobs.insert_one({**job.dict(), "active": True})
+        except DuplicateKeyError:
+            raise ValueError(f"Module '{module_name}' is already being installed")
+
+        self._spawn(
+            self._run_install_job(job.job_id, config, user_id, user_email, user_role)
+        )
+        logger.info(f"Install job {job.job_id} started for {module_name}")
+        return job
+
+    async def _run_install_job(
+        self,
+        job_id: str,
+        config: ModuleConfig,
+        user_id: str,
+        user_email: str,
+        user_role: str,
+    ) -> None:
+        async def progress(step: str, percent: int) -> None:
+            await self.db.module_jobs.update_one(
+                {"job_id": job_id},
+                {
+                    "$set": {
+                        "status": ModuleJobStatus.RUNNING,
+                        "step": step,
+                        "progress": percent,
+                        "updated_at": datetime.utcnow(),
+                    }
+                },
+            )
+
+        try:
+            result = await self.install_module(
+                config, user_id, user_email, user_role, progress=progress
+            )
+            update = {
+                "status": ModuleJobStatus.SUCCEEDED,
+                "step": "completed",
+                "progress": 100,
+                "result": {
+                    "container_id": result["container_id"],
+                    "container_name": result["container_name"],
+                },
+            }
+        except Exception as e:
+            # install_module has logged, audited and recorded the error
+            update = {"status": ModuleJobStatus.FAILED, "error": str(e)}
+
+        now = datetime.utcnow()
+        await self.db.module_jobs.update_one(
+            {"job_id": job_id},
+            {
+                "$set": {**update, "updated_at": now, "finished_at": now},
+                "$unset": {"active": ""},
+            },
+        )
+
+    async def get_job(self, job_id: str) -> ModuleJob:
+        """
+        Get a background module job (for progress polling).
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        job_doc = await self.db.module_jobs.find_one({"job_id": job_id})
+        if not job_doc:
+            raise ValueError(f"Job '{job_id}' not found")
+        return ModuleJob(**job_doc)
+
     # =========================================================================
     # Module Uninstallation
     # =========================================================================
@@ -815,7 +1084,7 @@ class ModuleManager:
             )
 
             # Ensure Docker client is initialized
-            self._ensure_docker_client()
+            await module_ops.run(self._ensure_docker_client)
 
             # Step 1: Find module in database
             module_doc = await self.db.installed_modules.find_one(
@@ -851,16 +1120,19 @@ class ModuleManager:
             container_id = module_doc.get("container_id")
             if container_id:
                 try:
-                    container = self.docker_client.containers.get(container_id)
+                    container = await module_ops.run(
+                        self.docker_client.containers.get, container_id
+                    )
                     logger.info(f"Stopping container: {container.name}")
 
                     # Stop container gracefully (10 second timeout)
-                    container.stop(timeout=10)
+                    await module_ops.run(partial(container.stop, timeout=10))
                     logger.info(f"Container stopped: {container.name}")
 
                     # Remove container
-                    container.remove(force=True)
+                    await module_ops.run(partial(container.remove, force=True))
                     logger.info(f"Container removed: {container.name}")
+                    container_states.discard(container_id)
 
                 except docker.errors.NotFound:
                     logger.warning(
@@ -954,6 +1226,9 @@ class ModuleManager:
         """
         Get list of installed modules with pagination.
 
+        Status, health and container state come from the database and the
+        event-fed container state cache; the Docker daemon is not queried.
+
         Args:
             page: Page number (1-indexed)
             per_page: Items per page
@@ -973,6 +1248,9 @@ class ModuleManager:
         # Convert to response models
         module_responses = []
         for module_doc in modules:
+            container_id = module_doc.get("container_id")
+            state = container_states.get(container_id) if container_id else None
+            status, health = _live_status(module_doc, state)
             try:
                 module_responses.append(
                     ModuleResponse(
@@ -983,10 +1261,11 @@ class ModuleManager:
                         description=module_doc.get("description"),
                         docker_image=module_doc.get("docker_image", "unknown:0.0.0"),
                         version=module_doc.get("version", "0.0.0"),
-                        status=module_doc.get("status", ModuleStatus.ERROR),
-                        health=module_doc.get("health", ModuleHealth.UNKNOWN),
-                        container_id=module_doc.get("container_id"),
+                        status=status,
+                        health=health,
+                        container_id=container_id,
                         container_name=module_doc.get("container_name"),
+                        container_state=state and state.get("container_state"),
                         ports=module_doc.get("ports", []),
                         route_prefix=module_doc.get("route_prefix"),
                         cpu_limit=module_doc.get("cpu_limit", "1.0"),
@@ -1016,6 +1295,11 @@ class ModuleManager:
         """
         Get detailed status of a specific module.
 
+        Container state comes from the event-fed cache.  Resource usage is
+        the last background sample: one older than MODULE_STATS_TTL_SECONDS
+        is served as is while a fresh one is taken (``container.stats`` takes
+        about two seconds), so the first call after install has no usage yet.
+
         Args:
             module_name: Module name
 
@@ -1032,101 +1316,41 @@ class ModuleManager:
         if not module_doc:
             raise ValueError(f"Module '{module_name}' not found")
 
-        # Get container stats if available
         container_id = module_doc.get("container_id")
+        state = container_states.get(container_id) if container_id else None
+        status, health = _live_status(module_doc, state)
         container_stats = {}
 
-        if container_id:
-            try:
-                # Ensure Docker client is initialized
-                self._ensure_docker_client()
-
-                container = self.docker_client.containers.get(container_id)
-
-                # Get container state
-                container.reload()
-                state = container.attrs["State"]
-
-                container_stats = {
-                    "container_state": state["Status"],
-                    "started_at": state.get("StartedAt"),
-                    "finished_at": state.get("FinishedAt"),
-                    "exit_code": state.get("ExitCode"),
-                    "restart_count": state.get("RestartCount", 0),
-                }
-
-                # Get resource usage stats
-                stats = container.stats(stream=False)
-                if stats:
-                    # CPU usage
-                    cpu_delta = (
-                        stats["cpu_stats"]["cpu_usage"]["total_usage"]
-                        - stats["precpu_stats"]["cpu_usage"]["total_usage"]
-                    )
-                    system_delta = (
-                        stats["cpu_stats"]["system_cpu_usage"]
-                        - stats["precpu_stats"]["system_cpu_usage"]
-                    )
-                    num_cpus = len(
-                        stats["cpu_stats"]["cpu_usage"].get("percpu_usage", [0])
-                    )
-                    cpu_percent = (
-                        (cpu_delta / system_delta) * num_cpus * 100.0
-                        if system_delta > 0
-                        else 0.0
-                    )
-
-                    # Memory usage
-                    memory_usage = stats["memory_stats"].get("usage", 0) / (
-                        1024 * 1024
-                    )  # MB
-                    memory_limit = stats["memory_stats"].get("limit", 0) / (
-                        1024 * 1024
-                    )  # MB
-
-                    # Network usage
-                    networks = stats.get("networks", {})
-                    network_rx = sum(
-                        net.get("rx_bytes", 0) for net in networks.values()
-                    )
-                    network_tx = sum(
-                        net.get("tx_bytes", 0) for net in networks.values()
-                    )
-
-                    container_stats.update(
-                        {
-                            "cpu_usage_percent": round(cpu_percent, 2),
-                            "memory_usage_mb": round(memory_usage, 2),
-                            "memory_limit_mb": round(memory_limit, 2),
-                            "network_rx_bytes": network_rx,
-                            "network_tx_bytes": network_tx,
-                        }
-                    )
-
-                # Calculate uptime
-                if state["Status"] == "running" and state.get("StartedAt"):
-                    from dateutil import parser
-
-                    started_at = parser.isoparse(state["StartedAt"])
-                    uptime_seconds = int(
-                        (
-                            datetime.utcnow() - started_at.replace(tzinfo=None)
-                        ).total_seconds()
-                    )
-                    container_stats["uptime_seconds"] = uptime_seconds
+        if state is not None:
+            container_stats = {
+                "container_state": state["container_state"],
+                "started_at": state["started_at"],
+                "finished_at": state["finished_at"],
+                "exit_code": state["exit_code"],
+                "restart_count": state["restart_count"] or 0,
+            }
+            if state["container_state"] == "running" and state["started_at"]:
+                container_stats["uptime_seconds"] = int(
+                    (datetime.utcnow() - state["started_at"]).total_seconds()
+                )
 
-            except docker.errors.NotFound:
-                logger.warning(f"Container not found: {container_id}")
-            except Exception as e:
-                logger.error(f"Error getting container stats: {e}")
+            if state["container_state"] == "running":
+                container_stats.update(state.get("usage") or {})
+                usage_age = time.monotonic() - state.get("usage_at", float("-inf"))
+                if (
+                    usage_age > settings.MODULE_STATS_TTL_SECONDS
+                    and container_id not in self._sampling
+                ):
+                    self._sampling.add(container_id)
+                    self._spawn(self._sample_usage(container_id))
 
         # Build response
         return ModuleStatusResponse(
             module_name=module_doc["module_name"],
             display_name=module_doc["display_name"],
-            status=module_doc["status"],
-            health=module_doc["health"],
-            container_id=module_doc.get("container_id"),
+            status=status,
+            health=health,
+            container_id=container_id,
             container_name=module_doc.get("container_name"),
             error_message=module_doc.get("error_message"),
             error_count=module_doc.get("error_count", 0),
@@ -1134,6 +1358,23 @@ class ModuleManager:
             **container_stats,
         )
 
+    async def _sample_usage(self, container_id: str) -> None:
+        """Take a resource usage sample of a container into the cache."""
+        try:
+            await module_ops.run(self._ensure_docker_client)
+            container = await module_ops.run(
+                self.docker_client.containers.get, container_id
+            )
+            stats = await module_ops.run(partial(container.stats, stream=False))
+            if stats:
+                container_states.set_usage(container_id, _resource_usage(stats))
+        except docker.errors.NotFound:
+            logger.warning(f"Container not found: {container_id}")
+        except Exception as e:
+            logger.error(f"Error getting container stats: {e}")
+        finally:
+            self._sampling.discard(container_id)
+
     # =========================================================================
     # Validation and Security
     # =========================================================================
@@ -0,0 +1,292 @@
+"""
+A64 Core Platform — Module Operations Executor and Container State Cache
+
+The Docker SDK and the nginx ``exec_run`` calls are blocking HTTP requests
+against the daemon socket; an image pull can take minutes.  Made from a
+request handler they stall every other request the worker is serving, so
+ModuleManager and ProxyManager run them through this module instead:
+
+- ``module_ops`` — a thread pool of ``MODULE_OPS_WORKERS`` threads with a
+  per-call timeout (``MODULE_OPS_TIMEOUT_SECONDS`` unless the caller passes
+  one).  A call that overruns raises ``ModuleOpTimeout`` (a RuntimeError, so
+  existing error handling maps it to a failed operation); its thread cannot
+  be interrupted and finishes in the background, still holding its worker.
+
+- ``container_states`` — the last known state of every managed container
+  (label ``a64core.managed=true``), kept current by a background thread
+  subscribed to the daemon's container event stream.  The status and list
+  endpoints read only this cache and MongoDB.  The stream is opened before
+  the containers are listed, so nothing that happens while priming is
+  missed; each event re-inspects its container.  When the stream drops the
+  thread reconnects with backoff and re-primes, and ``synced`` is False
+  until it has.
+
+Both are process-wide singletons; the application's startup hook starts the
+event subscription and its shutdown hook stops both.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from dateutil import parser as date_parser
+from docker.errors import NotFound
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MANAGED_LABEL = "a64core.managed=true"
+
+_RECONNECT_MAX_SECONDS = 30
+
+
+class ModuleOpTimeout(RuntimeError):
+    """A Docker or nginx operation did not finish within its timeout."""
+
+
+# =============================================================================
+# Executor
+# =============================================================================
+
+
+class ModuleOpsExecutor:
+    """Lazily created thread pool for blocking Docker and nginx calls."""
+
+    def __init__(self) -> None:
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._workers = 0
+        self._in_flight = 0
+        self._timed_out = 0
+
+    def _ensure_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._workers = max(1, settings.MODULE_OPS_WORKERS)
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="module-ops"
+            )
+            logger.info(f"Module ops pool started with {self._workers} thread(s)")
+        return self._pool
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run ``func(*args)`` in the pool.
+
+        Args:
+            func: Blocking callable (use functools.partial for keyword args).
+            timeout: Seconds to wait; defaults to MODULE_OPS_TIMEOUT_SECONDS.
+
+        Raises:
+            ModuleOpTimeout: If the call has not returned within ``timeout``.
+        """
+        if timeout is None:
+            timeout = settings.MODULE_OPS_TIMEOUT_SECONDS
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._ensure_pool(), func, *args)
+
+        self._in_flight += 1
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            name = getattr(func, "__qualname__", None) or repr(func)
+            raise ModuleOpTimeout(
+                f"Docker operation {name} timed out after {timeout:g}s"
+            ) from None
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self._workers,
+            "inFlight": self._in_flight,
+            "timedOut": self._timed_out,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._pool = None
+
+
+# =============================================================================
+# Container state cache
+# =============================================================================
+
+
+def _docker_time(value: Optional[str]) -> Optional[datetime]:
+    """Naive-UTC datetime of a Docker timestamp; None for its zero time."""
+    if not value or value.startswith("0001-"):
+        return None
+    return date_parser.isoparse(value).replace(tzinfo=None)
+
+
+def container_snapshot(container) -> Dict[str, Any]:
+    """The cached fields of an inspected container."""
+    attrs = container.attrs or {}
+    state = attrs.get("State") or {}
+    labels = (attrs.get("Config") or {}).get("Labels") or {}
+    return {
+        "container_id": container.id,
+        "container_name": container.name,
+        "module_name": labels.get("a64core.module"),
+        "container_state": state.get("Status"),
+        "health": (state.get("Health") or {}).get("Status"),
+        "started_at": _docker_time(state.get("StartedAt")),
+        "finished_at": _docker_time(state.get("FinishedAt")),
+        "exit_code": state.get("ExitCode"),
+        "restart_count": attrs.get("RestartCount", 0),
+    }
+
+
+class ContainerStateCache:
+    """Managed containers' last known state, fed by the Docker event stream."""
+
+    def __init__(self, label: str = MANAGED_LABEL) -> None:
+        self._label = label
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._stream = None
+        self._synced = False
+
+    # -- reads ----------------------------------------------------------------
+
+    @property
+    def synced(self) -> bool:
+        """Whether the event subscription is live (else states may be stale)."""
+        return self._synced
+
+    def get(self, container_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._states.get(container_id)
+            return dict(state) if state is not None else None
+
+    # -- writes ---------------------------------------------------------------
+
+    def put(self, container) -> None:
+        """Store an inspected container's state (keeping its usage sample)."""
+        snapshot = container_snapshot(container)
+        with self._lock:
+            previous = self._states.get(container.id) or {}
+            for key in ("usage", "usage_at"):
+                if key in previous:
+                    snapshot[key] = previous[key]
+            self._states[container.id] = snapshot
+
+    def discard(self, container_id: str) -> None:
+        with self._lock:
+            self._states.pop(container_id, None)
+
+    def set_usage(self, container_id: str, usage: Dict[str, Any]) -> None:
+        """Attach a resource usage sample to a cached container."""
+        with self._lock:
+            state = self._states.get(container_id)
+            if state is not None:
+                state["usage"] = usage
+                state["usage_at"] = time.monotonic()
+
+    # -- subscription ---------------------------------------------------------
+
+    def start(self, client_factory: Callable[[], Any]) -> None:
+        """
+        Subscribe to the daemon's events on a background thread.
+
+        Args:
+            client_factory: Returns a Docker client; called again on every
+                reconnect.  The stream blocks its connection, so this should
+                be a client of its own.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(client_factory,),
+            name="docker-events",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stopping.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _watch(self, client_factory: Callable[[], Any]) -> None:
+        backoff = 1
+        while not self._stopping.is_set():
+            try:
+                client = client_factory()
+                # Subscribe before listing: changes made while priming arrive
+                # as events and are re-inspected
+                self._stream = client.events(
+                    decode=True,
+                    filters={"type": "container", "label": self._label},
+                )
+                self._prime(client)
+                self._synced = True
+                backoff = 1
+                logger.info("Container state cache synced with Docker events")
+                for event in self._stream:
+                    if self._stopping.is_set():
+                        break
+                    self._apply(client, event)
+            except Exception as e:
+                if not self._stopping.is_set():
+                    logger.warning(f"Docker event stream lost: {e}")
+            self._synced = False
+            self._stream = None
+            if self._stopping.wait(backoff):
+                break
+            backoff = min(backoff * 2, _RECONNECT_MAX_SECONDS)
+
+    def _prime(self, client) -> None:
+        containers = client.containers.list(all=True, filters={"label": self._label})
+        fresh = {}
+        for container in containers:
+            fresh[container.id] = container_snapshot(container)
+        with self._lock:
+            for container_id, snapshot in fresh.items():
+                previous = self._states.get(container_id) or {}
+                for key in ("usage", "usage_at"):
+                    if key in previous:
+                        snapshot[key] = previous[key]
+            self._states = fresh
+
+    def _apply(self, client, event: Dict[str, Any]) -> None:
+        action = event.get("Action") or event.get("status") or ""
+        container_id = event.get("id") or (event.get("Actor") or {}).get("ID")
+        # exec_* events (the nginx -t / reload probes) do not change state
+        if not container_id or action.startswith("exec_"):
+            return
+        if action == "destroy":
+            self.discard(container_id)
+            return
+        try:
+            container = client.containers.get(container_id)
+        except NotFound:
+            self.discard(container_id)
+            return
+        self.put(container)
+
+
+module_ops = ModuleOpsExecutor()
+container_states = ContainerStateCache()
@@ -17,6 +17,7 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from ..core.indexes import declare_index
 from ..models.module import PortAllocation, PortRange
 
 logger = logging.getLogger(__name__)
@@ -44,20 +45,24 @@ class PortManager:
         )
 
     async def _ensure_indexes(self):
-        """Create database indexes for efficient port lookups"""
+        """Declare database indexes for efficient port lookups"""
+        self._declare_indexes()
+        logger.info("Port registry indexes declared")
+
+    @staticmethod
+    def _declare_indexes() -> None:
+        """Declare the port_registry indexes (reconciled by src.core.indexes)"""
         # Index on port for fast conflict detection
-        await self.db.port_registry.create_index("port", unique=True)
+        declare_index("port_registry", "port", unique=True)
 
         # Index on module_name for fast module port lookups
-        await self.db.port_registry.create_index("module_name")
+        declare_index("port_registry", "module_name")
 
         # Index on status for filtering active ports
-        await self.db.port_registry.create_index("status")
+        declare_index("port_registry", "status")
 
         # Compound index for efficient queries
-        await self.db.port_registry.create_index([("module_name", 1), ("status", 1)])
-
-        logger.info("Port registry indexes created")
+        declare_index("port_registry", [("module_name", 1), ("status", 1)])
 
     async def allocate_ports(
         self, module_name: str, internal_ports: List[int]
@@ -10,6 +10,9 @@ Key Features:
 - Remove routes on module uninstallation
 - Support for WebSocket, SSE, and long-running connections
 - Production-ready configuration with security headers
+
+The ``nginx -t`` / ``nginx -s reload`` execs are blocking Docker API calls and
+run on the module ops thread pool (src/services/module_ops.py).
 """
 
 import logging
@@ -19,6 +22,8 @@ from typing import Dict, Optional
 from pathlib import Path
 import docker
 
+from .module_ops import module_ops
+
 logger = logging.getLogger(__name__)
 
 
@@ -196,7 +201,7 @@ class ProxyManager:
             logger.info(f"Created NGINX config file: {config_file_path}")
 
             # Test NGINX configuration
-            if not self._test_nginx_config():
+            if not await self.test_nginx_config():
                 logger.error("NGINX configuration test failed - rolling back")
                 self._remove_config_file(module_name)
                 return False
@@ -235,7 +240,7 @@ class ProxyManager:
                 return True  # Already removed
 
             # Test NGINX configuration
-            if not self._test_nginx_config():
+            if not await self.test_nginx_config():
                 logger.error("NGINX configuration test failed after removing config")
                 return False
 
@@ -270,6 +275,14 @@ class ProxyManager:
         else:
             return False
 
+    async def test_nginx_config(self) -> bool:
+        """Test NGINX configuration off the event loop (see _test_nginx_config)."""
+        try:
+            return await module_ops.run(self._test_nginx_config)
+        except Exception as e:
+            logger.error(f"Failed to test NGINX configuration: {e}")
+            return False
+
     def _test_nginx_config(self) -> bool:
         """
         Test NGINX configuration for syntax errors.
@@ -307,6 +320,13 @@ class ProxyManager:
         Returns:
             True if successful, False otherwise
         """
+        try:
+            return await module_ops.run(self._reload_nginx)
+        except Exception as e:
+            logger.error(f"Failed to reload NGINX: {e}")
+            return False
+
+    def _reload_nginx(self) -> bool:
         if not self.docker_client:
             logger.warning("Docker client not available - skipping NGINX reload")
             return True
@@ -11,6 +11,7 @@ import logging
 
 from fastapi import HTTPException, status
 
+from ..core.tokens import revoke_user_tokens
 from ..models.user import UserResponse, UserUpdate, UserRole, UserOrganizationAssignment
 from ..middleware.permissions import guard_target_not_super_admin
 from .audit_log_service import write_user_audit_log
@@ -355,10 +356,11 @@ class UserService:
             },
         )
 
-        # Revoke all refresh tokens
+        # Revoke all refresh tokens and issued access tokens
         await db.refresh_tokens.update_many(
             {"userId": user_id, "isRevoked": False}, {"$set": {"isRevoked": True}}
         )
+        await revoke_user_tokens(db, user_id, "deleted")
 
         logger.info(f"User soft deleted: {user_id}")
 
@@ -516,10 +518,11 @@ class UserService:
             {"$set": {"isActive": False, "updatedAt": datetime.utcnow()}},
         )
 
-        # Revoke all refresh tokens
+        # Revoke all refresh tokens and issued access tokens
         await db.refresh_tokens.update_many(
             {"userId": user_id, "isRevoked": False}, {"$set": {"isRevoked": True}}
         )
+        await revoke_user_tokens(db, user_id, "deactivated")
 
         logger.info(f"User deactivated: {user_id}")
 
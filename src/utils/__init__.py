@@ -3,6 +3,9 @@
 from .security import (
     hash_password,
     verify_password,
+    hash_password_async,
+    verify_password_async,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -14,6 +17,9 @@ from .security import (
 __all__ = [
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "verify_and_update_password",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
@@ -0,0 +1,143 @@
+"""
+A64 Core Platform — Crypto Executor
+
+bcrypt at cost 12 takes ~250ms of pure CPU.  Run on the event loop, a burst
+of logins stalls every other request the worker is serving, so all password
+hashing and verification goes through this module instead: a process pool
+sized to the cores (``CRYPTO_POOL_WORKERS``, 0 = ``os.cpu_count()``) does the
+work while the loop keeps serving.
+
+Admission control
+-----------------
+At most ``CRYPTO_QUEUE_PER_WORKER`` hashes may wait per worker behind the
+ones running.  Past that the pool is saturated and new work is refused with
+``CryptoPoolSaturated`` — an HTTP 429 with ``Retry-After`` — rather than
+queueing logins whose clients would time out long before their turn.
+
+The pool is created lazily on first use with the ``spawn`` start method (the
+parent runs Motor's threads, which ``fork`` must not copy) and is closed by
+the application's shutdown hook.  The worker functions below are module-level
+so they pickle by reference.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CryptoPoolSaturated(HTTPException):
+    """The crypto pool's queue is full; the request should be retried."""
+
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent sign-in attempts. Please retry shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+# =============================================================================
+# Worker functions (run inside the pool's processes)
+# =============================================================================
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def bcrypt_hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def bcrypt_verify(password: str, hashed: str, rounds: int) -> bool:
+    return _context(rounds).verify(password, hashed)
+
+
+def bcrypt_verify_and_update(
+    password: str, hashed: str, rounds: int
+) -> Tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, hashed)
+
+
+# =============================================================================
+# Executor
+# =============================================================================
+
+
+class CryptoExecutor:
+    """Bounded, lazily created process pool for CPU-heavy password hashing."""
+
+    def __init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._in_flight = 0
+        self._rejected = 0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._workers = max(1, settings.CRYPTO_POOL_WORKERS or os.cpu_count() or 1)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Crypto pool started with {self._workers} worker(s)")
+        return self._pool
+
+    @property
+    def capacity(self) -> int:
+        """Jobs admitted at once: one running per worker plus its queue."""
+        return self._workers * (1 + max(0, settings.CRYPTO_QUEUE_PER_WORKER))
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``func(*args)`` in the pool.
+
+        Raises:
+            CryptoPoolSaturated: If ``capacity`` jobs are already admitted.
+        """
+        pool = self._ensure_pool()
+        if self._in_flight >= self.capacity:
+            self._rejected += 1
+            raise CryptoPoolSaturated()
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM-killed, ...): replace the pool and retry once
+                logger.error("Crypto pool broken; restarting it")
+                self.shutdown(wait=False)
+                return await loop.run_in_executor(self._ensure_pool(), func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self._workers,
+            "capacity": self.capacity,
+            "inFlight": self._in_flight,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._pool = None
+
+
+crypto_executor = CryptoExecutor()
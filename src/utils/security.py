@@ -8,21 +8,42 @@ Following User-Structure.md security requirements
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import time
 import uuid
 
 from ..config.settings import settings
+from ..core.tokens import verify_token
 from ..models.user import TokenPayload, UserRole
+from .crypto_executor import (
+    crypto_executor,
+    bcrypt_hash,
+    bcrypt_verify,
+    bcrypt_verify_and_update,
+)
 
 # Password hashing context
 # Reason: Using bcrypt with cost factor 12 per User-Structure.md
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+def _truncate(password: str) -> str:
+    # Truncate password to 72 bytes for bcrypt compatibility
+    # Reason: bcrypt has a 72-byte limit
+    if len(password.encode("utf-8")) > 72:
+        password = password[:72]
+    return password
 
 
 def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt
 
+    Blocks for the full cost of bcrypt; request handlers use
+    ``hash_password_async`` instead.
+
     Args:
         password: Plain text password
 
@@ -31,11 +52,7 @@ def hash_password(password: str) -> str:
 
     Security: Uses bcrypt with cost factor 12 (User-Structure.md)
     """
-    # Truncate password to 72 bytes for bcrypt compatibility
-    # Reason: bcrypt has a 72-byte limit
-    if len(password.encode("utf-8")) > 72:
-        password = password[:72]
-    return pwd_context.hash(password)
+    return pwd_context.hash(_truncate(password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -52,8 +69,60 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the crypto pool, off the event loop
+
+    Raises:
+        CryptoPoolSaturated: 429 if the pool's queue is full
+    """
+    return await crypto_executor.run(
+        bcrypt_hash, _truncate(password), settings.BCRYPT_ROUNDS
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the crypto pool, off the event loop
+
+    Raises:
+        CryptoPoolSaturated: 429 if the pool's queue is full
+    """
+    return await crypto_executor.run(
+        bcrypt_verify, plain_password, hashed_password, settings.BCRYPT_ROUNDS
+    )
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its cost is outdated
+
+    Used at login so that changing BCRYPT_ROUNDS upgrades each stored hash
+    the next time its owner signs in.
+
+    Returns:
+        Tuple of (is_valid, new_hash); new_hash is None unless the password
+        is valid and its stored hash needs replacing
+
+    Raises:
+        CryptoPoolSaturated: 429 if the pool's queue is full
+    """
+    return await crypto_executor.run(
+        bcrypt_verify_and_update,
+        plain_password,
+        hashed_password,
+        settings.BCRYPT_ROUNDS,
+    )
+
+
 def create_access_token(
-    user_id: str, email: str, role: UserRole, expires_delta: Optional[timedelta] = None
+    user_id: str,
+    email: str,
+    role: UserRole,
+    expires_delta: Optional[timedelta] = None,
+    session_id: Optional[str] = None,
 ) -> str:
     """
     Create JWT access token
@@ -63,6 +132,8 @@ def create_access_token(
         email: User's email
         role: User's role
         expires_delta: Optional custom expiration time
+        session_id: tokenId of the refresh token issued alongside (``sid``
+            claim), so that logging that session out revokes this token too
 
     Returns:
         Encoded JWT token
@@ -70,7 +141,7 @@ def create_access_token(
     Token Configuration (User-Structure.md):
     - Algorithm: HS256
     - Default Expiry: 1 hour
-    - Payload: {userId, email, role, exp}
+    - Payload: {userId, email, role, exp, iat[, sid]}
     """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -83,8 +154,12 @@ def create_access_token(
         "email": email,
         "role": role.value if isinstance(role, UserRole) else role,
         "exp": expire,
+        # Sub-second issue time: user-wide revocations cut off at "now"
+        "iat": time.time(),
         "type": "access",
     }
+    if session_id:
+        to_encode["sid"] = session_id
 
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
@@ -110,7 +185,7 @@ def create_refresh_token(
     Token Configuration (User-Structure.md):
     - Algorithm: HS256
     - Default Expiry: 7 days
-    - Payload: {userId, tokenId, exp}
+    - Payload: {userId, tokenId, exp, iat}
     """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -125,6 +200,7 @@ def create_refresh_token(
         "userId": user_id,
         "tokenId": token_id,
         "exp": expire,
+        "iat": time.time(),
         "type": "refresh",
     }
 
@@ -137,46 +213,58 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decode and validate JWT token
 
+    Goes through the shared verified-token cache (src.core.tokens), which
+    also rejects revoked tokens.
+
     Args:
         token: JWT token string
 
     Returns:
-        Token payload if valid, None otherwise
-
-    Raises:
-        JWTError: If token is invalid or expired
+        Token payload if valid, None otherwise (invalid, expired or revoked)
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        return payload
+        return verify_token(token)
     except JWTError:
         return None
 
 
-def verify_access_token(token: str) -> Optional[TokenPayload]:
+def token_payload_from_claims(
+    payload: Optional[Dict[str, Any]],
+) -> Optional[TokenPayload]:
     """
-    Verify and decode access token
+    Build the access-token payload from already decoded JWT claims
 
     Args:
-        token: JWT access token
+        payload: Claims returned by decode_token
 
     Returns:
-        TokenPayload if valid, None otherwise
+        TokenPayload if the claims are those of an access token, None otherwise
     """
-    try:
-        payload = decode_token(token)
-
-        if not payload or payload.get("type") != "access":
-            return None
+    if not payload or payload.get("type") != "access":
+        return None
 
-        token_data = TokenPayload(
+    try:
+        return TokenPayload(
             userId=payload.get("userId"),
             email=payload.get("email"),
             role=payload.get("role"),
         )
+    except Exception:
+        return None
 
-        return token_data
 
+def verify_access_token(token: str) -> Optional[TokenPayload]:
+    """
+    Verify and decode access token
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        TokenPayload if valid, None otherwise
+    """
+    try:
+        return token_payload_from_claims(decode_token(token))
     except Exception:
         return None
 
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+watchdog_benchmark.py
+Watchdog checker benchmark (no MongoDB / SenseHub needed)
+
+Builds an in-memory farm of N blocks (default 5,000) with a share of them in
+ALERT state, stale IoT sync, late harvest cycles, active alerts and
+unreachable MCP servers, then times the watchdog checkers:
+
+  - sequential: each checker on its own lookup cache, one after another
+    (the pre-parallel behaviour, minus the old 200/500 result caps)
+  - parallel:   WatchdogService-style — all checkers concurrently on one
+    shared per-run lookup cache
+
+Every Mongo round-trip and MCP probe is given a fixed simulated latency so
+the numbers reflect I/O overlap, not Python speed.
+
+Usage:
+    python tests/performance/watchdog_benchmark.py
+    python tests/performance/watchdog_benchmark.py --blocks 5000 --db-latency-ms 2 --probe-latency-ms 40
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.modules.farm_manager.services.watchdog.checkers import (  # noqa: E402
+    mcp_checker,
+)
+from src.modules.farm_manager.services.watchdog.lookup import (  # noqa: E402
+    WatchdogLookupCache,
+)
+from src.modules.farm_manager.services.watchdog.service import CHECKERS  # noqa: E402
+
+CURSOR_BATCH = 101  # MongoDB's default first batch size
+
+
+def _get(doc, path):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return None, False
+        doc = doc[part]
+    return doc, True
+
+
+def _matches(doc, query):
+    """Just enough of the MongoDB query language for the watchdog queries."""
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value, present = _get(doc, key)
+        if isinstance(cond, dict):
+            for op, arg in cond.items():
+                if op == "$in" and value not in arg:
+                    return False
+                if op == "$lt" and not (present and value is not None and value < arg):
+                    return False
+                if op == "$gt" and not (present and value is not None and value > arg):
+                    return False
+                if op == "$ne" and value == arg:
+                    return False
+                if op == "$exists" and present != arg:
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs, latency):
+        self._docs = docs
+        self._latency = latency
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for start in range(0, len(self._docs), CURSOR_BATCH):
+            await asyncio.sleep(self._latency)  # one getMore round-trip
+            for doc in self._docs[start : start + CURSOR_BATCH]:
+                yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs, stats, latency):
+        self.docs = docs
+        self.stats = stats
+        self.latency = latency
+
+    def find(self, query=None, projection=None):
+        self.stats["finds"] += 1
+        return FakeCursor(
+            [d for d in self.docs if _matches(d, query or {})], self.latency
+        )
+
+
+class FakeDB:
+    def __init__(self, collections, latency):
+        self.stats = {"finds": 0}
+        self._latency = latency
+        self._collections = {
+            name: FakeCollection(docs, self.stats, latency)
+            for name, docs in collections.items()
+        }
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(
+            name, FakeCollection([], self.stats, self._latency)
+        )
+
+
+def build_farm(n_blocks: int, seed: int = 7):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    farms = [
+        {"farmId": f"farm-{i}", "name": f"Farm {i}"}
+        for i in range(max(1, n_blocks // 100))
+    ]
+    blocks, cycles, alerts = [], [], []
+    for i in range(n_blocks):
+        farm = farms[i % len(farms)]
+        block_id = f"block-{i}"
+        iot_enabled = rng.random() < 0.6
+        blocks.append(
+            {
+                "blockId": block_id,
+                "name": f"B{i}",
+                "farmId": farm["farmId"],
+                "currentState": "ALERT" if rng.random() < 0.05 else "GROWING",
+                "iotController": {
+                    "enabled": iot_enabled,
+                    "address": f"10.0.{i // 250}.{i % 250}",
+                    "mcpPort": 8080 if iot_enabled else None,
+                    "lastSyncedAt": now - timedelta(hours=rng.choice([1, 2, 6, 30])),
+                },
+            }
+        )
+        if rng.random() < 0.2:
+            cycles.append(
+                {
+                    "cycleId": f"cycle-{i}",
+                    "blockId": block_id,
+                    "status": "active",
+                    "currentStage": "growing",
+                    "estimatedHarvestStartDate": now
+                    - timedelta(days=rng.randint(0, 20)),
+                    "actualHarvestStartDate": None,
+                }
+            )
+        if rng.random() < 0.1:
+            alerts.append(
+                {
+                    "alertId": f"alert-{i}",
+                    "blockId": block_id,
+                    "status": "active",
+                    "severity": rng.choice(["high", "critical"]),
+                    "alertType": "temperature",
+                    "createdAt": now - timedelta(hours=rng.randint(1, 72)),
+                }
+            )
+    return {"farms": farms, "blocks": blocks, "block_cycles": cycles, "alerts": alerts}
+
+
+def mock_transport(probe_latency: float, unreachable_ratio: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(probe_latency)
+        if int(request.url.host.rsplit(".", 1)[-1]) % 100 < unreachable_ratio * 100:
+            return httpx.Response(503)
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler)
+
+
+async def run_checkers(db, names, parallel: bool):
+    shared = WatchdogLookupCache(db)
+
+    async def one(name):
+        lookup = shared if parallel else WatchdogLookupCache(db)
+        checker = CHECKERS[name](db, lookup)
+        started = time.perf_counter()
+        issues = await checker.run()
+        return (
+            name,
+            (time.perf_counter() - started) * 1000,
+            checker.scanned,
+            len(issues),
+        )
+
+    started = time.perf_counter()
+    if parallel:
+        rows = await asyncio.gather(*[one(n) for n in names])
+    else:
+        rows = [await one(n) for n in names]
+    return (time.perf_counter() - started) * 1000, rows
+
+
+async def main_async(args) -> None:
+    if args.probe_budget:
+        mcp_checker.settings.WATCHDOG_MCP_PROBE_CONCURRENCY = args.probe_budget
+    data = build_farm(args.blocks)
+    names = ["mcp_reachability", "late_items", "active_alerts", "block_health"]
+    transport = mock_transport(args.probe_latency_ms / 1000, args.unreachable)
+    real_client = httpx.AsyncClient
+
+    def client_factory(*a, **kw):
+        kw["transport"] = transport
+        return real_client(*a, **kw)
+
+    print(
+        f"Blocks: {len(data['blocks'])}  cycles: {len(data['block_cycles'])}  "
+        f"alerts: {len(data['alerts'])}  probe budget: "
+        f"{mcp_checker.settings.WATCHDOG_MCP_PROBE_CONCURRENCY}"
+    )
+    with patch.object(mcp_checker.httpx, "AsyncClient", client_factory):
+        for label, parallel in (("sequential", False), ("parallel", True)):
+            db = FakeDB(data, args.db_latency_ms / 1000)
+            total_ms, rows = await run_checkers(db, names, parallel)
+            print(
+                f"\n{label}: {total_ms:,.0f} ms total, {db.stats['finds']} find() calls"
+            )
+            for name, ms, scanned, issues in rows:
+                print(
+                    f"  {name:<18} {ms:>9,.0f} ms  scanned={scanned:<6} issues={issues}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the watchdog checkers")
+    parser.add_argument("--blocks", type=int, default=5000)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--probe-latency-ms", type=float, default=40.0)
+    parser.add_argument("--unreachable", type=float, default=0.05)
+    parser.add_argument(
+        "--probe-budget",
+        type=int,
+        default=None,
+        help="Override WATCHDOG_MCP_PROBE_CONCURRENCY for this run",
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Tests for the AI analytics query engine cache
+(src/modules/ai_analytics/services/query_engine.py).
+
+Governed query results are shared by everyone running the same pipeline over
+the same data; the generated report answers one user's question, so it is
+only served back to that user for that prompt.
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.modules.ai_analytics.services import query_engine as query_engine_module
+from src.modules.ai_analytics.services.query_engine import QueryEngine
+from src.modules.ai_analytics.services.query_governor import GovernedResult
+
+PIPELINE = [{"$match": {"status": "active"}}]
+
+
+def _engine(monkeypatch):
+    gemini = MagicMock()
+    gemini.generate_mongodb_query = AsyncMock(
+        return_value={
+            "collection": "farms",
+            "query": PIPELINE,
+            "explanation": "Active farms",
+            "estimated_cost": {},
+        }
+    )
+    gemini.generate_report = AsyncMock(
+        side_effect=lambda **kw: {"summary": f"Report for: {kw['user_prompt']}"}
+    )
+    schema = MagicMock()
+    schema.get_schema_as_json = AsyncMock(return_value="{}")
+    schema.get_schema = AsyncMock(return_value={"collections": {"farms": {}}})
+    monkeypatch.setattr(query_engine_module, "get_gemini_service", lambda: gemini)
+    monkeypatch.setattr(
+        query_engine_module, "get_schema_service", lambda client, name: schema
+    )
+
+    engine = QueryEngine(MagicMock(), "a64_test")
+    engine.query_validator = MagicMock()
+
+    @asynccontextmanager
+    async def _slot(user_id):
+        yield
+
+    governor = MagicMock()
+    governor.user_slot = _slot
+    governor.cache_key = AsyncMock(return_value="pipeline-and-data-version")
+    governor.execute = AsyncMock(
+        return_value=GovernedResult(pipeline=PIPELINE, results=[{"farmId": "f1"}])
+    )
+    engine.governor = governor
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_reports_are_cached_per_user_and_prompt(monkeypatch):
+    engine = _engine(monkeypatch)
+
+    first = await engine.execute_ai_query("How many active farms?", "alice")
+    other_user = await engine.execute_ai_query("How many active farms?", "bob")
+    other_prompt = await engine.execute_ai_query("List active farms", "alice")
+    repeat = await engine.execute_ai_query("How many active farms?", "alice")
+
+    # One database run serves every caller...
+    engine.governor.execute.assert_awaited_once()
+    assert other_user["metadata"]["results_cache_hit"] is True
+    assert other_prompt["results"] == first["results"]
+    # ...but each caller gets a report written for their own question.
+    assert other_user["metadata"]["cache_hit"] is False
+    assert other_prompt["report"]["summary"] == "Report for: List active farms"
+    assert engine.gemini_service.generate_report.await_count == 3
+    assert repeat["metadata"]["cache_hit"] is True
+    assert repeat["report"] == first["report"]
+    assert engine.get_cache_stats()["response_entries"] == 3
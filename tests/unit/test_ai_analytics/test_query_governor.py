@@ -0,0 +1,193 @@
+"""
+Tests for the AI analytics query governor
+(src/modules/ai_analytics/services/query_governor.py).
+
+The governor must plan pipelines with explain, bound collection scans and
+result sizes, refuse unindexed joins into large collections, and key the
+result cache on the normalized pipeline plus data version.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo import ReadPreference
+
+from src.modules.ai_analytics.services.query_governor import (
+    GovernorPolicy,
+    QueryConcurrencyError,
+    QueryGovernor,
+    QueryRejectedError,
+)
+
+COLLSCAN_EXPLAIN = {
+    "queryPlanner": {
+        "winningPlan": {"stage": "PROJECTION", "inputStage": {"stage": "COLLSCAN"}},
+        "rejectedPlans": [],
+    }
+}
+IXSCAN_EXPLAIN = {
+    "queryPlanner": {
+        "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+        # A rejected collection scan must not count against the query.
+        "rejectedPlans": [{"stage": "COLLSCAN"}],
+    }
+}
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+        self.close = AsyncMock()
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self._docs:
+            yield doc
+
+
+def _db(counts, explain=IXSCAN_EXPLAIN, indexes=None, docs=()):
+    """Fake Motor db with per-collection sizes, indexes and aggregate output."""
+    collections = {}
+
+    def _get(name):
+        if name not in collections:
+            coll = MagicMock()
+            coll.estimated_document_count = AsyncMock(return_value=counts.get(name, 0))
+            coll.index_information = AsyncMock(
+                return_value={
+                    f"{f}_1": {"key": [(f, 1)]}
+                    for f in ["_id", *(indexes or {}).get(name, [])]
+                }
+            )
+            coll.find_one = AsyncMock(return_value={"_id": f"{name}-newest"})
+            coll.cursor = _Cursor(list(docs))
+            coll.aggregate = MagicMock(return_value=coll.cursor)
+            coll.with_options = MagicMock(return_value=coll)
+            collections[name] = coll
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=_get)
+    db.command = AsyncMock(return_value=explain)
+    return db
+
+
+@pytest.mark.asyncio
+async def test_collection_scan_on_large_collection_is_windowed_and_capped():
+    db = _db({"harvests": 2_000_000}, explain=COLLSCAN_EXPLAIN)
+    governor = QueryGovernor(db, GovernorPolicy(scan_window=50_000, max_results=100))
+    pipeline = [{"$group": {"_id": "$farmId", "total": {"$sum": "$quantity"}}}]
+
+    governed, rewrites, plan = await governor.plan("harvests", pipeline)
+
+    assert governed[:2] == [{"$sort": {"_id": -1}}, {"$limit": 50_000}]
+    assert governed[2] == pipeline[0]
+    assert governed[-1] == {"$limit": 100}
+    assert plan["collection_scan"] is True
+    assert len(rewrites) == 2
+
+
+@pytest.mark.asyncio
+async def test_windowed_scan_and_row_cap_mark_the_result_truncated():
+    docs = [{"_id": f"farm-{i}", "total": i} for i in range(3)]
+    db = _db({"harvests": 2_000_000}, explain=COLLSCAN_EXPLAIN, docs=docs)
+    governor = QueryGovernor(db, GovernorPolicy(scan_window=50_000, max_results=3))
+    pipeline = [{"$group": {"_id": "$farmId", "total": {"$sum": "$quantity"}}}]
+
+    result = await governor.execute("harvests", pipeline)
+
+    assert result.truncated is True
+    assert len(result.limitations) == 2
+    assert "50,000 most recent of 2,000,000" in result.limitations[0]
+    assert "3-row cap" in result.limitations[1]
+    assert result.summary()["limitations"] == result.limitations
+
+    untouched = QueryGovernor(_db({"farms": 40}, docs=docs))
+    result = await untouched.execute("farms", [{"$limit": 10}])
+    assert result.truncated is False and result.limitations == []
+
+
+@pytest.mark.asyncio
+async def test_small_collection_scans_and_index_plans_run_unchanged():
+    governor = QueryGovernor(_db({"farms": 40}, explain=COLLSCAN_EXPLAIN))
+    pipeline = [{"$match": {"status": "active"}}, {"$limit": 10}]
+
+    governed, rewrites, _ = await governor.plan("farms", pipeline)
+
+    assert governed == pipeline and rewrites == []
+
+    governor = QueryGovernor(_db({"harvests": 2_000_000}))
+    governed, rewrites, plan = await governor.plan("harvests", pipeline)
+    assert governed == pipeline and plan["collection_scan"] is False
+
+
+@pytest.mark.asyncio
+async def test_unindexed_lookup_into_large_collection_is_rejected():
+    db = _db({"blocks": 100, "harvests": 2_000_000}, indexes={"harvests": ["blockId"]})
+    governor = QueryGovernor(db)
+    lookup = {
+        "from": "harvests",
+        "localField": "name",
+        "foreignField": "blockName",
+        "as": "h",
+    }
+
+    with pytest.raises(QueryRejectedError, match="unindexed field 'blockName'"):
+        await governor.plan("blocks", [{"$lookup": lookup}])
+
+    lookup["foreignField"] = "blockId"
+    governed, _, _ = await governor.plan("blocks", [{"$lookup": lookup}])
+    assert governed[0] == {"$lookup": lookup}
+
+
+@pytest.mark.asyncio
+async def test_execute_streams_under_byte_budget_with_run_limits():
+    docs = [{"_id": i, "payload": "x" * 100} for i in range(50)]
+    db = _db({"harvests": 10}, docs=docs)
+    policy = GovernorPolicy(max_time_ms=1234, max_result_bytes=1000)
+    governor = QueryGovernor(db, policy)
+
+    result = await governor.execute("harvests", [{"$limit": 50}], user_role="user")
+
+    coll = db["harvests"]
+    coll.with_options.assert_called_once_with(
+        read_preference=ReadPreference.SECONDARY_PREFERRED
+    )
+    kwargs = coll.aggregate.call_args.kwargs
+    assert kwargs["maxTimeMS"] == 1234
+    assert kwargs["allowDiskUse"] is False
+    assert result.truncated is True
+    assert 0 < len(result.results) < 50
+    assert result.result_bytes <= 1000
+    coll.cursor.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_per_user_concurrency_limit():
+    governor = QueryGovernor(_db({}), GovernorPolicy(per_user_concurrency=1))
+
+    async with governor.user_slot("u1"):
+        with pytest.raises(QueryConcurrencyError):
+            async with governor.user_slot("u1"):
+                pass
+        async with governor.user_slot("u2"):
+            pass
+
+    async with governor.user_slot("u1"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cache_key_ignores_key_order_and_tracks_data_version():
+    db = _db({"harvests": 10})
+    governor = QueryGovernor(db)
+    a = [{"$match": {"farmId": "f1", "status": "done"}}, {"$limit": 5}]
+    b = [{"$match": {"status": "done", "farmId": "f1"}}, {"$limit": 5}]
+
+    key = await governor.cache_key("harvests", a)
+    assert key == await governor.cache_key("harvests", b)
+
+    db["harvests"].find_one.return_value = {"_id": "newer-insert"}
+    assert await governor.cache_key("harvests", a) != key
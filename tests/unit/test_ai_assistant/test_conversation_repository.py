@@ -6,6 +6,8 @@ Tests:
   - create() inserts a document and returns a Conversation.
   - get() returns None for wrong user (cross-user isolation).
   - append_messages() calls update_one with correct push.
+  - Bucketed storage: summaries read headers only, tail reads fetch the last
+    buckets only, legacy embedded arrays migrate on first append.
   - delete() returns True on success and False when not found.
   - _evict_if_needed() deletes the oldest conversation when at limit.
 """
@@ -138,12 +140,13 @@ async def test_get_returns_none_for_wrong_user():
 
 @pytest.mark.asyncio
 async def test_append_messages_calls_update_one():
-    """append_messages() should call update_one with $push for both messages."""
+    """append_messages() should reserve positions, then $push both messages to a bucket."""
     from src.modules.ai_assistant.services.conversation_repository import (
         ConversationRepository,
     )
 
     mock_collection = AsyncMock()
+    mock_collection.find_one_and_update = AsyncMock(return_value={"message_count": 4})
     mock_collection.update_one = AsyncMock()
 
     mock_db = MagicMock()
@@ -163,9 +166,13 @@ async def test_append_messages_calls_update_one():
             assistant_message="Hi there",
         )
 
+    reserve = mock_collection.find_one_and_update.call_args
+    assert reserve[0][1]["$inc"] == {"message_count": 2}
     mock_collection.update_one.assert_awaited_once()
     update_call = mock_collection.update_one.call_args
-    assert "$push" in update_call[0][1]
+    assert update_call[0][0] == {"conversation_id": "conv-1", "seq": 0}
+    pushed = update_call[0][1]["$push"]["messages"]["$each"]
+    assert [m["n"] for m in pushed] == [4, 5]
 
 
 # ---------------------------------------------------------------------------
@@ -249,7 +256,9 @@ async def test_evict_if_needed_deletes_oldest_when_at_limit():
                 return_value=MagicMock(
                     limit=MagicMock(
                         return_value=MagicMock(
-                            to_list=AsyncMock(return_value=[{"conversation_id": "oldest-id"}])
+                            to_list=AsyncMock(
+                                return_value=[{"conversation_id": "oldest-id"}]
+                            )
                         )
                     )
                 )
@@ -299,3 +308,290 @@ async def test_evict_if_needed_noop_below_limit():
         await repo._evict_if_needed("user-1", limit=3)
 
     mock_collection.delete_one.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# Bucketed storage — in-memory collections
+# ---------------------------------------------------------------------------
+
+
+class _Cursor:
+    def __init__(self, coll, docs):
+        self._coll = coll
+        self._docs = docs
+
+    def sort(self, key, direction):
+        self._docs.sort(key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self._docs = self._docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        docs = self._docs[:length]
+        self._coll.docs_read += len(docs)
+        return docs
+
+
+class _FakeCollection:
+    """Just enough of a Motor collection for ConversationRepository."""
+
+    def __init__(self):
+        self.docs = []
+        self.docs_read = 0
+
+    @staticmethod
+    def _matches(doc, query):
+        for key, cond in query.items():
+            if isinstance(cond, dict) and "$exists" in cond:
+                if (key in doc) != cond["$exists"]:
+                    return False
+            elif doc.get(key) != cond:
+                return False
+        return True
+
+    @staticmethod
+    def _project(doc, projection):
+        import copy
+
+        if not projection or all(v == 0 for v in projection.values()):
+            return {k: copy.deepcopy(v) for k, v in doc.items() if k != "_id"}
+        out = {}
+        for key, spec in projection.items():
+            if key == "_id":
+                continue
+            if isinstance(spec, dict):  # {"$size": {"$ifNull": ["$messages", []]}}
+                out[key] = len(doc.get("messages") or [])
+            elif key in doc:
+                out[key] = copy.deepcopy(doc[key])
+        return out
+
+    def find(self, query, projection=None):
+        return _Cursor(
+            self,
+            [
+                self._project(d, projection)
+                for d in self.docs
+                if self._matches(d, query)
+            ],
+        )
+
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                self.docs_read += 1
+                return self._project(doc, projection)
+        return None
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.docs if self._matches(d, query))
+
+    def _apply(self, doc, update):
+        for key, value in update.get("$set", {}).items():
+            doc[key] = value
+        for key, value in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + value
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+        for key, value in update.get("$push", {}).items():
+            doc.setdefault(key, []).extend(value["$each"])
+
+    async def find_one_and_update(self, query, update, projection=None, **kwargs):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                before = self._project(doc, projection)
+                self._apply(doc, update)
+                return before
+        return None
+
+    async def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                self._apply(doc, update)
+                return
+        if upsert:
+            doc = dict(query)
+            doc.update(update.get("$setOnInsert", {}))
+            self._apply(doc, update)
+            self.docs.append(doc)
+
+    async def delete_one(self, query):
+        hits = [d for d in self.docs if self._matches(d, query)]
+        if hits:
+            self.docs.remove(hits[0])
+        return MagicMock(deleted_count=len(hits[:1]))
+
+    async def delete_many(self, query):
+        self.docs = [d for d in self.docs if not self._matches(d, query)]
+
+
+@pytest.fixture
+def fake_db():
+    collections = {
+        "ai_assistant_conversations": _FakeCollection(),
+        "ai_assistant_message_buckets": _FakeCollection(),
+    }
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=collections.__getitem__)
+    with patch(
+        "src.modules.ai_assistant.services.conversation_repository.mongodb"
+    ) as mock_mongodb:
+        mock_mongodb.get_database.return_value = db
+        yield collections
+
+
+def _seed_conversation(fake_db, conv_id, user_id, n_messages, updated_at):
+    """Write a bucketed conversation directly, as append_messages would."""
+    from src.modules.ai_assistant.services.conversation_repository import BUCKET_SIZE
+
+    fake_db["ai_assistant_conversations"].docs.append(
+        {
+            "conversation_id": conv_id,
+            "user_id": user_id,
+            "title": conv_id,
+            "context": {},
+            "message_count": n_messages,
+            "last_message_preview": f"message {n_messages - 1}",
+            "created_at": updated_at,
+            "updated_at": updated_at,
+        }
+    )
+    for seq in range(-(-n_messages // BUCKET_SIZE)):
+        fake_db["ai_assistant_message_buckets"].docs.append(
+            {
+                "conversation_id": conv_id,
+                "user_id": user_id,
+                "seq": seq,
+                "messages": [
+                    {
+                        "role": "user" if n % 2 == 0 else "assistant",
+                        "content": f"message {n}",
+                        "timestamp": updated_at,
+                        "metadata": {},
+                        "n": n,
+                    }
+                    for n in range(
+                        seq * BUCKET_SIZE, min((seq + 1) * BUCKET_SIZE, n_messages)
+                    )
+                ],
+            }
+        )
+
+
+@pytest.mark.asyncio
+async def test_appends_fill_fixed_size_buckets(fake_db):
+    """Messages spill into a new bucket every BUCKET_SIZE messages, in order."""
+    from src.modules.ai_assistant.services.conversation_repository import (
+        BUCKET_SIZE,
+        ConversationRepository,
+    )
+
+    repo = ConversationRepository()
+    conv = await repo.create("user-1", "Hello", context={})
+    assert "messages" not in fake_db["ai_assistant_conversations"].docs[0]
+
+    turns = BUCKET_SIZE  # 2 * BUCKET_SIZE messages
+    for i in range(turns):
+        await repo.append_messages(conv.conversation_id, "user-1", f"q{i}", f"a{i}")
+
+    buckets = fake_db["ai_assistant_message_buckets"].docs
+    assert sorted(b["seq"] for b in buckets) == [0, 1]
+    assert all(len(b["messages"]) == BUCKET_SIZE for b in buckets)
+
+    full = await repo.get(conv.conversation_id, "user-1")
+    assert full.message_count == 2 * turns
+    assert full.last_message_preview == f"a{turns - 1}"
+    assert [m.content for m in full.messages[:3]] == ["q0", "a0", "q1"]
+
+    tail = await repo.get(conv.conversation_id, "user-1", last_n=3)
+    assert [m.content for m in tail.messages] == [
+        f"a{turns - 2}",
+        f"q{turns - 1}",
+        f"a{turns - 1}",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_legacy_embedded_messages_migrate_on_first_append(fake_db):
+    """A pre-bucketing conversation reads as before and moves to buckets on append."""
+    from src.modules.ai_assistant.services.conversation_repository import (
+        ConversationRepository,
+    )
+
+    now = datetime.utcnow()
+    fake_db["ai_assistant_conversations"].docs.append(
+        {
+            "conversation_id": "legacy",
+            "user_id": "user-1",
+            "title": "Old chat",
+            "messages": [
+                {"role": "user", "content": "old q", "timestamp": now, "metadata": {}},
+                {
+                    "role": "assistant",
+                    "content": "old a",
+                    "timestamp": now,
+                    "metadata": {},
+                },
+            ],
+            "context": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    repo = ConversationRepository()
+
+    [summary] = await repo.list_summaries("user-1")
+    assert summary.message_count == 2
+    before = await repo.get("legacy", "user-1", last_n=1)
+    assert [m.content for m in before.messages] == ["old a"]
+
+    await repo.append_messages("legacy", "user-1", "new q", "new a")
+
+    header = fake_db["ai_assistant_conversations"].docs[0]
+    assert "messages" not in header
+    assert header["message_count"] == 4
+    after = await repo.get("legacy", "user-1")
+    assert [m.content for m in after.messages] == ["old q", "old a", "new q", "new a"]
+
+
+@pytest.mark.asyncio
+async def test_benchmark_50_conversations_of_2000_messages(fake_db):
+    """
+    Listing 50 conversations x 2,000 messages reads 50 headers and zero
+    message documents; resuming one reads only its last two buckets.
+    """
+    import time
+
+    from src.modules.ai_assistant.services.conversation_repository import (
+        ConversationRepository,
+    )
+
+    base = datetime(2026, 1, 1)
+    for i in range(50):
+        _seed_conversation(
+            fake_db, f"conv-{i:02d}", "user-1", 2000, base.replace(minute=i)
+        )
+    headers = fake_db["ai_assistant_conversations"]
+    buckets = fake_db["ai_assistant_message_buckets"]
+    repo = ConversationRepository()
+
+    started = time.perf_counter()
+    summaries = await repo.list_summaries("user-1")
+    list_seconds = time.perf_counter() - started
+
+    assert len(summaries) == 50
+    assert summaries[0].conversation_id == "conv-49"
+    assert all(s.message_count == 2000 for s in summaries)
+    assert summaries[0].last_message_preview == "message 1999"
+    assert headers.docs_read == 50
+    assert buckets.docs_read == 0
+    assert list_seconds < 1.0
+
+    conv = await repo.get("conv-07", "user-1", last_n=99)
+    assert len(conv.messages) == 99
+    assert conv.messages[-1].content == "message 1999"
+    assert buckets.docs_read == 2
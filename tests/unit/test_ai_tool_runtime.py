@@ -0,0 +1,197 @@
+"""
+Tests for the shared AI tool runtime (src/core/ai_tools).
+
+Covers concurrent execution of a turn's read-only tools under the
+concurrency cap, call-order results, the per-scope result cache (TTL, error
+results, in-flight sharing, write invalidation) and latency recording.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core.ai_tools import (
+    SideEffect,
+    ToolCall,
+    ToolResultCache,
+    ToolRuntime,
+    ToolSpec,
+    tool_stats,
+)
+
+SPECS = [
+    ToolSpec("list_farms", cache_ttl_seconds=60),
+    ToolSpec("block_summary", cache_ttl_seconds=60),
+    ToolSpec("sensor_readings"),
+    ToolSpec("control_relay", SideEffect.WRITE),
+]
+
+
+class _Executor:
+    """Records calls; each tool sleeps for ``input["delay"]`` seconds."""
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, call):
+        self.calls.append(call.name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(call.input.get("delay", 0))
+            if call.input.get("fail"):
+                raise RuntimeError("SenseHub unreachable")
+            if call.input.get("error"):
+                return {"error": "Block not found"}
+            return {"tool": call.name, "input": call.input}
+        finally:
+            self.in_flight -= 1
+
+
+def _runtime(**kwargs):
+    return ToolRuntime("test", SPECS, cache=ToolResultCache(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_three_tool_turn_takes_about_as_long_as_slowest_tool():
+    runtime, execute = _runtime(), _Executor()
+    calls = [
+        ToolCall("list_farms", {"delay": 0.1}, id="a"),
+        ToolCall("block_summary", {"delay": 0.3}, id="b"),
+        ToolCall("sensor_readings", {"delay": 0.2}, id="c"),
+    ]
+
+    started = time.perf_counter()
+    outcomes = await runtime.run(calls, execute, scope="org-1")
+    elapsed = time.perf_counter() - started
+
+    assert 0.3 <= elapsed < 0.45  # sequential would be 0.6s
+    assert [o.call.id for o in outcomes] == ["a", "b", "c"]
+    assert [o.result["tool"] for o in outcomes] == [
+        "list_farms",
+        "block_summary",
+        "sensor_readings",
+    ]
+    assert outcomes[1].latency_ms >= 300
+    assert execute.max_in_flight == 3
+    assert tool_stats()["test.block_summary"]["calls"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_respected():
+    runtime, execute = _runtime(max_concurrency=2), _Executor()
+    calls = [ToolCall("sensor_readings", {"delay": 0.05, "n": i}) for i in range(6)]
+
+    outcomes = await runtime.run(calls, execute)
+
+    assert len(outcomes) == 6
+    assert execute.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_read_results_are_cached_per_scope():
+    runtime, execute = _runtime(), _Executor()
+    call = ToolCall("list_farms", {"page": 1})
+
+    first = await runtime.run([call], execute, scope="org-1")
+    again = await runtime.run([ToolCall("list_farms", {"page": 1})], execute, "org-1")
+    other_org = await runtime.run([call], execute, scope="org-2")
+    uncached_tool = await runtime.run([ToolCall("sensor_readings")] * 2, execute)
+
+    assert first[0].cached is False
+    assert again[0].cached is True and again[0].result == first[0].result
+    assert other_org[0].cached is False
+    assert not any(o.cached for o in uncached_tool)
+    assert execute.calls.count("list_farms") == 2
+    assert execute.calls.count("sensor_readings") == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_caller_and_skipped_without_an_org():
+    runtime, execute = _runtime(), _Executor()
+    call = ToolCall("list_farms", {"page": 1})
+
+    admin = await runtime.run([call], execute, "org-1", user_id="u1", role="admin")
+    same = await runtime.run([call], execute, "org-1", user_id="u1", role="admin")
+    viewer = await runtime.run([call], execute, "org-1", user_id="u1", role="viewer")
+    other_user = await runtime.run([call], execute, "org-1", user_id="u2", role="admin")
+    no_org = [await runtime.run([call], execute, user_id="u3") for _ in range(2)]
+
+    assert admin[0].cached is False and same[0].cached is True
+    assert viewer[0].cached is False
+    assert other_user[0].cached is False
+    assert not any(outcomes[0].cached for outcomes in no_org)
+    assert execute.calls.count("list_farms") == 5
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_in_one_turn_share_an_execution():
+    runtime, execute = _runtime(), _Executor()
+    calls = [ToolCall("block_summary", {"block": "B1", "delay": 0.05})] * 3
+
+    outcomes = await runtime.run(calls, execute, scope="org-1")
+
+    assert execute.calls == ["block_summary"]
+    assert [o.cached for o in outcomes] == [False, True, True]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_returned_not_cached_and_do_not_fail_the_turn():
+    runtime, execute = _runtime(), _Executor()
+    calls = [
+        ToolCall("list_farms", {"fail": True}),
+        ToolCall("block_summary", {"error": True}),
+        ToolCall("sensor_readings"),
+    ]
+
+    outcomes = await runtime.run(calls, execute, scope="org-1")
+    retry = await runtime.run(calls[:2], execute, scope="org-1")
+
+    assert outcomes[0].error == "SenseHub unreachable"
+    assert outcomes[0].result == {
+        "error": "Tool execution failed: SenseHub unreachable"
+    }
+    assert outcomes[1].result == {"error": "Block not found"}
+    assert outcomes[2].error is None
+    assert not any(o.cached for o in retry)
+
+
+@pytest.mark.asyncio
+async def test_write_tools_are_barriers_and_invalidate_the_scope():
+    runtime, execute = _runtime(), _Executor()
+    await runtime.run([ToolCall("list_farms")], execute, scope="org-1")
+    await runtime.run([ToolCall("list_farms")], execute, scope="org-2")
+    execute.calls.clear()
+
+    outcomes = await runtime.run(
+        [
+            ToolCall("list_farms"),  # cached
+            ToolCall("control_relay", {"delay": 0.02}),
+            ToolCall("list_farms"),  # re-read after the write
+            ToolCall("unknown_tool"),  # undeclared: treated as a write
+        ],
+        execute,
+        scope="org-1",
+    )
+
+    assert [o.cached for o in outcomes] == [True, False, False, False]
+    assert execute.calls == ["control_relay", "list_farms", "unknown_tool"]
+    other_org = await runtime.run([ToolCall("list_farms")], execute, scope="org-2")
+    assert other_org[0].cached is True
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    cache = ToolResultCache(max_entries=2)
+    cache.put(("s", "ns", "a", ""), 1, ttl_seconds=60)
+    cache.put(("s", "ns", "b", ""), 2, ttl_seconds=60)
+    cache.get(("s", "ns", "a", ""))
+    cache.put(("s", "ns", "c", ""), 3, ttl_seconds=60)
+
+    assert cache.get(("s", "ns", "a", "")) == (True, 1)
+    assert cache.get(("s", "ns", "b", ""))[0] is False
+
+    cache.put(("s", "ns", "d", ""), 4, ttl_seconds=-1)
+    assert cache.get(("s", "ns", "d", ""))[0] is False
@@ -227,7 +227,7 @@ async def test_update_invalidates_cache_so_the_write_is_visible_immediately(
     platform_doc: Dict[str, Any] = {}
     db = _make_fake_db(platform_doc=platform_doc, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     # Warm the cache with the pre-update state.
     before = await deployment_settings_service.get_resolved()
@@ -258,7 +258,7 @@ async def test_env_pinned_key_is_rejected_as_non_editable(monkeypatch: pytest.Mo
     _set_env(monkeypatch, "PUBLIC_BASE_URL", "https://pinned.example.com")
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     with pytest.raises(HTTPException) as exc:
         await deployment_settings_service.update(
@@ -336,7 +336,7 @@ async def test_cf_access_default_role_rejects_super_admin_is_still_allowed_but_m
     is caught if someone tightens one path without the other."""
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     resolved = await deployment_settings_service.update(
         changes={"CF_ACCESS_DEFAULT_ROLE": "super_admin"},
@@ -353,7 +353,7 @@ async def test_cf_access_default_role_accepts_a_valid_role(
 ) -> None:
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     resolved = await deployment_settings_service.update(
         changes={"CF_ACCESS_DEFAULT_ROLE": "moderator"},
@@ -383,7 +383,7 @@ async def test_empty_changes_is_rejected(monkeypatch: pytest.MonkeyPatch) -> Non
 async def test_wrong_password_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: False)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=False))
 
     with pytest.raises(HTTPException) as exc:
         await deployment_settings_service.update(
@@ -458,7 +458,7 @@ def _patch_httpx_client(monkeypatch: pytest.MonkeyPatch, **kwargs: Any) -> None:
 async def test_team_domain_validation_rejects_unreachable_host(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
     _patch_httpx_client(monkeypatch, get_exc=httpx.ConnectError("name resolution failed"))
 
     with pytest.raises(HTTPException) as exc:
@@ -476,7 +476,7 @@ async def test_team_domain_validation_rejects_unreachable_host(monkeypatch: pyte
 async def test_team_domain_validation_rejects_empty_jwks(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
     _patch_httpx_client(monkeypatch, response=_FakeResponse(json_data={"keys": []}))
 
     with pytest.raises(HTTPException) as exc:
@@ -493,7 +493,7 @@ async def test_team_domain_validation_rejects_empty_jwks(monkeypatch: pytest.Mon
 async def test_team_domain_validation_accepts_valid_jwks(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
     _patch_httpx_client(monkeypatch, response=_FakeResponse(json_data={"keys": [{"kid": "abc"}]}))
 
     resolved = await deployment_settings_service.update(
@@ -518,7 +518,7 @@ async def test_exclusive_blocked_without_proven_login_then_allowed_after(
     platform_doc: Dict[str, Any] = {}
     db = _make_fake_db(platform_doc=platform_doc, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     with pytest.raises(HTTPException) as exc:
         await deployment_settings_service.update(
@@ -550,7 +550,7 @@ async def test_exclusive_false_never_requires_a_proven_login(monkeypatch: pytest
     guardrail (b) — only enabling it does."""
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     resolved = await deployment_settings_service.update(
         changes={"CF_ACCESS_EXCLUSIVE": False},
@@ -571,7 +571,7 @@ async def test_audit_log_written_with_masked_secrets(monkeypatch: pytest.MonkeyP
     platform_doc = {"CF_ACCESS_AUD": "old-aud-value-1234"}
     db = _make_fake_db(platform_doc=platform_doc, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     await deployment_settings_service.update(
         changes={"CF_ACCESS_AUD": "new-aud-value-5678"},
@@ -599,7 +599,7 @@ async def test_audit_log_written_with_masked_secrets(monkeypatch: pytest.MonkeyP
 async def test_audit_log_does_not_mask_non_secret_keys(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _make_fake_db(platform_doc={}, user_doc=_default_user_doc())
     _patch_db(monkeypatch, db)
-    monkeypatch.setattr(deployment_settings_service, "verify_password", lambda pw, h: True)
+    monkeypatch.setattr(deployment_settings_service, "verify_password_async", AsyncMock(return_value=True))
 
     await deployment_settings_service.update(
         changes={"FRONTEND_URL": "https://plain-value.example.com"},
@@ -0,0 +1,253 @@
+"""
+Tests for the AI context snapshot service (services/ai_context).
+
+Uses a small in-memory stand-in for the Motor collections involved (farms,
+blocks, ai_context_snapshots) that records reads, so the tests can assert
+that a warm prompt build is a single snapshot read and that a dirty mark
+rebuilds only the affected farm.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from src.modules.farm_manager.services.ai_context import snapshot_service
+from src.modules.farm_manager.services.ai_context import (
+    get_farm_snapshot,
+    get_platform_snapshot,
+    mark_context_dirty,
+    rebuild_all_snapshots,
+)
+from src.modules.farm_manager.services.farm_level_ai.context_builder import (
+    build_farm_system_prompt,
+)
+from src.modules.farm_manager.services.global_ai.context_builder import (
+    build_global_system_prompt,
+)
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == "$expr":
+            left, right = (doc.get(f.lstrip("$")) for f in cond["$gte"])
+            if left is None or (right is not None and left < right):
+                return False
+            continue
+        value = doc.get(key)
+        if isinstance(cond, dict) and "$nin" in cond:
+            if value in cond["$nin"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, key, direction=1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            self._docs.sort(key=lambda d: d.get(field) or "", reverse=order < 0)
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+    def __aiter__(self):
+        self._it = iter(self._docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _FakeCollection:
+    def __init__(self, name, log):
+        self.name = name
+        self.docs = []
+        self._log = log
+
+    async def find_one(self, query, projection=None):
+        self._log.append((self.name, "find_one", query))
+        return next((dict(d) for d in self.docs if _matches(d, query)), None)
+
+    def find(self, query, projection=None):
+        self._log.append((self.name, "find", query))
+        return _Cursor([dict(d) for d in self.docs if _matches(d, query)])
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return
+            doc = dict(query)
+            doc.update(update.get("$setOnInsert", {}))
+            self.docs.append(doc)
+        doc.update(update.get("$set", {}))
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+
+    async def delete_one(self, query):
+        self.docs = [d for d in self.docs if not _matches(d, query)]
+
+    async def delete_many(self, query):
+        self.docs = [d for d in self.docs if not _matches(d, query)]
+
+
+class _FakeDB:
+    def __init__(self):
+        self.log = []
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = _FakeCollection(name, self.log)
+        return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def reads(self, collection):
+        return [entry for entry in self.log if entry[0] == collection]
+
+
+def _farm(name, active=True):
+    return {
+        "farmId": str(uuid4()),
+        "name": name,
+        "location": {"city": "Al Ain", "country": "UAE"},
+        "isActive": active,
+    }
+
+
+def _block(farm, code, connected=False, **extra):
+    block = {
+        "blockId": str(uuid4()),
+        "farmId": farm["farmId"],
+        "blockCode": code,
+        "name": code,
+        "state": "growing",
+        "isActive": True,
+        "iotController": {
+            "enabled": connected,
+            "connectionStatus": "connected" if connected else "disconnected",
+        },
+    }
+    block.update(extra)
+    return block
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _FakeDB()
+    monkeypatch.setattr(snapshot_service.farm_db, "get_database", lambda: fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_platform_summary_covers_every_farm_and_warm_reads_are_one_lookup(db):
+    farms = [_farm(f"Farm {i:03d}") for i in range(600)]
+    db.farms.docs.extend(farms)
+    db.blocks.docs.extend(
+        _block(f, f"B{i}", connected=i % 2 == 0) for i, f in enumerate(farms)
+    )
+    db.farms.docs.append(_farm("Closed Farm", active=False))
+
+    prompt = await build_global_system_prompt()
+    assert "Farm 599 | Al Ain, UAE | 1 blocks | 0 SenseHub-connected" in prompt
+    assert "Closed Farm" not in prompt
+
+    snapshot = await get_platform_snapshot()
+    assert snapshot["farmCount"] == 600
+    assert snapshot["connectedCount"] == 300
+
+    db.log.clear()
+    again = await build_global_system_prompt()
+    assert again == prompt
+    assert db.reads("farms") == [] and db.reads("blocks") == []
+    assert len(db.reads(snapshot_service.COLLECTION)) == 1
+
+
+@pytest.mark.asyncio
+async def test_dirty_mark_rebuilds_only_that_farm_and_bumps_version(db):
+    north, south = _farm("North"), _farm("South")
+    db.farms.docs.extend([north, south])
+    db.blocks.docs.append(_block(north, "N-001"))
+    await get_platform_snapshot()
+    version = (await get_platform_snapshot())["version"]
+
+    db.blocks.docs.append(_block(north, "N-002", connected=True))
+    await mark_context_dirty(db, [north["farmId"]])
+    db.log.clear()
+
+    snapshot = await get_platform_snapshot()
+    assert (
+        "North | Al Ain, UAE | 2 blocks | 1 SenseHub-connected" in snapshot["summary"]
+    )
+    assert snapshot["version"] == version + 1
+    block_reads = db.reads("blocks")
+    assert [q for _, _, q in block_reads] == [
+        {"farmId": north["farmId"], "isActive": True}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_mark_without_text_change_keeps_version(db):
+    farm = _farm("East")
+    db.farms.docs.append(farm)
+    db.blocks.docs.append(_block(farm, "E-001"))
+    first = await get_farm_snapshot(farm["farmId"])
+    platform = await get_platform_snapshot()
+
+    # e.g. a KPI-only or lastSyncedAt write that does not change the text
+    await mark_context_dirty(db, [farm["farmId"]])
+    second = await get_farm_snapshot(farm["farmId"])
+
+    assert second["builtAt"] > first["builtAt"]
+    assert second["version"] == first["version"]
+    assert (await get_platform_snapshot())["version"] == platform["version"]
+
+
+@pytest.mark.asyncio
+async def test_farm_prompt_uses_snapshot_and_handles_missing_farm(db):
+    farm = _farm("West")
+    db.farms.docs.append(farm)
+    db.blocks.docs.extend(
+        [
+            _block(farm, "W-002", connected=True, targetCropName="Tomato"),
+            _block(farm, "W-001"),
+        ]
+    )
+
+    prompt, summary = await build_farm_system_prompt(farm["farmId"])
+    assert summary == {"farm_name": "West", "block_count": 2, "connected_blocks": 1}
+    assert prompt.index("W-001") < prompt.index("W-002")
+    assert "Tomato" in prompt
+
+    missing_prompt, missing_summary = await build_farm_system_prompt(uuid4())
+    assert missing_summary is None
+    assert "not found" in missing_prompt
+
+
+@pytest.mark.asyncio
+async def test_full_rebuild_drops_deleted_farms(db):
+    keep, gone = _farm("Keep"), _farm("Gone")
+    db.farms.docs.extend([keep, gone])
+    await rebuild_all_snapshots(db)
+
+    db.farms.docs.remove(gone)
+    snapshot = await rebuild_all_snapshots(db)
+
+    assert snapshot["farmCount"] == 1
+    assert "Gone" not in snapshot["summary"]
+    ids = {d["_id"] for d in db[snapshot_service.COLLECTION].docs}
+    assert ids == {"platform", f"farm:{keep['farmId']}"}
+    assert isinstance(snapshot["builtAt"], datetime)
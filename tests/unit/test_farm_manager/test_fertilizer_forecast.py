@@ -0,0 +1,334 @@
+"""
+Tests for the fertilizer demand forecast (services/tools/fertilizer_forecast.py).
+
+Covers schedule compilation parity with the calculator's per-point totals,
+planting-date offsets and window clipping, the compiled-schedule cache, the
+database-backed entry point with chemical mapping + Excel export, and a
+5 000-block × 365-day benchmark checked against a plain-Python reference.
+"""
+
+import random
+import time
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from openpyxl import load_workbook
+
+from src.modules.farm_manager.models.tools.fertilizer_chemical import (
+    FertilizerChemical,
+)
+from src.modules.farm_manager.services.tools import fertilizer_forecast
+from src.modules.farm_manager.services.tools.excel_handler import (
+    export_demand_forecast,
+)
+from src.modules.farm_manager.services.tools.fertilizer_calculator import (
+    _process_custom_rule,
+    _process_interval_rule,
+)
+from src.modules.farm_manager.services.tools.fertilizer_forecast import (
+    Planting,
+    compile_schedule,
+    forecast_demand,
+    forecast_fertilizer_demand,
+    get_compiled_schedule,
+)
+
+START = date(2026, 3, 1)
+
+
+def _plant(cycle_days=60, seeds_per_point=1, version=1, plant_id=None):
+    return {
+        "plantDataId": plant_id or str(uuid4()),
+        "plantName": "Tomato",
+        "growthCycle": {"totalCycleDays": cycle_days},
+        "yieldInfo": {"seedsPerPlantingPoint": seeds_per_point},
+        "dataVersion": version,
+        "fertigationSchedule": {
+            "cards": [
+                {
+                    "dayStart": 0,
+                    "dayEnd": 40,
+                    "rules": [
+                        {
+                            "type": "interval",
+                            "frequencyDays": 7,
+                            "activeDayStart": 3,
+                            "ingredients": [
+                                {"name": "Urea", "dosagePerPoint": 2, "unit": "g"},
+                                {"name": "MKP", "dosagePerPoint": 1.5, "unit": "g"},
+                            ],
+                        }
+                    ],
+                },
+                {
+                    "dayStart": 41,
+                    "dayEnd": 90,
+                    "rules": [
+                        {
+                            "type": "custom",
+                            "applications": [
+                                {
+                                    "day": 45,
+                                    "ingredients": [
+                                        {
+                                            "name": "urea",
+                                            "dosagePerPoint": 5,
+                                            "unit": "g",
+                                        },
+                                        {
+                                            "name": "Cal Nitrate",
+                                            "dosagePerPoint": 10,
+                                            "unit": "ml",
+                                        },
+                                    ],
+                                },
+                                {
+                                    "day": 75,  # beyond a 60-day cycle
+                                    "ingredients": [
+                                        {"name": "Urea", "dosagePerPoint": 99}
+                                    ],
+                                },
+                            ],
+                        }
+                    ],
+                },
+            ]
+        },
+    }
+
+
+def _calculator_totals(plant):
+    """Per-point totals the calculator would produce for this plant."""
+    cycle = plant["growthCycle"]["totalCycleDays"]
+    accum = {}
+    for card in plant["fertigationSchedule"]["cards"]:
+        if card["dayStart"] > cycle:
+            continue
+        for rule in card["rules"]:
+            if rule["type"] == "interval":
+                _process_interval_rule(
+                    rule, min(card["dayEnd"], cycle), cycle, accum, []
+                )
+            else:
+                _process_custom_rule(rule, cycle, accum)
+    return {k: v[2] for k, v in accum.items()}
+
+
+def _reference(plantings, schedules, farm_count, start, days):
+    """Plain-Python per block, per day, per ingredient loop."""
+    out = {}
+    for p in plantings:
+        schedule = schedules[p.plant_data_id]
+        for t in range(days):
+            cycle_day = (start - p.planted_on).days + t
+            if not 0 <= cycle_day <= schedule.cycle_days:
+                continue
+            for col, (key, _, unit) in enumerate(schedule.ingredients):
+                qty = schedule.matrix[cycle_day, col] * p.points
+                if qty:
+                    k = (p.farm_index, t, key, unit)
+                    out[k] = out.get(k, 0.0) + qty
+    return out
+
+
+def test_compiled_schedule_totals_match_calculator():
+    for cycle in (20, 45, 60, 120):
+        plant = _plant(cycle_days=cycle)
+        compiled = compile_schedule(plant)
+        totals = dict(zip((i[0] for i in compiled.ingredients), compiled.matrix.sum(0)))
+
+        assert compiled.matrix.shape == (cycle + 1, len(compiled.ingredients))
+        assert totals == pytest.approx(_calculator_totals(plant))
+
+    compiled = compile_schedule(_plant())
+    urea = [i[0] for i in compiled.ingredients].index("urea")
+    assert np.flatnonzero(compiled.matrix[:, urea]).tolist() == [
+        3,
+        10,
+        17,
+        24,
+        31,
+        38,
+        45,
+    ]
+    assert compile_schedule({"plantDataId": "x", "growthCycle": {}}) is None
+
+
+def test_forecast_offsets_plantings_and_clips_to_cycle():
+    plant = _plant()
+    schedule = compile_schedule(plant)
+    pid = schedule.plant_data_id
+    plantings = [
+        Planting(0, pid, START - timedelta(days=10), 100),  # mid-cycle
+        Planting(1, pid, START + timedelta(days=5), 50),  # plants during window
+        Planting(1, pid, START - timedelta(days=200), 80),  # cycle already over
+    ]
+
+    ingredients, demand = forecast_demand(plantings, {pid: schedule}, 2, START, 30)
+    urea = [i[0] for i in ingredients].index("urea")
+
+    assert demand.shape == (2, 30, 3)
+    # farm 0: cycle day 10 + t -> Urea on cycle days 10, 17, 24, 31, 38
+    assert np.flatnonzero(demand[0, :, urea]).tolist() == [0, 7, 14, 21, 28]
+    assert demand[0, 0, urea] == pytest.approx(200)
+    # farm 1: planted on day 5 -> first Urea on cycle day 3 = window day 8
+    assert np.flatnonzero(demand[1, :, urea]).tolist() == [8, 15, 22, 29]
+    assert demand[1, 8, urea] == pytest.approx(100)
+
+
+def test_compiled_schedules_are_cached_per_data_version():
+    plant = _plant()
+    first = get_compiled_schedule(plant)
+
+    assert get_compiled_schedule(dict(plant)) is first
+    assert get_compiled_schedule({**plant, "dataVersion": 2}) is not first
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def to_list(self, length=None):
+        return self._docs
+
+
+class _Collection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        def ok(doc):
+            for key, cond in query.items():
+                value = doc.get(key)
+                if isinstance(cond, dict):
+                    if "$in" in cond and value not in cond["$in"]:
+                        return False
+                    if "$ne" in cond and value == cond["$ne"]:
+                        return False
+                elif value != cond:
+                    return False
+            return True
+
+        return _Cursor([d for d in self.docs if ok(d)])
+
+
+class _DB:
+    def __init__(self, farms, blocks, plants):
+        self.farms = _Collection(farms)
+        self.blocks = _Collection(blocks)
+        self.plant_data_enhanced = _Collection(plants)
+
+
+@pytest.mark.asyncio
+async def test_forecast_maps_chemicals_and_exports_to_excel():
+    org_id = uuid4()
+    plant = _plant(seeds_per_point=2)
+    farm_a = {"farmId": str(uuid4()), "name": "Alpha", "isActive": True}
+    farm_b = {
+        "farmId": str(uuid4()),
+        "name": "Beta",
+        "isActive": True,
+        "organizationId": str(org_id),
+    }
+
+    def block(farm, **extra):
+        return {
+            "blockId": str(uuid4()),
+            "farmId": farm["farmId"],
+            "isActive": True,
+            "targetCrop": plant["plantDataId"],
+            "actualPlantCount": 200,  # 100 points at 2 plants/point
+            **extra,
+        }
+
+    blocks = [
+        block(farm_a, state="growing", plantedDate=datetime(2026, 2, 19)),
+        block(
+            farm_b,
+            state="planned",
+            expectedStatusChanges={"planted": "2026-03-06T00:00:00Z"},
+        ),
+        block(farm_b, state="planned"),  # no date
+        block(
+            farm_b,
+            state="growing",
+            plantedDate=datetime(2026, 2, 1),
+            actualPlantCount=0,
+        ),
+    ]
+    urea = FertilizerChemical(
+        name="Urea 46%",
+        aliases=["urea"],
+        defaultUnit="kg",
+        organizationId=org_id,
+        createdBy=uuid4(),
+    )
+    db = _DB([farm_a, farm_b], blocks, [dict(plant, deletedAt=None)])
+
+    with patch.object(fertilizer_forecast.farm_db, "get_database", return_value=db):
+        with patch.object(
+            fertilizer_forecast.ChemicalsService,
+            "build_chemical_lookup",
+            AsyncMock(return_value=({"urea": urea}, {})),
+        ):
+            forecast = await forecast_fertilizer_demand(org_id, START, 60)
+
+    assert forecast.blockCount == 2
+    assert len(forecast.warnings) == 2
+    org = {s.name: s for s in forecast.organization}
+    assert set(org) == {"Urea 46%", "MKP", "Cal Nitrate"}
+    assert (
+        org["Urea 46%"].unit == "kg" and org["Urea 46%"].chemicalId == urea.chemicalId
+    )
+    assert org["MKP"].unit == "g" and org["MKP"].chemicalId is None
+    # Alpha: cycle day 10 on START -> Urea 2 g × 100 points = 0.2 kg
+    assert org["Urea 46%"].daily[0] == pytest.approx(0.2)
+    assert org["Urea 46%"].total == pytest.approx(sum(org["Urea 46%"].daily))
+    farm_totals = sum(
+        s.total for f in forecast.farms for s in f.series if s.name == "Urea 46%"
+    )
+    assert farm_totals == pytest.approx(org["Urea 46%"].total)
+
+    wb = load_workbook(BytesIO(export_demand_forecast(forecast)))
+    daily = wb["Daily Demand"]
+    assert daily.cell(row=1, column=1).value == "Date"
+    assert daily.max_row == 60 + 2
+    assert wb["Per Farm"].cell(row=2, column=1).value == "Alpha"
+    assert "Warnings" in wb.sheetnames
+
+
+def test_benchmark_5000_blocks_365_days():
+    rng = random.Random(7)
+    schedules = {}
+    for i in range(25):
+        compiled = compile_schedule(_plant(cycle_days=rng.randint(40, 180)))
+        schedules[compiled.plant_data_id] = compiled
+    plant_ids = list(schedules)
+    plantings = [
+        Planting(
+            farm_index=rng.randrange(40),
+            plant_data_id=rng.choice(plant_ids),
+            planted_on=START + timedelta(days=rng.randint(-180, 300)),
+            points=rng.randint(100, 5000),
+        )
+        for _ in range(5000)
+    ]
+
+    started = time.perf_counter()
+    ingredients, demand = forecast_demand(plantings, schedules, 40, START, 365)
+    elapsed = time.perf_counter() - started
+
+    assert demand.shape == (40, 365, len(ingredients))
+    assert elapsed < 2.0, f"forecast took {elapsed:.2f}s"
+
+    sample = plantings[:300]
+    _, sample_demand = forecast_demand(sample, schedules, 40, START, 365)
+    expected = _reference(sample, schedules, 40, START, 365)
+    col = {(k, unit): j for j, (k, _, unit) in enumerate(ingredients)}
+    for (farm, t, key, unit), qty in expected.items():
+        assert sample_demand[farm, t, col[(key, unit)]] == pytest.approx(qty)
+    assert sample_demand.sum() == pytest.approx(sum(expected.values()))
@@ -50,6 +50,14 @@ Test cases:
         HarvestRepository.get_total_quantity_for_block alongside a new
         productId-carrying row from submit_harvest_batch — same field, same
         aggregation, unchanged behavior.
+
+    Bulk ingestion / idempotency (services/block/harvest_ingest.py):
+    10. A 50-line submission writes one insert_many per collection and one
+        aggregated block KPI $inc.
+    11. Resubmitting with the same idempotency key replays the original
+        response and writes nothing; reusing it for other lines is a 409.
+    12. With transactions, a failing write leaves nothing behind, and a
+        concurrent submission with the same key replays the winner.
 """
 
 from __future__ import annotations
@@ -62,6 +70,7 @@ from uuid import UUID, uuid4
 
 import pytest
 from fastapi import HTTPException
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from src.modules.farm_manager.models.block import Block
 from src.modules.farm_manager.models.block_harvest import (
@@ -80,6 +89,7 @@ from src.modules.farm_manager.services.database import farm_db
 from src.modules.farm_manager.services.block.harvest_repository import (
     HarvestRepository,
 )
+from src.modules.farm_manager.services.block import harvest_ingest
 from src.modules.farm_manager.services.block.harvest_service import HarvestService
 from src.modules.farm_manager.services.plant_data.plant_mother_repository import (
     PlantMotherRepository,
@@ -180,9 +190,22 @@ class _FakeCursor:
         return list(self._items)
 
 
+# Unique indexes the ingestion path relies on (farm database.py)
+_UNIQUE_KEYS = {
+    "harvest_submissions": "_id",
+    "block_harvests": "harvestId",
+    "inventory_harvest": "inventoryId",
+    "inventory_movements": "movementId",
+    "inventory_waste": "wasteId",
+    "processing_inventory": "inventoryId",
+}
+
+
 class _FakeCollection:
-    def __init__(self) -> None:
+    def __init__(self, unique_key: Optional[str] = None) -> None:
         self.docs: List[Dict[str, Any]] = []
+        self.calls: List[str] = []
+        self.unique_key = unique_key
 
     async def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         for doc in self.docs:
@@ -194,14 +217,41 @@ class _FakeCollection:
         query = query or {}
         return _FakeCursor([dict(d) for d in self.docs if _matches(d, query)])
 
-    async def insert_one(self, doc: Dict[str, Any]):
-        self.docs.append(dict(doc))
+    def _write(self, session, name: str, op) -> None:
+        self.calls.append(name)
+        if session is not None:
+            session.pending.append(op)
+        else:
+            op()
+
+    def _is_duplicate(self, doc: Dict[str, Any]) -> bool:
+        key = self.unique_key
+        return key is not None and any(d.get(key) == doc.get(key) for d in self.docs)
+
+    async def insert_one(self, doc: Dict[str, Any], session=None):
+        if self._is_duplicate(doc):
+            raise DuplicateKeyError(f"duplicate {self.unique_key}")
+        self._write(session, "insert_one", lambda: self.docs.append(dict(doc)))
         return SimpleNamespace(inserted_id="fake_id")
 
-    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any]):
+    async def insert_many(self, docs: List[Dict[str, Any]], ordered=True, session=None):
+        fresh = [dict(d) for d in docs if not self._is_duplicate(d)]
+        self._write(session, "insert_many", lambda: self.docs.extend(fresh))
+        if len(fresh) < len(docs):
+            raise BulkWriteError(
+                {
+                    "writeErrors": [{"code": 11000}] * (len(docs) - len(fresh)),
+                    "nInserted": len(fresh),
+                }
+            )
+        return SimpleNamespace(inserted_ids=[d.get("_id") for d in docs])
+
+    async def update_one(
+        self, query: Dict[str, Any], update: Dict[str, Any], session=None
+    ):
         for doc in self.docs:
             if _matches(doc, query):
-                self._apply(doc, update)
+                self._write(session, "update_one", lambda: self._apply(doc, update))
                 return SimpleNamespace(matched_count=1, modified_count=1)
         return SimpleNamespace(matched_count=0, modified_count=0)
 
@@ -275,12 +325,40 @@ class _FakeCollection:
                 doc.setdefault(k, []).append(v)
 
 
+class _FakeSession:
+    """Transaction stand-in: writes are buffered and applied on commit."""
+
+    def __init__(self) -> None:
+        self.pending: List[Any] = []
+
+    def start_transaction(self) -> "_FakeSession":
+        return self
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, exc_type, *exc) -> bool:
+        if exc_type is None:
+            for op in self.pending:
+                op()
+        self.pending = []
+        return False
+
+
+class _FakeClient:
+    async def start_session(self) -> _FakeSession:
+        return _FakeSession()
+
+
 class _FakeDB:
     def __init__(self) -> None:
         self._collections: Dict[str, _FakeCollection] = {}
+        self.client = _FakeClient()
 
     def __getitem__(self, name: str) -> _FakeCollection:
-        return self._collections.setdefault(name, _FakeCollection())
+        if name not in self._collections:
+            self._collections[name] = _FakeCollection(_UNIQUE_KEYS.get(name))
+        return self._collections[name]
 
     def __getattr__(self, name: str) -> _FakeCollection:
         return self[name]
@@ -290,6 +368,8 @@ class _FakeDB:
 def fake_db(monkeypatch: pytest.MonkeyPatch) -> _FakeDB:
     db = _FakeDB()
     monkeypatch.setattr(farm_db, "get_database", lambda: db)
+    # Standalone-mongod path unless a test opts into transactions
+    monkeypatch.setattr(harvest_ingest, "_transactions_supported", False)
     return db
 
 
@@ -667,3 +747,205 @@ class TestSingleHarvestEndpointUnaffected:
         # back to the block's PRODUCT name (mother), not the variety name,
         # even on this unchanged call path.
         assert fake_db["inventory_harvest"].docs[0]["plantName"] == "Capsicum"
+
+
+# ---------------------------------------------------------------------------
+# Bulk ingestion / idempotency
+# ---------------------------------------------------------------------------
+
+
+def _sellable_request(fixture: _Fixture, lines: int, **kwargs):
+    return HarvestBatchSubmitRequest(
+        harvestDate=datetime(2026, 8, 19, 17, 0, tzinfo=timezone.utc),
+        lines=[
+            HarvestBatchLineCreate(
+                productId=fixture.sellable_product.productId,
+                quantity=2.0,
+                qualityGrade=QualityGrade.A,
+            )
+            for _ in range(lines)
+        ]
+        + [
+            HarvestBatchLineCreate(
+                productId=fixture.waste_product.productId, quantity=1.0
+            )
+        ],
+        **kwargs,
+    )
+
+
+def _written(fake_db: _FakeDB) -> Dict[str, int]:
+    return {
+        name: len(fake_db[name].docs)
+        for name in (
+            "block_harvests",
+            "inventory_harvest",
+            "inventory_movements",
+            "inventory_waste",
+        )
+    }
+
+
+class TestBulkIngestion:
+    @pytest.mark.asyncio
+    async def test_fifty_lines_one_insert_per_collection(self, fake_db: _FakeDB):
+        fixture = _Fixture()
+        await _seed_mother_and_block(fixture)
+
+        response = await HarvestService.submit_harvest_batch(
+            fixture.farm_id,
+            fixture.block_id,
+            _sellable_request(fixture, 50),
+            fixture.user_id,
+            "a@x.com",
+        )
+
+        assert len(response.lines) == 51 and not response.replayed
+        assert _written(fake_db) == {
+            "block_harvests": 50,
+            "inventory_harvest": 50,
+            "inventory_movements": 50,
+            "inventory_waste": 1,
+        }
+        for name in ("block_harvests", "inventory_harvest", "inventory_movements"):
+            assert fake_db[name].calls == ["insert_many"]
+        # One aggregated KPI increment for the block
+        assert fake_db["blocks"].calls == ["update_one"]
+        kpi = fake_db["blocks"].docs[0]["kpi"]
+        assert kpi["totalHarvests"] == 50
+        assert kpi["actualYieldKg"] == pytest.approx(100.0)
+        # Each inventory batch points back at its harvest row
+        harvest_ids = {d["harvestId"] for d in fake_db["block_harvests"].docs}
+        assert {
+            d["sourceHarvestId"] for d in fake_db["inventory_harvest"].docs
+        } == harvest_ids
+
+    @pytest.mark.asyncio
+    async def test_resubmission_with_same_key_is_replayed(self, fake_db: _FakeDB):
+        fixture = _Fixture()
+        await _seed_mother_and_block(fixture)
+        request = _sellable_request(fixture, 3, idempotencyKey="device-7:0042")
+
+        first = await HarvestService.submit_harvest_batch(
+            fixture.farm_id, fixture.block_id, request, fixture.user_id, "a@x.com"
+        )
+        written = _written(fake_db)
+        again = await HarvestService.submit_harvest_batch(
+            fixture.farm_id, fixture.block_id, request, fixture.user_id, "a@x.com"
+        )
+
+        assert again.replayed and not first.replayed
+        assert again.harvestBatchId == first.harvestBatchId
+        assert [line.recordId for line in again.lines] == [
+            line.recordId for line in first.lines
+        ]
+        assert _written(fake_db) == written
+        assert fake_db["blocks"].docs[0]["kpi"]["totalHarvests"] == 3
+
+        with pytest.raises(HTTPException) as exc:
+            await HarvestService.submit_harvest_batch(
+                fixture.farm_id,
+                fixture.block_id,
+                _sellable_request(fixture, 4, idempotencyKey="device-7:0042"),
+                fixture.user_id,
+                "a@x.com",
+            )
+        assert exc.value.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_interrupted_submission_is_completed_on_retry(self, fake_db: _FakeDB):
+        """Standalone mongod: a crash after the pending claim is resumed."""
+        fixture = _Fixture()
+        await _seed_mother_and_block(fixture)
+        request = _sellable_request(fixture, 2, idempotencyKey="k-1")
+
+        async def crash(*args, **kwargs):
+            raise RuntimeError("worker killed")
+
+        # Killed after the inserts, before the claim is completed
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(fake_db["harvest_submissions"], "update_one", crash)
+            with pytest.raises(RuntimeError):
+                await HarvestService.submit_harvest_batch(
+                    fixture.farm_id,
+                    fixture.block_id,
+                    request,
+                    fixture.user_id,
+                    "a@x.com",
+                )
+        assert fake_db["harvest_submissions"].docs[0]["status"] == "pending"
+
+        response = await HarvestService.submit_harvest_batch(
+            fixture.farm_id, fixture.block_id, request, fixture.user_id, "a@x.com"
+        )
+
+        assert not response.replayed
+        assert fake_db["harvest_submissions"].docs[0]["status"] == "complete"
+        # The retry's inserts were duplicate-key no-ops
+        assert len(fake_db["block_harvests"].docs) == 2
+        assert len(fake_db["inventory_movements"].docs) == 2
+        assert fake_db["blocks"].docs[0]["kpi"]["totalHarvests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_transaction_failure_writes_nothing(
+        self, fake_db: _FakeDB, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(harvest_ingest, "_transactions_supported", True)
+        fixture = _Fixture()
+        await _seed_mother_and_block(fixture)
+
+        async def fail(*args, **kwargs):
+            raise RuntimeError("connection reset")
+
+        monkeypatch.setattr(fake_db["inventory_waste"], "insert_many", fail)
+        with pytest.raises(RuntimeError):
+            await HarvestService.submit_harvest_batch(
+                fixture.farm_id,
+                fixture.block_id,
+                _sellable_request(fixture, 5, idempotencyKey="k-2"),
+                fixture.user_id,
+                "a@x.com",
+            )
+
+        assert _written(fake_db) == dict.fromkeys(_written(fake_db), 0)
+        assert fake_db["harvest_submissions"].docs == []
+        assert fake_db["blocks"].docs[0]["kpi"]["totalHarvests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_same_key_replays_the_winner(
+        self, fake_db: _FakeDB, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(harvest_ingest, "_transactions_supported", True)
+        fixture = _Fixture()
+        await _seed_mother_and_block(fixture)
+        request = _sellable_request(fixture, 2, idempotencyKey="k-3")
+
+        # Both requests pass the replay check before either commits
+        monkeypatch.setattr(
+            "src.modules.farm_manager.services.block.harvest_service.find_submission",
+            _first_call_misses(harvest_ingest.find_submission),
+        )
+        first = await HarvestService.submit_harvest_batch(
+            fixture.farm_id, fixture.block_id, request, fixture.user_id, "a@x.com"
+        )
+        second = await HarvestService.submit_harvest_batch(
+            fixture.farm_id, fixture.block_id, request, fixture.user_id, "a@x.com"
+        )
+
+        assert second.replayed and second.harvestBatchId == first.harvestBatchId
+        assert len(fake_db["block_harvests"].docs) == 2
+        assert fake_db["blocks"].docs[0]["kpi"]["totalHarvests"] == 2
+
+
+def _first_call_misses(find_submission):
+    """find_submission that reports 'not submitted' to each replay check."""
+    calls = {"n": 0}
+
+    async def patched(db, batch_id):
+        calls["n"] += 1
+        # Odd calls are submit_harvest_batch's up-front checks
+        if calls["n"] % 2:
+            return None
+        return await find_submission(db, batch_id)
+
+    return patched
@@ -13,7 +13,7 @@ Unit tests for the Plant Library Phase 2 API layer:
 
 No live database — a small hand-rolled fake standing in for a Motor
 database/collection (find_one/find/insert_one/update_one/update_many/
-count_documents), following this codebase's existing convention for DB-free
+find_one_and_update/count_documents), following this codebase's existing convention for DB-free
 unit tests (see tests/unit/test_genetics/test_line_purge.py) since
 mongomock is not in requirements.txt. farm_db.get_database is monkeypatched
 to return the fake for every test.
@@ -29,8 +29,9 @@ Test cases:
     6.  create_variety_for_mother 404s for an unknown mother
     7.  delete_mother is blocked (409) while active varieties exist
     8.  delete_mother succeeds once no active varieties remain
-    9.  update_mother renaming plantName cascades to the variety's
-        plantName/scientificName and to a referencing block's productName
+    9.  update_mother renaming plantName returns before the rename reaches
+        the variety and block; the queued propagation pass then carries it to
+        the variety's plantName/scientificName and the block's productName
     10. update_plant_data (existing variety-update endpoint) rejects a
         client-supplied plantName change
     11. update_plant_data rejects a client-supplied scientificName change
@@ -109,6 +110,7 @@ from src.modules.farm_manager.models.plant_mother import (
     ProductCategory,
     ProductUnit,
 )
+from src.core.propagation import run_propagation_pass
 from src.modules.farm_manager.services.database import farm_db
 from src.modules.farm_manager.services.block.block_repository_new import (
     BlockRepository,
@@ -182,27 +184,48 @@ class _FakeCollection:
     def __init__(self) -> None:
         self.docs: List[Dict[str, Any]] = []
 
-    async def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def find_one(
+        self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         for doc in self.docs:
             if _matches(doc, query):
                 return dict(doc)
         return None
 
-    def find(self, query: Optional[Dict[str, Any]] = None) -> _FakeCursor:
+    def find(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> _FakeCursor:
         query = query or {}
         return _FakeCursor([dict(d) for d in self.docs if _matches(d, query)])
 
     async def insert_one(self, doc: Dict[str, Any]):
-        self.docs.append(dict(doc))
+        self.docs.append({"_id": uuid4().hex, **doc})
         return SimpleNamespace(inserted_id="fake_id")
 
-    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any]):
+    async def update_one(
+        self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False
+    ):
         for doc in self.docs:
             if _matches(doc, query):
                 self._apply(doc, update)
                 return SimpleNamespace(matched_count=1, modified_count=1)
+        if upsert:
+            doc = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            self._apply(doc, update)
+            self.docs.append(doc)
         return SimpleNamespace(matched_count=0, modified_count=0)
 
+    async def find_one_and_update(
+        self, query: Dict[str, Any], update: Dict[str, Any], **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        for doc in self.docs:
+            if _matches(doc, query):
+                self._apply(doc, update)
+                return dict(doc)
+        return None
+
     async def update_many(self, query: Dict[str, Any], update: Dict[str, Any]):
         count = 0
         for doc in self.docs:
@@ -218,6 +241,8 @@ class _FakeCollection:
     def _apply(doc: Dict[str, Any], update: Dict[str, Any]) -> None:
         if "$set" in update:
             doc.update(update["$set"])
+        for k, v in update.get("$inc", {}).items():
+            doc[k] = doc.get(k, 0) + v
         if "$push" in update:
             for k, v in update["$push"].items():
                 doc.setdefault(k, []).append(v)
@@ -455,13 +480,20 @@ class TestUpdateMotherCascade:
         block_doc["farmId"] = str(block_doc["farmId"])
         block_doc["productMotherId"] = str(mother.plantMotherId)
         block_doc["productName"] = "Cabbage"
-        fake_db["blocks"].docs.append(block_doc)
+        await fake_db["blocks"].insert_one(block_doc)
 
         await PlantMotherService.update_mother(
             mother.plantMotherId,
             PlantMotherUpdate(plantName="Savoy Cabbage", scientificName="New Sci Name"),
         )
 
+        # The request only queued the rename...
+        stale = await PlantDataEnhancedRepository.get_by_id(variety.plantDataId)
+        assert stale.plantName == "Cabbage"
+        # ...which the next propagation pass applies.
+        summary = await run_propagation_pass(fake_db)
+        assert summary["applied"] == 1
+
         updated_variety = await PlantDataEnhancedRepository.get_by_id(
             variety.plantDataId
         )
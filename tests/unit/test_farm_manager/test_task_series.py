@@ -0,0 +1,459 @@
+"""
+Unit tests for recurring task series (src/modules/farm_manager/services/task/
+task_series.py) and TaskRepository / TaskGeneratorService /
+HarvestAggregatorService over series plus materialized overrides.
+
+No live database — a hand-rolled Motor-shaped fake, following this
+codebase's convention for DB-free unit tests (see
+test_harvest_batch_routing.py), extended with async cursor iteration,
+$addToSet and the $add/$multiply pipeline update reschedule_series_for_cycle
+issues.
+
+Test cases:
+    1. Occurrence ids round-trip to (seriesId, index) and expansion honours
+       the window, exceptions, overrides and cancellation.
+    2. Generating a block's daily harvest window writes one series document
+       and no farm_tasks documents; occurrences resolve by taskId.
+    3. get_by_farm / get_my_tasks / count_pending_tasks merge stored tasks
+       with occurrences for a date window, with correct totals and paging.
+    4. Adding a harvest entry materializes exactly that occurrence under the
+       same taskId; reads never show it twice.
+    5. A timeline change is one series update; pending overrides follow.
+    6. Ending harvest early cancels the rest of the series; the aggregator
+       extends a series whose window ran out instead of creating documents.
+    7. Leaving harvesting completes the occurrences already due and cuts the
+       series off; block-level counts and the 409 pending check see
+       occurrences.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from src.modules.farm_manager.models.farm_task import (
+    FarmTaskCreate,
+    FarmTaskSeries,
+    FarmTaskUpdate,
+    HarvestEntryCreate,
+    HarvestGrade,
+    TaskStatus,
+    TaskType,
+)
+from src.modules.farm_manager.models.block import BlockStatus
+from src.modules.farm_manager.services.block.block_service_new import BlockService
+from src.modules.farm_manager.services.database import farm_db
+from src.modules.farm_manager.services.task import task_series
+from src.modules.farm_manager.services.task.harvest_aggregator import (
+    HarvestAggregatorService,
+)
+from src.modules.farm_manager.services.task.task_generator import (
+    TaskGeneratorService,
+)
+from src.modules.farm_manager.services.task.task_repository import TaskRepository
+
+# ---------------------------------------------------------------------------
+# Fake Motor database
+# ---------------------------------------------------------------------------
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, expected in query.items():
+        if key == "$or":
+            if not any(_matches(doc, clause) for clause in expected):
+                return False
+            continue
+        actual = doc.get(key)
+        if isinstance(expected, dict):
+            for op, operand in expected.items():
+                if op == "$in" and actual not in operand:
+                    return False
+                if op == "$nin" and actual in operand:
+                    return False
+                if op == "$gt" and (actual is None or actual <= operand):
+                    return False
+                if op == "$gte" and (actual is None or actual < operand):
+                    return False
+                if op == "$lt" and (actual is None or actual >= operand):
+                    return False
+        elif actual != expected:
+            return False
+    return True
+
+
+def _evaluate(doc: Dict[str, Any], expr: Any) -> Any:
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, dict):
+        ((op, args),) = expr.items()
+        values = [_evaluate(doc, arg) for arg in args]
+        if op == "$multiply":
+            return values[0] * values[1]
+        # $add: a date plus milliseconds
+        total = values[0]
+        for value in values[1:]:
+            total += timedelta(milliseconds=value)
+        return total
+    return expr
+
+
+class _Cursor:
+    def __init__(self, docs: List[Dict[str, Any]]) -> None:
+        self._docs = docs
+
+    def sort(self, key, direction: int = 1) -> "_Cursor":
+        spec = [(key, direction)] if isinstance(key, str) else key
+        for field, order in reversed(spec):
+            self._docs.sort(key=lambda d: d.get(field), reverse=order < 0)
+        return self
+
+    def limit(self, n: int) -> "_Cursor":
+        self._docs = self._docs[:n]
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self._docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _Collection:
+    def __init__(self, unique_key: Optional[str] = None) -> None:
+        self.docs: List[Dict[str, Any]] = []
+        self.unique_key = unique_key
+        self.writes = 0
+
+    def find(self, query: Dict[str, Any]) -> _Cursor:
+        return _Cursor([dict(d) for d in self.docs if _matches(d, query)])
+
+    async def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for doc in self.docs:
+            if _matches(doc, query):
+                return dict(doc)
+        return None
+
+    async def count_documents(self, query: Dict[str, Any]) -> int:
+        return sum(1 for d in self.docs if _matches(d, query))
+
+    async def insert_one(self, doc: Dict[str, Any]):
+        key = self.unique_key
+        if key and any(d.get(key) == doc.get(key) for d in self.docs):
+            raise DuplicateKeyError(f"duplicate {key}")
+        self.writes += 1
+        self.docs.append(dict(doc))
+        return SimpleNamespace(inserted_id="fake_id")
+
+    async def update_one(self, query, update):
+        return await self._update(query, update, many=False)
+
+    async def update_many(self, query, update):
+        return await self._update(query, update, many=True)
+
+    def aggregate(self, pipeline: List[Dict[str, Any]]) -> _Cursor:
+        # Only the $match + $group-count shape count_by_status_for_block uses
+        match, group = pipeline[0]["$match"], pipeline[1]["$group"]
+        counts: Dict[Any, int] = {}
+        for doc in self.docs:
+            if _matches(doc, match):
+                key = doc.get(group["_id"][1:])
+                counts[key] = counts.get(key, 0) + 1
+        return _Cursor([{"_id": k, "count": n} for k, n in counts.items()])
+
+    async def delete_many(self, query):
+        matched = [d for d in self.docs if _matches(d, query)]
+        for doc in matched:
+            self.docs.remove(doc)
+        return SimpleNamespace(deleted_count=len(matched))
+
+    async def delete_one(self, query):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self.docs.remove(doc)
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    async def _update(self, query, update, many):
+        self.writes += 1
+        matched = [d for d in self.docs if _matches(d, query)]
+        if not many:
+            matched = matched[:1]
+        for doc in matched:
+            if isinstance(update, list):  # pipeline: [{"$set": {...}}]
+                values = {k: _evaluate(doc, v) for k, v in update[0]["$set"].items()}
+                doc.update(values)
+                continue
+            doc.update(update.get("$set", {}))
+            for key, value in update.get("$push", {}).items():
+                parent, _, child = key.partition(".")
+                doc.setdefault(parent, {}).setdefault(child, []).append(value)
+            for key, value in update.get("$addToSet", {}).items():
+                if value not in doc.setdefault(key, []):
+                    doc[key].append(value)
+        return SimpleNamespace(matched_count=len(matched), modified_count=len(matched))
+
+
+class _FakeDb:
+    def __init__(self) -> None:
+        self.collections: Dict[str, _Collection] = {
+            "farm_tasks": _Collection("taskId"),
+            task_series.SERIES_COLLECTION: _Collection("seriesId"),
+        }
+
+    def __getitem__(self, name: str) -> _Collection:
+        return self.collections.setdefault(name, _Collection())
+
+    def __getattr__(self, name: str) -> _Collection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _FakeDb()
+    monkeypatch.setattr(farm_db, "get_database", lambda: fake)
+    return fake
+
+
+FARM = uuid4()
+START = datetime(2026, 3, 1, 8, 0)
+WINDOW = (START - timedelta(days=1), START + timedelta(days=60))
+
+
+async def _series(count=30, start=START, **fields) -> FarmTaskSeries:
+    return await TaskRepository.create_series(
+        FarmTaskSeries(
+            seriesId=task_series.new_series_id(),
+            farmId=FARM,
+            blockId=fields.pop("blockId", uuid4()),
+            taskType=TaskType.DAILY_HARVEST,
+            description="Daily harvest for A - Day {n}",
+            startDate=start,
+            count=count,
+            dueOffsetSeconds=15 * 3600,
+            **fields,
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_occurrence_ids_and_expansion():
+    series = FarmTaskSeries(
+        seriesId=task_series.new_series_id(),
+        farmId=FARM,
+        blockId=uuid4(),
+        taskType=TaskType.DAILY_HARVEST,
+        startDate=START,
+        intervalDays=2,
+        count=10,
+        exceptions=[1],
+        materialized=[2],
+        cancelledAfter=START + timedelta(days=11),
+    )
+    task_id = task_series.occurrence_task_id(series.seriesId, 7)
+    assert task_series.split_occurrence_id(task_id) == (series.seriesId, 7)
+    assert task_series.split_occurrence_id(series.seriesId)[1] == -1
+
+    window = task_series.expand_series(
+        series, START + timedelta(days=1), START + timedelta(days=14)
+    )
+    # Indexes 1..6: 1 deleted, 2 overridden; after day 11 cancelled
+    assert [(t.occurrenceIndex, t.status) for t in window] == [
+        (3, TaskStatus.PENDING),
+        (4, TaskStatus.PENDING),
+        (5, TaskStatus.PENDING),
+        (6, TaskStatus.CANCELLED),
+    ]
+    for status in (None, TaskStatus.PENDING, TaskStatus.CANCELLED):
+        assert task_series.count_virtual(series, status) == len(
+            task_series.expand_series(series, status=status)
+        )
+
+
+@pytest.mark.asyncio
+async def test_generation_writes_one_series_document(db):
+    block_id, cycle_id = uuid4(), uuid4()
+    tasks = await TaskGeneratorService._generate_daily_harvest_tasks(
+        farm_id=FARM,
+        block_id=block_id,
+        block_name="A",
+        harvest_start_date=START,
+        expected_changes={},
+        cycle_id=cycle_id,
+    )
+
+    assert len(tasks) == 30 and db.farm_tasks.docs == []
+    assert len(db.farm_task_series.docs) == 1
+    assert tasks[29].scheduledDate == START + timedelta(days=29)
+    assert tasks[29].dueDate == (START + timedelta(days=29)).replace(
+        hour=23, minute=59, second=59
+    )
+    assert tasks[29].description == "Daily harvest for A - Day 30"
+
+    found = await TaskRepository.get_by_id(tasks[4].taskId)
+    assert found == tasks[4]
+    assert found.generatedFromCycleId == cycle_id
+
+
+@pytest.mark.asyncio
+async def test_reads_merge_stored_tasks_and_occurrences(db):
+    await _series(count=5)
+    stored = await TaskRepository.create(
+        FarmTaskCreate(
+            farmId=FARM,
+            blockId=uuid4(),
+            taskType=TaskType.CLEANING,
+            scheduledDate=START + timedelta(days=2, hours=1),
+        )
+    )
+
+    tasks, total = await TaskRepository.get_by_farm(FARM, *WINDOW, page=1, per_page=4)
+    assert total == 6
+    assert [t.occurrenceIndex for t in tasks] == [0, 1, 2, None]
+    page2, _ = await TaskRepository.get_by_farm(FARM, *WINDOW, page=2, per_page=4)
+    assert [t.occurrenceIndex for t in page2] == [3, 4]
+
+    window, total = await TaskRepository.get_by_farm(
+        FARM, START + timedelta(days=2), START + timedelta(days=4)
+    )
+    assert total == 3
+    assert [t.taskId for t in window][1] == stored.taskId
+
+    mine = await TaskRepository.get_my_tasks(FARM, uuid4(), TaskStatus.PENDING)
+    assert len(mine) == 6
+    assert await TaskRepository.count_pending_tasks(uuid4(), [FARM]) == 6
+
+
+@pytest.mark.asyncio
+async def test_touching_an_occurrence_materializes_it_once(db):
+    series = await _series(count=3)
+    task_id = task_series.occurrence_task_id(series.seriesId, 1)
+    entry = HarvestEntryCreate(quantity=12.5, grade=HarvestGrade.A)
+
+    await TaskRepository.add_harvest_entry(task_id, uuid4(), "a@b.c", entry)
+    updated = await TaskRepository.add_harvest_entry(task_id, uuid4(), "a@b.c", entry)
+
+    assert [d["taskId"] for d in db.farm_tasks.docs] == [str(task_id)]
+    assert len(updated.taskData.harvestEntries) == 2
+    assert db.farm_task_series.docs[0]["materialized"] == [1]
+
+    tasks, total = await TaskRepository.get_by_farm(FARM, *WINDOW)
+    assert total == 3
+    assert [t.taskId for t in tasks].count(task_id) == 1
+
+    assert await TaskRepository.delete(
+        task_series.occurrence_task_id(series.seriesId, 2)
+    )
+    assert db.farm_task_series.docs[0]["exceptions"] == [2]
+    assert (await TaskRepository.get_by_farm(FARM, *WINDOW))[1] == 2
+
+
+@pytest.mark.asyncio
+async def test_reschedule_is_one_series_update(db):
+    cycle_id = uuid4()
+    series = await _series(count=30, generatedFromCycleId=cycle_id)
+    await TaskRepository.materialize(task_series.occurrence_task_id(series.seriesId, 3))
+    series_writes = db.farm_task_series.writes
+
+    new_start = START + timedelta(days=5)
+    moved = await TaskGeneratorService.reschedule_tasks_for_timeline_change(
+        uuid4(), cycle_id, {"harvesting": new_start.isoformat()}, uuid4(), "a@b.c"
+    )
+
+    assert moved == 30
+    assert db.farm_task_series.writes == series_writes + 1
+    override = db.farm_tasks.docs[0]
+    assert override["scheduledDate"] == new_start + timedelta(days=3)
+    assert override["dueDate"] == new_start + timedelta(days=3, hours=15)
+    tasks, _ = await TaskRepository.get_by_farm(FARM, *WINDOW)
+    assert [t.scheduledDate for t in tasks] == [
+        new_start + timedelta(days=i) for i in range(30)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aggregator_extension_and_cancel(db):
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    cycle_id, block_id = uuid4(), uuid4()
+    series = await _series(
+        count=5,
+        start=today - timedelta(days=4),
+        generatedFromCycleId=cycle_id,
+        blockId=block_id,
+    )
+    db.blocks.docs.append({"blockId": str(block_id), "state": "harvesting"})
+
+    # Today's occurrence (the series' last) is started, then aggregated
+    last = task_series.occurrence_task_id(series.seriesId, 4)
+    await TaskRepository.update(last, FarmTaskUpdate(status=TaskStatus.IN_PROGRESS))
+
+    stats = await HarvestAggregatorService.run_daily_aggregation()
+
+    assert stats["tasks_aggregated"] == 1 and stats["new_tasks_generated"] == 1
+    assert db.farm_task_series.docs[0]["count"] == 6
+    assert [d["taskId"] for d in db.farm_tasks.docs] == [str(last)]
+    assert db.farm_tasks.docs[0]["status"] == TaskStatus.COMPLETED.value
+
+    # Harvest ends early: tomorrow's occurrence is cancelled, no more growth
+    cancelled = await TaskGeneratorService.cancel_future_harvest_tasks(
+        cycle_id, uuid4(), "a@b.c"
+    )
+    assert cancelled == 1
+    tomorrow = await TaskRepository.get_by_id(
+        task_series.occurrence_task_id(series.seriesId, 5)
+    )
+    assert tomorrow.status == TaskStatus.CANCELLED
+    assert not await TaskRepository.extend_series(
+        series.seriesId, today + timedelta(days=2)
+    )
+
+
+@pytest.mark.asyncio
+async def test_ending_harvest_closes_the_block_series(db):
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    block_id = uuid4()
+    series = await _series(
+        count=5,
+        start=today - timedelta(days=2),
+        blockId=block_id,
+        triggerStateChange=BlockStatus.CLEANING.value,
+    )
+    pending = await TaskRepository.list_by_block(
+        block_id,
+        status=TaskStatus.PENDING,
+        trigger_state_change=BlockStatus.CLEANING.value,
+    )
+    assert len(pending) == 5
+    assert await TaskRepository.count_by_status_for_block(block_id) == {"pending": 5}
+
+    completed = await BlockService.auto_complete_harvest_tasks(
+        block_id, uuid4(), "a@b.c"
+    )
+
+    # Occurrences 0..2 were due: completed under their own ids; 3..4 cancelled
+    assert completed == 3
+    assert sorted(d["occurrenceIndex"] for d in db.farm_tasks.docs) == [0, 1, 2]
+    assert db.farm_task_series.docs[0]["cancelledAfter"] is not None
+    assert await TaskRepository.count_by_status_for_block(block_id) == {
+        "completed": 3,
+        "cancelled": 2,
+    }
+    assert not await TaskRepository.list_by_block(block_id, status=TaskStatus.PENDING)
+    last = await TaskRepository.get_by_id(
+        task_series.occurrence_task_id(series.seriesId, 4)
+    )
+    assert last.status == TaskStatus.CANCELLED
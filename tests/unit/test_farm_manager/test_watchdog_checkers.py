@@ -0,0 +1,142 @@
+"""
+Tests for the watchdog checkers and run orchestration.
+
+Checkers must scan their full result sets (no 200/500 caps), share one
+per-run block/farm lookup cache, and report per-checker timings.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.modules.farm_manager.services.watchdog.checkers.alert_checker import (
+    AlertChecker,
+)
+from src.modules.farm_manager.services.watchdog.checkers.late_items_checker import (
+    LateItemsChecker,
+)
+from src.modules.farm_manager.services.watchdog.lookup import WatchdogLookupCache
+from src.modules.farm_manager.services.watchdog.models import WatchdogConfig
+from src.modules.farm_manager.services.watchdog.service import WatchdogService
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self._docs:
+            yield doc
+
+
+def _db(collections):
+    """Fake Motor db: find() returns every doc whose ids match an $in filter."""
+    calls = {}
+
+    def _get(name):
+        coll = MagicMock()
+
+        def find(query=None, projection=None):
+            calls[name] = calls.get(name, 0) + 1
+            docs = collections.get(name, [])
+            for field, cond in (query or {}).items():
+                if isinstance(cond, dict) and "$in" in cond:
+                    docs = [d for d in docs if d.get(field) in cond["$in"]]
+            return _Cursor(docs)
+
+        coll.find = MagicMock(side_effect=find)
+        return coll
+
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=_get)
+    db.find_calls = calls
+    return db
+
+
+def _farm(n_blocks):
+    return {
+        "blocks": [
+            {"blockId": f"b{i}", "name": f"Block {i}", "farmId": "f1"}
+            for i in range(n_blocks)
+        ],
+        "farms": [{"farmId": "f1", "name": "North Farm"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_alert_checker_scans_past_old_cap():
+    data = _farm(700)
+    data["alerts"] = [
+        {
+            "alertId": f"a{i}",
+            "blockId": f"b{i}",
+            "status": "active",
+            "severity": "high",
+            "createdAt": datetime.utcnow(),
+        }
+        for i in range(700)
+    ]
+    checker = AlertChecker(_db(data))
+
+    issues = await checker.run()
+
+    assert len(issues) == 700
+    assert checker.scanned == 700
+    assert issues[-1].farmName == "North Farm"
+    assert issues[-1].blockName == "Block 699"
+
+
+@pytest.mark.asyncio
+async def test_checkers_share_lookup_cache():
+    data = _farm(10)
+    data["alerts"] = [
+        {"alertId": "a1", "blockId": "b1", "status": "active", "severity": "critical"}
+    ]
+    data["block_cycles"] = [
+        {
+            "cycleId": "c1",
+            "blockId": "b1",
+            "status": "active",
+            "estimatedHarvestStartDate": datetime.utcnow() - timedelta(days=9),
+        }
+    ]
+    db = _db(data)
+    lookup = WatchdogLookupCache(db)
+
+    await AlertChecker(db, lookup).run()
+    late = await LateItemsChecker(db, lookup).run()
+
+    assert late[0].blockName == "Block 1"
+    # b1 and f1 were fetched once, by whichever checker asked first.
+    assert db.find_calls["blocks"] == 1
+    assert db.find_calls["farms"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_check_records_per_checker_stats_and_isolates_failures():
+    db = _db(_farm(3))
+    service = WatchdogService(db)
+    service.config_service.get_config = AsyncMock(
+        return_value=WatchdogConfig(
+            enabled=True, enabledChecks=["active_alerts", "system_health"]
+        )
+    )
+
+    with patch(
+        "src.modules.farm_manager.services.watchdog.checkers."
+        "system_health_checker.SystemHealthChecker.run",
+        AsyncMock(side_effect=RuntimeError("boom")),
+    ):
+        result = await service.run_check(triggered_by="manual")
+
+    by_name = {c.name: c for c in result.checkers}
+    assert set(by_name) == {"active_alerts", "system_health"}
+    assert by_name["active_alerts"].error is None
+    assert by_name["active_alerts"].durationMs >= 0
+    assert by_name["system_health"].error == "boom"
+    assert result.errors == ["system_health: boom"]
+    assert result.lookupStats is not None
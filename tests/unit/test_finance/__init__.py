@@ -0,0 +1 @@
+"""Unit tests for the operational finance (P&L) module."""
@@ -0,0 +1,487 @@
+"""
+Tests for the pnl_monthly_facts table (finance/services/finance/pnl_facts.py).
+
+Every P&L endpoint answered from facts must match what the source-collection
+aggregation returns for the same fixture dataset.  A small in-memory
+aggregation evaluator runs both sets of pipelines (there is no mongomock in
+requirements.txt).
+"""
+
+import copy
+from datetime import date, datetime
+
+import pytest
+
+from src.core.finance.pnl_dirty import DIRTY_COLLECTION
+from src.modules.finance.services.finance.pnl_facts import (
+    FACTS_COLLECTION,
+    PnLFactsService,
+)
+from src.modules.finance.services.finance.pnl_service import PnLService
+
+_MISSING = object()
+
+
+def _get(doc, path):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return _MISSING
+        doc = doc[part]
+    return doc
+
+
+def _eval(expr, doc):
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = _get(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, dict) and len(expr) == 1:
+        op, args = next(iter(expr.items()))
+        if op == "$ifNull":
+            value = _eval(args[0], doc)
+            return _eval(args[1], doc) if value is None else value
+        if op == "$subtract":
+            return _eval(args[0], doc) - _eval(args[1], doc)
+        if op in ("$year", "$month"):
+            value = _eval(args, doc)
+            return None if value is None else getattr(value, op[1:])
+    if isinstance(expr, dict):
+        return {k: _eval(v, doc) for k, v in expr.items()}
+    return expr
+
+
+def _cond_ok(value, cond):
+    if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+        for op, arg in cond.items():
+            if op == "$in" and value not in arg:
+                return False
+            if op == "$ne" and value == arg:
+                return False
+            if op in ("$gte", "$lte", "$lt", "$gt"):
+                if value is None or value is _MISSING:
+                    return False
+                ok = {
+                    "$gte": value >= arg,
+                    "$lte": value <= arg,
+                    "$lt": value < arg,
+                    "$gt": value > arg,
+                }[op]
+                if not ok:
+                    return False
+        return True
+    return (None if value is _MISSING else value) == cond
+
+
+def _matches(doc, query):
+    return all(_cond_ok(_get(doc, k), c) for k, c in (query or {}).items())
+
+
+def _group(docs, spec):
+    groups = {}
+    for doc in docs:
+        key = _eval(spec["_id"], doc)
+        hashable = repr(key)
+        if hashable not in groups:
+            groups[hashable] = {"_id": key}
+            for name, acc in spec.items():
+                if name == "_id":
+                    continue
+                op = next(iter(acc))
+                groups[hashable][name] = {
+                    "$sum": 0,
+                    "$addToSet": [],
+                    "$push": [],
+                    "$min": None,
+                    "$max": None,
+                }[op]
+        out = groups[hashable]
+        for name, acc in spec.items():
+            if name == "_id":
+                continue
+            op, arg = next(iter(acc.items()))
+            value = _eval(arg, doc)
+            if op == "$sum":
+                if isinstance(value, (int, float)):
+                    out[name] += value
+            elif op == "$addToSet":
+                if _get(doc, arg[1:]) is not _MISSING and value not in out[name]:
+                    out[name].append(value)
+            elif op == "$push":
+                out[name].append(value)
+            elif value is not None:
+                if out[name] is None:
+                    out[name] = value
+                elif op == "$min":
+                    out[name] = min(out[name], value)
+                else:
+                    out[name] = max(out[name], value)
+    return list(groups.values())
+
+
+def _aggregate(docs, pipeline):
+    docs = [copy.deepcopy(d) for d in docs]
+    for stage in pipeline:
+        ((op, arg),) = stage.items()
+        if op == "$match":
+            docs = [d for d in docs if _matches(d, arg)]
+        elif op == "$unwind":
+            field = arg[1:]
+            docs = [{**d, field: item} for d in docs for item in (_get(d, field) or [])]
+        elif op == "$project":
+            docs = [
+                {
+                    k: (_eval(v, d) if v != 1 else _get(d, k))
+                    for k, v in arg.items()
+                    if v == 1 and _get(d, k) is not _MISSING or v != 1
+                }
+                for d in docs
+            ]
+        elif op == "$group":
+            docs = _group(docs, arg)
+        elif op == "$sort":
+            for field, direction in reversed(list(arg.items())):
+                docs.sort(key=lambda d: _get(d, field), reverse=direction < 0)
+        elif op == "$limit":
+            docs = docs[:arg]
+        else:
+            raise NotImplementedError(op)
+    return docs
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, field, direction=1):
+        self._docs.sort(key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length=None):
+        return self._docs if length is None else self._docs[:length]
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self._docs:
+            yield doc
+
+
+class _Result:
+    def __init__(self, **kw):
+        self.__dict__.update(kw)
+
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+
+    def find(self, query=None, projection=None):
+        return _Cursor([copy.deepcopy(d) for d in self.docs if _matches(d, query)])
+
+    async def find_one(self, query=None, projection=None):
+        found = [d for d in self.docs if _matches(d, query)]
+        return copy.deepcopy(found[0]) if found else None
+
+    def aggregate(self, pipeline):
+        return _Cursor(_aggregate(self.docs, pipeline))
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            self.docs = [d for d in self.docs if d["_id"] != op._filter["_id"]]
+            self.docs.append(copy.deepcopy(op._doc))
+
+    async def delete_many(self, query):
+        keep = [d for d in self.docs if not _matches(d, query)]
+        removed, self.docs = len(self.docs) - len(keep), keep
+        return _Result(deleted_count=removed)
+
+    async def delete_one(self, query):
+        hits = [d for d in self.docs if _matches(d, query)]
+        if hits:
+            self.docs.remove(hits[0])
+        return _Result(deleted_count=len(hits[:1]))
+
+
+class FakeDB:
+    def __init__(self, **collections):
+        self._collections = {k: FakeCollection(v) for k, v in collections.items()}
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(name, FakeCollection())
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+ORG = "org-1"
+
+
+def _line(ref, day, farm, crop, source, after_tax, vat, paid, kg, year=2025):
+    return {
+        "organizationId": ORG,
+        "orderRef": ref,
+        "createdAt": day,
+        "farmId": farm,
+        "cropName": crop,
+        "farmingYear": year,
+        "metadata": {"priceSource": source} if source else {},
+        "excel_data": (
+            {"totalAmountAfterTax": after_tax, "vatAmount": vat, "paidAmount": paid}
+            if after_tax is not None
+            else None
+        ),
+        "totalKg": kg,
+    }
+
+
+def _fixture():
+    return FakeDB(
+        farms=[
+            {"farmId": "f1", "name": "North"},
+            {"farmId": "f2", "name": "South"},
+            {"farmId": "f3", "name": "Idle"},
+        ],
+        sales_order_lines=[
+            _line(
+                "SO1",
+                datetime(2025, 1, 5),
+                "f1",
+                "Tomato",
+                "excel_match",
+                105.0,
+                5.0,
+                105.0,
+                10,
+            ),
+            _line(
+                "SO1",
+                datetime(2025, 1, 5),
+                "f1",
+                "Lettuce",
+                "excel_match",
+                52.5,
+                2.5,
+                0.0,
+                4,
+            ),
+            _line(
+                "SO2",
+                datetime(2025, 1, 20),
+                "f2",
+                "Tomato",
+                "imputed_customer_crop_avg",
+                210.0,
+                10.0,
+                100.0,
+                20,
+            ),
+            _line(
+                "SO3",
+                datetime(2025, 2, 3),
+                "f1",
+                "Tomato",
+                "excel_alias_match",
+                63.0,
+                3.0,
+                63.0,
+                6,
+            ),
+            _line(
+                "SO3", datetime(2025, 2, 3), "f1", "Cucumber", None, None, None, None, 3
+            ),
+            _line(
+                "SO4",
+                datetime(2025, 3, 15),
+                "f2",
+                "Lettuce",
+                "excel_match",
+                31.5,
+                1.5,
+                31.5,
+                2,
+                year=2026,
+            ),
+        ],
+        purchase_register=[
+            {
+                "organizationId": ORG,
+                "date": datetime(2025, 1, 10),
+                "items": [
+                    {
+                        "name": "Tomato seeds",
+                        "amount": 40.0,
+                        "mappedCropName": "Tomato",
+                    },
+                    {"name": "NPK fertilizer", "amount": 25.0, "mappedCropName": None},
+                    {"name": "Pump repair", "amount": 12.0},
+                ],
+            },
+            {
+                "organizationId": ORG,
+                "date": datetime(2025, 2, 12),
+                "items": [
+                    {"name": "Diesel fuel", "amount": 18.0},
+                    {"name": "Office rent", "amount": 30.0},
+                    {
+                        "name": "Lettuce plugs",
+                        "amount": 9.0,
+                        "mappedCropName": "Lettuce",
+                    },
+                ],
+            },
+        ],
+        sales_orders=[
+            {
+                "organizationId": ORG,
+                "orderDate": datetime(2025, 1, 5),
+                "farmId": "f1",
+                "farmingYear": 2025,
+                "paymentStatus": "paid",
+            },
+            {
+                "organizationId": ORG,
+                "orderDate": datetime(2025, 1, 20),
+                "farmId": "f2",
+                "farmingYear": 2025,
+                "paymentStatus": "partial",
+            },
+            {
+                "organizationId": ORG,
+                "orderDate": datetime(2025, 2, 3),
+                "farmId": "f1",
+                "farmingYear": 2025,
+                "paymentStatus": "pending",
+            },
+            {
+                "organizationId": ORG,
+                "orderDate": datetime(2025, 3, 15),
+                "farmId": "f2",
+                "farmingYear": 2026,
+                "paymentStatus": "unknown",
+            },
+        ],
+        block_harvests=[
+            {
+                "organizationId": ORG,
+                "harvestDate": datetime(2025, 1, 2),
+                "farmId": "f1",
+                "quantityKg": 30.0,
+            },
+            {
+                "organizationId": ORG,
+                "harvestDate": datetime(2025, 2, 8),
+                "farmId": "f2",
+                "quantityKg": 12.5,
+            },
+        ],
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_facts_flag():
+    PnLService._facts_built = False
+    yield
+    PnLService._facts_built = False
+
+
+async def _services():
+    db = _fixture()
+    await PnLFactsService(db).rebuild_all()
+    service = PnLService()
+    service._db = db
+    return db, service
+
+
+SCOPES = [
+    {},
+    {"farm_id": "f1"},
+    {"farming_year": 2025},
+    {"start_date": date(2025, 1, 1), "end_date": date(2025, 1, 31)},
+    {"start_date": date(2025, 2, 1), "end_date": date(2025, 3, 31)},
+    {"include_imputed": False},
+    {"price_source_filter": "excel_match"},
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scope", SCOPES)
+async def test_facts_match_source_aggregation(scope):
+    db, service = await _services()
+    no_farm = {k: v for k, v in scope.items() if k != "farm_id"}
+    sources_scope = {
+        k: v
+        for k, v in scope.items()
+        if k not in ("include_imputed", "price_source_filter")
+    }
+
+    assert await service.get_summary(**scope) == await service._summary_from_source(
+        **scope
+    )
+    assert await service.get_by_month(**scope) == await service._by_month_from_source(
+        **scope
+    )
+    assert await service.get_by_farm(**no_farm) == await service._by_farm_from_source(
+        **no_farm
+    )
+    assert await service.get_by_crop(**scope) == await service._by_crop_from_source(
+        **scope
+    )
+    assert await service.get_revenue_sources(
+        **sources_scope
+    ) == await service._revenue_sources_from_source(**sources_scope)
+    assert PnLService._facts_built is True
+
+
+@pytest.mark.asyncio
+async def test_expenses_are_classified_once_at_write_time():
+    db, _ = await _services()
+    by_category = {}
+    for fact in db[FACTS_COLLECTION].docs:
+        if "amount" in fact:
+            by_category[fact["category"]] = (
+                by_category.get(fact["category"], 0) + fact["amount"]
+            )
+
+    assert by_category == {
+        "cogs_crop": 49.0,
+        "cogs_farm": 25.0,
+        "opex_maintenance": 12.0,
+        "opex_logistics": 18.0,
+        "opex_other": 30.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_split_month_ranges_fall_back_to_source():
+    db, service = await _services()
+    db[FACTS_COLLECTION].docs.clear()  # facts would return zeros
+
+    summary = await service.get_summary(
+        start_date=date(2025, 1, 1), end_date=date(2025, 1, 15)
+    )
+
+    assert summary["revenue"]["lineCount"] == 2
+
+
+@pytest.mark.asyncio
+async def test_dirty_month_refresh_picks_up_new_orders():
+    db, service = await _services()
+    db["sales_orders"].docs.append(
+        {
+            "organizationId": ORG,
+            "orderDate": datetime(2025, 2, 20),
+            "farmId": "f2",
+            "farmingYear": 2025,
+            "paymentStatus": "paid",
+        }
+    )
+    db[DIRTY_COLLECTION].docs.append({"_id": "2025-02", "markedAt": datetime.utcnow()})
+
+    result = await PnLFactsService(db).refresh_dirty()
+
+    assert result == {"months": ["2025-02"]}
+    assert db[DIRTY_COLLECTION].docs == []
+    summary = await service.get_summary()
+    assert summary["orders"] == {"paid": 2, "pending": 1, "partial": 1, "total": 5}
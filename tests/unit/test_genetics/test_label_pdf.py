@@ -439,6 +439,12 @@ class _FakeDB:
 def fake_db(monkeypatch):
     db = _FakeDB()
     monkeypatch.setattr(labels_module.genetics_db, "get_database", lambda: db)
+    # Every collection name maps to the one fake collection, so the public
+    # page invalidation after a count bump would land on it too — keep it out
+    # of the update_one assertions below.
+    monkeypatch.setattr(
+        labels_module.PublicInfoSnapshotService, "invalidate", AsyncMock()
+    )
     return db
 
 
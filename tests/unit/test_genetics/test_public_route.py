@@ -42,9 +42,12 @@ No live database — Motor's AsyncIOMotorCollection is stood in for with a
 small generic fake supporting the query shapes this route's collaborators
 actually issue (equality, ``$in``, and Mongo's array-contains-scalar
 semantics), following the no-mongomock precedent in
-tests/unit/test_genetics/test_vessel_resolver.py. ``resolve_vessel`` itself
-is never mocked — the split-survives-a-scan test exercises the real
-function against the fake collection, exactly as spec §3 describes it.
+tests/unit/test_genetics/test_vessel_resolver.py. The split walk is never
+mocked — the split-survives-a-scan test exercises the route's real walk
+against the fake collection, exactly as spec §3 describes it. The fake has
+no write operations, so every request here builds its page afresh (the
+snapshot store's writes are best-effort); test_public_snapshots.py covers
+the stored path.
 
 Test cases:
   - Leakage
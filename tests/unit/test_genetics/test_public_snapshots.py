@@ -0,0 +1,367 @@
+"""
+Unit tests for the precomputed public label pages behind
+``GET /api/v1/public/genetics/i/{token}[/{vesselNo}]``.
+
+What these pin down:
+
+  - A repeat scan is served from the stored snapshot alone — one read by
+    ``_id``, nothing else — for both tiers, and the anonymous body is the
+    same bytes with the same strong ETag every time.
+  - A matching ``If-None-Match`` gets a bodiless 304; a vessel scan carries
+    its own ETag.
+  - Writing a record a page was built from (here an ancestor) drops the page
+    and the next scan shows the new data.
+  - A page built while an invalidation ran is withdrawn, not kept.
+  - Split-off vessels route through the stored pages.
+
+The fake below extends test_public_route.py's query-shape fake with the
+write operations the snapshot store issues, and records every call so a
+test can assert which collections a scan touched.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models.organization import PublicInfoPageConfig
+from src.modules.genetics.api.v1 import public as public_module
+from src.modules.genetics.models.accession import Accession, ParentRef, StorageLocation
+from src.modules.genetics.models.enums import (
+    OrganismKind,
+    ParentRole,
+    ProvenanceType,
+    VesselForm,
+)
+from src.modules.genetics.models.line import Line, Provenance
+from src.modules.genetics.services.common import model_to_doc
+from src.modules.genetics.services.database import (
+    ACCESSIONS,
+    LINES,
+    PUBLIC_SNAPSHOTS,
+)
+from src.modules.genetics.services.public_info.snapshot_service import (
+    PublicInfoSnapshotService,
+)
+
+# ---------------------------------------------------------------------------
+# Fake database
+# ---------------------------------------------------------------------------
+
+
+def _values(doc: Dict[str, Any], dotted_key: str) -> List[Any]:
+    current: List[Any] = [doc]
+    for part in dotted_key.split("."):
+        nxt: List[Any] = []
+        for value in current:
+            if isinstance(value, dict) and part in value:
+                nxt.append(value[part])
+            elif isinstance(value, list):
+                nxt.extend(i[part] for i in value if isinstance(i, dict) and part in i)
+        current = nxt
+    # Array fields match on any element
+    flat: List[Any] = []
+    for value in current:
+        flat.extend(value if isinstance(value, list) else [value])
+    return flat
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, expected in query.items():
+        actual = _values(doc, key)
+        if isinstance(expected, dict) and "$in" in expected:
+            if not any(v in expected["$in"] for v in actual):
+                return False
+        elif expected not in actual:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, items: List[Dict[str, Any]]) -> None:
+        self._items = list(items)
+
+    def sort(self, *args: Any, **kwargs: Any) -> "_Cursor":
+        return self
+
+    def limit(self, *args: Any, **kwargs: Any) -> "_Cursor":
+        return self
+
+    def __aiter__(self) -> "_Cursor":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if not self._items:
+            raise StopAsyncIteration
+        return self._items.pop(0)
+
+
+class _FakeCollection:
+    def __init__(self, name: str, calls: List[Tuple[str, str]]) -> None:
+        self.name = name
+        self.docs: List[Dict[str, Any]] = []
+        self._calls = calls
+
+    async def find_one(self, query: Dict[str, Any], *args: Any, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self._calls.append((self.name, "find_one"))
+        return next((dict(d) for d in self.docs if _matches(d, query)), None)
+
+    def find(self, query: Optional[Dict[str, Any]] = None, *args: Any, **kwargs: Any) -> _Cursor:
+        self._calls.append((self.name, "find"))
+        return _Cursor([dict(d) for d in self.docs if _matches(d, query or {})])
+
+    async def replace_one(self, query: Dict[str, Any], doc: Dict[str, Any], upsert: bool = False) -> None:
+        self.docs = [d for d in self.docs if not _matches(d, query)]
+        self.docs.append({**doc, "_id": query["_id"]})
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> None:
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is None:
+            doc = dict(query)
+            self.docs.append(doc)
+        for field, value in update.get("$set", {}).items():
+            doc[field] = value
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+
+    async def delete_one(self, query: Dict[str, Any]) -> None:
+        match = next((d for d in self.docs if _matches(d, query)), None)
+        if match is not None:
+            self.docs.remove(match)
+
+    async def delete_many(self, query: Dict[str, Any]) -> SimpleNamespace:
+        kept = [d for d in self.docs if not _matches(d, query)]
+        deleted = len(self.docs) - len(kept)
+        self.docs = kept
+        return SimpleNamespace(deleted_count=deleted)
+
+
+class _FakeDB:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, str]] = []
+        self._collections: Dict[str, _FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> _FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = _FakeCollection(name, self.calls)
+        return self._collections[name]
+
+    def seed(self, name: str, docs: List[Dict[str, Any]]) -> None:
+        self[name].docs = list(docs)
+
+    def touched(self) -> List[str]:
+        return sorted({name for name, _ in self.calls})
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def _make_accession(**overrides: Any) -> Accession:
+    defaults: Dict[str, Any] = dict(
+        lineId="line-po-blu",
+        accessionCode="PO-BLU-G3-004",
+        form=VesselForm.PETRI_DISH,
+        quantity=113,
+        unit="plates",
+        cloneGeneration=3,
+        publicToken="ZZZZZZ0001",
+        labelledVesselCount=120,
+    )
+    defaults.update(overrides)
+    return Accession(**defaults)
+
+
+@pytest.fixture
+def db(monkeypatch: pytest.MonkeyPatch) -> _FakeDB:
+    fake = _FakeDB()
+    monkeypatch.setattr(public_module.genetics_db, "get_database", lambda: fake)
+    monkeypatch.setattr(
+        public_module.OrganizationService,
+        "get_organization",
+        AsyncMock(
+            return_value=SimpleNamespace(
+                modules=SimpleNamespace(publicInfoPage=PublicInfoPageConfig())
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        public_module.UserService,
+        "get_user_by_id",
+        AsyncMock(return_value=SimpleNamespace(firstName="Viet", lastName="Anh")),
+    )
+    return fake
+
+
+@pytest.fixture
+def scenario(db: _FakeDB) -> Dict[str, Accession]:
+    root = _make_accession(
+        accessionCode="PO-BLU-G0-001",
+        cloneGeneration=0,
+        publicToken="SNAPROOT01",
+        labelledVesselCount=0,
+        provenance=Provenance(type=ProvenanceType.WILD_COLLECTED, sourceNote="Spore print"),
+    )
+    main = _make_accession(
+        publicToken="SNAPMAIN01",
+        parents=[ParentRef(accessionId=root.id, role=ParentRole.CLONE_SOURCE, lineId=root.lineId)],
+        createdBy="user-1",
+        organizationId="org-1",
+        location=StorageLocation(facility="Lab A"),
+        acquiredAt=datetime(2026, 7, 31),
+    )
+    child = _make_accession(
+        accessionCode="PO-BLU-G3-100",
+        publicToken="SNAPCHILD1",
+        labelledVesselCount=0,
+        quantity=1,
+        organizationId="org-1",
+        splitFromAccessionId=main.id,
+        sourceVesselNumbers=[7],
+    )
+    line = Line(
+        id=main.lineId,
+        code="PO-BLU",
+        commonName="Blue Oyster",
+        kind=OrganismKind.FUNGUS,
+    )
+    db.seed(ACCESSIONS, [model_to_doc(a, "accessionId") for a in (root, main, child)])
+    db.seed(LINES, [model_to_doc(line, "lineId")])
+    return {"root": root, "main": main, "child": child}
+
+
+@pytest.fixture
+def client(db: _FakeDB) -> TestClient:
+    app = FastAPI()
+    app.include_router(public_module.router)
+    app.dependency_overrides[public_module.enforce_public_rate_limit] = lambda: None
+    with TestClient(app) as c:
+        yield c
+
+
+def _staff_user() -> "public_module.CurrentUser":
+    return public_module.CurrentUser(
+        userId="staff-1",
+        email="staff@example.com",
+        firstName="Bench",
+        lastName="Staff",
+        role="user",
+        isActive=True,
+        isEmailVerified=True,
+        organizationId="org-1",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_repeat_scan_is_one_snapshot_read(client: TestClient, db: _FakeDB, scenario: Dict[str, Accession]) -> None:
+    first = client.get("/i/snapmain01")
+    assert first.status_code == 200, first.text
+    assert ACCESSIONS in db.touched()
+    assert first.headers["cache-control"] == "no-cache"
+    assert first.headers["vary"] == "Authorization"
+
+    db.calls.clear()
+    second = client.get("/i/SNAPMAIN01")
+    assert second.status_code == 200
+    assert db.calls == [(PUBLIC_SNAPSHOTS, "find_one")]
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.json()["operator"] == "V.A."
+
+
+def test_matching_if_none_match_gets_304(client: TestClient, scenario: Dict[str, Accession]) -> None:
+    batch = client.get("/i/SNAPMAIN01")
+    etag = batch.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    not_modified = client.get("/i/SNAPMAIN01", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    vessel = client.get("/i/SNAPMAIN01/8")
+    assert vessel.json()["vessel"]["number"] == 8
+    assert vessel.headers["etag"] != etag
+    again = client.get("/i/SNAPMAIN01/8", headers={"If-None-Match": f'"stale", W/{vessel.headers["etag"]}'})
+    assert again.status_code == 304
+
+    assert client.get("/i/SNAPMAIN01", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_ancestor_write_invalidates_and_rebuilds(
+    client: TestClient, db: _FakeDB, scenario: Dict[str, Accession]
+) -> None:
+    root = scenario["root"]
+    before = client.get("/i/SNAPMAIN01")
+    assert before.json()["lineage"][-1]["provenance"] == "Spore print"
+
+    root_doc = next(d for d in db[ACCESSIONS].docs if d["accessionId"] == root.id)
+    root_doc["provenance"] = {"type": ProvenanceType.WILD_COLLECTED.value, "sourceNote": "Tissue clone"}
+    # Unrelated keys leave the page alone
+    client.portal.call(lambda: PublicInfoSnapshotService.invalidate(line_ids=["other-line"]))
+    assert client.get("/i/SNAPMAIN01").headers["etag"] == before.headers["etag"]
+
+    client.portal.call(lambda: PublicInfoSnapshotService.invalidate(accession_ids=[root.id]))
+    after = client.get("/i/SNAPMAIN01", headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json()["lineage"][-1]["provenance"] == "Tissue clone"
+    assert after.headers["etag"] != before.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_page_built_across_an_invalidation_is_withdrawn(db: _FakeDB) -> None:
+    generation = await PublicInfoSnapshotService.generation()
+    await PublicInfoSnapshotService.invalidate(accession_ids=["acc-1"])
+    await PublicInfoSnapshotService.save("TOKEN00001", {"body": "{}"}, {"accession:acc-1"}, generation)
+    assert await PublicInfoSnapshotService.get("TOKEN00001") is None
+
+    generation = await PublicInfoSnapshotService.generation()
+    await PublicInfoSnapshotService.save("TOKEN00001", {"body": "{}"}, {"accession:acc-1"}, generation)
+    stored = await PublicInfoSnapshotService.get("TOKEN00001")
+    assert stored["version"] == generation
+    assert stored["deps"] == ["accession:acc-1"]
+
+
+def test_authenticated_tier_is_an_overlay_on_the_snapshot(
+    client: TestClient, db: _FakeDB, scenario: Dict[str, Accession]
+) -> None:
+    main, root = scenario["main"], scenario["root"]
+    anonymous = client.get("/i/SNAPMAIN01")
+    assert "accessionId" not in anonymous.text and "token" not in anonymous.json()["lineageGraph"]["nodes"][0]
+
+    db.calls.clear()
+    client.app.dependency_overrides[public_module._optional_current_user] = _staff_user
+    authed = client.get("/i/SNAPMAIN01", headers={"Authorization": "Bearer overridden"})
+    assert authed.status_code == 200
+    assert db.calls == [(PUBLIC_SNAPSHOTS, "find_one")]
+    assert authed.headers["cache-control"] == "no-store"
+    assert "etag" not in authed.headers
+
+    body = authed.json()
+    assert body["accessionId"] == main.id
+    assert body["operator"] == "Viet Anh"
+    assert body["facility"] == "Lab A"
+    tokens = {node["code"]: node["token"] for node in body["lineageGraph"]["nodes"]}
+    assert tokens[root.accessionCode] == root.publicToken
+
+
+def test_split_vessel_routes_through_stored_pages(
+    client: TestClient, db: _FakeDB, scenario: Dict[str, Accession]
+) -> None:
+    assert client.get("/i/SNAPMAIN01/7").json()["accessionCode"] == "PO-BLU-G3-100"
+
+    db.calls.clear()
+    resp = client.get("/i/SNAPMAIN01/7")
+    assert resp.json()["vessel"] == {"number": 7, "of": 120, "splitOff": True, "fromVesselNo": None}
+    assert db.calls == [(PUBLIC_SNAPSHOTS, "find_one"), (PUBLIC_SNAPSHOTS, "find_one")]
@@ -0,0 +1,266 @@
+"""
+Tests for the declarative index manifest (src/core/indexes).
+
+The reconciler must list each collection once, create only what is missing
+(one createIndexes per collection), and never touch indexes that already
+exist — including ones that exist under a different name.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from src.core.indexes import (
+    IndexRegistry,
+    reconcile_indexes,
+    reconcile_indexes_on_startup,
+)
+from src.core.indexes import reconciler
+
+
+def _db(existing_by_collection):
+    """Fake Motor db: index_information() per collection + create_indexes spy."""
+    collections = {}
+
+    def _get(name):
+        if name not in collections:
+            coll = MagicMock()
+            coll.index_information = AsyncMock(
+                return_value=existing_by_collection.get(
+                    name, {"_id_": {"key": [("_id", 1)]}}
+                )
+            )
+            coll.create_indexes = AsyncMock()
+            collections[name] = coll
+        return collections[name]
+
+    db = MagicMock()
+    db.name = "a64_test"
+    db.__getitem__ = MagicMock(side_effect=_get)
+    db.collections = collections
+    return db
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for the leader election."""
+
+    def __init__(self):
+        self.keys = {}
+
+    async def exists(self, key):
+        return key in self.keys
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+
+def _use_redis(monkeypatch, redis):
+    monkeypatch.setattr(reconciler, "_get_redis", AsyncMock(return_value=redis))
+
+
+def test_declare_is_idempotent_and_rejects_conflicts():
+    reg = IndexRegistry()
+    reg.declare("users", "email", unique=True)
+    reg.declare("users", "email", unique=True)
+    assert len(reg) == 1
+    with pytest.raises(ValueError):
+        reg.declare("users", "email")
+
+
+def test_fingerprint_changes_with_manifest():
+    reg = IndexRegistry()
+    reg.declare("farms", "farmId", unique=True)
+    before = reg.fingerprint()
+    reg.declare("farms", "managerId")
+    assert reg.fingerprint() != before
+
+
+@pytest.mark.asyncio
+async def test_only_missing_indexes_are_created_in_one_call():
+    reg = IndexRegistry()
+    reg.declare("farms", "farmId", unique=True)
+    reg.declare("farms", "managerId")
+    reg.declare("farms", [("createdAt", -1)])
+    db = _db(
+        {
+            "farms": {
+                "_id_": {"key": [("_id", 1)]},
+                "farmId_1": {"key": [("farmId", 1)], "unique": True},
+            }
+        }
+    )
+
+    report = await reconcile_indexes(db, reg)
+
+    assert sorted(report.missing) == ["farms.createdAt_-1", "farms.managerId_1"]
+    coll = db.collections["farms"]
+    coll.create_indexes.assert_awaited_once()
+    created = [m.document["name"] for m in coll.create_indexes.await_args.args[0]]
+    assert sorted(created) == ["createdAt_-1", "managerId_1"]
+    assert report.failed == {}
+
+
+@pytest.mark.asyncio
+async def test_same_keys_under_other_name_is_drift_not_missing():
+    reg = IndexRegistry()
+    reg.declare("users", "email", unique=True, name="email_live_unique")
+    db = _db({"users": {"email_live_unique_old": {"key": [("email", 1)]}}})
+
+    report = await reconcile_indexes(db, reg)
+
+    assert report.missing == []
+    assert report.name_drift
+    db.collections["users"].create_indexes.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_option_mismatch_is_drift_not_a_match():
+    reg = IndexRegistry()
+    reg.declare("users", "email", unique=True)
+    reg.declare("sessions", "createdAt", expireAfterSeconds=3600)
+    reg.declare("tokens", "jti", unique=True, sparse=True)
+    db = _db(
+        {
+            "users": {"email_1": {"key": [("email", 1)]}},
+            "sessions": {
+                "createdAt_1": {"key": [("createdAt", 1)], "expireAfterSeconds": 60}
+            },
+            "tokens": {"jti_1": {"key": [("jti", 1)], "unique": True, "sparse": True}},
+        }
+    )
+
+    report = await reconcile_indexes(db, reg)
+
+    assert report.missing == []
+    assert sorted(report.option_drift) == [
+        "sessions.createdAt_1 (expireAfterSeconds: 3600 != 60)",
+        "users.email_1 (unique: True != False)",
+    ]
+    assert report.to_dict()["optionDrift"] == report.option_drift
+    for coll in db.collections.values():
+        coll.create_indexes.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_partial_filter_distinguishes_same_keys():
+    reg = IndexRegistry()
+    reg.declare(
+        "users",
+        "email",
+        unique=True,
+        partialFilterExpression={"deletedAt": None},
+        name="email_live_unique",
+    )
+    # Legacy full unique index on the same key — must not satisfy the partial one.
+    db = _db({"users": {"email_1": {"key": [("email", 1)], "unique": True}}})
+
+    report = await reconcile_indexes(db, reg)
+
+    assert report.missing == ["users.email_live_unique"]
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_falls_back_to_one_by_one():
+    reg = IndexRegistry()
+    reg.declare("blocks", "blockId", unique=True)
+    reg.declare("blocks", "farmId")
+    db = _db({})
+    coll = db["blocks"]
+    coll.create_indexes = AsyncMock(
+        side_effect=[
+            OperationFailure("batch"),
+            OperationFailure("duplicate key"),
+            None,
+        ]
+    )
+
+    report = await reconcile_indexes(db, reg)
+
+    assert coll.create_indexes.await_count == 3
+    assert list(report.failed) == ["blocks.blockId_1"]
+    assert report.created == ["blocks.farmId_1"]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_creates_nothing():
+    reg = IndexRegistry()
+    reg.declare("alerts", "alertId", unique=True)
+    db = _db({})
+
+    report = await reconcile_indexes(db, reg, dry_run=True)
+
+    assert report.missing == ["alerts.alertId_1"]
+    db.collections["alerts"].create_indexes.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_startup_marker_is_scoped_to_the_database(monkeypatch):
+    reg = IndexRegistry()
+    reg.declare("alerts", "alertId", unique=True)
+    redis = _FakeRedis()
+    _use_redis(monkeypatch, redis)
+
+    await reconcile_indexes_on_startup(_db({}), reg)
+    other = _db({})
+    other.name = "a64_staging"
+    report = await reconcile_indexes_on_startup(other, reg)
+
+    assert report.skipped_reason is None
+    assert report.created == ["alerts.alertId_1"]
+    assert set(redis.keys) == {
+        f"indexes:reconciled:a64_test:{reg.fingerprint()}",
+        f"indexes:reconciled:a64_staging:{reg.fingerprint()}",
+    }
+
+
+@pytest.mark.asyncio
+async def test_startup_marker_is_verified_before_skipping(monkeypatch):
+    reg = IndexRegistry()
+    reg.declare("alerts", "alertId", unique=True)
+    redis = _FakeRedis()
+    _use_redis(monkeypatch, redis)
+    present = {
+        "alerts": {
+            "_id_": {"key": [("_id", 1)]},
+            "alertId_1": {"key": [("alertId", 1)], "unique": True},
+        }
+    }
+
+    await reconcile_indexes_on_startup(_db(present), reg)
+    healthy = _db(present)
+    skipped = await reconcile_indexes_on_startup(healthy, reg)
+
+    assert skipped.skipped_reason == "manifest already applied"
+    healthy.collections["alerts"].index_information.assert_awaited_once()
+    healthy.collections["alerts"].create_indexes.assert_not_awaited()
+
+    # Database dropped and restored without indexes, marker still in Redis.
+    restored = _db({})
+    report = await reconcile_indexes_on_startup(restored, reg)
+
+    assert report.skipped_reason is None
+    assert report.created == ["alerts.alertId_1"]
+    restored.collections["alerts"].create_indexes.assert_awaited_once()
+
+
+def test_cli_loads_every_declaring_module():
+    from src.core.indexes import index_registry
+    from src.core.indexes.__main__ import load_declarations
+
+    load_declarations()
+
+    declared = {
+        (spec.collection, spec.name)
+        for collection in index_registry.collections()
+        for spec in index_registry.specs(collection)
+    }
+    assert ("ai_assistant_message_buckets", "conversation_id_1_seq_1") in declared
+    assert ("weather_cache", "ttl_updatedAt") in declared
+    assert ("port_registry", "port_1") in declared
@@ -0,0 +1,386 @@
+"""
+Tests for the inventory valuation ledger (src/core/inventory).
+
+Covers the moving-average costing rule, ledger/balance posting (including
+pre-ledger balances adopted as an opening entry and concurrent writers
+racing for the same seq), bulk balance reads, as-of valuation, ledger
+replay with drift repair, the GR receipts fed to the ledger, and a 100k
+movement benchmark that counts round trips.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from src.core.inventory import (
+    Balance,
+    StockMovement,
+    apply_movement,
+    get_balances,
+    post_movements,
+    rebuild_balances,
+    valuation_as_of,
+)
+from src.core.inventory.valuation import BALANCES_COLLECTION, LEDGER_COLLECTION
+from src.modules.purchasing.services.document_service import DocumentService
+
+ORG = "org-1"
+
+
+def _key(doc):
+    return (doc["organizationId"], doc["itemId"], doc["warehouseId"])
+
+
+def _matches(doc, query):
+    for field, expected in query.items():
+        value = doc.get(field)
+        if isinstance(expected, dict):
+            if "$in" in expected and value not in expected["$in"]:
+                return False
+            if "$lte" in expected and not value <= expected["$lte"]:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, fields):
+        for field, direction in reversed(fields):
+            self._docs.sort(key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._docs:
+            yield doc
+
+
+class _Ledger:
+    """Ledger collection enforcing the (key, seq) unique index."""
+
+    def __init__(self):
+        self.entries = {}
+        self.round_trips = 0
+
+    async def insert_many(self, docs, ordered=True, session=None):
+        self.round_trips += 1
+        await asyncio.sleep(0)  # let concurrent posters interleave
+        for index, doc in enumerate(docs):
+            unique = (*_key(doc), doc["seq"])
+            if unique in self.entries:
+                raise BulkWriteError(
+                    {
+                        "writeErrors": [{"code": 11000, "index": index}],
+                        "nInserted": index,
+                    }
+                )
+            self.entries[unique] = dict(doc)
+
+    async def find_one(self, query, sort=None, session=None):
+        matching = [d for d in self.entries.values() if _matches(d, query)]
+        return dict(max(matching, key=lambda d: d["seq"])) if matching else None
+
+    def find(self, query):
+        return _Cursor([dict(d) for d in self.entries.values() if _matches(d, query)])
+
+    def aggregate(self, pipeline):
+        # The as-of pipeline: $match, then the latest entry per key
+        latest = {}
+        for doc in self.entries.values():
+            if _matches(doc, pipeline[0]["$match"]):
+                key = (doc["itemId"], doc["warehouseId"])
+                if key not in latest or doc["seq"] > latest[key]["seq"]:
+                    latest[key] = doc
+        return _Cursor([{"entry": latest[key]} for key in sorted(latest)])
+
+
+class _Balances:
+    """Balance collection enforcing the key unique index."""
+
+    def __init__(self):
+        self.docs = {}
+        self.round_trips = 0
+
+    def find(self, query, session=None):
+        self.round_trips += 1
+        return _Cursor([dict(d) for d in self.docs.values() if _matches(d, query)])
+
+    async def find_one(self, query, session=None):
+        doc = self.docs.get(_key(query))
+        return dict(doc) if doc else None
+
+    def _update(self, query, update, upsert):
+        key = _key(query)
+        doc = self.docs.get(key)
+        if doc is not None:
+            if not _matches(doc, query):
+                return None
+            doc.update(update["$set"])
+            return "matched"
+        if not upsert:
+            return None
+        self.docs[key] = dict(update["$set"])
+        return "upserted"
+
+    async def find_one_and_update(self, query, update, upsert=False, **kwargs):
+        await asyncio.sleep(0)
+        outcome = self._update(query, update, upsert)
+        if outcome is None and upsert and _key(query) in self.docs:
+            raise DuplicateKeyError("balance_key_unique")
+        return dict(self.docs[_key(query)]) if outcome else None
+
+    async def bulk_write(self, operations, ordered=False, session=None):
+        self.round_trips += 1
+        await asyncio.sleep(0)
+        outcomes = [self._update(op._filter, op._doc, op._upsert) for op in operations]
+        return SimpleNamespace(
+            matched_count=outcomes.count("matched"),
+            upserted_count=outcomes.count("upserted"),
+        )
+
+
+@pytest.fixture
+def db():
+    return {LEDGER_COLLECTION: _Ledger(), BALANCES_COLLECTION: _Balances()}
+
+
+def _receipt(item, qty, cost, wh="WH-1"):
+    return StockMovement(
+        ORG, item, wh, Decimal(qty), "goods_receipt", unit_cost=Decimal(cost)
+    )
+
+
+def _issue(item, qty, wh="WH-1"):
+    return StockMovement(ORG, item, wh, -Decimal(qty), "delivery")
+
+
+def _ledger_seqs(db, item, wh="WH-1"):
+    return sorted(
+        seq for (_, i, w, seq) in db[LEDGER_COLLECTION].entries if (i, w) == (item, wh)
+    )
+
+
+def test_apply_movement_moving_average():
+    b = Balance(ORG, "item", "WH-1")
+
+    b, cost, value = apply_movement(b, Decimal("10"), Decimal("5"))
+    assert (b.quantity, b.value, b.avg_cost, value) == (10, 50, 5, 50)
+    b, cost, value = apply_movement(b, Decimal("10"), Decimal("7"))
+    assert (b.quantity, b.value, b.avg_cost) == (20, 120, 6)
+
+    # Issues and cost-less receipts (returns) move at the average
+    b, cost, value = apply_movement(b, Decimal("-5"), None)
+    assert (cost, value, b.value, b.avg_cost) == (6, -30, 90, 6)
+    b, cost, value = apply_movement(b, Decimal("1"), None)
+    assert (cost, value, b.avg_cost) == (6, 6, 6)
+
+    # Emptying drops rounding residue; receiving into an oversold position
+    # takes the receipt's cost
+    b, _, _ = apply_movement(b, Decimal("-16"), None)
+    assert (b.quantity, b.value) == (0, 0)
+    b, _, _ = apply_movement(b, Decimal("-2"), None)
+    b, _, _ = apply_movement(b, Decimal("5"), Decimal("4"))
+    assert (b.quantity, b.value, b.avg_cost, b.seq) == (3, 12, 4, 7)
+
+
+@pytest.mark.asyncio
+async def test_post_movements_appends_ledger_and_advances_balances(db):
+    posted = await post_movements(
+        db,
+        [
+            _receipt("A", "10", "5"),
+            _receipt("B", "4", "2.5"),
+            _receipt("A", "10", "7"),
+            _issue("A", "5"),
+        ],
+    )
+
+    assert [(p.seq, p.unit_cost, p.value) for p in posted] == [
+        (1, 5, 50),
+        (1, Decimal("2.5"), 10),
+        (2, 7, 70),
+        (3, 6, -30),
+    ]
+    assert _ledger_seqs(db, "A") == [1, 2, 3]
+    balance = db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]
+    assert (balance["quantityOnHand"], balance["totalValue"], balance["seq"]) == (
+        15,
+        90,
+        3,
+    )
+    # One read, one ledger insert, one balance write for the whole batch
+    assert db[BALANCES_COLLECTION].round_trips == 2
+    assert db[LEDGER_COLLECTION].round_trips == 1
+
+    balances = await get_balances(
+        db, ORG, [("A", "WH-1"), ("B", "WH-1"), ("A", "WH-2")]
+    )
+    assert db[BALANCES_COLLECTION].round_trips == 3
+    assert set(balances) == {("A", "WH-1"), ("B", "WH-1")}
+    assert balances[("A", "WH-1")].avg_cost == 6
+
+    with pytest.raises(ValueError):
+        await post_movements(db, [_issue("A", "0")])
+
+
+@pytest.mark.asyncio
+async def test_pre_ledger_balance_is_adopted_as_opening(db):
+    db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")] = {
+        "organizationId": ORG,
+        "itemId": "A",
+        "warehouseId": "WH-1",
+        "avgCost": 12.5,
+        "quantityOnHand": 100,
+    }
+
+    [issue] = await post_movements(db, [_issue("A", "5")])
+
+    assert (issue.seq, issue.unit_cost, issue.value) == (2, Decimal("12.5"), -62.5)
+    opening = db[LEDGER_COLLECTION].entries[(ORG, "A", "WH-1", 1)]
+    assert opening["movementType"] == "opening"
+    assert (opening["quantityAfter"], opening["valueAfter"]) == (100, 1250)
+    assert db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]["seq"] == 2
+    report = await rebuild_balances(db, ORG, dry_run=True)
+    assert (report["mismatches"], report["gaps"], report["drifted"]) == ([], [], [])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_posters_replan_lost_seqs(db):
+    await asyncio.gather(
+        *(
+            post_movements(db, [_receipt("A", "1", str(cost)), _receipt("B", "1", "1")])
+            for cost in range(1, 6)
+        )
+    )
+
+    assert _ledger_seqs(db, "A") == [1, 2, 3, 4, 5]
+    balance = db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]
+    assert (balance["quantityOnHand"], balance["totalValue"], balance["seq"]) == (
+        5,
+        15,
+        5,
+    )
+    report = await rebuild_balances(db)
+    assert report["entries"] == 10
+    assert (report["mismatches"], report["gaps"], report["drifted"]) == ([], [], [])
+
+    # Inside a caller's transaction the conflict is raised, not retried
+    stale = db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]
+    stale["seq"] = 4
+    with pytest.raises(BulkWriteError):
+        await post_movements(db, [_issue("A", "1")], session=object())
+    assert _ledger_seqs(db, "A") == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_valuation_as_of(db):
+    await post_movements(db, [_receipt("A", "10", "5"), _receipt("B", "2", "3")])
+    cutoff = datetime.now(tz=timezone.utc)
+    for entry in db[LEDGER_COLLECTION].entries.values():
+        entry["postedAt"] = cutoff - timedelta(days=1)
+    await post_movements(db, [_issue("A", "4"), _issue("B", "2")])
+
+    before = await valuation_as_of(db, ORG, cutoff)
+    now = await valuation_as_of(db, ORG, cutoff + timedelta(days=1))
+
+    assert [(b.item_id, b.quantity, b.value) for b in before] == [
+        ("A", 10, 50),
+        ("B", 2, 6),
+    ]
+    # B is empty now and omitted
+    assert [(b.item_id, b.quantity, b.value) for b in now] == [("A", 6, 30)]
+    only_b = await valuation_as_of(db, ORG, cutoff, item_id="B")
+    assert [b.item_id for b in only_b] == ["B"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_reports_and_repairs_drift(db):
+    await post_movements(db, [_receipt("A", "10", "5"), _issue("A", "3")])
+    await post_movements(db, [_receipt("B", "1", "1")])
+    db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]["quantityOnHand"] = 9
+    db[LEDGER_COLLECTION].entries[(ORG, "B", "WH-1", 1)]["valueAfter"] = 2
+
+    dry = await rebuild_balances(db, ORG, dry_run=True)
+    assert dry["keys"] == 2 and dry["entries"] == 3
+    assert dry["mismatches"] == [{"key": [ORG, "B", "WH-1"], "seq": 1}]
+    assert [d["key"][1] for d in dry["drifted"]] == ["A", "B"]
+    assert dry["repaired"] == 0
+    assert db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]["quantityOnHand"] == 9
+
+    report = await rebuild_balances(db, ORG)
+    assert report["repaired"] == 2
+    assert db[BALANCES_COLLECTION].docs[(ORG, "A", "WH-1")]["quantityOnHand"] == 7
+    assert (await rebuild_balances(db, ORG))["drifted"] == []
+
+
+def test_gr_receipts_for_stocked_lines_only():
+    header = {"docId": "gr-1", "docNumber": "GR-2026-0001", "warehouseId": "WH-H"}
+    lines = [
+        {"lineId": "l1", "itemId": "A", "quantity": 4, "lineNet": 10.0},
+        {
+            "lineId": "l2",
+            "itemId": "B",
+            "quantity": 2,
+            "lineNet": 9.0,
+            "itemType": "consumable",
+            "warehouseId": "WH-L",
+        },
+        {"lineId": "l3", "itemId": "S", "quantity": 1, "itemType": "service"},
+    ]
+
+    movements = DocumentService._gr_stock_movements(ORG, header, lines, "user-1")
+
+    assert [(m.item_id, m.warehouse_id, m.unit_cost) for m in movements] == [
+        ("A", "WH-H", Decimal("2.5")),
+        ("B", "WH-L", Decimal("4.5")),
+    ]
+    assert movements[0].source_doc_number == "GR-2026-0001"
+    # No warehouse anywhere: not valued
+    assert (
+        DocumentService._gr_stock_movements(ORG, {"docId": "g"}, lines[:1], "u") == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_benchmark_100k_movements(db):
+    items, batch_size, batches = 500, 1000, 100
+    started = time.perf_counter()
+    for batch in range(batches):
+        movements = [
+            (
+                _receipt(f"item-{i % items}", "10", str(1 + (i % 7)))
+                if (i // items) % 2 == 0
+                else _issue(f"item-{i % items}", "4")
+            )
+            for i in range(batch * batch_size, (batch + 1) * batch_size)
+        ]
+        await post_movements(db, movements)
+    elapsed = time.perf_counter() - started
+
+    assert len(db[LEDGER_COLLECTION].entries) == batches * batch_size
+    # Three round trips per batch regardless of its size
+    round_trips = (
+        db[LEDGER_COLLECTION].round_trips + db[BALANCES_COLLECTION].round_trips
+    )
+    assert round_trips == 3 * batches
+    print(
+        f"\n100k movements: {elapsed:.2f}s "
+        f"({batches * batch_size / elapsed:,.0f}/s, {round_trips} round trips)"
+    )
+    report = await rebuild_balances(db, dry_run=True)
+    assert report["keys"] == items and report["entries"] == batches * batch_size
+    assert (report["mismatches"], report["gaps"], report["drifted"]) == ([], [], [])
@@ -0,0 +1,431 @@
+"""
+Tests for the leader-elected background job runner (src/core/jobs).
+
+Covers cron evaluation, lease election, missed-run catch-up, per-job
+concurrency limits, coalescing of queued runs, run-lease fencing and run
+recording.  Motor collections are faked with AsyncMock (or, where run state
+matters, a small in-memory ``job_runs``); no MongoDB is needed.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from src.core.jobs import CronSchedule, JobDefinition, JobRunner
+from src.core.jobs.runner import (
+    LEASE_COLLECTION,
+    RUN_ABANDONED,
+    RUN_FAILED,
+    RUN_QUEUED,
+    RUN_RUNNING,
+    RUN_SUCCEEDED,
+    RUNS_COLLECTION,
+    SCHEDULES_COLLECTION,
+)
+
+
+def _db():
+    """Fake Motor db returning one AsyncMock-backed collection per name."""
+    collections = {}
+
+    def _get(name):
+        if name not in collections:
+            coll = MagicMock()
+            coll.find_one = AsyncMock(return_value=None)
+            coll.find_one_and_update = AsyncMock(return_value=None)
+            coll.update_one = AsyncMock()
+            coll.update_many = AsyncMock()
+            coll.insert_one = AsyncMock()
+            collections[name] = coll
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=_get)
+    return db
+
+
+def _runner(db, *jobs):
+    runner = JobRunner()
+    runner._db = db
+    for job in jobs:
+        runner.register(job)
+    return runner
+
+
+async def _noop():
+    return {"ok": True}
+
+
+def test_cron_next_after():
+    daily = CronSchedule.parse("0 23 * * *")
+    assert daily.next_after(datetime(2026, 10, 18, 23, 0)) == datetime(
+        2026, 10, 19, 23, 0
+    )
+    leap = CronSchedule.parse("0 0 29 2 *")
+    assert leap.next_after(datetime(2026, 10, 18)) == datetime(2028, 2, 29)
+    # Sunday only (7 == 0); 2026-10-18 is a Sunday.
+    sunday = CronSchedule.parse("*/30 9 * * 7")
+    assert sunday.next_after(datetime(2026, 10, 18, 9, 10)) == datetime(
+        2026, 10, 18, 9, 30
+    )
+    with pytest.raises(ValueError):
+        CronSchedule.parse("61 * * * *")
+
+
+def test_job_needs_exactly_one_schedule():
+    with pytest.raises(ValueError):
+        JobDefinition(name="x", func=_noop)
+    with pytest.raises(ValueError):
+        JobDefinition(name="x", func=_noop, interval_seconds=60, cron="* * * * *")
+
+
+@pytest.mark.asyncio
+async def test_lease_held_elsewhere_means_follower():
+    db = _db()
+    db[LEASE_COLLECTION].find_one_and_update = AsyncMock(
+        side_effect=DuplicateKeyError("E11000")
+    )
+    runner = _runner(db, JobDefinition(name="j", func=_noop, interval_seconds=60))
+
+    await runner.tick()
+
+    assert runner.is_leader is False
+    db[SCHEDULES_COLLECTION].find_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_first_sight_schedules_after_startup_delay_without_running():
+    db = _db()
+    job = JobDefinition(
+        name="j", func=_noop, interval_seconds=60, startup_delay_seconds=30
+    )
+    runner = _runner(db, job)
+    now = datetime(2026, 10, 18, 12, 0)
+
+    await runner._enqueue_if_due(job, now)
+
+    db[RUNS_COLLECTION].insert_one.assert_not_awaited()
+    update = db[SCHEDULES_COLLECTION].update_one.await_args.args[1]
+    assert update["$set"]["nextRunAt"] == now + timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_missed_run_is_caught_up_once():
+    db = _db()
+    now = datetime(2026, 10, 18, 12, 0)
+    db[SCHEDULES_COLLECTION].find_one = AsyncMock(
+        return_value={"_id": "j", "nextRunAt": now - timedelta(hours=5)}
+    )
+    job = JobDefinition(name="j", func=_noop, interval_seconds=3600)
+    runner = _runner(db, job)
+
+    await runner._enqueue_if_due(job, now)
+
+    db[RUNS_COLLECTION].insert_one.assert_awaited_once()
+    run = db[RUNS_COLLECTION].insert_one.await_args.args[0]
+    assert run["status"] == RUN_QUEUED and run["trigger"] == "catch-up"
+    # Next slot is computed from now, not by replaying the five missed hours.
+    update = db[SCHEDULES_COLLECTION].update_one.await_args.args[1]
+    assert update["$set"]["nextRunAt"] == now + timedelta(hours=1)
+
+
+@pytest.mark.asyncio
+async def test_missed_run_skipped_without_catch_up():
+    db = _db()
+    now = datetime(2026, 10, 19, 1, 0)
+    db[SCHEDULES_COLLECTION].find_one = AsyncMock(
+        return_value={"_id": "j", "nextRunAt": datetime(2026, 10, 18, 23, 0)}
+    )
+    job = JobDefinition(name="j", func=_noop, cron="0 23 * * *", catch_up=False)
+    runner = _runner(db, job)
+
+    await runner._enqueue_if_due(job, now)
+
+    db[RUNS_COLLECTION].insert_one.assert_not_awaited()
+    update = db[SCHEDULES_COLLECTION].update_one.await_args.args[1]
+    assert update["$set"]["nextRunAt"] == datetime(2026, 10, 19, 23, 0)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_respects_max_concurrency():
+    db = _db()
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+
+    job = JobDefinition(name="j", func=slow, interval_seconds=60, max_concurrency=1)
+    runner = _runner(db, job)
+    scheduled = datetime(2026, 10, 18, 12, 0)
+    queued = [
+        {"runId": "r1", "job": "j", "scheduledFor": scheduled},
+        {"runId": "r2", "job": "j", "scheduledFor": scheduled},
+    ]
+    cursor = MagicMock()
+    cursor.sort.return_value.to_list = AsyncMock(return_value=queued)
+    db[RUNS_COLLECTION].find = MagicMock(return_value=cursor)
+    db[RUNS_COLLECTION].find_one_and_update = AsyncMock(
+        side_effect=lambda f, u, **kw: {
+            "runId": f["runId"],
+            "job": "j",
+            "scheduledFor": scheduled,
+            "startedAt": scheduled,
+        }
+    )
+
+    await runner._dispatch_queued()
+
+    assert db[RUNS_COLLECTION].find_one_and_update.await_count == 1
+    assert list(runner._in_flight["j"]) == ["r1"]
+    release.set()
+    await asyncio.gather(*runner._in_flight["j"].values())
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_recorded():
+    db = _db()
+
+    async def boom():
+        raise RuntimeError("sensehub down")
+
+    job = JobDefinition(name="j", func=boom, interval_seconds=60)
+    runner = _runner(db, job)
+    scheduled = datetime(2026, 10, 18, 12, 0)
+
+    await runner._execute(
+        job,
+        {
+            "runId": "r1",
+            "scheduledFor": scheduled,
+            "startedAt": scheduled + timedelta(seconds=2),
+        },
+    )
+
+    run_update = db[RUNS_COLLECTION].update_one.await_args.args[1]["$set"]
+    assert run_update["status"] == RUN_FAILED
+    assert run_update["error"] == "sensehub down"
+    assert run_update["lagMs"] == 2000.0
+    state = db[SCHEDULES_COLLECTION].update_one.await_args.args[1]["$set"]
+    assert state["lastStatus"] == RUN_FAILED
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unknown_job_raises():
+    runner = _runner(_db())
+    with pytest.raises(KeyError):
+        await runner.enqueue("nope")
+
+
+# ---------------------------------------------------------------------------
+# Stateful job_runs fake (coalescing / fencing)
+# ---------------------------------------------------------------------------
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value = doc.get(key)
+        if not isinstance(cond, dict):
+            if value != cond:
+                return False
+            continue
+        for op, arg in cond.items():
+            if op == "$exists" and (key in doc) != arg:
+                return False
+            if op == "$ne" and value == arg:
+                return False
+            if op == "$in" and value not in arg:
+                return False
+            if op == "$lt" and (value is None or not value < arg):
+                return False
+    return True
+
+
+class _Runs:
+    """In-memory ``job_runs`` supporting the calls the runner makes."""
+
+    def __init__(self):
+        self.docs = []
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+    def find(self, query):
+        found = [dict(d) for d in self.docs if _matches(d, query)]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=found)
+        cursor.sort.return_value.to_list = AsyncMock(
+            return_value=sorted(found, key=lambda d: d["scheduledFor"])
+        )
+        return cursor
+
+    def _apply(self, doc, update):
+        doc.update(update.get("$set", {}))
+        for key, by in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + by
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self._apply(doc, update)
+                return dict(doc)
+        return None
+
+    async def update_one(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self._apply(doc, update)
+                return MagicMock(modified_count=1)
+        return MagicMock(modified_count=0)
+
+    async def update_many(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self._apply(doc, update)
+
+
+def _stateful_db(next_run_at=None):
+    db = _db()
+    runs = _Runs()
+    state = {"_id": "j", "nextRunAt": next_run_at}
+
+    async def _set_state(query, update, **kwargs):
+        state.update(update.get("$set", {}))
+
+    db[SCHEDULES_COLLECTION].find_one = AsyncMock(return_value=state)
+    db[SCHEDULES_COLLECTION].update_one = AsyncMock(side_effect=_set_state)
+    collections = {RUNS_COLLECTION: runs}
+    original = db.__getitem__.side_effect
+    db.__getitem__ = MagicMock(
+        side_effect=lambda name: collections.get(name) or original(name)
+    )
+    return db, runs, state
+
+
+@pytest.mark.asyncio
+async def test_slow_job_spanning_intervals_coalesces_queued_runs():
+    release = asyncio.Event()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await release.wait()
+
+    start = datetime(2026, 10, 18, 12, 0)
+    db, runs, state = _stateful_db(next_run_at=start)
+    job = JobDefinition(name="j", func=slow, interval_seconds=60)
+    runner = _runner(db, job)
+
+    # The first run starts, then four more intervals pass while it runs.
+    for minute in range(5):
+        await runner._enqueue_if_due(job, start + timedelta(minutes=minute))
+        await runner._dispatch_queued()
+        await asyncio.sleep(0)
+
+    assert [d["status"] for d in runs.docs] == [RUN_RUNNING, RUN_QUEUED]
+    assert runs.docs[1]["coalesced"] == 3
+    assert len(calls) == 1
+
+    release.set()
+    await asyncio.gather(*runner._in_flight["j"].values())
+    await runner._dispatch_queued()
+    await asyncio.gather(*runner._in_flight["j"].values())
+    assert [d["status"] for d in runs.docs] == [RUN_SUCCEEDED, RUN_SUCCEEDED]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_recovery_only_takes_runs_whose_lease_lapsed():
+    db, runs, _ = _stateful_db()
+    now = datetime(2026, 10, 18, 12, 0)
+    base = {"job": "j", "status": RUN_RUNNING, "scheduledFor": now}
+    runs.docs = [
+        {
+            **base,
+            "runId": "live",
+            "workerId": "old",
+            "leaseExpiresAt": now + timedelta(seconds=30),
+        },
+        {
+            **base,
+            "runId": "lapsed",
+            "workerId": "old",
+            "leaseExpiresAt": now - timedelta(seconds=1),
+        },
+    ]
+    runner = _runner(db, JobDefinition(name="j", func=_noop, interval_seconds=60))
+
+    await runner._recover_abandoned_runs(now)
+
+    by_id = {d["runId"]: d for d in runs.docs}
+    assert by_id["live"]["status"] == RUN_RUNNING
+    assert by_id["lapsed"]["status"] == RUN_ABANDONED
+    replacement = [d for d in runs.docs if d.get("trigger") == "recovery"]
+    assert len(replacement) == 1 and replacement[0]["status"] == RUN_QUEUED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failure", ["lost", "unreachable"])
+async def test_deposed_leader_cancels_in_flight_runs(failure, monkeypatch):
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.Event().wait()
+
+    db, runs, _ = _stateful_db()
+    now = datetime.utcnow()
+    runs.docs = [{"runId": "r1", "job": "j", "status": RUN_QUEUED, "scheduledFor": now}]
+    runner = _runner(db, JobDefinition(name="j", func=slow, interval_seconds=3600))
+    runner._is_leader = True
+    await runner._dispatch_queued()
+    await started.wait()
+
+    if failure == "lost":
+        db[LEASE_COLLECTION].find_one_and_update = AsyncMock(
+            side_effect=DuplicateKeyError("E11000")
+        )
+    else:
+        db[LEASE_COLLECTION].find_one_and_update = AsyncMock(
+            side_effect=ConnectionError("mongo unreachable")
+        )
+        # The last successful renewal is older than the leader lease.
+        runner._lease_renewed_at = -1e9
+
+    await runner.tick()
+
+    assert runner.is_leader is False
+    assert runner._in_flight["j"] == {}
+    assert runs.docs[0]["status"] == RUN_ABANDONED
+    assert runs.docs[0]["error"] == "cancelled (leadership lost)"
+
+
+@pytest.mark.asyncio
+async def test_result_of_a_taken_over_run_is_discarded():
+    db, runs, state = _stateful_db()
+    now = datetime(2026, 10, 18, 12, 0)
+    runner = _runner(db, JobDefinition(name="j", func=_noop, interval_seconds=60))
+    # Our lease lapsed and another leader already recovered the run.
+    runs.docs = [
+        {
+            "runId": "r1",
+            "job": "j",
+            "status": RUN_ABANDONED,
+            "workerId": runner.worker_id,
+            "scheduledFor": now,
+        }
+    ]
+
+    await runner._execute(
+        JobDefinition(name="j", func=_noop, interval_seconds=60),
+        {"runId": "r1", "scheduledFor": now, "startedAt": now},
+    )
+
+    assert runs.docs[0]["status"] == RUN_ABANDONED
+    assert "lastStatus" not in state
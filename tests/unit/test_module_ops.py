@@ -0,0 +1,453 @@
+"""
+Tests for off-loop module operations (src/services/module_ops.py) and
+ModuleManager's background installs.
+
+Runs against FakeDockerClient — an in-memory daemon with images, managed
+containers and a container event stream — so no Docker socket is needed.
+Every fake daemon call records the thread it ran on, which lets the tests
+assert that nothing touches the daemon from the event loop.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from docker.errors import ImageNotFound, NotFound
+from pymongo.errors import DuplicateKeyError
+
+# services before middleware: src.middleware.auth <-> services import cycle
+from src.services.database import mongodb  # noqa: F401
+from src.models.module import ModuleConfig
+from src.services import module_manager as manager_module
+from src.services import module_ops as ops_module
+from src.services.module_ops import (
+    ContainerStateCache,
+    ModuleOpsExecutor,
+    ModuleOpTimeout,
+)
+
+# =============================================================================
+# Fake Docker daemon
+# =============================================================================
+
+
+class _EventStream:
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self.events.put(None)
+
+
+class FakeContainer:
+    def __init__(self, daemon, name, labels):
+        self.daemon = daemon
+        self.id = uuid4().hex
+        self.name = name
+        self.attrs = {
+            "Config": {"Labels": labels},
+            "RestartCount": 0,
+            "State": {
+                "Status": "running",
+                "StartedAt": datetime.utcnow().isoformat() + "123Z",
+                "FinishedAt": "0001-01-01T00:00:00Z",
+                "ExitCode": 0,
+            },
+        }
+
+    def stop(self, timeout=None):
+        self.daemon._record("stop")
+        self.attrs["State"].update(Status="exited", ExitCode=137)
+        self.daemon.emit(self, "die")
+
+    def remove(self, force=False):
+        self.daemon._record("remove")
+        del self.daemon.containers_by_id[self.id]
+        self.daemon.emit(self, "destroy")
+
+    def stats(self, stream=True):
+        self.daemon._record("stats")
+        return {
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": 300, "percpu_usage": [1, 1]},
+                "system_cpu_usage": 2000,
+            },
+            "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 0},
+            "memory_stats": {"usage": 64 * 1024 * 1024, "limit": 512 * 1024 * 1024},
+            "networks": {"eth0": {"rx_bytes": 10, "tx_bytes": 20}},
+        }
+
+
+class FakeDockerClient:
+    """In-memory stand-in for docker.DockerClient."""
+
+    def __init__(self, local_images=()):
+        self.local_images = set(local_images)
+        self.containers_by_id = {}
+        self.streams = []
+        self.loop_calls = []
+        self.release_pull = threading.Event()
+        self.release_pull.set()
+        self.images = SimpleNamespace(get=self._get_image, pull=self._pull_image)
+        self.containers = SimpleNamespace(
+            get=self._get_container, list=self._list, run=self._run
+        )
+
+    def _record(self, call):
+        if threading.current_thread() is threading.main_thread():
+            self.loop_calls.append(call)
+
+    def ping(self):
+        self._record("ping")
+        return True
+
+    def events(self, decode=False, filters=None):
+        self._record("events")
+        stream = _EventStream()
+        self.streams.append(stream)
+        return stream
+
+    def emit(self, container, action):
+        if container.attrs["Config"]["Labels"].get("a64core.managed") != "true":
+            return
+        for stream in self.streams:
+            stream.events.put(
+                {"Type": "container", "Action": action, "id": container.id}
+            )
+
+    def drop_streams(self):
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
+
+    def _get_image(self, name):
+        self._record("images.get")
+        if name not in self.local_images:
+            raise ImageNotFound(name)
+        return SimpleNamespace(id="sha256:" + "0" * 64, labels={})
+
+    def _pull_image(self, name):
+        self._record("images.pull")
+        self.release_pull.wait(5)
+        return self._get_image(name)
+
+    def _get_container(self, container_id):
+        self._record("containers.get")
+        for container in self.containers_by_id.values():
+            if container_id in (container.id, container.name):
+                return container
+        raise NotFound(container_id)
+
+    def _list(self, all=False, filters=None):
+        self._record("containers.list")
+        return [
+            c
+            for c in self.containers_by_id.values()
+            if c.attrs["Config"]["Labels"].get("a64core.managed") == "true"
+        ]
+
+    def _run(self, name, labels=None, **config):
+        self._record("containers.run")
+        return self.add(name, labels or {})
+
+    def add(self, name, labels):
+        container = FakeContainer(self, name, labels)
+        self.containers_by_id[container.id] = container
+        self.emit(container, "create")
+        self.emit(container, "start")
+        return container
+
+
+# =============================================================================
+# Fake MongoDB
+# =============================================================================
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        value = doc.get(key)
+        if isinstance(cond, dict) and "$lt" in cond:
+            if value is None or value >= cond["$lt"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def skip(self, n):
+        return _Cursor(self.docs[n:])
+
+    def limit(self, n):
+        return _Cursor(self.docs[:n])
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self.docs]
+
+
+class _Collection:
+    def __init__(self, name):
+        self.name = name
+        self.docs = []
+
+    async def find_one(self, query):
+        found = [d for d in self.docs if _matches(d, query)]
+        return dict(found[0]) if found else None
+
+    def find(self, query):
+        return _Cursor([d for d in self.docs if _matches(d, query)])
+
+    async def count_documents(self, query):
+        return len([d for d in self.docs if _matches(d, query)])
+
+    async def insert_one(self, doc):
+        # module_jobs: unique module_name among active jobs
+        if doc.get("active") and any(
+            d.get("active") and d["module_name"] == doc["module_name"]
+            for d in self.docs
+        ):
+            raise DuplicateKeyError("E11000 duplicate key")
+        self.docs.append(dict(doc))
+
+    async def update_one(self, query, update):
+        return await self._update(query, update, many=False)
+
+    async def update_many(self, query, update):
+        return await self._update(query, update, many=True)
+
+    async def _update(self, query, update, many):
+        found = [d for d in self.docs if _matches(d, query)]
+        for doc in found if many else found[:1]:
+            doc.update(update.get("$set", {}))
+            for field, delta in update.get("$inc", {}).items():
+                doc[field] = doc.get(field, 0) + delta
+            for field in update.get("$unset", {}):
+                doc.pop(field, None)
+        return SimpleNamespace(matched_count=len(found))
+
+    async def delete_one(self, query):
+        found = [d for d in self.docs if _matches(d, query)]
+        if found:
+            self.docs.remove(found[0])
+
+
+class _Db:
+    def __init__(self):
+        self.collections = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.collections.setdefault(name, _Collection(name))
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+async def _until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(ops_module.settings, "MODULE_OPS_WORKERS", 2)
+    pool = ModuleOpsExecutor()
+    yield pool
+    pool.shutdown(wait=False)
+
+
+@pytest.fixture
+def cache():
+    states = ContainerStateCache()
+    yield states
+    states.stop()
+
+
+@pytest.fixture
+def docker_client():
+    return FakeDockerClient(local_images={"docker.io/acme/crm:1.0.0"})
+
+
+@pytest.fixture
+def manager(monkeypatch, executor, cache, docker_client):
+    monkeypatch.setattr(manager_module, "module_ops", executor)
+    monkeypatch.setattr(manager_module, "container_states", cache)
+    monkeypatch.setattr(manager_module, "encrypt_license_key", lambda key: "enc")
+
+    async def valid(license_key, module_name, version):
+        return {"valid": True}
+
+    svc = manager_module.ModuleManager()
+    svc._db = _Db()
+    svc.docker_client = docker_client
+    svc._docker_initialized = True
+    svc.license_validator = SimpleNamespace(validate_license=valid)
+    return svc
+
+
+def _config(name="crm", image="docker.io/acme/crm:1.0.0"):
+    return ModuleConfig(
+        module_name=name,
+        display_name="CRM Module",
+        docker_image=image,
+        version="1.0.0",
+        license_key="LIC-1234-5678",
+    )
+
+
+# =============================================================================
+# Executor
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_run_times_out_without_blocking_the_loop(executor):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    try:
+        with pytest.raises(ModuleOpTimeout, match="timed out after 0.1s"):
+            await executor.run(time.sleep, 0.5, timeout=0.1)
+        assert await executor.run(sum, [1, 2]) == 3
+    finally:
+        task.cancel()
+
+    assert ticks >= 5
+    assert executor.stats() == {"workers": 2, "inFlight": 0, "timedOut": 1}
+
+
+# =============================================================================
+# Container state cache
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_cache_follows_docker_events_and_reconnects(cache, docker_client):
+    managed = {"a64core.managed": "true", "a64core.module": "crm"}
+    existing = docker_client.add("a64core-crm", managed)
+    other = docker_client.add("postgres", {})
+
+    cache.start(lambda: docker_client)
+    await _until(lambda: cache.synced)
+
+    state = cache.get(existing.id)
+    assert state["module_name"] == "crm"
+    assert state["container_state"] == "running"
+    assert state["finished_at"] is None
+    assert cache.get(other.id) is None
+
+    existing.stop()
+    await _until(lambda: cache.get(existing.id)["container_state"] == "exited")
+    assert cache.get(existing.id)["exit_code"] == 137
+
+    existing.remove()
+    await _until(lambda: cache.get(existing.id) is None)
+
+    # While disconnected events are lost; the reconnect re-primes the cache
+    docker_client.drop_streams()
+    await _until(lambda: not cache.synced)
+    missed = FakeContainer(docker_client, "a64core-erp", managed)
+    docker_client.containers_by_id[missed.id] = missed
+    await _until(lambda: cache.synced)
+    assert cache.get(missed.id)["container_name"] == "a64core-erp"
+
+
+# =============================================================================
+# Background installs
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_install_job_progress_and_status_from_cache(manager, docker_client):
+    docker_client.release_pull.clear()
+    manager.start_container_watch(lambda: docker_client)
+
+    job = await manager.start_install(_config(), "user-1", "admin@example.com")
+
+    jobs = manager.db.module_jobs
+    await _until(lambda: jobs.docs[0].get("step") == "pulling_image")
+    assert jobs.docs[0]["status"] == "running"
+    assert jobs.docs[0]["progress"] == 20
+    with pytest.raises(ValueError, match="already being installed"):
+        await manager.start_install(_config(), "user-1", "admin@example.com")
+
+    docker_client.release_pull.set()
+    await _until(lambda: jobs.docs[0]["status"] == "succeeded")
+    done = await manager.get_job(job.job_id)
+    assert (done.step, done.progress, done.error) == ("completed", 100, None)
+    assert "active" not in jobs.docs[0]
+
+    status = await manager.get_module_status("crm")
+    assert status.status == "running"
+    assert status.container_state == "running"
+    assert status.container_id == done.result["container_id"]
+    assert status.uptime_seconds is not None
+
+    # Usage is sampled in the background and served from then on
+    await _until(lambda: manager._sampling == set())
+    status = await manager.get_module_status("crm")
+    assert (status.cpu_usage_percent, status.memory_usage_mb) == (20.0, 64.0)
+    assert status.network_tx_bytes == 20
+
+    # A container stopped outside the platform shows up through the events
+    await asyncio.to_thread(docker_client.containers_by_id[status.container_id].stop)
+    await _until(
+        lambda: manager_module.container_states.get(status.container_id)[
+            "container_state"
+        ]
+        == "exited"
+    )
+    listed = await manager.get_installed_modules()
+    assert listed["data"][0]["status"] == "stopped"
+    assert listed["data"][0]["container_state"] == "exited"
+
+    assert docker_client.loop_calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_install_job_records_error_and_frees_module(
+    manager, docker_client
+):
+    docker_client.local_images.clear()
+
+    job = await manager.start_install(_config(), "user-1", "admin@example.com")
+
+    await _until(lambda: manager.db.module_jobs.docs[0]["status"] == "failed")
+    failed = await manager.get_job(job.job_id)
+    assert "Docker image not found" in failed.error
+    assert failed.finished_at is not None
+    audit = manager.db.module_audit_log.docs
+    assert [(a["operation"], a["status"]) for a in audit] == [("install", "failure")]
+
+    # The failed job no longer blocks a retry
+    docker_client.local_images.add("docker.io/acme/crm:1.0.0")
+    retry = await manager.start_install(_config(), "user-1", "admin@example.com")
+    await _until(lambda: manager.db.module_jobs.docs[1]["status"] == "succeeded")
+    assert retry.job_id != job.job_id
+    assert docker_client.loop_calls == []
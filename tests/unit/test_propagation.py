@@ -0,0 +1,349 @@
+"""
+Tests for denormalized-field propagation (src/core/propagation).
+
+A small in-memory stand-in for the Motor collections involved covers the
+engine end to end: enqueue coalescing, batched application, resumption after
+a failed pass, supersession by a newer rename, the status/lag report, and
+the customer rename path no longer touching sales orders in the request.
+"""
+
+import copy
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from src.core.propagation import (
+    DenormalizedField,
+    PropagationTarget,
+    enqueue_propagation,
+    propagation_status,
+    register_denormalized_field,
+    run_propagation_pass,
+)
+from src.core.propagation import engine
+from src.modules.crm.models.customer import CustomerUpdate
+from src.modules.crm.services.customer import customer_service as customer_module
+from src.modules.crm.services.customer.customer_service import CustomerService
+
+
+def _cmp(value, cond):
+    if isinstance(cond, dict):
+        for op, arg in cond.items():
+            if op == "$ne" and value == arg:
+                return False
+            if op == "$in" and value not in arg:
+                return False
+            if op == "$lt" and not (value is not None and value < arg):
+                return False
+            if op == "$lte" and not (value is not None and value <= arg):
+                return False
+        return True
+    return value == cond
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif not _cmp(doc.get(key), cond):
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, field, direction=1):
+        self._docs.sort(key=lambda d: d.get(field), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self._docs = self._docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self._docs]
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.docs = []
+        self.finds = 0
+        self.before_update_many = None
+
+    def find(self, query=None, projection=None):
+        self.finds += 1
+        return _Cursor([d for d in self.docs if _matches(d, query or {})])
+
+    async def find_one(self, query, projection=None):
+        return next((dict(d) for d in self.docs if _matches(d, query)), None)
+
+    async def insert_one(self, doc):
+        self.docs.append({"_id": uuid4().hex, **doc})
+
+    @staticmethod
+    def _apply(doc, update):
+        for path, value in update.get("$set", {}).items():
+            *parents, leaf = path.split(".")
+            target = doc
+            for part in parents:
+                target = target.setdefault(part, {})
+            target[leaf] = value
+        for k, v in update.get("$inc", {}).items():
+            doc[k] = doc.get(k, 0) + v
+
+    async def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self._apply(doc, update)
+                return SimpleNamespace(matched_count=1, modified_count=1)
+        if upsert:
+            doc = dict(query)
+            self._apply(doc, update)
+            self.docs.append(doc)
+        return SimpleNamespace(matched_count=0, modified_count=0)
+
+    async def update_many(self, query, update):
+        if self.before_update_many:
+            await self.before_update_many()
+        hits = [d for d in self.docs if _matches(d, query)]
+        for doc in hits:
+            self._apply(doc, update)
+        return SimpleNamespace(matched_count=len(hits), modified_count=len(hits))
+
+    async def find_one_and_update(self, query, update, sort=None, **kwargs):
+        docs = [d for d in self.docs if _matches(d, query)]
+        for field, direction in reversed(sort or []):
+            docs.sort(key=lambda d: d.get(field), reverse=direction < 0)
+        if not docs:
+            return None
+        self._apply(docs[0], update)
+        return copy.deepcopy(docs[0])
+
+
+class _FakeDB:
+    def __init__(self):
+        self._collections = {}
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(name, _FakeCollection())
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+WIDGET_NAME = register_denormalized_field(
+    DenormalizedField(
+        name="test_widget.name",
+        source_collection="widgets",
+        source_id_field="widgetId",
+        targets=(
+            PropagationTarget(
+                "widget_orders",
+                match_field="widgetId",
+                paths={"widgetName": "name"},
+                stamp_updated_at=True,
+            ),
+            PropagationTarget(
+                "widget_archive", match_field="widgetId", paths={"widgetName": "name"}
+            ),
+        ),
+    )
+)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(engine.settings, "PROPAGATION_BATCH_SIZE", 500)
+    monkeypatch.setattr(engine.settings, "PROPAGATION_BATCH_PAUSE_MS", 0)
+    return _FakeDB()
+
+
+async def _seed(db, orders=0, archived=0, name="Old"):
+    widget_id = str(uuid4())
+    await db.widgets.insert_one({"widgetId": widget_id, "name": name})
+    for _ in range(orders):
+        await db.widget_orders.insert_one({"widgetId": widget_id, "widgetName": name})
+    for _ in range(archived):
+        await db.widget_archive.insert_one({"widgetId": widget_id, "widgetName": name})
+    return widget_id
+
+
+async def _rename(db, widget_id, name):
+    await db.widgets.update_one({"widgetId": widget_id}, {"$set": {"name": name}})
+    await enqueue_propagation(db, WIDGET_NAME.name, widget_id)
+
+
+def _names(db, collection, widget_id):
+    return {d["widgetName"] for d in db[collection].docs if d["widgetId"] == widget_id}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_coalesces_repeated_renames(db):
+    widget_id = await _seed(db)
+    await _rename(db, widget_id, "New")
+    await _rename(db, widget_id, "Newer")
+
+    (job,) = db[engine.COLLECTION].docs
+    assert job["_id"] == f"{WIDGET_NAME.name}:{widget_id}"
+    assert job["generation"] == 2 and job["status"] == "pending"
+
+    with pytest.raises(ValueError):
+        await enqueue_propagation(db, "no.such.field", widget_id)
+
+
+@pytest.mark.asyncio
+async def test_pass_applies_in_batches_and_leaves_other_sources_alone(db):
+    widget_id = await _seed(db, orders=1200, archived=3)
+    other_id = await _seed(db, orders=5)
+    await _rename(db, widget_id, "Renamed")
+
+    summary = await run_propagation_pass(db)
+
+    assert summary["applied"] == 1
+    assert summary["modified"] == {"widget_orders": 1200, "widget_archive": 3}
+    assert _names(db, "widget_orders", widget_id) == {"Renamed"}
+    assert _names(db, "widget_archive", widget_id) == {"Renamed"}
+    assert _names(db, "widget_orders", other_id) == {"Old"}
+    # 500 + 500 + 200: the short batch ends the target without another probe
+    assert db.widget_orders.finds == 3
+    assert all(
+        "updatedAt" in d for d in db.widget_orders.docs if d["widgetId"] == widget_id
+    )
+    assert not any("updatedAt" in d for d in db.widget_archive.docs)
+
+    (job,) = db[engine.COLLECTION].docs
+    assert job["status"] == "done" and job["finishedAt"] is not None
+    assert (await run_propagation_pass(db))["applied"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_pass_resumes_where_it_stopped(db):
+    widget_id = await _seed(db, orders=1200)
+    await _rename(db, widget_id, "Renamed")
+
+    calls = {"n": 0}
+
+    async def fail_second_batch():
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("connection reset")
+
+    db.widget_orders.before_update_many = fail_second_batch
+    summary = await run_propagation_pass(db)
+
+    assert summary["failed"] == 1
+    (job,) = db[engine.COLLECTION].docs
+    assert job["status"] == "pending" and job["lastError"] == "connection reset"
+    assert job["progress"] == {"widget_orders": 500}
+    assert (
+        len([n for n in db.widget_orders.docs if n["widgetName"] == "Renamed"]) == 500
+    )
+
+    # Not retried before its delay has passed
+    db.widget_orders.before_update_many = None
+    assert (await run_propagation_pass(db))["applied"] == 0
+    job = db[engine.COLLECTION].docs[0]
+    assert job["retryAt"] > datetime.utcnow()
+    job["retryAt"] = datetime.utcnow()
+
+    summary = await run_propagation_pass(db)
+    assert summary["modified"] == {"widget_orders": 700}
+    assert _names(db, "widget_orders", widget_id) == {"Renamed"}
+    assert db[engine.COLLECTION].docs[0]["progress"] == {"widget_orders": 1200}
+
+
+@pytest.mark.asyncio
+async def test_repeated_failures_park_the_job(db, monkeypatch):
+    monkeypatch.setattr(engine, "MAX_ATTEMPTS", 2)
+    widget_id = await _seed(db, orders=1)
+    await _rename(db, widget_id, "Renamed")
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    db.widget_orders.before_update_many = fail
+    await run_propagation_pass(db)
+    db[engine.COLLECTION].docs[0]["retryAt"] = datetime.utcnow()
+    await run_propagation_pass(db)
+
+    (job,) = db[engine.COLLECTION].docs
+    assert job["status"] == "failed" and job["attempts"] == 2
+    assert (await run_propagation_pass(db))["failed"] == 0
+
+    # A new rename revives it
+    db.widget_orders.before_update_many = None
+    await _rename(db, widget_id, "Renamed again")
+    assert (await run_propagation_pass(db))["applied"] == 1
+    assert _names(db, "widget_orders", widget_id) == {"Renamed again"}
+
+
+@pytest.mark.asyncio
+async def test_newer_rename_supersedes_running_pass(db):
+    widget_id = await _seed(db, orders=800)
+    await _rename(db, widget_id, "First")
+
+    async def rename_mid_pass():
+        db.widget_orders.before_update_many = None
+        await _rename(db, widget_id, "Second")
+
+    db.widget_orders.before_update_many = rename_mid_pass
+    summary = await run_propagation_pass(db)
+
+    # The stale pass stopped after one batch; the same pass then re-claimed
+    # the re-queued job and applied the newest name everywhere.
+    assert summary["superseded"] == 1 and summary["applied"] == 1
+    assert _names(db, "widget_orders", widget_id) == {"Second"}
+
+
+@pytest.mark.asyncio
+async def test_status_reports_backlog_and_lag(db):
+    widget_id = await _seed(db, orders=1)
+    await _rename(db, widget_id, "Renamed")
+    db[engine.COLLECTION].docs[0]["requestedAt"] -= timedelta(seconds=90)
+
+    report = await propagation_status(db)
+    row = next(r for r in report["fields"] if r["field"] == WIDGET_NAME.name)
+    assert row["pending"] == 1 and row["running"] == 0
+    assert row["targets"] == ["widget_orders", "widget_archive"]
+    assert row["lagSeconds"] >= 90
+    assert report["jobs"][0]["sourceId"] == widget_id
+
+    await run_propagation_pass(db)
+    report = await propagation_status(db)
+    row = next(r for r in report["fields"] if r["field"] == WIDGET_NAME.name)
+    assert row["pending"] == 0 and row["lagSeconds"] == 0
+    assert report["jobs"] == []
+
+
+@pytest.mark.asyncio
+async def test_customer_rename_returns_before_orders_are_updated(db, monkeypatch):
+    monkeypatch.setattr(customer_module.mongodb, "get_database", lambda: db)
+    customer_id = uuid4()
+    await db.customers.insert_one({"customerId": str(customer_id), "name": "Acme"})
+    await db.sales_orders.insert_one(
+        {"customerId": str(customer_id), "customerName": "Acme"}
+    )
+
+    service = CustomerService()
+    service.get_customer = AsyncMock(return_value=SimpleNamespace(name="Acme"))
+
+    async def update(cid, data):
+        await db.customers.update_one(
+            {"customerId": str(cid)}, {"$set": {"name": data.name}}
+        )
+        return SimpleNamespace(name=data.name)
+
+    service.repository.update = update
+    await service.update_customer(customer_id, CustomerUpdate(name="Acme Farms"))
+
+    assert db.sales_orders.docs[0]["customerName"] == "Acme"
+    await run_propagation_pass(db)
+    assert db.sales_orders.docs[0]["customerName"] == "Acme Farms"
@@ -0,0 +1,232 @@
+"""
+Tests for the pure-ASGI request pipeline (src/middleware/pipeline.py).
+
+Covers the response headers (X-Response-Time, X-RateLimit-*, 429 with
+Retry-After), the shared request context (division ContextVars, route
+template, the bearer token decoded once even with ``get_current_user``
+downstream), streaming responses and background tasks passing through, and a
+requests/s benchmark against the previous three-layer BaseHTTPMiddleware shape.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import BackgroundTasks, Depends, FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# services before middleware: src.middleware.auth <-> services import cycle
+from src.services.database import mongodb
+from src.middleware import request_context as context_module
+from src.middleware.auth import get_current_user
+from src.middleware.division_context import get_current_division_id
+from src.middleware.pipeline import RequestPipelineMiddleware
+from src.middleware.rate_limit import (
+    rate_limit_headers,
+    rate_limit_user_from_claims,
+    rate_limiter,
+)
+from src.middleware.request_context import get_request_context
+from src.middleware.timing import record_response_time
+from src.models.user import UserRole
+from src.utils.security import create_access_token, decode_token
+
+
+class _Users:
+    async def find_one(self, query):
+        now = datetime.utcnow()
+        return {
+            "userId": query["userId"],
+            "email": "grower@example.com",
+            "firstName": "Ada",
+            "lastName": "Grower",
+            "role": "user",
+            "isActive": True,
+            "isEmailVerified": True,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+
+
+class _DB:
+    users = _Users()
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_redis", object())
+    monkeypatch.setattr(rate_limiter, "_redis_available", False)
+    monkeypatch.setattr(rate_limiter, "requests", {})
+    limits = {role: 1_000_000 for role in UserRole}
+    monkeypatch.setattr(rate_limiter, "limits", limits)
+    monkeypatch.setattr(mongodb, "get_database", lambda: _DB())
+    return limits
+
+
+def _app(events=None):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/health")
+    async def health():
+        return {"ok": True}
+
+    @app.get("/farms/{farm_id}/me")
+    async def me(farm_id: str, request: Request, user=Depends(get_current_user)):
+        context = get_request_context()
+        return {
+            "user": user.userId,
+            "division": get_current_division_id(),
+            "route": context.route,
+            "same": request.state.context is context,
+        }
+
+    @app.get("/stream")
+    async def stream(background: BackgroundTasks):
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i};"
+                await asyncio.sleep(0)
+
+        background.add_task(events.append, "background ran")
+        return StreamingResponse(chunks(), background=background)
+
+    app.add_middleware(RequestPipelineMiddleware)
+    return app
+
+
+def _client(app):
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://t")
+
+
+@pytest.mark.asyncio
+async def test_headers_match_the_previous_middleware(limits):
+    async with _client(_app()) as client:
+        response = await client.get("/ping")
+        health = await client.get("/api/health")
+
+    assert response.headers["X-Response-Time"].endswith("ms")
+    assert response.headers["X-RateLimit-Limit"] == "1000000"
+    assert response.headers["X-RateLimit-Remaining"] == "999999"
+    assert 1 <= int(response.headers["X-RateLimit-Reset"]) <= 60
+    # Health checks are timed but never rate limited
+    assert "X-Response-Time" in health.headers
+    assert "X-RateLimit-Limit" not in health.headers
+
+
+@pytest.mark.asyncio
+async def test_exceeding_the_limit_returns_429(limits):
+    limits[UserRole.GUEST] = 2
+    async with _client(_app()) as client:
+        statuses = [(await client.get("/ping")).status_code for _ in range(2)]
+        refused = await client.get("/ping")
+
+    assert statuses == [200, 200]
+    assert refused.status_code == 429
+    assert refused.json()["detail"].startswith("Rate limit exceeded")
+    assert refused.headers["X-RateLimit-Limit"] == "2"
+    assert refused.headers["X-RateLimit-Remaining"] == "0"
+    assert refused.headers["Retry-After"] == refused.headers["X-RateLimit-Reset"]
+
+
+@pytest.mark.asyncio
+async def test_context_is_shared_and_the_token_decoded_once(limits, monkeypatch):
+    decodes = []
+    real_verify = context_module.verify_token
+
+    def counting_verify(token):
+        decodes.append(token)
+        return real_verify(token)
+
+    monkeypatch.setattr(context_module, "verify_token", counting_verify)
+    limits[UserRole.USER] = 50
+    token = create_access_token("u-1", "grower@example.com", UserRole.USER)
+
+    async with _client(_app()) as client:
+        response = await client.get(
+            "/farms/f-1/me",
+            headers={"Authorization": f"Bearer {token}", "X-Division-Id": "div-9"},
+        )
+
+    assert response.json() == {
+        "user": "u-1",
+        "division": "div-9",
+        "route": "/farms/{farm_id}/me",
+        "same": True,
+    }
+    assert decodes == [token]
+    # Rate limited as the token's user and role, not as a guest IP
+    assert response.headers["X-RateLimit-Limit"] == "50"
+    assert get_current_division_id() is None
+
+
+@pytest.mark.asyncio
+async def test_streaming_responses_and_background_tasks_pass_through(limits):
+    events = []
+    async with _client(_app(events)) as client:
+        response = await client.get("/stream")
+
+    assert response.text == "chunk0;chunk1;chunk2;"
+    assert "X-Response-Time" in response.headers
+    assert events == ["background ran"]
+
+
+class _LegacyDivision(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+class _LegacyRateLimit(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        auth = request.headers.get("Authorization", "")
+        claims = decode_token(auth[7:]) if auth.startswith("Bearer ") else None
+        user = rate_limit_user_from_claims(claims)
+        if user:
+            request.state.user = user
+        limit, remaining, _ = await rate_limiter.check_rate_limit(request)
+        response = await call_next(request)
+        response.headers.update(rate_limit_headers(limit, remaining))
+        return response
+
+
+class _LegacyTiming(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+        record_response_time(
+            request.method, request.url.path, response.status_code, duration_ms
+        )
+        return response
+
+
+async def _requests_per_second(app, n=1500):
+    async with _client(app) as client:
+        for _ in range(100):
+            await client.get("/ping")
+        started = time.perf_counter()
+        for _ in range(n):
+            await client.get("/ping")
+        return n / (time.perf_counter() - started)
+
+
+@pytest.mark.asyncio
+async def test_benchmark_requests_per_second(limits):
+    before = FastAPI()
+    before.get("/ping")(lambda: {"ok": True})
+    for layer in (_LegacyTiming, _LegacyRateLimit, _LegacyDivision):
+        before.add_middleware(layer)
+
+    rps_before = await _requests_per_second(before)
+    rps_after = await _requests_per_second(_app())
+
+    print(f"\ntrivial endpoint: {rps_before:.0f} req/s before, {rps_after:.0f} after")
+    assert rps_after > rps_before * 1.3
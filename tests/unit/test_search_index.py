@@ -0,0 +1,505 @@
+"""
+Tests for the shared search index (src/core/search).
+
+Uses a small in-memory stand-in for the Motor collections involved that
+understands the query operators, bulk operations and aggregation stages the
+index issues, so the tests cover tokenisation, write maintenance (token
+documents and gram counts), autocomplete keyset paging, typo-tolerant
+ranking, tenant scoping and the opt-in gate used by the list endpoints.
+"""
+
+import re
+from uuid import uuid4
+
+import pytest
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.core.indexes import index_registry
+from src.core.search import index as search_index
+from src.core.search import (
+    SearchEntity,
+    autocomplete,
+    backfill_search_index,
+    normalize,
+    register_search_entity,
+    reindex,
+    search,
+    trigrams,
+    use_search_index,
+    word_prefixes,
+)
+from src.modules.purchasing.services.vendor_service import VendorService
+
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def _cmp(value, cond):
+    if isinstance(cond, dict) and any(k.startswith("$") for k in cond):
+        values = value if isinstance(value, list) else [value]
+        for op, arg in cond.items():
+            if op == "$in":
+                if not any(v in arg for v in values):
+                    return False
+            elif op == "$ne":
+                if value == arg:
+                    return False
+            elif op == "$all":
+                if not all(a in values for a in arg):
+                    return False
+            elif op == "$regex":
+                if not any(isinstance(v, str) and re.search(arg, v) for v in values):
+                    return False
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    return False
+                if op == "$gt" and not value > arg:
+                    return False
+                if op == "$gte" and not value >= arg:
+                    return False
+                if op == "$lt" and not value < arg:
+                    return False
+                if op == "$lte" and not value <= arg:
+                    return False
+            else:
+                raise NotImplementedError(op)
+        return True
+    if isinstance(value, list):
+        return cond in value
+    return value == cond
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif not _cmp(_get(doc, key), cond):
+            return False
+    return True
+
+
+def _eval(expr, doc):
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _get(doc, expr[1:])
+    if isinstance(expr, dict):
+        ((op, arg),) = expr.items()
+        if op == "$size":
+            return len(_eval(arg, doc))
+        if op == "$setIntersection":
+            a, b = (set(_eval(x, doc) or []) for x in arg)
+            return sorted(a & b)
+        if op == "$in":
+            return _eval(arg[0], doc) in (_eval(arg[1], doc) or [])
+        values = [_eval(x, doc) for x in arg]
+        if op == "$add":
+            return sum(values)
+        if op == "$subtract":
+            return values[0] - values[1]
+        if op == "$multiply":
+            return values[0] * values[1]
+        if op == "$divide":
+            return values[0] / values[1]
+        if op == "$max":
+            return max(values)
+        if op == "$round":
+            return round(values[0], values[1])
+        if op == "$cond":
+            return values[1] if values[0] else values[2]
+        raise NotImplementedError(op)
+    return expr
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+        self._skip = 0
+        self._limit = None
+
+    def sort(self, keys, direction=1):
+        keys = keys if isinstance(keys, list) else [(keys, direction)]
+        for field, order in reversed(keys):
+            self._docs.sort(key=lambda d: _get(d, field) or "", reverse=order < 0)
+        return self
+
+    def skip(self, n):
+        self._skip = n
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def _window(self):
+        end = None if self._limit is None else self._skip + self._limit
+        return self._docs[self._skip : end]
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self._window()]
+
+    def __aiter__(self):
+        self._it = iter(self._window())
+        return self
+
+    async def __anext__(self):
+        try:
+            return dict(next(self._it))
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _FakeCollection:
+    def __init__(self, name, log):
+        self.name = name
+        self.docs = []
+        self._log = log
+
+    def _id_of(self, doc):
+        return doc.get("_id")
+
+    def find(self, query=None, projection=None):
+        self._log.append((self.name, "find", query))
+        return _Cursor([d for d in self.docs if _matches(d, query or {})])
+
+    async def find_one(self, query, projection=None):
+        return next((dict(d) for d in self.docs if _matches(d, query)), None)
+
+    async def count_documents(self, query, limit=0):
+        n = sum(1 for d in self.docs if _matches(d, query))
+        return min(n, limit) if limit else n
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return
+            doc = {k: v for k, v in query.items() if not k.startswith("$")}
+            self.docs.append(doc)
+        doc.update(update.get("$set", {}))
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+
+    async def delete_many(self, query):
+        self.docs = [d for d in self.docs if not _matches(d, query)]
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            if isinstance(op, ReplaceOne):
+                self.docs = [d for d in self.docs if not _matches(d, op._filter)]
+                self.docs.append(dict(op._doc))
+            elif isinstance(op, DeleteOne):
+                await self.delete_many(op._filter)
+            elif isinstance(op, UpdateOne):
+                await self.update_one(op._filter, op._doc, upsert=op._upsert)
+            elif isinstance(op, InsertOne):
+                if any(d.get("_id") == op._doc.get("_id") for d in self.docs):
+                    raise BulkWriteError(
+                        {"writeErrors": [{"code": 11000}], "nInserted": 0}
+                    )
+                self.docs.append(dict(op._doc))
+
+    def aggregate(self, pipeline):
+        self._log.append((self.name, "aggregate", pipeline))
+        return _Cursor(self._run(pipeline, [dict(d) for d in self.docs]))
+
+    def _run(self, pipeline, rows):
+        for stage in pipeline:
+            ((op, arg),) = stage.items()
+            if op == "$match":
+                rows = [r for r in rows if _matches(r, arg)]
+            elif op == "$limit":
+                rows = rows[:arg]
+            elif op == "$sort":
+                for field, order in reversed(list(arg.items())):
+                    rows.sort(key=lambda r: r[field], reverse=order < 0)
+            elif op == "$addFields":
+                rows = [{**r, **{k: _eval(v, r) for k, v in arg.items()}} for r in rows]
+            elif op == "$count":
+                rows = [{arg: len(rows)}] if rows else []
+            elif op == "$facet":
+                rows = [{k: self._run(sub, list(rows)) for k, sub in arg.items()}]
+            elif op == "$project":
+                rows = [
+                    {
+                        k: (r.get(k) if v == 1 else _eval(v, r))
+                        for k, v in arg.items()
+                        if v != 0
+                    }
+                    for r in rows
+                ]
+            else:
+                raise NotImplementedError(op)
+        return rows
+
+
+class _FakeDB:
+    def __init__(self):
+        self.log = []
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = _FakeCollection(name, self.log)
+        return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+CONTACTS = register_search_entity(
+    SearchEntity(
+        name="test_contacts",
+        collection="contacts",
+        id_field="contactId",
+        fields=("firstName", "lastName", "company"),
+        label_fields=("firstName", "lastName"),
+        scope_field="organizationId",
+        filter_fields=("isActive",),
+        include=lambda doc: doc.get("deletedAt") is None,
+    )
+)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(search_index, "_ready", set())
+    monkeypatch.setattr(
+        search_index.settings, "SEARCH_INDEX_ENTITIES", "test_contacts,vendors"
+    )
+    return _FakeDB()
+
+
+async def _add(db, first, last, company="", org="org-1", **extra):
+    doc = {
+        "contactId": str(uuid4()),
+        "firstName": first,
+        "lastName": last,
+        "company": company,
+        "organizationId": org,
+        "isActive": True,
+        "deletedAt": None,
+        **extra,
+    }
+    await db.contacts.insert_one(doc)
+    await reindex(db, CONTACTS.name, [doc["contactId"]])
+    return doc
+
+
+def _stat(db, org, gram):
+    key = f"{CONTACTS.name}|{org}|{gram}"
+    doc = next(
+        (d for d in db[search_index.STATS_COLLECTION].docs if d["_id"] == key), None
+    )
+    return doc["n"] if doc else 0
+
+
+def test_tokens_normalise_accents_and_punctuation():
+    assert normalize("  Café DÉJÀ-vu, Ltd. ") == "cafe deja vu ltd"
+    assert word_prefixes(["abc"]) == ["a", "ab", "abc"]
+    assert trigrams(["ab"]) == ["  a", " ab", "ab "]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_matches_word_prefixes_with_keyset_paging(db):
+    john = await _add(db, "John", "Smith", "Acme Farms")
+    await _add(db, "Johanna", "Berg", "Green Valley")
+    await _add(db, "Mary", "Johnson")
+    for i in range(22):
+        await _add(db, f"Jo{i:02d}", "Filler")
+
+    page = await autocomplete(db, CONTACTS.name, "jo sm", scope="org-1")
+    assert page.entity_ids == [john["contactId"]]
+    assert page.hits[0].label == "John Smith"
+    assert (await autocomplete(db, CONTACTS.name, "acm", scope="org-1")).entity_ids == [
+        john["contactId"]
+    ]
+
+    seen, cursor = [], None
+    while True:
+        page = await autocomplete(
+            db, CONTACTS.name, "jo", scope="org-1", limit=10, cursor=cursor
+        )
+        assert page.estimated_total == 25 and page.total_is_exact
+        seen.extend(h.label for h in page.hits)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 25
+    assert seen == sorted(seen, key=normalize)
+
+    with pytest.raises(ValueError):
+        await autocomplete(db, CONTACTS.name, "jo", scope="org-1", cursor="bogus")
+
+
+def test_autocomplete_query_follows_the_declared_index():
+    spec = next(
+        s
+        for s in index_registry.specs()
+        if s.collection == search_index.COLLECTION
+        and s.name == "entity_scope_prefix_sort"
+    )
+    assert [k for k, _ in spec.keys] == [
+        "entity",
+        "scope",
+        "prefixes",
+        "sortKey",
+        "entityId",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_tolerates_typos_and_ranks_best_match_first(db):
+    john = await _add(db, "John", "Smith", "Acme Farms")
+    jon = await _add(db, "Jon", "Smithers")
+    await _add(db, "Alice", "Jones")
+    await _add(db, "Bob", "Stone")
+
+    page = await search(db, CONTACTS.name, "john smiht", scope="org-1")
+
+    assert page.entity_ids[:2] == [john["contactId"], jon["contactId"]]
+    assert all(h.score > 0 for h in page.hits)
+    assert page.total_is_exact and page.estimated_total == len(page.hits)
+    # Only the rarest grams are probed, never every query gram
+    pipeline = [q for c, op, q in db.log if op == "aggregate"][-1]
+    probed = pipeline[0]["$match"]["grams"]["$in"]
+    assert len(probed) < len(trigrams(["john", "smiht"]))
+
+    first = await search(db, CONTACTS.name, "smith", scope="org-1", limit=1)
+    second = await search(
+        db, CONTACTS.name, "smith", scope="org-1", limit=1, cursor=first.next_cursor
+    )
+    assert first.entity_ids + second.entity_ids == [
+        john["contactId"],
+        jon["contactId"],
+    ]
+    assert second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_candidate_cap_applies_after_ranking(db, monkeypatch):
+    monkeypatch.setattr(search_index, "CANDIDATE_CAP", 3)
+    for i in range(6):
+        await _add(db, "Maria", f"Lopez{i}")
+    best = await _add(db, "Mariam", "Lopezz")
+
+    page = await search(db, CONTACTS.name, "mariam", scope="org-1", limit=2)
+
+    assert page.entity_ids[0] == best["contactId"]
+    assert page.estimated_total == 7 and page.total_is_exact
+
+
+@pytest.mark.asyncio
+async def test_searches_are_confined_to_scope_and_filters(db):
+    await _add(db, "Ahmed", "Khan", org="org-1")
+    other = await _add(db, "Ahmed", "Khan", org="org-2")
+    inactive = await _add(db, "Ahmed", "Karim", org="org-2", isActive=False)
+
+    page = await search(db, CONTACTS.name, "ahmed", scope="org-2")
+    assert set(page.entity_ids) == {other["contactId"], inactive["contactId"]}
+
+    active = await autocomplete(
+        db, CONTACTS.name, "ahm", scope="org-2", filters={"isActive": True}
+    )
+    assert active.entity_ids == [other["contactId"]]
+
+    with pytest.raises(ValueError):
+        await search(db, CONTACTS.name, "ahmed", filters={"company": "x"})
+
+
+@pytest.mark.asyncio
+async def test_reindex_follows_updates_and_deletes_and_keeps_gram_counts(db):
+    doc = await _add(db, "Fatima", "Noor")
+    assert _stat(db, "org-1", "fat") == 1
+
+    await db.contacts.update_one(
+        {"contactId": doc["contactId"]}, {"$set": {"firstName": "Layla"}}
+    )
+    await reindex(db, CONTACTS.name, [doc["contactId"]])
+
+    assert _stat(db, "org-1", "fat") == 0
+    assert _stat(db, "org-1", "lay") == 1
+    assert (await autocomplete(db, CONTACTS.name, "fat", scope="org-1")).hits == []
+    assert (await autocomplete(db, CONTACTS.name, "lay", scope="org-1")).entity_ids == [
+        doc["contactId"]
+    ]
+
+    # Soft delete: excluded by the entity's include predicate
+    await db.contacts.update_one(
+        {"contactId": doc["contactId"]}, {"$set": {"deletedAt": "2026-01-01"}}
+    )
+    await reindex(db, CONTACTS.name, [doc["contactId"]])
+    assert db[search_index.COLLECTION].docs == []
+    assert _stat(db, "org-1", "lay") == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_gates_endpoints_and_vendor_search_uses_index(db):
+    org = str(uuid4())
+    service = VendorService(db)
+    for name in ("Gulf Agri Supplies", "Desert Irrigation LLC", "Emirates Seeds"):
+        await db.vendors.insert_one(
+            {
+                "vendorId": str(uuid4()),
+                "organizationId": org,
+                "vendorCode": f"VND-{name[:3].upper()}",
+                "name": name,
+                "isActive": True,
+                "deletedAt": None,
+            }
+        )
+
+    assert not await use_search_index(db, "vendors")
+    assert not await use_search_index(db, "customers")  # not opted in
+
+    result = await backfill_search_index(db)
+    assert result["rebuilt"]["vendors"] == 3
+    assert await use_search_index(db, "vendors")
+    # A second run does nothing until the definition version changes
+    assert "vendors" not in (await backfill_search_index(db))["rebuilt"]
+
+    async def no_regex(*args, **kwargs):
+        raise AssertionError("list_vendors fell back to the $regex query")
+
+    db.vendors.count_documents = no_regex
+    found = await search_index.search(db, "vendors", "irigation", scope=org)
+    assert [h.label for h in found.hits] == ["Desert Irrigation LLC"]
+
+    suggestions = await service.autocomplete_vendors(org, "em se")
+    assert [h.label for h in suggestions.hits] == ["Emirates Seeds"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_survives_concurrent_gram_upserts(db):
+    john = await _add(db, "John", "Smith")
+    stale = f"{CONTACTS.name}|org-1|zzz"
+    await db[search_index.STATS_COLLECTION].insert_one({"_id": stale, "n": 3})
+    stats = db[search_index.STATS_COLLECTION]
+    real_bulk_write = stats.bulk_write
+
+    async def reindex_lands_mid_rebuild(ops, ordered=True):
+        # A concurrent reindex upserts a gram the rebuild is about to write.
+        await stats.update_one(
+            {"_id": f"{CONTACTS.name}|org-1|joh"}, {"$inc": {"n": 1}}, upsert=True
+        )
+        await real_bulk_write(ops, ordered)
+
+    stats.bulk_write = reindex_lands_mid_rebuild
+
+    result = await search_index.rebuild_entity(db, CONTACTS.name)
+
+    assert result["count"] == 1
+    assert await use_search_index(db, CONTACTS.name)
+    assert _stat(db, "org-1", "joh") == 1
+    assert _stat(db, "org-1", "zzz") == 0
+    page = await search(db, CONTACTS.name, "john", scope="org-1")
+    assert page.entity_ids == [john["contactId"]]
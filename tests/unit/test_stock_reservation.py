@@ -0,0 +1,441 @@
+"""
+Tests for the sales stock reservation engine
+(src/modules/sales/services/sales/stock_reservation.py) and OrderService's
+use of it.
+
+Covers all-or-nothing guarded reservation (transactional and sequential
+fallback), release/deduct guards, FEFO batch picking, order reservation with
+FEFO allocations, and 200 concurrent orders against shared batches.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+# services before middleware: src.middleware.auth <-> services import cycle
+from src.services.database import mongodb  # noqa: F401
+from src.modules.sales.models.sales_order import (
+    OrderItem,
+    OrderItemAllocation,
+    SalesOrder,
+    SalesOrderStatus,
+)
+from src.modules.sales.services.sales import order_service as order_module
+from src.modules.sales.services.sales import stock_reservation as engine
+from src.modules.sales.services.sales.stock_reservation import (
+    DEDUCT,
+    RELEASE,
+    RESERVE,
+    StockLeg,
+    StockShortfall,
+    apply_stock_action,
+    plan_fefo,
+)
+
+ORG = "org-1"
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value = doc.get(key)
+        if isinstance(cond, dict):
+            for op, operand in cond.items():
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$gte" and (value is None or value < operand):
+                    return False
+                if op == "$gt" and (value is None or value <= operand):
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        return self
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(0)
+        return [dict(d) for d in self.docs]
+
+
+class _Collection:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.docs = []
+
+    def _find(self, query):
+        return [d for d in self.docs if _matches(d, query)]
+
+    def _inc(self, doc, update, session):
+        for field, delta in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + delta
+        doc.update(update.get("$set", {}))
+        if session is not None and update.get("$inc"):
+            session.journal.append((doc, update["$inc"]))
+
+    def find(self, query, session=None):
+        return _Cursor(self._find(query))
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        await asyncio.sleep(0)
+        found = self._find(query)
+        if not found:
+            return None
+        self._inc(found[0], update, None)
+        return dict(found[0])
+
+    async def update_one(self, query, update, session=None):
+        await asyncio.sleep(0)
+        found = self._find(query)
+        if found:
+            if "$inc" in update:
+                self._inc(found[0], update, session)
+            else:
+                found[0].update(update["$set"])
+        return SimpleNamespace(matched_count=len(found[:1]))
+
+    async def bulk_write(self, requests, ordered=True, session=None):
+        matched = 0
+        for request in requests:
+            await asyncio.sleep(0)
+            found = self._find(request._filter)
+            if found:
+                self._inc(found[0], request._doc, session)
+                matched += 1
+        return SimpleNamespace(matched_count=matched)
+
+    async def insert_many(self, docs):
+        self.docs.extend(docs)
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+
+class _Session:
+    def __init__(self):
+        self.journal = []
+
+    def start_transaction(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    # Also the transaction context: a raising block undoes the journal, like
+    # an aborted transaction
+    async def __aexit__(self, exc_type, *exc):
+        if exc_type is not None:
+            for doc, inc in reversed(self.journal):
+                for field, delta in inc.items():
+                    doc[field] -= delta
+        self.journal = []
+        return False
+
+
+class _Client:
+    async def start_session(self):
+        return _Session()
+
+
+class _FarmDb:
+    def __init__(self):
+        self.client = _Client()
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = _Collection(self, name)
+        return self.collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+def _row(db, available, *, source="harvest", expiry_days=None, plant="Lettuce"):
+    row = {
+        "inventoryId": str(uuid4()),
+        "organizationId": ORG,
+        "farmId": str(uuid4()),
+        "farmName": "North",
+        "plantName": plant,
+        "qualityGrade": "grade_a",
+        "quantity": available,
+        "availableQuantity": available,
+        "reservedQuantity": 0,
+        "expiryDate": (
+            None
+            if expiry_days is None
+            else (datetime.utcnow() + timedelta(days=expiry_days)).isoformat()
+        ),
+    }
+    db[engine.COLLECTIONS[source]].docs.append(row)
+    return row
+
+
+@pytest.fixture(params=[True, False], ids=["transaction", "sequential"])
+def db(request, monkeypatch):
+    monkeypatch.setattr(engine, "_transactions_supported", request.param)
+    return _FarmDb()
+
+
+@pytest.mark.asyncio
+async def test_reserve_is_all_or_nothing(db):
+    first, second = _row(db, 10), _row(db, 3, source="returned")
+    legs = [
+        StockLeg("harvest", first["inventoryId"], 4),
+        StockLeg("returned", second["inventoryId"], 5, line_index=1),
+    ]
+
+    with pytest.raises(StockShortfall) as exc:
+        await apply_stock_action(db, RESERVE, legs)
+
+    assert [
+        (leg.line_index, row["availableQuantity"]) for leg, row in exc.value.legs
+    ] == [(1, 3)]
+    assert first["availableQuantity"] == 10 and first["reservedQuantity"] == 0
+
+    # Legs on the same row are summed
+    rows = await apply_stock_action(
+        db, RESERVE, [legs[0], StockLeg("harvest", first["inventoryId"], 6)]
+    )
+    assert rows[("harvest", first["inventoryId"])]["availableQuantity"] == 0
+    assert first["reservedQuantity"] == 10
+
+
+@pytest.mark.asyncio
+async def test_release_and_deduct_guards(db):
+    row = _row(db, 10)
+    leg = StockLeg("harvest", row["inventoryId"], 4)
+    await apply_stock_action(db, RESERVE, [leg])
+
+    await apply_stock_action(db, DEDUCT, [leg])
+    assert (row["quantity"], row["availableQuantity"], row["reservedQuantity"]) == (
+        6,
+        6,
+        0,
+    )
+    for action in (RELEASE, DEDUCT):
+        with pytest.raises(StockShortfall):
+            await apply_stock_action(db, action, [leg])
+    with pytest.raises(StockShortfall) as exc:
+        await apply_stock_action(db, RESERVE, [StockLeg("harvest", "missing", 1)])
+    assert exc.value.legs[0][1] is None
+
+
+@pytest.mark.asyncio
+async def test_fefo_soonest_expiry_first_and_skips_expired(db):
+    no_expiry = _row(db, 50)
+    later = _row(db, 5, expiry_days=9)
+    soon = _row(db, 5, source="returned", expiry_days=2)
+    _row(db, 100, expiry_days=-1)  # expired
+    _row(db, 100, expiry_days=1, plant="Basil")
+
+    plan = await plan_fefo(
+        db, organization_id=ORG, plant_name="Lettuce", quantity=12, line_index=2
+    )
+
+    assert [(leg.source, leg.inventory_id, leg.quantity) for leg, _ in plan] == [
+        ("returned", soon["inventoryId"], 5),
+        ("harvest", later["inventoryId"], 5),
+        ("harvest", no_expiry["inventoryId"], 2),
+    ]
+    assert {leg.line_index for leg, _ in plan} == {2}
+
+    with pytest.raises(StockShortfall) as exc:
+        await plan_fefo(db, organization_id=ORG, plant_name="Lettuce", quantity=61)
+    assert exc.value.legs[0][1]["availableQuantity"] == 60
+
+
+def _order(*items):
+    return SalesOrder(
+        customerId=uuid4(),
+        customerName="Acme",
+        status=SalesOrderStatus.CONFIRMED,
+        items=list(items),
+        subtotal=0,
+        total=0,
+        organizationId=ORG,
+        orderCode="SO001",
+        createdBy=uuid4(),
+    )
+
+
+def _item(quantity, allocations=(), name="Lettuce"):
+    return OrderItem(
+        productId=uuid4(),
+        productName=name,
+        quantity=quantity,
+        unitPrice=1,
+        totalPrice=quantity,
+        qualityGrade="grade_a",
+        allocations=list(allocations),
+    )
+
+
+@pytest.fixture
+def service(db, monkeypatch):
+    orders = _FarmDb()["sales_orders"]
+    monkeypatch.setattr(order_module.farm_db, "get_database", lambda: db)
+    monkeypatch.setattr(order_module.sales_db, "get_collection", lambda name: orders)
+    svc = order_module.OrderService.__new__(order_module.OrderService)
+    svc.orders = orders
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_order_reserve_fefo_release_and_ship(db, service):
+    batch = _row(db, 8, expiry_days=3)
+    fresh = _row(db, 20, expiry_days=10)
+    explicit = OrderItemAllocation(
+        inventorySource="harvest",
+        inventoryId=fresh["inventoryId"],
+        farmId=fresh["farmId"],
+        quantity=5,
+    )
+    order = _order(_item(5, [explicit]), _item(10))
+    service.orders.docs.append({"orderId": str(order.orderId)})
+
+    await service._reserve_allocations(order, "user-1")
+
+    picked = order.items[1].allocations
+    assert [(str(a.inventoryId), a.quantity) for a in picked] == [
+        (batch["inventoryId"], 8),
+        (fresh["inventoryId"], 2),
+    ]
+    assert service.orders.docs[0]["items.1.allocations"][0]["quantity"] == 8
+    assert fresh["availableQuantity"] == 13 and fresh["reservedQuantity"] == 7
+    movements = db.inventory_movements.docs
+    assert [
+        (m["inventoryId"], m["quantityBefore"], m["quantityAfter"]) for m in movements
+    ] == [
+        (fresh["inventoryId"], 20, 15),
+        (batch["inventoryId"], 8, 0),
+        (fresh["inventoryId"], 15, 13),
+    ]
+
+    await service._deduct_allocations(order, "user-1")
+    assert fresh["quantity"] == 13 and fresh["reservedQuantity"] == 0
+    with pytest.raises(HTTPException) as exc:
+        await service._deduct_allocations(order, "user-1")
+    assert exc.value.status_code == 409
+
+    # Releasing what is no longer reserved is skipped, not an error
+    await service._release_allocations(order, "user-1")
+    assert fresh["availableQuantity"] == 13
+
+
+@pytest.mark.asyncio
+async def test_order_reserve_shortfall_is_422_and_reserves_nothing(db, service):
+    batch = _row(db, 4)
+    order = _order(
+        _item(
+            3,
+            [
+                OrderItemAllocation(
+                    inventorySource="harvest",
+                    inventoryId=batch["inventoryId"],
+                    quantity=3,
+                )
+            ],
+        ),
+        _item(7, name="Basil"),
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await service._reserve_allocations(order, "user-1")
+
+    assert exc.value.status_code == 422
+    assert "Line item 1: insufficient stock for 'Basil'" in exc.value.detail
+    assert batch["availableQuantity"] == 4 and batch["reservedQuantity"] == 0
+
+
+@pytest.mark.asyncio
+async def test_order_lines_of_one_product_share_fefo_stock(db, service):
+    soon = _row(db, 10, expiry_days=2)
+    later = _row(db, 10, expiry_days=5)
+    order = _order(_item(8), _item(8))
+    service.orders.docs.append({"orderId": str(order.orderId)})
+
+    await service._reserve_allocations(order, "user-1")
+
+    assert [
+        [(str(a.inventoryId), a.quantity) for a in item.allocations]
+        for item in order.items
+    ] == [
+        [(soon["inventoryId"], 8)],
+        [(soon["inventoryId"], 2), (later["inventoryId"], 6)],
+    ]
+    assert (soon["availableQuantity"], later["availableQuantity"]) == (0, 4)
+    assert soon["reservedQuantity"] + later["reservedQuantity"] == 16
+
+
+@pytest.mark.asyncio
+async def test_fefo_pick_skips_stock_claimed_by_explicit_leg(db, service):
+    soon = _row(db, 10, expiry_days=2)
+    later = _row(db, 10, expiry_days=5)
+    explicit = OrderItemAllocation(
+        inventorySource="harvest", inventoryId=soon["inventoryId"], quantity=7
+    )
+    order = _order(_item(7, [explicit]), _item(6))
+    service.orders.docs.append({"orderId": str(order.orderId)})
+
+    await service._reserve_allocations(order, "user-1")
+
+    assert [(str(a.inventoryId), a.quantity) for a in order.items[1].allocations] == [
+        (soon["inventoryId"], 3),
+        (later["inventoryId"], 3),
+    ]
+    assert (soon["availableQuantity"], later["availableQuantity"]) == (0, 7)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_orders_never_oversell(db, service):
+    batches = [_row(db, 50, expiry_days=d) for d in (2, 4, 6, 8)]
+    stock = sum(b["availableQuantity"] for b in batches)
+
+    async def place(i):
+        if i % 2:
+            order = _order(_item(3))  # FEFO
+        else:
+            batch = batches[i % 4]
+            order = _order(
+                _item(
+                    3,
+                    [
+                        OrderItemAllocation(
+                            inventorySource="harvest",
+                            inventoryId=batch["inventoryId"],
+                            quantity=3,
+                        )
+                    ],
+                )
+            )
+        try:
+            await service._reserve_allocations(order, "user-1")
+        except HTTPException:
+            return 0
+        return 3
+
+    reserved = await asyncio.gather(*(place(i) for i in range(200)))
+
+    assert all(b["availableQuantity"] >= 0 for b in batches)
+    assert sum(b["reservedQuantity"] for b in batches) == sum(reserved)
+    assert sum(b["availableQuantity"] for b in batches) == stock - sum(reserved)
+    # 200 x 3 = 600 asked for 200 in stock: the stock is sold out, not oversold
+    assert stock - sum(reserved) < 3
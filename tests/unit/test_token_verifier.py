@@ -0,0 +1,242 @@
+"""
+Tests for the shared token verifier (src/core/tokens/verifier.py).
+
+Covers the verified-token cache (hits skip jose, expiry still enforced, LRU
+bound), user/session/refresh revocations and their cross-worker sync, and a
+module auth dependency reusing the claims the request pipeline verified.
+"""
+
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError
+
+# services before middleware: src.middleware.auth <-> services import cycle
+from src.services.database import mongodb
+from src.core.tokens import verifier as verifier_module
+from src.core.tokens.verifier import (
+    TokenRevokedError,
+    TokenVerifier,
+    revoke_refresh_token,
+    revoke_session,
+    revoke_user_tokens,
+    sync_revocations,
+    verify_token,
+)
+from src.middleware.pipeline import RequestPipelineMiddleware
+from src.middleware.rate_limit import rate_limiter
+from src.models.user import UserRole
+from src.modules.crm.middleware.auth import get_current_user
+from src.modules.crm.services.database import crm_db
+from src.utils.security import create_access_token, create_refresh_token
+
+
+class _Revocations:
+    def __init__(self):
+        self.docs = {}
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+        doc.update(update["$set"])
+
+    def find(self, query):
+        docs = [
+            dict(d)
+            for d in self.docs.values()
+            if d["expiresAt"] > query["expiresAt"]["$gt"]
+            and (
+                "revokedAt" not in query or d["revokedAt"] >= query["revokedAt"]["$gte"]
+            )
+        ]
+        return SimpleNamespace(to_list=_async(docs))
+
+
+def _async(value):
+    async def to_list(length=None):
+        return value
+
+    return to_list
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    fresh = TokenVerifier()
+    monkeypatch.setattr(verifier_module, "token_verifier", fresh)
+    decodes = []
+    real_decode = verifier_module.jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        decodes.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(verifier_module.jwt, "decode", counting_decode)
+    fresh.decodes = decodes
+    return fresh
+
+
+@pytest.fixture
+def db():
+    return {verifier_module.REVOCATIONS_COLLECTION: _Revocations()}
+
+
+def _access(user_id="u-1", **kwargs):
+    return create_access_token(
+        user_id, f"{user_id}@example.com", UserRole.USER, **kwargs
+    )
+
+
+def test_cache_hits_skip_decoding_and_return_copies(verifier):
+    token = _access()
+
+    first = verify_token(token)
+    first["role"] = "super_admin"
+    second = verify_token(token)
+
+    assert second["userId"] == "u-1" and second["role"] == "user"
+    assert verifier.decodes == [token]
+    assert verifier.stats()["hits"] == 1 and verifier.stats()["misses"] == 1
+
+    # Invalid tokens are never cached
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            verify_token(token[:-2] + "xx")
+    assert len(verifier.decodes) == 3
+
+
+def test_cached_tokens_still_expire(verifier, monkeypatch):
+    token = _access(expires_delta=timedelta(seconds=30))
+    verify_token(token)
+
+    later = time.time() + 60
+    monkeypatch.setattr(verifier_module, "time", SimpleNamespace(time=lambda: later))
+    with pytest.raises(ExpiredSignatureError):
+        verify_token(token)
+    assert verifier.stats()["entries"] == 0
+
+
+def test_cache_is_bounded_lru(verifier, monkeypatch):
+    monkeypatch.setattr(verifier_module.settings, "TOKEN_CACHE_MAX_ENTRIES", 3)
+    tokens = [_access(f"u-{i}") for i in range(4)]
+    for token in tokens[:3]:
+        verify_token(token)
+    verify_token(tokens[0])  # most recently used now
+    verify_token(tokens[3])  # evicts tokens[1]
+
+    assert verifier.stats()["entries"] == 3
+    verifier.decodes.clear()
+    verify_token(tokens[0])
+    verify_token(tokens[1])
+    assert verifier.decodes == [tokens[1]]
+
+
+@pytest.mark.asyncio
+async def test_user_revocation_cuts_off_earlier_tokens(verifier, db):
+    old = _access()
+    other_user = _access("u-2")
+    verify_token(old)
+
+    await revoke_user_tokens(db, "u-1", "password_reset")
+
+    with pytest.raises(TokenRevokedError):
+        verify_token(old)  # even though it is cached
+    assert verify_token(other_user)["userId"] == "u-2"
+    # Signing in again after the revocation works
+    assert verify_token(_access())["userId"] == "u-1"
+
+
+@pytest.mark.asyncio
+async def test_session_and_refresh_revocations(verifier, db):
+    refresh, session_id = create_refresh_token("u-1")
+    access = _access(session_id=session_id)
+    other_refresh, other_id = create_refresh_token("u-1")
+    other_access = _access(session_id=other_id)
+    expires = datetime.utcnow() + timedelta(days=7)
+
+    # Rotation: only the refresh token itself
+    await revoke_refresh_token(db, other_id, expires)
+    with pytest.raises(TokenRevokedError):
+        verify_token(other_refresh)
+    assert verify_token(other_access)["sid"] == other_id
+
+    # Logout: the refresh token and the access tokens issued with it
+    await revoke_session(db, session_id, expires)
+    for token in (refresh, access):
+        with pytest.raises(TokenRevokedError):
+            verify_token(token)
+    assert verify_token(other_access)
+
+
+@pytest.mark.asyncio
+async def test_revocations_sync_to_other_workers(verifier, db, monkeypatch):
+    token = _access()
+    assert await sync_revocations(db) == 0
+    verify_token(token)
+
+    # Another worker revokes: only the shared collection changes here
+    await revoke_user_tokens(db, "u-1", "logout")
+    verifier.reset_revocations()
+    assert verify_token(token)
+
+    assert await sync_revocations(db) == 1
+    with pytest.raises(TokenRevokedError):
+        verify_token(token)
+
+    # Entries are dropped once nothing they match can still be valid
+    later = time.time() + 8 * 24 * 3600
+    verifier.prune_revocations(later)
+    assert verifier.stats()["revocations"] == 0
+
+
+class _Users:
+    async def find_one(self, query):
+        return {
+            "userId": query["userId"],
+            "email": "grower@example.com",
+            "firstName": "Ada",
+            "lastName": "Grower",
+            "role": "user",
+            "isActive": True,
+            "isEmailVerified": True,
+        }
+
+
+@pytest.mark.asyncio
+async def test_module_auth_reuses_pipeline_claims(verifier, db, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_redis", object())
+    monkeypatch.setattr(rate_limiter, "_redis_available", False)
+    monkeypatch.setattr(rate_limiter, "requests", {})
+    monkeypatch.setattr(crm_db, "get_database", lambda: SimpleNamespace(users=_Users()))
+    monkeypatch.setattr(mongodb, "get_database", lambda: db)
+
+    app = FastAPI()
+
+    @app.get("/crm/me")
+    async def me(user=Depends(get_current_user)):
+        return {"user": user.userId}
+
+    app.add_middleware(RequestPipelineMiddleware)
+    token = _access()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        responses = [await client.get("/crm/me", headers=headers) for _ in range(3)]
+        await revoke_user_tokens(db, "u-1", "mfa_reset")
+        revoked = await client.get("/crm/me", headers=headers)
+
+    assert [r.json() for r in responses] == [{"user": "u-1"}] * 3
+    # Rate limiter and module dependency share one verification, and later
+    # requests are cache hits
+    assert verifier.decodes == [token]
+    assert revoked.status_code == 401
+
+    # Called directly (no request), the dependency verifies the token itself
+    direct = await get_current_user(
+        credentials=SimpleNamespace(credentials=_access("u-3"))
+    )
+    assert direct.userId == "u-3"